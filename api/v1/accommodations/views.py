@@ -1,12 +1,15 @@
 """Vistas públicas de alojamientos (formato que espera el frontend)."""
 
 import uuid
+from datetime import datetime
 from rest_framework import permissions, status
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from django.db.models import Q
 
-from apps.accommodations.models import Accommodation
+from api.v1.pagination import KeysetCursorPagination
+from apps.accommodations import listing_cache
+from apps.accommodations.models import Accommodation, AccommodationQuerySet
 from apps.accommodations.services.pricing import (
     calculate_accommodation_pricing,
     AccommodationPricingError,
@@ -20,26 +23,80 @@ from apps.accommodations.serializers import (
 )
 
 
+def _parse_date(s):
+    """Parse YYYY-MM-DD or return None."""
+    if not s or not isinstance(s, str):
+        return None
+    try:
+        return datetime.strptime(s.strip()[:10], "%Y-%m-%d").date()
+    except ValueError:
+        return None
+
+
+class PublicAccommodationListCursorPagination(KeysetCursorPagination):
+    """Cursor por (rating, created_at, id); ver AccommodationQuerySet.with_public_ordering."""
+
+    ordering = AccommodationQuerySet.PUBLIC_ORDERING
+    page_size = 24
+    max_page_size = 100
+
+
 class PublicAccommodationListView(APIView):
     """
     GET /api/v1/accommodations/public/
     Lista alojamientos publicados. Formato compatible con el tipo Accommodation del frontend.
+
+    Filtros: country, city, search, guests y check_in/check_out (YYYY-MM-DD): excluye en SQL
+    los alojamientos con fechas bloqueadas o reservas pending/paid que se crucen con el rango.
+    Paginación por cursor con ?page_size=N (y luego ?cursor=... tomado de "next"):
+    devuelve {"next": url|null, "results": [...]}. Sin page_size ni cursor devuelve la lista
+    completa (formato anterior). Respuestas cacheadas por filtro (ver listing_cache).
     """
 
     permission_classes = [permissions.AllowAny]
+    pagination_class = PublicAccommodationListCursorPagination
+
+    def _filters(self, request):
+        params = request.query_params
+        guests_param = params.get("guests", "").strip()
+        try:
+            guests = int(guests_param) if guests_param else None
+        except ValueError:
+            guests = None
+        check_in = _parse_date(params.get("check_in"))
+        check_out = _parse_date(params.get("check_out"))
+        if not (check_in and check_out and check_out > check_in):
+            check_in = check_out = None
+        return {
+            "country": params.get("country", "").strip().lower(),
+            "city": params.get("city", "").strip().lower(),
+            "search": params.get("search", "").strip().lower(),
+            "guests": guests if guests and guests > 0 else None,
+            "check_in": check_in,
+            "check_out": check_out,
+        }
 
     def get(self, request):
-        qs = Accommodation.objects.filter(
-            status="published",
-            deleted_at__isnull=True,
+        filters = self._filters(request)
+        paginate = any(
+            request.query_params.get(p)
+            for p in (self.pagination_class.cursor_query_param, self.pagination_class.page_size_query_param)
         )
-        country = request.query_params.get("country", "").strip()
-        city = request.query_params.get("city", "").strip()
-        search = request.query_params.get("search", "").strip()
-        if country:
-            qs = qs.filter(country__icontains=country)
-        if city:
-            qs = qs.filter(city__icontains=city)
+        key = listing_cache.cache_key(request, {
+            **filters,
+            "cursor": request.query_params.get("cursor", "") if paginate else None,
+            "page_size": request.query_params.get("page_size", "") if paginate else None,
+        })
+        cached = listing_cache.get_cached(key)
+        if cached is not None:
+            return Response(cached)
+
+        qs = Accommodation.objects.public()
+        if filters["country"]:
+            qs = qs.filter(country__icontains=filters["country"])
+        if filters["city"]:
+            qs = qs.filter(city__icontains=filters["city"])
+        search = filters["search"]
         if search:
             qs = qs.filter(
                 Q(title__icontains=search)
@@ -47,9 +104,22 @@ class PublicAccommodationListView(APIView):
                 | Q(location_name__icontains=search)
                 | Q(city__icontains=search)
             )
-        qs = qs.order_by("-rating_avg", "-created_at")
-        serializer = PublicAccommodationListSerializer(qs, many=True, context={"request": request})
-        return Response(serializer.data)
+        if filters["guests"]:
+            qs = qs.for_guests(filters["guests"])
+        if filters["check_in"]:
+            qs = qs.available_between(filters["check_in"], filters["check_out"])
+        qs = qs.with_public_ordering()
+
+        context = {"request": request}
+        if paginate:
+            paginator = self.pagination_class()
+            page = paginator.paginate_queryset(qs, request, view=self)
+            serializer = PublicAccommodationListSerializer(page, many=True, context=context)
+            data = paginator.get_paginated_response(serializer.data).data
+        else:
+            data = PublicAccommodationListSerializer(qs, many=True, context=context).data
+        listing_cache.store(key, data)
+        return Response(data)
 
 
 class PublicAccommodationDetailView(APIView):
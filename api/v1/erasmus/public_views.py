@@ -22,6 +22,12 @@ from apps.erasmus.models import (
     ErasmusActivityInscriptionPayment,
     ErasmusActivityPaymentLink,
 )
+from apps.erasmus.inscriptions import (
+    inscribed_count as inscribed_count_for,
+    inscribed_counts,
+    inscribed_leads,
+    inscribed_leads_by_instance,
+)
 from apps.events.models import Order
 from rest_framework.exceptions import ValidationError as DRFValidationError
 from api.v1.superadmin.serializers import (
@@ -135,10 +141,9 @@ def _activity_to_dict(act, include_instances=False):
     }
     if include_instances:
         data["instances"] = []
-        for inst in act.instances.order_by("display_order", "scheduled_date", "scheduled_year", "scheduled_month"):
-            inscribed_count = ErasmusLead.objects.filter(
-                interested_experiences__contains=[str(inst.id)]
-            ).count()
+        instances = list(act.instances.order_by("display_order", "scheduled_date", "scheduled_year", "scheduled_month"))
+        counts = inscribed_counts([inst.id for inst in instances])
+        for inst in instances:
             data["instances"].append({
                 "id": str(inst.id),
                 "scheduled_date": inst.scheduled_date.isoformat() if inst.scheduled_date else None,
@@ -157,7 +162,7 @@ def _activity_to_dict(act, include_instances=False):
                 "instructions_en": getattr(inst, "instructions_en", "") or "",
                 "whatsapp_message_es": getattr(inst, "whatsapp_message_es", "") or "",
                 "whatsapp_message_en": getattr(inst, "whatsapp_message_en", "") or "",
-                "inscribed_count": inscribed_count,
+                "inscribed_count": counts[str(inst.id)],
             })
     return data
 
@@ -235,37 +240,37 @@ class ErasmusPublicViewInscritosView(APIView):
         if act is None:
             return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
         instances = []
-        for inst in act.instances.order_by("display_order", "scheduled_date", "scheduled_year", "scheduled_month"):
-            leads = list(
-                ErasmusLead.objects.filter(
-                    interested_experiences__contains=[str(inst.id)]
-                ).order_by("-updated_at").values(
-                    "id", "first_name", "last_name", "email",
-                    "phone_country_code", "phone_number", "instagram", "updated_at"
-                )
-            )
-            # Payment status per inscription (lead+instance)
-            lead_ids = [l["id"] for l in leads]
-            payments = {
-                (str(p.lead_id), str(p.instance_id)): p
-                for p in ErasmusActivityInscriptionPayment.objects.filter(
-                    lead_id__in=lead_ids,
-                    instance=inst,
-                ).select_related("lead", "instance")
-            }
-            # Payment links: order for "Ver pedido" + link_sent status (paid and free)
-            payment_links_by_key = {}
-            for pl in ErasmusActivityPaymentLink.objects.filter(
-                lead_id__in=lead_ids, instance=inst
-            ).select_related("order"):
-                key = (str(pl.lead_id), str(pl.instance_id))
-                payment_links_by_key[key] = pl
-            # Include order for every inscription that has a link (paid or free) so "Ver pedido" works
-            payment_links_orders = {
-                (str(pl.lead_id), str(pl.instance_id)): pl.order
-                for pl in payment_links_by_key.values()
-                if getattr(pl, "order", None)
-            }
+        activity_instances = list(
+            act.instances.order_by("display_order", "scheduled_date", "scheduled_year", "scheduled_month")
+        )
+        instance_ids = [inst.id for inst in activity_instances]
+        # One query each for inscritos, payments and payment links across all instances
+        leads_by_instance = inscribed_leads_by_instance(instance_ids, [
+            "id", "first_name", "last_name", "email",
+            "phone_country_code", "phone_number", "instagram", "updated_at",
+        ])
+        # Payment status per inscription (lead+instance)
+        payments = {
+            (str(p.lead_id), str(p.instance_id)): p
+            for p in ErasmusActivityInscriptionPayment.objects.filter(
+                instance_id__in=instance_ids,
+            ).select_related("lead", "instance")
+        }
+        # Payment links: order for "Ver pedido" + link_sent status (paid and free)
+        payment_links_by_key = {}
+        for pl in ErasmusActivityPaymentLink.objects.filter(
+            instance_id__in=instance_ids
+        ).select_related("order"):
+            key = (str(pl.lead_id), str(pl.instance_id))
+            payment_links_by_key[key] = pl
+        # Include order for every inscription that has a link (paid or free) so "Ver pedido" works
+        payment_links_orders = {
+            key: pl.order
+            for key, pl in payment_links_by_key.items()
+            if getattr(pl, "order", None)
+        }
+        for inst in activity_instances:
+            leads = leads_by_instance[str(inst.id)]
             label = inst.scheduled_label_es or (inst.scheduled_date.isoformat() if inst.scheduled_date else str(inst.id))
             instances.append({
                 "id": str(inst.id),
@@ -850,10 +855,12 @@ class ErasmusPublicEditInstancesView(APIView):
         if act is None:
             return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
         instances = []
-        for inst in act.instances.order_by("display_order", "scheduled_date", "scheduled_year", "scheduled_month"):
-            inscribed_count = ErasmusLead.objects.filter(
-                interested_experiences__contains=[str(inst.id)]
-            ).count()
+        activity_instances = list(
+            act.instances.order_by("display_order", "scheduled_date", "scheduled_year", "scheduled_month")
+        )
+        counts = inscribed_counts([inst.id for inst in activity_instances])
+        for inst in activity_instances:
+            inscribed_count = counts[str(inst.id)]
             instances.append({
                 "id": str(inst.id),
                 "scheduled_date": inst.scheduled_date.isoformat() if inst.scheduled_date else None,
@@ -931,9 +938,7 @@ class ErasmusPublicEditInstanceDetailView(APIView):
         act, inst, err_resp = self._get_instance(edit_token, instance_id)
         if err_resp is not None:
             return err_resp
-        inscribed_count = ErasmusLead.objects.filter(
-            interested_experiences__contains=[str(inst.id)]
-        ).count()
+        inscribed_count = inscribed_count_for(inst)
         return Response({
             "id": str(inst.id),
             "scheduled_date": inst.scheduled_date.isoformat() if inst.scheduled_date else None,
@@ -996,9 +1001,7 @@ class ErasmusPublicEditInstanceDetailView(APIView):
             inst.save()
         except ValidationError as e:
             return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
-        inscribed_count = ErasmusLead.objects.filter(
-            interested_experiences__contains=[str(inst.id)]
-        ).count()
+        inscribed_count = inscribed_count_for(inst)
         return Response({
             "id": str(inst.id),
             "scheduled_date": inst.scheduled_date.isoformat() if inst.scheduled_date else None,
@@ -1038,9 +1041,7 @@ class ErasmusPublicEditInstanceInscriptionsView(APIView):
             inst = ErasmusActivityInstance.objects.get(id=instance_id, activity_id=act.id)
         except ErasmusActivityInstance.DoesNotExist:
             return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
-        leads = ErasmusLead.objects.filter(
-            interested_experiences__contains=[str(inst.id)]
-        ).order_by("-updated_at")
+        leads = inscribed_leads(inst).order_by("-updated_at")
         result = [
             {
                 "id": str(lead.id),
@@ -31,6 +31,7 @@ from apps.erasmus.models import (
     ErasmusWhatsAppGroup,
 )
 from apps.erasmus.activity_display import get_activity_display_data
+from apps.erasmus.inscriptions import inscribed_count, inscribed_counts
 from apps.erasmus.options_data import get_erasmus_options
 from apps.erasmus.services import get_guides_for_destinations
 from apps.landing_destinations.models import LandingDestination
@@ -68,13 +69,15 @@ class ErasmusTimelineView(APIView):
             ).select_related("activity", "activity__experience").order_by(
                 "display_order", "scheduled_date", "scheduled_year", "scheduled_month", "created_at"
             )
+            instances = list(instances)
+            counts = inscribed_counts([inst.id for inst in instances])
             for inst in instances:
                 act = inst.activity
                 display = get_activity_display_data(act)
                 scheduled_label = None
                 if inst.scheduled_label_es or inst.scheduled_label_en:
                     scheduled_label = {"es": inst.scheduled_label_es or "", "en": inst.scheduled_label_en or inst.scheduled_label_es or ""}
-                display_count = _instance_interested_display_count(inst)
+                display_count = _instance_interested_display_count(inst, counts)
                 capacity = getattr(inst, "capacity", None)
                 is_agotado = getattr(inst, "is_agotado", False)
                 result.append({
@@ -126,11 +129,9 @@ def _format_time(t):
     return t.strftime("%H:%M")
 
 
-def _instance_interested_display_count(inst):
-    """Real inscritos + interested_count_boost for public display."""
-    real = ErasmusLead.objects.filter(
-        interested_experiences__contains=[str(inst.id)]
-    ).count()
+def _instance_interested_display_count(inst, counts=None):
+    """Real inscritos + interested_count_boost for public display. Pass ``counts`` (inscribed_counts) in loops."""
+    real = counts.get(str(inst.id), 0) if counts is not None else inscribed_count(inst)
     boost = getattr(inst, "interested_count_boost", 0) or 0
     return real + boost
 
@@ -169,14 +170,14 @@ class ErasmusActivityDetailView(APIView):
         instances = act.instances.filter(is_active=True).order_by(
             "scheduled_date", "scheduled_year", "scheduled_month", "display_order", "created_at"
         )
+        instances = list(instances)
+        counts = inscribed_counts([inst.id for inst in instances])
         instance_list = []
         for inst in instances:
             scheduled_label = None
             if inst.scheduled_label_es or inst.scheduled_label_en:
                 scheduled_label = {"es": inst.scheduled_label_es or "", "en": inst.scheduled_label_en or inst.scheduled_label_es or ""}
-            interested_count = ErasmusLead.objects.filter(
-                interested_experiences__contains=[str(inst.id)]
-            ).count()
+            interested_count = counts[str(inst.id)]
             instance_list.append({
                 "id": str(inst.id),
                 "scheduledDate": inst.scheduled_date.isoformat() if inst.scheduled_date else None,
@@ -234,6 +235,8 @@ class ErasmusActivityDetailBySlugView(APIView):
         instances = act.instances.filter(is_active=True).order_by(
             "scheduled_date", "scheduled_year", "scheduled_month", "display_order", "created_at"
         )
+        instances = list(instances)
+        counts = inscribed_counts([inst.id for inst in instances])
         instance_list = []
         for inst in instances:
             scheduled_label = None
@@ -248,7 +251,7 @@ class ErasmusActivityDetailBySlugView(APIView):
                 "startTime": _format_time(getattr(inst, "start_time", None)),
                 "endTime": _format_time(getattr(inst, "end_time", None)),
                 "display_order": inst.display_order,
-                "interestedCount": _instance_interested_display_count(inst),
+                "interestedCount": _instance_interested_display_count(inst, counts),
                 "capacity": getattr(inst, "capacity", None),
                 "is_agotado": getattr(inst, "is_agotado", False),
                 "isPast": inst.is_past,
@@ -947,9 +950,7 @@ class ErasmusExpressInterestView(APIView):
                 status=status.HTTP_200_OK,
             )
         if getattr(instance, "capacity", None) is not None:
-            current_count = ErasmusLead.objects.filter(
-                interested_experiences__contains=[str(instance.id)]
-            ).count()
+            current_count = inscribed_count(instance)
             if current_count >= instance.capacity:
                 return Response(
                     {"success": False, "detail": "No quedan cupos para esta fecha."},
@@ -45,12 +45,16 @@ class PublicEventViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         """Solo eventos públicos para consulta."""
-        return Event.objects.filter(
+        queryset = Event.objects.filter(
             status='published', 
             visibility='public',
             requires_email_validation=False,
             deleted_at__isnull=True  # Exclude soft deleted events
         )
+        if self.action in ['retrieve', 'list']:
+            # Disponibilidad anotada + prefetch: sin queries por tier en EventDetailSerializer
+            queryset = queryset.for_detail()
+        return queryset
     
     def get_object(self):
         """
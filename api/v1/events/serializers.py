@@ -31,6 +31,7 @@ from apps.events.models import (
     ComplimentaryTicketInvitation,
 )
 from apps.forms.models import Form, FormField
+from apps.media.derivatives import derivative_index, responsive_image
 from apps.forms.serializers import FormFieldSerializer, FormSerializer
 from apps.organizers.models import OrganizerUser
 from django.contrib.auth import get_user_model
@@ -44,6 +45,43 @@ except ImportError:
     Payment = None
 
 
+def _event_image_index(serializer):
+    """
+    DerivativeIndex for event images (stored with the media library file name).
+    When rendering a list whose images were prefetched, every event's images are
+    looked up in one query.
+    """
+    context = serializer.context
+    index = derivative_index(context)
+    if not context.get('event_images_preloaded'):
+        context['event_images_preloaded'] = True
+        events = serializer.root.instance if isinstance(serializer.root, serializers.ListSerializer) else None
+        index.load(
+            image.image.name
+            for event in events or []
+            if 'images' in getattr(event, '_prefetched_objects_cache', {})
+            for image in event.images.all()
+        )
+    return index
+
+
+def _event_image_payload(serializer, image, alt):
+    """Public image dict: responsive JPEG as ``url`` plus srcsets once derivatives exist."""
+    request = serializer.context.get('request')
+    payload = {
+        'id': image.id,
+        'url': request.build_absolute_uri(image.image.url),
+        'srcset': '',
+        'jpeg_srcset': '',
+        'type': image.type,
+        'alt': alt,
+    }
+    responsive = responsive_image(_event_image_index(serializer).get(image.image.name), request.build_absolute_uri)
+    if responsive:
+        payload.update(responsive)
+    return payload
+
+
 class LocationSerializer(serializers.ModelSerializer):
     """
     Serializer for location model - supports both physical and virtual locations.
@@ -717,6 +755,7 @@ class PublicEventSerializer(serializers.ModelSerializer):
     """
     # Map backend fields to frontend expected fields
     image = serializers.SerializerMethodField()
+    image_srcset = serializers.SerializerMethodField()
     description = serializers.SerializerMethodField()
     price = serializers.SerializerMethodField()
     rating = serializers.SerializerMethodField()
@@ -737,7 +776,7 @@ class PublicEventSerializer(serializers.ModelSerializer):
     class Meta:
         model = Event
         fields = [
-            'id', 'title', 'image', 'description', 'price', 'rating', 'reviews',
+            'id', 'title', 'image', 'image_srcset', 'description', 'price', 'rating', 'reviews',
             'location', 'date', 'time', 'ticketsAvailable', 'ticketsSold',
             # 🚀 ENTERPRISE: Availability fields for advanced filtering
             'is_sales_active', 'is_available_for_purchase', 'has_available_tickets',
@@ -747,13 +786,19 @@ class PublicEventSerializer(serializers.ModelSerializer):
 
     def get_image(self, obj) -> str:
         """Get the first event image or None if no image exists."""
-        request = self.context.get('request')
         first_image = obj.images.first()
         if first_image and first_image.image:
-            return request.build_absolute_uri(first_image.image.url)
+            return _event_image_payload(self, first_image, obj.title)['url']
         # Return None so frontend can handle default image
         return None
 
+    def get_image_srcset(self, obj) -> str:
+        """WebP srcset for the card image ('' until its derivatives are generated)."""
+        first_image = obj.images.first()
+        if first_image and first_image.image:
+            return _event_image_payload(self, first_image, obj.title)['srcset']
+        return ''
+
     def get_description(self, obj):
         """
         Return a short description for cards/slider.
@@ -768,9 +813,13 @@ class PublicEventSerializer(serializers.ModelSerializer):
             return int(obj.simple_price) if not obj.is_free else 0
         
         # For complex events, get the minimum price from ticket tiers
-        min_price = obj.ticket_tiers.filter(is_public=True).aggregate(
-            min_price=models.Min('price')
-        )['min_price']
+        public_tiers = getattr(obj, 'public_ticket_tiers', None)  # Event.objects.with_availability()
+        if public_tiers is not None:
+            min_price = min((tier.price for tier in public_tiers), default=None)
+        else:
+            min_price = obj.ticket_tiers.filter(is_public=True).aggregate(
+                min_price=models.Min('price')
+            )['min_price']
         return int(min_price) if min_price else 0
 
     def get_rating(self, obj) -> float:
@@ -826,10 +875,16 @@ class PublicEventSerializer(serializers.ModelSerializer):
 
     def get_ticketsAvailable(self, obj) -> int:
         """Get available tickets count."""
+        prefetched_tiers = getattr(obj, 'public_ticket_tiers', None)  # Event.objects.with_availability()
+        if prefetched_tiers:
+            if any(tier.available is None or tier.available >= 99990 for tier in prefetched_tiers):
+                return -1  # -1 indicates unlimited capacity
+            return sum(tier.available for tier in prefetched_tiers)
+        
         # Get all public ticket tiers
         public_tiers = obj.ticket_tiers.filter(is_public=True)
         
-        if public_tiers.exists():
+        if prefetched_tiers is None and public_tiers.exists():
             # Check if any tier has unlimited capacity (available is None or very high)
             unlimited_tiers = public_tiers.filter(
                 models.Q(available__isnull=True) | 
@@ -893,16 +948,9 @@ class EventListSerializer(serializers.ModelSerializer):
 
     def get_images(self, obj) -> List[Dict[str, Any]]:
         """Return event images."""
-        request = self.context.get('request')
-        images = obj.images.all()[:3]  # Limit to 3 images for list view
-        return [
-            {
-                'id': image.id,
-                'url': request.build_absolute_uri(image.image.url),
-                'type': image.type,
-                'alt': image.alt or obj.title
-            } for image in images
-        ]
+        images = list(obj.images.all()[:3])  # Limit to 3 images for list view
+        _event_image_index(self).load(image.image.name for image in images)
+        return [_event_image_payload(self, image, image.alt or obj.title) for image in images]
 
 
 class EventDetailSerializer(serializers.ModelSerializer):
@@ -950,20 +998,18 @@ class EventDetailSerializer(serializers.ModelSerializer):
 
     def get_images(self, obj) -> List[Dict[str, Any]]:
         """Return all event images."""
-        request = self.context.get('request')
-        return [
-            {
-                'id': image.id,
-                'url': request.build_absolute_uri(image.image.url),
-                'type': image.type,
-                'alt': image.alt or obj.title
-            } for image in obj.images.all()
-        ]
+        images = list(obj.images.all())
+        _event_image_index(self).load(image.image.name for image in images)
+        return [_event_image_payload(self, image, image.alt or obj.title) for image in images]
     
     def get_ticket_tiers(self, obj) -> List[Dict[str, Any]]:
         """Return public ticket tiers for this event."""
-        # Get all public ticket tiers for this event
-        public_tiers = obj.ticket_tiers.filter(is_public=True).order_by('order', 'price')
+        # Get all public ticket tiers for this event (annotated: no per-tier availability queries)
+        public_tiers = getattr(obj, 'public_ticket_tiers', None)  # Event.objects.with_availability()
+        if public_tiers is None:
+            public_tiers = obj.ticket_tiers.filter(is_public=True).with_availability().select_related(
+                'category', 'form'
+            ).order_by('order', 'price')
         
         # Use the TicketTierSerializer to serialize each tier
         return TicketTierSerializer(public_tiers, many=True, context=self.context).data
@@ -1870,6 +1916,8 @@ class BookingSerializer(serializers.Serializer):
             
             # ✅ CREAR TICKETS INMEDIATAMENTE para eventos gratuitos
             self._create_tickets_from_holders(order, validated_data.get('ticketHolders', []), customer_info)
+            from apps.events.tasks import enqueue_order_tickets_qr
+            enqueue_order_tickets_qr(order.id)
             
             # 🚀 ENTERPRISE: Log tickets created
             if flow:
@@ -2201,10 +2249,7 @@ class PublicEventCreateSerializer(serializers.ModelSerializer):
     
     def validate(self, data):
         """Validaciones básicas para eventos públicos."""
-        from django.utils import timezone
-        
         # Validar fechas - comparar con UTC para evitar problemas de zona horaria
-        from django.utils import timezone
         now_utc = timezone.now()
         if data.get('start_date') and data['start_date'] <= now_utc:
             raise serializers.ValidationError({
@@ -21,17 +21,14 @@ from django.db import transaction, models
 from django.db.models import Count, Sum, F, Q, Value
 from django.db.models.functions import Coalesce
 from django.http import Http404, JsonResponse
+from django.urls import reverse
 from django.core.exceptions import PermissionDenied
 from django.utils import timezone
 from datetime import timedelta
-from decimal import Decimal, ROUND_HALF_UP
-import csv
+from decimal import Decimal
 import io
 import logging
 import time
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment
-from openpyxl.utils import get_column_letter
 
 logger = logging.getLogger(__name__)
 
@@ -43,7 +40,6 @@ from apps.events.models import (
     TicketTier,
     TicketCategory,
     Order,
-    OrderItem,
     Ticket,
     TicketHold,
     Coupon,
@@ -78,6 +74,16 @@ from .serializers import (
     ComplimentaryTicketInvitationRedeemSerializer,
     PublicComplimentaryTicketInvitationSerializer,
 )
+from apps.events.services.inventory import get_inventory_engine, InsufficientInventory
+from apps.events.exports import (
+    KIND_ATTENDEES,
+    KIND_ORDERS,
+    build_export_download_response,
+    build_export_response,
+    export_job_payload,
+    get_export_job,
+    start_export_job,
+)
 from apps.events.services.complimentary import (
     parse_excel_file,
     parse_text_file,
@@ -126,15 +132,16 @@ class EventViewSet(viewsets.ModelViewSet):
                 deleted_at__isnull=True
             )
             print(f"DEBUG - EventViewSet.get_queryset - Found {queryset.count()} events for organizer")
-            return queryset
+            return queryset.for_detail() if self.action == 'retrieve' else queryset
         
         # Para usuarios no organizadores o anónimos, solo eventos públicos
         if self.action in ['book', 'reserve', 'availability', 'retrieve']:
-            return Event.objects.filter(
+            queryset = Event.objects.filter(
                 status='published', 
                 visibility='public',
                 deleted_at__isnull=True  # Exclude soft deleted events
             )
+            return queryset.for_detail() if self.action == 'retrieve' else queryset
         
         # Si no hay organizador y no es una acción pública, retornar vacío
         print("DEBUG - EventViewSet.get_queryset - No organizer found, returning empty queryset")
@@ -249,7 +256,7 @@ class EventViewSet(viewsets.ModelViewSet):
             status='published',
             visibility='public',
             deleted_at__isnull=True  # Exclude soft deleted events
-        ).order_by('-featured', '-start_date')
+        ).with_availability().select_related('location').prefetch_related('images').order_by('-featured', '-start_date')
         
         # Apply filters
         event_type = request.query_params.getlist('type', [])
@@ -312,6 +319,32 @@ class EventViewSet(viewsets.ModelViewSet):
             logger.warning(f'📦 BOOKING: Event {event.id} is deleted')
             return Response({"detail": "Event not available for booking."}, status=status.HTTP_404_NOT_FOUND)
         
+        # 🚀 ENTERPRISE: Holds are persisted by the flush task enqueued at reserve time. When this
+        # reservation still has changes in the hold log (first reserve or a later quantity change),
+        # drain the log without waiting on the inventory lock; the order must not be built from
+        # stale holds, so the buyer retries if another flush is still writing them
+        inventory_engine = get_inventory_engine()
+        reservation_id = request.data.get('reservationId')
+        if inventory_engine is not None and reservation_id:
+            try:
+                in_sync = inventory_engine.order_in_sync(reservation_id)
+                if not in_sync:
+                    try:
+                        inventory_engine.flush(blocking_timeout=0)
+                    except TimeoutError:
+                        pass  # Another flush/reconcile holds the lock and is draining the log
+                    in_sync = inventory_engine.order_in_sync(reservation_id)
+            except Exception as e:
+                logger.warning(f'📦 BOOKING: Could not check inventory holds inline: {e}')
+                in_sync = True  # Fall back to the database holds, as without the engine
+            if not in_sync:
+                logger.warning(f'📦 BOOKING: Reservation {reservation_id} has unflushed holds, asking to retry')
+                return Response(
+                    {"detail": "Tu reserva se está actualizando. Intenta nuevamente en unos segundos."},
+                    status=status.HTTP_409_CONFLICT,
+                    headers={'Retry-After': '1'},
+                )
+
         try:
             # Create a clean context without request.user to avoid AnonymousUser issues
             context = {'event_id': pk}
@@ -359,16 +392,15 @@ class EventViewSet(viewsets.ModelViewSet):
         now = timezone.now()
         expires_at = now + timedelta(minutes=hold_minutes)
 
-        with transaction.atomic():
-            # 🚀 ENTERPRISE: Clean expired holds for these tiers before proceeding
-            tier_ids = [t.get('tierId') for t in tickets if t.get('tierId')]
-            expired_holds = TicketHold.objects.select_for_update().filter(
-                ticket_tier_id__in=tier_ids,
-                released=False,
-                expires_at__lte=now,
+        # 🚀 ENTERPRISE: Redis inventory engine (no TicketTier row locks on the request path)
+        inventory_engine = get_inventory_engine()
+        if inventory_engine is not None:
+            return self._reserve_with_inventory_engine(
+                inventory_engine, event, tickets, reservation_id, hold_minutes, expires_at
             )
-            for hold in expired_holds:
-                hold.release()
+
+        with transaction.atomic():
+            # Expired holds are released by the hold sweeper (Celery Beat), not on this path
 
             # Get or create reservation order
             if reservation_id:
@@ -377,32 +409,10 @@ class EventViewSet(viewsets.ModelViewSet):
                     print(f"🔄 RESERVE DEBUG - Reusing existing reservation: {reservation_id}")
                 except Order.DoesNotExist:
                     print(f"⚠️ RESERVE DEBUG - Reservation {reservation_id} not found, creating new one")
-                    order = Order.objects.create(
-                        event=event,
-                        email='',  # Will be collected during checkout
-                        first_name='Guest',
-                        last_name='User',
-                        phone='',
-                        subtotal=0,
-                        service_fee=0,
-                        total=0,
-                        currency=event.ticket_tiers.first().currency if event.ticket_tiers.exists() else 'CLP',
-                        status='pending'
-                    )
+                    order = self._create_reservation_order(event)
             else:
                 print(f"🆕 RESERVE DEBUG - Creating new reservation")
-                order = Order.objects.create(
-                    event=event,
-                    email='',  # Will be collected during checkout
-                    first_name='Guest',
-                    last_name='User',
-                    phone='',
-                    subtotal=0,
-                    service_fee=0,
-                    total=0,
-                    currency=event.ticket_tiers.first().currency if event.ticket_tiers.exists() else 'CLP',
-                    status='pending'
-                )
+                order = self._create_reservation_order(event)
 
             # 🚀 ENTERPRISE: Index existing active holds for this order
             active_holds = list(TicketHold.objects.select_for_update().filter(
@@ -413,7 +423,9 @@ class EventViewSet(viewsets.ModelViewSet):
                 holds_by_tier.setdefault(str(hold.ticket_tier_id), []).append(hold)
 
             # 🚀 ENTERPRISE: For each requested tier, adjust holds to match desired quantity
+            # One hold row per (order, tier, custom_price); new rows are bulk-created at the end
             result_items = []
+            new_holds = []
             for t in tickets:
                 tier_id = t.get('tierId')
                 qty = int(t.get('quantity', 0))
@@ -443,7 +455,7 @@ class EventViewSet(viewsets.ModelViewSet):
                     ).update(
                         available=F('available') - need  # ✅ Atomic decrease
                     )
-                    
+
                     if updated_rows == 0:
                         # ❌ Not enough tickets available or tier doesn't exist
                         tier.refresh_from_db()  # Get fresh data for error message
@@ -452,49 +464,119 @@ class EventViewSet(viewsets.ModelViewSet):
                                     f"Disponibles: {tier.real_available}, Solicitados: {need}"
                         }, status=status.HTTP_400_BAD_REQUEST)
                 
-                    # ✅ Success: tickets were atomically reserved, now create holds
-                    for _ in range(need):
+                    # ✅ Success: tickets were atomically reserved, now grow or create the aggregate hold
+                    hold_custom_price = None
+                    if tier.is_pay_what_you_want and custom_price is not None:
                         # 🚀 ENTERPRISE: Include custom_price for PWYW tickets
-                        hold_data = {
-                            'event': event,
-                            'ticket_tier': tier,
-                            'order': order,
-                            'quantity': 1,
-                            'expires_at': expires_at,
-                        }
-                        
-                        # Add custom_price if this is a PWYW ticket
-                        if tier.is_pay_what_you_want and custom_price is not None:
-                            from decimal import Decimal
-                            print(f"🔍 RESERVE DEBUG - PWYW tier {tier_id}: custom_price received = {custom_price} (type: {type(custom_price)})")
-                            custom_price_decimal = Decimal(str(custom_price))
-                            print(f"🔍 RESERVE DEBUG - Decimal conversion: {custom_price_decimal}")
-                            hold_data['custom_price'] = custom_price_decimal
-                        
-                        created_hold = TicketHold.objects.create(**hold_data)
-                        print(f"🔍 RESERVE DEBUG - Created hold: tier={created_hold.ticket_tier_id}, custom_price={created_hold.custom_price}")
+                        hold_custom_price = Decimal(str(custom_price))
+
+                    existing_hold = next(
+                        (h for h in holds_by_tier.get(str(tier_id), []) if h.custom_price == hold_custom_price),
+                        None
+                    )
+                    if existing_hold:
+                        TicketHold.objects.filter(id=existing_hold.id).update(
+                            quantity=F('quantity') + need,
+                            expires_at=expires_at,
+                        )
+                    else:
+                        new_holds.append(TicketHold(
+                            event=event,
+                            ticket_tier=tier,
+                            order=order,
+                            quantity=need,
+                            expires_at=expires_at,
+                            custom_price=hold_custom_price,
+                        ))
                 
                 elif qty < existing_qty:
-                    to_release = existing_qty - qty
-                    # 🚀 ENTERPRISE: Release oldest holds first
-                    holds_list = sorted(holds_by_tier.get(str(tier_id), []), key=lambda h: h.expires_at)
-                    for hold in holds_list:
-                        if to_release <= 0:
-                            break
-                        hold.release()
-                        to_release -= hold.quantity
+                    # 🚀 ENTERPRISE: Release oldest holds first (shrinking the last one if needed)
+                    TicketHold.objects.filter(
+                        id__in=[h.id for h in holds_by_tier.get(str(tier_id), [])]
+                    ).release_quantity(existing_qty - qty)
 
                 result_items.append({
                     'tierId': str(tier_id),
                     'quantity': qty
                 })
 
+            TicketHold.objects.bulk_create(new_holds)
+
             return Response({
                 'reservationId': str(order.id),
                 'expiresAt': expires_at.isoformat(),
                 'items': result_items,
                 'holdMinutes': hold_minutes
             })
+
+    def _create_reservation_order(self, event):
+        """Create the pending order that groups the holds of a reservation."""
+        first_tier = event.ticket_tiers.first()
+        return Order.objects.create(
+            event=event,
+            email='',  # Will be collected during checkout
+            first_name='Guest',
+            last_name='User',
+            phone='',
+            subtotal=0,
+            service_fee=0,
+            total=0,
+            currency=first_tier.currency if first_tier else 'CLP',
+            status='pending'
+        )
+
+    def _reserve_with_inventory_engine(self, engine, event, tickets, reservation_id, hold_minutes, expires_at):
+        """
+        🚀 ENTERPRISE: Reserve through the Redis inventory engine.
+
+        Availability is checked and decremented atomically in Redis; TicketHold rows
+        and TicketTier.available are written in bulk by the flush task, enqueued right
+        away so the holds are usually in the database before the buyer books.
+        """
+        order = None
+        if reservation_id:
+            order = Order.objects.filter(id=reservation_id, event=event).first()
+        if order is None:
+            order = self._create_reservation_order(event)
+
+        requested = [t for t in tickets if t.get('tierId') and int(t.get('quantity', 0)) >= 0]
+        tiers = {
+            str(tier.id): tier
+            for tier in TicketTier.objects.filter(event=event, id__in=[t['tierId'] for t in requested])
+        }
+
+        items = []
+        result_items = []
+        for t in requested:
+            tier = tiers.get(str(t['tierId']))
+            if tier is None:
+                return Response({"detail": f"Ticket tier {t['tierId']} not found."}, status=status.HTTP_400_BAD_REQUEST)
+            custom_price = t.get('customPrice')
+            items.append({
+                'tier_id': tier.id,
+                'quantity': int(t.get('quantity', 0)),
+                'custom_price': Decimal(str(custom_price)) if tier.is_pay_what_you_want and custom_price is not None else None,
+            })
+            result_items.append({'tierId': str(t['tierId']), 'quantity': int(t.get('quantity', 0))})
+
+        try:
+            engine.reserve(event.id, order.id, items, expires_at)
+        except InsufficientInventory as e:
+            tier = tiers[e.tier_id]
+            return Response({
+                "detail": f"No hay suficientes tickets disponibles para {tier.name}. "
+                        f"Disponibles: {e.available}"
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        from apps.events.tasks import flush_ticket_inventory
+        transaction.on_commit(flush_ticket_inventory.delay)
+
+        return Response({
+            'reservationId': str(order.id),
+            'expiresAt': expires_at.isoformat(),
+            'items': result_items,
+            'holdMinutes': hold_minutes
+        })
     
     @action(detail=False, methods=['get'])
     def categories(self, request):
@@ -512,11 +594,13 @@ class EventViewSet(viewsets.ModelViewSet):
         - Price changes over time
         - Service fees and taxes
         - Manual discounts
+        
+        Served from core.RevenueRollup (one row per event/tier and day, plus hour
+        buckets for today), so the cost does not grow with the number of orders.
+        The window covers whole local days: today and the previous `days - 1`.
         """
-        from django.db.models import Sum, Count, Avg, Q, F
-        from django.utils import timezone
-        from datetime import datetime, timedelta
-        from collections import defaultdict
+        from core.models import RevenueRollup
+        from core.revenue_rollups import day_bucket, rollup_queryset, sum_rollups
         
         organizer = self.get_organizer()
         if not organizer:
@@ -530,268 +614,120 @@ class EventViewSet(viewsets.ModelViewSet):
         days = int(days_param) if days_param else 0
         event_id = request.query_params.get('event_id')
         
-        # 🚀 ENTERPRISE: Support "all sales" when days=0
-        # Calculate start_date: if days=0, get from first order, otherwise use days
-        show_all_sales = (days == 0)
-        
-        from core.revenue_system import order_revenue_eligible_q
-        if show_all_sales:
-            # Get all revenue-eligible orders to find the first one
-            base_orders = Order.objects.filter(
-                event__organizer=organizer,
-            ).filter(order_revenue_eligible_q())
-            if event_id:
-                base_orders = base_orders.filter(event_id=event_id)
-            
-            first_order = base_orders.order_by('created_at').first()
-            if first_order:
-                start_date = first_order.created_at.date()
-                # Calculate actual days from first order to today
-                days = (timezone.now().date() - start_date).days + 1
-                # Convert date to datetime at start of day
-                start_date = timezone.make_aware(datetime.combine(start_date, datetime.min.time()))
-            else:
-                # No orders found, use default 30 days
-                days = 30
-                start_date = timezone.now() - timedelta(days=days)
-                show_all_sales = False
-        else:
-            start_date = timezone.now() - timedelta(days=days)
-        
-        print(f"🔍 [ANALYTICS DEBUG] days={days}, event_id={event_id}, start_date={start_date}, show_all_sales={show_all_sales}")
-        
-        # Base queryset for revenue-eligible orders only (paid, not sandbox, not deleted, not excluded)
-        if show_all_sales:
-            orders_queryset = Order.objects.filter(
-                event__organizer=organizer,
-            ).filter(order_revenue_eligible_q()).select_related('event')
-        else:
-            orders_queryset = Order.objects.filter(
-                event__organizer=organizer,
-                created_at__gte=start_date,
-            ).filter(order_revenue_eligible_q()).select_related('event')
-        
-        print(f"🔍 [ANALYTICS DEBUG] Base orders count: {orders_queryset.count()}")
-        
-        if event_id:
-            orders_queryset = orders_queryset.filter(event_id=event_id)
-            print(f"🔍 [ANALYTICS DEBUG] Orders after event filter: {orders_queryset.count()}")
-        else:
-            print(f"🔍 [ANALYTICS DEBUG] No event_id filter applied")
-        
-        # 🚀 ENTERPRISE: Use centralized revenue calculator
-        # This ensures consistency across all endpoints
-        from core.revenue_calculator import calculate_event_revenue
-        
-        # Calculate revenue using centralized function
-        # Note: For analytics, we need to calculate per event if event_id is provided
+        event = None
         if event_id:
-            from apps.events.models import Event
-            try:
-                event = Event.objects.get(id=event_id, organizer=organizer)
-                revenue_result = calculate_event_revenue(
-                    event,
-                    start_date=start_date if not show_all_sales else None,
-                    end_date=timezone.now() if not show_all_sales else None,
-                    validate=True
-                )
-                # Extract values from centralized calculation
-                total_revenue = revenue_result['total_revenue']
-                gross_revenue_effective = revenue_result['gross_revenue']
-                service_fees_effective = revenue_result['service_fees']
-                total_subtotal_original = revenue_result['subtotal_original']
-                total_service_fees_original = revenue_result['service_fees_original']
-                total_discount = revenue_result['total_discount']
-                total_orders = revenue_result['total_orders']
-            except Event.DoesNotExist:
+            event = Event.objects.filter(id=event_id, organizer=organizer).first()
+            if event is None:
                 return Response(
                     {"detail": "Evento no encontrado"}, 
                     status=status.HTTP_404_NOT_FOUND
                 )
-            
-        # Calculate total tickets sold (from order items) - ALWAYS needed
-        tickets_data = OrderItem.objects.filter(
-            order__in=orders_queryset
-        ).aggregate(
-            total_tickets=Sum('quantity'),
-            total_gross_revenue=Sum('unit_price'),  # Sum unit_price * quantity for gross revenue
-            avg_unit_price=Avg('unit_price')  # Average actual price paid per ticket
-        )
         
-        total_tickets = tickets_data['total_tickets'] or 0
+        scope = {'event': event} if event else {'organizer': organizer}
+        now = timezone.now()
+        today = day_bucket(now)
         
-        # Calculate effective average ticket price (base price without service fees)
-        effective_avg_price = 0
-        if total_tickets > 0:
-            # Use gross revenue effective for accurate average
-            effective_avg_price = gross_revenue_effective / total_tickets if gross_revenue_effective > 0 else 0
+        # 🚀 ENTERPRISE: Support "all sales" when days=0 (window starts at the first sale day)
+        show_all_sales = (days == 0)
+        if show_all_sales:
+            first_bucket = rollup_queryset(**scope).order_by('bucket_start').values_list('bucket_start', flat=True).first()
+            if first_bucket:
+                days = (timezone.localtime(now).date() - timezone.localtime(first_bucket).date()).days + 1
+            else:
+                # No orders found, use default 30 days
+                days = 30
+                show_all_sales = False
+        days = max(days, 1)
+        start_date = today - timedelta(days=days - 1)
+        
+        # KPIs from event-level day rows
+        day_rows = rollup_queryset(start_date=start_date, **scope)
+        totals = sum_rollups(day_rows)
+        total_revenue = float(totals['total_revenue'])
+        gross_revenue_effective = float(totals['gross_revenue'])
+        service_fees_effective = float(totals['service_fees'])
+        total_discount = float(totals['total_discount'])
+        total_orders = totals['orders']
+        total_tickets = totals['tickets']
         
-        # 🚀 ENTERPRISE: Time series with effective revenue
+        # Calculate effective average ticket price (base price without service fees)
+        effective_avg_price = gross_revenue_effective / total_tickets if total_tickets > 0 else 0
+        
+        # 🚀 ENTERPRISE: Time series with effective revenue (one grouped query, empty days filled with zeros)
+        daily = {
+            timezone.localtime(row['bucket_start']).date(): row
+            for row in day_rows.values('bucket_start').annotate(
+                day_tickets=Sum('tickets'),
+                day_revenue=Sum('total_revenue'),
+                day_gross=Sum('gross_revenue'),
+                day_orders=Sum('orders'),
+            )
+        }
         chart_data = []
         for i in range(days):
-            current_date = start_date + timedelta(days=i)
-            next_date = current_date + timedelta(days=1)
-            
-            daily_orders = orders_queryset.filter(
-                created_at__gte=current_date,
-                created_at__lt=next_date
-            )
-            
-            daily_stats = daily_orders.aggregate(
-                revenue=Sum('total'),  # Effective revenue (lo que pagó el cliente)
-                subtotal=Sum('subtotal'),  # Subtotal original
-                service_fees=Sum('service_fee'),  # Service fees originales
-                orders=Count('id')
-            )
-            
-            daily_tickets = OrderItem.objects.filter(
-                order__in=daily_orders
-            ).aggregate(tickets=Sum('quantity'))
-            
-            # Calcular revenue efectivo diario (distribuyendo descuentos proporcionalmente)
-            # 🚀 ENTERPRISE: Todos los valores deben ser enteros (sin decimales para CLP)
-            daily_revenue = float(daily_stats['revenue'] or 0)
-            daily_subtotal = float(daily_stats['subtotal'] or 0)
-            daily_service_fees = float(daily_stats['service_fees'] or 0)
-            daily_original = daily_subtotal + daily_service_fees
-            
-            if daily_original > 0:
-                daily_ratio = Decimal(str(daily_revenue)) / Decimal(str(daily_original))
-                daily_gross_revenue = (Decimal(str(daily_subtotal)) * daily_ratio).quantize(Decimal('1'), rounding=ROUND_HALF_UP)
-                daily_gross_revenue = float(daily_gross_revenue)
-            else:
-                daily_gross_revenue = 0
-            
+            current_date = timezone.localtime(start_date).date() + timedelta(days=i)
+            row = daily.get(current_date, {})
             chart_data.append({
                 'date': current_date.strftime('%d/%m/%Y'),
-                'sales': daily_tickets['tickets'] or 0,
-                'revenue': daily_revenue,
-                'gross_revenue': daily_gross_revenue,  # Revenue efectivo del organizador
-                'orders': daily_stats['orders'] or 0
+                'sales': row.get('day_tickets') or 0,
+                'revenue': float(row.get('day_revenue') or 0),
+                'gross_revenue': float(row.get('day_gross') or 0),  # Revenue efectivo del organizador
+                'orders': row.get('day_orders') or 0
             })
         
+        # Today by hour
+        hourly_data = [
+            {
+                'hour': timezone.localtime(row['bucket_start']).strftime('%H:00'),
+                'sales': row['hour_tickets'] or 0,
+                'revenue': float(row['hour_revenue'] or 0),
+                'orders': row['hour_orders'] or 0,
+            }
+            for row in rollup_queryset(granularity=RevenueRollup.GRANULARITY_HOUR, start_date=today, **scope)
+            .values('bucket_start')
+            .annotate(hour_tickets=Sum('tickets'), hour_revenue=Sum('total_revenue'), hour_orders=Sum('orders'))
+            .order_by('bucket_start')
+        ]
+        
         # 🚀 ENTERPRISE: Ticket categories with effective revenue (considering discounts)
         category_data = []
-        if event_id:
+        tier_rows = RevenueRollup.objects.filter(
+            granularity=RevenueRollup.GRANULARITY_DAY,
+            ticket_tier__isnull=False,
+            bucket_start__gte=start_date,
+            **scope
+        )
+        tier_totals = dict(
+            tickets=Sum('tickets'),
+            effective_revenue=Sum('gross_revenue'),
+            effective_service_fees=Sum('service_fees'),
+            orders_count=Sum('orders'),
+        )
+        if event:
             # For specific event - group by ticket tiers
-            event = Event.objects.get(id=event_id)
-            for tier in event.ticket_tiers.all():
-                # Get orders that have this tier
-                tier_orders_filter = {
-                    'items__ticket_tier': tier,
-                }
-                if not show_all_sales:
-                    tier_orders_filter['created_at__gte'] = start_date
-                tier_orders = Order.objects.filter(**tier_orders_filter).filter(order_revenue_eligible_q()).distinct()
-                
-                # Calculate totals for orders with this tier
-                tier_order_stats = tier_orders.aggregate(
-                    total_revenue=Sum('total'),
-                    total_subtotal=Sum('subtotal'),
-                    total_service_fees=Sum('service_fee')
-                )
-                
-                tier_revenue = float(tier_order_stats['total_revenue'] or 0)
-                tier_subtotal = float(tier_order_stats['total_subtotal'] or 0)
-                tier_service_fees = float(tier_order_stats['total_service_fees'] or 0)
-                tier_original = tier_subtotal + tier_service_fees
-                
-                # Calculate effective revenue (distributing discounts proportionally)
-                # 🚀 ENTERPRISE: Todos los valores deben ser enteros (sin decimales para CLP)
-                if tier_original > 0:
-                    tier_ratio = Decimal(str(tier_revenue)) / Decimal(str(tier_original))
-                    tier_effective_revenue = (Decimal(str(tier_subtotal)) * tier_ratio).quantize(Decimal('1'), rounding=ROUND_HALF_UP)
-                    tier_effective_service_fees = (Decimal(str(tier_service_fees)) * tier_ratio).quantize(Decimal('1'), rounding=ROUND_HALF_UP)
-                    tier_effective_revenue = float(tier_effective_revenue)
-                    tier_effective_service_fees = float(tier_effective_service_fees)
-                else:
-                    tier_effective_revenue = 0
-                    tier_effective_service_fees = 0
-                
-                tier_items_filter = {
-                    'ticket_tier': tier,
-                    'order__status': 'paid',
-                    'order__is_sandbox': False,
-                    'order__deleted_at__isnull': True,
-                    'order__exclude_from_revenue': False,
-                }
-                if not show_all_sales:
-                    tier_items_filter['order__created_at__gte'] = start_date
-                tier_items = OrderItem.objects.filter(**tier_items_filter).aggregate(
-                    tickets=Sum('quantity')
-                )
-                
-                tickets_sold = tier_items['tickets'] or 0
-                if tickets_sold > 0:
+            for row in tier_rows.values('ticket_tier_id', 'ticket_tier__name', 'ticket_tier__price').annotate(
+                **tier_totals
+            ).order_by('ticket_tier__name'):
+                if row['tickets'] > 0:
                     category_data.append({
-                        'name': tier.name,
-                        'value': tickets_sold,
-                        'effective_revenue': round(tier_effective_revenue, 2),
-                        'service_fees': round(tier_effective_service_fees, 2),
-                        'base_price': float(tier.price),
-                        'fill': f"#{hash(tier.name) % 16777215:06x}"
+                        'name': row['ticket_tier__name'],
+                        'value': row['tickets'],
+                        'effective_revenue': round(float(row['effective_revenue']), 2),
+                        'service_fees': round(float(row['effective_service_fees']), 2),
+                        'base_price': float(row['ticket_tier__price']),
+                        'fill': f"#{hash(row['ticket_tier__name']) % 16777215:06x}"
                     })
         else:
             # For all events - aggregate by tier names with effective revenue
-            tier_stats = defaultdict(lambda: {
-                'tickets': 0,
-                'orders': set(),
-                'order_ids': set()
-            })
-            
-            order_items_filter = {
-                'order__event__organizer': organizer,
-                'order__status': 'paid',
-                'order__is_sandbox': False,
-                'order__deleted_at__isnull': True,
-                'order__exclude_from_revenue': False,
-            }
-            if not show_all_sales:
-                order_items_filter['order__created_at__gte'] = start_date
-            order_items = OrderItem.objects.filter(**order_items_filter).select_related('ticket_tier', 'order')
-            
-            # First pass: collect tier info and order IDs
-            for item in order_items:
-                tier_name = item.ticket_tier.name
-                tier_stats[tier_name]['tickets'] += item.quantity
-                tier_stats[tier_name]['order_ids'].add(item.order_id)
-            
-            # Second pass: calculate effective revenue per tier (considering discounts)
-            for tier_name, stats in tier_stats.items():
-                if stats['tickets'] > 0:
-                    # Get orders for this tier
-                    tier_orders = Order.objects.filter(
-                        id__in=stats['order_ids']
-                    ).aggregate(
-                        total_revenue=Sum('total'),
-                        total_subtotal=Sum('subtotal'),
-                        total_service_fees=Sum('service_fee')
-                    )
-                    
-                    tier_revenue = float(tier_orders['total_revenue'] or 0)
-                    tier_subtotal = float(tier_orders['total_subtotal'] or 0)
-                    tier_service_fees = float(tier_orders['total_service_fees'] or 0)
-                    tier_original = tier_subtotal + tier_service_fees
-                    
-                    # Calculate effective revenue (distributing discounts proportionally)
-                    # 🚀 ENTERPRISE: Todos los valores deben ser enteros (sin decimales para CLP)
-                    if tier_original > 0:
-                        tier_ratio = Decimal(str(tier_revenue)) / Decimal(str(tier_original))
-                        tier_effective_revenue = (Decimal(str(tier_subtotal)) * tier_ratio).quantize(Decimal('1'), rounding=ROUND_HALF_UP)
-                        tier_effective_service_fees = (Decimal(str(tier_service_fees)) * tier_ratio).quantize(Decimal('1'), rounding=ROUND_HALF_UP)
-                        tier_effective_revenue = float(tier_effective_revenue)
-                        tier_effective_service_fees = float(tier_effective_service_fees)
-                    else:
-                        tier_effective_revenue = 0
-                        tier_effective_service_fees = 0
-                    
+            for row in tier_rows.values('ticket_tier__name').annotate(**tier_totals).order_by('ticket_tier__name'):
+                if row['tickets'] > 0:
                     category_data.append({
-                        'name': tier_name,
-                        'value': stats['tickets'],
-                        'effective_revenue': round(tier_effective_revenue, 2),
-                        'service_fees': round(tier_effective_service_fees, 2),
-                        'orders_count': len(stats['order_ids']),
-                        'fill': f"#{hash(tier_name) % 16777215:06x}"
+                        'name': row['ticket_tier__name'],
+                        'value': row['tickets'],
+                        'effective_revenue': round(float(row['effective_revenue']), 2),
+                        'service_fees': round(float(row['effective_service_fees']), 2),
+                        'orders_count': row['orders_count'],
+                        'fill': f"#{hash(row['ticket_tier__name']) % 16777215:06x}"
                     })
         
         # 🚀 ENTERPRISE: Enhanced device/channel analysis (placeholder for now)
@@ -815,34 +751,32 @@ class EventViewSet(viewsets.ModelViewSet):
                 'totalRevenue': total_revenue,  # Lo que pagó el cliente (después de descuentos)
                 'grossRevenue': round(gross_revenue_effective, 2),  # Revenue efectivo del organizador (después de descuentos proporcionales)
                 'totalServiceFees': round(service_fees_effective, 2),  # Service fees efectivos (después de descuentos proporcionales)
-                 'totalDiscounts': total_discount,
+                'totalDiscounts': total_discount,
                 'averageTicketPrice': round(effective_avg_price, 2),  # Effective average
                 'totalOrders': total_orders,
                 'conversionRate': 0,  # Placeholder - needs view tracking implementation
                 'averageOrderValue': round(total_revenue / total_orders, 2) if total_orders > 0 else 0
             },
             'chartData': chart_data,
+            'hourlyData': hourly_data,
             'categoryData': category_data,
             'deviceData': device_data,
             'channelData': channel_data,
             'dateRange': {
                 'start': start_date.isoformat(),
-                'end': timezone.now().isoformat(),
+                'end': now.isoformat(),
                 'days': days
             },
             'metadata': {
-                'calculation_method': 'effective_revenue',
+                'calculation_method': 'revenue_rollup',
                 'includes_discounts': True,
                 'includes_service_fees': True,
                 'only_paid_orders': True,
                 'event_id_filter': event_id,
-                'filtered_orders_count': orders_queryset.count()
+                'filtered_orders_count': total_orders
             }
         }
         
-        print(f"🔍 [ANALYTICS DEBUG] Final response KPIs: totalSales={total_tickets}, totalRevenue={total_revenue}")
-        print(f"🔍 [ANALYTICS DEBUG] Event filter applied: {event_id is not None}")
-        
         return Response(response_data)
 
     @action(detail=True, methods=['get'])
@@ -885,40 +819,14 @@ class EventViewSet(viewsets.ModelViewSet):
             export_format = request.query_params.get('export_format', 'csv').lower()
             print(f"🔍 [EXPORT ORDERS] Export format: {export_format}")
             
-            # Get all orders for this event with related data
-            print(f"🔍 [EXPORT ORDERS] Querying orders for event {event.id}...")
-            orders = Order.objects.filter(
-                event=event
-            ).select_related(
-                'user',
-                'coupon'
-            ).prefetch_related(
-                'items__ticket_tier',
-                'items__tickets'
-            ).order_by('created_at')
-            
-            orders_count = orders.count()
-            print(f"🔍 [EXPORT ORDERS] Found {orders_count} orders")
-            
-            if orders_count == 0:
+            if not Order.objects.filter(event=event).exists():
                 print(f"🔍 [EXPORT ORDERS] No orders found - returning empty response")
                 return Response(
                     {"detail": "No hay órdenes para exportar para este evento"},
                     status=status.HTTP_404_NOT_FOUND
                 )
             
-            print(f"🔍 [EXPORT ORDERS] Generating {export_format} export...")
-            if export_format == 'excel':
-                print(f"🔍 [EXPORT ORDERS] Calling _export_orders_excel...")
-                result = self._export_orders_excel(event, orders)
-                print(f"🔍 [EXPORT ORDERS] Excel export completed, content_type: {result.get('Content-Type', 'NOT SET')}")
-            else:
-                print(f"🔍 [EXPORT ORDERS] Calling _export_orders_csv...")
-                result = self._export_orders_csv(event, orders)
-                print(f"🔍 [EXPORT ORDERS] CSV export completed, content_type: {result.get('Content-Type', 'NOT SET')}")
-            
-            print(f"🔍 [EXPORT ORDERS] Export generated successfully")
-            return result
+            return self._export_response(request, event, KIND_ORDERS, export_format)
                 
         except Exception as e:
             print(f"🔍 [EXPORT ORDERS] ERROR: {str(e)}")
@@ -956,30 +864,7 @@ class EventViewSet(viewsets.ModelViewSet):
             # Get export format (default to CSV)
             export_format = request.query_params.get('export_format', 'csv').lower()
             
-            # Get all tickets for this event with related data
-            tickets = Ticket.objects.filter(
-                order_item__order__event=event
-            ).select_related(
-                'order_item__order',
-                'order_item__ticket_tier',
-                'order_item__ticket_tier__form',
-                'check_in_by',
-                'approved_by'
-            ).prefetch_related(
-                'order_item__ticket_tier__form__fields'
-            ).order_by('created_at')
-            
-            print(f"🔍 [EXPORT ATTENDEES] Generating {export_format} export...")
-            if export_format == 'excel':
-                print(f"🔍 [EXPORT ATTENDEES] Calling _export_attendees_excel...")
-                result = self._export_attendees_excel(event, tickets)
-                print(f"🔍 [EXPORT ATTENDEES] Excel export completed, content_type: {result.get('Content-Type', 'NOT SET')}")
-                return result
-            else:
-                print(f"🔍 [EXPORT ATTENDEES] Calling _export_attendees_csv...")
-                result = self._export_attendees_csv(event, tickets)
-                print(f"🔍 [EXPORT ATTENDEES] CSV export completed, content_type: {result.get('Content-Type', 'NOT SET')}")
-                return result
+            return self._export_response(request, event, KIND_ATTENDEES, export_format)
                 
         except Exception as e:
             print(f"🔍 [EXPORT ATTENDEES] ERROR: {str(e)}")
@@ -990,6 +875,52 @@ class EventViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+    @action(detail=True, methods=['get'])
+    def export_status(self, request, pk=None):
+        """
+        🚀 ENTERPRISE: Status of a background export started with ?async=1.
+        
+        Returns the job record; once status is 'completed', url is the (authenticated)
+        export_download link.
+        """
+        event = self.get_object()
+        organizer = self.get_organizer()
+        if not organizer or event.organizer != organizer:
+            return Response(
+                {"detail": "No tienes permisos para exportar este evento"},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        job = get_export_job(request.query_params.get('job_id', ''))
+        if not job or job.get('event_id') != str(event.id):
+            return Response({"detail": "Exportación no encontrada"}, status=status.HTTP_404_NOT_FOUND)
+        download_url = request.build_absolute_uri(reverse('event-export-download', args=[event.pk]))
+        return Response(export_job_payload(job, download_url))
+
+    @action(detail=True, methods=['get'])
+    def export_download(self, request, pk=None):
+        """
+        🚀 ENTERPRISE: Download the file of a completed background export.
+        
+        Streamed from the private export storage to organizer members only, while the
+        job record lives (EVENT_EXPORTS['LINK_TTL']).
+        """
+        event = self.get_object()
+        organizer = self.get_organizer()
+        if not organizer or event.organizer != organizer:
+            return Response(
+                {"detail": "No tienes permisos para exportar este evento"},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        job = get_export_job(request.query_params.get('job_id', ''))
+        if not job or job.get('event_id') != str(event.id):
+            return Response({"detail": "Exportación no encontrada"}, status=status.HTTP_404_NOT_FOUND)
+        response = build_export_download_response(job)
+        if response is None:
+            return Response({"detail": "Exportación no disponible"}, status=status.HTTP_404_NOT_FOUND)
+        return response
+
     @action(detail=True, methods=['get'])
     def conversion_metrics(self, request, pk=None):
         """🚀 ENTERPRISE: Get conversion funnel metrics for a specific event."""
@@ -1073,14 +1004,15 @@ class EventViewSet(viewsets.ModelViewSet):
     def track_view(self, request):
         """🚀 ENTERPRISE: Track an event view for analytics."""
         from apps.events.analytics_models import EventView
+        from core.analytics_ingest import record_event_view
         
         event_id = request.data.get('event_id')
         if not event_id:
             return Response({'detail': 'event_id is required'}, status=status.HTTP_400_BAD_REQUEST)
         
         try:
-            event = Event.objects.get(id=event_id)
-            view = EventView.track_view(event, request)
+            event = Event.objects.only('id').get(id=event_id)
+            view = record_event_view(EventView.build_view(event, request))
             
             return Response({
                 'view_id': str(view.id) if view else None,
@@ -1573,425 +1505,15 @@ class EventViewSet(viewsets.ModelViewSet):
             )
     
     
-    def _export_attendees_csv(self, event, tickets):
-        """Generate CSV export for attendees"""
-        response = HttpResponse(content_type='text/csv; charset=utf-8')
-        response['Content-Disposition'] = f'attachment; filename="asistentes_{event.slug}_{timezone.now().strftime("%Y%m%d_%H%M%S")}.csv"'
-        
-        # Add BOM for proper UTF-8 encoding in Excel
-        response.write('\ufeff')
-        
-        writer = csv.writer(response)
-        
-        # Get all form fields for this event
-        form_fields = []
-        for ticket_tier in event.ticket_tiers.all():
-            if ticket_tier.form:
-                for field in ticket_tier.form.fields.all():
-                    if field.label not in [f.label for f in form_fields]:
-                        form_fields.append(field)
-        
-        # Write header
-        header = [
-            'Número de Ticket',
-            'Nombre',
-            'Apellido',
-            'Email',
-            'Tipo de Ticket',
-            'Precio del Ticket',
-            'Estado del Ticket',
-            'Estado de Check-in',
-            'Fecha de Check-in',
-            'Check-in por',
-            'Estado de Aprobación',
-            'Aprobado por',
-            'Fecha de Aprobación',
-            'Razón de Rechazo',
-            'Número de Orden',
-            'Estado de Orden',
-            'Método de Pago',
-            'Total de Orden',
-            'Fecha de Compra',
-            'Fecha de Pago',
-            'Teléfono del Comprador',
-            'Nombre del Comprador',
-            'IP de Compra',
-            'Cupón Usado',
-            'Descuento Aplicado'
-        ]
-        
-        # Add custom form fields to header
-        for field in form_fields:
-            header.append(f'Campo: {field.label}')
-        
-        writer.writerow(header)
-        
-        # Write data rows
-        for ticket in tickets:
-            order = ticket.order_item.order
-            
-            row = [
-                ticket.ticket_number,
-                ticket.first_name,
-                ticket.last_name,
-                ticket.email,
-                ticket.order_item.ticket_tier.name if ticket.order_item.ticket_tier else 'N/A',
-                str(ticket.order_item.unit_price),
-                ticket.get_status_display(),
-                ticket.get_check_in_status_display(),
-                ticket.check_in_time.strftime('%Y-%m-%d %H:%M:%S') if ticket.check_in_time else '',
-                ticket.check_in_by.get_full_name() if ticket.check_in_by else '',
-                ticket.get_approval_status_display() if ticket.approval_status else '',
-                ticket.approved_by.get_full_name() if ticket.approved_by else '',
-                ticket.approved_at.strftime('%Y-%m-%d %H:%M:%S') if ticket.approved_at else '',
-                ticket.rejection_reason,
-                order.order_number,
-                order.get_status_display(),
-                order.payment_method,
-                str(order.total),
-                order.created_at.strftime('%Y-%m-%d %H:%M:%S'),
-                order.updated_at.strftime('%Y-%m-%d %H:%M:%S') if order.is_paid else '',
-                order.phone,
-                f"{order.first_name} {order.last_name}".strip(),
-                order.ip_address or '',
-                order.coupon.code if order.coupon else '',
-                str(order.discount) if order.discount > 0 else '0'
-            ]
-            
-            # Add custom form field values
-            for field in form_fields:
-                field_value = ''
-                if ticket.form_data and str(field.id) in ticket.form_data:
-                    field_value = str(ticket.form_data[str(field.id)])
-                row.append(field_value)
-            
-            writer.writerow(row)
-        
-        return response
-    
-    def _export_attendees_excel(self, event, tickets):
-        """Generate Excel export for attendees"""
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Asistentes"
-        
-        # Get all form fields for this event
-        form_fields = []
-        for ticket_tier in event.ticket_tiers.all():
-            if ticket_tier.form:
-                for field in ticket_tier.form.fields.all():
-                    if field.label not in [f.label for f in form_fields]:
-                        form_fields.append(field)
-        
-        # Define headers
-        headers = [
-            'Número de Ticket',
-            'Nombre',
-            'Apellido',
-            'Email',
-            'Tipo de Ticket',
-            'Precio del Ticket',
-            'Estado del Ticket',
-            'Estado de Check-in',
-            'Fecha de Check-in',
-            'Check-in por',
-            'Estado de Aprobación',
-            'Aprobado por',
-            'Fecha de Aprobación',
-            'Razón de Rechazo',
-            'Número de Orden',
-            'Estado de Orden',
-            'Método de Pago',
-            'Total de Orden',
-            'Fecha de Compra',
-            'Fecha de Pago',
-            'Teléfono del Comprador',
-            'Nombre del Comprador',
-            'IP de Compra',
-            'Cupón Usado',
-            'Descuento Aplicado'
-        ]
-        
-        # Add custom form fields to headers
-        for field in form_fields:
-            headers.append(f'Campo: {field.label}')
-        
-        # Style headers
-        header_font = Font(bold=True, color="FFFFFF")
-        header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-        header_alignment = Alignment(horizontal="center", vertical="center")
-        
-        # Write headers
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col, value=header)
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.alignment = header_alignment
-        
-        # Write data
-        for row_num, ticket in enumerate(tickets, 2):
-            order = ticket.order_item.order
-            
-            data = [
-                ticket.ticket_number,
-                ticket.first_name,
-                ticket.last_name,
-                ticket.email,
-                ticket.order_item.ticket_tier.name if ticket.order_item.ticket_tier else 'N/A',
-                float(ticket.order_item.unit_price),
-                ticket.get_status_display(),
-                ticket.get_check_in_status_display(),
-                ticket.check_in_time.replace(tzinfo=None) if ticket.check_in_time else '',
-                ticket.check_in_by.get_full_name() if ticket.check_in_by else '',
-                ticket.get_approval_status_display() if ticket.approval_status else '',
-                ticket.approved_by.get_full_name() if ticket.approved_by else '',
-                ticket.approved_at.replace(tzinfo=None) if ticket.approved_at else '',
-                ticket.rejection_reason,
-                order.order_number,
-                order.get_status_display(),
-                order.payment_method,
-                float(order.total),
-                order.created_at.replace(tzinfo=None) if order.created_at else '',
-                order.updated_at.replace(tzinfo=None) if order.updated_at and order.is_paid else '',
-                order.phone,
-                f"{order.first_name} {order.last_name}".strip(),
-                order.ip_address or '',
-                order.coupon.code if order.coupon else '',
-                float(order.discount) if order.discount > 0 else 0
-            ]
-            
-            # Add custom form field values
-            for field in form_fields:
-                field_value = ''
-                if ticket.form_data and str(field.id) in ticket.form_data:
-                    field_value = ticket.form_data[str(field.id)]
-                data.append(field_value)
-            
-            for col, value in enumerate(data, 1):
-                ws.cell(row=row_num, column=col, value=value)
-        
-        # Auto-adjust column widths
-        for column in ws.columns:
-            max_length = 0
-            column_letter = get_column_letter(column[0].column)
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            ws.column_dimensions[column_letter].width = adjusted_width
-        
-        # Create response
-        response = HttpResponse(
-            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        )
-        response['Content-Disposition'] = f'attachment; filename="asistentes_{event.slug}_{timezone.now().strftime("%Y%m%d_%H%M%S")}.xlsx"'
-        
-        wb.save(response)
-        return response
-    
-    def _export_orders_csv(self, event, orders):
-        """Generate CSV export for orders"""
-        response = HttpResponse(content_type='text/csv; charset=utf-8')
-        response['Content-Disposition'] = f'attachment; filename="pedidos_{event.slug}_{timezone.now().strftime("%Y%m%d_%H%M%S")}.csv"'
-        
-        # Add BOM for proper UTF-8 encoding in Excel
-        response.write('\ufeff')
-        
-        writer = csv.writer(response)
-        
-        # Write header
-        header = [
-            'Número de Orden',
-            'Estado de Orden',
-            'Fecha de Creación',
-            'Fecha de Pago',
-            'Email del Comprador',
-            'Nombre del Comprador',
-            'Apellido del Comprador',
-            'Teléfono',
-            'Subtotal',
-            'Impuestos',
-            'Comisión de Servicio',
-            'Descuento',
-            'Total',
-            'Moneda',
-            'Método de Pago',
-            'ID de Transacción',
-            'Cupón Usado',
-            'Código de Cupón',
-            'IP de Compra',
-            'User Agent',
-            'Cantidad de Tickets',
-            'Tipos de Tickets',
-            'Precios Unitarios',
-            'Notas',
-            'Monto Reembolsado',
-            'Razón de Reembolso'
-        ]
-        
-        writer.writerow(header)
-        
-        # Write data rows
-        for order in orders:
-            # Aggregate ticket information
-            ticket_types = []
-            unit_prices = []
-            total_tickets = 0
-            
-            for item in order.items.all():
-                ticket_types.append(f"{item.ticket_tier.name} (x{item.quantity})")
-                unit_prices.append(f"{item.ticket_tier.name}: ${item.unit_price}")
-                total_tickets += item.quantity
-            
-            row = [
-                order.order_number,
-                order.get_status_display(),
-                order.created_at.strftime('%Y-%m-%d %H:%M:%S'),
-                order.updated_at.strftime('%Y-%m-%d %H:%M:%S') if order.is_paid else '',
-                order.email,
-                order.first_name,
-                order.last_name,
-                order.phone,
-                str(order.subtotal),
-                str(order.taxes),
-                str(order.service_fee),
-                str(order.discount),
-                str(order.total),
-                order.currency,
-                order.payment_method,
-                order.payment_id or '',
-                'Sí' if order.coupon else 'No',
-                order.coupon.code if order.coupon else '',
-                order.ip_address or '',
-                order.user_agent,
-                str(total_tickets),
-                '; '.join(ticket_types),
-                '; '.join(unit_prices),
-                order.notes,
-                str(order.refunded_amount),
-                order.refund_reason
-            ]
-            
-            writer.writerow(row)
-        
-        return response
-    
-    def _export_orders_excel(self, event, orders):
-        """Generate Excel export for orders"""
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Pedidos"
-        
-        # Define headers
-        headers = [
-            'Número de Orden',
-            'Estado de Orden',
-            'Fecha de Creación',
-            'Fecha de Pago',
-            'Email del Comprador',
-            'Nombre del Comprador',
-            'Apellido del Comprador',
-            'Teléfono',
-            'Subtotal',
-            'Impuestos',
-            'Comisión de Servicio',
-            'Descuento',
-            'Total',
-            'Moneda',
-            'Método de Pago',
-            'ID de Transacción',
-            'Cupón Usado',
-            'Código de Cupón',
-            'IP de Compra',
-            'User Agent',
-            'Cantidad de Tickets',
-            'Tipos de Tickets',
-            'Precios Unitarios',
-            'Notas',
-            'Monto Reembolsado',
-            'Razón de Reembolso'
-        ]
-        
-        # Style headers
-        header_font = Font(bold=True, color="FFFFFF")
-        header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-        header_alignment = Alignment(horizontal="center", vertical="center")
-        
-        # Write headers
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col, value=header)
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.alignment = header_alignment
-        
-        # Write data
-        for row_num, order in enumerate(orders, 2):
-            # Aggregate ticket information
-            ticket_types = []
-            unit_prices = []
-            total_tickets = 0
-            
-            for item in order.items.all():
-                ticket_types.append(f"{item.ticket_tier.name} (x{item.quantity})")
-                unit_prices.append(f"{item.ticket_tier.name}: ${item.unit_price}")
-                total_tickets += item.quantity
-            
-            data = [
-                order.order_number,
-                order.get_status_display(),
-                order.created_at.replace(tzinfo=None) if order.created_at else '',
-                order.updated_at.replace(tzinfo=None) if order.updated_at and order.is_paid else '',
-                order.email,
-                order.first_name,
-                order.last_name,
-                order.phone,
-                float(order.subtotal),
-                float(order.taxes),
-                float(order.service_fee),
-                float(order.discount),
-                float(order.total),
-                order.currency,
-                order.payment_method,
-                order.payment_id or '',
-                'Sí' if order.coupon else 'No',
-                order.coupon.code if order.coupon else '',
-                order.ip_address or '',
-                order.user_agent,
-                total_tickets,
-                '; '.join(ticket_types),
-                '; '.join(unit_prices),
-                order.notes,
-                float(order.refunded_amount),
-                order.refund_reason
-            ]
-            
-            for col, value in enumerate(data, 1):
-                ws.cell(row=row_num, column=col, value=value)
-        
-        # Auto-adjust column widths
-        for column in ws.columns:
-            max_length = 0
-            column_letter = get_column_letter(column[0].column)
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            ws.column_dimensions[column_letter].width = adjusted_width
-        
-        # Create response
-        response = HttpResponse(
-            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        )
-        response['Content-Disposition'] = f'attachment; filename="pedidos_{event.slug}_{timezone.now().strftime("%Y%m%d_%H%M%S")}.xlsx"'
-        
-        wb.save(response)
-        return response
+    def _export_response(self, request, event, kind, export_format):
+        """
+        Streamed CSV/XLSX, or with ?async=1 a background job that uploads the file to
+        storage; poll export_status?job_id= for the download link.
+        """
+        if request.query_params.get('async') in ('1', 'true'):
+            job = start_export_job(event, kind, export_format)
+            return Response(job, status=status.HTTP_202_ACCEPTED)
+        return build_export_response(event, kind, export_format)
 
     @action(detail=False, methods=['get'])
     def validation_stats(self, request):
@@ -5240,7 +4762,13 @@ class EventCommunicationViewSet(viewsets.ModelViewSet):
 
 @extend_schema(
     summary="Generate QR Code for Ticket",
-    description="Generate a professional QR code for ticket validation. Includes caching and security features.",
+    description=(
+        "QR code for ticket validation, served from the pre-rendered image store. "
+        "Pass ?stream=1 to stream the PNG instead of the JSON payload."
+    ),
+    parameters=[
+        OpenApiParameter(name='stream', type=bool, required=False, description="Stream the PNG image"),
+    ],
     responses={
         200: {
             "description": "QR code generated successfully",
@@ -5249,6 +4777,7 @@ class EventCommunicationViewSet(viewsets.ModelViewSet):
                     "example": {
                         "success": True,
                         "qr_code": "data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAA...",
+                        "qr_image_url": "https://storage.googleapis.com/bucket/tickets/qr/ab/ab12....png",
                         "ticket_number": "TIX-B382C943",
                         "ticket_url": "https://tuki.live/tickets/TIX-B382C943",
                         "expires_at": "2025-09-30T16:18:29Z",
@@ -5265,22 +4794,20 @@ class EventCommunicationViewSet(viewsets.ModelViewSet):
 @permission_classes([AllowAny])
 def generate_ticket_qr(request, ticket_number):
     """
-    🎫 ENTERPRISE: Generate professional QR code for ticket validation
+    🎫 ENTERPRISE: QR code for ticket validation
     
     Features:
-    - Cached QR generation for performance
+    - Pre-rendered QR image (generated when the order is paid), rendered and
+      stored on first request for older tickets
+    - Image URL in the configured storage, or streamed PNG with ?stream=1
     - Security hash for validation
     - Expiration timestamp
     - Professional error handling
-    - Rate limiting protection
     """
     try:
         from apps.events.models import Ticket
-        from apps.events.services import QRCodeService
-        from django.core.cache import cache
-        from django.utils import timezone
+        from apps.events.qr_generator import generate_ticket_qr as render_ticket_qr, get_ticket_qr_png, ticket_qr_url
         import hashlib
-        import json
         
         # Validate ticket exists and is active
         try:
@@ -5306,35 +4833,29 @@ def generate_ticket_qr(request, ticket_number):
                 'message': 'Ticket order is not paid'
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        # Create cache key with ticket data
-        cache_key = f"qr_code_{ticket_number}_{ticket.updated_at.timestamp()}"
-        
-        # Try to get from cache first
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            return Response(cached_data)
-        
-        # Generate security hash
-        security_data = f"{ticket_number}_{ticket.order_item.order.id}_{ticket.created_at.timestamp()}"
-        security_hash = hashlib.sha256(security_data.encode()).hexdigest()[:16]
-        
-        # Generate QR code
-        qr_code_base64 = QRCodeService.generate_qr_code(
-            ticket_number, 
-            size=250  # Higher quality for professional use
-        )
-        
-        if not qr_code_base64:
+        # Tickets from before the QR store (or whose background batch has not run yet)
+        if not (ticket.qr_code and ticket.qr_image) and not render_ticket_qr(ticket):
             return Response({
                 'success': False,
                 'error': 'QR_GENERATION_FAILED',
                 'message': 'Failed to generate QR code'
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
         
+        # ?format= is taken by DRF content negotiation
+        if request.query_params.get('stream') in ('1', 'true'):
+            response = HttpResponse(get_ticket_qr_png(ticket, settings.FRONTEND_URL), content_type='image/png')
+            response['Cache-Control'] = 'private, max-age=86400'
+            return response
+        
+        # Generate security hash
+        security_data = f"{ticket_number}_{ticket.order_item.order.id}_{ticket.created_at.timestamp()}"
+        security_hash = hashlib.sha256(security_data.encode()).hexdigest()[:16]
+        
         # Prepare response data
         response_data = {
             'success': True,
-            'qr_code': qr_code_base64,
+            'qr_code': f"data:image/png;base64,{ticket.qr_code}",
+            'qr_image_url': ticket_qr_url(ticket),
             'ticket_number': ticket_number,
             'ticket_url': f"{settings.FRONTEND_URL}/tickets/{ticket_number}",
             'expires_at': (timezone.now() + timezone.timedelta(days=30)).isoformat(),
@@ -5348,12 +4869,10 @@ def generate_ticket_qr(request, ticket_number):
             }
         }
         
-        # Cache for 1 hour
-        cache.set(cache_key, response_data, 3600)
-        
         return Response(response_data)
         
     except Exception as e:
+        logger.error(f"❌ [QR] Error serving QR for ticket {ticket_number}: {e}", exc_info=True)
         return Response({
             'success': False,
             'error': 'INTERNAL_ERROR',
@@ -6300,18 +5819,18 @@ def proxy_event_image(request):
     🎫 ENTERPRISE: Proxy endpoint to serve event images with CORS headers.
     
     This endpoint solves the CORS issue when html2canvas tries to load images
-    from Google Cloud Storage for PDF generation.
+    from Google Cloud Storage for PDF generation. Images are served from a local
+    disk cache (apps.events.image_proxy) and revalidated against GCS with their ETag.
     
     Usage:
         GET /api/v1/events/images/proxy/?url=https://storage.googleapis.com/...
+        GET /api/v1/events/images/proxy/?url=...&w=640&fmt=webp  (resized on the fly)
     
     Returns:
-        Image file with proper CORS headers
+        Image file with proper CORS headers (supports If-None-Match and Range)
     """
     import logging
-    import requests
-    from django.http import StreamingHttpResponse
-    from django.conf import settings
+    from apps.events import image_proxy
     
     logger = logging.getLogger(__name__)
     
@@ -6324,49 +5843,33 @@ def proxy_event_image(request):
         )
     
     # Validate that the URL is from our storage bucket (security)
-    allowed_domains = [
-        'storage.googleapis.com',
-        settings.GS_BUCKET_NAME if hasattr(settings, 'GS_BUCKET_NAME') else None,
-    ]
-    allowed_domains = [d for d in allowed_domains if d]
-    
-    if not any(domain in image_url for domain in allowed_domains):
+    if not image_proxy.is_allowed_url(image_url):
         return Response(
             {'error': 'Invalid image URL domain'}, 
             status=status.HTTP_400_BAD_REQUEST
         )
     
+    width = request.GET.get('w')
+    if width is not None:
+        try:
+            width = int(width)
+        except ValueError:
+            width = 0
+        if width <= 0:
+            return Response(
+                {'error': 'w must be a positive integer'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+    
     try:
-        # Fetch the image from Google Cloud Storage
-        response = requests.get(image_url, stream=True, timeout=10)
-        response.raise_for_status()
-        
-        # Determine content type from response or default to image/jpeg
-        content_type = response.headers.get('Content-Type', 'image/jpeg')
-        
-        # Create streaming response with CORS headers
-        proxy_response = StreamingHttpResponse(
-            response.iter_content(chunk_size=8192),
-            content_type=content_type
-        )
-        
-        # Add CORS headers to allow cross-origin requests
-        proxy_response['Access-Control-Allow-Origin'] = '*'
-        proxy_response['Access-Control-Allow-Methods'] = 'GET, OPTIONS'
-        proxy_response['Access-Control-Allow-Headers'] = 'Content-Type'
-        proxy_response['Cache-Control'] = 'public, max-age=86400'  # Cache for 24 hours
-        
-        # Copy content length if available
-        if 'Content-Length' in response.headers:
-            proxy_response['Content-Length'] = response.headers['Content-Length']
-        
-        return proxy_response
+        image = image_proxy.fetch_image(image_url, width=width, fmt=request.GET.get('fmt'))
+        return image_proxy.build_response(request, image)
         
-    except requests.exceptions.RequestException as e:
+    except image_proxy.ProxyError as e:
         logger.error(f"❌ [IMAGE_PROXY] Error fetching image {image_url}: {e}")
         return Response(
             {'error': 'Failed to fetch image'}, 
-            status=status.HTTP_502_BAD_GATEWAY
+            status=e.status
         )
     except Exception as e:
         logger.error(f"❌ [IMAGE_PROXY] Unexpected error: {e}", exc_info=True)
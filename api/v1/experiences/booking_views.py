@@ -205,25 +205,6 @@ def calculate_capacity_units(adult_count, child_count, infant_count, rule):
     return adult_count + child_count + infant_count  # default
 
 
-def cleanup_expired_holds(instance):
-    """Release expired holds for an instance."""
-    now = timezone.now()
-    
-    # Release expired capacity holds
-    ExperienceCapacityHold.objects.filter(
-        instance=instance,
-        released=False,
-        expires_at__lt=now
-    ).update(released=True, released_at=now)
-    
-    # Release expired resource holds
-    ExperienceResourceHold.objects.filter(
-        instance=instance,
-        released=False,
-        expires_at__lt=now
-    ).update(released=True, released_at=now)
-
-
 def check_capacity_available(instance, capacity_units_needed, exclude_reservation_id=None):
     """
     Check if capacity is available (atomic check).
@@ -353,8 +334,7 @@ class PublicExperienceReserveView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Cleanup expired holds
-        cleanup_expired_holds(instance)
+        # Expired holds are ignored by the checks below and released by the hold sweeper
         
         # Calculate capacity needed
         capacity_units = calculate_capacity_units(
@@ -22,6 +22,7 @@ from apps.experiences.models import (
 )
 from apps.experiences.serializers import (
     ExperienceSerializer,
+    PublicExperienceSerializer,
     TourLanguageSerializer,
     TourInstanceSerializer,
     TourBookingSerializer,
@@ -790,7 +791,7 @@ class PublicExperienceListView(APIView):
             imported_review_sum=Sum('imported_reviews__rating'),
         )
 
-        serializer = ExperienceSerializer(queryset, many=True)
+        serializer = PublicExperienceSerializer(queryset, many=True)
         return Response(serializer.data)
 
 
@@ -856,7 +857,7 @@ class PublicExperienceDetailView(APIView):
             imported_review_sum=Sum('imported_reviews__rating'),
         ).first()
 
-        serializer = ExperienceSerializer(experience)
+        serializer = PublicExperienceSerializer(experience)
         return Response(serializer.data)
 
 
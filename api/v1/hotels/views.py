@@ -4,9 +4,8 @@ from datetime import datetime
 from rest_framework import permissions, status
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from django.db.models import Exists, OuterRef
 
-from apps.accommodations.models import Accommodation, AccommodationBlockedDate, AccommodationReservation, Hotel
+from apps.accommodations.models import Accommodation, Hotel
 from apps.accommodations.serializers import resolve_room_public_payload, _build_images_from_gallery_items
 
 
@@ -169,20 +168,7 @@ class PublicHotelRoomsView(APIView):
             qs = qs.filter(guests__gte=guests)
 
         if check_in and check_out and check_out > check_in:
-            blocked_subq = AccommodationBlockedDate.objects.filter(
-                accommodation_id=OuterRef("id"),
-                date__gte=check_in,
-                date__lt=check_out,
-            )
-            qs = qs.exclude(Exists(blocked_subq))
-            overlapping = AccommodationReservation.objects.filter(
-                accommodation_id=OuterRef("id"),
-                status__in=("pending", "paid"),
-            ).filter(
-                check_in__lt=check_out,
-                check_out__gt=check_in,
-            )
-            qs = qs.exclude(Exists(overlapping))
+            qs = qs.available_between(check_in, check_out)
 
         qs = qs.order_by("-rating_avg", "-created_at")
         data = [resolve_room_public_payload(acc, request) for acc in qs]
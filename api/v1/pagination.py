@@ -1,6 +1,15 @@
 """Shared pagination classes for API v1."""
 
-from rest_framework.pagination import PageNumberPagination
+import base64
+import json
+from collections import OrderedDict
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 
 
 class LargePageSizePagination(PageNumberPagination):
@@ -12,3 +21,106 @@ class LargePageSizePagination(PageNumberPagination):
     page_size_query_param = 'page_size'
     max_page_size = 5000
     page_query_param = 'page'
+
+
+class KeysetCursorPagination(BasePagination):
+    """
+    🚀 ENTERPRISE: Forward-only cursor pagination on a composite key (keyset / seek).
+
+    The cursor encodes the ordering values of the last row of the page and the next
+    page is `WHERE (key) < (cursor) ORDER BY key LIMIT n`, so every page is one
+    index range scan regardless of depth (no OFFSET, unlike PageNumberPagination,
+    and no offset fallback on ties, unlike DRF's CursorPagination).
+
+    `ordering` must end with a unique field (e.g. '-id') and its fields must be non-null
+    (annotate a Coalesce for nullable columns; annotations are valid ordering fields).
+    Response: {"next": url|null, "results": [...]}.
+    """
+    ordering = ('-created_at', '-id')
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+
+        queryset = queryset.order_by(*self.ordering)
+        position = self.decode_cursor(request, queryset)
+        if position is not None:
+            queryset = queryset.filter(self._after(position))
+
+        rows = list(queryset[: self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        self.next_position = self._position(rows[-1]) if self.has_next else None
+        return rows
+
+    def get_page_size(self, request):
+        raw = request.query_params.get(self.page_size_query_param)
+        try:
+            size = int(raw) if raw else self.page_size
+        except (TypeError, ValueError):
+            size = self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('results', data),
+        ]))
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.next_position))
+
+    # ------------------------------------------------------------------
+    # Cursor encoding
+    # ------------------------------------------------------------------
+
+    def _fields(self):
+        return [(name.lstrip('-'), name.startswith('-')) for name in self.ordering]
+
+    def _position(self, obj):
+        return [getattr(obj, name) for name, _ in self._fields()]
+
+    def encode_cursor(self, position):
+        payload = json.dumps([None if v is None else str(v) for v in position], separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+    @staticmethod
+    def _output_field(queryset, name):
+        annotation = queryset.query.annotations.get(name)
+        if annotation is not None:
+            return annotation.output_field
+        return queryset.model._meta.get_field(name)
+
+    def decode_cursor(self, request, queryset):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            padded = encoded + '=' * (-len(encoded) % 4)
+            raw = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8'))
+            fields = self._fields()
+            if not isinstance(raw, list) or len(raw) != len(fields):
+                raise ValueError(encoded)
+            return [
+                self._output_field(queryset, name).to_python(value)
+                for (name, _), value in zip(fields, raw)
+            ]
+        except (TypeError, ValueError, ValidationError, UnicodeDecodeError):
+            raise NotFound('Invalid cursor')
+
+    def _after(self, position):
+        """(a, b, c) after (x, y, z) in ordering: a>x OR (a=x AND b>y) OR ... (per direction)."""
+        condition = Q()
+        equal = {}
+        for (name, descending), value in zip(self._fields(), position):
+            lookup = f"{name}__lt" if descending else f"{name}__gt"
+            condition |= Q(**equal, **{lookup: value})
+            equal[name] = value
+        return condition
@@ -4,9 +4,8 @@ from datetime import datetime
 from rest_framework import permissions, status
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from django.db.models import Q, Exists, OuterRef
 
-from apps.accommodations.models import Accommodation, AccommodationBlockedDate, AccommodationReservation, RentalHub
+from apps.accommodations.models import Accommodation, RentalHub
 from apps.accommodations.serializers import PublicAccommodationListSerializer
 
 
@@ -131,22 +130,7 @@ class PublicRentalHubAccommodationsView(APIView):
 
         # Filter by availability when dates are provided
         if check_in and check_out and check_out > check_in:
-            # Exclude accommodations that have any blocked date in [check_in, check_out)
-            blocked_subq = AccommodationBlockedDate.objects.filter(
-                accommodation_id=OuterRef("id"),
-                date__gte=check_in,
-                date__lt=check_out,
-            )
-            qs = qs.exclude(Exists(blocked_subq))
-            # Exclude accommodations with overlapping reservation (pending or paid)
-            overlapping = AccommodationReservation.objects.filter(
-                accommodation_id=OuterRef("id"),
-                status__in=("pending", "paid"),
-            ).filter(
-                check_in__lt=check_out,
-                check_out__gt=check_in,
-            )
-            qs = qs.exclude(Exists(overlapping))
+            qs = qs.available_between(check_in, check_out)
 
         qs = qs.order_by("tower", "floor", "unit_number", "-rating_avg", "-created_at")
         serializer = PublicAccommodationListSerializer(qs, many=True, context={"request": request})
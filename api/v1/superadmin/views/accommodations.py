@@ -33,7 +33,9 @@ from apps.accommodations.models import (
 from apps.accommodations.constants import ROOM_CATEGORIES
 from apps.accommodations.public_code_service import ensure_public_code_on_publish
 from apps.accommodations.serializers import _normalize_media_url
+from apps.media.derivatives import derivatives_enabled
 from apps.media.models import MediaAsset
+from apps.media.tasks import enqueue_media_derivatives
 from apps.organizers.models import Organizer
 
 from ..permissions import IsSuperUser
@@ -1155,7 +1157,10 @@ def bulk_upload_gallery_zip(request):
                     )
                     try:
                         asset.file.save(filename, ContentFile(data), save=True)
-                        asset.generate_thumbnail()
+                        if derivatives_enabled():
+                            enqueue_media_derivatives(asset.id)
+                        else:
+                            asset.generate_thumbnail()
                         if tags_list:
                             asset.tags = tags_list
                             asset.save(update_fields=["tags"])
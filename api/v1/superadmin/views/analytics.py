@@ -7,15 +7,14 @@ from datetime import timedelta
 import logging
 
 from django.contrib.auth import get_user_model
-from django.db.models import Count, F, Min, Sum, Q
-from django.db.models.functions import Coalesce, TruncDate
+from django.db.models import Count, Sum, Q
 from django.utils import timezone
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 
 from apps.events.models import Order, Event, OrderItem
-from apps.organizers.models import Organizer
+from core import platform_analytics
 from core.revenue_system import order_revenue_eligible_q
 
 from ..permissions import IsSuperUser
@@ -39,62 +38,8 @@ def _parse_range(range_param):
 
 
 def _first_activity_date():
-    """
-    Fecha más antigua con actividad contable: primera orden con revenue, primer usuario,
-    primer alojamiento, primera experiencia, primer organizador.
-    Así "Todo" solo muestra desde que la plataforma tiene datos reales.
-    """
-    end = timezone.now().date()
-    candidates = []
-    # Primera orden con revenue
-    first_order = (
-        Order.objects.filter(order_revenue_eligible_q())
-        .exclude(order_kind="erasmus_activity")
-        .aggregate(m=Min("created_at"))
-    )
-    if first_order.get("m"):
-        candidates.append(first_order["m"].date())
-    # Primer usuario
-    first_user = User.objects.aggregate(m=Min("date_joined"))
-    if first_user.get("m"):
-        candidates.append(first_user["m"].date())
-    # Primer organizador
-    first_org = Organizer.objects.aggregate(m=Min("created_at"))
-    if first_org.get("m"):
-        candidates.append(first_org["m"].date())
-    try:
-        from apps.accommodations.models import Accommodation
-        first_acc = Accommodation.objects.aggregate(m=Min("created_at"))
-        if first_acc.get("m"):
-            candidates.append(first_acc["m"].date())
-    except Exception:
-        pass
-    try:
-        from apps.experiences.models import Experience
-        first_exp = Experience.objects.aggregate(m=Min("created_at"))
-        if first_exp.get("m"):
-            candidates.append(first_exp["m"].date())
-    except Exception:
-        pass
-    try:
-        from apps.erasmus.models import ErasmusActivityInscriptionPayment
-        first_erasmus = ErasmusActivityInscriptionPayment.objects.filter(
-            exclude_from_revenue=False
-        ).aggregate(m=Min("created_at"))
-        if first_erasmus.get("m"):
-            candidates.append(first_erasmus["m"].date())
-    except Exception:
-        pass
-    try:
-        from apps.car_rental.models import Car
-        first_car = Car.objects.aggregate(m=Min("created_at"))
-        if first_car.get("m"):
-            candidates.append(first_car["m"].date())
-    except Exception:
-        pass
-    if not candidates:
-        return end - timedelta(days=365)
-    return min(candidates)
+    """Fecha más antigua con actividad contable (ver core.platform_analytics.first_activity_date)."""
+    return platform_analytics.first_activity_date()
 
 
 @api_view(['GET'])
@@ -415,100 +360,14 @@ def organizer_sales(request):
         Lista de organizadores con sus ventas y comisiones generadas
     """
     try:
-        organizer_id = request.query_params.get('organizer_id')
-        
-        # Base queryset de organizadores
-        organizers_qs = Organizer.objects.all()
-        
-        if organizer_id:
-            organizers_qs = organizers_qs.filter(id=organizer_id)
-        
-        # Calcular ventas por organizador
-        organizers_data = []
-        
-        for organizer in organizers_qs:
-            # Obtener todas las órdenes pagadas de eventos de este organizador (revenue-eligible)
-            paid_orders = Order.objects.filter(
-                event__organizer=organizer,
-            ).filter(order_revenue_eligible_q())
-            
-            # Calcular totales
-            sales_data = paid_orders.aggregate(
-                total_sales=Sum('subtotal'),
-                total_fees=Sum('service_fee'),
-                orders_count=Count('id')
-            )
-            
-            total_sales = float(sales_data['total_sales'] or 0)
-            total_fees = float(sales_data['total_fees'] or 0)
-            orders_count = sales_data['orders_count'] or 0
-            
-            # Calcular tasa de comisión promedio
-            avg_fee_percentage = 0
-            if total_sales > 0:
-                avg_fee_percentage = (total_fees / total_sales) * 100
-            
-            # 🚀 Contar productos por tipo
-            events_count = Event.objects.filter(organizer=organizer, deleted_at__isnull=True).count()
-            
-            experiences_count = 0
-            if organizer.has_experience_module:
-                try:
-                    from apps.experiences.models import Experience
-                    experiences_count = Experience.objects.filter(organizer=organizer, deleted_at__isnull=True).count()
-                except Exception:
-                    pass
-            
-            accommodations_count = 0
-            if organizer.has_accommodation_module:
-                try:
-                    from apps.accommodations.models import Accommodation
-                    accommodations_count = Accommodation.objects.filter(organizer=organizer, deleted_at__isnull=True).count()
-                except Exception:
-                    pass
-            
-            # 🚀 Service fee efectivo (siguiendo jerarquía)
-            effective_service_fee_rate = float(organizer.default_service_fee_rate) if organizer.default_service_fee_rate is not None else 0.15
-            service_fee_source = 'organizer' if organizer.default_service_fee_rate is not None else 'platform'
-            
-            # Normalize legacy template values
-            template = organizer.experience_dashboard_template
-            if template == 'standard':
-                template = 'v0'
-            elif template == 'free_tours':
-                template = 'principal'
-            
-            organizers_data.append({
-                'organizer_id': str(organizer.id),
-                'organizer_name': organizer.name,
-                'organizer_email': organizer.contact_email,
-                'total_sales': total_sales,
-                'total_service_fees': total_fees,
-                'gross_total': total_sales + total_fees,
-                'orders_count': orders_count,
-                'average_fee_percentage': round(avg_fee_percentage, 2),
-                # 🚀 Service fee configurado (puede ser null)
-                'default_service_fee_rate': float(organizer.default_service_fee_rate) if organizer.default_service_fee_rate is not None else None,
-                # 🚀 Service fee efectivo
-                'effective_service_fee_rate': effective_service_fee_rate,
-                'service_fee_source': service_fee_source,
-                'status': organizer.status,
-                # 🚀 Módulos activos
-                'has_events_module': organizer.has_events_module,
-                'has_experience_module': organizer.has_experience_module,
-                'has_accommodation_module': organizer.has_accommodation_module,
-                # 🚀 Centro de Alumnos
-                'is_student_center': organizer.is_student_center,
-                # 🚀 Template de dashboard de experiencias (normalizado)
-                'experience_dashboard_template': template,
-                # 🚀 Conteos de productos
-                'events_count': events_count,
-                'experiences_count': experiences_count,
-                'accommodations_count': accommodations_count,
-            })
-        
-        # Ordenar por ventas totales descendente
-        organizers_data.sort(key=lambda x: x['total_sales'], reverse=True)
+        organizer_id = request.query_params.get('organizer_id') or None
+
+        # 🚀 ENTERPRISE: grouped aggregates (constant number of queries), cached per filter
+        organizers_data = platform_analytics.cached(
+            'organizer_sales',
+            {'organizer_id': organizer_id},
+            lambda: platform_analytics.organizer_sales_rows(organizer_id),
+        )
         
         logger.info(f"✅ [SuperAdmin] Organizer sales calculated for {len(organizers_data)} organizers")
         
@@ -570,182 +429,20 @@ def dashboard_time_series(request):
                 range_param = "30d"
             start_date, end_date = _parse_range(range_param)
             if range_param == "all":
-                start_date = _first_activity_date()
+                start_date = None  # resolved (and cached) with the series: first activity date
             end_date = min(end_date, today)
 
-        # --- Revenue por día: efectivo (service_fee_effective, con descuentos/impuestos) o fallback a service_fee
-        paid_orders = (
-            Order.objects.filter(order_revenue_eligible_q())
-            .exclude(order_kind="erasmus_activity")
-            .filter(created_at__date__gte=start_date, created_at__date__lte=end_date)
-        )
-        revenue_by_date = (
-            paid_orders.annotate(day=TruncDate("created_at"))
-            .values("day")
-            .annotate(revenue=Sum(Coalesce(F("service_fee_effective"), F("service_fee"))))
-            .order_by("day")
-        )
-        revenue_map = {item["day"].isoformat() if item["day"] else None: float(item["revenue"] or 0) for item in revenue_by_date if item["day"]}
-
-        # Erasmus: ingresos plataforma (si hay fee o monto que cuente como revenue)
-        try:
-            from apps.erasmus.models import ErasmusActivityInscriptionPayment
-            erasmus_by_date = (
-                ErasmusActivityInscriptionPayment.objects.filter(exclude_from_revenue=False)
-                .filter(created_at__date__gte=start_date, created_at__date__lte=end_date)
-                .annotate(day=TruncDate("created_at"))
-                .values("day")
-                .annotate(amount=Sum("amount"))
-                .order_by("day")
-            )
-            for item in erasmus_by_date:
-                if item["day"]:
-                    k = item["day"].isoformat()
-                    revenue_map[k] = revenue_map.get(k, 0) + float(item["amount"] or 0)
-        except Exception:
-            pass
-
-        # Build sorted list of all days in range
-        days = []
-        d = start_date
-        while d <= end_date:
-            days.append(d)
-            d += timedelta(days=1)
-        day_strs = [d.isoformat() for d in days]
-
-        revenue_series = []
-        cumulative = 0
-        for day_str in day_strs:
-            rev = revenue_map.get(day_str, 0)
-            cumulative += rev
-            revenue_series.append({
-                "date": day_str,
-                "value": round(rev, 0),
-                "cumulative": round(cumulative, 0),
-            })
-
-        # --- Usuarios por día (date_joined)
-        users_agg = (
-            User.objects.filter(date_joined__date__gte=start_date, date_joined__date__lte=end_date)
-            .annotate(day=TruncDate("date_joined"))
-            .values("day")
-            .annotate(count=Count("id"))
-            .order_by("day")
+        # 🚀 ENTERPRISE: one GROUP BY day per entity, cached per (range, dates)
+        data = platform_analytics.cached(
+            "dashboard_time_series",
+            {"range": range_param, "start_date": start_date, "end_date": end_date},
+            lambda: platform_analytics.dashboard_time_series_data(start_date, end_date),
         )
-        users_map = {item["day"].isoformat() if item["day"] else None: item["count"] for item in users_agg if item["day"]}
-        # Cumulative: total users up to each day (users with date_joined <= day)
-        users_series = []
-        cum_users = 0
-        for day_str in day_strs:
-            new_count = users_map.get(day_str, 0)
-            cum_users += new_count
-            users_series.append({"date": day_str, "value": new_count, "cumulative": cum_users})
-
-        # --- Alojamientos por día (created_at)
-        try:
-            from apps.accommodations.models import Accommodation
-            acc_agg = (
-                Accommodation.objects.filter(created_at__date__gte=start_date, created_at__date__lte=end_date)
-                .annotate(day=TruncDate("created_at"))
-                .values("day")
-                .annotate(count=Count("id"))
-                .order_by("day")
-            )
-            acc_map = {item["day"].isoformat() if item["day"] else None: item["count"] for item in acc_agg if item["day"]}
-        except Exception:
-            acc_map = {}
-        acc_cum = 0
-        accommodations_series = []
-        for day_str in day_strs:
-            new_count = acc_map.get(day_str, 0)
-            acc_cum += new_count
-            accommodations_series.append({"date": day_str, "value": new_count, "cumulative": acc_cum})
-
-        # --- Experiencias por día (created_at)
-        try:
-            from apps.experiences.models import Experience
-            exp_agg = (
-                Experience.objects.filter(created_at__date__gte=start_date, created_at__date__lte=end_date)
-                .annotate(day=TruncDate("created_at"))
-                .values("day")
-                .annotate(count=Count("id"))
-                .order_by("day")
-            )
-            exp_map = {item["day"].isoformat() if item["day"] else None: item["count"] for item in exp_agg if item["day"]}
-        except Exception:
-            exp_map = {}
-        exp_cum = 0
-        experiences_series = []
-        for day_str in day_strs:
-            new_count = exp_map.get(day_str, 0)
-            exp_cum += new_count
-            experiences_series.append({"date": day_str, "value": new_count, "cumulative": exp_cum})
-
-        # --- Organizadores por día (created_at)
-        org_agg = (
-            Organizer.objects.filter(created_at__date__gte=start_date, created_at__date__lte=end_date)
-            .annotate(day=TruncDate("created_at"))
-            .values("day")
-            .annotate(count=Count("id"))
-            .order_by("day")
-        )
-        org_map = {item["day"].isoformat() if item["day"] else None: item["count"] for item in org_agg if item["day"]}
-        org_cum = 0
-        organizers_series = []
-        for day_str in day_strs:
-            new_count = org_map.get(day_str, 0)
-            org_cum += new_count
-            organizers_series.append({"date": day_str, "value": new_count, "cumulative": org_cum})
-
-        # --- Transportes (autos/vehículos rent-a-car) por día (created_at)
-        try:
-            from apps.car_rental.models import Car
-            car_agg = (
-                Car.objects.filter(created_at__date__gte=start_date, created_at__date__lte=end_date)
-                .annotate(day=TruncDate("created_at"))
-                .values("day")
-                .annotate(count=Count("id"))
-                .order_by("day")
-            )
-            car_map = {item["day"].isoformat() if item["day"] else None: item["count"] for item in car_agg if item["day"]}
-        except Exception:
-            car_map = {}
-        car_cum = 0
-        transports_series = []
-        for day_str in day_strs:
-            new_count = car_map.get(day_str, 0)
-            car_cum += new_count
-            transports_series.append({"date": day_str, "value": new_count, "cumulative": car_cum})
-
-        # Summary: últimos 7 y 30 días (para tarjetas: "Última semana", "Último mes")
-        n = len(revenue_series)
-        rev_7 = sum(p["value"] for p in revenue_series[-7:]) if n >= 1 else 0
-        rev_30 = sum(p["value"] for p in revenue_series[-30:]) if n >= 1 else 0
-        users_7 = sum(p["value"] for p in users_series[-7:]) if len(users_series) >= 1 else 0
-        users_30 = sum(p["value"] for p in users_series[-30:]) if len(users_series) >= 1 else 0
-        org_7 = sum(p["value"] for p in organizers_series[-7:]) if len(organizers_series) >= 1 else 0
-        org_30 = sum(p["value"] for p in organizers_series[-30:]) if len(organizers_series) >= 1 else 0
-        summary = {
-            "revenue_last_7d": round(rev_7, 0),
-            "revenue_last_30d": round(rev_30, 0),
-            "users_new_7d": users_7,
-            "users_new_30d": users_30,
-            "organizers_new_7d": org_7,
-            "organizers_new_30d": org_30,
-        }
 
         return Response({
             "success": True,
             "range": range_param,
-            "start_date": start_date.isoformat(),
-            "end_date": end_date.isoformat(),
-            "revenue": revenue_series,
-            "users": users_series,
-            "accommodations": accommodations_series,
-            "experiences": experiences_series,
-            "organizers": organizers_series,
-            "transports": transports_series,
-            "summary": summary,
+            **data,
         }, status=status.HTTP_200_OK)
 
     except Exception as e:
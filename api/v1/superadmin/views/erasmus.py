@@ -38,6 +38,7 @@ from apps.erasmus.models import (
 from apps.whatsapp.models import WhatsAppChat
 from apps.media.models import MediaAsset
 from apps.erasmus.whatsapp_og import fetch_whatsapp_group_image
+from apps.erasmus.inscriptions import inscribed_count as inscribed_count_for, inscribed_counts, inscribed_leads
 from apps.experiences.models import Experience
 from apps.erasmus.lead_import import (
     normalize_lead,
@@ -831,9 +832,7 @@ def _format_time(t):
 def _instance_detail_response(inst, inscribed_count=None):
     """Build JSON response for one ErasmusActivityInstance (GET/PATCH)."""
     if inscribed_count is None:
-        inscribed_count = ErasmusLead.objects.filter(
-            interested_experiences__contains=[str(inst.id)]
-        ).count()
+        inscribed_count = inscribed_count_for(inst)
     return {
         "id": str(inst.id),
         "scheduled_date": inst.scheduled_date.isoformat() if inst.scheduled_date else None,
@@ -997,10 +996,10 @@ def _activity_to_dict(act, include_instances=False):
     }
     if include_instances:
         data["instances"] = []
-        for inst in act.instances.order_by("display_order", "scheduled_date", "scheduled_year", "scheduled_month"):
-            inscribed_count = ErasmusLead.objects.filter(
-                interested_experiences__contains=[str(inst.id)]
-            ).count()
+        instances = list(act.instances.order_by("display_order", "scheduled_date", "scheduled_year", "scheduled_month"))
+        counts = inscribed_counts([inst.id for inst in instances])
+        for inst in instances:
+            inscribed_count = counts[str(inst.id)]
             data["instances"].append({
                 "id": str(inst.id),
                 "scheduled_date": inst.scheduled_date.isoformat() if inst.scheduled_date else None,
@@ -1395,10 +1394,12 @@ class ErasmusActivityInstanceListCreateView(APIView):
         except ErasmusActivity.DoesNotExist:
             return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
         instances = []
-        for inst in act.instances.order_by("display_order", "scheduled_date", "scheduled_year", "scheduled_month"):
-            inscribed_count = ErasmusLead.objects.filter(
-                interested_experiences__contains=[str(inst.id)]
-            ).count()
+        activity_instances = list(
+            act.instances.order_by("display_order", "scheduled_date", "scheduled_year", "scheduled_month")
+        )
+        counts = inscribed_counts([inst.id for inst in activity_instances])
+        for inst in activity_instances:
+            inscribed_count = counts[str(inst.id)]
             instances.append({
                 "id": str(inst.id),
                 "scheduled_date": inst.scheduled_date.isoformat() if inst.scheduled_date else None,
@@ -1511,10 +1512,7 @@ class ErasmusActivityInstanceDetailView(APIView):
             inst = ErasmusActivityInstance.objects.get(id=instance_id, activity_id=activity_id)
         except ErasmusActivityInstance.DoesNotExist:
             return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
-        inscribed_count = ErasmusLead.objects.filter(
-            interested_experiences__contains=[str(inst.id)]
-        ).count()
-        return Response(_instance_detail_response(inst, inscribed_count))
+        return Response(_instance_detail_response(inst))
 
     def patch(self, request, activity_id, instance_id):
         try:
@@ -1587,11 +1585,7 @@ class ErasmusActivityInstanceInscriptionsView(APIView):
         extra_field_defs = list(
             ErasmusActivityExtraField.objects.filter(activity=act, is_active=True).order_by("order", "id")
         )
-        lead_ids = list(
-            ErasmusLead.objects.filter(
-                interested_experiences__contains=[str(inst.id)]
-            ).values_list("id", flat=True)
-        )
+        lead_ids = list(inscribed_leads(inst).values_list("id", flat=True))
         registrations_by_lead = {
             r.lead_id: r
             for r in ErasmusActivityInstanceRegistration.objects.filter(
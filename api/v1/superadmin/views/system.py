@@ -293,8 +293,12 @@ def celery_tasks_list(request):
     - task_name
     - status
     - date range
+    
+    With CELERY_TELEMETRY['MODE'] = 'aggregate' logs are a sample (plus failures and
+    flow tasks); counts and per-task timings come from CeleryTaskStat.
     """
     try:
+        from core import celery_telemetry
         from core.models import CeleryTaskLog
         from datetime import timedelta
         
@@ -322,6 +326,16 @@ def celery_tasks_list(request):
         status_counts = CeleryTaskLog.objects.filter(
             created_at__gte=start_date
         ).values('status').annotate(count=Count('id'))
+        status_counts = {item['status']: item['count'] for item in status_counts}
+        total = None
+        task_stats = None
+        
+        if celery_telemetry.aggregate_enabled():
+            stats = celery_telemetry.task_stats(start_date, task_name=task_name, status=task_status)
+            # In-flight executions are only visible as sampled 'started' logs
+            status_counts = {**celery_telemetry.status_counts(start_date), 'started': status_counts.get('started', 0)}
+            total = stats['total']
+            task_stats = stats['tasks']
         
         return Response({
             'success': True,
@@ -338,8 +352,10 @@ def celery_tasks_list(request):
                 'order_id': str(log.order.id) if log.order else None,
                 'order_number': log.order.order_number if log.order else None
             } for log in logs],
-            'status_counts': {item['status']: item['count'] for item in status_counts},
-            'total': query.count()
+            'status_counts': status_counts,
+            'total': total if total is not None else query.count(),
+            'task_stats': task_stats,
+            'telemetry_mode': 'aggregate' if task_stats is not None else 'log',
         })
         
     except Exception as e:
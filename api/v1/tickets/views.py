@@ -228,20 +228,14 @@ class TicketTierManagementViewSet(viewsets.ModelViewSet):
             
             now = timezone.now()
             
-            # Find expired holds
-            expired_holds = TicketHold.objects.filter(
+            # Release expired holds (one UPDATE for holds, one for tier availability)
+            released_count, returned = TicketHold.objects.filter(
                 ticket_tier=ticket_tier,
                 released=False,
                 expires_at__lte=now
-            )
-            
-            released_count = 0
-            freed_tickets = 0
-            
-            for hold in expired_holds:
-                freed_tickets += hold.quantity
-                hold.release()  # This updates tier.available
-                released_count += 1
+            ).release()
+            freed_tickets = sum(returned.values())
+            ticket_tier.refresh_from_db(fields=['available'])
             
             return Response({
                 'ticket_tier_id': str(ticket_tier.id),
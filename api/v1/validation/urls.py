@@ -15,14 +15,18 @@ urlpatterns = [
     # 🚀 ENTERPRISE VALIDATION ENDPOINTS
     path('validator/session/start/', views.start_validator_session, name='start-validator-session'),
     path('validator/ticket/validate/', views.validate_ticket_enterprise, name='validate-ticket-enterprise'),
-    path('validator/ticket/<int:ticket_id>/checkin/', views.checkin_ticket_enterprise, name='checkin-ticket-enterprise'),
+    path('validator/ticket/<uuid:ticket_id>/checkin/', views.checkin_ticket_enterprise, name='checkin-ticket-enterprise'),
     
     # Endpoints adicionales para el sistema completo
-    path('validator/session/<int:session_id>/end/', views.end_validator_session, name='end-validator-session'),
+    path('validator/session/<uuid:session_id>/end/', views.end_validator_session, name='end-validator-session'),
     path('validator/session/<int:session_id>/stats/', views.get_session_stats, name='get-session-stats'),
-    path('validator/ticket/<int:ticket_id>/notes/', views.add_ticket_note, name='add-ticket-note'),
+    path('validator/ticket/<uuid:ticket_id>/notes/', views.add_ticket_note, name='add-ticket-note'),
     path('validator/event/<int:event_id>/tickets/', views.get_event_tickets, name='get-event-tickets'),
     path('validator/event/<int:event_id>/stats/', views.get_event_validation_stats, name='get-event-validation-stats'),
+
+    # Offline sync para dispositivos validadores
+    path('validator/event/<uuid:event_id>/sync/', views.get_event_ticket_snapshot, name='event-ticket-snapshot'),
+    path('validator/session/<uuid:session_id>/sync/', views.sync_offline_checkins, name='sync-offline-checkins'),
     
     # Include router URLs
     path('', include(router.urls)),
@@ -8,11 +8,13 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
+from django.conf import settings
 from django.utils import timezone
-from django.db import transaction
 from django.db.models import Q, Count, Sum
 from apps.events.models import Event, Ticket
 from apps.organizers.models import Organizer, OrganizerUser
+from apps.validation import engine as validation_engine
+from apps.validation import sync as offline_sync
 from apps.validation.models import ValidatorSession, TicketValidationLog, TicketNote, EventValidationStats
 from apps.validation.serializers import (
     ValidatorSessionSerializer, TicketValidationLogSerializer,
@@ -24,6 +26,9 @@ import json
 from datetime import datetime, timedelta
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from drf_spectacular.types import OpenApiTypes
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 @extend_schema(
@@ -52,14 +57,17 @@ def start_validator_session(request):
         
         # Validar evento
         event_id = request.data.get('event_id')
-        event = Event.objects.get(id=event_id, organizer=organizer)
+        event = Event.objects.select_related('location').get(id=event_id, organizer=organizer)
         
         # Cerrar sesiones activas previas
-        ValidatorSession.objects.filter(
+        previous_sessions = ValidatorSession.objects.filter(
             user=request.user,
             event=event,
             is_active=True
-        ).update(is_active=False, end_time=timezone.now())
+        )
+        for previous_id in previous_sessions.values_list('id', flat=True):
+            validation_engine.forget_session(previous_id)
+        previous_sessions.update(is_active=False, end_time=timezone.now())
         
         # Crear nueva sesión
         session = ValidatorSession.objects.create(
@@ -71,6 +79,11 @@ def start_validator_session(request):
             location=request.data.get('location', {})
         )
         
+        # 🚀 ENTERPRISE: Índice de tickets del evento para escaneos sin joins
+        validation_engine.warm_event_index(event)
+        validation_engine.remember_session(session)
+        
+        event_tickets = Ticket.objects.filter(order_item__order__event=event)
         return Response({
             'success': True,
             'session_id': session.id,
@@ -79,8 +92,8 @@ def start_validator_session(request):
                 'id': event.id,
                 'title': event.title,
                 'start_date': event.start_date,
-                'total_tickets': event.tickets.count(),
-                'checked_in': event.tickets.filter(check_in_status='checked_in').count()
+                'total_tickets': event_tickets.count(),
+                'checked_in': event_tickets.filter(check_in_status='checked_in').count()
             },
             'message': f'Sesión iniciada para {session.validator_name}'
         })
@@ -105,234 +118,41 @@ def validate_ticket_enterprise(request):
     Features:
     - Validación de seguridad completa
     - Verificación de fechas y horarios
-    - Control de límites de ingreso
     - Tracking completo de sesión
     - Logs detallados
-    - Sincronización offline/online
+    
+    Con VALIDATION_ENGINE=redis el ticket se resuelve en el índice del evento y el log
+    se encola (ver apps.validation.engine).
     """
-    import logging
-    logger = logging.getLogger(__name__)
+    ticket_number = request.data.get('ticket_number')
+    session_id = request.data.get('session_id')
+    
+    if not ticket_number or not session_id:
+        return Response({
+            'valid': False,
+            'error': 'MISSING_DATA',
+            'message': 'ticket_number y session_id son requeridos'
+        }, status=status.HTTP_400_BAD_REQUEST)
     
     try:
-        with transaction.atomic():
-            # 1. Obtener datos de entrada
-            ticket_number = request.data.get('ticket_number')
-            session_id = request.data.get('session_id')
-            qr_data = request.data.get('qr_data', '')
-            scan_time_ms = request.data.get('scan_time_ms', 0)
-            device_location = request.data.get('device_location', {})
-            
-            logger.info("=" * 60)
-            logger.info("🎫 BACKEND VALIDATION REQUEST")
-            logger.info("=" * 60)
-            logger.info(f"  ├─ Ticket Number: {ticket_number}")
-            logger.info(f"  ├─ Session ID: {session_id}")
-            logger.info(f"  ├─ QR Data: {qr_data}")
-            logger.info(f"  ├─ Scan Time: {scan_time_ms}ms")
-            logger.info(f"  └─ User: {request.user}")
-            
-            if not ticket_number or not session_id:
-                logger.warning("  └─ ❌ MISSING DATA")
-                return Response({
-                    'valid': False,
-                    'error': 'MISSING_DATA',
-                    'message': 'ticket_number y session_id son requeridos'
-                }, status=status.HTTP_400_BAD_REQUEST)
-            
-            # 2. Validar sesión activa
-            try:
-                session = ValidatorSession.objects.get(
-                    id=session_id,
-                    user=request.user,
-                    is_active=True
-                )
-                logger.info(f"  ├─ ✅ Session found: {session.event.title}")
-            except ValidatorSession.DoesNotExist:
-                logger.warning("  └─ ❌ INVALID SESSION")
-                return Response({
-                    'valid': False,
-                    'error': 'INVALID_SESSION',
-                    'message': 'Sesión de validador inválida o expirada'
-                }, status=status.HTTP_401_UNAUTHORIZED)
-            
-            # 3. Buscar ticket
-            logger.info(f"  ├─ Searching ticket in event: {session.event.id}")
-            try:
-                ticket = Ticket.objects.select_related(
-                    'order_item__order__event',
-                    'order_item__ticket_tier'
-                ).get(
-                    ticket_number=ticket_number,
-                    order_item__order__event=session.event
-                )
-                logger.info(f"  ├─ ✅ Ticket found!")
-                logger.info(f"  │  ├─ ID: {ticket.id}")
-                logger.info(f"  │  ├─ Number: {ticket.ticket_number}")
-                logger.info(f"  │  ├─ Name: {ticket.first_name} {ticket.last_name}")
-                logger.info(f"  │  ├─ Status: {ticket.status}")
-                logger.info(f"  │  └─ Check-in Status: {ticket.check_in_status}")
-            except Ticket.DoesNotExist:
-                logger.warning(f"  └─ ❌ TICKET NOT FOUND: {ticket_number}")
-                # Log intento fallido
-                TicketValidationLog.objects.create(
-                    ticket=None,
-                    validator_session=session,
-                    action='validate',
-                    status='error',
-                    message=f'Ticket no encontrado: {ticket_number}',
-                    scan_time_ms=scan_time_ms,
-                    qr_data=qr_data,
-                    device_location=device_location
-                )
-                
-                session.total_scans += 1
-                session.failed_validations += 1
-                session.save()
-                
-                return Response({
-                    'valid': False,
-                    'error': 'TICKET_NOT_FOUND',
-                    'message': 'Ticket no encontrado o no pertenece a este evento'
-                })
-            
-            # 4. Validaciones de business logic
-            logger.info("  ├─ Running business logic validations...")
-            validation_errors = []
-            
-            # 4.1 Estado del ticket
-            if ticket.status != 'active':
-                error = f'Ticket no activo (estado: {ticket.get_status_display()})'
-                validation_errors.append(error)
-                logger.warning(f"  │  └─ ❌ {error}")
-            
-            # 4.2 Verificar si ya está checked-in
-            if ticket.check_in_status == 'checked_in':
-                error = f'Ticket ya ingresado el {ticket.check_in_time}'
-                validation_errors.append(error)
-                logger.warning(f"  │  └─ ❌ {error}")
-            
-            # 4.3 Verificar fechas del evento
-            now = timezone.now()
-            event = ticket.order_item.order.event
-            
-            # Verificar si el evento ya terminó
-            if event.end_date and now > event.end_date:
-                error = 'El evento ya terminó'
-                validation_errors.append(error)
-                logger.warning(f"  │  └─ ❌ {error}")
-            
-            # Verificar si es muy temprano (más de 2 horas antes)
-            if event.start_date and now < (event.start_date - timedelta(hours=2)):
-                error = 'Muy temprano para ingresar'
-                validation_errors.append(error)
-                logger.warning(f"  │  └─ ❌ {error}")
-            
-            # 4.4 Verificar límites de capacidad (si aplica)
-            if hasattr(event, 'max_capacity') and event.max_capacity:
-                current_checkins = Ticket.objects.filter(
-                    order_item__order__event=event,
-                    check_in_status='checked_in'
-                ).count()
-                
-                if current_checkins >= event.max_capacity:
-                    error = 'Evento lleno (capacidad máxima alcanzada)'
-                    validation_errors.append(error)
-                    logger.warning(f"  │  └─ ❌ {error}")
-            
-            # 5. Si hay errores, registrar y retornar
-            if validation_errors:
-                error_message = '; '.join(validation_errors)
-                logger.warning(f"  └─ ❌ VALIDATION FAILED: {error_message}")
-                
-                TicketValidationLog.objects.create(
-                    ticket=ticket,
-                    validator_session=session,
-                    action='validate',
-                    status='error',
-                    message=error_message,
-                    scan_time_ms=scan_time_ms,
-                    qr_data=qr_data,
-                    device_location=device_location
-                )
-                
-                session.total_scans += 1
-                session.failed_validations += 1
-                session.save()
-                
-                return Response({
-                    'valid': False,
-                    'error': 'VALIDATION_FAILED',
-                    'message': error_message,
-                    'ticket_info': {
-                        'ticket_number': ticket.ticket_number,
-                        'attendee_name': f'{ticket.first_name} {ticket.last_name}',
-                        'status': ticket.status,
-                        'check_in_status': ticket.check_in_status
-                    }
-                })
-            
-            # 6. ✅ VALIDACIÓN EXITOSA - Actualizar métricas
-            logger.info("  ├─ ✅ All validations passed!")
-            session.total_scans += 1
-            session.successful_validations += 1
-            session.save()
-            logger.info(f"  ├─ Session stats: {session.successful_validations}/{session.total_scans}")
-            
-            # Log validación exitosa
-            TicketValidationLog.objects.create(
-                ticket=ticket,
-                validator_session=session,
-                action='validate',
-                status='success',
-                message='Ticket validado correctamente',
-                scan_time_ms=scan_time_ms,
-                qr_data=qr_data,
-                device_location=device_location
-            )
-            
-            # 7. Preparar respuesta completa
-            response_data = {
-                'valid': True,
-                'message': 'Ticket válido - Listo para check-in',
-                'ticket': {
-                    'id': ticket.id,
-                    'ticket_number': ticket.ticket_number,
-                    'attendee_name': f'{ticket.first_name} {ticket.last_name}',
-                    'email': ticket.email,
-                    'status': ticket.status,
-                    'check_in_status': ticket.check_in_status,
-                    'tier_name': ticket.order_item.ticket_tier.name,
-                    'tier_price': float(ticket.order_item.ticket_tier.price),
-                    'form_data': ticket.form_data,
-                    'order_info': {
-                        'order_id': ticket.order_item.order.id,
-                        'purchase_date': ticket.order_item.order.created_at,
-                        'total_amount': float(ticket.order_item.order.total_amount)
-                    }
-                },
-                'event': {
-                    'id': event.id,
-                    'title': event.title,
-                    'start_date': event.start_date,
-                    'location': event.location.name if event.location else None
-                },
-                'validation_info': {
-                    'validator_name': session.validator_name,
-                    'validation_time': timezone.now(),
-                    'scan_time_ms': scan_time_ms
-                }
-            }
-            
-            logger.info("  └─ ✅ SUCCESS! Returning valid ticket")
-            logger.info("=" * 60)
-            return Response(response_data)
-            
+        session = validation_engine.load_session(session_id, request.user.id)
+        if session is None:
+            return Response({
+                'valid': False,
+                'error': 'INVALID_SESSION',
+                'message': 'Sesión de validador inválida o expirada'
+            }, status=status.HTTP_401_UNAUTHORIZED)
+        
+        return Response(validation_engine.validate_scan(
+            session,
+            ticket_number,
+            qr_data=request.data.get('qr_data', ''),
+            scan_time_ms=request.data.get('scan_time_ms', 0),
+            device_location=request.data.get('device_location', {}),
+        ))
+        
     except Exception as e:
-        logger.error("=" * 60)
-        logger.error(f"❌ SYSTEM ERROR: {str(e)}")
-        logger.error("=" * 60)
-        import traceback
-        logger.error(traceback.format_exc())
+        logger.exception(f"❌ [VALIDATION] Error validating ticket {ticket_number}: {e}")
         return Response({
             'valid': False,
             'error': 'SYSTEM_ERROR',
@@ -349,79 +169,28 @@ def validate_ticket_enterprise(request):
 def checkin_ticket_enterprise(request, ticket_id):
     """
     🚀 ENTERPRISE: Check-in de ticket con validaciones completas
+    
+    El check-in es un UPDATE condicional: dos validadores escaneando el mismo
+    ticket a la vez no pueden darle ingreso dos veces.
     """
     try:
-        with transaction.atomic():
-            session_id = request.data.get('session_id')
-            notes = request.data.get('notes', '')
-            device_location = request.data.get('device_location', {})
-            
-            # Validar sesión
-            session = ValidatorSession.objects.get(
-                id=session_id,
-                user=request.user,
-                is_active=True
-            )
-            
-            # Obtener ticket
-            ticket = Ticket.objects.select_related(
-                'order_item__order__event'
-            ).get(
-                id=ticket_id,
-                order_item__order__event=session.event
-            )
-            
-            # Verificar que se puede hacer check-in
-            if ticket.check_in_status == 'checked_in':
-                return Response({
-                    'success': False,
-                    'message': f'Ticket ya tiene check-in desde {ticket.check_in_time}'
-                }, status=status.HTTP_400_BAD_REQUEST)
-            
-            # Realizar check-in
-            ticket.check_in_status = 'checked_in'
-            ticket.checked_in = True  # Legacy field
-            ticket.check_in_time = timezone.now()
-            ticket.check_in_by = request.user
-            ticket.status = 'used'
-            ticket.save()
-            
-            # Actualizar métricas de sesión
-            session.tickets_checked_in += 1
-            session.save()
-            
-            # Log del check-in
-            TicketValidationLog.objects.create(
-                ticket=ticket,
-                validator_session=session,
-                action='check_in',
-                status='success',
-                message=f'Check-in realizado por {session.validator_name}',
-                device_location=device_location,
-                metadata={'notes': notes} if notes else {}
-            )
-            
-            # Agregar nota si se proporcionó
-            if notes:
-                TicketNote.objects.create(
-                    ticket=ticket,
-                    user=request.user,
-                    note=notes,
-                    note_type='check_in'
-                )
-            
+        session = validation_engine.load_session(request.data.get('session_id'), request.user.id)
+        if session is None:
             return Response({
-                'success': True,
-                'message': 'Check-in realizado exitosamente',
-                'ticket': {
-                    'id': ticket.id,
-                    'ticket_number': ticket.ticket_number,
-                    'attendee_name': f'{ticket.first_name} {ticket.last_name}',
-                    'check_in_status': ticket.check_in_status,
-                    'check_in_time': ticket.check_in_time,
-                    'checked_in_by': session.validator_name
-                }
-            })
+                'success': False,
+                'message': 'Sesión de validador inválida o expirada'
+            }, status=status.HTTP_401_UNAUTHORIZED)
+        
+        payload, checked_in = validation_engine.check_in_ticket(
+            session,
+            ticket_id,
+            request.user,
+            notes=request.data.get('notes', ''),
+            device_location=request.data.get('device_location', {}),
+        )
+        if not checked_in:
+            return Response(payload, status=status.HTTP_400_BAD_REQUEST)
+        return Response(payload)
             
     except Exception as e:
             return Response({
@@ -449,7 +218,9 @@ def end_validator_session(request, session_id):
         
         session.is_active = False
         session.end_time = timezone.now()
-        session.save()
+        # Counters are incremented with F() by concurrent scans: don't overwrite them
+        session.save(update_fields=['is_active', 'end_time', 'updated_at'])
+        validation_engine.forget_session(session.id)
         
         # Generar reporte final
         return Response({
@@ -710,3 +481,101 @@ def get_session_stats(request, session_id):
             'success': False,
             'message': 'Sesión no encontrada'
         }, status=status.HTTP_404_NOT_FOUND)
+
+
+@extend_schema(
+    summary="🚀 ENTERPRISE: Snapshot Offline de Tickets",
+    description="Snapshot compacto y versionado de los tickets de un evento, con deltas desde un cursor",
+    parameters=[
+        OpenApiParameter('cursor', OpenApiTypes.STR, description='Cursor de la página o sincronización anterior'),
+    ]
+)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_event_ticket_snapshot(request, event_id):
+    """
+    🚀 ENTERPRISE: Tickets del evento para validación offline
+    
+    Sin cursor devuelve el snapshot completo (paginado); con cursor solo los tickets
+    que cambiaron desde entonces. Cada fila es una lista en el orden de ``fields``.
+    El dispositivo guarda el último ``cursor`` y lo envía en la próxima sincronización.
+    """
+    try:
+        organizer_user = OrganizerUser.objects.get(user=request.user)
+        event = Event.objects.get(id=event_id, organizer=organizer_user.organizer)
+    except (OrganizerUser.DoesNotExist, Event.DoesNotExist):
+        return Response({
+            'success': False,
+            'message': 'Evento no encontrado'
+        }, status=status.HTTP_404_NOT_FOUND)
+    
+    try:
+        snapshot = offline_sync.ticket_snapshot(event.id, cursor=request.GET.get('cursor'))
+    except offline_sync.InvalidCursor as e:
+        return Response({
+            'success': False,
+            'message': str(e)
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    return Response({'success': True, 'event_id': event.id, **snapshot})
+
+
+@extend_schema(
+    summary="🚀 ENTERPRISE: Sincronizar Check-ins Offline",
+    description="Aplica en una transacción un lote de check-ins escaneados sin conexión (idempotente por scan_id)"
+)
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def sync_offline_checkins(request, session_id):
+    """
+    🚀 ENTERPRISE: Subir escaneos offline
+    
+    Body:
+    {
+        "scans": [
+            {"scan_id": "<uuid generado en el dispositivo>", "ticket_number": "TIX-...",
+             "scanned_at": "2026-03-01T21:04:11Z", "device_id": "puerta-1"}
+        ]
+    }
+    
+    Reenviar el mismo lote es seguro: los scan_id ya aplicados vuelven como ``already_applied``.
+    Un ticket con check-in previo (por ejemplo en otro dispositivo) vuelve como ``conflict``.
+    """
+    try:
+        session = ValidatorSession.objects.get(id=session_id, user=request.user, is_active=True)
+    except ValidatorSession.DoesNotExist:
+        return Response({
+            'success': False,
+            'message': 'Sesión de validador inválida o expirada'
+        }, status=status.HTTP_401_UNAUTHORIZED)
+    
+    scans = request.data.get('scans')
+    max_scans = getattr(settings, 'VALIDATION_ENGINE', {}).get('SYNC_MAX_SCANS', 1000)
+    if not isinstance(scans, list) or not scans:
+        return Response({
+            'success': False,
+            'message': 'scans es requerido'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    if len(scans) > max_scans:
+        return Response({
+            'success': False,
+            'message': f'Máximo {max_scans} escaneos por sincronización'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    try:
+        results = offline_sync.apply_offline_scans(session, scans, request.user)
+    except (KeyError, TypeError, ValueError) as e:
+        return Response({
+            'success': False,
+            'message': f'Escaneo inválido: {str(e)}'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    summary = {}
+    for result in results:
+        summary[result['status']] = summary.get(result['status'], 0) + 1
+    return Response({
+        'success': True,
+        'results': results,
+        'summary': summary,
+        'conflicts': [r for r in results if r['status'] == 'conflict'],
+    })
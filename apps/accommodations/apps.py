@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+from django.utils.translation import gettext_lazy as _
+
+
+class AccommodationsConfig(AppConfig):
+    name = 'apps.accommodations'
+    verbose_name = _('Accommodations')
+
+    def ready(self):
+        """Connect public listing cache signals."""
+        import apps.accommodations.signals  # noqa
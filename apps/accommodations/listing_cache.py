@@ -0,0 +1,79 @@
+"""
+Cache of the rendered public accommodation listing (GET /api/v1/accommodations/public/).
+
+Responses are stored per (host, normalized filters, cursor) for
+ACCOMMODATION_PUBLIC_LIST['CACHE_TTL'] seconds. Every key embeds a version number
+that signals.py bumps when an accommodation (or its extra charges, blocked dates or
+reservations) is saved or deleted, so edits show up immediately; the TTL bounds
+staleness for bulk .update() calls, which do not send signals.
+"""
+
+import hashlib
+import json
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+CACHE_PREFIX = "accommodations:public_list"
+VERSION_KEY = f"{CACHE_PREFIX}:version"
+
+
+def _settings():
+    return getattr(settings, "ACCOMMODATION_PUBLIC_LIST", {})
+
+
+def cache_ttl():
+    return _settings().get("CACHE_TTL", 60)
+
+
+def _version():
+    try:
+        version = cache.get(VERSION_KEY)
+        if version is None:
+            cache.add(VERSION_KEY, 1, None)
+            version = cache.get(VERSION_KEY) or 1
+        return version
+    except Exception:
+        return 0
+
+
+def invalidate():
+    """Drop every cached listing (new version; old keys expire with their TTL)."""
+    try:
+        try:
+            cache.incr(VERSION_KEY)
+        except ValueError:
+            cache.add(VERSION_KEY, 2, None)
+    except Exception as e:
+        logger.warning(f"⚠️ [ACCOMMODATIONS] Could not invalidate public list cache: {e}")
+
+
+def cache_key(request, params):
+    """Key for one listing response; absolute URLs in the payload depend on the host."""
+    raw = json.dumps(
+        [request.scheme, request.get_host(), sorted(params.items())],
+        default=str,
+        separators=(",", ":"),
+    )
+    digest = hashlib.md5(raw.encode("utf-8")).hexdigest()
+    return f"{CACHE_PREFIX}:v{_version()}:{digest}"
+
+
+def get_cached(key):
+    try:
+        return cache.get(key)
+    except Exception:
+        return None
+
+
+def store(key, data):
+    ttl = cache_ttl()
+    if not ttl:
+        return
+    try:
+        cache.set(key, data, ttl)
+    except Exception as e:
+        logger.warning(f"⚠️ [ACCOMMODATIONS] Could not cache public list: {e}")
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.8 on 2026-10-16 20:34
+
+from decimal import Decimal
+from django.db import migrations, models
+import django.db.models.functions.comparison
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accommodations', '0023_add_public_code_prefix'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='accommodation',
+            index=models.Index(models.OrderBy(django.db.models.functions.comparison.Coalesce('rating_avg', models.Value(Decimal('0'))), descending=True), models.OrderBy(models.F('created_at'), descending=True), models.OrderBy(models.F('id'), descending=True), condition=models.Q(('deleted_at__isnull', True), ('status', 'published')), name='accommodation_public_list_idx'),
+        ),
+    ]
@@ -1,6 +1,9 @@
 """Models for accommodations (alojamientos)."""
 
+from decimal import Decimal
+
 from django.db import models
+from django.db.models.functions import Coalesce
 from django.utils.translation import gettext_lazy as _
 from django.core.validators import MinValueValidator, MaxValueValidator
 
@@ -201,6 +204,50 @@ class Hotel(BaseModel):
         return self.name
 
 
+def _public_rating_sort():
+    # Unrated = 0 (as shown in the card); keeps the keyset ordering key non-null
+    return Coalesce("rating_avg", models.Value(Decimal("0")))
+
+
+class AccommodationQuerySet(models.QuerySet):
+    """QuerySet helpers for public listings (availability resolved in SQL)."""
+
+    PUBLIC_ORDERING = ("-rating_sort", "-created_at", "-id")
+
+    def public(self):
+        """Published and not soft-deleted (public listing)."""
+        return self.filter(status="published", deleted_at__isnull=True)
+
+    def with_public_ordering(self):
+        """Best rated first, then newest; served by accommodation_public_list_idx."""
+        return self.annotate(rating_sort=_public_rating_sort()).order_by(*self.PUBLIC_ORDERING)
+
+    def available_between(self, check_in, check_out):
+        """
+        🚀 ENTERPRISE: Exclude accommodations not bookable for [check_in, check_out).
+
+        Two anti-joins (NOT EXISTS) served by the (accommodation, date) and
+        (accommodation, status) indexes: any blocked night in the range, or any
+        pending/paid reservation overlapping it.
+        """
+        blocked = AccommodationBlockedDate.objects.filter(
+            accommodation_id=models.OuterRef("pk"),
+            date__gte=check_in,
+            date__lt=check_out,
+        )
+        overlapping = AccommodationReservation.objects.filter(
+            accommodation_id=models.OuterRef("pk"),
+            status__in=AccommodationReservation.BLOCKING_STATUSES,
+            check_in__lt=check_out,
+            check_out__gt=check_in,
+        )
+        return self.exclude(models.Exists(blocked)).exclude(models.Exists(overlapping))
+
+    def for_guests(self, guests):
+        """Capacity for at least `guests` people."""
+        return self.filter(guests__gte=guests)
+
+
 class Accommodation(BaseModel):
     """Alojamiento: cabaña, casa, departamento, etc. Con reseñas y amenities."""
 
@@ -487,10 +534,22 @@ class Accommodation(BaseModel):
         ),
     )
 
+    objects = AccommodationQuerySet.as_manager()
+
     class Meta:
         verbose_name = _("Accommodation")
         verbose_name_plural = _("Accommodations")
         ordering = ["-created_at"]
+        indexes = [
+            # Public listing: keyset pagination over PUBLIC_ORDERING
+            models.Index(
+                _public_rating_sort().desc(),
+                models.F("created_at").desc(),
+                models.F("id").desc(),
+                name="accommodation_public_list_idx",
+                condition=models.Q(status="published", deleted_at__isnull=True),
+            ),
+        ]
 
     def get_effective_min_nights(self):
         """
@@ -626,6 +685,8 @@ class AccommodationReservation(BaseModel):
         ("expired", _("Expired")),
         ("refunded", _("Refunded")),
     ]
+    # Statuses that hold the dates (availability checks)
+    BLOCKING_STATUSES = ("pending", "paid")
 
     reservation_id = models.CharField(
         _("reservation ID"),
@@ -6,9 +6,12 @@ import re
 from urllib.parse import urlparse
 
 from django.conf import settings as django_settings
+from django.db.models import Manager, Prefetch, prefetch_related_objects
 from rest_framework import serializers
 
-from .models import Accommodation, AccommodationReview
+from apps.media.derivatives import public_path
+
+from .models import Accommodation, AccommodationExtraCharge, AccommodationReview
 from .constants import ROOM_CATEGORIES, ROOM_CATEGORY_LABELS
 
 
@@ -58,13 +61,42 @@ def _rewrite_media_url_to_request_host(url, request):
     return request.build_absolute_uri(path)
 
 
-def _build_images_from_gallery_items(acc, request=None):
+def _gallery_media_ids(acc):
+    """Ids de MediaAsset referenciados por gallery_items y gallery_media_ids."""
+    ids = [str(it.get("media_id")) for it in (acc.gallery_items or []) if it.get("media_id")]
+    ids.extend(str(mid) for mid in (acc.gallery_media_ids or []))
+    return ids
+
+
+def prefetch_gallery_assets(accommodations):
     """
-    Lista plana de URLs ordenada por sort_order global.
-    Si algún item tiene is_principal=True, esa URL va primero (para card/listado).
+    🚀 ENTERPRISE: MediaAsset de la galería de varios alojamientos en una sola query.
+
+    Devuelve {str(asset.id): asset} (solo assets con archivo y no borrados), para pasar
+    como asset_map a _accommodation_to_public_dict en listados.
     """
     from apps.media.models import MediaAsset
 
+    ids = {mid for acc in accommodations for mid in _gallery_media_ids(acc)}
+    if not ids:
+        return {}
+    assets = MediaAsset.objects.filter(id__in=ids, deleted_at__isnull=True)
+    return {str(a.id): a for a in assets if a.file}
+
+
+def _assets_for(acc, asset_map=None):
+    """asset_map precargado (listados) o una query para este alojamiento (detalle)."""
+    if asset_map is not None:
+        return asset_map
+    return prefetch_gallery_assets([acc])
+
+
+def _build_images_from_gallery_items(acc, request=None, asset_map=None):
+    """
+    Lista plana de URLs ordenada por sort_order global.
+    Si algún item tiene is_principal=True, esa URL va primero (para card/listado).
+    asset_map: ver prefetch_gallery_assets (evita una query por alojamiento).
+    """
     items = list(acc.gallery_items or [])
     if not items and acc.gallery_media_ids:
         items = [
@@ -74,9 +106,7 @@ def _build_images_from_gallery_items(acc, request=None):
     if not items:
         return []
 
-    ids = [str(it.get("media_id")) for it in items if it.get("media_id")]
-    assets = MediaAsset.objects.filter(id__in=ids, deleted_at__isnull=True)
-    asset_map = {str(a.id): a for a in assets if a.file}
+    asset_map = _assets_for(acc, asset_map)
 
     resolved = []
     for it in items:
@@ -103,12 +133,12 @@ def _build_images_from_gallery_items(acc, request=None):
     return urls
 
 
-def _resolve_images(acc, request=None):
+def _resolve_images(acc, request=None, asset_map=None):
     """
     Lista de URLs de imagen: mismo patrón que destinos (landing_destinations/views.py).
     Orden global por sort_order; si is_principal en algún item, esa imagen va primero (card).
     """
-    urls = _build_images_from_gallery_items(acc, request)
+    urls = _build_images_from_gallery_items(acc, request, asset_map=asset_map)
     if urls:
         return urls
 
@@ -118,24 +148,11 @@ def _resolve_images(acc, request=None):
 
     # 1) Desde MediaAsset — igual que destinos: request.build_absolute_uri(a.file.url) si hay request
     if acc.gallery_media_ids:
-        from apps.media.models import MediaAsset
-
-        assets = MediaAsset.objects.filter(
-            id__in=acc.gallery_media_ids,
-            deleted_at__isnull=True,
-        )
-        asset_map = {str(a.id): a for a in assets if a.file}
+        asset_map = _assets_for(acc, asset_map)
         for eid in acc.gallery_media_ids:
             a = asset_map.get(str(eid))
             if a and a.file:
-                raw = a.file.url
-                if raw.startswith(("http://", "https://")):
-                    url = _normalize_media_url(raw)
-                elif request:
-                    url = request.build_absolute_uri(raw)
-                else:
-                    path = raw if raw.startswith("/") else f"/{raw.lstrip('/')}"
-                    url = f"{media_base}{path}" if media_base else _absolute_media_url(raw, None)
+                url = _resolve_image_url_for_asset(a, request)
                 if url:
                     urls.append(url)
     # 2) Fallback: acc.images (legacy o respaldo) — normalizar solo localhost; no reescribir URLs externas (GCS)
@@ -167,10 +184,14 @@ def _resolve_images(acc, request=None):
 
 
 def _resolve_image_url_for_asset(asset, request=None):
-    """Single MediaAsset URL (same logic as _resolve_images)."""
+    """
+    Single MediaAsset URL (same logic as _resolve_images): the responsive JPEG
+    (MEDIA_DERIVATIVES['PUBLIC_WIDTH']) once generated, the original until then.
+    """
     if not asset or not asset.file:
         return ""
-    raw = asset.file.url
+    derivative = public_path(asset.derivatives)
+    raw = asset.file.storage.url(derivative) if derivative else asset.file.url
     if raw.startswith(("http://", "https://")):
         return _normalize_media_url(raw)
     if request:
@@ -247,9 +268,12 @@ def _build_photo_tour(acc, request=None):
     return result
 
 
-def _accommodation_to_public_dict(acc, request=None, include_photo_tour=False):
-    """Mapea Accommodation al formato que espera el frontend (Accommodation type)."""
-    images = _resolve_images(acc, request)
+def _accommodation_to_public_dict(acc, request=None, include_photo_tour=False, asset_map=None):
+    """
+    Mapea Accommodation al formato que espera el frontend (Accommodation type).
+    En listados usa asset_map y los cobros precargados (prefetch_public_cards).
+    """
+    images = _resolve_images(acc, request, asset_map=asset_map)
     lat = float(acc.latitude) if acc.latitude is not None else 0
     lng = float(acc.longitude) if acc.longitude is not None else 0
     effective_min = acc.get_effective_min_nights() if hasattr(acc, "get_effective_min_nights") else None
@@ -280,7 +304,9 @@ def _accommodation_to_public_dict(acc, request=None, include_photo_tour=False):
         "city": acc.city or "",
     }
     # Extra charges (cobros adicionales v1.5) - active only, for public list/detail
-    extras_qs = acc.extra_charges.filter(is_active=True).order_by("display_order", "name")
+    extras_qs = getattr(acc, "active_extra_charges", None)
+    if extras_qs is None:
+        extras_qs = acc.extra_charges.filter(is_active=True).order_by("display_order", "name")
     out["extra_charges"] = [
         {
             "id": str(e.id),
@@ -346,8 +372,6 @@ def _other_rooms_for_hotel(hotel_id, exclude_accommodation_id, request=None, lim
     Each item includes card data: id, slug, title, image, price, guests, bedrooms, bathrooms,
     short_description, rating, reviews, min_nights (same as central/hotel cards).
     """
-    from apps.accommodations.models import Accommodation
-
     qs = (
         Accommodation.objects.filter(
             hotel_id=hotel_id,
@@ -398,8 +422,6 @@ def _other_units_for_hub(rental_hub_id, exclude_accommodation_id, request=None,
     Each item includes card data: id, slug, title, image, price, guests, bedrooms, bathrooms,
     short_description, rating, reviews, min_nights, square_meters, unit_type (same as central cards).
     """
-    from apps.accommodations.models import Accommodation
-
     qs = (
         Accommodation.objects.filter(
             rental_hub_id=rental_hub_id,
@@ -412,9 +434,44 @@ def _other_units_for_hub(rental_hub_id, exclude_accommodation_id, request=None,
     return [_accommodation_card_summary(unit, request) for unit in qs]
 
 
+def prefetch_public_cards(accommodations):
+    """
+    🚀 ENTERPRISE: Precarga lo que necesita el card público de una lista de alojamientos.
+
+    hotel / rental_hub (min_nights efectivo) y cobros activos (active_extra_charges):
+    una query por relación en vez de una por alojamiento. Devuelve el asset_map de
+    prefetch_gallery_assets.
+    """
+    accommodations = list(accommodations)
+    prefetch_related_objects(
+        accommodations,
+        "hotel",
+        "rental_hub",
+        Prefetch(
+            "extra_charges",
+            queryset=AccommodationExtraCharge.objects.filter(is_active=True).order_by("display_order", "name"),
+            to_attr="active_extra_charges",
+        ),
+    )
+    return prefetch_gallery_assets(accommodations)
+
+
+class PublicAccommodationCardListSerializer(serializers.ListSerializer):
+    """many=True: precarga relaciones y media de toda la lista antes de serializar."""
+
+    def to_representation(self, data):
+        items = list(data.all() if isinstance(data, Manager) else data)
+        asset_map = prefetch_public_cards(items)
+        request = self.context.get("request")
+        return [_accommodation_to_public_dict(acc, request, asset_map=asset_map) for acc in items]
+
+
 class PublicAccommodationListSerializer(serializers.BaseSerializer):
     """Serializa lista pública para que el frontend reciba el tipo Accommodation."""
 
+    class Meta:
+        list_serializer_class = PublicAccommodationCardListSerializer
+
     def to_representation(self, instance):
         request = self.context.get("request")
         return _accommodation_to_public_dict(instance, request)
@@ -0,0 +1,24 @@
+"""Signals for the accommodations app: invalidate the cached public listing."""
+
+from django.db.models.signals import post_delete, post_save
+
+from . import listing_cache
+from .models import (
+    Accommodation,
+    AccommodationBlockedDate,
+    AccommodationExtraCharge,
+    AccommodationReservation,
+)
+
+# Models whose changes alter a listing card or the availability filter
+LISTING_MODELS = (Accommodation, AccommodationExtraCharge, AccommodationBlockedDate, AccommodationReservation)
+
+
+def invalidate_public_listing(sender, instance, **kwargs):
+    if not kwargs.get("raw"):
+        listing_cache.invalidate()
+
+
+for _model in LISTING_MODELS:
+    post_save.connect(invalidate_public_listing, sender=_model, dispatch_uid=f"public_listing_save_{_model.__name__}")
+    post_delete.connect(invalidate_public_listing, sender=_model, dispatch_uid=f"public_listing_delete_{_model.__name__}")
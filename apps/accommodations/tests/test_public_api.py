@@ -5,13 +5,23 @@ List: published only. Detail: published or draft (draft = unlisted, accessible b
 404 for slug/id not found; photo_tour present when categorized.
 """
 import io
+from datetime import date
 from decimal import Decimal
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APITestCase
 from rest_framework import status
 from django.core.files.uploadedfile import SimpleUploadedFile
 
-from apps.accommodations.models import Accommodation, AccommodationReview
+from apps.accommodations.models import (
+    Accommodation,
+    AccommodationBlockedDate,
+    AccommodationExtraCharge,
+    AccommodationReservation,
+    AccommodationReview,
+)
 from apps.organizers.models import Organizer
 from apps.media.models import MediaAsset
 
@@ -65,6 +75,123 @@ class PublicAccommodationListTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
 
+class PublicAccommodationListFilterTests(APITestCase):
+    """Availability filter, cursor pagination, prefetching and cache of the public list."""
+
+    def setUp(self):
+        cache.clear()
+        self.organizer = Organizer.objects.create(name="Test Org", slug="test-org")
+
+    def _create(self, title, **kwargs):
+        defaults = {"organizer": self.organizer, "status": "published", "guests": 4, "price": Decimal("50000")}
+        defaults.update(kwargs)
+        return Accommodation.objects.create(title=title, slug=title.lower().replace(" ", "-"), **defaults)
+
+    def _reserve(self, acc, check_in, check_out, status_value):
+        return AccommodationReservation.objects.create(
+            reservation_id=f"RES-{acc.slug}-{status_value}",
+            accommodation=acc,
+            status=status_value,
+            check_in=check_in,
+            check_out=check_out,
+            first_name="Ana",
+            last_name="Test",
+            email="ana@example.com",
+        )
+
+    def _titles(self, response):
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return sorted(item["title"] for item in response.data)
+
+    def test_check_in_check_out_excludes_unavailable(self):
+        free = self._create("Free Cabin")
+        blocked = self._create("Blocked Cabin")
+        booked = self._create("Booked Cabin")
+        cancelled = self._create("Cancelled Cabin")
+        self._create("Small Cabin", guests=2)
+        AccommodationBlockedDate.objects.create(accommodation=blocked, date=date(2026, 3, 11))
+        self._reserve(booked, date(2026, 3, 8), date(2026, 3, 11), "paid")
+        self._reserve(cancelled, date(2026, 3, 10), date(2026, 3, 12), "cancelled")
+        # Checkout on the check-in day does not overlap
+        self._reserve(free, date(2026, 3, 5), date(2026, 3, 10), "pending")
+
+        response = self.client.get(BASE + "/", {"check_in": "2026-03-10", "check_out": "2026-03-12", "guests": 3})
+        self.assertEqual(self._titles(response), ["Cancelled Cabin", "Free Cabin"])
+
+        # Invalid range: no availability filter
+        response = self.client.get(BASE + "/", {"check_in": "2026-03-12", "check_out": "2026-03-10"})
+        self.assertEqual(len(response.data), 5)
+
+    def test_cursor_pagination_walks_all_pages_in_order(self):
+        for i in range(7):
+            self._create(f"Cabin {i}", rating_avg=Decimal("4.5") if i % 2 else None)
+
+        titles, url, pages = [], BASE + "/?page_size=3", 0
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(response.data["results"]), 3)
+            titles.extend(item["title"] for item in response.data["results"])
+            url, pages = response.data["next"], pages + 1
+
+        self.assertEqual(pages, 3)
+        self.assertEqual(len(titles), 7)
+        self.assertEqual(len(set(titles)), 7)
+        # Rated first (unrated count as 0), newest first within the same rating
+        self.assertEqual(titles[:3], ["Cabin 5", "Cabin 3", "Cabin 1"])
+
+    def test_invalid_cursor_returns_404(self):
+        response = self.client.get(BASE + "/", {"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_list_query_count_does_not_grow_with_results(self):
+        jpeg = make_minimal_jpeg()
+
+        def add(i):
+            acc = self._create(f"Media Cabin {i}")
+            asset = MediaAsset.objects.create(
+                scope="organizer",
+                organizer=self.organizer,
+                original_filename=f"m{i}.jpg",
+                content_type="image/jpeg",
+                size_bytes=len(jpeg),
+                file=SimpleUploadedFile(f"m{i}.jpg", jpeg, content_type="image/jpeg"),
+            )
+            acc.gallery_items = [{"media_id": str(asset.id), "sort_order": 0, "is_principal": True}]
+            acc.save()
+            AccommodationExtraCharge.objects.create(
+                accommodation=acc, code=f"clean-{i}", name="Limpieza", amount=Decimal("10000")
+            )
+
+        add(0)
+        cache.clear()
+        with CaptureQueriesContext(connection) as single:
+            response = self.client.get(BASE + "/")
+        self.assertEqual(len(response.data[0]["images"]), 1)
+        self.assertEqual(len(response.data[0]["extra_charges"]), 1)
+
+        for i in range(1, 6):
+            add(i)
+        cache.clear()
+        with CaptureQueriesContext(connection) as many:
+            response = self.client.get(BASE + "/")
+        self.assertEqual(len(response.data), 6)
+        self.assertTrue(all(len(item["images"]) == 1 for item in response.data))
+        self.assertEqual(len(many), len(single))
+
+    def test_cached_until_accommodation_saved(self):
+        acc = self._create("Cached Cabin")
+        self.assertEqual(self._titles(self.client.get(BASE + "/")), ["Cached Cabin"])
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self._titles(self.client.get(BASE + "/")), ["Cached Cabin"])
+        self.assertEqual(len(queries), 0)
+
+        acc.title = "Renamed Cabin"
+        acc.save()
+        self.assertEqual(self._titles(self.client.get(BASE + "/")), ["Renamed Cabin"])
+
+
 class PublicAccommodationDetailTests(APITestCase):
     """GET /api/v1/accommodations/public/<slug_or_id>/"""
 
@@ -6,3 +6,6 @@ class ErasmusConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.erasmus"
     verbose_name = _("Erasmus")
+
+    def ready(self):
+        import apps.erasmus.signals  # noqa
@@ -10,6 +10,8 @@ from typing import Dict, Any, Optional
 from django.conf import settings
 from django.utils import timezone
 
+from core.email_rendering import cached_fragment
+
 logger = logging.getLogger(__name__)
 
 
@@ -79,6 +81,17 @@ def _get_post_purchase_message(instance, locale: str = "es") -> str:
     return msg_es or msg_en or ""
 
 
+def _build_activity_data(act) -> Dict[str, Any]:
+    """Activity fields used by the confirmation templates (no lead/order data)."""
+    return {
+        "title": getattr(act, "title_es", None) or getattr(act, "title_en", None) or "Actividad Erasmus",
+        "short_description_es": getattr(act, "short_description_es", None) or "",
+        "location_name": getattr(act, "location_name", None) or getattr(act, "location", None) or "",
+        "location_address": getattr(act, "location_address", None) or "",
+        "duration_minutes": getattr(act, "duration_minutes", None),
+    }
+
+
 def build_erasmus_activity_confirmation_context(
     order,
     link,
@@ -123,14 +136,8 @@ def build_erasmus_activity_confirmation_context(
             "created_at": order.created_at,
         }
 
-        activity_data = {
-            "title": activity_title,
-            "short_description_es": getattr(act, "short_description_es", None) or "",
-            "location_name": getattr(act, "location_name", None) or getattr(act, "location", None) or "",
-            "location_address": getattr(act, "location_address", None) or "",
-            "duration_minutes": getattr(act, "duration_minutes", None),
-            "image_url": image_url,
-        }
+        # Activity part is shared by every email of the activity (cached per updated_at)
+        activity_data = {**cached_fragment("erasmus_activity", act, _build_activity_data), "image_url": image_url}
 
         instance_data = {
             "instance_label": instance_label,
@@ -3,18 +3,18 @@
 Same pattern as events/experiences: sync send, flow logging, <10s latency.
 """
 import logging
-import os
 import time
 from typing import Dict, Any, Optional
 
 from django.conf import settings
 from django.core.mail import get_connection
-from django.template.loader import render_to_string
 from django.utils import timezone
 from email.mime.image import MIMEImage
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 
+from core.email_rendering import cached_fragment, render_email, static_image_bytes
+
 logger = logging.getLogger(__name__)
 
 
@@ -42,12 +42,14 @@ def send_erasmus_activity_confirmation_email_optimized(
     order_id: str,
     to_email: Optional[str] = None,
     flow_id: Optional[str] = None,
+    connection=None,
 ) -> Dict[str, Any]:
     """
     🚀 ENTERPRISE: Send Erasmus activity payment confirmation email (sync, same flow as events).
+    Sends over ``connection`` when given (batch sends), else a pooled one (core.smtp_pool).
     """
     start_time = time.time()
-    metrics = {"fetch_time_ms": 0, "context_time_ms": 0, "render_time_ms": 0, "smtp_time_ms": 0, "total_time_ms": 0}
+    metrics = {"fetch_time_ms": 0, "context_time_ms": 0, "render_time_ms": 0, "connection_time_ms": 0, "smtp_time_ms": 0, "total_time_ms": 0}
 
     try:
         from apps.events.models import Order, EmailLog
@@ -74,7 +76,7 @@ def send_erasmus_activity_confirmation_email_optimized(
             return {"status": "skipped", "reason": "no_link", "metrics": metrics}
 
         act = link.instance.activity
-        image_url = _activity_image_url(act)
+        image_url = cached_fragment("erasmus_activity_image", act, _activity_image_url)
 
         context_start = time.time()
         context = build_erasmus_activity_confirmation_context(order, link, image_url=image_url)
@@ -86,8 +88,8 @@ def send_erasmus_activity_confirmation_email_optimized(
             return {"status": "skipped", "reason": "no_email", "metrics": metrics}
 
         render_start = time.time()
-        html_message = render_to_string("emails/erasmus/confirmation.html", context)
-        text_message = render_to_string("emails/erasmus/confirmation.txt", context)
+        html_message = render_email("emails/erasmus/confirmation.html", context)
+        text_message = render_email("emails/erasmus/confirmation.txt", context)
         metrics["render_time_ms"] = int((time.time() - render_start) * 1000)
 
         activity_title = context.get("activity_title", "Actividad Erasmus")
@@ -104,20 +106,18 @@ def send_erasmus_activity_confirmation_email_optimized(
         related_msg = MIMEMultipart("related")
         related_msg.attach(MIMEText(html_message, "html", "utf-8"))
 
-        logo_path = os.path.join(settings.BASE_DIR, "static/images/logos/logo-negro.png")
-        if os.path.exists(logo_path):
-            with open(logo_path, "rb") as f:
-                logo = MIMEImage(f.read())
-                logo.add_header("Content-ID", "<logo_negro>")
-                logo.add_header("Content-Disposition", "inline")
-                related_msg.attach(logo)
-        isotipo_path = os.path.join(settings.BASE_DIR, "static/images/logos/isotipo-azul.png")
-        if os.path.exists(isotipo_path):
-            with open(isotipo_path, "rb") as f:
-                iso = MIMEImage(f.read())
-                iso.add_header("Content-ID", "<isotipo_azul>")
-                iso.add_header("Content-Disposition", "inline")
-                related_msg.attach(iso)
+        logo_bytes = static_image_bytes("static/images/logos/logo-negro.png")
+        if logo_bytes:
+            logo = MIMEImage(logo_bytes)
+            logo.add_header("Content-ID", "<logo_negro>")
+            logo.add_header("Content-Disposition", "inline")
+            related_msg.attach(logo)
+        isotipo_bytes = static_image_bytes("static/images/logos/isotipo-azul.png")
+        if isotipo_bytes:
+            iso = MIMEImage(isotipo_bytes)
+            iso.add_header("Content-ID", "<isotipo_azul>")
+            iso.add_header("Content-Disposition", "inline")
+            related_msg.attach(iso)
 
         alternative_msg.attach(related_msg)
         root_msg.attach(alternative_msg)
@@ -159,10 +159,12 @@ def send_erasmus_activity_confirmation_email_optimized(
             def get_connection(self, fail_silently):
                 return get_connection(fail_silently=fail_silently)
 
-        smtp_start = time.time()
-        connection = get_connection(fail_silently=False)
-        connection.send_messages([_CustomEmailMessage(root_msg, from_email, recipient_email)])
-        metrics["smtp_time_ms"] = int((time.time() - smtp_start) * 1000)
+        from core.smtp_pool import send_messages, smtp_connection
+
+        with smtp_connection(connection, metrics) as smtp:
+            smtp_start = time.time()
+            send_messages(smtp, [_CustomEmailMessage(root_msg, from_email, recipient_email)])
+            metrics["smtp_time_ms"] = int((time.time() - smtp_start) * 1000)
 
         email_log.status = "sent"
         email_log.sent_at = timezone.now()
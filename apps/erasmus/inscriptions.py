@@ -0,0 +1,105 @@
+"""
+Inscription index for Erasmus activity instances.
+
+ErasmusLead.interested_experiences (JSON list of ids) is still the field that forms and
+superadmin write. ErasmusActivityInscription mirrors the entries that are activity
+instance ids, one row per (lead, instance), kept in sync on every lead save that touches
+the JSON field. Reads go through the helpers below: per-page counts are one GROUP BY and
+inscrit lists are an indexed join.
+"""
+
+import uuid
+
+from django.db import transaction
+from django.db.models import Count
+
+from apps.erasmus.models import ErasmusActivityInscription, ErasmusActivityInstance, ErasmusLead
+
+
+def _uuid_strings(values):
+    ids = set()
+    for value in values or []:
+        try:
+            ids.add(str(uuid.UUID(str(value).strip())))
+        except (ValueError, TypeError, AttributeError):
+            continue
+    return ids
+
+
+def sync_lead_inscriptions(lead):
+    """Align the lead's inscription rows with interested_experiences. Returns (added, removed)."""
+    wanted = _uuid_strings(lead.interested_experiences)
+    if wanted:
+        # Timeline items and stale ids live in the same list: keep only existing instances
+        wanted = {str(pk) for pk in ErasmusActivityInstance.objects.filter(id__in=wanted).values_list("id", flat=True)}
+    current = {
+        str(pk) for pk in ErasmusActivityInscription.objects.filter(lead=lead).values_list("instance_id", flat=True)
+    }
+    added = wanted - current
+    removed = current - wanted
+    with transaction.atomic():
+        if removed:
+            ErasmusActivityInscription.objects.filter(lead=lead, instance_id__in=removed).delete()
+        if added:
+            ErasmusActivityInscription.objects.bulk_create(
+                [ErasmusActivityInscription(lead=lead, instance_id=pk) for pk in added],
+                ignore_conflicts=True,
+            )
+    return len(added), len(removed)
+
+
+def inscribed_counts(instance_ids):
+    """{instance_id (str): inscribed leads} for many instances in one grouped query."""
+    counts = {str(pk): 0 for pk in instance_ids}
+    if not counts:
+        return counts
+    rows = (
+        ErasmusActivityInscription.objects.filter(instance_id__in=list(counts))
+        .values("instance_id")
+        .annotate(total=Count("id"))
+    )
+    for row in rows:
+        counts[str(row["instance_id"])] = row["total"]
+    return counts
+
+
+def inscribed_count(instance):
+    return ErasmusActivityInscription.objects.filter(instance=instance).count()
+
+
+def inscribed_leads(instance):
+    """Leads inscribed in the instance (queryset)."""
+    return ErasmusLead.objects.filter(activity_inscriptions__instance=instance)
+
+
+def inscribed_leads_by_instance(instance_ids, fields):
+    """
+    {instance_id (str): [lead values dict, ...]} for many instances in one query,
+    each list ordered by lead ``-updated_at``. ``fields`` are ErasmusLead field names.
+    """
+    by_instance = {str(pk): [] for pk in instance_ids}
+    if not by_instance:
+        return by_instance
+    lookups = [f"lead__{name}" for name in fields]
+    rows = (
+        ErasmusActivityInscription.objects.filter(instance_id__in=list(by_instance))
+        .order_by("-lead__updated_at")
+        .values("instance_id", *lookups)
+    )
+    for row in rows:
+        by_instance[str(row["instance_id"])].append({name: row[f"lead__{name}"] for name in fields})
+    return by_instance
+
+
+def rebuild_inscriptions(batch_size=2000):
+    """Re-sync every lead with a non-empty interested_experiences list. Returns (added, removed)."""
+    added = removed = 0
+    leads = ErasmusLead.objects.exclude(interested_experiences=[]).only("id", "interested_experiences")
+    for lead in leads.iterator(chunk_size=batch_size):
+        a, r = sync_lead_inscriptions(lead)
+        added += a
+        removed += r
+    # Leads whose list was emptied
+    orphaned = ErasmusActivityInscription.objects.filter(lead__interested_experiences=[])
+    removed += orphaned.delete()[0]
+    return added, removed
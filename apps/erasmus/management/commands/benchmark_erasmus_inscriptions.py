@@ -0,0 +1,118 @@
+"""
+Benchmark Erasmus inscription reads: legacy JSON containment vs the inscription index.
+
+Creates a throwaway activity with --instances instances and --leads synthetic leads
+(each inscribed in a few random instances), then times the two hot reads:
+per-instance counts (timeline / activity cards) and inscrit lists (public view link).
+Everything runs in a transaction that is rolled back.
+
+Usage:
+    python manage.py benchmark_erasmus_inscriptions
+    python manage.py benchmark_erasmus_inscriptions --leads 100000 --instances 40 --repeat 5
+"""
+
+import random
+import statistics
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from apps.erasmus.inscriptions import inscribed_counts, inscribed_leads_by_instance
+from apps.erasmus.models import ErasmusActivity, ErasmusActivityInscription, ErasmusActivityInstance, ErasmusLead
+
+LEAD_FIELDS = ["id", "first_name", "last_name", "email", "phone_country_code", "phone_number", "instagram", "updated_at"]
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "Benchmark Erasmus inscription counts/lists: JSON containment vs inscription index"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--leads", type=int, default=100000)
+        parser.add_argument("--instances", type=int, default=40)
+        parser.add_argument("--per-lead", type=int, default=3, help="Max instances per lead")
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self._run(options)
+                raise Rollback
+        except Rollback:
+            self.stdout.write("Benchmark data rolled back.")
+
+    def _run(self, options):
+        started = time.perf_counter()
+        activity = ErasmusActivity.objects.create(title_es="Benchmark", slug=f"benchmark-{uuid.uuid4().hex[:8]}")
+        instances = ErasmusActivityInstance.objects.bulk_create(
+            [ErasmusActivityInstance(activity=activity, display_order=i) for i in range(options["instances"])]
+        )
+        instance_ids = [str(inst.id) for inst in instances]
+
+        leads = []
+        for i in range(options["leads"]):
+            chosen = random.sample(instance_ids, random.randint(0, min(options["per_lead"], len(instance_ids))))
+            leads.append(ErasmusLead(
+                first_name="Bench", last_name=str(i), phone_country_code="+56", phone_number=str(i),
+                stay_reason="university", interested_experiences=chosen,
+            ))
+        leads = ErasmusLead.objects.bulk_create(leads, batch_size=5000)
+        ErasmusActivityInscription.objects.bulk_create(
+            [
+                ErasmusActivityInscription(lead_id=lead.id, instance_id=pk)
+                for lead in leads
+                for pk in lead.interested_experiences
+            ],
+            batch_size=5000,
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {ErasmusLead._meta.db_table}")
+            cursor.execute(f"ANALYZE {ErasmusActivityInscription._meta.db_table}")
+        self.stdout.write(
+            f"Seeded {len(leads)} leads x {len(instance_ids)} instances in {time.perf_counter() - started:.1f}s"
+        )
+
+        def legacy_counts():
+            return {
+                pk: ErasmusLead.objects.filter(interested_experiences__contains=[pk]).count()
+                for pk in instance_ids
+            }
+
+        def legacy_lists():
+            return {
+                pk: list(ErasmusLead.objects.filter(
+                    interested_experiences__contains=[pk]
+                ).order_by("-updated_at").values(*LEAD_FIELDS))
+                for pk in instance_ids
+            }
+
+        results = [
+            self._measure("counts: JSON contains", legacy_counts, options["repeat"]),
+            self._measure("counts: index", lambda: inscribed_counts(instance_ids), options["repeat"]),
+            self._measure("lists: JSON contains", legacy_lists, options["repeat"]),
+            self._measure("lists: index", lambda: inscribed_leads_by_instance(instance_ids, LEAD_FIELDS), options["repeat"]),
+        ]
+        if legacy_counts() != inscribed_counts(instance_ids):
+            self.stdout.write(self.style.ERROR("Counts differ between JSON and index"))
+
+        self.stdout.write("")
+        self.stdout.write(f"{'read':<24} {'mean ms':>10} {'p50 ms':>10} {'queries':>8}")
+        for r in results:
+            self.stdout.write(f"{r['name']:<24} {r['mean']:>10.1f} {r['p50']:>10.1f} {r['queries']:>8}")
+
+    def _measure(self, name, fn, repeat):
+        timings = []
+        queries = 0
+        for _ in range(repeat):
+            with CaptureQueriesContext(connection) as captured:
+                t0 = time.perf_counter()
+                fn()
+                timings.append((time.perf_counter() - t0) * 1000)
+            queries = len(captured)
+        return {"name": name, "mean": statistics.mean(timings), "p50": statistics.median(timings), "queries": queries}
@@ -0,0 +1,21 @@
+"""
+Rebuild ErasmusActivityInscription from ErasmusLead.interested_experiences.
+
+Lead saves keep the index in sync; run this after bulk edits that bypass save()
+(queryset.update, raw SQL, imports with bulk_create) or to check for drift.
+
+Usage:
+    python manage.py sync_erasmus_inscriptions
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.erasmus.inscriptions import rebuild_inscriptions
+
+
+class Command(BaseCommand):
+    help = "Rebuild the Erasmus inscription index from interested_experiences"
+
+    def handle(self, *args, **options):
+        added, removed = rebuild_inscriptions()
+        self.stdout.write(self.style.SUCCESS(f"Inscriptions synced: {added} added, {removed} removed"))
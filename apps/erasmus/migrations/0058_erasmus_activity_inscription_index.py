@@ -0,0 +1,92 @@
+# Normalized (lead, instance) inscription index + GIN index for legacy interested_experiences reads
+
+import uuid
+
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def backfill_inscriptions(apps, schema_editor):
+    ErasmusLead = apps.get_model("erasmus", "ErasmusLead")
+    ErasmusActivityInstance = apps.get_model("erasmus", "ErasmusActivityInstance")
+    ErasmusActivityInscription = apps.get_model("erasmus", "ErasmusActivityInscription")
+
+    instance_ids = {str(pk) for pk in ErasmusActivityInstance.objects.values_list("id", flat=True)}
+    batch = []
+    leads = ErasmusLead.objects.exclude(interested_experiences=[]).values_list(
+        "id", "interested_experiences", "updated_at"
+    )
+    for lead_id, experiences, updated_at in leads.iterator(chunk_size=2000):
+        seen = set()
+        for value in experiences or []:
+            try:
+                pk = str(uuid.UUID(str(value).strip()))
+            except (ValueError, TypeError, AttributeError):
+                continue
+            if pk in instance_ids and pk not in seen:
+                seen.add(pk)
+                batch.append(ErasmusActivityInscription(lead_id=lead_id, instance_id=pk, created_at=updated_at))
+        if len(batch) >= 2000:
+            ErasmusActivityInscription.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    if batch:
+        ErasmusActivityInscription.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("erasmus", "0057_rename_erasmus_con_contest_5a0f0d_idx_erasmus_con_contest_68a53a_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ErasmusActivityInscription",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("created_at", models.DateTimeField(default=django.utils.timezone.now, verbose_name="created at")),
+                (
+                    "instance",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="inscriptions",
+                        to="erasmus.erasmusactivityinstance",
+                        verbose_name="activity instance",
+                    ),
+                ),
+                (
+                    "lead",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="activity_inscriptions",
+                        to="erasmus.erasmuslead",
+                        verbose_name="lead",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Erasmus activity inscription",
+                "verbose_name_plural": "Erasmus activity inscriptions",
+                "ordering": ["-created_at"],
+                "indexes": [models.Index(fields=["instance", "created_at"], name="erasmus_inscription_inst_idx")],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="erasmusactivityinscription",
+            constraint=models.UniqueConstraint(
+                fields=("lead", "instance"),
+                name="erasmus_activity_inscription_lead_instance_unique",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="erasmuslead",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["interested_experiences"],
+                name="erasmus_lead_interested_gin",
+                opclasses=["jsonb_path_ops"],
+            ),
+        ),
+        migrations.RunPython(backfill_inscriptions, migrations.RunPython.noop),
+    ]
@@ -3,6 +3,7 @@
 import calendar
 from datetime import date
 
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 from django.conf import settings
 from django.core.exceptions import ValidationError
@@ -242,6 +243,14 @@ class ErasmusLead(TimeStampedModel):
         verbose_name = _("Erasmus lead")
         verbose_name_plural = _("Erasmus leads")
         ordering = ["-created_at"]
+        indexes = [
+            # Legacy inscription reads (interested_experiences__contains); see ErasmusActivityInscription
+            GinIndex(
+                fields=["interested_experiences"],
+                name="erasmus_lead_interested_gin",
+                opclasses=["jsonb_path_ops"],
+            ),
+        ]
 
     def __str__(self):
         return f"{self.first_name} {self.last_name} ({self.email or self.phone_number})"
@@ -1315,6 +1324,44 @@ class ErasmusActivityPaymentLink(models.Model):
         return f"{self.lead} – {self.instance} – {self.amount}"
 
 
+class ErasmusActivityInscription(models.Model):
+    """
+    Normalized inscription of a lead in an activity instance.
+
+    Mirrors the instance ids stored in ErasmusLead.interested_experiences (kept in sync on
+    lead save, see apps.erasmus.inscriptions) so counts and inscrit lists are indexed
+    grouped queries instead of one JSON containment scan per instance.
+    """
+    lead = models.ForeignKey(
+        ErasmusLead,
+        on_delete=models.CASCADE,
+        related_name="activity_inscriptions",
+        verbose_name=_("lead"),
+    )
+    instance = models.ForeignKey(
+        ErasmusActivityInstance,
+        on_delete=models.CASCADE,
+        related_name="inscriptions",
+        verbose_name=_("activity instance"),
+    )
+    created_at = models.DateTimeField(_("created at"), default=timezone.now)
+
+    class Meta:
+        verbose_name = _("Erasmus activity inscription")
+        verbose_name_plural = _("Erasmus activity inscriptions")
+        ordering = ["-created_at"]
+        indexes = [models.Index(fields=["instance", "created_at"], name="erasmus_inscription_inst_idx")]
+        constraints = [
+            models.UniqueConstraint(
+                fields=("lead", "instance"),
+                name="erasmus_activity_inscription_lead_instance_unique",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.lead} – {self.instance}"
+
+
 class ErasmusActivityReview(TimeStampedModel):
     """
     Review left by a student for a specific instance of an Erasmus activity.
@@ -10,6 +10,7 @@ from .models import (
     ErasmusActivityNotificationConfig,
     ErasmusActivityInstance,
 )
+from .inscriptions import inscribed_count
 
 logger = logging.getLogger(__name__)
 
@@ -157,9 +158,7 @@ def notify_activity_inscription(lead: ErasmusLead, instance: ErasmusActivityInst
         logger.debug("[ActivityNotify] No configs for activity %s; skip.", activity.id)
         return 0
 
-    total_inscribed = ErasmusLead.objects.filter(
-        interested_experiences__contains=[str(instance.id)]
-    ).count()
+    total_inscribed = inscribed_count(instance)
 
     message = _format_activity_inscription_message(lead, instance, total_inscribed)
     sent = 0
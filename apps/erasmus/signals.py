@@ -0,0 +1,19 @@
+"""Signals for the Erasmus app."""
+
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from apps.erasmus.inscriptions import sync_lead_inscriptions
+from apps.erasmus.models import ErasmusLead
+
+
+@receiver(post_save, sender=ErasmusLead)
+def sync_inscriptions_on_lead_save(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    """Keep ErasmusActivityInscription in sync with interested_experiences."""
+    if raw:
+        return
+    if update_fields is not None and "interested_experiences" not in update_fields:
+        return
+    if created and not instance.interested_experiences:
+        return
+    sync_lead_inscriptions(instance)
@@ -0,0 +1,64 @@
+"""
+Inscription index (apps.erasmus.inscriptions): rows follow interested_experiences on
+lead save, non-instance ids are ignored, and grouped counts/lists match the JSON field.
+"""
+from django.test import TestCase
+
+from apps.erasmus.inscriptions import (
+    inscribed_counts,
+    inscribed_leads,
+    inscribed_leads_by_instance,
+    rebuild_inscriptions,
+)
+from apps.erasmus.models import ErasmusActivity, ErasmusActivityInscription, ErasmusActivityInstance, ErasmusLead
+
+
+class InscriptionIndexTests(TestCase):
+
+    def setUp(self):
+        activity = ErasmusActivity.objects.create(title_es="Trekking", slug="trekking")
+        self.first = ErasmusActivityInstance.objects.create(activity=activity, display_order=0)
+        self.second = ErasmusActivityInstance.objects.create(activity=activity, display_order=1)
+
+    def _lead(self, name, experiences):
+        return ErasmusLead.objects.create(
+            first_name=name, last_name="Test", phone_country_code="+56", phone_number="900000000",
+            stay_reason="university", interested_experiences=experiences,
+        )
+
+    def test_lead_save_syncs_rows(self):
+        lead = self._lead("Ana", [str(self.first.id), "timeline-item", "not-a-uuid"])
+        self.assertEqual(list(lead.activity_inscriptions.values_list("instance_id", flat=True)), [self.first.id])
+
+        lead.interested_experiences = [str(self.second.id)]
+        lead.save(update_fields=["interested_experiences", "updated_at"])
+        self.assertEqual(list(lead.activity_inscriptions.values_list("instance_id", flat=True)), [self.second.id])
+
+    def test_counts_and_lists_are_grouped(self):
+        self._lead("Ana", [str(self.first.id)])
+        self._lead("Ben", [str(self.first.id), str(self.second.id)])
+
+        with self.assertNumQueries(1):
+            counts = inscribed_counts([self.first.id, self.second.id])
+        self.assertEqual(counts, {str(self.first.id): 2, str(self.second.id): 1})
+
+        with self.assertNumQueries(1):
+            lists = inscribed_leads_by_instance([self.first.id, self.second.id], ["first_name"])
+        self.assertCountEqual([row["first_name"] for row in lists[str(self.first.id)]], ["Ana", "Ben"])
+        self.assertEqual(inscribed_leads(self.second).get().first_name, "Ben")
+
+    def test_counts_match_legacy_json_reads(self):
+        for i in range(3):
+            self._lead(f"L{i}", [str(self.first.id)] if i % 2 else [str(self.first.id), str(self.second.id)])
+        for inst in (self.first, self.second):
+            legacy = ErasmusLead.objects.filter(interested_experiences__contains=[str(inst.id)]).count()
+            self.assertEqual(inscribed_counts([inst.id])[str(inst.id)], legacy)
+
+    def test_rebuild_repairs_drift(self):
+        lead = self._lead("Ana", [str(self.first.id)])
+        ErasmusLead.objects.filter(id=lead.id).update(interested_experiences=[str(self.second.id)])
+
+        self.assertEqual(rebuild_inscriptions(), (1, 1))
+        self.assertEqual(
+            list(ErasmusActivityInscription.objects.values_list("instance_id", flat=True)), [self.second.id]
+        )
@@ -134,6 +134,16 @@ class EventView(BaseModel):
         """
         🚀 ENTERPRISE: Track an event view with full analytics data.
         """
+        view = cls.build_view(event, request, session_id)
+        view.save(force_insert=True)
+        return view
+    
+    @classmethod
+    def build_view(cls, event, request, session_id=None):
+        """
+        Unsaved view with every analytics field derived from the request
+        (persisted by track_view, or buffered by core.analytics_ingest).
+        """
         from django.contrib.gis.geoip2 import GeoIP2
         from user_agents import parse
         
@@ -161,8 +171,7 @@ class EventView(BaseModel):
         except:
             pass
         
-        # Create view record
-        view = cls.objects.create(
+        return cls(
             event=event,
             user=request.user if request.user.is_authenticated else None,
             session_id=session_id,
@@ -179,8 +188,6 @@ class EventView(BaseModel):
             country=country,
             city=city
         )
-        
-        return view
     
     @staticmethod
     def _get_client_ip(request):
@@ -11,7 +11,7 @@ Usage:
     from apps.events.email_context import build_order_confirmation_context
     
     context = build_order_confirmation_context(order, recipient_tickets)
-    html = render_to_string('emails/order_confirmation.html', context)
+    html = render_email('emails/order_confirmation.html', context)
 """
 
 import logging
@@ -19,9 +19,35 @@ from typing import List, Dict, Any
 from django.conf import settings
 from django.utils import timezone
 
+from core.email_rendering import cached_fragment
+
 logger = logging.getLogger(__name__)
 
 
+def _build_event_data(event) -> Dict[str, Any]:
+    """Event fields used by the confirmation templates (no order/ticket data)."""
+    first_image = event.images.first()
+    return {
+        'title': event.title,
+        'description': event.description or '',
+        'start_date': event.start_date,
+        'end_date': event.end_date,
+        'location': event.location.name if event.location else 'Por confirmar',
+        'address': event.location.address if event.location else '',
+        'city': '',  # Location model doesn't have city field
+        'images_url': first_image.image.url if first_image else None,
+    }
+
+
+def _build_organizer_data(organizer) -> Dict[str, Any]:
+    return {
+        'name': organizer.name,
+        'email': organizer.contact_email or '',
+        'phone': organizer.contact_phone or '',
+        'website': organizer.website or '',
+    }
+
+
 def build_order_confirmation_context(order, tickets: List, raffle_tickets: List = None) -> Dict[str, Any]:
     """
     Build complete context for order confirmation email.
@@ -76,27 +102,11 @@ def build_order_confirmation_context(order, tickets: List, raffle_tickets: List
             }
             raffle_tickets_data.append(raffle_data)
         
-        # Pre-compute event data
+        # Event and organizer parts are shared by every email of the event (cached per updated_at)
         event = order.event
-        event_data = {
-            'title': event.title,
-            'description': event.description or '',
-            'start_date': event.start_date,
-            'end_date': event.end_date,
-            'location': event.location.name if event.location else 'Por confirmar',
-            'address': event.location.address if event.location else '',
-            'city': '',  # Location model doesn't have city field
-            'images_url': event.images.first().image.url if event.images.exists() else None,
-        }
-        
-        # Pre-compute organizer data
+        event_data = cached_fragment('event', event, _build_event_data)
         organizer = event.organizer
-        organizer_data = {
-            'name': organizer.name,
-            'email': organizer.contact_email or '',
-            'phone': organizer.contact_phone or '',
-            'website': organizer.website or '',
-        }
+        organizer_data = cached_fragment('organizer', organizer, _build_organizer_data)
         
         # Pre-compute order data
         order_data = {
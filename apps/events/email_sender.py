@@ -19,20 +19,22 @@ import time
 from typing import Dict, Any, List, Optional
 from django.conf import settings
 from django.core.mail import EmailMultiAlternatives, get_connection
-from django.template.loader import render_to_string
 from django.utils import timezone
 from email.mime.image import MIMEImage
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 import base64
 
+from core.email_rendering import render_email, static_image_bytes
+
 logger = logging.getLogger(__name__)
 
 
 def send_order_confirmation_email_optimized(
     order_id: str,
     to_email: Optional[str] = None,
-    flow_id: Optional[str] = None
+    flow_id: Optional[str] = None,
+    connection=None
 ) -> Dict[str, Any]:
     """
     🚀 ENTERPRISE: Send order confirmation email with <10s latency.
@@ -41,12 +43,14 @@ def send_order_confirmation_email_optimized(
     - Uses pre-generated QR codes from database
     - Pre-computed email context
     - No file I/O during send
+    - Persistent SMTP connections (core.smtp_pool)
     - Detailed performance metrics
     
     Args:
         order_id: UUID of the order
         to_email: Optional override email address
         flow_id: Optional flow ID for tracking
+        connection: Optional open email connection (batch sends); pooled when omitted
         
     Returns:
         Dict with status, timing metrics, and results
@@ -58,6 +62,7 @@ def send_order_confirmation_email_optimized(
         'fetch_time_ms': 0,
         'context_time_ms': 0,
         'render_time_ms': 0,
+        'connection_time_ms': 0,
         'smtp_time_ms': 0,
         'total_time_ms': 0,
     }
@@ -66,6 +71,7 @@ def send_order_confirmation_email_optimized(
         from apps.events.models import Order, EmailLog
         from apps.events.email_context import build_order_confirmation_context
         from core.flow_logger import FlowLogger
+        from core.smtp_pool import send_messages, smtp_connection
         
         # 1. Fetch order with optimized query
         fetch_start = time.time()
@@ -159,8 +165,8 @@ def send_order_confirmation_email_optimized(
                 
                 # Render templates (using ORIGINAL templates, no changes to design)
                 render_start = time.time()
-                html_message = render_to_string('emails/order_confirmation.html', context)
-                text_message = render_to_string('emails/order_confirmation.txt', context)
+                html_message = render_email('emails/order_confirmation.html', context)
+                text_message = render_email('emails/order_confirmation.txt', context)
                 render_time = int((time.time() - render_start) * 1000)
                 metrics['render_time_ms'] = max(metrics['render_time_ms'], render_time)
                 
@@ -192,18 +198,17 @@ def send_order_confirmation_email_optimized(
                 html_part = MIMEText(html_message, 'html', 'utf-8')
                 related_msg.attach(html_part)
                 
-                # 🚀 ENTERPRISE: Generate and attach QR codes on-the-fly (no DB writes)
-                # Esto evita problemas de transacciones y asegura que SIEMPRE haya QR,
-                # incluso para órdenes antiguas sin qr_code en la base de datos.
-                import os
-                from apps.events.qr_generator import generate_qr_image
+                # 🚀 ENTERPRISE: Attach QR codes from the pre-generated ticket.qr_code (no DB writes).
+                # Órdenes antiguas sin qr_code en la base de datos se generan on-the-fly,
+                # así que SIEMPRE hay QR.
+                from apps.events.qr_generator import get_ticket_qr_png
                 
                 frontend_url = getattr(settings, 'FRONTEND_URL', 'http://localhost:8080')
                 qr_attached_count = 0
                 
                 for ticket in recipient_regular:
                     try:
-                        qr_bytes = generate_qr_image(ticket.ticket_number, frontend_url)
+                        qr_bytes = get_ticket_qr_png(ticket, frontend_url)
                         qr_image = MIMEImage(qr_bytes)
                         content_id = f'qr_code_{ticket.ticket_number}'
                         qr_image.add_header('Content-ID', f'<{content_id}>')
@@ -214,7 +219,7 @@ def send_order_confirmation_email_optimized(
                         related_msg.attach(qr_image)  # Attach to related, not root
                         qr_attached_count += 1
                         logger.info(
-                            f"📧 [EMAIL_OPTIMIZED] Generated & attached QR for ticket {ticket.ticket_number} "
+                            f"📧 [EMAIL_OPTIMIZED] Attached QR for ticket {ticket.ticket_number} "
                             f"(Content-ID: {content_id}, size: {len(qr_bytes)} bytes)"
                         )
                     except Exception as e:
@@ -223,25 +228,23 @@ def send_order_confirmation_email_optimized(
                 logger.info(f"📧 [EMAIL_OPTIMIZED] Attached {qr_attached_count} QR codes for {len(recipient_regular)} regular tickets")
                 
                 # Attach logos (same as original)
-                logo_negro_path = os.path.join(settings.BASE_DIR, 'static/images/logos/logo-negro.png')
-                if os.path.exists(logo_negro_path):
-                    with open(logo_negro_path, 'rb') as logo_file:
-                        logo_negro = MIMEImage(logo_file.read())
-                        logo_negro.add_header('Content-ID', '<logo_negro>')
-                        # CRITICAL: No filename in Content-Disposition inline to prevent Apple Mail from showing as attachment
-                        logo_negro.add_header('Content-Disposition', 'inline')
-                        logo_negro.add_header('X-Attachment-Id', 'logo_negro')
-                        related_msg.attach(logo_negro)  # Attach to related, not root
+                logo_negro_bytes = static_image_bytes('static/images/logos/logo-negro.png')
+                if logo_negro_bytes:
+                    logo_negro = MIMEImage(logo_negro_bytes)
+                    logo_negro.add_header('Content-ID', '<logo_negro>')
+                    # CRITICAL: No filename in Content-Disposition inline to prevent Apple Mail from showing as attachment
+                    logo_negro.add_header('Content-Disposition', 'inline')
+                    logo_negro.add_header('X-Attachment-Id', 'logo_negro')
+                    related_msg.attach(logo_negro)  # Attach to related, not root
                 
-                isotipo_path = os.path.join(settings.BASE_DIR, 'static/images/logos/isotipo-azul.png')
-                if os.path.exists(isotipo_path):
-                    with open(isotipo_path, 'rb') as isotipo_file:
-                        isotipo_azul = MIMEImage(isotipo_file.read())
-                        isotipo_azul.add_header('Content-ID', '<isotipo_azul>')
-                        # CRITICAL: No filename in Content-Disposition inline to prevent Apple Mail from showing as attachment
-                        isotipo_azul.add_header('Content-Disposition', 'inline')
-                        isotipo_azul.add_header('X-Attachment-Id', 'isotipo_azul')
-                        related_msg.attach(isotipo_azul)  # Attach to related, not root
+                isotipo_bytes = static_image_bytes('static/images/logos/isotipo-azul.png')
+                if isotipo_bytes:
+                    isotipo_azul = MIMEImage(isotipo_bytes)
+                    isotipo_azul.add_header('Content-ID', '<isotipo_azul>')
+                    # CRITICAL: No filename in Content-Disposition inline to prevent Apple Mail from showing as attachment
+                    isotipo_azul.add_header('Content-Disposition', 'inline')
+                    isotipo_azul.add_header('X-Attachment-Id', 'isotipo_azul')
+                    related_msg.attach(isotipo_azul)  # Attach to related, not root
                 
                 # Attach the related container (HTML + images) to alternative
                 alternative_msg.attach(related_msg)
@@ -307,11 +310,11 @@ def send_order_confirmation_email_optimized(
                 
                 custom_email = CustomEmailMessage(root_msg, from_email, recipient_email)
                 
-                # Send using Django's connection
-                smtp_start = time.time()
-                connection = get_connection(fail_silently=False)
-                connection.send_messages([custom_email])
-                smtp_time = int((time.time() - smtp_start) * 1000)
+                # Send over a persistent pooled connection (or the caller's batch connection)
+                with smtp_connection(connection, metrics) as smtp:
+                    smtp_start = time.time()
+                    send_messages(smtp, [custom_email])
+                    smtp_time = int((time.time() - smtp_start) * 1000)
                 metrics['smtp_time_ms'] = max(metrics['smtp_time_ms'], smtp_time)
                 
                 # Update EmailLog
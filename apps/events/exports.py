@@ -0,0 +1,468 @@
+"""
+🚀 ENTERPRISE: Attendee and order exports for events (CSV / XLSX).
+
+Exports are built row by row over a server-side cursor (``QuerySet.iterator``) so a
+30k-attendee event never holds every ticket, row or cell in memory:
+
+- CSV is streamed to the client with ``StreamingHttpResponse``.
+- XLSX is written with openpyxl's write-only mode to a temporary file that is then
+  streamed with ``FileResponse``.
+- Form fields of all ticket tiers are loaded once, in a single query.
+- Large exports can run as a Celery job (``export_event_data``) that uploads the file
+  to the export storage (``EVENT_EXPORTS['STORAGE']``, a private bucket in production).
+  Files are only served through the authenticated ``export_download`` endpoint and are
+  deleted by ``purge_expired_event_exports`` once LINK_TTL has passed.
+
+Usage:
+    from apps.events.exports import build_export_response
+
+    return build_export_response(event, 'attendees', 'excel')
+"""
+
+import csv
+import logging
+import tempfile
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.http import FileResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Font, PatternFill
+from openpyxl.utils import get_column_letter
+
+from apps.events.models import Order, Ticket
+
+logger = logging.getLogger(__name__)
+
+KIND_ATTENDEES = 'attendees'
+KIND_ORDERS = 'orders'
+EXPORT_KINDS = (KIND_ATTENDEES, KIND_ORDERS)
+
+CSV_CONTENT_TYPE = 'text/csv; charset=utf-8'
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+ATTENDEE_HEADERS = [
+    'Número de Ticket',
+    'Nombre',
+    'Apellido',
+    'Email',
+    'Tipo de Ticket',
+    'Precio del Ticket',
+    'Estado del Ticket',
+    'Estado de Check-in',
+    'Fecha de Check-in',
+    'Check-in por',
+    'Estado de Aprobación',
+    'Aprobado por',
+    'Fecha de Aprobación',
+    'Razón de Rechazo',
+    'Número de Orden',
+    'Estado de Orden',
+    'Método de Pago',
+    'Total de Orden',
+    'Fecha de Compra',
+    'Fecha de Pago',
+    'Teléfono del Comprador',
+    'Nombre del Comprador',
+    'IP de Compra',
+    'Cupón Usado',
+    'Descuento Aplicado',
+]
+
+ORDER_HEADERS = [
+    'Número de Orden',
+    'Estado de Orden',
+    'Fecha de Creación',
+    'Fecha de Pago',
+    'Email del Comprador',
+    'Nombre del Comprador',
+    'Apellido del Comprador',
+    'Teléfono',
+    'Subtotal',
+    'Impuestos',
+    'Comisión de Servicio',
+    'Descuento',
+    'Total',
+    'Moneda',
+    'Método de Pago',
+    'ID de Transacción',
+    'Cupón Usado',
+    'Código de Cupón',
+    'IP de Compra',
+    'User Agent',
+    'Cantidad de Tickets',
+    'Tipos de Tickets',
+    'Precios Unitarios',
+    'Notas',
+    'Monto Reembolsado',
+    'Razón de Reembolso',
+]
+
+SHEET_TITLES = {KIND_ATTENDEES: 'Asistentes', KIND_ORDERS: 'Pedidos'}
+FILENAME_PREFIXES = {KIND_ATTENDEES: 'asistentes', KIND_ORDERS: 'pedidos'}
+
+
+def _export_settings():
+    return getattr(settings, 'EVENT_EXPORTS', {})
+
+
+def _chunk_size():
+    return _export_settings().get('CHUNK_SIZE', 2000)
+
+
+# ============================================================================
+# Querysets
+# ============================================================================
+
+def event_form_fields(event):
+    """Custom form fields of all the event's ticket tiers (one query), de-duplicated by label."""
+    from apps.forms.models import FormField
+
+    fields = FormField.objects.filter(form__ticket_tiers__event=event).order_by(
+        'form__ticket_tiers__order', 'form__ticket_tiers__price', 'order'
+    )
+    seen_labels = set()
+    form_fields = []
+    for field in fields:
+        if field.label not in seen_labels:
+            seen_labels.add(field.label)
+            form_fields.append(field)
+    return form_fields
+
+
+def attendee_queryset(event):
+    return Ticket.objects.filter(
+        order_item__order__event=event
+    ).select_related(
+        'order_item__order',
+        'order_item__order__coupon',
+        'order_item__ticket_tier',
+        'check_in_by',
+        'approved_by',
+    ).order_by('created_at')
+
+
+def order_queryset(event):
+    return Order.objects.filter(
+        event=event
+    ).select_related(
+        'coupon'
+    ).prefetch_related(
+        'items__ticket_tier'
+    ).order_by('created_at')
+
+
+def export_queryset(event, kind):
+    return attendee_queryset(event) if kind == KIND_ATTENDEES else order_queryset(event)
+
+
+# ============================================================================
+# Rows
+# ============================================================================
+
+def _datetime(value, for_excel):
+    if not value:
+        return ''
+    if for_excel:
+        return value.replace(tzinfo=None)
+    return value.strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _amount(value, for_excel):
+    return float(value) if for_excel else str(value)
+
+
+def attendee_row(ticket, form_fields, for_excel=False):
+    order = ticket.order_item.order
+    row = [
+        ticket.ticket_number,
+        ticket.first_name,
+        ticket.last_name,
+        ticket.email,
+        ticket.order_item.ticket_tier.name if ticket.order_item.ticket_tier else 'N/A',
+        _amount(ticket.order_item.unit_price, for_excel),
+        ticket.get_status_display(),
+        ticket.get_check_in_status_display(),
+        _datetime(ticket.check_in_time, for_excel),
+        ticket.check_in_by.get_full_name() if ticket.check_in_by else '',
+        ticket.get_approval_status_display() if ticket.approval_status else '',
+        ticket.approved_by.get_full_name() if ticket.approved_by else '',
+        _datetime(ticket.approved_at, for_excel),
+        ticket.rejection_reason,
+        order.order_number,
+        order.get_status_display(),
+        order.payment_method,
+        _amount(order.total, for_excel),
+        _datetime(order.created_at, for_excel),
+        _datetime(order.updated_at, for_excel) if order.is_paid else '',
+        order.phone,
+        f"{order.first_name} {order.last_name}".strip(),
+        order.ip_address or '',
+        order.coupon.code if order.coupon else '',
+        _amount(order.discount, for_excel) if order.discount > 0 else (0 if for_excel else '0'),
+    ]
+    form_data = ticket.form_data or {}
+    for field in form_fields:
+        value = form_data.get(str(field.id), '')
+        # openpyxl only takes scalars (multi-select answers are lists)
+        row.append(value if for_excel and isinstance(value, (str, int, float)) else str(value))
+    return row
+
+
+def order_row(order, for_excel=False):
+    ticket_types = []
+    unit_prices = []
+    total_tickets = 0
+    for item in order.items.all():
+        ticket_types.append(f"{item.ticket_tier.name} (x{item.quantity})")
+        unit_prices.append(f"{item.ticket_tier.name}: ${item.unit_price}")
+        total_tickets += item.quantity
+
+    return [
+        order.order_number,
+        order.get_status_display(),
+        _datetime(order.created_at, for_excel),
+        _datetime(order.updated_at, for_excel) if order.is_paid else '',
+        order.email,
+        order.first_name,
+        order.last_name,
+        order.phone,
+        _amount(order.subtotal, for_excel),
+        _amount(order.taxes, for_excel),
+        _amount(order.service_fee, for_excel),
+        _amount(order.discount, for_excel),
+        _amount(order.total, for_excel),
+        order.currency,
+        order.payment_method,
+        order.payment_id or '',
+        'Sí' if order.coupon else 'No',
+        order.coupon.code if order.coupon else '',
+        order.ip_address or '',
+        order.user_agent,
+        total_tickets if for_excel else str(total_tickets),
+        '; '.join(ticket_types),
+        '; '.join(unit_prices),
+        order.notes,
+        _amount(order.refunded_amount, for_excel),
+        order.refund_reason,
+    ]
+
+
+def export_table(event, kind, for_excel=False):
+    """(headers, row iterator) for an export; rows are read over a server-side cursor."""
+    queryset = export_queryset(event, kind)
+    if kind == KIND_ATTENDEES:
+        form_fields = event_form_fields(event)
+        headers = ATTENDEE_HEADERS + [f'Campo: {field.label}' for field in form_fields]
+        rows = (attendee_row(t, form_fields, for_excel) for t in queryset.iterator(chunk_size=_chunk_size()))
+    else:
+        headers = list(ORDER_HEADERS)
+        rows = (order_row(o, for_excel) for o in queryset.iterator(chunk_size=_chunk_size()))
+    return headers, rows
+
+
+# ============================================================================
+# Writers
+# ============================================================================
+
+class _Echo:
+    """File-like object whose write() returns the value, for csv.writer in generators."""
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(headers, rows):
+    """CSV lines (with a UTF-8 BOM so Excel detects the encoding)."""
+    writer = csv.writer(_Echo())
+    yield '\ufeff'
+    yield writer.writerow(headers)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def write_xlsx(fileobj, sheet_title, headers, rows):
+    """Write an XLSX in openpyxl write-only mode (rows are flushed as they are added)."""
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(title=sheet_title)
+
+    # Write-only sheets cannot be measured after the fact: size columns from the headers
+    for col, header in enumerate(headers, 1):
+        ws.column_dimensions[get_column_letter(col)].width = min(max(len(header) + 2, 14), 50)
+
+    header_font = Font(bold=True, color="FFFFFF")
+    header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+    header_alignment = Alignment(horizontal="center", vertical="center")
+    header_cells = []
+    for header in headers:
+        cell = WriteOnlyCell(ws, value=header)
+        cell.font = header_font
+        cell.fill = header_fill
+        cell.alignment = header_alignment
+        header_cells.append(cell)
+    ws.append(header_cells)
+
+    count = 0
+    for row in rows:
+        ws.append(row)
+        count += 1
+    wb.save(fileobj)
+    return count
+
+
+def export_filename(event, kind, export_format):
+    extension = 'xlsx' if export_format == 'excel' else 'csv'
+    return f"{FILENAME_PREFIXES[kind]}_{event.slug}_{timezone.now().strftime('%Y%m%d_%H%M%S')}.{extension}"
+
+
+def build_export_response(event, kind, export_format):
+    """Streaming CSV, or an XLSX built in write-only mode and streamed from a temporary file."""
+    filename = export_filename(event, kind, export_format)
+    if export_format == 'excel':
+        headers, rows = export_table(event, kind, for_excel=True)
+        tmp = tempfile.TemporaryFile()
+        write_xlsx(tmp, SHEET_TITLES[kind], headers, rows)
+        tmp.seek(0)
+        return FileResponse(tmp, as_attachment=True, filename=filename, content_type=XLSX_CONTENT_TYPE)
+
+    headers, rows = export_table(event, kind)
+    response = StreamingHttpResponse(iter_csv(headers, rows), content_type=CSV_CONTENT_TYPE)
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+# ============================================================================
+# Background jobs
+# ============================================================================
+
+def export_storage():
+    """
+    Storage for background export files: EVENT_EXPORTS['STORAGE'] ({'BACKEND', 'OPTIONS'}),
+    else the default storage. Files are never linked directly, so a private bucket works.
+    """
+    options = _export_settings().get('STORAGE')
+    if not options:
+        return default_storage
+    return import_string(options['BACKEND'])(**options.get('OPTIONS', {}))
+
+
+def _job_cache_key(job_id):
+    return f"event_export_job:{job_id}"
+
+
+def get_export_job(job_id):
+    return cache.get(_job_cache_key(job_id))
+
+
+def _set_export_job(job_id, data):
+    cache.set(_job_cache_key(job_id), data, _export_settings().get('LINK_TTL', 86400))
+
+
+def start_export_job(event, kind, export_format):
+    """Queue export_event_data and return the job record ({'job_id', 'status', ...})."""
+    from apps.events.tasks import export_event_data
+
+    job_id = uuid.uuid4().hex
+    job = {
+        'job_id': job_id,
+        'event_id': str(event.id),
+        'kind': kind,
+        'export_format': export_format,
+        'status': 'pending',
+        'url': None,
+        'rows': None,
+        'error': None,
+    }
+    _set_export_job(job_id, job)
+    export_event_data.apply_async(args=[job_id, str(event.id), kind, export_format])
+    return job
+
+
+def run_export_job(job_id, event_id, kind, export_format):
+    """Build the export into a temporary file, upload it to the export storage and record its path."""
+    from apps.events.models import Event
+
+    job = get_export_job(job_id) or {
+        'job_id': job_id, 'event_id': str(event_id), 'kind': kind, 'export_format': export_format,
+    }
+    job.update({'status': 'running', 'error': None})
+    _set_export_job(job_id, job)
+
+    try:
+        event = Event.objects.get(id=event_id)
+        filename = export_filename(event, kind, export_format)
+        with tempfile.TemporaryFile() as tmp:
+            if export_format == 'excel':
+                headers, rows = export_table(event, kind, for_excel=True)
+                count = write_xlsx(tmp, SHEET_TITLES[kind], headers, rows)
+            else:
+                headers, rows = export_table(event, kind)
+                count = -2  # BOM and header lines
+                for line in iter_csv(headers, rows):
+                    tmp.write(line.encode('utf-8'))
+                    count += 1
+            tmp.seek(0)
+            prefix = _export_settings().get('STORAGE_PREFIX', 'exports/events')
+            path = export_storage().save(f"{prefix}/{event_id}/{job_id}/{filename}", File(tmp))
+    except Exception as e:
+        logger.error(f"❌ [EXPORT] Job {job_id} ({kind}/{export_format}) for event {event_id} failed: {e}", exc_info=True)
+        job.update({'status': 'failed', 'error': str(e)})
+        _set_export_job(job_id, job)
+        raise
+
+    job.update({'status': 'completed', 'path': path, 'rows': count, 'filename': filename})
+    _set_export_job(job_id, job)
+    logger.info(f"✅ [EXPORT] Job {job_id}: {count} {kind} rows exported for event {event_id}")
+    return job
+
+
+def export_job_payload(job, download_url):
+    """Job record for API responses: the storage path stays internal, url is the authenticated download."""
+    payload = {key: value for key, value in job.items() if key != 'path'}
+    payload['url'] = f"{download_url}?job_id={job['job_id']}" if job.get('path') else None
+    return payload
+
+
+def build_export_download_response(job):
+    """Stream a finished job's file from the export storage; None once it has been purged."""
+    storage = export_storage()
+    path = job.get('path')
+    if not path or not storage.exists(path):
+        return None
+    content_type = XLSX_CONTENT_TYPE if job.get('export_format') == 'excel' else CSV_CONTENT_TYPE
+    return FileResponse(
+        storage.open(path, 'rb'), as_attachment=True, filename=job.get('filename'), content_type=content_type,
+    )
+
+
+def purge_expired_exports(now=None):
+    """
+    Delete export files older than LINK_TTL (their job records have expired with them).
+    Layout: <prefix>/<event_id>/<job_id>/<filename>. Returns the number of files deleted.
+    """
+    storage = export_storage()
+    prefix = _export_settings().get('STORAGE_PREFIX', 'exports/events')
+    cutoff = (now or timezone.now()) - timedelta(seconds=_export_settings().get('LINK_TTL', 86400))
+    try:
+        event_dirs, _ = storage.listdir(prefix)
+    except FileNotFoundError:
+        return 0
+
+    deleted = 0
+    for event_dir in event_dirs:
+        job_dirs, _ = storage.listdir(f"{prefix}/{event_dir}")
+        for job_dir in job_dirs:
+            job_path = f"{prefix}/{event_dir}/{job_dir}"
+            for name in storage.listdir(job_path)[1]:
+                path = f"{job_path}/{name}"
+                if storage.get_modified_time(path) < cutoff:
+                    storage.delete(path)
+                    deleted += 1
+    return deleted
@@ -0,0 +1,464 @@
+"""
+🚀 ENTERPRISE: Caching proxy for event images (api/v1/events/views.py::proxy_event_image).
+
+html2canvas loads every image of a ticket PDF through the proxy (for CORS), so each
+ticket view used to cost a fresh GCS download. Objects are now fetched through one
+pooled HTTP session and kept in a bounded on-disk LRU cache
+(IMAGE_PROXY['CACHE_DIR'], least recently served files evicted above MAX_CACHE_BYTES):
+
+- an entry is served as is for REVALIDATE_AFTER_SECONDS, then revalidated with
+  If-None-Match / If-Modified-Since (a 304 only refreshes the entry), and served
+  stale if GCS cannot be reached;
+- ``w`` / ``fmt`` resize on the fly with the media derivative renderer; widths snap
+  to MEDIA_DERIVATIVES['WIDTHS'] and variants are cached under the original's ETag;
+- responses carry ETag, honour If-None-Match and single byte ranges.
+
+Hit/miss counters live in the default cache (``get_image_proxy_stats``).
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from io import BytesIO
+from typing import BinaryIO, Optional
+from urllib.parse import urlparse
+
+import requests
+from django.conf import settings
+from django.http import FileResponse, HttpResponse
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from apps.media.derivatives import render_variant, snap_width
+from core.cache_counters import CacheCounters
+
+logger = logging.getLogger(__name__)
+
+_counters = CacheCounters('image_proxy:count:', ('hit', 'revalidated', 'stale', 'miss', 'error'))
+
+VARIANT_CONTENT_TYPES = {'webp': 'image/webp', 'jpeg': 'image/jpeg'}
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+TEMP_PREFIX = '.tmp'
+
+
+class ProxyError(Exception):
+    """The image could not be served; ``status`` is the HTTP status to answer with."""
+
+    def __init__(self, message, status=502):
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass
+class ProxiedImage:
+    file: BinaryIO
+    size: int
+    content_type: str
+    etag: str
+    cache_status: str  # HIT, REVALIDATED, STALE or MISS
+
+
+def _proxy_settings():
+    return getattr(settings, 'IMAGE_PROXY', {})
+
+
+def get_image_proxy_stats():
+    """Counters since the last reset plus current disk usage."""
+    stats = _counters.values()
+    served = stats['hit'] + stats['revalidated'] + stats['stale']
+    total = served + stats['miss']
+    stats['hit_ratio'] = round(served / total, 4) if total else None
+    stats.update(get_disk_cache().usage())
+    return stats
+
+
+def reset_image_proxy_stats():
+    _counters.reset()
+
+
+# ---------------------------------------------------------------------------
+# Upstream
+# ---------------------------------------------------------------------------
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """Process-wide session: keep-alive connections to GCS are reused across requests."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                pool_size = _proxy_settings().get('POOL_SIZE', 20)
+                adapter = HTTPAdapter(
+                    pool_connections=4,
+                    pool_maxsize=pool_size,
+                    max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=(502, 503, 504)),
+                )
+                session = requests.Session()
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                _session = session
+    return _session
+
+
+def is_allowed_url(url: str) -> bool:
+    """Only our storage: IMAGE_PROXY['ALLOWED_HOSTS'] and the GCS bucket's own hosts."""
+    parsed = urlparse(url or '')
+    if parsed.scheme not in ('http', 'https') or not parsed.hostname:
+        return False
+    allowed = {h.lower() for h in _proxy_settings().get('ALLOWED_HOSTS', ['storage.googleapis.com'])}
+    bucket = getattr(settings, 'GS_BUCKET_NAME', None)
+    if bucket:
+        allowed.update({bucket.lower(), f'{bucket.lower()}.storage.googleapis.com'})
+    return parsed.hostname.lower() in allowed
+
+
+def _download(response) -> bytes:
+    limit = _proxy_settings().get('MAX_OBJECT_BYTES', 20 * 1024 * 1024)
+    chunks = []
+    total = 0
+    for chunk in response.iter_content(chunk_size=65536):
+        total += len(chunk)
+        if total > limit:
+            raise ProxyError(f'Image larger than {limit} bytes', status=502)
+        chunks.append(chunk)
+    return b''.join(chunks)
+
+
+# ---------------------------------------------------------------------------
+# Disk cache
+# ---------------------------------------------------------------------------
+
+class DiskLRUCache:
+    """
+    Bodies in ``<root>/<key[:2]>/<key>`` with metadata in ``<key>.json``. Reads
+    touch the body's mtime; writes are atomic (temp file + rename) and, once the
+    directory exceeds ``max_bytes``, the least recently used entries are removed
+    down to 90% of it. The running size is per process and re-measured on every
+    eviction, so several workers can share the directory.
+    """
+
+    def __init__(self, root: str, max_bytes: int):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._bytes = None
+        self._lock = threading.Lock()
+
+    def _paths(self, key):
+        dirname = os.path.join(self.root, key[:2])
+        return dirname, os.path.join(dirname, key), os.path.join(dirname, f'{key}.json')
+
+    def get(self, key):
+        """``(meta, open body file)`` or None."""
+        _, body, meta_path = self._paths(key)
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            fh = open(body, 'rb')
+        except (OSError, ValueError):
+            return None
+        try:
+            os.utime(body)
+        except OSError:
+            pass
+        return meta, fh
+
+    def put(self, key, meta: dict, data: bytes):
+        dirname, body, meta_path = self._paths(key)
+        os.makedirs(dirname, exist_ok=True)
+        self._write(body, data)
+        self._write(meta_path, json.dumps(meta).encode())
+        self._account(len(data))
+
+    def update_meta(self, key, meta: dict):
+        _, _, meta_path = self._paths(key)
+        self._write(meta_path, json.dumps(meta).encode())
+
+    @staticmethod
+    def _write(path, data: bytes):
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=TEMP_PREFIX)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+    def _entries(self):
+        """[(mtime, size, body path)] of every cached body."""
+        entries = []
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                if name.endswith('.json') or name.startswith(TEMP_PREFIX):
+                    continue
+                path = os.path.join(dirpath, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _account(self, added: int):
+        with self._lock:
+            if self._bytes is None:
+                self._bytes = sum(size for _, size, _ in self._entries())
+            else:
+                self._bytes += added
+            if self._bytes > self.max_bytes:
+                self._bytes = self._evict()
+
+    def _evict(self) -> int:
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * 0.9
+        for _, size, path in entries:
+            if total <= target:
+                break
+            for victim in (path, f'{path}.json'):
+                try:
+                    os.unlink(victim)
+                except OSError:
+                    pass
+            total -= size
+        return total
+
+    def usage(self) -> dict:
+        entries = self._entries()
+        return {'entries': len(entries), 'bytes': sum(size for _, size, _ in entries), 'max_bytes': self.max_bytes}
+
+    def clear(self) -> int:
+        entries = self._entries()
+        for _, _, path in entries:
+            for victim in (path, f'{path}.json'):
+                try:
+                    os.unlink(victim)
+                except OSError:
+                    pass
+        with self._lock:
+            self._bytes = 0
+        return len(entries)
+
+
+_disk_caches = {}
+
+
+def get_disk_cache() -> DiskLRUCache:
+    config = _proxy_settings()
+    root = str(config.get('CACHE_DIR') or os.path.join(tempfile.gettempdir(), 'tuki-image-proxy'))
+    max_bytes = config.get('MAX_CACHE_BYTES', 256 * 1024 * 1024)
+    disk_cache = _disk_caches.get((root, max_bytes))
+    if disk_cache is None:
+        disk_cache = _disk_caches.setdefault((root, max_bytes), DiskLRUCache(root, max_bytes))
+    return disk_cache
+
+
+# ---------------------------------------------------------------------------
+# Fetch
+# ---------------------------------------------------------------------------
+
+def _key(*parts) -> str:
+    return hashlib.sha256('|'.join(parts).encode()).hexdigest()
+
+
+def _store(disk_cache, key, meta, data):
+    try:
+        disk_cache.put(key, meta, data)
+    except OSError as e:
+        # Disk full or read-only: still serve the object
+        logger.warning(f"⚠️ [IMAGE_PROXY] Could not cache {meta['url']}: {e}")
+
+
+def _fetch_original(url: str):
+    """``(meta, file, cache_status)`` for the upstream object at ``url``."""
+    config = _proxy_settings()
+    disk_cache = get_disk_cache()
+    key = _key(url)
+    cached = disk_cache.get(key)
+    now = time.time()
+    headers = {}
+    if cached:
+        meta, fh = cached
+        if now - meta['fetched_at'] < config.get('REVALIDATE_AFTER_SECONDS', 300):
+            return meta, fh, 'HIT'
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+
+    try:
+        response = get_session().get(url, headers=headers, stream=True, timeout=config.get('TIMEOUT', 10))
+    except requests.RequestException as e:
+        if cached:
+            logger.warning(f"⚠️ [IMAGE_PROXY] Serving stale {url}: {e}")
+            return meta, fh, 'STALE'
+        raise ProxyError(f'Failed to fetch image: {e}') from e
+
+    with response:
+        if response.status_code == 304 and cached:
+            meta['fetched_at'] = now
+            try:
+                disk_cache.update_meta(key, meta)
+            except OSError:
+                pass
+            return meta, fh, 'REVALIDATED'
+        if response.status_code >= 500 and cached:
+            logger.warning(f"⚠️ [IMAGE_PROXY] Serving stale {url}: upstream {response.status_code}")
+            return meta, fh, 'STALE'
+        if cached:
+            fh.close()
+        if response.status_code != 200:
+            raise ProxyError(f'Upstream answered {response.status_code}')
+        data = _download(response)
+
+    meta = {
+        'url': url,
+        'etag': response.headers.get('ETag', ''),
+        'last_modified': response.headers.get('Last-Modified', ''),
+        'content_type': response.headers.get('Content-Type', 'image/jpeg'),
+        'size': len(data),
+        'fetched_at': now,
+    }
+    _store(disk_cache, key, meta, data)
+    return meta, BytesIO(data), 'MISS'
+
+
+def _variant(url: str, meta: dict, fh, width: int, fmt: str):
+    """``(meta, file, rendered)`` for the resized ``width``/``fmt`` variant of the original."""
+    disk_cache = get_disk_cache()
+    version = meta.get('etag') or meta.get('last_modified') or str(meta['size'])
+    key = _key(url, version, str(width), fmt)
+    cached = disk_cache.get(key)
+    if cached:
+        fh.close()
+        return cached[0], cached[1], False
+
+    try:
+        data = render_variant(fh.read(), width, fmt)
+    except Exception as e:
+        raise ProxyError(f'Cannot resize image: {e}', status=422) from e
+    finally:
+        fh.close()
+    variant_meta = {
+        'url': url,
+        'etag': f'"{version.strip(chr(34))}-{width}{fmt}"',
+        'content_type': VARIANT_CONTENT_TYPES[fmt],
+        'size': len(data),
+        'fetched_at': meta['fetched_at'],
+    }
+    _store(disk_cache, key, variant_meta, data)
+    return variant_meta, BytesIO(data), True
+
+
+def fetch_image(url: str, width: Optional[int] = None, fmt: Optional[str] = None) -> ProxiedImage:
+    """
+    The image at ``url`` (an allowed storage URL), optionally resized to ``width``
+    (snapped to a derivative width) as ``fmt`` ('webp' or 'jpeg', default 'jpeg').
+    Raises ProxyError.
+    """
+    try:
+        meta, fh, cache_status = _fetch_original(url)
+        if width:
+            fmt = fmt if fmt in VARIANT_CONTENT_TYPES else 'jpeg'
+            meta, fh, rendered = _variant(url, meta, fh, snap_width(width), fmt)
+            if rendered:
+                cache_status = 'MISS'
+    except ProxyError:
+        _counters.incr('error')
+        raise
+    _counters.incr(cache_status.lower())
+    return ProxiedImage(
+        file=fh,
+        size=meta['size'],
+        content_type=meta['content_type'],
+        etag=meta.get('etag', ''),
+        cache_status=cache_status,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Response
+# ---------------------------------------------------------------------------
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if not etag:
+        return False
+    if header.strip() == '*':
+        return True
+    def opaque(tag):
+        return tag.strip().removeprefix('W/')
+
+    return opaque(etag) in {opaque(tag) for tag in header.split(',')}
+
+
+def _parse_range(header: str, size: int):
+    """``(start, end)`` inclusive, 'unsatisfiable', or None to serve the whole body."""
+    match = RANGE_RE.match(header.strip())
+    if not match:
+        return None  # Malformed or multi-range: whole body (RFC 9110)
+    start, end = match.groups()
+    if not start and not end:
+        return None
+    if not start:
+        suffix = int(end)
+        if suffix == 0:
+            return 'unsatisfiable'
+        return max(0, size - suffix), size - 1
+    start = int(start)
+    end = min(int(end), size - 1) if end else size - 1
+    if start >= size or start > end:
+        return 'unsatisfiable'
+    return start, end
+
+
+def build_response(request, image: ProxiedImage):
+    """Serve ``image`` honouring If-None-Match and Range, with CORS and cache headers."""
+    meta = request.META
+    range_header = meta.get('HTTP_RANGE', '')
+    if_range = meta.get('HTTP_IF_RANGE', '')
+
+    if _etag_matches(meta.get('HTTP_IF_NONE_MATCH', ''), image.etag):
+        image.file.close()
+        response = HttpResponse(status=304)
+    elif range_header and (not if_range or _etag_matches(if_range, image.etag)):
+        byte_range = _parse_range(range_header, image.size)
+        if byte_range == 'unsatisfiable':
+            image.file.close()
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{image.size}'
+        elif byte_range:
+            start, end = byte_range
+            with image.file:
+                image.file.seek(start)
+                body = image.file.read(end - start + 1)
+            response = HttpResponse(body, status=206, content_type=image.content_type)
+            response['Content-Range'] = f'bytes {start}-{end}/{image.size}'
+        else:
+            response = FileResponse(image.file, content_type=image.content_type)
+    else:
+        response = FileResponse(image.file, content_type=image.content_type)
+
+    # CORS headers so html2canvas can read the pixels
+    response['Access-Control-Allow-Origin'] = '*'
+    response['Access-Control-Allow-Methods'] = 'GET, OPTIONS'
+    response['Access-Control-Allow-Headers'] = 'Content-Type, Range, If-None-Match'
+    response['Cache-Control'] = 'public, max-age=86400'  # Cache for 24 hours
+    response['Accept-Ranges'] = 'bytes'
+    response['X-Cache'] = image.cache_status
+    if image.etag:
+        response['ETag'] = image.etag
+    return response
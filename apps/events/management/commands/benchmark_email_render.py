@@ -0,0 +1,133 @@
+"""
+🚀 ENTERPRISE COMMAND: Benchmark confirmation email rendering.
+
+Renders the order confirmation email (context + HTML + text + inline images) N times
+for one paid order and reports per-email time and queries, first with the rendering
+caches of core.email_rendering disabled (previous behaviour) and then enabled.
+Nothing is sent and nothing is written.
+
+Usage:
+    python manage.py benchmark_email_render
+    python manage.py benchmark_email_render --emails 10000 --order <order_id>
+    python manage.py benchmark_email_render --with-qr  # Include QR PNG loading per ticket
+"""
+
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.events.email_context import build_order_confirmation_context
+from apps.events.models import Order
+from apps.events.qr_generator import generate_qr_image, get_ticket_qr_png
+from core import email_rendering
+from core.email_rendering import render_email, static_image_bytes
+
+LOGOS = ['static/images/logos/logo-negro.png', 'static/images/logos/isotipo-azul.png']
+
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class Command(BaseCommand):
+    help = '🚀 ENTERPRISE: Benchmark order confirmation email rendering (caches off vs on)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--emails', type=int, default=10000, help='Number of emails to render per mode')
+        parser.add_argument('--order', type=str, default=None, help='Paid order id (default: latest paid order with tickets)')
+        parser.add_argument('--with-qr', action='store_true', help='Load QR PNGs for every ticket')
+
+    def handle(self, *args, **options):
+        order_id = options['order'] or self._latest_paid_order_id()
+        if not order_id:
+            raise CommandError('No paid order with tickets found; pass --order <order_id>')
+
+        frontend_url = getattr(settings, 'FRONTEND_URL', 'http://localhost:8080')
+        self.stdout.write(f"📧 Rendering {options['emails']} confirmation emails for order {order_id}")
+
+        results = [
+            self._run('caches off', order_id, options['emails'], options['with_qr'], frontend_url, enabled=False),
+            self._run('caches on', order_id, options['emails'], options['with_qr'], frontend_url, enabled=True),
+        ]
+
+        self.stdout.write('')
+        self.stdout.write(
+            f"{'mode':<12} {'emails':>7} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'queries/email':>14}"
+        )
+        for r in results:
+            self.stdout.write(
+                f"{r['mode']:<12} {r['emails']:>7} {r['mean']:>9.2f} {r['p50']:>9.2f} {r['p95']:>9.2f} "
+                f"{r['p99']:>9.2f} {r['queries']:>14.1f}"
+            )
+        before, after = results
+        if after['mean']:
+            self.stdout.write(self.style.SUCCESS(f"✅ Speed-up: {before['mean'] / after['mean']:.1f}x per email"))
+
+    def _latest_paid_order_id(self):
+        return Order.objects.filter(
+            status='paid', order_kind='event', items__tickets__isnull=False
+        ).order_by('-created_at').values_list('id', flat=True).first()
+
+    def _load(self, order_id):
+        order = Order.objects.select_related('event', 'event__organizer').prefetch_related(
+            'items__tickets', 'items__ticket_tier', 'event__images'
+        ).get(id=order_id)
+        tickets = [ticket for item in order.items.all() for ticket in item.tickets.all()]
+        regular = [t for t in tickets if not t.order_item.ticket_tier.is_raffle]
+        raffle = [t for t in tickets if t.order_item.ticket_tier.is_raffle]
+        return order, regular, raffle
+
+    def _run(self, mode, order_id, emails, with_qr, frontend_url, enabled):
+        email_rendering.clear_caches()
+        timings = []
+
+        def render_one():
+            # Fresh instances per email, as each send fetches its order
+            order, regular, raffle = self._load(order_id)
+            started = time.perf_counter()
+            context = build_order_confirmation_context(order, regular, raffle)
+            render_email('emails/order_confirmation.html', context)
+            render_email('emails/order_confirmation.txt', context)
+            for path in LOGOS:
+                static_image_bytes(path)
+            if with_qr:
+                for ticket in regular:
+                    if enabled:
+                        get_ticket_qr_png(ticket, frontend_url)
+                    else:
+                        generate_qr_image(ticket.ticket_number, frontend_url)
+            timings.append((time.perf_counter() - started) * 1000)
+
+        with CaptureQueriesContext(connection) as queries:
+            if enabled:
+                for _ in range(emails):
+                    render_one()
+            else:
+                with email_rendering.caching_disabled():
+                    for _ in range(emails):
+                        render_one()
+        # The per-email fetch is the sender's, not the renderer's
+        fetch_queries = self._fetch_query_count(order_id)
+
+        timings.sort()
+        return {
+            'mode': mode,
+            'emails': emails,
+            'mean': statistics.mean(timings) if timings else 0.0,
+            'p50': statistics.median(timings) if timings else 0.0,
+            'p95': _percentile(timings, 95),
+            'p99': _percentile(timings, 99),
+            'queries': max(0.0, len(queries) / emails - fetch_queries) if emails else 0.0,
+        }
+
+    def _fetch_query_count(self, order_id):
+        with CaptureQueriesContext(connection) as queries:
+            self._load(order_id)
+        return len(queries)
@@ -0,0 +1,173 @@
+"""
+🚀 ENTERPRISE COMMAND: Load benchmark for EventViewSet.reserve.
+
+Fires N concurrent buyers at a single ticket tier and reports p50/p95/p99 latency
+and throughput for the database (row lock) path and the Redis inventory engine.
+Creates its own throwaway organizer/event/tier and deletes them afterwards.
+
+Usage:
+    python manage.py benchmark_reserve
+    python manage.py benchmark_reserve --buyers 1000 --concurrency 100 --engine both
+    python manage.py benchmark_reserve --engine redis --capacity 500  # Sell-out scenario
+"""
+
+import os
+import statistics
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import override_settings
+from rest_framework.test import APIRequestFactory
+
+from apps.events.models import Event, TicketTier, TicketHold, Order
+from apps.organizers.models import Organizer
+from core.redis_client import get_redis_client
+
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class Command(BaseCommand):
+    help = '🚀 ENTERPRISE: Benchmark reserve latency/throughput (database vs Redis inventory engine)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--buyers', type=int, default=1000, help='Number of reserve requests (buyers)')
+        parser.add_argument('--concurrency', type=int, default=64, help='Concurrent worker threads')
+        parser.add_argument('--quantity', type=int, default=1, help='Tickets per buyer')
+        parser.add_argument('--capacity', type=int, default=None, help='Tier capacity (default: buyers * quantity)')
+        parser.add_argument(
+            '--engine',
+            choices=['database', 'redis', 'both'],
+            default='both',
+            help='Inventory engine(s) to benchmark',
+        )
+
+    def handle(self, *args, **options):
+        engines = ['database', 'redis'] if options['engine'] == 'both' else [options['engine']]
+        buyers = options['buyers']
+        capacity = options['capacity'] or buyers * options['quantity']
+
+        results = []
+        for engine_name in engines:
+            if engine_name == 'redis' and not self._redis_available():
+                self.stdout.write(self.style.WARNING('⚠️  Redis not reachable, skipping redis engine'))
+                continue
+            results.append(self._run(engine_name, buyers, options['concurrency'], options['quantity'], capacity))
+
+        if not results:
+            raise CommandError('No engine could be benchmarked')
+
+        self.stdout.write('')
+        self.stdout.write(
+            f"{'engine':<10} {'ok':>6} {'rejected':>9} {'errors':>7} {'p50 ms':>9} {'p95 ms':>9} "
+            f"{'p99 ms':>9} {'req/s':>9} {'sold':>6} {'oversold':>9}"
+        )
+        for r in results:
+            self.stdout.write(
+                f"{r['engine']:<10} {r['ok']:>6} {r['rejected']:>9} {r['errors']:>7} {r['p50']:>9.1f} "
+                f"{r['p95']:>9.1f} {r['p99']:>9.1f} {r['throughput']:>9.1f} {r['held']:>6} {r['oversold']:>9}"
+            )
+
+    def _redis_available(self):
+        try:
+            get_redis_client(settings.TICKET_INVENTORY.get('REDIS_URL')).ping()
+            return True
+        except Exception:
+            return False
+
+    def _run(self, engine_name, buyers, concurrency, quantity, capacity):
+        from api.v1.events.views import EventViewSet
+        from apps.events.services import inventory
+
+        self.stdout.write(f'🎟️  [{engine_name}] {buyers} buyers x {quantity} tickets, capacity {capacity}, {concurrency} threads')
+
+        suffix = uuid.uuid4().hex[:8]
+        organizer = Organizer.objects.create(
+            name=f'Benchmark {suffix}', slug=f'benchmark-{suffix}', contact_email=f'bench-{suffix}@tuki.cl'
+        )
+        event = Event.objects.create(
+            title=f'Benchmark {suffix}', slug=f'benchmark-{suffix}', organizer=organizer, status='published'
+        )
+        tier = TicketTier.objects.create(
+            event=event, name='General', price=Decimal('10000'), capacity=capacity, available=capacity,
+            max_per_order=max(quantity, 1),
+        )
+
+        view = EventViewSet.as_view({'post': 'reserve'})
+        factory = APIRequestFactory()
+        payload = {'tickets': [{'tierId': str(tier.id), 'quantity': quantity}]}
+
+        def buy(buyer):
+            # One client IP per buyer so the anonymous throttle behaves like real traffic
+            remote_addr = f'10.{(buyer >> 16) & 255}.{(buyer >> 8) & 255}.{buyer & 255}'
+            request = factory.post(
+                f'/api/v1/events/{event.id}/reserve/', payload, format='json', REMOTE_ADDR=remote_addr
+            )
+            started = time.perf_counter()
+            try:
+                response = view(request, pk=str(event.id))
+                code = response.status_code
+            except Exception:
+                code = 500
+            finally:
+                connection.close()
+            return code, (time.perf_counter() - started) * 1000
+
+        settings_override = {
+            'ENGINE': engine_name,
+            'REDIS_URL': '',
+            'FLUSH_BATCH_SIZE': 1000,
+            'LOCK_TIMEOUT': 30,
+            'LOCK_WAIT': 10,
+        }
+        try:
+            with override_settings(TICKET_INVENTORY=settings_override), open(os.devnull, 'w') as devnull:
+                inventory._engine = None
+                with redirect_stdout(devnull):
+                    started = time.perf_counter()
+                    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                        outcomes = list(pool.map(buy, range(buyers)))
+                    elapsed = time.perf_counter() - started
+
+                    engine = inventory.get_inventory_engine()
+                    if engine is not None:
+                        engine.flush()
+
+            latencies = sorted(ms for _, ms in outcomes)
+            ok = sum(1 for code, _ in outcomes if code == 200)
+            rejected = sum(1 for code, _ in outcomes if code == 400)
+            held = sum(TicketHold.objects.filter(ticket_tier=tier, released=False).values_list('quantity', flat=True))
+            tier.refresh_from_db()
+
+            return {
+                'engine': engine_name,
+                'ok': ok,
+                'rejected': rejected,
+                'errors': len(outcomes) - ok - rejected,
+                'p50': statistics.median(latencies),
+                'p95': _percentile(latencies, 95),
+                'p99': _percentile(latencies, 99),
+                'throughput': len(outcomes) / elapsed if elapsed else 0,
+                'held': held,
+                'oversold': max(0, held - capacity) + max(0, -(tier.available or 0)),
+            }
+        finally:
+            if engine_name == 'redis' and inventory._engine is not None:
+                inventory._engine.client.delete(
+                    inventory._engine.available_key(tier.id), inventory._engine.pending_key(tier.id)
+                )
+                inventory._engine.client.srem(inventory._engine.tiers_key, str(tier.id))
+            inventory._engine = None
+            Order.objects.filter(event=event).delete()
+            event.delete()
+            organizer.delete()
@@ -1,17 +1,19 @@
 """
-🚀 ENTERPRISE COMMAND: Clean up expired ticket holds to prevent stock leakage.
+🚀 ENTERPRISE COMMAND: Clean up expired holds to prevent stock leakage.
 
-This command should be run periodically (every 5-10 minutes) via cron or Celery
-to ensure that expired holds are released and tickets become available again.
+Runs the same set-based sweeper as the Celery Beat task: expired ticket, coupon
+and experience holds are released and tickets become available again.
 
 Usage:
     python manage.py cleanup_expired_holds
     python manage.py cleanup_expired_holds --dry-run  # Preview what would be cleaned
+    python manage.py cleanup_expired_holds --batch-size 10000
 """
 
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 from apps.events.models import TicketHold
+from apps.events.services.hold_sweeper import sweep_expired_holds
 
 
 class Command(BaseCommand):
@@ -23,6 +25,12 @@ class Command(BaseCommand):
             action='store_true',
             help='Show what would be cleaned without actually doing it',
         )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=None,
+            help='Holds released per UPDATE statement (default: HOLD_SWEEPER BATCH_SIZE)',
+        )
 
     def handle(self, *args, **options):
         now = timezone.now()
@@ -36,7 +44,7 @@ class Command(BaseCommand):
         
         total_holds = expired_holds.count()
         
-        if total_holds == 0:
+        if total_holds == 0 and dry_run:
             self.stdout.write(
                 self.style.SUCCESS('✅ No expired holds found. System is clean!')
             )
@@ -58,38 +66,19 @@ class Command(BaseCommand):
                 
             return
         
-        # Actually release the holds
-        self.stdout.write(f'🧹 Cleaning up {total_holds} expired holds...')
+        # Actually release the holds: batched UPDATE ... RETURNING per hold model
+        self.stdout.write(f'🧹 Cleaning up {total_holds} expired ticket holds (plus coupon/experience holds)...')
         
-        released_count = 0
-        tickets_returned = 0
-        
-        for hold in expired_holds:
-            try:
-                hold.release()  # This returns tickets to availability
-                released_count += 1
-                tickets_returned += hold.quantity
-                
-                if released_count % 100 == 0:  # Progress indicator for large batches
-                    self.stdout.write(f'  Processed {released_count}/{total_holds} holds...')
-                    
-            except Exception as e:
-                self.stdout.write(
-                    self.style.ERROR(f'❌ Error releasing hold {hold.id}: {e}')
-                )
+        stats = sweep_expired_holds(batch_size=options['batch_size'])
         
         self.stdout.write(
             self.style.SUCCESS(
-                f'✅ Successfully released {released_count} expired holds, '
-                f'returning {tickets_returned} tickets to availability!'
+                f"✅ Successfully released {stats['ticket_holds']} expired ticket holds, "
+                f"returning {stats['tickets_returned']} tickets to availability!"
             )
         )
-        
-        if released_count != total_holds:
-            self.stdout.write(
-                self.style.WARNING(
-                    f'⚠️  {total_holds - released_count} holds could not be released. '
-                    'Check logs for errors.'
-                )
-            )
-
+        self.stdout.write(
+            f"   Coupon holds: {stats['coupon_holds']} | Experience holds: "
+            f"{stats['experience_capacity_holds']} capacity, {stats['experience_resource_holds']} resource | "
+            f"{stats['rows_touched']} rows in {stats['duration_ms']}ms"
+        )
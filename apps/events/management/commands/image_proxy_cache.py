@@ -0,0 +1,49 @@
+"""
+🚀 ENTERPRISE COMMAND: Inspect or clear the event image proxy cache.
+
+Shows hit/miss counters (shared through the default cache) and this instance's
+disk usage; --clear empties the disk cache and --reset-stats zeroes the counters.
+
+Usage:
+    python manage.py image_proxy_cache
+    python manage.py image_proxy_cache --clear --reset-stats
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.events.image_proxy import get_disk_cache, get_image_proxy_stats, reset_image_proxy_stats
+
+
+class Command(BaseCommand):
+    help = '🚀 ENTERPRISE: Show or clear the event image proxy cache'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--clear',
+            action='store_true',
+            help='Delete every cached object on this instance',
+        )
+        parser.add_argument(
+            '--reset-stats',
+            action='store_true',
+            help='Zero the hit/miss counters',
+        )
+
+    def handle(self, *args, **options):
+        if options['clear']:
+            removed = get_disk_cache().clear()
+            self.stdout.write(self.style.SUCCESS(f'Removed {removed} cached object(s).'))
+        if options['reset_stats']:
+            reset_image_proxy_stats()
+            self.stdout.write(self.style.SUCCESS('Counters reset.'))
+
+        stats = get_image_proxy_stats()
+        ratio = f"{stats['hit_ratio']:.1%}" if stats['hit_ratio'] is not None else 'n/a'
+        self.stdout.write(
+            f"hits={stats['hit']} revalidated={stats['revalidated']} stale={stats['stale']} "
+            f"misses={stats['miss']} errors={stats['error']} hit_ratio={ratio}"
+        )
+        self.stdout.write(
+            f"disk: {stats['entries']} object(s), {stats['bytes'] / 1024 / 1024:.1f} MB "
+            f"of {stats['max_bytes'] / 1024 / 1024:.0f} MB"
+        )
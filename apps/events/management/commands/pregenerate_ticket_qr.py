@@ -0,0 +1,72 @@
+"""
+🚀 ENTERPRISE COMMAND: Pre-render and store QR images for existing tickets.
+
+Paid orders get their QR images from the generate_order_tickets_qr task; this
+command backfills tickets created before the QR store existed (or imported in bulk)
+so door-open traffic never renders a QR. Large batches render in a process pool.
+
+Usage:
+    python manage.py pregenerate_ticket_qr --event <event_id>
+    python manage.py pregenerate_ticket_qr --upcoming --workers 8
+    python manage.py pregenerate_ticket_qr --event <event_id> --force  # Re-render stored QRs
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.events.models import Ticket
+from apps.events.qr_generator import generate_tickets_qr_batch
+
+
+class Command(BaseCommand):
+    help = '🚀 ENTERPRISE: Pre-render and store ticket QR images'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--event', type=str, default=None, help='Event id')
+        parser.add_argument('--upcoming', action='store_true', help='All events that have not ended yet')
+        parser.add_argument('--workers', type=int, default=4, help='Render workers')
+        parser.add_argument('--chunk', type=int, default=2000, help='Tickets per batch')
+        parser.add_argument('--threads', action='store_true', help='Render in threads instead of processes')
+        parser.add_argument('--force', action='store_true', help='Re-render tickets that already have a stored QR')
+
+    def handle(self, *args, **options):
+        if not options['event'] and not options['upcoming']:
+            raise CommandError('Pass --event <event_id> or --upcoming')
+
+        tickets = Ticket.objects.filter(
+            status='active', order_item__order__status='paid', order_item__ticket_tier__is_raffle=False
+        )
+        if options['event']:
+            tickets = tickets.filter(order_item__order__event_id=options['event'])
+        else:
+            tickets = tickets.filter(
+                Q(order_item__order__event__end_date__gte=timezone.now())
+                | Q(order_item__order__event__end_date__isnull=True)
+            )
+        if not options['force']:
+            tickets = tickets.filter(Q(qr_image='') | Q(qr_code=''))
+
+        ids = list(tickets.order_by('created_at').values_list('id', flat=True))
+        self.stdout.write(f"🎫 {len(ids)} tickets to render")
+
+        totals = {'success': 0, 'failed': 0, 'skipped': 0, 'duration_ms': 0}
+        for offset in range(0, len(ids), options['chunk']):
+            chunk = Ticket.objects.filter(id__in=ids[offset:offset + options['chunk']]).only(
+                'id', 'ticket_number', 'qr_code', 'qr_image'
+            )
+            result = generate_tickets_qr_batch(
+                chunk,
+                max_workers=options['workers'],
+                use_processes=not options['threads'],
+                force=options['force'],
+            )
+            for key in totals:
+                totals[key] += result[key]
+            self.stdout.write(f"  {min(offset + options['chunk'], len(ids))}/{len(ids)} ({result['duration_ms']}ms)")
+
+        style = self.style.SUCCESS if not totals['failed'] else self.style.WARNING
+        self.stdout.write(style(
+            f"✅ {totals['success']} rendered, {totals['failed']} failed, "
+            f"{totals['skipped']} skipped in {totals['duration_ms']}ms"
+        ))
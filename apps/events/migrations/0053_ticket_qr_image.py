@@ -0,0 +1,18 @@
+# Generated by Django 4.2.8 on 2026-10-16 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0052_order_booking_date_order_cancellation_date_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ticket',
+            name='qr_image',
+            field=models.CharField(blank=True, help_text='Storage path of the pre-rendered QR PNG (content-addressed)', max_length=255, verbose_name='QR image'),
+        ),
+    ]
@@ -5,6 +5,7 @@ from django.utils.translation import gettext_lazy as _
 from django.contrib.auth import get_user_model
 from django.contrib.postgres.fields import ArrayField
 from django.core.validators import MinValueValidator
+from django.db.models.functions import Coalesce, Greatest
 from django.utils import timezone
 from decimal import Decimal
 import uuid
@@ -62,6 +63,45 @@ class EventCategory(BaseModel):
         return self.name
 
 
+class EventQuerySet(models.QuerySet):
+    """QuerySet helpers for listing events without per-event availability queries."""
+
+    def with_availability(self):
+        """
+        🚀 ENTERPRISE: Annotate availability for every event in one query.
+
+        Adds annotated_has_available_tickets / annotated_simple_confirmed (read by
+        has_available_tickets and simple_available_capacity) and prefetches public
+        tiers, annotated with TicketTier.objects.with_availability(), into
+        ``public_ticket_tiers``.
+        """
+        public_tiers = TicketTier.objects.filter(event=models.OuterRef('pk'), is_public=True)
+        confirmed_bookings = SimpleBooking.objects.filter(
+            event=models.OuterRef('pk'), status='confirmed'
+        ).order_by().values('event').annotate(total=models.Count('id')).values('total')
+
+        return self.annotate(
+            annotated_has_available_tickets=models.Exists(public_tiers.filter(available__gt=0)),
+            annotated_simple_confirmed=Coalesce(models.Subquery(confirmed_bookings), 0),
+        ).prefetch_related(
+            models.Prefetch(
+                'ticket_tiers',
+                queryset=TicketTier.objects.filter(is_public=True).with_availability()
+                .select_related('category', 'form').order_by('order', 'price'),
+                to_attr='public_ticket_tiers',
+            )
+        )
+
+    def for_detail(self):
+        """🚀 ENTERPRISE: with_availability() plus every relation the event detail serializers read."""
+        return self.with_availability().select_related(
+            'location', 'category', 'organizer'
+        ).prefetch_related(
+            'images',
+            models.Prefetch('ticket_categories__ticket_tiers', queryset=TicketTier.objects.with_availability()),
+        )
+
+
 class Event(BaseModel):
     """Event model for creating and managing events."""
     
@@ -256,6 +296,8 @@ class Event(BaseModel):
         blank=True,
         help_text=_("When the event was soft deleted")
     )
+
+    objects = EventQuerySet.as_manager()
     
     class Meta:
         verbose_name = _("event")
@@ -339,7 +381,9 @@ class Event(BaseModel):
                 return True  # Unlimited capacity
             return self.simple_available_capacity > 0
         
-        # For complex events, check ticket tiers
+        # For complex events, check ticket tiers (annotated by Event.objects.with_availability())
+        if hasattr(self, 'annotated_has_available_tickets'):
+            return self.annotated_has_available_tickets
         return self.ticket_tiers.filter(
             is_public=True,
             available__gt=0
@@ -369,11 +413,13 @@ class Event(BaseModel):
             return None  # Unlimited
         
         # Count confirmed attendees for simple events
-        from apps.bookings.models import SimpleBooking
-        confirmed_count = SimpleBooking.objects.filter(
-            event=self,
-            status='confirmed'
-        ).count()
+        if hasattr(self, 'annotated_simple_confirmed'):
+            confirmed_count = self.annotated_simple_confirmed
+        else:
+            confirmed_count = SimpleBooking.objects.filter(
+                event=self,
+                status='confirmed'
+            ).count()
         
         return max(0, self.simple_capacity - confirmed_count)
     
@@ -604,6 +650,51 @@ class TicketCategory(BaseModel):
         return self.available == 0 or self.status == 'sold_out'
 
 
+class TicketTierQuerySet(models.QuerySet):
+    """QuerySet helpers for set-based inventory updates on ticket tiers."""
+
+    def with_availability(self):
+        """
+        🚀 ENTERPRISE: Annotate on-hold, sold and real-available counts in one query.
+
+        tickets_on_hold, tickets_sold, real_available and get_availability_summary()
+        read these annotations instead of running one aggregate per access.
+        """
+        active_holds = TicketHold.objects.filter(
+            ticket_tier=models.OuterRef('pk'), released=False, expires_at__gt=timezone.now()
+        ).order_by().values('ticket_tier').annotate(total=models.Sum('quantity')).values('total')
+        paid_items = OrderItem.objects.filter(
+            ticket_tier=models.OuterRef('pk'), order__status='paid'
+        ).order_by().values('ticket_tier').annotate(total=models.Sum('quantity')).values('total')
+
+        return self.annotate(
+            annotated_on_hold=Coalesce(models.Subquery(active_holds), 0),
+            annotated_sold=Coalesce(models.Subquery(paid_items), 0),
+        ).annotate(
+            # NULL available (unlimited) stays NULL
+            annotated_real_available=Greatest(
+                models.F('available') - models.F('annotated_on_hold'), models.Value(0)
+            ),
+        )
+
+    def adjust_available(self, deltas):
+        """
+        🚀 ENTERPRISE: Apply availability deltas ({tier_id: +/-qty}) in a single UPDATE.
+
+        Unlimited tiers (available=NULL) are left untouched.
+        """
+        deltas = {tier_id: delta for tier_id, delta in deltas.items() if delta}
+        if not deltas:
+            return 0
+        return self.filter(id__in=list(deltas), available__isnull=False).update(
+            available=models.F('available') + models.Case(
+                *[models.When(id=tier_id, then=models.Value(delta)) for tier_id, delta in deltas.items()],
+                default=models.Value(0),
+                output_field=models.IntegerField(),
+            )
+        )
+
+
 class TicketTier(BaseModel):
     """Ticket tier model for different ticket types in an event."""
     
@@ -767,6 +858,8 @@ class TicketTier(BaseModel):
         default=False,
         help_text=_("If true, this ticket is a raffle entry (no QR code generation)")
     )
+
+    objects = TicketTierQuerySet.as_manager()
     
     class Meta:
         verbose_name = _("ticket tier")
@@ -912,10 +1005,9 @@ class TicketTier(BaseModel):
     @property
     def tickets_on_hold(self):
         """🚀 ENTERPRISE: Return number of tickets currently on hold (cached property)."""
-        # ⚠️ WARNING: This property makes a database query every time it's accessed
-        # For better performance in views, use:
-        # - .prefetch_related('holds') in QuerySet
-        # - Or call .get_tickets_on_hold() method directly
+        # Queries on every access unless loaded via TicketTier.objects.with_availability()
+        if hasattr(self, 'annotated_on_hold'):
+            return self.annotated_on_hold
         return self.get_tickets_on_hold()
     
     @property
@@ -923,11 +1015,15 @@ class TicketTier(BaseModel):
         """🚀 ENTERPRISE: Return tickets available for immediate purchase (excluding holds)."""
         if self.available is None:
             return None  # Unlimited capacity
+        if hasattr(self, 'annotated_real_available'):
+            return self.annotated_real_available
         return max(0, self.available - self.tickets_on_hold)
     
     @property
     def tickets_sold(self):
         """🚀 ENTERPRISE: Return number of tickets actually sold (paid orders)."""
+        if hasattr(self, 'annotated_sold'):
+            return self.annotated_sold
         return self.order_items.filter(
             order__status='paid'
         ).aggregate(total=models.Sum('quantity'))['total'] or 0
@@ -1244,6 +1340,15 @@ class Order(BaseModel):
     def __str__(self):
         return self.order_number
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the revenue contribution as loaded so save() can apply only the change
+        from core.revenue_rollups import SNAPSHOT_FIELDS, order_revenue_snapshot
+        if not instance.get_deferred_fields().intersection(SNAPSHOT_FIELDS):
+            instance._revenue_snapshot = order_revenue_snapshot(instance)
+        return instance
+    
     def save(self, *args, **kwargs):
         """
         Generate access token automatically if not set and enforce basic invariants.
@@ -1278,7 +1383,20 @@ class Order(BaseModel):
             # Set explicitly by the car rental WhatsApp/payment flow.
             pass
 
+        from core.revenue_rollups import load_order_revenue_snapshot, sync_order_revenue_rollups
+        if not self._state.adding and not hasattr(self, '_revenue_snapshot'):
+            self._revenue_snapshot = load_order_revenue_snapshot(self)
+
         super().save(*args, **kwargs)
+
+        # 🚀 ENTERPRISE: Keep revenue rollups (dashboards/analytics) in step with this order
+        sync_order_revenue_rollups(self)
+    
+    def delete(self, *args, **kwargs):
+        """Delete the order (items and tickets cascade) and remove it from revenue rollups."""
+        from core.revenue_rollups import tracking_order_revenue
+        with tracking_order_revenue(self.pk):
+            return super().delete(*args, **kwargs)
     
     @property
     def buyer_name(self):
@@ -1432,7 +1550,16 @@ class OrderItem(BaseModel):
             # Normal calculation
             self.subtotal = (self.unit_price + self.unit_service_fee) * self.quantity
         
-        super().save(*args, **kwargs)
+        # 🚀 ENTERPRISE: Tickets per tier feed the order's revenue rollups
+        from core.revenue_rollups import tracking_order_revenue
+        with tracking_order_revenue(self.order_id, order_changes=False):
+            super().save(*args, **kwargs)
+    
+    def delete(self, *args, **kwargs):
+        """Delete the item and take its tickets out of the order's revenue rollups."""
+        from core.revenue_rollups import tracking_order_revenue
+        with tracking_order_revenue(self.order_id, order_changes=False):
+            return super().delete(*args, **kwargs)
 
 
 def generate_ticket_number():
@@ -1563,6 +1690,12 @@ class Ticket(BaseModel):
         blank=True,
         help_text=_("Base64-encoded QR code image for instant email delivery")
     )
+    qr_image = models.CharField(
+        _("QR image"),
+        max_length=255,
+        blank=True,
+        help_text=_("Storage path of the pre-rendered QR PNG (content-addressed)")
+    )
     
     class Meta:
         verbose_name = _("ticket")
@@ -1843,8 +1976,74 @@ class TicketHolderReservation(BaseModel):
         return f"{self.first_name} {self.last_name} - {self.ticket_tier.name} (Order: {self.order.order_number})"
 
 
+class TicketHoldQuerySet(models.QuerySet):
+    """QuerySet helpers for aggregate (one row per order/tier/price) ticket holds."""
+
+    def active(self):
+        return self.filter(released=False, expires_at__gt=timezone.now())
+
+    def release(self):
+        """
+        🚀 ENTERPRISE: Release every unreleased hold in the queryset (idempotent).
+
+        One UPDATE marks the holds released and one UPDATE returns their quantity to
+        TicketTier.available grouped by tier. Returns (holds_released, {tier_id: tickets}).
+        """
+        from django.db import transaction
+
+        with transaction.atomic():
+            rows = list(
+                self.filter(released=False).select_for_update().values_list('id', 'ticket_tier_id', 'quantity')
+            )
+            if not rows:
+                return 0, {}
+
+            TicketHold.objects.filter(id__in=[row[0] for row in rows]).update(released=True)
+
+            returned = {}
+            for _hold_id, tier_id, quantity in rows:
+                returned[tier_id] = returned.get(tier_id, 0) + quantity
+            TicketTier.objects.adjust_available(returned)
+
+        return len(rows), returned
+
+    def release_quantity(self, quantity):
+        """
+        🚀 ENTERPRISE: Release up to `quantity` tickets from these holds, oldest expiry first.
+
+        Whole holds are released; the last one is shrunk if only part of it is needed.
+        Returns the number of tickets returned to availability.
+        """
+        from django.db import transaction
+
+        remaining = quantity
+        with transaction.atomic():
+            to_release = []
+            returned = {}
+            for hold in self.filter(released=False).select_for_update().order_by('expires_at'):
+                if remaining <= 0:
+                    break
+                take = min(hold.quantity, remaining)
+                if take == hold.quantity:
+                    to_release.append(hold.id)
+                else:
+                    TicketHold.objects.filter(id=hold.id).update(quantity=models.F('quantity') - take)
+                returned[hold.ticket_tier_id] = returned.get(hold.ticket_tier_id, 0) + take
+                remaining -= take
+
+            if to_release:
+                TicketHold.objects.filter(id__in=to_release).update(released=True)
+            TicketTier.objects.adjust_available(returned)
+
+        return quantity - remaining
+
+
 class TicketHold(BaseModel):
-    """Temporary hold to reserve tickets and prevent overselling during checkout."""
+    """
+    Temporary hold to reserve tickets and prevent overselling during checkout.
+
+    One row per (order, ticket tier, custom price) carrying the held quantity.
+    """
     event = models.ForeignKey(
         Event,
         on_delete=models.CASCADE,
@@ -1878,6 +2077,8 @@ class TicketHold(BaseModel):
         help_text=_("Custom price per ticket for Pay-What-You-Want tickets")
     )
 
+    objects = TicketHoldQuerySet.as_manager()
+
     class Meta:
         verbose_name = _("ticket hold")
         verbose_name_plural = _("ticket holds")
@@ -1909,25 +2110,10 @@ class TicketHold(BaseModel):
         """🚀 ENTERPRISE: Release the hold and return tickets to availability (idempotent)."""
         if self.released:
             return
-            
-        from django.db import transaction
-        from django.db.models import F
-        
-        # 🛡️ ENTERPRISE: Atomic operation to prevent race conditions
-        with transaction.atomic():
-            # Double-check pattern: verify again within transaction
-            if self.released:
-                return
-                
-            # 🚀 ATOMIC UPDATE: Use F() expression for safe concurrent updates
-            # This ensures the database handles the addition atomically
-            TicketTier.objects.filter(id=self.ticket_tier_id).update(
-                available=F('available') + self.quantity
-            )
-            
-            # Mark as released
-            self.released = True
-            self.save()
+
+        # Row lock + released=False filter make concurrent releases return capacity once
+        TicketHold.objects.filter(id=self.id).release()
+        self.released = True
 
 
 class CouponHold(BaseModel):
@@ -1,11 +1,13 @@
 """
 🚀 ENTERPRISE QR Code Generator - Tuki Platform
-Pre-generates QR codes for tickets to avoid blocking email delivery.
+Pre-generates QR codes for tickets to avoid blocking email delivery and door-open traffic.
 
 Performance:
-- Generates QR codes asynchronously when tickets are created
+- Generates QR codes in a background batch when the order becomes paid
 - Stores QR as base64 in database (no file I/O during email send)
-- Parallel generation for multiple tickets
+- Stores the PNG once in the configured storage, content-addressed
+  (``tickets/qr/ab/<sha256>.png``), served by URL or streamed by the QR endpoint
+- Parallel generation for multiple tickets; a process pool for bulk batches
 - <100ms per QR code generation
 
 Usage:
@@ -18,13 +20,18 @@ Usage:
     generate_tickets_qr_batch(tickets)
 """
 
+import hashlib
 import logging
+import multiprocessing
 import qrcode
 import io
 import base64
+import time
 from typing import List, Optional
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
 
 logger = logging.getLogger(__name__)
 
@@ -83,13 +90,61 @@ def generate_qr_base64(ticket_number: str, frontend_url: str) -> str:
     return base64.b64encode(png_bytes).decode('utf-8')
 
 
+def _qr_store_settings() -> dict:
+    return getattr(settings, 'QR_STORE', {})
+
+
+def qr_image_path(png_bytes: bytes) -> str:
+    """Content-addressed storage path for a QR PNG: identical images share one file."""
+    digest = hashlib.sha256(png_bytes).hexdigest()
+    prefix = _qr_store_settings().get('PATH_PREFIX', 'tickets/qr')
+    return f"{prefix}/{digest[:2]}/{digest}.png"
+
+
+def store_qr_image(png_bytes: bytes) -> str:
+    """Save a QR PNG to the default storage (once per content) and return its path."""
+    path = qr_image_path(png_bytes)
+    if not default_storage.exists(path):
+        path = default_storage.save(path, ContentFile(png_bytes))
+    return path
+
+
+def ticket_qr_url(ticket) -> Optional[str]:
+    """Public URL of the stored QR PNG, or None when the ticket has not been pre-rendered."""
+    path = getattr(ticket, 'qr_image', '')
+    return default_storage.url(path) if path else None
+
+
+def get_ticket_qr_png(ticket, frontend_url: str) -> bytes:
+    """
+    PNG bytes of a ticket QR for email attachments and the QR endpoint.
+    
+    Decodes the pre-generated ticket.qr_code when present (no image work during
+    send), then the stored PNG; tickets without either are generated on the fly.
+    """
+    qr_base64 = getattr(ticket, 'qr_code', None)
+    if qr_base64:
+        try:
+            return base64.b64decode(qr_base64)
+        except (ValueError, TypeError):
+            logger.warning(f"⚠️ [QR] Invalid stored QR for ticket {ticket.ticket_number}, regenerating")
+    qr_path = getattr(ticket, 'qr_image', '')
+    if qr_path:
+        try:
+            with default_storage.open(qr_path, 'rb') as f:
+                return f.read()
+        except Exception as e:
+            logger.warning(f"⚠️ [QR] Stored QR {qr_path} unreadable for ticket {ticket.ticket_number}: {e}")
+    return generate_qr_image(ticket.ticket_number, frontend_url)
+
+
 def generate_ticket_qr(ticket, save: bool = True) -> Optional[str]:
     """
     Generate and optionally save QR code for a single ticket.
     
     Args:
         ticket: Ticket model instance
-        save: Whether to save QR to ticket.qr_code field
+        save: Whether to save QR to ticket.qr_code / ticket.qr_image
         
     Returns:
         Base64-encoded QR code or None if error
@@ -100,14 +155,16 @@ def generate_ticket_qr(ticket, save: bool = True) -> Optional[str]:
     """
     try:
         frontend_url = getattr(settings, 'FRONTEND_URL', 'http://localhost:8080')
-        qr_base64 = generate_qr_base64(ticket.ticket_number, frontend_url)
+        png_bytes = generate_qr_image(ticket.ticket_number, frontend_url)
+        qr_base64 = base64.b64encode(png_bytes).decode('utf-8')
         
         if save and hasattr(ticket, 'qr_code'):
-            # Use update() to avoid transaction issues
+            qr_path = store_qr_image(png_bytes)
+            # Use update() to avoid transaction issues (and keep updated_at untouched)
             from apps.events.models import Ticket
-            Ticket.objects.filter(id=ticket.id).update(qr_code=qr_base64)
-            # Refresh instance to reflect the update
-            ticket.refresh_from_db()
+            Ticket.objects.filter(id=ticket.id).update(qr_code=qr_base64, qr_image=qr_path)
+            ticket.qr_code = qr_base64
+            ticket.qr_image = qr_path
             logger.info(f"✅ [QR] Generated and saved QR for ticket {ticket.ticket_number}")
         
         return qr_base64
@@ -117,56 +174,109 @@ def generate_ticket_qr(ticket, save: bool = True) -> Optional[str]:
         return None
 
 
-def generate_tickets_qr_batch(tickets: List, max_workers: int = 4) -> dict:
+def _render_qr_png(ticket_number: str, frontend_url: str) -> Optional[bytes]:
+    """Pool worker: PNG bytes or None (module-level so process pools can pickle it)."""
+    try:
+        return generate_qr_image(ticket_number, frontend_url)
+    except Exception:
+        return None
+
+
+def _can_use_process_pool() -> bool:
+    # Celery prefork children are daemonic and may not start child processes
+    return not multiprocessing.current_process().daemon
+
+
+def generate_tickets_qr_batch(
+    tickets: List,
+    max_workers: int = 4,
+    use_processes: Optional[bool] = None,
+    force: bool = False,
+) -> dict:
     """
-    Generate QR codes for multiple tickets in parallel.
+    Generate and store QR codes for multiple tickets in parallel.
+    
+    PNGs are rendered in a pool (processes for bulk batches, since rendering is
+    CPU-bound; threads otherwise), stored content-addressed in the default storage
+    and written back with bulk_update. Tickets that already have a stored image are
+    skipped unless ``force``.
     
     Args:
         tickets: List of Ticket model instances
         max_workers: Number of parallel workers (default 4)
+        use_processes: Force (True) or forbid (False) the process pool; None picks it
+            from QR_STORE['PROCESS_POOL_MIN_TICKETS']
+        force: Regenerate tickets that already have a stored QR
         
     Returns:
-        Dict with success/failure counts and timing
+        Dict with success/failure/skipped counts and timing
         
     Performance: ~100ms for 4 tickets, ~200ms for 10 tickets
     
     Example:
         from apps.events.models import Ticket
-        tickets = Ticket.objects.filter(order=order)
+        tickets = Ticket.objects.filter(order_item__order=order)
         result = generate_tickets_qr_batch(tickets)
-        # {'success': 10, 'failed': 0, 'duration_ms': 150}
+        # {'success': 10, 'failed': 0, 'skipped': 0, 'duration_ms': 150}
     """
-    import time
+    from apps.events.models import Ticket
+
     start_time = time.time()
-    
-    success_count = 0
-    failed_count = 0
-    
+    config = _qr_store_settings()
+    tickets = list(tickets)
+    pending = [t for t in tickets if force or not (t.qr_image and t.qr_code)]
+    skipped_count = len(tickets) - len(pending)
+
+    if not pending:
+        return {'success': 0, 'failed': 0, 'skipped': skipped_count, 'duration_ms': 0}
+
+    frontend_url = getattr(settings, 'FRONTEND_URL', 'http://localhost:8080')
+    if use_processes is None:
+        use_processes = len(pending) >= config.get('PROCESS_POOL_MIN_TICKETS', 200)
+    use_processes = use_processes and _can_use_process_pool()
+
+    numbers = [t.ticket_number for t in pending]
+    executor_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    chunksize = max(1, len(numbers) // (max_workers * 4)) if use_processes else 1
+    with executor_class(max_workers=max_workers) as executor:
+        images = list(executor.map(_render_qr_png, numbers, [frontend_url] * len(numbers), chunksize=chunksize))
+
+    # Storage writes are I/O-bound (GCS in production): threads are enough
+    def store(png_bytes):
+        if png_bytes is None:
+            return None
+        try:
+            return store_qr_image(png_bytes)
+        except Exception as e:
+            logger.error(f"❌ [QR] Failed to store QR image: {e}")
+            return None
+
     with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = {executor.submit(generate_ticket_qr, ticket): ticket for ticket in tickets}
-        
-        for future in as_completed(futures):
-            ticket = futures[future]
-            try:
-                qr_code = future.result()
-                if qr_code:
-                    success_count += 1
-                else:
-                    failed_count += 1
-            except Exception as e:
-                logger.error(f"❌ [QR] Batch generation failed for ticket {ticket.ticket_number}: {e}")
-                failed_count += 1
-    
+        paths = list(executor.map(store, images))
+
+    updated = []
+    for ticket, png_bytes, qr_path in zip(pending, images, paths):
+        if qr_path is None:
+            logger.error(f"❌ [QR] Batch generation failed for ticket {ticket.ticket_number}")
+            continue
+        ticket.qr_code = base64.b64encode(png_bytes).decode('utf-8')
+        ticket.qr_image = qr_path
+        updated.append(ticket)
+
+    Ticket.objects.bulk_update(updated, ['qr_code', 'qr_image'], batch_size=config.get('UPDATE_BATCH_SIZE', 500))
+
+    success_count = len(updated)
+    failed_count = len(pending) - success_count
     duration_ms = int((time.time() - start_time) * 1000)
     
     logger.info(
-        f"✅ [QR] Batch generation complete: {success_count} success, "
-        f"{failed_count} failed in {duration_ms}ms"
+        f"✅ [QR] Batch generation complete: {success_count} success, {failed_count} failed, "
+        f"{skipped_count} skipped in {duration_ms}ms ({'processes' if use_processes else 'threads'})"
     )
     
     return {
         'success': success_count,
         'failed': failed_count,
+        'skipped': skipped_count,
         'duration_ms': duration_ms,
     }
-
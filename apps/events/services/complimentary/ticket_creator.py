@@ -3,7 +3,7 @@
 import logging
 from typing import List
 from apps.events.models import Ticket, OrderItem
-from apps.events.qr_generator import generate_ticket_qr
+from apps.events.qr_generator import generate_tickets_qr_batch
 
 logger = logging.getLogger(__name__)
 
@@ -39,14 +39,14 @@ def create_complimentary_tickets(
             status='active'
         )
         
-        # Generate QR code
-        try:
-            generate_ticket_qr(ticket, save=True)
-        except Exception as e:
-            logger.error(f"Error generating QR for ticket {ticket.ticket_number}: {e}")
-        
         tickets.append(ticket)
         logger.debug(f"Created complimentary ticket {ticket.ticket_number}")
     
+    # Generate and store QR codes in one batch
+    try:
+        generate_tickets_qr_batch(tickets)
+    except Exception as e:
+        logger.error(f"Error generating QR for complimentary tickets of order item {order_item.id}: {e}")
+    
     return tickets
 
@@ -0,0 +1,439 @@
+"""
+🚀 ENTERPRISE: Redis-backed ticket inventory engine.
+
+Optional fast path for ``EventViewSet.reserve``. Per-tier availability lives in
+Redis and is decremented atomically by a Lua script, so concurrent buyers of a
+hot tier no longer serialize on the ``TicketTier`` row lock. Every accepted
+change is appended to a hold log that ``flush()`` drains in the background,
+writing aggregate ``TicketHold`` rows in bulk and adjusting ``TicketTier.available``
+with one UPDATE per batch.
+
+``TicketTier.available`` stays the source of truth: ``reconcile()`` periodically
+resets every Redis counter to ``available - pending`` where *pending* is the net
+quantity accepted by Redis but not yet persisted to Postgres.
+
+Enable with ``TICKET_INVENTORY_ENGINE=redis``; the default (``database``) keeps
+the original row-locking path.
+"""
+
+import json
+import logging
+import time
+import uuid
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from core.redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'tuki:inventory'
+UNLIMITED = -1
+
+
+# KEYS[1] = order hash, KEYS[2] = hold log, then (available, pending) per tier.
+# ARGV[1..4] = ttl, order_id, event_id, expires_at; then 4 args per tier:
+# tier_id, quantity, custom_price ('' when none), hold_id.
+RESERVE_SCRIPT = """
+local order_key = KEYS[1]
+local log_key = KEYS[2]
+local n = (#KEYS - 2) / 2
+local deltas = {}
+local avails = {}
+
+for i = 1, n do
+    local raw = redis.call('GET', KEYS[1 + 2 * i])
+    if not raw then
+        return {-1, i}
+    end
+    local base = 5 + (i - 1) * 4
+    local held = tonumber(redis.call('HGET', order_key, ARGV[base]) or '0')
+    local delta = tonumber(ARGV[base + 1]) - held
+    local avail = tonumber(raw)
+    if delta > 0 and avail >= 0 and avail < delta then
+        return {0, i, avail}
+    end
+    deltas[i] = delta
+    avails[i] = avail
+end
+
+for i = 1, n do
+    local delta = deltas[i]
+    if delta ~= 0 then
+        local base = 5 + (i - 1) * 4
+        local tier_id = ARGV[base]
+        local qty = tonumber(ARGV[base + 1])
+        if avails[i] >= 0 then
+            redis.call('DECRBY', KEYS[1 + 2 * i], delta)
+            redis.call('INCRBY', KEYS[2 + 2 * i], delta)
+        end
+        if qty > 0 then
+            redis.call('HSET', order_key, tier_id, qty)
+        else
+            redis.call('HDEL', order_key, tier_id)
+        end
+        redis.call('RPUSH', log_key, cjson.encode({
+            order_id = ARGV[2],
+            event_id = ARGV[3],
+            expires_at = ARGV[4],
+            tier_id = tier_id,
+            delta = delta,
+            custom_price = ARGV[base + 2],
+            hold_id = ARGV[base + 3],
+            limited = avails[i] >= 0,
+        }))
+    end
+end
+
+redis.call('EXPIRE', order_key, tonumber(ARGV[1]))
+return {1}
+"""
+
+# KEYS = available, pending, tier set. ARGV = db available ('unlimited' when null), tier_id, only_if_missing.
+SEED_SCRIPT = """
+if ARGV[3] == '1' and redis.call('EXISTS', KEYS[1]) == 1 then
+    return tonumber(redis.call('GET', KEYS[1]))
+end
+local value = -1
+if ARGV[1] ~= 'unlimited' then
+    value = tonumber(ARGV[1]) - tonumber(redis.call('GET', KEYS[2]) or '0')
+end
+redis.call('SET', KEYS[1], value)
+redis.call('SADD', KEYS[3], ARGV[2])
+return value
+"""
+
+# KEYS[1] = hold log. ARGV[1] = batch size.
+POP_BATCH_SCRIPT = """
+local items = redis.call('LRANGE', KEYS[1], 0, tonumber(ARGV[1]) - 1)
+if #items > 0 then
+    redis.call('LTRIM', KEYS[1], #items, -1)
+end
+return items
+"""
+
+
+class InsufficientInventory(Exception):
+    """Raised when a tier cannot cover the requested quantity. Caller should return 400."""
+
+    def __init__(self, tier_id, available):
+        self.tier_id = tier_id
+        self.available = available
+        super().__init__(f"Tier {tier_id} has only {available} tickets available")
+
+
+def _inventory_settings():
+    return getattr(settings, 'TICKET_INVENTORY', {})
+
+
+_engine = None
+
+
+def get_inventory_engine():
+    """Return the configured RedisInventoryEngine, or None when the database path is active."""
+    global _engine
+    if _inventory_settings().get('ENGINE', 'database') != 'redis':
+        return None
+    if _engine is None:
+        _engine = RedisInventoryEngine(get_redis_client(_inventory_settings().get('REDIS_URL')))
+    return _engine
+
+
+class RedisInventoryEngine:
+    """Atomic per-tier counters in Redis with asynchronous TicketHold persistence."""
+
+    def __init__(self, client, prefix=KEY_PREFIX):
+        self.client = client
+        self.prefix = prefix
+        self._reserve = client.register_script(RESERVE_SCRIPT)
+        self._seed = client.register_script(SEED_SCRIPT)
+        self._pop_batch = client.register_script(POP_BATCH_SCRIPT)
+
+    # ------------------------------------------------------------------
+    # Keys
+    # ------------------------------------------------------------------
+
+    def available_key(self, tier_id):
+        return f'{self.prefix}:tier:{tier_id}:available'
+
+    def pending_key(self, tier_id):
+        return f'{self.prefix}:tier:{tier_id}:pending'
+
+    def order_key(self, order_id):
+        return f'{self.prefix}:order:{order_id}'
+
+    @property
+    def log_key(self):
+        return f'{self.prefix}:hold_log'
+
+    @property
+    def tiers_key(self):
+        return f'{self.prefix}:tiers'
+
+    @contextmanager
+    def _lock(self, blocking_timeout=None):
+        """Serialize flush/seed/reconcile so DB snapshots and pending counters stay coherent."""
+        config = _inventory_settings()
+        lock = self.client.lock(
+            f'{self.prefix}:lock',
+            timeout=config.get('LOCK_TIMEOUT', 30),
+            blocking_timeout=blocking_timeout if blocking_timeout is not None else config.get('LOCK_WAIT', 5),
+        )
+        if not lock.acquire():
+            raise TimeoutError('Could not acquire inventory lock')
+        try:
+            yield
+        finally:
+            try:
+                lock.release()
+            except Exception:
+                logger.warning('[INVENTORY] Lock expired before release')
+
+    # ------------------------------------------------------------------
+    # Reserve path
+    # ------------------------------------------------------------------
+
+    def reserve(self, event_id, order_id, items, expires_at):
+        """
+        Set the held quantity of each tier for an order.
+
+        ``items`` is a list of ``{'tier_id', 'quantity', 'custom_price'}`` with the
+        desired absolute quantity per tier (same semantics as the reserve payload).
+        Raises InsufficientInventory if any tier cannot cover the increase; in that
+        case nothing is applied.
+        """
+        if not items:
+            return
+
+        keys = [self.order_key(order_id), self.log_key]
+        args = [
+            max(1, int((expires_at - timezone.now()).total_seconds())),
+            str(order_id),
+            str(event_id),
+            expires_at.isoformat(),
+        ]
+        for item in items:
+            tier_id = str(item['tier_id'])
+            custom_price = item.get('custom_price')
+            keys += [self.available_key(tier_id), self.pending_key(tier_id)]
+            args += [
+                tier_id,
+                int(item['quantity']),
+                '' if custom_price is None else str(custom_price),
+                str(uuid.uuid4()),
+            ]
+
+        for _ in range(3):
+            result = self._reserve(keys=keys, args=args)
+            status_code = int(result[0])
+            if status_code == 1:
+                return
+            tier_id = str(items[int(result[1]) - 1]['tier_id'])
+            if status_code == 0:
+                raise InsufficientInventory(tier_id, int(result[2]))
+            self.seed_tier(tier_id)
+
+        raise TimeoutError('Inventory counters could not be seeded')
+
+    def seed_tier(self, tier_id, force=False):
+        """Load a tier counter from TicketTier.available minus pending deltas."""
+        from apps.events.models import TicketTier
+
+        with self._lock():
+            available = TicketTier.objects.filter(id=tier_id).values_list('available', flat=True).first()
+            return self._seed(
+                keys=[self.available_key(tier_id), self.pending_key(tier_id), self.tiers_key],
+                args=['unlimited' if available is None else available, str(tier_id), '0' if force else '1'],
+            )
+
+    def get_available(self, tier_id):
+        """Return the live Redis counter for a tier (None if unlimited or not seeded)."""
+        raw = self.client.get(self.available_key(tier_id))
+        if raw is None or int(raw) == UNLIMITED:
+            return None
+        return int(raw)
+
+    def invalidate_tier(self, tier_id):
+        """Drop a tier counter so the next reserve reseeds it from the database."""
+        self.client.delete(self.available_key(tier_id))
+
+    def order_in_sync(self, order_id):
+        """
+        True when the active TicketHold rows of an order match the quantities Redis
+        accepted for it, i.e. none of its hold log records is still waiting for flush().
+        """
+        from django.db.models import Sum
+
+        from apps.events.models import TicketHold
+
+        held = {
+            (tier_id.decode() if isinstance(tier_id, bytes) else tier_id): int(quantity)
+            for tier_id, quantity in self.client.hgetall(self.order_key(order_id)).items()
+        }
+        persisted = {
+            str(row['ticket_tier_id']): row['quantity']
+            for row in TicketHold.objects.active().filter(order_id=order_id)
+            .values('ticket_tier_id').annotate(quantity=Sum('quantity')).order_by()
+            if row['quantity']
+        }
+        return held == persisted
+
+    # ------------------------------------------------------------------
+    # Background persistence
+    # ------------------------------------------------------------------
+
+    def flush(self, batch_size=None, max_batches=None, blocking_timeout=None):
+        """
+        Drain the hold log into Postgres.
+
+        Must run outside an outer ``transaction.atomic`` block: popped records are
+        only acknowledged (pending counters decremented) once their batch commits.
+        Returns the number of log records persisted.
+        """
+        batch_size = batch_size or _inventory_settings().get('FLUSH_BATCH_SIZE', 500)
+        persisted = 0
+        batches = 0
+
+        with self._lock(blocking_timeout=blocking_timeout):
+            while max_batches is None or batches < max_batches:
+                raw_records = self._pop_batch(keys=[self.log_key], args=[batch_size])
+                if not raw_records:
+                    break
+                records = [json.loads(r) for r in raw_records]
+                try:
+                    self._persist(records)
+                except Exception:
+                    # Put the batch back at the head, preserving order, and let the caller retry
+                    self.client.lpush(self.log_key, *reversed(raw_records))
+                    raise
+
+                pending = defaultdict(int)
+                for record in records:
+                    if record.get('limited', True):
+                        pending[record['tier_id']] += int(record['delta'])
+                pipe = self.client.pipeline()
+                for tier_id, delta in pending.items():
+                    if delta:
+                        pipe.decrby(self.pending_key(tier_id), delta)
+                pipe.execute()
+
+                persisted += len(records)
+                batches += 1
+
+        return persisted
+
+    def _persist(self, records):
+        """Apply a batch of hold log records with bulk writes and one UPDATE for all tiers."""
+        from apps.events.models import TicketHold, TicketTier
+
+        now = timezone.now()
+        tier_adjustments = defaultdict(int)
+
+        with transaction.atomic():
+            # Aggregate increases per (order, tier, custom_price): one hold row each
+            increases = {}
+            for record in records:
+                delta = int(record['delta'])
+                expires_at = datetime.fromisoformat(record['expires_at'])
+                if delta <= 0 or expires_at <= now:
+                    # Expired before reaching the database: capacity never leaves the tier
+                    continue
+                custom_price = Decimal(record['custom_price']) if record['custom_price'] else None
+                key = (record['order_id'], record['tier_id'], custom_price)
+                entry = increases.setdefault(key, {'record': record, 'quantity': 0, 'expires_at': expires_at})
+                entry['quantity'] += delta
+                entry['expires_at'] = max(entry['expires_at'], expires_at)
+
+            existing = {}
+            if increases:
+                for hold in TicketHold.objects.active().select_for_update().filter(
+                    order_id__in={key[0] for key in increases},
+                    ticket_tier_id__in={key[1] for key in increases},
+                ):
+                    existing.setdefault((str(hold.order_id), str(hold.ticket_tier_id), hold.custom_price), hold)
+
+            new_holds = []
+            for key, entry in increases.items():
+                order_id, tier_id, custom_price = key
+                hold = existing.get(key)
+                if hold is not None:
+                    TicketHold.objects.filter(id=hold.id).update(
+                        quantity=F('quantity') + entry['quantity'],
+                        expires_at=max(hold.expires_at, entry['expires_at']),
+                    )
+                else:
+                    new_holds.append(TicketHold(
+                        id=entry['record']['hold_id'],
+                        event_id=entry['record']['event_id'],
+                        ticket_tier_id=tier_id,
+                        order_id=order_id,
+                        quantity=entry['quantity'],
+                        expires_at=entry['expires_at'],
+                        custom_price=custom_price,
+                    ))
+                tier_adjustments[tier_id] -= entry['quantity']
+            TicketHold.objects.bulk_create(new_holds, batch_size=500)
+
+            # Decreases return capacity themselves (release_quantity adjusts TicketTier.available)
+            for record in records:
+                if int(record['delta']) < 0:
+                    TicketHold.objects.filter(
+                        order_id=record['order_id'],
+                        ticket_tier_id=record['tier_id'],
+                    ).release_quantity(-int(record['delta']))
+
+            TicketTier.objects.adjust_available(tier_adjustments)
+
+    # ------------------------------------------------------------------
+    # Reconciliation
+    # ------------------------------------------------------------------
+
+    def reconcile(self):
+        """
+        Flush pending holds, return expired holds to their tiers and reset every
+        seeded counter to ``TicketTier.available - pending``.
+        """
+        from apps.events.models import TicketHold, TicketTier
+
+        started = time.monotonic()
+        flushed = self.flush()
+
+        tier_ids = [t.decode() if isinstance(t, bytes) else t for t in self.client.smembers(self.tiers_key)]
+        if not tier_ids:
+            return {'flushed': flushed, 'tiers': 0, 'released_holds': 0, 'duration_ms': 0}
+
+        with self._lock():
+            released_holds, _ = TicketHold.objects.filter(
+                ticket_tier_id__in=tier_ids,
+                released=False,
+                expires_at__lte=timezone.now(),
+            ).release()
+
+            db_available = dict(
+                (str(pk), available)
+                for pk, available in TicketTier.objects.filter(id__in=tier_ids).values_list('id', 'available')
+            )
+            for tier_id in tier_ids:
+                if tier_id not in db_available:
+                    self.client.delete(self.available_key(tier_id), self.pending_key(tier_id))
+                    self.client.srem(self.tiers_key, tier_id)
+                    continue
+                available = db_available[tier_id]
+                self._seed(
+                    keys=[self.available_key(tier_id), self.pending_key(tier_id), self.tiers_key],
+                    args=['unlimited' if available is None else available, tier_id, '0'],
+                )
+
+        return {
+            'flushed': flushed,
+            'tiers': len(tier_ids),
+            'released_holds': released_holds,
+            'duration_ms': round((time.monotonic() - started) * 1000, 2),
+        }
@@ -1,10 +1,11 @@
 """Signals for the events app."""
 
-from django.db.models.signals import pre_save
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save
 from django.dispatch import receiver
 from django.utils.text import slugify
 
-from .models import Event, EventCategory
+from .models import Event, EventCategory, Order, TicketTier
 
 
 @receiver(pre_save, sender=Event)
@@ -36,4 +37,23 @@ def create_category_slug(sender, instance, **kwargs):
             slug = f"{base_slug}-{counter}"
             counter += 1
         
-        instance.slug = slug 
\ No newline at end of file
+        instance.slug = slug
+
+
+@receiver(post_save, sender=TicketTier)
+def invalidate_tier_inventory(sender, instance, **kwargs):
+    """Drop the Redis inventory counter so it is reseeded from the saved tier."""
+    from apps.events.services.inventory import get_inventory_engine
+
+    engine = get_inventory_engine()
+    if engine is not None:
+        transaction.on_commit(lambda: engine.invalidate_tier(instance.id))
+
+
+@receiver(post_save, sender=Order)
+def invalidate_platform_analytics(sender, instance, **kwargs):
+    """Paid/cancelled/refunded orders change SuperAdmin revenue figures: drop the cached analytics."""
+    from core import platform_analytics
+
+    if instance.status in platform_analytics.REVENUE_STATUSES:
+        transaction.on_commit(platform_analytics.invalidate)
@@ -247,7 +247,13 @@ def update_event_view_metrics(event_id, session_id, time_on_page):
     🚀 ENTERPRISE: Update time on page for an event view.
     
     Called when user leaves the page to record actual time spent.
+    Queued for the analytics drain task when ANALYTICS_INGEST_BUFFERED is on.
     """
+    from core.analytics_ingest import record_time_on_page
+    
+    if record_time_on_page(event_id, session_id, time_on_page):
+        return {'queued': True, 'time_on_page': time_on_page}
+    
     try:
         view = EventView.objects.filter(
             event_id=event_id,
@@ -496,40 +502,138 @@ def send_ticket_confirmation_email(self, order_id):
 @shared_task
 def cleanup_expired_ticket_holds():
     """
-    🚀 ENTERPRISE: Clean up expired ticket holds.
+    🚀 ENTERPRISE: Clean up expired holds (tickets, coupons and experiences).
     
-    Removes expired ticket reservations to free up inventory.
-    This task runs every 5 minutes via Celery Beat.
+    Releases expired holds in batched UPDATE ... RETURNING statements and returns
+    ticket capacity to TicketTier.available grouped by tier.
+    This task runs every minute via Celery Beat.
     """
     try:
-        from apps.events.models import TicketHold
-        from django.utils import timezone
+        from apps.events.services.hold_sweeper import sweep_expired_holds
         
-        # Get expired holds (older than 15 minutes)
-        expiry_time = timezone.now() - timezone.timedelta(minutes=15)
-        
-        expired_holds = TicketHold.objects.filter(
-            expires_at__lt=timezone.now(),
-            released=False
-        )
-        
-        count = expired_holds.count()
-        
-        if count > 0:
-            # Mark as released and free up the holds
-            expired_holds.update(released=True)
-            logger.info(f"🧹 [CLEANUP] Cleaned up {count} expired ticket holds")
-        
-        return {
-            'cleaned_holds': count,
-            'expiry_time': expiry_time.isoformat()
-        }
+        return sweep_expired_holds()
         
     except Exception as e:
         logger.error(f"🧹 [CLEANUP] Error in cleanup_expired_ticket_holds: {e}")
         raise
 
 
+@shared_task(bind=True, max_retries=3, default_retry_delay=30)
+def generate_order_tickets_qr(self, order_id):
+    """
+    🚀 ENTERPRISE: Pre-render and store QR images for every ticket of a paid order.
+
+    Enqueued when the order becomes paid so QR endpoints and confirmation emails
+    read the stored image instead of rendering it at door-open time.
+    """
+    from apps.events.models import Ticket
+    from apps.events.qr_generator import generate_tickets_qr_batch
+
+    tickets = Ticket.objects.filter(
+        order_item__order_id=order_id, order_item__ticket_tier__is_raffle=False
+    ).only('id', 'ticket_number', 'qr_code', 'qr_image')
+    try:
+        result = generate_tickets_qr_batch(tickets)
+    except Exception as e:
+        logger.error(f"❌ [QR] Error pre-rendering QR for order {order_id}: {e}")
+        raise self.retry(exc=e)
+    if result['failed']:
+        raise self.retry(exc=RuntimeError(f"{result['failed']} QR image(s) failed for order {order_id}"))
+    return result
+
+
+def enqueue_order_tickets_qr(order_id):
+    """Queue QR pre-rendering once the surrounding transaction commits."""
+    from django.db import transaction
+
+    def enqueue():
+        try:
+            generate_order_tickets_qr.apply_async(args=[str(order_id)])
+        except Exception as e:
+            # Not fatal: QR endpoints and emails fall back to rendering on demand
+            logger.warning(f"⚠️ [QR] Could not enqueue QR pre-rendering for order {order_id}: {e}")
+
+    transaction.on_commit(enqueue)
+
+
+@shared_task(bind=True, max_retries=1, default_retry_delay=60)
+def export_event_data(self, job_id, event_id, kind, export_format):
+    """
+    🚀 ENTERPRISE: Build an attendee/order export and upload it to storage.
+
+    Started by the export endpoints with ?async=1; the job record (status and
+    download link) is read back through export_status.
+    """
+    from apps.events.exports import run_export_job
+
+    try:
+        return run_export_job(job_id, event_id, kind, export_format)
+    except Exception as e:
+        raise self.retry(exc=e)
+
+
+@shared_task
+def purge_expired_event_exports():
+    """
+    🚀 ENTERPRISE: Delete background export files whose job records (and links) expired.
+
+    Runs hourly; files live at most EVENT_EXPORTS['LINK_TTL'] plus one hour.
+    """
+    from apps.events.exports import purge_expired_exports
+
+    deleted = purge_expired_exports()
+    if deleted:
+        logger.info(f"🗑️ [EXPORT] Deleted {deleted} expired export files")
+    return deleted
+
+
+@shared_task
+def flush_ticket_inventory():
+    """
+    🚀 ENTERPRISE: Persist holds accepted by the Redis inventory engine.
+
+    Bulk-creates aggregate TicketHold rows and applies one TicketTier UPDATE per batch.
+    No-op when TICKET_INVENTORY_ENGINE is 'database'.
+    """
+    from apps.events.services.inventory import get_inventory_engine
+
+    engine = get_inventory_engine()
+    if engine is None:
+        return {'flushed': 0}
+
+    try:
+        flushed = engine.flush(blocking_timeout=0)
+    except TimeoutError:
+        # Another flush/reconcile holds the lock; it will drain the log
+        return {'flushed': 0, 'skipped': True}
+
+    if flushed:
+        logger.info(f"🎟️ [INVENTORY] Flushed {flushed} hold log records")
+    return {'flushed': flushed}
+
+
+@shared_task
+def reconcile_ticket_inventory():
+    """
+    🚀 ENTERPRISE: Realign Redis inventory counters with TicketTier.available.
+
+    TicketTier.available remains the source of truth; counters are reset to
+    available minus the holds still waiting in the hold log.
+    """
+    from apps.events.services.inventory import get_inventory_engine
+
+    engine = get_inventory_engine()
+    if engine is None:
+        return {'tiers': 0}
+
+    result = engine.reconcile()
+    logger.info(
+        f"🎟️ [INVENTORY] Reconciled {result['tiers']} tiers "
+        f"(flushed={result['flushed']}, released_holds={result['released_holds']}, {result['duration_ms']}ms)"
+    )
+    return result
+
+
 @shared_task
 def schedule_event_reminders():
     """
@@ -787,19 +891,53 @@ def send_order_confirmation_email(self, order_id, to_email=None, flow_id=None):
 
 
 
+# EmailLog.template / Order.order_kind -> optimized confirmation sender (module, function)
+CONFIRMATION_SENDERS_BY_TEMPLATE = {
+    'order_confirmation': ('apps.events.email_sender', 'send_order_confirmation_email_optimized'),
+    'experience_confirmation': ('apps.experiences.email_sender', 'send_experience_confirmation_email_optimized'),
+    'erasmus_activity_confirmation': ('apps.erasmus.email_sender', 'send_erasmus_activity_confirmation_email_optimized'),
+}
+CONFIRMATION_TEMPLATE_BY_ORDER_KIND = {
+    'event': 'order_confirmation',
+    'experience': 'experience_confirmation',
+    'erasmus_activity': 'erasmus_activity_confirmation',
+}
+
+
+def _confirmation_sender(template):
+    """Return the optimized sender for a confirmation template (events sender by default)."""
+    import importlib
+    
+    module_name, function_name = CONFIRMATION_SENDERS_BY_TEMPLATE.get(
+        template, CONFIRMATION_SENDERS_BY_TEMPLATE['order_confirmation']
+    )
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+# ensure_pending_emails_sent: one run at a time; expires if a worker dies mid-batch
+PENDING_EMAILS_LOCK_KEY = 'ensure_pending_emails_sent:lock'
+PENDING_EMAILS_LOCK_SECONDS = 15 * 60
+
+
+def _confirmation_sent(result):
+    return bool(result) and result.get('status') in ('completed', 'success') and not result.get('failed_emails')
+
+
 @shared_task(bind=True, max_retries=3)
 def retry_failed_emails(self):
     """
     🚀 ENTERPRISE: Retry failed email deliveries automatically.
     
-    Scans EmailLog for failed/pending emails and retries them.
+    Scans EmailLog for failed/pending emails and retries them, one send per
+    (order, recipient), over a few pooled SMTP connections (core.smtp_pool.send_batch).
     Ensures no email is ever lost.
     
     Runs every 15 minutes via Celery Beat.
     """
     try:
         from apps.events.models import EmailLog
-        from apps.events.email_sender import send_order_confirmation_email_optimized
+        from core.smtp_pool import send_batch
+        from django.db.models import F
         from django.utils import timezone
         from datetime import timedelta
         
@@ -811,32 +949,41 @@ def retry_failed_emails(self):
             attempts__lt=3
         ).select_related('order')
         
-        retried = 0
-        succeeded = 0
-        
+        # Several failed logs for the same recipient are retried with one send
+        jobs = {}
         for email_log in failed_emails:
-            try:
-                logger.info(f"🔄 [RETRY] Retrying email to {email_log.to_email} for order {email_log.order.order_number}")
-                
-                result = send_order_confirmation_email_optimized(
-                    str(email_log.order.id),
-                    to_email=email_log.to_email
-                )
-                
-                if result['status'] == 'completed':
-                    succeeded += 1
-                    logger.info(f"✅ [RETRY] Successfully sent email to {email_log.to_email}")
-                
-                retried += 1
-                
-            except Exception as e:
-                logger.error(f"❌ [RETRY] Failed to retry email to {email_log.to_email}: {e}")
+            key = (email_log.order_id, email_log.to_email)
+            job = jobs.setdefault(key, {
+                'order_id': str(email_log.order_id),
+                'order_number': email_log.order.order_number,
+                'to_email': email_log.to_email,
+                'template': email_log.template,
+                'log_ids': [],
+            })
+            job['log_ids'].append(email_log.id)
+        jobs = list(jobs.values())
+        
+        # Count the attempt up front so a recipient that keeps failing stops after 3 tries
+        EmailLog.objects.filter(
+            id__in=[log_id for job in jobs for log_id in job['log_ids']]
+        ).update(attempts=F('attempts') + 1)
+        
+        def send_one(job, connection):
+            logger.info(f"🔄 [RETRY] Retrying email to {job['to_email']} for order {job['order_number']}")
+            return _confirmation_sender(job['template'])(
+                job['order_id'], to_email=job['to_email'], connection=connection
+            )
         
-        logger.info(f"🔄 [RETRY] Completed: {retried} retried, {succeeded} succeeded")
+        batch = send_batch(jobs, send_one)
+        succeeded = sum(1 for result in batch['results'] if _confirmation_sent(result))
+        retried = len(jobs)
+        
+        logger.info(f"🔄 [RETRY] Completed: {retried} retried, {succeeded} succeeded - Metrics: {batch['metrics']}")
         
         return {
             'retried': retried,
             'succeeded': succeeded,
+            'metrics': batch['metrics'],
             'timestamp': timezone.now().isoformat()
         }
         
@@ -856,13 +1003,29 @@ def ensure_pending_emails_sent(self):
     Garantiza que TODOS los emails se envíen eventualmente,
     incluso si el frontend nunca llama al endpoint o pierde conexión.
     
+    Los envíos del backlog se hacen en lote sobre unas pocas conexiones SMTP
+    persistentes (core.smtp_pool.send_batch). Un envío fallido no registra
+    EMAIL_SENT, así que la siguiente ejecución lo reintenta. El evento de flow del
+    fallback se registra después del lote, con el resultado de cada envío, y un
+    lock en cache evita que dos ejecuciones solapadas envíen el mismo backlog.
+    
     Esta es la última línea de defensa para garantizar entrega de emails.
     
     Runs every 5 minutes via Celery Beat.
     """
+    import uuid
+    from django.core.cache import cache
+    
+    # 🔒 LOCK: Un lote lento no debe solaparse con la siguiente ejecución (cada 5 minutos)
+    lock_token = uuid.uuid4().hex
+    if not cache.add(PENDING_EMAILS_LOCK_KEY, lock_token, PENDING_EMAILS_LOCK_SECONDS):
+        logger.warning("📧 [FALLBACK] Previous run still in progress, skipping")
+        return {'skipped_locked': True, 'timestamp': timezone.now().isoformat()}
+    
     try:
+        from core.flow_logger import FlowLogger
         from core.models import PlatformFlow
-        from django.utils import timezone
+        from core.smtp_pool import send_batch
         from datetime import timedelta
         
         logger.info("📧 [FALLBACK] Starting periodic check for pending emails")
@@ -879,7 +1042,7 @@ def ensure_pending_emails_sent(self):
             events__step='EMAIL_SENT'
         ).distinct().select_related('primary_order')
         
-        enqueued = 0
+        jobs = []
         skipped = 0
         
         for flow in pending_flows:
@@ -913,58 +1076,71 @@ def ensure_pending_emails_sent(self):
                     logger.warning(f"📧 [FALLBACK] Order {order.order_number} not paid, skipping")
                     continue
                 
-                # Enqueue email send
-                logger.info(f"📧 [FALLBACK] Enqueuing email for order {order.order_number} (pending for {timezone.now() - pending_event.created_at})")
-                
-                # ✅ CRÍTICO: Verificar order_kind y llamar task correcto
-                if getattr(order, 'order_kind', 'event') == 'experience':
-                    # Experience order
-                    from apps.experiences.tasks import send_experience_confirmation_email
-                    send_experience_confirmation_email.apply_async(
-                        args=[str(order.id)],
-                        kwargs={'flow_id': str(flow.id)},
-                        queue='emails'
-                    )
-                else:
-                    # Event order (tickets)
-                    from apps.events.tasks import send_order_confirmation_email
-                    send_order_confirmation_email.apply_async(
-                        args=[str(order.id)],
-                        kwargs={'flow_id': str(flow.id)},
-                        queue='emails'
-                    )
-                
-                # Log fallback event
-                flow.log_event(
+                logger.info(f"📧 [FALLBACK] Queuing email for order {order.order_number} (pending for {timezone.now() - pending_event.created_at})")
+                
+                jobs.append({'order': order, 'flow': flow, 'flow_id': str(flow.id), 'pending_since': pending_event.created_at})
+                
+            except Exception as e:
+                logger.error(f"📧 [FALLBACK] Error processing flow {flow.id}: {e}", exc_info=True)
+                continue
+        
+        # ✅ CRÍTICO: El sender depende del order_kind (evento, experiencia, Erasmus)
+        def send_one(job, connection):
+            order = job['order']
+            template = CONFIRMATION_TEMPLATE_BY_ORDER_KIND.get(getattr(order, 'order_kind', 'event'), 'order_confirmation')
+            return _confirmation_sender(template)(str(order.id), flow_id=job['flow_id'], connection=connection)
+        
+        batch = send_batch(jobs, send_one)
+        sent = 0
+        
+        # Log fallback events with the outcome of each send
+        for job, result in zip(jobs, batch['results']):
+            order = job['order']
+            delivered = _confirmation_sent(result)
+            sent += delivered
+            pending_for = timezone.now() - job['pending_since']
+            try:
+                FlowLogger(job['flow']).log_event(
                     'EMAIL_TASK_ENQUEUED',
                     order=order,
                     source='celery',
-                    status='success',
-                    message=f"Email enqueued by periodic fallback task (was pending for {timezone.now() - pending_event.created_at})",
+                    status='success' if delivered else 'failure',
+                    message=(
+                        f"Email sent by periodic fallback batch (was pending for {pending_for})" if delivered
+                        else f"Periodic fallback send failed, will retry (pending for {pending_for})"
+                    ),
                     metadata={
                         'reason': 'periodic_fallback',
-                        'pending_since': pending_event.created_at.isoformat(),
-                        'order_kind': getattr(order, 'order_kind', 'event')
+                        'pending_since': job['pending_since'].isoformat(),
+                        'order_kind': getattr(order, 'order_kind', 'event'),
+                        'sent': delivered,
+                        'error': (result or {}).get('error') if not delivered else None,
                     }
                 )
-                
-                enqueued += 1
-                
             except Exception as e:
-                logger.error(f"📧 [FALLBACK] Error processing flow {flow.id}: {e}", exc_info=True)
-                continue
+                logger.error(f"📧 [FALLBACK] Could not log fallback result for order {order.order_number}: {e}")
         
-        logger.info(f"📧 [FALLBACK] Completed: {enqueued} enqueued, {skipped} skipped (too recent)")
+        logger.info(
+            f"📧 [FALLBACK] Completed: {len(jobs)} processed, {sent} sent, {skipped} skipped (too recent) - "
+            f"Metrics: {batch['metrics']}"
+        )
         
         return {
-            'enqueued': enqueued,
+            'enqueued': len(jobs),
+            'sent': sent,
             'skipped': skipped,
+            'metrics': batch['metrics'],
             'timestamp': timezone.now().isoformat()
         }
         
     except Exception as e:
         logger.error(f"❌ [FALLBACK] Error in ensure_pending_emails_sent: {e}", exc_info=True)
         raise
+    
+    finally:
+        # Only release our own lock (it may have expired and been taken by a newer run)
+        if cache.get(PENDING_EMAILS_LOCK_KEY) == lock_token:
+            cache.delete(PENDING_EMAILS_LOCK_KEY)
 
 
 # OLD IMPLEMENTATION - REMOVED
@@ -978,4 +1154,3 @@ def ensure_pending_emails_sent(self):
 # 2. Pre-computed context with no queries (<1s)
 # 3. Optimized SMTP with timeout (<10s)
 # TOTAL: <10s ✅
-        self.retry(countdown=60 * (self.request.retries + 1), exc=e)
\ No newline at end of file
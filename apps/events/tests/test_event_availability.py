@@ -0,0 +1,92 @@
+"""
+Tests for batched availability annotations (TicketTier/Event .with_availability()).
+
+Annotated values match the per-instance properties, and public event endpoints run a
+fixed number of queries regardless of how many tiers/events they serialize.
+"""
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.events.models import Event, Order, OrderItem, TicketCategory, TicketHold, TicketTier
+from core.testing import create_event, create_organizer, create_ticket_tier
+
+
+def _add_tiers(event, count, category=None):
+    """Create `count` public tiers with one active hold and one paid item each."""
+    order = Order.objects.create(event=event, email='', first_name='Guest', last_name='User')
+    expires_at = timezone.now() + timedelta(minutes=15)
+    existing = event.ticket_tiers.count()
+    for i in range(count):
+        tier = create_ticket_tier(event, name=f'Tier {existing + i}', capacity=100, available=90, category=category)
+        TicketHold.objects.create(event=event, ticket_tier=tier, order=order, quantity=3, expires_at=expires_at)
+        OrderItem.objects.bulk_create([
+            OrderItem(order=order, ticket_tier=tier, quantity=7, unit_price=tier.price,
+                      unit_service_fee=Decimal('0'), subtotal=tier.price * 7),
+        ])
+    Order.objects.filter(id=order.id).update(status='paid')
+
+
+class AvailabilityAnnotationTests(TestCase):
+    """Annotated counts equal the query-per-access properties."""
+
+    def setUp(self):
+        self.event = create_event()
+        _add_tiers(self.event, 2)
+        create_ticket_tier(self.event, name='Unlimited', capacity=None, available=None)
+
+    def test_tier_annotations_match_properties(self):
+        for tier in TicketTier.objects.filter(event=self.event).with_availability():
+            plain = TicketTier.objects.get(id=tier.id)
+            self.assertEqual(tier.tickets_on_hold, plain.tickets_on_hold)
+            self.assertEqual(tier.tickets_sold, plain.tickets_sold)
+            self.assertEqual(tier.real_available, plain.real_available)
+            self.assertEqual(tier.get_availability_summary(), plain.get_availability_summary())
+
+    def test_event_annotation_matches_property(self):
+        sold_out = create_event(slug='sold-out', organizer=self.event.organizer, pricing_mode='complex')
+        create_ticket_tier(sold_out, capacity=10, available=0)
+
+        for event in Event.objects.filter(id__in=[self.event.id, sold_out.id]).with_availability():
+            self.assertEqual(event.has_available_tickets, Event.objects.get(id=event.id).has_available_tickets)
+        self.assertFalse(Event.objects.with_availability().get(id=sold_out.id).has_available_tickets)
+
+
+class PublicEventQueryCountTests(TestCase):
+    """Query-count regression: adding tiers/events must not add queries."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.organizer = create_organizer()
+
+    def _count_queries(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def _detail_urls(self, event):
+        return [f'/api/v1/events/{event.id}/', f'/api/v1/public/events/{event.id}/']
+
+    def test_event_detail_queries_do_not_grow_with_tiers(self):
+        event = create_event(organizer=self.organizer, pricing_mode='complex')
+        category = TicketCategory.objects.create(event=event, name='General')
+        _add_tiers(event, 2, category=category)
+        baseline = [self._count_queries(url) for url in self._detail_urls(event)]
+
+        _add_tiers(event, 8, category=category)
+        self.assertEqual([self._count_queries(url) for url in self._detail_urls(event)], baseline)
+        self.assertLessEqual(max(baseline), 10)
+
+    def test_public_list_queries_do_not_grow_with_events(self):
+        _add_tiers(create_event(organizer=self.organizer, slug='e-0', pricing_mode='complex'), 3)
+        baseline = self._count_queries('/api/v1/events/public_list/')
+
+        for i in range(1, 6):
+            _add_tiers(create_event(organizer=self.organizer, slug=f'e-{i}', pricing_mode='complex'), 3)
+        self.assertEqual(self._count_queries('/api/v1/events/public_list/'), baseline)
@@ -0,0 +1,131 @@
+"""
+Tests for streaming attendee/order exports (apps.events.exports).
+
+CSV rows stream over a server-side cursor with form fields loaded once; XLSX is
+written in write-only mode; background jobs upload the file to the export storage,
+expose it only through the download endpoint and are purged after LINK_TTL.
+"""
+import csv
+import io
+import shutil
+import tempfile
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from openpyxl import load_workbook
+
+from apps.events.exports import (
+    ATTENDEE_HEADERS,
+    KIND_ATTENDEES,
+    KIND_ORDERS,
+    ORDER_HEADERS,
+    build_export_download_response,
+    build_export_response,
+    export_job_payload,
+    export_storage,
+    get_export_job,
+    purge_expired_exports,
+    run_export_job,
+)
+from apps.events.models import Order, OrderItem, Ticket
+from apps.forms.models import Form, FormField
+from core.testing import create_event, create_ticket_tier
+
+
+def _csv_rows(response):
+    content = b''.join(response.streaming_content).decode('utf-8')
+    return list(csv.reader(io.StringIO(content.lstrip('\ufeff'))))
+
+
+class EventExportTestCase(TestCase):
+    """Event with two tiers sharing a form, four paid orders, eight tickets."""
+
+    def setUp(self):
+        self.event = create_event()
+        form = Form.objects.create(name='Asistentes', organizer=self.event.organizer)
+        self.rut = FormField.objects.create(form=form, label='RUT', type='text', order=1)
+        FormField.objects.create(form=form, label='Talla', type='text', order=2)
+        vip = create_ticket_tier(self.event, name='VIP', price=Decimal('20000'), form=form)
+        general = create_ticket_tier(self.event, name='General', form=form)
+
+        for i in range(4):
+            order = Order.objects.create(
+                event=self.event, email=f'buyer{i}@example.com', first_name='Buyer', last_name=str(i),
+                status='paid', subtotal=Decimal('20000'), total=Decimal('20000'),
+            )
+            for tier in (vip, general):
+                item = OrderItem.objects.create(order=order, ticket_tier=tier, quantity=1, unit_price=tier.price)
+                Ticket.objects.create(
+                    order_item=item, first_name='Guest', last_name=str(i), email=order.email,
+                    form_data={str(self.rut.id): f'1111111{i}-K'},
+                )
+
+
+class EventExportTests(EventExportTestCase):
+
+    def test_attendee_csv_streams_every_ticket_with_form_fields(self):
+        response = build_export_response(self.event, KIND_ATTENDEES, 'csv')
+        self.assertTrue(response.streaming)
+        rows = _csv_rows(response)
+
+        self.assertEqual(rows[0], ATTENDEE_HEADERS + ['Campo: RUT', 'Campo: Talla'])
+        self.assertEqual(len(rows), 1 + 8)
+        self.assertEqual(rows[1][-2:], ['11111110-K', ''])
+
+    def test_attendee_query_count_does_not_grow_with_rows(self):
+        with self.assertNumQueries(2):  # form fields + ticket cursor
+            _csv_rows(build_export_response(self.event, KIND_ATTENDEES, 'csv'))
+
+    def test_order_excel_is_written_in_write_only_mode(self):
+        response = build_export_response(self.event, KIND_ORDERS, 'excel')
+        workbook = load_workbook(io.BytesIO(b''.join(response.streaming_content)), read_only=True)
+        rows = list(workbook['Pedidos'].values)
+
+        self.assertEqual(list(rows[0]), ORDER_HEADERS)
+        self.assertEqual(len(rows), 1 + 4)
+        self.assertEqual(rows[1][ORDER_HEADERS.index('Cantidad de Tickets')], 2)
+
+
+class ExportJobTests(EventExportTestCase):
+
+    def setUp(self):
+        super().setUp()
+        export_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, export_root, ignore_errors=True)
+        storage_settings = override_settings(EVENT_EXPORTS={
+            **settings.EVENT_EXPORTS,
+            'STORAGE': {
+                'BACKEND': 'django.core.files.storage.FileSystemStorage',
+                'OPTIONS': {'location': export_root},
+            },
+        })
+        storage_settings.enable()
+        self.addCleanup(storage_settings.disable)
+
+    def test_job_uploads_export_to_export_storage(self):
+        job = run_export_job('job123', str(self.event.id), KIND_ATTENDEES, 'csv')
+
+        self.assertEqual(job['status'], 'completed')
+        self.assertEqual(job['rows'], 8)
+        path = f"exports/events/{self.event.id}/job123/{job['filename']}"
+        self.assertEqual(get_export_job('job123')['path'], path)
+        with export_storage().open(path, 'rb') as f:
+            self.assertEqual(len(f.read().decode('utf-8').splitlines()), 9)
+
+        payload = export_job_payload(job, 'https://api.test/download/')
+        self.assertNotIn('path', payload)
+        self.assertEqual(payload['url'], 'https://api.test/download/?job_id=job123')
+        response = build_export_download_response(job)
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        response.close()
+
+    def test_expired_files_are_purged(self):
+        job = run_export_job('job123', str(self.event.id), KIND_ORDERS, 'csv')
+
+        self.assertEqual(purge_expired_exports(), 0)
+        self.assertEqual(purge_expired_exports(now=timezone.now() + timedelta(days=2)), 1)
+        self.assertFalse(export_storage().exists(job['path']))
+        self.assertIsNone(build_export_download_response(job))
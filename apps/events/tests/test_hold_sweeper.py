@@ -0,0 +1,171 @@
+"""
+Tests for the set-based expired-hold sweeper (apps.events.services.hold_sweeper).
+
+Ticket holds: capacity returned to TicketTier.available grouped by tier, active holds untouched.
+Coupon/experience holds: released (released_at stamped) without touching confirmed/active rows.
+Reserve: no release on the request path; capacity held by expired holds returns with the next sweep.
+"""
+from datetime import timedelta
+from decimal import Decimal
+
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.events.models import Coupon, CouponHold, Order, TicketHold, TicketTier
+from apps.events.services.hold_sweeper import (
+    get_last_sweep_stats,
+    sweep_expired_holds,
+    sweep_ticket_holds,
+)
+from apps.experiences.models import (
+    Experience,
+    ExperienceCapacityHold,
+    ExperienceReservation,
+    ExperienceResource,
+    ExperienceResourceHold,
+    TourInstance,
+)
+from core.testing import create_event, create_ticket_tier
+
+
+def _expire(queryset):
+    """Move holds into the past (expires_at must stay after created_at)."""
+    now = timezone.now()
+    queryset.update(created_at=now - timedelta(hours=1), expires_at=now - timedelta(minutes=1))
+
+
+class TicketHoldSweepTests(TestCase):
+    """sweep_ticket_holds() / sweep_expired_holds() on TicketHold."""
+
+    def setUp(self):
+        self.event = create_event()
+        self.order = Order.objects.create(event=self.event, email='', first_name='Guest', last_name='User')
+
+    def test_sweeps_100k_expired_holds_and_restores_capacity(self):
+        tiers = [create_ticket_tier(self.event, name=f'T{i}', capacity=100_000, available=0) for i in range(4)]
+        expires_at = timezone.now() + timedelta(minutes=15)
+        TicketHold.objects.bulk_create(
+            (
+                TicketHold(
+                    event=self.event, ticket_tier=tiers[i % 4], order=self.order, quantity=1, expires_at=expires_at
+                )
+                for i in range(100_000)
+            ),
+            batch_size=5000,
+        )
+        _expire(TicketHold.objects.all())
+
+        stats = sweep_expired_holds(batch_size=20_000)
+
+        self.assertEqual(stats['ticket_holds'], 100_000)
+        self.assertEqual(stats['tickets_returned'], 100_000)
+        self.assertEqual(stats['tiers'], 4)
+        self.assertGreaterEqual(stats['duration_ms'], 0)
+        self.assertEqual(get_last_sweep_stats(), stats)
+        self.assertFalse(TicketHold.objects.filter(released=False).exists())
+        self.assertEqual(
+            sorted(TicketTier.objects.filter(event=self.event).values_list('available', flat=True)),
+            [25_000] * 4,
+        )
+
+    def test_active_holds_and_other_tiers_untouched(self):
+        tier_a = create_ticket_tier(self.event, name='A', capacity=100, available=90)
+        tier_b = create_ticket_tier(self.event, name='B', capacity=100, available=95)
+        expires_at = timezone.now() + timedelta(minutes=15)
+        TicketHold.objects.bulk_create([
+            TicketHold(event=self.event, ticket_tier=tier_a, order=self.order, quantity=6, expires_at=expires_at),
+            TicketHold(event=self.event, ticket_tier=tier_a, order=self.order, quantity=4, expires_at=expires_at),
+            TicketHold(event=self.event, ticket_tier=tier_b, order=self.order, quantity=5, expires_at=expires_at),
+        ])
+        _expire(TicketHold.objects.filter(ticket_tier=tier_a, quantity=6))
+        _expire(TicketHold.objects.filter(ticket_tier=tier_b))
+
+        released, returned = sweep_ticket_holds(tier_ids=[tier_a.id])
+
+        self.assertEqual((released, returned), (1, {tier_a.id: 6}))
+        self.assertEqual(TicketTier.objects.get(id=tier_a.id).available, 96)
+        self.assertEqual(TicketTier.objects.get(id=tier_b.id).available, 95)
+        self.assertEqual(sweep_ticket_holds(), (1, {tier_b.id: 5}))
+        self.assertEqual(sweep_ticket_holds(), (0, {}))
+
+    def test_reserve_leaves_expired_holds_to_the_sweeper(self):
+        tier = create_ticket_tier(self.event, capacity=5, available=0)
+        TicketHold.objects.create(
+            event=self.event, ticket_tier=tier, order=self.order, quantity=5,
+            expires_at=timezone.now() + timedelta(minutes=15),
+        )
+        _expire(TicketHold.objects.filter(ticket_tier=tier))
+
+        def reserve():
+            return APIClient().post(
+                f'/api/v1/events/{self.event.id}/reserve/',
+                {'tickets': [{'tierId': str(tier.id), 'quantity': 2}]},
+                format='json',
+            )
+
+        self.assertEqual(reserve().status_code, 400)
+        self.assertTrue(TicketHold.objects.filter(order=self.order, released=False).exists())
+
+        sweep_ticket_holds()
+        self.assertEqual(reserve().status_code, 200)
+        tier.refresh_from_db()
+        self.assertEqual(tier.available, 3)
+        self.assertFalse(TicketHold.objects.filter(order=self.order, released=False).exists())
+
+
+class CouponAndExperienceHoldSweepTests(TestCase):
+    """sweep_expired_holds() on CouponHold, ExperienceCapacityHold and ExperienceResourceHold."""
+
+    def setUp(self):
+        self.event = create_event()
+        self.order = Order.objects.create(event=self.event, email='', first_name='Guest', last_name='User')
+        self.coupon = Coupon.objects.create(
+            code='SWEEP10', organizer=self.event.organizer, discount_type='percentage', discount_value=Decimal('10')
+        )
+        experience = Experience.objects.create(
+            title='Tour', slug='tour', organizer=self.event.organizer, status='published'
+        )
+        start = timezone.now() + timedelta(days=7)
+        self.instance = TourInstance.objects.create(
+            experience=experience, start_datetime=start, end_datetime=start + timedelta(hours=3), max_capacity=10
+        )
+        self.reservation = ExperienceReservation.objects.create(
+            reservation_id='RES-SWEEP', experience=experience, instance=self.instance,
+            first_name='Ana', last_name='Test', email='ana@example.com',
+        )
+        self.resource = ExperienceResource.objects.create(experience=experience, name='Kayak', price=Decimal('0'))
+
+    def test_releases_expired_unconfirmed_holds(self):
+        expires_at = timezone.now() + timedelta(minutes=15)
+        expired_coupon = CouponHold.objects.create(coupon=self.coupon, order=self.order, expires_at=expires_at)
+        confirmed_coupon = CouponHold.objects.create(
+            coupon=self.coupon, order=self.order, expires_at=expires_at, confirmed=True
+        )
+        active_coupon = CouponHold.objects.create(coupon=self.coupon, order=self.order, expires_at=expires_at)
+        capacity_hold = ExperienceCapacityHold.objects.create(
+            instance=self.instance, reservation=self.reservation, capacity_units=3, expires_at=expires_at
+        )
+        resource_hold = ExperienceResourceHold.objects.create(
+            resource=self.resource, reservation=self.reservation, instance=self.instance, quantity=2,
+            expires_at=expires_at,
+        )
+        _expire(CouponHold.objects.filter(id__in=[expired_coupon.id, confirmed_coupon.id]))
+        _expire(ExperienceCapacityHold.objects.all())
+        _expire(ExperienceResourceHold.objects.all())
+
+        stats = sweep_expired_holds()
+
+        self.assertEqual(stats['coupon_holds'], 1)
+        self.assertEqual(stats['experience_capacity_holds'], 1)
+        self.assertEqual(stats['experience_resource_holds'], 1)
+        self.assertEqual(stats['capacity_units_returned'], 3)
+        self.assertEqual(stats['rows_touched'], 3)
+        self.assertTrue(CouponHold.objects.get(id=expired_coupon.id).released)
+        self.assertFalse(CouponHold.objects.get(id=confirmed_coupon.id).released)
+        self.assertFalse(CouponHold.objects.get(id=active_coupon.id).released)
+        capacity_hold.refresh_from_db()
+        resource_hold.refresh_from_db()
+        self.assertTrue(capacity_hold.released)
+        self.assertIsNotNone(capacity_hold.released_at)
+        self.assertTrue(resource_hold.released)
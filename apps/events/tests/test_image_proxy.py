@@ -0,0 +1,154 @@
+"""
+Tests for the event image proxy cache (apps.events.image_proxy).
+
+The first request downloads through the pooled session and fills the disk cache;
+later ones are hits, revalidated with If-None-Match once stale, or served stale if
+storage is down. The endpoint honours If-None-Match and byte ranges, resizes with
+``w``/``fmt`` and rejects hosts outside our storage.
+"""
+import os
+import shutil
+import tempfile
+from io import BytesIO
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from PIL import Image
+from rest_framework.test import APIClient
+
+from apps.events import image_proxy
+
+IMAGE_URL = 'https://storage.googleapis.com/tuki-bucket/events/banner.jpg'
+
+
+def jpeg_bytes(size=(1000, 500)):
+    buf = BytesIO()
+    Image.new('RGB', size, (10, 120, 200)).save(buf, format='JPEG')
+    return buf.getvalue()
+
+
+class FakeResponse:
+
+    def __init__(self, status_code, body=b'', headers=None):
+        self.status_code = status_code
+        self.body = body
+        self.headers = headers or {}
+
+    def iter_content(self, chunk_size):
+        for i in range(0, len(self.body), chunk_size):
+            yield self.body[i:i + chunk_size]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class ImageProxyTests(TestCase):
+
+    def setUp(self):
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir, ignore_errors=True)
+        self.proxy_settings = {
+            'CACHE_DIR': cache_dir,
+            'MAX_CACHE_BYTES': 10 * 1024 * 1024,
+            'REVALIDATE_AFTER_SECONDS': 300,
+            'ALLOWED_HOSTS': ['storage.googleapis.com'],
+        }
+        overrides = override_settings(
+            IMAGE_PROXY=self.proxy_settings,
+            CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+
+        self.body = jpeg_bytes()
+        self.session = mock.Mock()
+        self.session.get.return_value = FakeResponse(
+            200, self.body, {'ETag': '"v1"', 'Content-Type': 'image/jpeg'}
+        )
+        patcher = mock.patch.object(image_proxy, 'get_session', return_value=self.session)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = APIClient()
+
+    def _get(self, **params):
+        headers = {k: params.pop(k) for k in list(params) if k.startswith('HTTP_')}
+        return self.client.get('/api/v1/events/images/proxy/', {'url': IMAGE_URL, **params}, **headers)
+
+    def test_miss_then_hit(self):
+        first = self._get()
+        second = self._get()
+
+        self.assertEqual((first.status_code, first['X-Cache']), (200, 'MISS'))
+        self.assertEqual((second.status_code, second['X-Cache']), (200, 'HIT'))
+        self.assertEqual(b''.join(second.streaming_content), self.body)
+        self.assertEqual(second['ETag'], '"v1"')
+        self.assertEqual(self.session.get.call_count, 1)
+        stats = image_proxy.get_image_proxy_stats()
+        self.assertEqual((stats['hit'], stats['miss'], stats['entries']), (1, 1, 1))
+
+    def test_stale_entry_is_revalidated_with_etag(self):
+        self._get()
+        self.proxy_settings['REVALIDATE_AFTER_SECONDS'] = 0
+        self.session.get.return_value = FakeResponse(304)
+
+        response = self._get()
+
+        self.assertEqual(response['X-Cache'], 'REVALIDATED')
+        self.assertEqual(b''.join(response.streaming_content), self.body)
+        self.assertEqual(self.session.get.call_args.kwargs['headers'], {'If-None-Match': '"v1"'})
+
+    def test_stale_entry_served_when_storage_is_down(self):
+        self._get()
+        self.proxy_settings['REVALIDATE_AFTER_SECONDS'] = 0
+        self.session.get.side_effect = image_proxy.requests.ConnectionError('down')
+
+        response = self._get()
+
+        self.assertEqual((response.status_code, response['X-Cache']), (200, 'STALE'))
+
+    def test_conditional_and_range_requests(self):
+        self.assertEqual(self._get(HTTP_IF_NONE_MATCH='"v1"').status_code, 304)
+
+        response = self._get(HTTP_RANGE='bytes=0-9')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response.content, self.body[:10])
+        self.assertEqual(response['Content-Range'], f'bytes 0-9/{len(self.body)}')
+
+        response = self._get(HTTP_RANGE='bytes=-5')
+        self.assertEqual(response.content, self.body[-5:])
+
+        response = self._get(HTTP_RANGE=f'bytes={len(self.body)}-')
+        self.assertEqual(response.status_code, 416)
+
+    def test_resize_snaps_width_and_caches_variant(self):
+        response = self._get(w='300', fmt='webp')
+
+        self.assertEqual((response.status_code, response['Content-Type']), (200, 'image/webp'))
+        image = Image.open(BytesIO(b''.join(response.streaming_content)))
+        self.assertEqual(image.size, (320, 160))
+        self.assertEqual(self._get(w='300', fmt='webp')['X-Cache'], 'HIT')
+        self.assertEqual(self.session.get.call_count, 1)
+
+    def test_rejects_foreign_hosts(self):
+        for url in ('https://evil.example.com/?storage.googleapis.com', 'file:///etc/passwd'):
+            response = self.client.get('/api/v1/events/images/proxy/', {'url': url})
+            self.assertEqual(response.status_code, 400)
+        self.session.get.assert_not_called()
+
+    def test_disk_cache_evicts_least_recently_used(self):
+        disk_cache = image_proxy.DiskLRUCache(self.proxy_settings['CACHE_DIR'], max_bytes=100)
+        for i, key in enumerate(('aa1', 'bb2', 'cc3')):
+            disk_cache.put(key, {'url': key}, b'x' * 40)
+            body = os.path.join(self.proxy_settings['CACHE_DIR'], key[:2], key)
+            os.utime(body, (1000 + i, 1000 + i))
+
+        disk_cache.put('dd4', {'url': 'dd4'}, b'x' * 40)
+
+        self.assertIsNone(disk_cache.get('aa1'))
+        self.assertIsNone(disk_cache.get('bb2'))
+        meta, fh = disk_cache.get('dd4')
+        fh.close()
+        self.assertLessEqual(disk_cache.usage()['bytes'], 90)
@@ -0,0 +1,176 @@
+"""
+Tests for the Redis inventory engine (apps.events.services.inventory).
+
+Reserve: atomic decrement, no oversell, quantity changes, flush task enqueued after
+commit. Flush: bulk TicketHold writes and TicketTier.available adjustment; per-order
+sync check used by booking. Reconcile: counters realigned with the database.
+Skipped when no Redis server is reachable.
+"""
+import uuid
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.events.models import Order, TicketHold
+from apps.events.services import inventory
+from apps.events.services.inventory import InsufficientInventory, RedisInventoryEngine
+from core.testing import create_event, create_ticket_tier, redis_test_client
+
+
+REDIS = redis_test_client()
+REDIS_SETTINGS = {'ENGINE': 'redis', 'REDIS_URL': '', 'FLUSH_BATCH_SIZE': 500, 'LOCK_TIMEOUT': 30, 'LOCK_WAIT': 5}
+
+
+class RedisInventoryTestCase(TestCase):
+    """Engine bound to a per-test key prefix; keys are deleted on teardown."""
+
+    def setUp(self):
+        if REDIS is None:
+            self.skipTest('Redis not available')
+        self.prefix = f'test:inventory:{uuid.uuid4().hex[:8]}'
+        self.engine = RedisInventoryEngine(REDIS, prefix=self.prefix)
+        self.event = create_event()
+        self.tier = create_ticket_tier(self.event, capacity=10)
+
+    def tearDown(self):
+        keys = REDIS.keys(f'{self.prefix}:*')
+        if keys:
+            REDIS.delete(*keys)
+
+    def _order(self):
+        return Order.objects.create(
+            event=self.event, email='', first_name='Guest', last_name='User', status='pending'
+        )
+
+    def _expires(self):
+        return timezone.now() + timedelta(minutes=15)
+
+
+class ReserveTests(RedisInventoryTestCase):
+
+    def test_reserve_seeds_and_decrements_counter(self):
+        order = self._order()
+        self.engine.reserve(self.event.id, order.id, [{'tier_id': self.tier.id, 'quantity': 3}], self._expires())
+        self.assertEqual(self.engine.get_available(self.tier.id), 7)
+        # Database untouched until flush
+        self.tier.refresh_from_db()
+        self.assertEqual(self.tier.available, 10)
+        self.assertFalse(TicketHold.objects.filter(order=order).exists())
+
+    def test_reserve_rejects_oversell_without_partial_apply(self):
+        other_tier = create_ticket_tier(self.event, name='VIP', capacity=2)
+        order = self._order()
+        with self.assertRaises(InsufficientInventory) as ctx:
+            self.engine.reserve(
+                self.event.id,
+                order.id,
+                [{'tier_id': self.tier.id, 'quantity': 1}, {'tier_id': other_tier.id, 'quantity': 3}],
+                self._expires(),
+            )
+        self.assertEqual(ctx.exception.tier_id, str(other_tier.id))
+        self.assertEqual(ctx.exception.available, 2)
+        self.assertEqual(self.engine.get_available(self.tier.id), 10)
+
+    def test_reserve_same_order_sets_absolute_quantity(self):
+        order = self._order()
+        self.engine.reserve(self.event.id, order.id, [{'tier_id': self.tier.id, 'quantity': 4}], self._expires())
+        self.engine.reserve(self.event.id, order.id, [{'tier_id': self.tier.id, 'quantity': 1}], self._expires())
+        self.assertEqual(self.engine.get_available(self.tier.id), 9)
+
+
+class FlushAndReconcileTests(RedisInventoryTestCase):
+
+    def test_flush_persists_holds_and_tier_availability(self):
+        first, second = self._order(), self._order()
+        self.engine.reserve(self.event.id, first.id, [{'tier_id': self.tier.id, 'quantity': 2}], self._expires())
+        self.engine.reserve(self.event.id, second.id, [{'tier_id': self.tier.id, 'quantity': 3}], self._expires())
+
+        self.assertEqual(self.engine.flush(), 2)
+
+        self.tier.refresh_from_db()
+        self.assertEqual(self.tier.available, 5)
+        self.assertEqual(sum(TicketHold.objects.filter(order=first).values_list('quantity', flat=True)), 2)
+        self.assertEqual(sum(TicketHold.objects.filter(order=second).values_list('quantity', flat=True)), 3)
+        self.assertEqual(int(REDIS.get(self.engine.pending_key(self.tier.id))), 0)
+
+    def test_flush_applies_quantity_reduction(self):
+        order = self._order()
+        self.engine.reserve(self.event.id, order.id, [{'tier_id': self.tier.id, 'quantity': 4}], self._expires())
+        self.engine.flush()
+        self.engine.reserve(self.event.id, order.id, [{'tier_id': self.tier.id, 'quantity': 1}], self._expires())
+        self.engine.flush()
+
+        self.tier.refresh_from_db()
+        self.assertEqual(self.tier.available, 9)
+        active = TicketHold.objects.filter(order=order, released=False)
+        self.assertEqual(sum(active.values_list('quantity', flat=True)), 1)
+
+    def test_order_in_sync_tracks_unflushed_quantity_changes(self):
+        order = self._order()
+        self.engine.reserve(self.event.id, order.id, [{'tier_id': self.tier.id, 'quantity': 2}], self._expires())
+        self.assertFalse(self.engine.order_in_sync(order.id))
+        self.engine.flush()
+        self.assertTrue(self.engine.order_in_sync(order.id))
+
+        # Holds already exist, but the new quantity is still in the log
+        self.engine.reserve(self.event.id, order.id, [{'tier_id': self.tier.id, 'quantity': 5}], self._expires())
+        self.assertFalse(self.engine.order_in_sync(order.id))
+        self.engine.flush()
+        self.assertTrue(self.engine.order_in_sync(order.id))
+
+    def test_reconcile_realigns_counter_with_database(self):
+        order = self._order()
+        self.engine.reserve(self.event.id, order.id, [{'tier_id': self.tier.id, 'quantity': 2}], self._expires())
+        # Counter drifted (e.g. manual edit in Redis); pending log record still unflushed
+        REDIS.set(self.engine.available_key(self.tier.id), 0)
+
+        result = self.engine.reconcile()
+
+        self.assertEqual(result['flushed'], 1)
+        self.assertEqual(self.engine.get_available(self.tier.id), 8)
+        self.tier.refresh_from_db()
+        self.assertEqual(self.tier.available, 8)
+
+
+@override_settings(TICKET_INVENTORY=REDIS_SETTINGS)
+class ReserveEndpointTests(RedisInventoryTestCase):
+    """POST /api/v1/events/{id}/reserve/ with TICKET_INVENTORY_ENGINE=redis."""
+
+    def setUp(self):
+        super().setUp()
+        inventory._engine = self.engine
+
+    def tearDown(self):
+        inventory._engine = None
+        super().tearDown()
+
+    def test_reserve_endpoint_uses_engine(self):
+        client = APIClient()
+        with mock.patch('apps.events.tasks.flush_ticket_inventory.delay') as flush_delay, \
+                self.captureOnCommitCallbacks(execute=True):
+            response = client.post(
+                f'/api/v1/events/{self.event.id}/reserve/',
+                {'tickets': [{'tierId': str(self.tier.id), 'quantity': 2}]},
+                format='json',
+            )
+        self.assertEqual(response.status_code, 200)
+        flush_delay.assert_called_once_with()
+        reservation_id = response.json()['reservationId']
+        self.assertEqual(self.engine.get_available(self.tier.id), 8)
+
+        self.engine.flush()
+        holds = TicketHold.objects.filter(order_id=reservation_id, released=False)
+        self.assertEqual(sum(holds.values_list('quantity', flat=True)), 2)
+
+    def test_reserve_endpoint_sold_out(self):
+        client = APIClient()
+        response = client.post(
+            f'/api/v1/events/{self.event.id}/reserve/',
+            {'tickets': [{'tierId': str(self.tier.id), 'quantity': 11}]},
+            format='json',
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('Disponibles: 10', response.json()['detail'])
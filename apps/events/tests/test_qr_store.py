@@ -0,0 +1,80 @@
+"""
+Tests for the pre-rendered ticket QR store (apps.events.qr_generator).
+
+Batch generation stores one content-addressed PNG per ticket and fills qr_code /
+qr_image; already rendered tickets are skipped; the QR endpoint serves the stored
+image as JSON (with URL) or as a PNG stream.
+"""
+import base64
+import shutil
+import tempfile
+from decimal import Decimal
+
+from django.core.files.storage import default_storage
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from apps.events.models import Order, OrderItem, Ticket
+from apps.events.qr_generator import generate_tickets_qr_batch, qr_image_path
+from apps.events.tasks import generate_order_tickets_qr
+from core.testing import create_event, create_ticket_tier
+
+
+class QRStoreTests(TestCase):
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        storage_settings = override_settings(
+            MEDIA_ROOT=media_root,
+            DEFAULT_FILE_STORAGE='django.core.files.storage.FileSystemStorage',
+            FRONTEND_URL='https://tuki.test',
+        )
+        storage_settings.enable()
+        self.addCleanup(storage_settings.disable)
+
+        event = create_event()
+        tier = create_ticket_tier(event, price=Decimal('0'))
+        self.order = Order.objects.create(
+            event=event, email='guest@example.com', first_name='Guest', last_name='User', status='paid'
+        )
+        item = OrderItem.objects.create(order=self.order, ticket_tier=tier, quantity=3, unit_price=Decimal('0'))
+        self.tickets = [
+            Ticket.objects.create(order_item=item, first_name='Guest', last_name=str(i), email='guest@example.com')
+            for i in range(3)
+        ]
+
+    def test_batch_stores_content_addressed_images(self):
+        result = generate_tickets_qr_batch(self.tickets, use_processes=False)
+
+        self.assertEqual((result['success'], result['failed'], result['skipped']), (3, 0, 0))
+        for ticket in Ticket.objects.filter(order_item__order=self.order):
+            png = base64.b64decode(ticket.qr_code)
+            self.assertEqual(ticket.qr_image, qr_image_path(png))
+            with default_storage.open(ticket.qr_image, 'rb') as f:
+                self.assertEqual(f.read(), png)
+
+    def test_rendered_tickets_are_skipped(self):
+        generate_tickets_qr_batch(self.tickets[:1], use_processes=False)
+        tickets = list(Ticket.objects.filter(order_item__order=self.order))
+        result = generate_tickets_qr_batch(tickets, use_processes=False)
+        self.assertEqual((result['success'], result['skipped']), (2, 1))
+
+    def test_paid_order_task_renders_all_tickets(self):
+        generate_order_tickets_qr.apply(args=[str(self.order.id)])
+        self.assertFalse(Ticket.objects.filter(order_item__order=self.order, qr_image='').exists())
+
+    def test_endpoint_serves_stored_image(self):
+        ticket = self.tickets[0]
+        client = APIClient()
+
+        response = client.get(f'/api/v1/tickets/{ticket.ticket_number}/qr/')
+        self.assertEqual(response.status_code, 200)
+        ticket.refresh_from_db()
+        self.assertTrue(ticket.qr_image)
+        self.assertEqual(response.json()['qr_code'], f'data:image/png;base64,{ticket.qr_code}')
+        self.assertTrue(response.json()['qr_image_url'].endswith(ticket.qr_image))
+
+        response = client.get(f'/api/v1/tickets/{ticket.ticket_number}/qr/', {'stream': '1'})
+        self.assertEqual(response['Content-Type'], 'image/png')
+        self.assertEqual(response.content, base64.b64decode(ticket.qr_code))
@@ -0,0 +1,117 @@
+"""
+Tests for aggregate TicketHold rows (one per order/tier/custom_price) and set-based release.
+
+Reserve (database engine): bulk-created aggregate holds, growing/shrinking quantities.
+TicketHold.objects.release(): returns capacity to TicketTier.available grouped by tier.
+"""
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.events.models import Order, TicketHold, TicketTier
+from core.testing import create_event, create_ticket_tier
+
+
+class ReserveAggregateHoldTests(TestCase):
+    """POST /api/v1/events/{id}/reserve/ with the default database engine."""
+
+    def setUp(self):
+        self.event = create_event()
+        self.tier = create_ticket_tier(self.event, capacity=50)
+        self.client = APIClient()
+
+    def _reserve(self, quantity, reservation_id=None, tier=None, **extra):
+        payload = {'tickets': [{'tierId': str((tier or self.tier).id), 'quantity': quantity, **extra}]}
+        if reservation_id:
+            payload['reservationId'] = reservation_id
+        return self.client.post(f'/api/v1/events/{self.event.id}/reserve/', payload, format='json')
+
+    def test_group_purchase_creates_single_hold_row(self):
+        response = self._reserve(20)
+        self.assertEqual(response.status_code, 200)
+
+        holds = TicketHold.objects.filter(order_id=response.json()['reservationId'])
+        self.assertEqual(holds.count(), 1)
+        self.assertEqual(holds.get().quantity, 20)
+        self.tier.refresh_from_db()
+        self.assertEqual(self.tier.available, 30)
+
+    def test_increase_grows_existing_hold(self):
+        reservation_id = self._reserve(2).json()['reservationId']
+        self._reserve(5, reservation_id=reservation_id)
+
+        holds = TicketHold.objects.filter(order_id=reservation_id, released=False)
+        self.assertEqual(holds.count(), 1)
+        self.assertEqual(holds.get().quantity, 5)
+        self.tier.refresh_from_db()
+        self.assertEqual(self.tier.available, 45)
+
+    def test_decrease_shrinks_hold_and_returns_capacity(self):
+        reservation_id = self._reserve(10).json()['reservationId']
+        self._reserve(4, reservation_id=reservation_id)
+
+        hold = TicketHold.objects.get(order_id=reservation_id)
+        self.assertEqual(hold.quantity, 4)
+        self.assertFalse(hold.released)
+        self.tier.refresh_from_db()
+        self.assertEqual(self.tier.available, 46)
+
+    def test_pwyw_prices_get_separate_rows(self):
+        pwyw = create_ticket_tier(self.event, name='Donación', capacity=50, is_pay_what_you_want=True)
+        reservation_id = self._reserve(2, tier=pwyw, customPrice=5000).json()['reservationId']
+        self._reserve(3, reservation_id=reservation_id, tier=pwyw, customPrice=8000)
+
+        holds = TicketHold.objects.filter(order_id=reservation_id, released=False)
+        self.assertEqual(
+            sorted((int(h.custom_price), h.quantity) for h in holds),
+            [(5000, 2), (8000, 1)],
+        )
+
+
+class TicketHoldReleaseTests(TestCase):
+    """TicketHold.objects.release() / release_quantity() and instance release()."""
+
+    def setUp(self):
+        self.event = create_event()
+        self.tier_a = create_ticket_tier(self.event, name='A', capacity=100, available=70)
+        self.tier_b = create_ticket_tier(self.event, name='B', capacity=100, available=90)
+        self.order = Order.objects.create(event=self.event, email='', first_name='Guest', last_name='User')
+        expires_at = timezone.now() + timedelta(minutes=15)
+        TicketHold.objects.bulk_create([
+            TicketHold(event=self.event, ticket_tier=self.tier_a, order=self.order, quantity=20, expires_at=expires_at),
+            TicketHold(event=self.event, ticket_tier=self.tier_a, order=self.order, quantity=10, expires_at=expires_at),
+            TicketHold(event=self.event, ticket_tier=self.tier_b, order=self.order, quantity=10, expires_at=expires_at),
+        ])
+
+    def test_release_returns_capacity_grouped_by_tier(self):
+        released, returned = TicketHold.objects.filter(order=self.order).release()
+
+        self.assertEqual(released, 3)
+        self.assertEqual(returned, {self.tier_a.id: 30, self.tier_b.id: 10})
+        self.assertEqual(TicketTier.objects.get(id=self.tier_a.id).available, 100)
+        self.assertEqual(TicketTier.objects.get(id=self.tier_b.id).available, 100)
+
+    def test_release_is_idempotent(self):
+        TicketHold.objects.filter(order=self.order).release()
+        released, returned = TicketHold.objects.filter(order=self.order).release()
+
+        self.assertEqual((released, returned), (0, {}))
+        self.assertEqual(TicketTier.objects.get(id=self.tier_a.id).available, 100)
+
+    def test_instance_release(self):
+        hold = TicketHold.objects.filter(ticket_tier=self.tier_b).get()
+        hold.release()
+        hold.release()
+
+        self.assertTrue(TicketHold.objects.get(id=hold.id).released)
+        self.assertEqual(TicketTier.objects.get(id=self.tier_b.id).available, 100)
+
+    def test_release_quantity_partial(self):
+        returned = TicketHold.objects.filter(ticket_tier=self.tier_a).release_quantity(25)
+
+        self.assertEqual(returned, 25)
+        remaining = TicketHold.objects.filter(ticket_tier=self.tier_a, released=False)
+        self.assertEqual(sum(remaining.values_list('quantity', flat=True)), 5)
+        self.assertEqual(TicketTier.objects.get(id=self.tier_a.id).available, 95)
@@ -13,7 +13,7 @@ Usage:
     from apps.experiences.email_context import build_experience_confirmation_context
     
     context = build_experience_confirmation_context(order, reservation)
-    html = render_to_string('emails/experiences/confirmation.html', context)
+    html = render_email('emails/experiences/confirmation.html', context)
 """
 
 import logging
@@ -21,6 +21,8 @@ from typing import Dict, Any
 from django.conf import settings
 from django.utils import timezone
 
+from core.email_rendering import cached_fragment
+
 logger = logging.getLogger(__name__)
 
 
@@ -37,6 +39,30 @@ def _normalize_experience_image_urls(images_value) -> list:
     return urls
 
 
+def _build_experience_data(experience) -> Dict[str, Any]:
+    """Experience fields used by the confirmation templates (no reservation data)."""
+    return {
+        'title': experience.title,
+        'description': experience.description or '',
+        'short_description': experience.short_description or '',
+        'duration_minutes': experience.duration_minutes,
+        'location_name': experience.location_name,
+        'location_address': experience.location_address,
+        'meeting_point': getattr(experience, 'meeting_point', None) or '',
+        # Experience.images is JSONField (list of URLs or dicts), not a relation
+        'images': _normalize_experience_image_urls(experience.images or []),
+    }
+
+
+def _build_organizer_data(organizer) -> Dict[str, Any]:
+    return {
+        'name': organizer.name,
+        'email': organizer.contact_email or '',
+        'phone': organizer.contact_phone or '',
+        'website': organizer.website or '',
+    }
+
+
 def build_experience_confirmation_context(order, reservation) -> Dict[str, Any]:
     """
     Build complete context for experience confirmation email.
@@ -55,18 +81,8 @@ def build_experience_confirmation_context(order, reservation) -> Dict[str, Any]:
         experience = reservation.experience
         instance = reservation.instance
         
-        # Pre-compute experience data
-        experience_data = {
-            'title': experience.title,
-            'description': experience.description or '',
-            'short_description': experience.short_description or '',
-            'duration_minutes': experience.duration_minutes,
-            'location_name': experience.location_name,
-            'location_address': experience.location_address,
-            'meeting_point': getattr(experience, 'meeting_point', None) or '',
-            # Experience.images is JSONField (list of URLs or dicts), not a relation
-            'images': _normalize_experience_image_urls(experience.images or []),
-        }
+        # Experience and organizer parts are shared by every email of the experience (cached per updated_at)
+        experience_data = cached_fragment('experience', experience, _build_experience_data)
         
         # Pre-compute instance data
         # Note: TourInstance.language is CharField (e.g. 'es', 'en'), not a FK
@@ -112,14 +128,8 @@ def build_experience_confirmation_context(order, reservation) -> Dict[str, Any]:
                     'is_per_person': hold.resource.is_per_person,
                 })
         
-        # Pre-compute organizer data
         organizer = experience.organizer
-        organizer_data = {
-            'name': organizer.name,
-            'email': organizer.contact_email or '',
-            'phone': organizer.contact_phone or '',
-            'website': organizer.website or '',
-        }
+        organizer_data = cached_fragment('organizer', organizer, _build_organizer_data)
         
         # Build complete context
         context = {
@@ -17,23 +17,24 @@ Usage:
 
 import logging
 import time
-import os
 from typing import Dict, Any, Optional
 from django.conf import settings
 from django.core.mail import get_connection
-from django.template.loader import render_to_string
 from django.utils import timezone
 from email.mime.image import MIMEImage
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 
+from core.email_rendering import render_email, static_image_bytes
+
 logger = logging.getLogger(__name__)
 
 
 def send_experience_confirmation_email_optimized(
     order_id: str,
     to_email: Optional[str] = None,
-    flow_id: Optional[str] = None
+    flow_id: Optional[str] = None,
+    connection=None
 ) -> Dict[str, Any]:
     """
     🚀 ENTERPRISE: Send experience confirmation email with <10s latency.
@@ -49,6 +50,7 @@ def send_experience_confirmation_email_optimized(
         order_id: UUID of the order
         to_email: Optional override email address
         flow_id: Optional flow ID for tracking
+        connection: Optional open email connection (batch sends); pooled when omitted
         
     Returns:
         Dict with status, timing metrics, and results
@@ -60,6 +62,7 @@ def send_experience_confirmation_email_optimized(
         'fetch_time_ms': 0,
         'context_time_ms': 0,
         'render_time_ms': 0,
+        'connection_time_ms': 0,
         'smtp_time_ms': 0,
         'total_time_ms': 0,
     }
@@ -116,8 +119,8 @@ def send_experience_confirmation_email_optimized(
         
         # 3. Render templates
         render_start = time.time()
-        html_message = render_to_string('emails/experiences/confirmation.html', context)
-        text_message = render_to_string('emails/experiences/confirmation.txt', context)
+        html_message = render_email('emails/experiences/confirmation.html', context)
+        text_message = render_email('emails/experiences/confirmation.txt', context)
         render_time = int((time.time() - render_start) * 1000)
         metrics['render_time_ms'] = render_time
         
@@ -150,25 +153,23 @@ def send_experience_confirmation_email_optimized(
         related_msg.attach(html_part)
         
         # 5. Attach logos inline (same as events, NO QR codes for experiences)
-        logo_negro_path = os.path.join(settings.BASE_DIR, 'static/images/logos/logo-negro.png')
-        if os.path.exists(logo_negro_path):
-            with open(logo_negro_path, 'rb') as logo_file:
-                logo_negro = MIMEImage(logo_file.read())
-                logo_negro.add_header('Content-ID', '<logo_negro>')
-                # CRITICAL: No filename in Content-Disposition inline to prevent Apple Mail from showing as attachment
-                logo_negro.add_header('Content-Disposition', 'inline')
-                logo_negro.add_header('X-Attachment-Id', 'logo_negro')
-                related_msg.attach(logo_negro)  # Attach to related, not root
-        
-        isotipo_path = os.path.join(settings.BASE_DIR, 'static/images/logos/isotipo-azul.png')
-        if os.path.exists(isotipo_path):
-            with open(isotipo_path, 'rb') as isotipo_file:
-                isotipo_azul = MIMEImage(isotipo_file.read())
-                isotipo_azul.add_header('Content-ID', '<isotipo_azul>')
-                # CRITICAL: No filename in Content-Disposition inline to prevent Apple Mail from showing as attachment
-                isotipo_azul.add_header('Content-Disposition', 'inline')
-                isotipo_azul.add_header('X-Attachment-Id', 'isotipo_azul')
-                related_msg.attach(isotipo_azul)  # Attach to related, not root
+        logo_negro_bytes = static_image_bytes('static/images/logos/logo-negro.png')
+        if logo_negro_bytes:
+            logo_negro = MIMEImage(logo_negro_bytes)
+            logo_negro.add_header('Content-ID', '<logo_negro>')
+            # CRITICAL: No filename in Content-Disposition inline to prevent Apple Mail from showing as attachment
+            logo_negro.add_header('Content-Disposition', 'inline')
+            logo_negro.add_header('X-Attachment-Id', 'logo_negro')
+            related_msg.attach(logo_negro)  # Attach to related, not root
+        
+        isotipo_bytes = static_image_bytes('static/images/logos/isotipo-azul.png')
+        if isotipo_bytes:
+            isotipo_azul = MIMEImage(isotipo_bytes)
+            isotipo_azul.add_header('Content-ID', '<isotipo_azul>')
+            # CRITICAL: No filename in Content-Disposition inline to prevent Apple Mail from showing as attachment
+            isotipo_azul.add_header('Content-Disposition', 'inline')
+            isotipo_azul.add_header('X-Attachment-Id', 'isotipo_azul')
+            related_msg.attach(isotipo_azul)  # Attach to related, not root
         
         # Attach the related container (HTML + images) to alternative
         alternative_msg.attach(related_msg)
@@ -236,11 +237,13 @@ def send_experience_confirmation_email_optimized(
         
         custom_email = CustomEmailMessage(root_msg, from_email, recipient_email)
         
-        # Send using Django's connection
-        smtp_start = time.time()
-        connection = get_connection(fail_silently=False)
-        connection.send_messages([custom_email])
-        smtp_time = int((time.time() - smtp_start) * 1000)
+        # Send over a persistent pooled connection (or the caller's batch connection)
+        from core.smtp_pool import send_messages, smtp_connection
+        
+        with smtp_connection(connection, metrics) as smtp:
+            smtp_start = time.time()
+            send_messages(smtp, [custom_email])
+            smtp_time = int((time.time() - smtp_start) * 1000)
         metrics['smtp_time_ms'] = smtp_time
         
         # 8. Update EmailLog (status='sent', sent_at)
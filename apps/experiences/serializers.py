@@ -13,6 +13,8 @@ from .models import (
     ExperienceCapacityHold, ExperienceResourceHold, ExperienceReview,
     ExperienceImportedReview,
 )
+from apps.media.derivatives import derivative_index, file_name_from_url, responsive_image
+from apps.media.models import absolute_media_url
 from apps.organizers.models import OrganizerUser
 from apps.events.models import Order
 
@@ -279,6 +281,51 @@ class ExperienceSerializer(serializers.ModelSerializer):
             })
 
 
+class PublicExperienceSerializer(ExperienceSerializer):
+    """
+    🚀 ENTERPRISE: Read-only Experience payload for public list/detail.
+
+    ``images`` point at the responsive JPEG of each media library image (original
+    URL until its derivatives exist); ``responsive_images`` is aligned with
+    ``images`` and carries the WebP/JPEG srcsets.
+    """
+
+    responsive_images = serializers.SerializerMethodField()
+
+    class Meta(ExperienceSerializer.Meta):
+        fields = ExperienceSerializer.Meta.fields + ['responsive_images']
+
+    def _derivative_index(self):
+        context = self.context
+        index = derivative_index(context)
+        if not context.get('experience_images_preloaded'):
+            context['experience_images_preloaded'] = True
+            experiences = self.root.instance if isinstance(self.root, serializers.ListSerializer) else [self.instance]
+            index.load(
+                file_name_from_url(url)
+                for experience in experiences or []
+                for url in (getattr(experience, 'images', None) or [])
+                if isinstance(url, str)
+            )
+        return index
+
+    def _responsive(self, url):
+        if not isinstance(url, str):
+            return None
+        return responsive_image(self._derivative_index().get(file_name_from_url(url)), absolute_media_url)
+
+    def get_responsive_images(self, obj):
+        out = []
+        for url in obj.images or []:
+            out.append(self._responsive(url) or {'url': url, 'srcset': '', 'jpeg_srcset': ''})
+        return out
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        data['images'] = [entry['url'] for entry in data['responsive_images']]
+        return data
+
+
 class TourLanguageSerializer(serializers.ModelSerializer):
     """Serializer for TourLanguage model."""
     
@@ -6,3 +6,7 @@ class LandingDestinationsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.landing_destinations'
     verbose_name = _('Landing Destinations')
+
+    def ready(self):
+        """Connect search index signals."""
+        import apps.landing_destinations.signals  # noqa
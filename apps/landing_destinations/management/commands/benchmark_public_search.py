@@ -0,0 +1,94 @@
+"""
+Benchmark de latencia de la búsqueda pública del índice (search_index.search_hits) sobre un corpus sintético.
+
+Uso: python manage.py benchmark_public_search [--documents 50000] [--queries 200]
+
+Crea N SearchDocument dentro de una transacción que se revierte al final y mide
+p50/p95/max de consultas típicas (prefijos mientras se escribe, palabras completas,
+con y sin tildes).
+"""
+
+import random
+import statistics
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from apps.landing_destinations.models import SearchDocument
+from apps.landing_destinations.search_index import normalize_text, search_hits, search_vector, trigram_available
+
+PLACES = [
+    "Valparaíso", "Cochamó", "Pucón", "San Pedro de Atacama", "Puerto Natales", "Chiloé",
+    "Viña del Mar", "La Serena", "Valdivia", "Isla de Pascua", "Copacabana", "Cusco",
+]
+WORDS = [
+    "tour", "cabaña", "festival", "música", "kayak", "trekking", "vino", "astronomía",
+    "glaciar", "volcán", "playa", "concierto", "gastronomía", "refugio", "lago", "bosque",
+]
+SYLLABLES = ["ta", "ri", "mo", "lu", "ca", "pe", "so", "na", "gu", "el", "ve", "qui"]
+QUERIES = ["valpa", "Valparaíso", "cabana", "festival musica", "trek", "volcan pucon", "astronomia", "chiloe kayak"]
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "Benchmark de latencia de la búsqueda pública sobre un corpus sintético"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--documents", type=int, default=50_000)
+        parser.add_argument("--queries", type=int, default=200)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self._run(options)
+                raise _Rollback()
+        except _Rollback:
+            self.stdout.write("Corpus sintético revertido.")
+
+    def _run(self, options):
+        rng = random.Random(7)
+        # Descriptive filler from a few thousand pseudo-words, plus some real vocabulary
+        vocabulary = [
+            "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))) for _ in range(5000)
+        ]
+        doc_types = [choice for choice, _ in SearchDocument.TYPE_CHOICES]
+        documents = []
+        for i in range(options["documents"]):
+            place = rng.choice(PLACES)
+            title = f"{rng.choice(WORDS).title()} {rng.choice(WORDS)} en {place} {i}"
+            body = " ".join(rng.choice(vocabulary) for _ in range(40)) + " " + rng.choice(WORDS)
+            documents.append(SearchDocument(
+                doc_type=doc_types[i % len(doc_types)],
+                object_id=uuid.uuid4(),
+                title=normalize_text(title),
+                location=normalize_text(place),
+                body=normalize_text(body),
+                search_text=normalize_text(f"{title} {place}"),
+            ))
+        started = time.perf_counter()
+        SearchDocument.objects.bulk_create(documents, batch_size=5000)
+        SearchDocument.objects.update(search_vector=search_vector())
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {SearchDocument._meta.db_table}")
+        self.stdout.write(
+            f"Corpus: {len(documents)} documentos en {time.perf_counter() - started:.1f}s "
+            f"(pg_trgm: {'sí' if trigram_available() else 'no'})"
+        )
+
+        timings = []
+        for i in range(options["queries"]):
+            q = QUERIES[i % len(QUERIES)]
+            started = time.perf_counter()
+            search_hits(q)
+            timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        p95 = timings[int(len(timings) * 0.95) - 1]
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(timings)} consultas: p50={statistics.median(timings):.1f}ms "
+            f"p95={p95:.1f}ms max={timings[-1]:.1f}ms"
+        ))
@@ -0,0 +1,32 @@
+"""
+Reconstruye el índice de búsqueda pública (SearchDocument).
+Uso: python manage.py rebuild_search_index [--type event --type experience ...]
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.landing_destinations.models import SearchDocument
+from apps.landing_destinations.search_index import rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = "Reconstruye el índice de búsqueda pública (destinos, eventos, experiencias, alojamientos)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--type",
+            action="append",
+            dest="types",
+            choices=[choice for choice, _ in SearchDocument.TYPE_CHOICES],
+            help="Solo este tipo (repetible). Default: todos.",
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        counts = rebuild_search_index(doc_types=options["types"])
+        summary = ", ".join(f"{doc_type}={count}" for doc_type, count in counts.items())
+        self.stdout.write(self.style.SUCCESS(
+            f"Índice reconstruido en {time.perf_counter() - started:.2f}s ({summary})."
+        ))
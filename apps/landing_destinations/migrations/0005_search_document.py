@@ -0,0 +1,119 @@
+# Generated by Django 4.2.8 on 2026-10-16 19:57
+
+import unicodedata
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations, models
+
+
+def create_trigram_index(apps, schema_editor):
+    """pg_trgm is optional: without it search falls back to tsvector + substring matching."""
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        if cursor.fetchone() is None:
+            return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS landing_searchdoc_text_trgm "
+        "ON landing_destinations_searchdocument USING gin (search_text gin_trgm_ops)"
+    )
+
+
+def drop_trigram_index(apps, schema_editor):
+    schema_editor.execute("DROP INDEX IF EXISTS landing_searchdoc_text_trgm")
+
+
+def _normalize(value):
+    # Frozen copy of search_index.normalize_text (migrations must not import live code)
+    value = unicodedata.normalize('NFKD', str(value or ''))
+    return ''.join(ch for ch in value if not unicodedata.combining(ch)).lower().strip()
+
+
+def _join(*parts):
+    return _normalize(' '.join(p for p in parts if p))
+
+
+def build_search_index(apps, schema_editor):
+    """Index existing public content with the historical models (same rules as search_index)."""
+    SearchDocument = apps.get_model('landing_destinations', 'SearchDocument')
+    LandingDestination = apps.get_model('landing_destinations', 'LandingDestination')
+    Event = apps.get_model('events', 'Event')
+    Experience = apps.get_model('experiences', 'Experience')
+    Accommodation = apps.get_model('accommodations', 'Accommodation')
+
+    sources = [
+        ('destination', LandingDestination.objects.filter(is_active=True),
+         lambda d: (d.name, _join(d.slug, d.region, d.country), d.description, '')),
+        ('event', Event.objects.filter(status='published', visibility='public').select_related('location'),
+         lambda e: (e.title, _join(e.location.name, e.location.address) if e.location else '',
+                    e.description, e.short_description)),
+        ('experience', Experience.objects.filter(status='published', is_active=True, deleted_at__isnull=True)
+         .select_related('country'),
+         lambda x: (x.title, _join(x.location_name, x.country.name if x.country else ''),
+                    x.description, x.short_description)),
+        ('accommodation', Accommodation.objects.filter(status='published', deleted_at__isnull=True),
+         lambda a: (a.title, _join(a.location_name, a.city, a.country), a.description, a.short_description)),
+    ]
+    for doc_type, queryset, fields in sources:
+        documents = []
+        for obj in queryset.iterator(chunk_size=500):
+            title, location, body, summary = fields(obj)
+            title, summary_text = _normalize(title), _normalize(summary)
+            documents.append(SearchDocument(
+                doc_type=doc_type,
+                object_id=obj.pk,
+                title=title[:255],
+                location=location,
+                body=_join(summary, body)[:5000],
+                search_text=' '.join(p for p in (title, location, summary_text) if p),
+            ))
+        SearchDocument.objects.bulk_create(documents, batch_size=500)
+
+    SearchDocument.objects.update(search_vector=(
+        SearchVector('title', config='simple', weight='A')
+        + SearchVector('title', config='spanish', weight='A')
+        + SearchVector('title', config='english', weight='A')
+        + SearchVector('location', config='simple', weight='B')
+        + SearchVector('body', config='spanish', weight='C')
+        + SearchVector('body', config='english', weight='C')
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('landing_destinations', '0004_car_rental_ids_and_featured_car_rental'),
+        ('events', '0052_order_booking_date_order_cancellation_date_and_more'),
+        ('experiences', '0023_alter_experience_creator_commission_basis_and_more'),
+        ('accommodations', '0023_add_public_code_prefix'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('doc_type', models.CharField(choices=[('destination', 'Destination'), ('event', 'Event'), ('experience', 'Experience'), ('accommodation', 'Accommodation')], max_length=20, verbose_name='type')),
+                ('object_id', models.UUIDField(verbose_name='object id')),
+                ('title', models.CharField(blank=True, max_length=255, verbose_name='title')),
+                ('location', models.TextField(blank=True, verbose_name='location')),
+                ('body', models.TextField(blank=True, verbose_name='body')),
+                ('search_text', models.TextField(blank=True, help_text='Title, location and summary (substring/trigram matching)', verbose_name='search text')),
+                ('search_vector', django.contrib.postgres.search.SearchVectorField(null=True, verbose_name='search vector')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='updated at')),
+            ],
+            options={
+                'verbose_name': 'Search document',
+                'verbose_name_plural': 'Search documents',
+                'indexes': [django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='landing_searchdoc_vector_gin')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='searchdocument',
+            constraint=models.UniqueConstraint(fields=('doc_type', 'object_id'), name='landing_searchdoc_unique_object'),
+        ),
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+        migrations.RunPython(build_search_index, migrations.RunPython.noop),
+    ]
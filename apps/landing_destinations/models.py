@@ -1,5 +1,7 @@
 """Models for landing destinations (Tuki main site destination pages)."""
 
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 from core.models import BaseModel
@@ -115,3 +117,47 @@ class LandingDestinationEvent(models.Model):
         unique_together = [["destination", "event_id"]]
         verbose_name = _("Landing destination event")
         verbose_name_plural = _("Landing destination events")
+
+
+class SearchDocument(models.Model):
+    """
+    Denormalized public search entry (one per published destination, event, experience
+    or accommodation), maintained by apps.landing_destinations.search_index.
+
+    Text columns are stored lowercased and without accents. Only the searchable
+    text and the object id are kept: results are serialized from the live objects.
+    The trigram index on `search_text` is created by migration when pg_trgm exists.
+    """
+
+    TYPE_DESTINATION = "destination"
+    TYPE_EVENT = "event"
+    TYPE_EXPERIENCE = "experience"
+    TYPE_ACCOMMODATION = "accommodation"
+    TYPE_CHOICES = [
+        (TYPE_DESTINATION, _("Destination")),
+        (TYPE_EVENT, _("Event")),
+        (TYPE_EXPERIENCE, _("Experience")),
+        (TYPE_ACCOMMODATION, _("Accommodation")),
+    ]
+
+    doc_type = models.CharField(_("type"), max_length=20, choices=TYPE_CHOICES)
+    object_id = models.UUIDField(_("object id"))
+    title = models.CharField(_("title"), max_length=255, blank=True)
+    location = models.TextField(_("location"), blank=True)
+    body = models.TextField(_("body"), blank=True)
+    search_text = models.TextField(_("search text"), blank=True, help_text=_("Title, location and summary (substring/trigram matching)"))
+    search_vector = SearchVectorField(_("search vector"), null=True)
+    updated_at = models.DateTimeField(_("updated at"), auto_now=True)
+
+    class Meta:
+        verbose_name = _("Search document")
+        verbose_name_plural = _("Search documents")
+        constraints = [
+            models.UniqueConstraint(fields=["doc_type", "object_id"], name="landing_searchdoc_unique_object"),
+        ]
+        indexes = [
+            GinIndex(fields=["search_vector"], name="landing_searchdoc_vector_gin"),
+        ]
+
+    def __str__(self):
+        return f"{self.doc_type}: {self.title}"
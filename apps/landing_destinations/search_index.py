@@ -0,0 +1,383 @@
+"""
+Public search index: one SearchDocument per published destination, event, experience
+and accommodation.
+
+- Documents hold only the searchable text of each object plus its id. They are built
+  here from the source models and kept up to date by signals (see signals.py);
+  `manage.py rebuild_search_index` rebuilds them in bulk.
+- Text is stored lowercased and without accents (Python-side unaccent), so the
+  tsvector and the trigram index are accent-insensitive without the `unaccent`
+  extension. The tsvector combines `simple` (prefix matching while typing) with
+  `spanish` and `english` stemming; title weighs more than location and body.
+- `search()` runs one ranked query across all types (top N per type via ROW_NUMBER).
+  With pg_trgm installed it also matches substrings and typos through the trigram index.
+  The hits are then loaded from the source tables (one query per type with results)
+  and serialized for the current request, so images, prices and visibility are live.
+"""
+
+import logging
+import re
+import unicodedata
+from functools import lru_cache
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector, TrigramWordSimilarity
+from django.db import connection, transaction
+from django.db.models import F, FloatField, Q, Value, Window
+from django.db.models.functions import Coalesce, RowNumber
+
+from .models import SearchDocument
+
+logger = logging.getLogger(__name__)
+
+RESULTS_PER_TYPE = 10
+BODY_MAX_LENGTH = 5000
+
+# doc_type -> key in the PublicSearchView response
+RESULT_KEYS = {
+    SearchDocument.TYPE_DESTINATION: "destinations",
+    SearchDocument.TYPE_EVENT: "events",
+    SearchDocument.TYPE_EXPERIENCE: "experiences",
+    SearchDocument.TYPE_ACCOMMODATION: "accommodations",
+}
+
+
+def normalize_text(value):
+    """Lowercase and strip accents ("Valparaíso" -> "valparaiso")."""
+    value = unicodedata.normalize("NFKD", str(value or ""))
+    return "".join(ch for ch in value if not unicodedata.combining(ch)).lower().strip()
+
+
+def _join(*parts):
+    return normalize_text(" ".join(p for p in parts if p))
+
+
+@lru_cache(maxsize=1)
+def trigram_available():
+    """True when pg_trgm is installed (trigram index + fuzzy matching)."""
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+            return cursor.fetchone() is not None
+    except Exception:
+        return False
+
+
+def search_vector():
+    """tsvector expression over the stored (already unaccented) text columns."""
+    return (
+        SearchVector("title", config="simple", weight="A")
+        + SearchVector("title", config="spanish", weight="A")
+        + SearchVector("title", config="english", weight="A")
+        + SearchVector("location", config="simple", weight="B")
+        + SearchVector("body", config="spanish", weight="C")
+        + SearchVector("body", config="english", weight="C")
+    )
+
+
+# ============================================================================
+# DOCUMENT BUILDERS (return None when the object must not be searchable)
+# ============================================================================
+
+def _destination_document(dest):
+    if not dest.is_active:
+        return None
+    return {
+        "title": dest.name,
+        "location": _join(dest.slug, dest.region, dest.country),
+        "body": dest.description,
+        "summary": "",
+    }
+
+
+def _event_document(ev):
+    if ev.status != "published" or ev.visibility != "public":
+        return None
+    location = ev.location
+    return {
+        "title": ev.title,
+        "location": _join(location.name, location.address) if location else "",
+        "body": ev.description,
+        "summary": ev.short_description,
+    }
+
+
+def _experience_document(ex):
+    if ex.status != "published" or not ex.is_active or ex.deleted_at is not None:
+        return None
+    return {
+        "title": ex.title,
+        "location": _join(ex.location_name, ex.country.name if ex.country else ""),
+        "body": ex.description,
+        "summary": ex.short_description,
+    }
+
+
+def _accommodation_document(acc):
+    if acc.status != "published" or acc.deleted_at is not None:
+        return None
+    return {
+        "title": acc.title,
+        "location": _join(acc.location_name, acc.city, acc.country),
+        "body": acc.description,
+        "summary": acc.short_description,
+    }
+
+
+# ============================================================================
+# RESULT SERIALIZERS (live objects, per request; same payloads as before the index)
+# ============================================================================
+
+def _destination_results(dests, request):
+    from .views import _normalize_media_url
+
+    return [
+        {"id": str(d.id), "name": d.name, "slug": d.slug, "image": _normalize_media_url(d.hero_image), "region": d.region}
+        for d in dests
+    ]
+
+
+def _event_results(events, request):
+    results = []
+    for ev in events:
+        img = ""
+        first = next(iter(ev.images.all()), None)
+        if first and getattr(first, "image", None):
+            img = first.image.url
+        results.append({
+            "id": str(ev.id),
+            "title": ev.title,
+            "slug": ev.slug,
+            "image": img,
+            "description": (ev.short_description or ev.description or "")[:200],
+        })
+    return results
+
+
+def _experience_results(experiences, request):
+    from .views import _normalize_media_url
+
+    results = []
+    for ex in experiences:
+        images = ex.images or []
+        results.append({
+            "id": str(ex.id),
+            "title": ex.title,
+            "slug": ex.slug,
+            "image": _normalize_media_url(images[0]) if images else "",
+            "price": float(ex.price) if ex.price is not None else 0,
+            "description": (ex.short_description or ex.description or "")[:200],
+        })
+    return results
+
+
+def _accommodation_results(accommodations, request):
+    from apps.accommodations.serializers import _accommodation_to_public_dict, prefetch_public_cards
+
+    accommodations = list(accommodations)
+    asset_map = prefetch_public_cards(accommodations)
+    results = []
+    for acc in accommodations:
+        data = _accommodation_to_public_dict(acc, request=request, asset_map=asset_map)
+        images = data.get("images") or []
+        results.append({
+            "id": data.get("id", str(acc.id)),
+            "title": data.get("title", acc.title),
+            "slug": getattr(acc, "slug", None) or str(acc.id),
+            "image": images[0] if images and isinstance(images[0], str) else "",
+            "price": float(data.get("price") or 0),
+            "description": (data.get("short_description") or data.get("description") or "")[:200],
+        })
+    return results
+
+
+RESULT_SERIALIZERS = {
+    SearchDocument.TYPE_DESTINATION: _destination_results,
+    SearchDocument.TYPE_EVENT: _event_results,
+    SearchDocument.TYPE_EXPERIENCE: _experience_results,
+    SearchDocument.TYPE_ACCOMMODATION: _accommodation_results,
+}
+
+
+def _sources():
+    """doc_type -> (queryset of candidates, builder)."""
+    from apps.accommodations.models import Accommodation
+    from apps.events.models import Event
+    from apps.experiences.models import Experience
+
+    from .models import LandingDestination
+
+    return {
+        SearchDocument.TYPE_DESTINATION: (
+            LandingDestination.objects.filter(is_active=True),
+            _destination_document,
+        ),
+        SearchDocument.TYPE_EVENT: (
+            Event.objects.filter(status="published", visibility="public")
+            .select_related("location")
+            .prefetch_related("images"),
+            _event_document,
+        ),
+        SearchDocument.TYPE_EXPERIENCE: (
+            Experience.objects.filter(status="published", is_active=True, deleted_at__isnull=True)
+            .select_related("country"),
+            _experience_document,
+        ),
+        SearchDocument.TYPE_ACCOMMODATION: (
+            Accommodation.objects.filter(status="published", deleted_at__isnull=True),
+            _accommodation_document,
+        ),
+    }
+
+
+def doc_type_for(instance):
+    """SearchDocument type for a source model instance (None if not indexed)."""
+    from apps.accommodations.models import Accommodation
+    from apps.events.models import Event
+    from apps.experiences.models import Experience
+
+    from .models import LandingDestination
+
+    for model, doc_type in (
+        (LandingDestination, SearchDocument.TYPE_DESTINATION),
+        (Event, SearchDocument.TYPE_EVENT),
+        (Experience, SearchDocument.TYPE_EXPERIENCE),
+        (Accommodation, SearchDocument.TYPE_ACCOMMODATION),
+    ):
+        if isinstance(instance, model):
+            return doc_type
+    return None
+
+
+def _document_fields(doc):
+    title = normalize_text(doc["title"])
+    location = doc["location"]
+    summary = normalize_text(doc["summary"])
+    return {
+        "title": title[:255],
+        "location": location,
+        "body": _join(doc["summary"], doc["body"])[:BODY_MAX_LENGTH],
+        "search_text": " ".join(p for p in (title, location, summary) if p),
+    }
+
+
+# ============================================================================
+# WRITE PATHS
+# ============================================================================
+
+def index_object(instance):
+    """Create/update (or remove, when no longer public) the document of one object."""
+    doc_type = doc_type_for(instance)
+    if doc_type is None:
+        return
+    _, builder = _sources()[doc_type]
+    doc = builder(instance)
+    if doc is None:
+        remove_object(instance)
+        return
+    with transaction.atomic():
+        document, _ = SearchDocument.objects.update_or_create(
+            doc_type=doc_type, object_id=instance.pk, defaults=_document_fields(doc)
+        )
+        SearchDocument.objects.filter(pk=document.pk).update(search_vector=search_vector())
+
+
+def remove_object(instance):
+    doc_type = doc_type_for(instance)
+    if doc_type is not None:
+        SearchDocument.objects.filter(doc_type=doc_type, object_id=instance.pk).delete()
+
+
+def rebuild_search_index(doc_types=None, chunk_size=500):
+    """
+    Rebuild documents for the given types (default: all). Each type is replaced in one
+    transaction; vectors are computed with a single UPDATE per type. Returns {doc_type: count}.
+    """
+    counts = {}
+    for doc_type, (queryset, builder) in _sources().items():
+        if doc_types and doc_type not in doc_types:
+            continue
+        documents = []
+        for obj in queryset.iterator(chunk_size=chunk_size):
+            doc = builder(obj)
+            if doc is not None:
+                documents.append(SearchDocument(doc_type=doc_type, object_id=obj.pk, **_document_fields(doc)))
+        with transaction.atomic():
+            SearchDocument.objects.filter(doc_type=doc_type).delete()
+            SearchDocument.objects.bulk_create(documents, batch_size=chunk_size)
+            SearchDocument.objects.filter(doc_type=doc_type).update(search_vector=search_vector())
+        counts[doc_type] = len(documents)
+        logger.info(f"🔎 [SEARCH] Indexed {len(documents)} {doc_type} documents")
+    return counts
+
+
+# ============================================================================
+# QUERY
+# ============================================================================
+
+def search_hits(q, doc_type=None, limit=RESULTS_PER_TYPE):
+    """
+    Ranked index query across all document types (one query).
+
+    Returns [(doc_type, object_id), ...] with up to `limit` hits per type, best match first.
+    """
+    text = normalize_text(q)
+    words = re.findall(r"[^\W_]+", text)
+    if not words:
+        return []
+
+    query = (
+        SearchQuery(" & ".join(f"{word}:*" for word in words), config="simple", search_type="raw")
+        | SearchQuery(text, config="spanish")
+        | SearchQuery(text, config="english")
+    )
+    match = Q(search_vector=query)
+    rank = Coalesce(SearchRank(F("search_vector"), query), Value(0.0), output_field=FloatField())
+    if trigram_available():
+        # Substring and typo-tolerant matches, served by the trigram GIN index
+        # (without it LIKE '%...%' would scan the whole table on every keystroke)
+        match |= Q(search_text__contains=text) | Q(search_text__trigram_word_similar=text)
+        rank = rank + TrigramWordSimilarity(text, "search_text")
+
+    documents = SearchDocument.objects.filter(match)
+    if doc_type:
+        documents = documents.filter(doc_type=doc_type)
+    return list(
+        documents.annotate(rank=rank)
+        .annotate(position=Window(RowNumber(), partition_by=[F("doc_type")], order_by=[F("rank").desc(), F("title").asc()]))
+        .filter(position__lte=limit)
+        .order_by("doc_type", "position")
+        .values_list("doc_type", "object_id")
+    )
+
+
+def search(q, doc_type=None, limit=RESULTS_PER_TYPE, request=None):
+    """
+    Ranked search over all document types.
+
+    Returns {"destinations": [...], "events": [...], "experiences": [...], "accommodations": [...]}
+    with up to `limit` results per type, best match first, serialized from the current
+    objects (an object no longer public is skipped until its document is removed).
+
+    Public search must not fail as a whole: if the index cannot be queried (e.g. before
+    its migration ran) every section is empty, and a type that fails to load or
+    serialize only drops its own section. Errors are logged.
+    """
+    result = {key: [] for key in RESULT_KEYS.values()}
+    ranked = {}
+    try:
+        for row_type, object_id in search_hits(q, doc_type=doc_type, limit=limit):
+            ranked.setdefault(row_type, []).append(object_id)
+    except Exception as e:
+        logger.error(f"🔎 [SEARCH] Index query failed for {q!r}: {e}", exc_info=True)
+        return result
+
+    sources = _sources()
+    for row_type, object_ids in ranked.items():
+        try:
+            queryset, _ = sources[row_type]
+            objects = {obj.pk: obj for obj in queryset.filter(pk__in=object_ids)}
+            hits = [objects[object_id] for object_id in object_ids if object_id in objects]
+            result[RESULT_KEYS[row_type]] = RESULT_SERIALIZERS[row_type](hits, request)
+        except Exception as e:
+            logger.error(f"🔎 [SEARCH] Could not load {row_type} results for {q!r}: {e}", exc_info=True)
+    return result
@@ -3,16 +3,22 @@
 from rest_framework import permissions
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from django.db.models import Q
 
-from .models import LandingDestination
-from .views import _normalize_media_url
+from .search_index import RESULT_KEYS, search
+
+# ?type= value -> SearchDocument.doc_type
+TYPE_FILTERS = {key: doc_type for doc_type, key in RESULT_KEYS.items()}
 
 
 class PublicSearchView(APIView):
     """
     GET /api/v1/public/search?q=...&type=destinations|events|experiences|accommodations
     Returns { destinations: [], events: [], experiences: [], accommodations: [] }
+
+    Served from the SearchDocument index (see search_index.py): one ranked,
+    accent-insensitive query across all types, up to 10 results per type, then
+    the hits are loaded and serialized for this request. A failing type (or index)
+    is logged and returns an empty section instead of failing the whole search.
     """
 
     permission_classes = [permissions.AllowAny]
@@ -21,119 +27,7 @@ class PublicSearchView(APIView):
         q = (request.query_params.get("q") or "").strip()
         type_filter = request.query_params.get("type", "").strip().lower()
 
-        result = {"destinations": [], "events": [], "experiences": [], "accommodations": []}
-
-        if not q:
-            return Response(result)
-
-        # Destinations
-        if type_filter in ("", "destinations"):
-            dests = LandingDestination.objects.filter(
-                is_active=True
-            ).filter(
-                Q(name__icontains=q) | Q(slug__icontains=q) | Q(region__icontains=q) | Q(country__icontains=q)
-            )[:10]
-            result["destinations"] = [
-                {"id": str(d.id), "name": d.name, "slug": d.slug, "image": _normalize_media_url(d.hero_image), "region": d.region}
-                for d in dests
-            ]
-
-        # Events
-        if type_filter in ("", "events"):
-            try:
-                from apps.events.models import Event
-                events = Event.objects.filter(
-                    status="published",
-                    visibility="public",
-                ).filter(
-                    Q(title__icontains=q) | Q(description__icontains=q) | Q(short_description__icontains=q)
-                )[:10]
-                event_list = []
-                for ev in events:
-                    img = ""
-                    if hasattr(ev, "images") and ev.images.exists():
-                        first = ev.images.first()
-                        if first and getattr(first, "image", None):
-                            img = first.image.url
-                    event_list.append({
-                        "id": str(ev.id),
-                        "title": ev.title,
-                        "slug": ev.slug,
-                        "image": img,
-                        "description": (ev.short_description or ev.description or "")[:200],
-                    })
-                result["events"] = event_list
-            except Exception:
-                pass
-
-        # Experiences: título, descripción, ubicación, país (ej. "copacabana" en título o location_name)
-        if type_filter in ("", "experiences"):
-            try:
-                from apps.experiences.models import Experience
-                exp_q = (
-                    Q(title__icontains=q)
-                    | Q(description__icontains=q)
-                    | Q(short_description__icontains=q)
-                    | Q(location_name__icontains=q)
-                )
-                try:
-                    exp_q |= Q(country__name__icontains=q)
-                except Exception:
-                    pass
-                exps = Experience.objects.filter(
-                    status="published",
-                    is_active=True,
-                    deleted_at__isnull=True,
-                ).filter(exp_q)[:10]
-                exp_list = []
-                for ex in exps:
-                    images = getattr(ex, "images", None) or []
-                    img = images[0] if images else ""
-                    if img:
-                        img = _normalize_media_url(img)
-                    exp_list.append({
-                        "id": str(ex.id),
-                        "title": ex.title,
-                        "slug": ex.slug,
-                        "image": img,
-                        "price": float(ex.price) if ex.price is not None else 0,
-                        "description": (ex.short_description or ex.description or "")[:200],
-                    })
-                result["experiences"] = exp_list
-            except Exception:
-                pass
-
-        # Accommodations: título, descripción, ciudad, ubicación, país
-        if type_filter in ("", "accommodations"):
-            try:
-                from apps.accommodations.models import Accommodation
-                from apps.accommodations.serializers import _accommodation_to_public_dict
-                accs = Accommodation.objects.filter(
-                    status="published",
-                    deleted_at__isnull=True,
-                ).filter(
-                    Q(title__icontains=q)
-                    | Q(description__icontains=q)
-                    | Q(short_description__icontains=q)
-                    | Q(location_name__icontains=q)
-                    | Q(city__icontains=q)
-                    | Q(country__icontains=q)
-                )[:10]
-                acc_list = []
-                for acc in accs:
-                    data = _accommodation_to_public_dict(acc, request=request)
-                    images = data.get("images") or []
-                    img = images[0] if images and isinstance(images[0], str) else ""
-                    acc_list.append({
-                        "id": data.get("id", str(acc.id)),
-                        "title": data.get("title", acc.title),
-                        "slug": getattr(acc, "slug", None) or str(acc.id),
-                        "image": img,
-                        "price": float(data.get("price") or 0),
-                        "description": (data.get("short_description") or data.get("description") or "")[:200],
-                    })
-                result["accommodations"] = acc_list
-            except Exception:
-                pass
+        if not q or (type_filter and type_filter not in TYPE_FILTERS):
+            return Response({key: [] for key in RESULT_KEYS.values()})
 
-        return Response(result)
+        return Response(search(q, doc_type=TYPE_FILTERS.get(type_filter), request=request))
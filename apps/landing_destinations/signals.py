@@ -0,0 +1,39 @@
+"""Signals for the landing_destinations app: keep the public search index in sync."""
+
+import logging
+
+from django.db.models.signals import post_delete, post_save
+
+from apps.accommodations.models import Accommodation
+from apps.events.models import Event
+from apps.experiences.models import Experience
+
+from .models import LandingDestination
+from .search_index import index_object, remove_object
+
+logger = logging.getLogger(__name__)
+
+INDEXED_MODELS = (LandingDestination, Event, Experience, Accommodation)
+
+
+def _safe(action, instance):
+    # Search indexing must never break a save; `rebuild_search_index` repairs drift
+    try:
+        action(instance)
+    except Exception as e:
+        logger.error(f"🔎 [SEARCH] Could not update search document for {instance!r}: {e}")
+
+
+def update_search_document(sender, instance, raw=False, **kwargs):
+    """Index (or drop, when no longer public) destinations, events, experiences and accommodations."""
+    if not raw:
+        _safe(index_object, instance)
+
+
+def delete_search_document(sender, instance, **kwargs):
+    _safe(remove_object, instance)
+
+
+for _model in INDEXED_MODELS:
+    post_save.connect(update_search_document, sender=_model, dispatch_uid=f"search_index_save_{_model.__name__}")
+    post_delete.connect(delete_search_document, sender=_model, dispatch_uid=f"search_index_delete_{_model.__name__}")
@@ -0,0 +1,98 @@
+"""
+Tests for the public search index (SearchDocument / search_index) and PublicSearchView.
+
+Documents follow their source objects through signals, matching is accent-insensitive
+with prefix support while typing, and the endpoint runs one ranked query and serializes
+the hits from the current objects.
+"""
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import DatabaseError, connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from apps.events.models import Event, Location
+from apps.experiences.models import Experience
+from apps.landing_destinations.models import LandingDestination, SearchDocument
+from apps.landing_destinations import search_index
+from apps.landing_destinations.search_index import search
+from core.testing import create_accommodation, create_event, create_organizer
+
+URL = "/api/v1/public/search/"
+
+
+class SearchIndexTests(TestCase):
+
+    def setUp(self):
+        self.organizer = create_organizer()
+        self.destination = LandingDestination.objects.create(name="Valparaíso", slug="valparaiso", region="Valparaíso")
+        location = Location.objects.create(name="Teatro Municipal", address="Av. Pedro Montt, Valparaíso")
+        self.event = create_event(
+            organizer=self.organizer, title="Festival de Música Porteña", visibility="public",
+            short_description="Tres días de música en vivo", location=location,
+        )
+        self.experience = Experience.objects.create(
+            title="Kayak en Cochamó", slug="kayak-cochamo", organizer=self.organizer, status="published",
+            description="Remada por el río con guías locales", location_name="Cochamó",
+        )
+        self.accommodation = create_accommodation(
+            organizer=self.organizer, title="Cabaña del Lago", city="Pucón", description="Vista al volcán",
+        )
+
+    def test_signals_index_public_objects(self):
+        self.assertEqual(SearchDocument.objects.count(), 4)
+
+        self.event.status = "draft"
+        self.event.save()
+        self.assertFalse(SearchDocument.objects.filter(object_id=self.event.id).exists())
+
+        self.experience.delete()
+        self.assertEqual(set(SearchDocument.objects.values_list("doc_type", flat=True)), {"destination", "accommodation"})
+
+    def test_accent_insensitive_prefix_and_stemmed_matches(self):
+        self.assertEqual(search("valparaiso")["destinations"][0]["slug"], "valparaiso")
+        self.assertEqual(search("valpa")["events"][0]["title"], "Festival de Música Porteña")
+        self.assertEqual(search("COCHAMO")["experiences"][0]["slug"], "kayak-cochamo")
+        self.assertEqual(search("cabana pucon")["accommodations"][0]["title"], "Cabaña del Lago")
+        self.assertEqual(search("guía")["experiences"][0]["slug"], "kayak-cochamo")  # body, stemmed
+        self.assertEqual(search("musica")["events"][0]["description"], "Tres días de música en vivo")
+        self.assertEqual(search("zzzz"), {"destinations": [], "events": [], "experiences": [], "accommodations": []})
+
+    def test_view_bounds_queries_and_filters_by_type(self):
+        client = APIClient()
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get(URL, {"q": "valparaíso"})
+        self.assertEqual(response.status_code, 200)
+        self.assertLessEqual(len(ctx.captured_queries), 4)  # index + event, its images + destination
+        self.assertEqual(len(response.data["destinations"]), 1)
+        self.assertEqual(len(response.data["events"]), 1)
+
+        response = client.get(URL, {"q": "valparaiso", "type": "events"})
+        self.assertEqual((len(response.data["destinations"]), len(response.data["events"])), (0, 1))
+
+    def test_results_are_serialized_from_current_objects(self):
+        Event.objects.filter(pk=self.event.pk).update(short_description="Cuatro días de música")
+        self.assertEqual(search("musica")["events"][0]["description"], "Cuatro días de música")
+
+        Event.objects.filter(pk=self.event.pk).update(status="draft")  # No signal: document still there
+        self.assertEqual(search("musica")["events"], [])
+
+    def test_failing_type_only_drops_its_own_section(self):
+        with mock.patch.dict(search_index.RESULT_SERIALIZERS, {SearchDocument.TYPE_EVENT: mock.Mock(side_effect=ValueError)}):
+            response = APIClient().get(URL, {"q": "valparaíso"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["events"], [])
+        self.assertEqual(len(response.data["destinations"]), 1)
+
+        with mock.patch.object(search_index, "search_hits", side_effect=DatabaseError("no such table")):
+            response = APIClient().get(URL, {"q": "valparaíso"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["destinations"], [])
+
+    def test_rebuild_command_restores_documents(self):
+        SearchDocument.objects.all().delete()
+        call_command("rebuild_search_index", stdout=open("/dev/null", "w"))
+        self.assertEqual(SearchDocument.objects.count(), 4)
+        self.assertEqual(search("kayak")["experiences"][0]["title"], "Kayak en Cochamó")
@@ -0,0 +1,402 @@
+"""
+🚀 ENTERPRISE: Responsive image derivatives for MediaAsset.
+
+Every asset gets a ladder of widths (MEDIA_DERIVATIVES['WIDTHS'], never upscaled)
+in WebP and JPEG, stored next to the original:
+
+    <dir>/_derivatives/<stem>_<width>.<ext>
+
+Paths are deterministic, so regenerating overwrites in place and URLs are built
+from ``asset.derivatives`` ({'webp': {'640': path, ...}, 'jpeg': {...}}) without
+touching storage. The original is decoded once per asset (JPEG decodes at reduced
+scale via draft mode) and every size, plus the 300px grid thumbnail, comes out of
+that decode by successive downscaling.
+
+Rendering is CPU-bound and runs in a process pool for batches; Celery prefork
+children are daemonic and may not start processes, so there it falls back to
+threads (Pillow releases the GIL while resizing and encoding).
+"""
+
+import logging
+import math
+import multiprocessing
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from io import BytesIO
+from typing import Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+DERIVATIVES_DIR = '_derivatives'
+THUMBNAILS_DIR = '_thumbs'
+
+FORMAT_EXTENSIONS = {'webp': 'webp', 'jpeg': 'jpg'}
+
+# Stored originals: <organizer-slug|temp|global>/YYYY/MM/DD/<uuid hex>.<ext>
+FILE_NAME_RE = re.compile(r'[^/]+/\d{4}/\d{2}/\d{2}/[0-9a-f]{32}\.[A-Za-z0-9]+')
+
+EXIF_ORIENTATION = 0x0112
+ROTATED_ORIENTATIONS = (5, 6, 7, 8)
+
+
+def _derivative_settings():
+    return getattr(settings, 'MEDIA_DERIVATIVES', {})
+
+
+def derivatives_enabled() -> bool:
+    return bool(_derivative_settings().get('ENABLED', True))
+
+
+def derivative_path(file_name: str, width: int, fmt: str) -> str:
+    """Storage path of one derivative of the original ``file_name``."""
+    dirname, basename = os.path.split(file_name)
+    stem = os.path.splitext(basename)[0]
+    return os.path.join(dirname, DERIVATIVES_DIR, f'{stem}_{width}.{FORMAT_EXTENSIONS[fmt]}')
+
+
+def thumbnail_path(file_name: str) -> str:
+    dirname, basename = os.path.split(file_name)
+    return os.path.join(dirname, THUMBNAILS_DIR, f'{os.path.splitext(basename)[0]}.jpg')
+
+
+def flatten_to_rgb(img: Image.Image) -> Image.Image:
+    """RGB copy of ``img``; transparency is composited over white."""
+    if img.mode in ('RGBA', 'LA', 'P'):
+        bg = Image.new('RGB', img.size, (255, 255, 255))
+        if img.mode == 'P' and 'transparency' in img.info:
+            img = img.convert('RGBA')
+        if img.mode in ('RGBA', 'LA'):
+            bg.paste(img, mask=img.split()[-1])
+        else:
+            bg.paste(img)
+        return bg
+    if img.mode != 'RGB':
+        return img.convert('RGB')
+    return img
+
+
+def target_widths(original_width: int, widths: Iterable[int]) -> List[int]:
+    """Configured widths below the original, plus the largest size it can fill."""
+    widths = sorted(set(widths))
+    if not widths or not original_width:
+        return []
+    targets = {w for w in widths if w < original_width}
+    targets.add(min(original_width, widths[-1]))
+    return sorted(targets)
+
+
+def _decode(data: bytes, max_width: int):
+    """
+    Open ``data`` upright, ready for resizing to at most ``max_width``:
+    ``(image, width, height)`` with RGBA kept only when the image has transparency.
+    """
+    img = Image.open(BytesIO(data))
+    raw_width, raw_height = img.size
+    rotated = img.getexif().get(EXIF_ORIENTATION) in ROTATED_ORIENTATIONS
+    width, height = (raw_height, raw_width) if rotated else (raw_width, raw_height)
+    if width and max_width < width:
+        # JPEG: let libjpeg decode at the smallest scale still >= max_width
+        scale = max_width / width
+        img.draft('RGB', (math.ceil(raw_width * scale), math.ceil(raw_height * scale)))
+    img = ImageOps.exif_transpose(img)
+    has_alpha = img.mode in ('RGBA', 'LA') or (img.mode == 'P' and 'transparency' in img.info)
+    img = img.convert('RGBA') if has_alpha else flatten_to_rgb(img)
+    return img, width, height
+
+
+def _resize(img: Image.Image, width: int, height: int, target: int) -> Image.Image:
+    """``img`` scaled to ``target`` wide, keeping the original ``width``/``height`` ratio."""
+    if img.width == target:
+        return img
+    return img.resize((target, max(1, round(height * target / width))), Image.Resampling.LANCZOS)
+
+
+def _encode(img: Image.Image, fmt: str, quality: Dict[str, int]) -> bytes:
+    buf = BytesIO()
+    if fmt == 'webp':
+        img.save(buf, format='WEBP', quality=quality.get('webp', 80), method=4)
+    else:
+        flatten_to_rgb(img).save(buf, format='JPEG', quality=quality.get('jpeg', 82), optimize=True, progressive=True)
+    return buf.getvalue()
+
+
+def render_derivatives(data: bytes, widths, formats, quality: Dict[str, int], thumbnail_size: int) -> dict:
+    """
+    Pool worker: decode ``data`` once and encode every derivative.
+
+    Module-level and free of Django state so process pools can pickle it. Returns
+    ``{'width', 'height', 'variants': [(fmt, width, bytes), ...], 'thumbnail': bytes}``
+    or ``{'error': str}``.
+    """
+    try:
+        img, width, height = _decode(data, max(widths))
+        targets = target_widths(width, widths)
+        if not targets:
+            return {'error': 'empty image'}
+
+        variants = []
+        current = img
+        # Largest first: each size is downscaled from the previous one
+        for target in reversed(targets):
+            current = _resize(current, width, height, target)
+            for fmt in formats:
+                variants.append((fmt, target, _encode(current, fmt, quality)))
+
+        thumb = flatten_to_rgb(current)
+        thumb.thumbnail((thumbnail_size, thumbnail_size), Image.Resampling.LANCZOS)
+        buf = BytesIO()
+        thumb.save(buf, format='JPEG', quality=85, optimize=True)
+        return {'width': width, 'height': height, 'variants': variants, 'thumbnail': buf.getvalue()}
+    except Exception as e:
+        return {'error': str(e) or e.__class__.__name__}
+
+
+def snap_width(width: int) -> int:
+    """Smallest configured derivative width >= ``width`` (the largest if none is)."""
+    widths = sorted(_derivative_settings().get('WIDTHS', [320, 640, 960, 1280, 1920]))
+    return next((w for w in widths if w >= width), widths[-1])
+
+
+def render_variant(data: bytes, width: int, fmt: str) -> bytes:
+    """
+    One resized image (never upscaled) with the derivative settings, for on-the-fly
+    requests; raises on undecodable data.
+    """
+    img, original_width, height = _decode(data, width)
+    target = min(width, original_width)
+    return _encode(_resize(img, original_width, height, target), fmt, _derivative_settings().get('QUALITY', {}))
+
+
+def _render_job(job):
+    return render_derivatives(*job)
+
+
+def _can_use_process_pool() -> bool:
+    # Celery prefork children are daemonic and may not start child processes
+    return not multiprocessing.current_process().daemon
+
+
+def _read_original(asset) -> Optional[bytes]:
+    try:
+        with asset.file.storage.open(asset.file.name, 'rb') as f:
+            return f.read()
+    except Exception as e:
+        logger.warning(f"⚠️ [MEDIA] Could not read original for {asset.id}: {e}")
+        return None
+
+
+def _store(storage, path: str, data: bytes) -> str:
+    from django.core.files.base import ContentFile
+
+    # FileSystemStorage renames on collision; paths are deterministic, so replace
+    if storage.exists(path):
+        storage.delete(path)
+    return storage.save(path, ContentFile(data))
+
+
+def _store_rendered(asset, rendered: dict) -> dict:
+    storage = asset.file.storage
+    derivatives = {}
+    for fmt, width, data in rendered['variants']:
+        path = _store(storage, derivative_path(asset.file.name, width, fmt), data)
+        derivatives.setdefault(fmt, {})[str(width)] = path
+    thumb = _store(storage, thumbnail_path(asset.file.name), rendered['thumbnail'])
+    return {'derivatives': derivatives, 'thumbnail': thumb}
+
+
+def generate_derivatives_batch(assets, force: bool = False, use_processes: Optional[bool] = None) -> dict:
+    """
+    Render and store derivatives (and the grid thumbnail) for ``assets``.
+
+    Originals are read and outputs stored in threads (I/O-bound, GCS in
+    production); rendering runs in a process pool when the batch reaches
+    MEDIA_DERIVATIVES['PROCESS_POOL_MIN_ASSETS'] (``use_processes`` forces it on or
+    off). Assets that already have derivatives are skipped unless ``force``.
+
+    Returns ``{'success', 'failed', 'skipped', 'duration_ms'}``.
+    """
+    from apps.media.models import MediaAsset
+
+    start_time = time.time()
+    config = _derivative_settings()
+    assets = [a for a in assets if a.file]
+    pending = [a for a in assets if force or not a.derivatives]
+    skipped = len(assets) - len(pending)
+    if not pending:
+        return {'success': 0, 'failed': 0, 'skipped': skipped, 'duration_ms': 0}
+
+    max_workers = config.get('MAX_WORKERS', 4)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        originals = list(executor.map(_read_original, pending))
+
+    jobs = [
+        (data, config.get('WIDTHS', [320, 640, 960, 1280, 1920]), config.get('FORMATS', ['webp', 'jpeg']),
+         config.get('QUALITY', {}), config.get('THUMBNAIL_SIZE', 300))
+        for data in originals if data is not None
+    ]
+    if use_processes is None:
+        use_processes = len(jobs) >= config.get('PROCESS_POOL_MIN_ASSETS', 4)
+    use_processes = use_processes and _can_use_process_pool()
+    executor_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    with executor_class(max_workers=max_workers) as executor:
+        rendered_iter = iter(list(executor.map(_render_job, jobs)))
+    rendered = [next(rendered_iter) if data is not None else None for data in originals]
+
+    def store(pair):
+        asset, result = pair
+        if result is None or 'error' in result:
+            logger.warning(f"⚠️ [MEDIA] Derivatives failed for {asset.id}: {result and result['error']}")
+            return None
+        try:
+            return _store_rendered(asset, result)
+        except Exception as e:
+            logger.error(f"❌ [MEDIA] Could not store derivatives for {asset.id}: {e}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        stored = list(executor.map(store, zip(pending, rendered)))
+
+    now = timezone.now()
+    updated = []
+    for asset, result, paths in zip(pending, rendered, stored):
+        if paths is None:
+            continue
+        asset.derivatives = paths['derivatives']
+        asset.derivatives_generated_at = now
+        asset.thumbnail.name = paths['thumbnail']
+        if not asset.width:
+            asset.width, asset.height = result['width'], result['height']
+        updated.append(asset)
+    if updated:
+        MediaAsset.objects.bulk_update(
+            updated, ['derivatives', 'derivatives_generated_at', 'thumbnail', 'width', 'height']
+        )
+
+    duration_ms = int((time.time() - start_time) * 1000)
+    logger.info(
+        f"📸 [MEDIA] Derivatives: {len(updated)} generated, {len(pending) - len(updated)} failed, "
+        f"{skipped} skipped in {duration_ms}ms"
+    )
+    return {
+        'success': len(updated),
+        'failed': len(pending) - len(updated),
+        'skipped': skipped,
+        'duration_ms': duration_ms,
+    }
+
+
+def generate_derivatives(asset, force: bool = False) -> bool:
+    """Single asset, rendered in-process. True if derivatives were stored."""
+    return generate_derivatives_batch([asset], force=force, use_processes=False)['success'] == 1
+
+
+# ---------------------------------------------------------------------------
+# URLs
+# ---------------------------------------------------------------------------
+
+def _storage_url(path: str) -> str:
+    from django.core.files.storage import default_storage
+
+    return default_storage.url(path)
+
+
+def _widths(derivatives: dict, fmt: str) -> List[int]:
+    return sorted(int(w) for w in (derivatives or {}).get(fmt, {}))
+
+
+def public_width(derivatives: dict, fmt: str = 'jpeg') -> Optional[int]:
+    """Width served as the plain image URL: largest size up to PUBLIC_WIDTH."""
+    widths = _widths(derivatives, fmt)
+    if not widths:
+        return None
+    limit = _derivative_settings().get('PUBLIC_WIDTH', 1280)
+    fitting = [w for w in widths if w <= limit]
+    return fitting[-1] if fitting else widths[0]
+
+
+def public_path(derivatives: dict) -> Optional[str]:
+    """Storage path of the JPEG served as the plain image URL, or None."""
+    width = public_width(derivatives)
+    return derivatives['jpeg'][str(width)] if width is not None else None
+
+
+def derivative_urls(derivatives: dict, absolutize=None) -> Dict[str, Dict[int, str]]:
+    """{fmt: {width: url}} for a derivatives map; ``absolutize`` maps storage URLs."""
+    absolutize = absolutize or (lambda url: url)
+    return {
+        fmt: {int(w): absolutize(_storage_url(path)) for w, path in sorted(sizes.items(), key=lambda i: int(i[0]))}
+        for fmt, sizes in (derivatives or {}).items()
+    }
+
+
+def srcset(derivatives: dict, fmt: str = 'webp', absolutize=None) -> str:
+    """``srcset`` attribute value: "url 320w, url 640w, ..." (empty if none)."""
+    urls = derivative_urls({fmt: (derivatives or {}).get(fmt, {})}, absolutize).get(fmt, {})
+    return ', '.join(f'{url} {width}w' for width, url in urls.items())
+
+
+def responsive_image(derivatives: dict, absolutize=None) -> Optional[dict]:
+    """
+    Public payload for an image with derivatives, or None if it has none yet:
+    ``{'url': JPEG at PUBLIC_WIDTH, 'srcset': WebP srcset, 'jpeg_srcset': JPEG srcset}``.
+    """
+    path = public_path(derivatives)
+    if path is None:
+        return None
+    absolutize = absolutize or (lambda url: url)
+    return {
+        'url': absolutize(_storage_url(path)),
+        'srcset': srcset(derivatives, 'webp', absolutize),
+        'jpeg_srcset': srcset(derivatives, 'jpeg', absolutize),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Lookup by stored file name (EventImage.image, Experience.images URLs)
+# ---------------------------------------------------------------------------
+
+def file_name_from_url(url: str) -> Optional[str]:
+    """Storage name of a media library original referenced by URL, or None."""
+    match = FILE_NAME_RE.search(url or '')
+    return match.group(0) if match else None
+
+
+class DerivativeIndex:
+    """
+    Memoized ``file name -> derivatives`` map. ``load`` fetches unseen names in one
+    query; share one instance across a response through the serializer context
+    (see ``derivative_index``).
+    """
+
+    def __init__(self):
+        self._by_name = {}
+
+    def load(self, names: Iterable[str]):
+        from apps.media.models import MediaAsset
+
+        missing = {n for n in names if n and n not in self._by_name}
+        if not missing:
+            return
+        rows = MediaAsset.objects.filter(file__in=missing, deleted_at__isnull=True).values_list('file', 'derivatives')
+        for name, derivatives in rows:
+            if derivatives:
+                self._by_name[name] = derivatives
+        for name in missing:
+            self._by_name.setdefault(name, {})
+
+    def get(self, name: Optional[str]) -> dict:
+        if not name:
+            return {}
+        self.load([name])
+        return self._by_name[name]
+
+
+def derivative_index(context: dict) -> DerivativeIndex:
+    """The DerivativeIndex shared by every serializer rendering with ``context``."""
+    return context.setdefault('media_derivatives', DerivativeIndex())
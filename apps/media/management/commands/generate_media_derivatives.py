@@ -0,0 +1,61 @@
+"""
+Generate responsive derivatives (and thumbnails) for MediaAssets that don't have them.
+Run: python manage.py generate_media_derivatives [--batch 500] [--chunk 50] [--force] [--dry-run]
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.media.derivatives import generate_derivatives_batch
+from apps.media.models import MediaAsset
+
+
+class Command(BaseCommand):
+    help = "Generate responsive WebP/JPEG derivatives for MediaAssets without them"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch',
+            type=int,
+            default=500,
+            help='Process up to N assets per run (default 500)',
+        )
+        parser.add_argument(
+            '--chunk',
+            type=int,
+            default=50,
+            help='Assets rendered together in the process pool (default 50)',
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Regenerate assets that already have derivatives',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only count, do not generate',
+        )
+
+    def handle(self, *args, **options):
+        qs = MediaAsset.objects.filter(deleted_at__isnull=True).exclude(file='').order_by('created_at')
+        if not options['force']:
+            qs = qs.filter(derivatives={})
+        ids = list(qs.values_list('id', flat=True)[:options['batch']])
+        if not ids:
+            self.stdout.write(self.style.SUCCESS('No assets need derivatives.'))
+            return
+        if options['dry_run']:
+            self.stdout.write(f'Would generate derivatives for {len(ids)} asset(s). Run without --dry-run to apply.')
+            return
+        ok = failed = 0
+        chunk = max(1, options['chunk'])
+        for start in range(0, len(ids), chunk):
+            assets = MediaAsset.objects.filter(id__in=ids[start:start + chunk])
+            result = generate_derivatives_batch(assets, force=options['force'])
+            ok += result['success']
+            failed += result['failed']
+            self.stdout.write(
+                f"  {min(start + chunk, len(ids))}/{len(ids)}: {result['success']} ok, "
+                f"{result['failed']} failed ({result['duration_ms']}ms)"
+            )
+        self.stdout.write(self.style.SUCCESS(f'Done: {ok} generated, {failed} failed.'))
@@ -0,0 +1,38 @@
+# Responsive image derivatives (apps.media.derivatives) and file-name lookups
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('media', '0005_add_thumbnail_field'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mediaasset',
+            name='derivatives',
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                help_text="Storage paths by format and width, e.g. {'webp': {'640': '...'}, 'jpeg': {...}}",
+                verbose_name='derivatives',
+            ),
+        ),
+        migrations.AddField(
+            model_name='mediaasset',
+            name='derivatives_generated_at',
+            field=models.DateTimeField(
+                blank=True,
+                editable=False,
+                null=True,
+                verbose_name='derivatives generated at',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='mediaasset',
+            index=models.Index(fields=['file'], name='media_asset_file_idx'),
+        ),
+    ]
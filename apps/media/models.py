@@ -17,6 +17,7 @@ from PIL import Image
 from io import BytesIO
 
 from core.models import BaseModel
+from apps.media import derivatives as media_derivatives
 from apps.organizers.models import Organizer
 from django.contrib.auth import get_user_model
 
@@ -57,6 +58,40 @@ def get_thumbnail_upload_path(instance, filename):
     return os.path.join(dirname, '_thumbs', fname)
 
 
+def absolute_media_url(relative_url):
+    """
+    Absolute URL for a storage URL.
+
+    GCS (and any absolute URL) is returned as is; FileSystemStorage paths are
+    prefixed with BACKEND_URL (or the first public ALLOWED_HOSTS entry).
+    """
+    from django.conf import settings
+
+    if not relative_url:
+        return relative_url
+    storage_class = getattr(settings, 'DEFAULT_FILE_STORAGE', '')
+    if 'PublicGoogleCloudStorage' in storage_class or 'GoogleCloudStorage' in storage_class:
+        return relative_url
+    if relative_url.startswith(('http://', 'https://')):
+        return relative_url
+
+    relative_url = relative_url.lstrip('/')
+    base_url = getattr(settings, 'BACKEND_URL', None)
+    if not base_url and getattr(settings, 'DEBUG', False):
+        base_url = 'http://localhost:8000'
+    if not base_url:
+        allowed = getattr(settings, 'ALLOWED_HOSTS', [])
+        if isinstance(allowed, str):
+            allowed = [h.strip() for h in allowed.split(',') if h.strip()]
+        for host in (allowed if isinstance(allowed, (list, tuple)) else [allowed]):
+            if host and host not in ('*', 'localhost', '127.0.0.1'):
+                base_url = f"https://{host}"
+                break
+    if not base_url:
+        base_url = 'http://localhost:8000'
+    return f"{base_url.rstrip('/')}/{relative_url}"
+
+
 class MediaAsset(BaseModel):
     """
     Media asset model for storing images/files.
@@ -179,6 +214,22 @@ class MediaAsset(BaseModel):
         blank=True,
         help_text=_("List of tag strings for filtering (e.g. ['playa', 'alojamiento'])"),
     )
+
+    # Responsive sizes (apps.media.derivatives), generated asynchronously after upload
+    derivatives = models.JSONField(
+        _("derivatives"),
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text=_("Storage paths by format and width, e.g. {'webp': {'640': '...'}, 'jpeg': {...}}"),
+    )
+
+    derivatives_generated_at = models.DateTimeField(
+        _("derivatives generated at"),
+        null=True,
+        blank=True,
+        editable=False
+    )
     
     class Meta:
         verbose_name = _("media asset")
@@ -188,6 +239,7 @@ class MediaAsset(BaseModel):
             models.Index(fields=['scope', 'organizer', '-created_at']),
             models.Index(fields=['sha256']),
             models.Index(fields=['deleted_at']),
+            models.Index(fields=['file'], name='media_asset_file_idx'),
         ]
     
     def __str__(self):
@@ -229,37 +281,18 @@ class MediaAsset(BaseModel):
         """
         if not self.file:
             return None
-        
-        from django.conf import settings
-        
-        # For GCS (production), use storage backend URL method directly
-        # Check if using GCS storage backend
-        storage_class = getattr(settings, 'DEFAULT_FILE_STORAGE', '')
-        if 'PublicGoogleCloudStorage' in storage_class or 'GoogleCloudStorage' in storage_class:
-            return self.file.url
-        
-        # For FileSystemStorage (local/homeserver): build absolute URL from BACKEND_URL
-        relative_url = self.file.url
+        return absolute_media_url(self.file.url)
 
-        if relative_url.startswith(('http://', 'https://')):
-            return relative_url
+    @property
+    def derivative_urls(self):
+        """{format: {width: absolute URL}} for the generated responsive sizes."""
+        return media_derivatives.derivative_urls(self.derivatives, absolute_media_url)
+
+    @property
+    def srcset(self):
+        """WebP ``srcset`` value for the generated sizes (empty until generated)."""
+        return media_derivatives.srcset(self.derivatives, 'webp', absolute_media_url)
 
-        relative_url = relative_url.lstrip('/')
-        base_url = getattr(settings, 'BACKEND_URL', None)
-        if not base_url and getattr(settings, 'DEBUG', False):
-            base_url = 'http://localhost:8000'
-        if not base_url:
-            allowed = getattr(settings, 'ALLOWED_HOSTS', [])
-            if isinstance(allowed, str):
-                allowed = [h.strip() for h in allowed.split(',') if h.strip()]
-            for host in (allowed if isinstance(allowed, (list, tuple)) else [allowed]):
-                if host and host not in ('*', 'localhost', '127.0.0.1'):
-                    base_url = f"https://{host}"
-                    break
-        if not base_url:
-            base_url = 'http://localhost:8000'
-        return f"{base_url.rstrip('/')}/{relative_url}"
-    
     @property
     def size_mb(self):
         """Return size in MB."""
@@ -284,18 +317,7 @@ class MediaAsset(BaseModel):
         import logging
         log = logging.getLogger(__name__)
         try:
-            img = Image.open(self.file)
-            if img.mode in ('RGBA', 'LA', 'P'):
-                bg = Image.new('RGB', img.size, (255, 255, 255))
-                if img.mode == 'P' and 'transparency' in img.info:
-                    img = img.convert('RGBA')
-                if img.mode in ('RGBA', 'LA'):
-                    bg.paste(img, mask=img.split()[-1])
-                else:
-                    bg.paste(img)
-                img = bg
-            elif img.mode != 'RGB':
-                img = img.convert('RGB')
+            img = media_derivatives.flatten_to_rgb(Image.open(self.file))
             img.thumbnail((max_size, max_size), Image.Resampling.LANCZOS)
             buf = BytesIO()
             img.save(buf, format='JPEG', quality=85, optimize=True)
@@ -9,7 +9,8 @@ from django.conf import settings
 from rest_framework import serializers
 
 logger = logging.getLogger(__name__)
-from apps.media.models import MediaAsset, MediaUsage
+from apps.media import derivatives as media_derivatives
+from apps.media.models import MediaAsset, MediaUsage, absolute_media_url
 from apps.organizers.models import Organizer
 from django.contrib.contenttypes.models import ContentType
 
@@ -55,6 +56,8 @@ class MediaAssetSerializer(serializers.ModelSerializer):
     
     url = serializers.SerializerMethodField()
     thumbnail_url = serializers.SerializerMethodField()
+    derivative_urls = serializers.SerializerMethodField()
+    srcset = serializers.SerializerMethodField()
     size_mb = serializers.SerializerMethodField()
     usage_count = serializers.SerializerMethodField()
     uploaded_by_name = serializers.SerializerMethodField()
@@ -72,6 +75,8 @@ class MediaAssetSerializer(serializers.ModelSerializer):
             'file',
             'url',
             'thumbnail_url',
+            'derivative_urls',
+            'srcset',
             'original_filename',
             'content_type',
             'size_bytes',
@@ -137,6 +142,20 @@ class MediaAssetSerializer(serializers.ModelSerializer):
                 return raw
         return self.get_url(obj)
 
+    def _absolutize(self, raw):
+        request = self.context.get("request")
+        if request:
+            return _build_media_url_for_request(raw, request)
+        return absolute_media_url(raw)
+
+    def get_derivative_urls(self, obj):
+        """Responsive sizes by format and width ({} until the documents worker renders them)."""
+        return media_derivatives.derivative_urls(obj.derivatives, self._absolutize)
+
+    def get_srcset(self, obj):
+        """WebP srcset for <img srcset> / <source type="image/webp">."""
+        return media_derivatives.srcset(obj.derivatives, 'webp', self._absolutize)
+
     def get_size_mb(self, obj):
         """Return size in MB."""
         return obj.size_mb
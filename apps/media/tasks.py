@@ -0,0 +1,44 @@
+"""
+🚀 ENTERPRISE: Media library Celery tasks.
+"""
+
+import logging
+
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=30)
+def generate_media_derivatives(self, asset_ids, force=False):
+    """
+    🚀 ENTERPRISE: Render responsive sizes and the grid thumbnail for uploaded assets.
+
+    Enqueued after upload so the request only stores the original.
+    """
+    from apps.media.derivatives import generate_derivatives_batch
+    from apps.media.models import MediaAsset
+
+    assets = MediaAsset.objects.filter(id__in=asset_ids, deleted_at__isnull=True)
+    try:
+        result = generate_derivatives_batch(assets, force=force)
+    except Exception as e:
+        logger.error(f"❌ [MEDIA] Error generating derivatives for {asset_ids}: {e}")
+        raise self.retry(exc=e)
+    if result['failed']:
+        raise self.retry(exc=RuntimeError(f"{result['failed']} asset(s) failed derivative generation"))
+    return result
+
+
+def enqueue_media_derivatives(asset_id):
+    """Queue derivative generation once the surrounding transaction commits."""
+    from django.db import transaction
+
+    def enqueue():
+        try:
+            generate_media_derivatives.apply_async(args=[[str(asset_id)]])
+        except Exception as e:
+            # Not fatal: public payloads fall back to the original until the backfill runs
+            logger.warning(f"⚠️ [MEDIA] Could not enqueue derivatives for asset {asset_id}: {e}")
+
+    transaction.on_commit(enqueue)
@@ -0,0 +1,169 @@
+"""
+Responsive image derivatives (apps.media.derivatives): sizes are never upscaled,
+every size is stored once per format with a deterministic path, uploads hash and
+deduplicate before storing, and derivative generation is queued after commit.
+"""
+import shutil
+import tempfile
+from io import BytesIO
+
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from PIL import Image
+from rest_framework.test import APIClient
+
+from apps.media.derivatives import (
+    DerivativeIndex,
+    derivative_path,
+    file_name_from_url,
+    generate_derivatives_batch,
+    render_derivatives,
+    responsive_image,
+    target_widths,
+)
+from apps.media.models import MediaAsset
+
+User = get_user_model()
+
+
+def image_bytes(size=(1000, 500), mode='RGB', fmt='JPEG'):
+    buf = BytesIO()
+    Image.new(mode, size, (200, 30, 30, 128) if mode == 'RGBA' else (200, 30, 30)).save(buf, format=fmt)
+    return buf.getvalue()
+
+
+class RenderTests(TestCase):
+
+    def test_target_widths_never_upscale(self):
+        widths = [320, 640, 960, 1280, 1920]
+        self.assertEqual(target_widths(1000, widths), [320, 640, 960, 1000])
+        self.assertEqual(target_widths(4000, widths), widths)
+        self.assertEqual(target_widths(200, widths), [200])
+
+    def test_render_one_variant_per_width_and_format(self):
+        rendered = render_derivatives(
+            image_bytes(mode='RGBA', fmt='PNG'), [320, 640, 960, 1280], ['webp', 'jpeg'], {}, 300
+        )
+
+        self.assertEqual((rendered['width'], rendered['height']), (1000, 500))
+        self.assertEqual(
+            sorted((fmt, width) for fmt, width, _ in rendered['variants']),
+            sorted((fmt, w) for fmt in ('webp', 'jpeg') for w in (320, 640, 960, 1000)),
+        )
+        for fmt, width, data in rendered['variants']:
+            img = Image.open(BytesIO(data))
+            self.assertEqual(img.format, fmt.upper())
+            self.assertEqual(img.size, (width, width // 2))
+        self.assertEqual(Image.open(BytesIO(rendered['thumbnail'])).size, (300, 150))
+
+    def test_render_reports_undecodable_data(self):
+        self.assertIn('error', render_derivatives(b'not an image', [320], ['jpeg'], {}, 300))
+
+    def test_file_name_from_url(self):
+        name = 'global/2026/01/02/' + 'a' * 32 + '.jpg'
+        self.assertEqual(file_name_from_url(f'https://storage.googleapis.com/bucket/{name}'), name)
+        self.assertEqual(file_name_from_url(f'https://tuki.cl/media/{name}?v=1'), name)
+        self.assertIsNone(file_name_from_url('https://example.com/photo.jpg'))
+
+
+class DerivativeStorageTests(TestCase):
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        storage_settings = override_settings(
+            MEDIA_ROOT=media_root,
+            DEFAULT_FILE_STORAGE='django.core.files.storage.FileSystemStorage',
+            BACKEND_URL='https://api.tuki.test',
+        )
+        storage_settings.enable()
+        self.addCleanup(storage_settings.disable)
+
+        self.asset = MediaAsset(scope='global', original_filename='photo.jpg', content_type='image/jpeg')
+        self.asset.file.save('photo.jpg', ContentFile(image_bytes(size=(1500, 1000))), save=True)
+
+    def test_batch_stores_deterministic_paths(self):
+        result = generate_derivatives_batch([self.asset], use_processes=False)
+
+        self.assertEqual((result['success'], result['failed']), (1, 0))
+        self.asset.refresh_from_db()
+        self.assertEqual(sorted(self.asset.derivatives), ['jpeg', 'webp'])
+        self.assertEqual(sorted(self.asset.derivatives['jpeg'], key=int), ['320', '640', '960', '1280', '1500'])
+        for fmt, sizes in self.asset.derivatives.items():
+            for width, path in sizes.items():
+                self.assertEqual(path, derivative_path(self.asset.file.name, int(width), fmt))
+                self.assertTrue(default_storage.exists(path))
+        self.assertTrue(self.asset.thumbnail)
+        self.assertIsNotNone(self.asset.derivatives_generated_at)
+        self.assertIn('320w', self.asset.srcset)
+        self.assertTrue(self.asset.srcset.startswith('https://api.tuki.test/'))
+
+    def test_generated_assets_are_skipped_and_force_overwrites(self):
+        generate_derivatives_batch([self.asset], use_processes=False)
+        self.asset.refresh_from_db()
+        first = dict(self.asset.derivatives['webp'])
+
+        self.assertEqual(generate_derivatives_batch([self.asset], use_processes=False)['skipped'], 1)
+        result = generate_derivatives_batch([self.asset], force=True, use_processes=False)
+        self.asset.refresh_from_db()
+        self.assertEqual(result['success'], 1)
+        self.assertEqual(self.asset.derivatives['webp'], first)
+
+    def test_public_payload_uses_public_width(self):
+        generate_derivatives_batch([self.asset], use_processes=False)
+        index = DerivativeIndex()
+        index.load([self.asset.file.name])
+
+        with self.assertNumQueries(0):
+            payload = responsive_image(index.get(self.asset.file.name))
+        self.assertTrue(payload['url'].endswith('_1280.jpg'))
+        self.assertIn('1500w', payload['srcset'])
+        self.assertIsNone(responsive_image(index.get('global/2026/01/01/missing.jpg')))
+
+
+class UploadTests(TestCase):
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        storage_settings = override_settings(
+            MEDIA_ROOT=media_root,
+            DEFAULT_FILE_STORAGE='django.core.files.storage.FileSystemStorage',
+        )
+        storage_settings.enable()
+        self.addCleanup(storage_settings.disable)
+
+        user = User.objects.create_user(
+            username='media-admin', email='media-admin@example.com', password='x', is_staff=True
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user)
+        self.data = image_bytes()
+
+    def _upload(self, tags='[]'):
+        return self.client.post(
+            '/api/v1/media/assets/',
+            {'file': SimpleUploadedFile('photo.jpg', self.data, 'image/jpeg'), 'scope': 'global', 'tags': tags},
+            format='multipart',
+        )
+
+    def test_upload_queues_derivatives_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            response = self._upload()
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(callbacks), 1)
+        asset = MediaAsset.objects.get()
+        self.assertEqual(len(asset.sha256), 64)
+        self.assertFalse(asset.thumbnail)
+
+    def test_duplicate_upload_reuses_asset(self):
+        self._upload(tags='["playa"]')
+        response = self._upload(tags='["sur"]')
+
+        self.assertEqual(response.status_code, 201)
+        asset = MediaAsset.objects.get()
+        self.assertEqual(asset.tags, ['playa', 'sur'])
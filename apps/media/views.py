@@ -18,7 +18,9 @@ from api.v1.pagination import LargePageSizePagination
 from django.db.models import Q, Count
 from django.core.files.storage import default_storage
 
+from apps.media.derivatives import derivatives_enabled
 from apps.media.models import MediaAsset, MediaUsage
+from apps.media.tasks import enqueue_media_derivatives
 
 
 def _unlink_asset_from_accommodations_and_destinations(asset_id):
@@ -306,17 +308,42 @@ class MediaAssetViewSet(viewsets.ModelViewSet):
             safe_stored_name = original_filename if '.' in (original_filename or '') else _ct_to_filename.get(_ct, 'image.jpg')
             file_obj.name = safe_stored_name
         
-        # Compute SHA256 hash for deduplication
-        file_obj.seek(0)
-        sha256_hash = hashlib.sha256(file_obj.read()).hexdigest()
+        # Compute SHA256 hash for deduplication (streamed: uploads may be on disk)
+        digest = hashlib.sha256()
+        for chunk in file_obj.chunks():
+            digest.update(chunk)
+        sha256_hash = digest.hexdigest()
         file_obj.seek(0)
         
         # Set organizer in serializer data BEFORE save so upload_to path is correct
         if scope == 'organizer' and organizer:
             serializer.validated_data['organizer'] = organizer
         
-        # Save asset (tags from validated_data if present)
         tags = serializer.validated_data.get('tags') or []
+
+        # Same bytes already in this library: reuse the stored asset instead of a second copy
+        existing = MediaAsset.objects.filter(
+            sha256=sha256_hash,
+            scope=scope,
+            organizer=organizer if scope == 'organizer' else None,
+            deleted_at__isnull=True,
+        ).order_by('created_at').first()
+        if existing:
+            current_tags = existing.tags or []
+            merged_tags = current_tags + [t for t in tags if t not in current_tags]
+            if merged_tags != current_tags:
+                existing.tags = merged_tags
+                existing.save(update_fields=['tags', 'updated_at'])
+            if not existing.derivatives and derivatives_enabled():
+                enqueue_media_derivatives(existing.id)
+            serializer.instance = existing
+            logger.info(
+                f"📸 [MEDIA] Duplicate upload by user {user.id} reused asset {existing.id} "
+                f"(scope={scope}, organizer={organizer.id if organizer else None})"
+            )
+            return
+
+        # Save asset (tags from validated_data if present)
         asset = serializer.save(
             uploaded_by=user,
             organizer=organizer if scope == 'organizer' else None,
@@ -326,8 +353,12 @@ class MediaAssetViewSet(viewsets.ModelViewSet):
             sha256=sha256_hash,
             tags=tags,
         )
-        # Generate thumbnail for fast grid loading (~10-30KB vs full image)
-        asset.generate_thumbnail()
+        if derivatives_enabled():
+            # Responsive sizes + grid thumbnail are rendered by the documents worker
+            enqueue_media_derivatives(asset.id)
+        else:
+            # Generate thumbnail for fast grid loading (~10-30KB vs full image)
+            asset.generate_thumbnail()
         logger.info(
             f"📸 [MEDIA] Asset created: {asset.id} by user {user.id} "
             f"(scope={scope}, organizer={organizer.id if organizer else None})"
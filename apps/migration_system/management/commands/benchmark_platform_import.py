@@ -0,0 +1,149 @@
+"""
+🚀 ENTERPRISE: Benchmark del import de plataforma (bulk vs registro a registro).
+
+Usage:
+    python manage.py benchmark_platform_import [--orders 20000] [--batch-size 1000] [--legacy]
+
+Todo corre dentro de una transacción que se revierte al final:
+1. Agrega datos sintéticos (usuarios, organizador, eventos, tiers, órdenes e items)
+2. Exporta la plataforma completa (snapshot 2.0.0) a un archivo temporal
+3. Vacía las tablas exportadas (TRUNCATE ... CASCADE)
+4. Importa con BulkImportEngine y reporta filas/s por modelo
+5. Con --legacy, repite el import con import_model_enterprise para comparar
+
+Solo para entornos de desarrollo: TRUNCATE toma locks exclusivos hasta el rollback.
+"""
+
+import shutil
+import tempfile
+import time
+from decimal import Decimal
+from pathlib import Path
+
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from apps.events.models import Order, OrderItem
+from apps.migration_system.services import PlatformExportService, PlatformImportService
+from apps.migration_system.services.bulk_import import BulkImportEngine
+from core.testing import create_event, create_organizer, create_ticket_tier
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Benchmark del import de plataforma: bulk vs registro a registro (datos revertidos)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--orders', type=int, default=20000, help='Órdenes sintéticas a agregar')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Registros por lote en modo bulk')
+        parser.add_argument('--legacy', action='store_true', help='Comparar con el import registro a registro')
+        parser.add_argument('--top', type=int, default=10, help='Modelos a mostrar en el detalle')
+
+    def handle(self, *args, **options):
+        tmp_dir = Path(tempfile.mkdtemp(prefix='tuki_import_bench_'))
+        try:
+            with transaction.atomic():
+                self._run(options, tmp_dir)
+                raise _Rollback()
+        except _Rollback:
+            self.stdout.write('Datos sintéticos revertidos.')
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def _seed(self, total_orders):
+        User = get_user_model()
+        User.objects.bulk_create(
+            [User(email=f'bench{i}@bench.test', username=f'bench-{i}', password='!') for i in range(total_orders // 10)],
+            batch_size=2000,
+        )
+        organizer = create_organizer(name='Benchmark Import', slug='benchmark-import')
+        tiers = []
+        for i in range(10):
+            event = create_event(organizer=organizer, title=f'Bench {i}', slug=f'bench-import-{i}', pricing_mode='complex')
+            tiers.append(create_ticket_tier(event, name='General', price=Decimal('5000')))
+
+        orders = Order.objects.bulk_create(
+            (
+                Order(
+                    event=tiers[i % len(tiers)].event, order_number=f'BENCH-IMP-{i}', email=f'bench{i}@bench.test',
+                    first_name='Bench', last_name='Buyer', status='paid', subtotal=Decimal('5000'),
+                    service_fee=Decimal('100'), total=Decimal('5100'),
+                )
+                for i in range(total_orders)
+            ),
+            batch_size=5000,
+        )
+        OrderItem.objects.bulk_create(
+            (
+                OrderItem(order=order, ticket_tier=tiers[i % len(tiers)], quantity=1, unit_price=Decimal('5000'),
+                          unit_service_fee=Decimal('100'), subtotal=Decimal('5100'))
+                for i, order in enumerate(orders)
+            ),
+            batch_size=5000,
+        )
+
+    def _truncate(self, model_paths):
+        tables = []
+        for path in model_paths:
+            model = apps.get_model(path)
+            tables.append(model._meta.db_table)
+            tables.extend(f.remote_field.through._meta.db_table for f in model._meta.many_to_many)
+        qn = connection.ops.quote_name
+        with connection.cursor() as cursor:
+            # TRUNCATE no se permite con checks de FK diferidos pendientes (los del seed)
+            cursor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+            cursor.execute(f"TRUNCATE {', '.join(qn(t) for t in dict.fromkeys(tables))} CASCADE")
+
+    def _run(self, options, tmp_dir):
+        started = time.perf_counter()
+        self._seed(options['orders'])
+        self.stdout.write(f'Datos sintéticos creados en {time.perf_counter() - started:.1f}s')
+
+        export_file = tmp_dir / 'snapshot.tar'
+        started = time.perf_counter()
+        export = PlatformExportService().export_all(output_file=str(export_file), include_media=False)
+        total_records = export['statistics']['total_records']
+        self.stdout.write(
+            f"Snapshot: {total_records:,} registros, {export['size_mb']} MB en {time.perf_counter() - started:.1f}s"
+        )
+
+        service = PlatformImportService()
+        data = service.load_from_file(str(export_file))
+        try:
+            model_paths = [path for path in service.MODEL_IMPORT_ORDER if data['models'].get(path)]
+            self._truncate(model_paths)
+
+            sid = transaction.savepoint()
+            started = time.perf_counter()
+            stats = BulkImportEngine(service, batch_size=options['batch_size']).run(
+                data['models'], service.MODEL_IMPORT_ORDER
+            )
+            bulk_time = time.perf_counter() - started
+            bulk_rows = sum(s['imported'] for s in stats.values())
+            transaction.savepoint_rollback(sid)
+
+            self.stdout.write('')
+            self.stdout.write('Modelos con más registros (bulk):')
+            for path, s in sorted(stats.items(), key=lambda item: -item[1]['imported'])[:options['top']]:
+                self.stdout.write(f"  {path:<40} {s['imported']:>9,}  {s['rows_per_sec']:>12,.0f} filas/s")
+            self.stdout.write(f'Bulk:      {bulk_rows:,} registros en {bulk_time:.2f}s ({bulk_rows / bulk_time:,.0f} filas/s)')
+
+            if options['legacy']:
+                started = time.perf_counter()
+                legacy_rows = 0
+                for path in model_paths:
+                    with transaction.atomic():
+                        legacy_rows += service.import_model_enterprise(path, data['models'][path])
+                legacy_time = time.perf_counter() - started
+                self.stdout.write(
+                    f'Registro a registro: {legacy_rows:,} registros en {legacy_time:.2f}s '
+                    f'({legacy_rows / legacy_time:,.0f} filas/s)'
+                )
+                self.stdout.write(self.style.SUCCESS(f'Speedup: {legacy_time / bulk_time:.1f}x'))
+        finally:
+            data.close()
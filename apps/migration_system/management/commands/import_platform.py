@@ -64,6 +64,17 @@ class Command(BaseCommand):
             action='store_true',
             help='No descargar archivos media'
         )
+        parser.add_argument(
+            '--no-bulk',
+            action='store_true',
+            help='Importar registro a registro en vez de por lotes'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=None,
+            help='Registros por lote en modo bulk (default: MIGRATION_SYSTEM CHUNK_SIZE)'
+        )
         parser.add_argument(
             '--auto-rollback',
             action='store_true',
@@ -108,6 +119,8 @@ class Command(BaseCommand):
                 'skip_existing': options.get('skip_existing', True),
                 'skip_media': options.get('skip_media', False),
                 'auto_rollback': options.get('auto_rollback', True),
+                'bulk': not options.get('no_bulk', False),
+                'batch_size': options.get('batch_size'),
             }
             
             # Ejecutar import
@@ -132,8 +145,13 @@ class Command(BaseCommand):
             
             self.stdout.write('')
             self.stdout.write('  Registros importados por modelo:')
+            bulk_stats = result.get('bulk_stats') or {}
             for model_path, count in result['imported_counts'].items():
-                self.stdout.write(f"    • {model_path}: {count}")
+                stats = bulk_stats.get(model_path)
+                if stats:
+                    self.stdout.write(f"    • {model_path}: {count} ({stats['rows_per_sec']:,.0f} filas/s)")
+                else:
+                    self.stdout.write(f"    • {model_path}: {count}")
             
             self.stdout.write('')
             
@@ -223,6 +223,11 @@ def _make_json_serializable(value):
         return None
 
 
+def _targets_pk(field):
+    """True si el FK apunta a la pk del modelo relacionado (sin to_field)."""
+    return field.target_field.primary_key
+
+
 class MigrationSerializer(serializers.ModelSerializer):
     """
     Serializer base optimizado para migración que exporta:
@@ -254,6 +259,13 @@ class MigrationSerializer(serializers.ModelSerializer):
             if field.auto_created and not field.concrete:
                 continue
             
+            # FK/OneToOne hacia la pk: leer la columna *_id directamente
+            # (sin cargar el objeto relacionado, una query por fila)
+            if isinstance(field, django_models.ForeignKey) and _targets_pk(field):
+                value = getattr(instance, field.attname)
+                data[field_name + '_id'] = str(value) if value is not None else None
+                continue
+            
             # Skip campos que no tienen valor en la instancia
             if not hasattr(instance, field_name):
                 continue
@@ -263,10 +275,10 @@ class MigrationSerializer(serializers.ModelSerializer):
                 
                 # Manejo de ManyToMany - extraer a metadata separada
                 if field.many_to_many:
-                    # Obtener lista de IDs
+                    # Obtener lista de IDs (usa prefetch_related si el queryset lo trae)
                     m2m_ids = []
                     if hasattr(value, 'all'):
-                        m2m_ids = list(value.all().values_list('pk', flat=True))
+                        m2m_ids = [obj.pk for obj in value.all()]
                     m2m_data[field_name] = m2m_ids
                     # NO incluir en data principal
                     continue
@@ -0,0 +1,353 @@
+"""
+🚀 ENTERPRISE BULK IMPORT ENGINE
+
+Import por lotes para PlatformImportService (modo por defecto, ver import_all).
+
+En vez de 3-5 queries por registro (_check_exists_by_unique_fields,
+_validate_and_clean_fks, create + UPDATE de timestamps), por cada modelo:
+
+1. Precarga en memoria las claves existentes: pks y cada unique / UniqueConstraint
+   sin condición ({clave: pk}).
+2. Precarga (una vez por modelo destino) los pks válidos para cada FK: los que ya
+   están en la DB más los que trae el export.
+3. Arma las instancias en Python (field.to_python) y escribe con bulk_create en
+   lotes de batch_size; con overwrite usa bulk_create(update_conflicts=True) sobre la pk.
+4. Restaura created_at/updated_at (auto_now*) con un UPDATE ... FROM (VALUES ...) por lote.
+
+Todo corre en una transacción con SET CONSTRAINTS ALL DEFERRED: los FKs circulares
+(p.ej. PlatformFlow.primary_order <-> Order.flow) se insertan con su valor real sin
+segunda pasada, y se verifican todos juntos al final (SET CONSTRAINTS ALL IMMEDIATE).
+Si algo falla, la transacción completa se revierte y import_all reintenta con el
+import registro a registro.
+"""
+
+import logging
+import time
+
+from django.apps import apps
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
+from django.db.models import UniqueConstraint
+
+logger = logging.getLogger(__name__)
+
+
+class BulkModelPlan:
+    """Metadatos de un modelo precalculados una sola vez por import."""
+
+    def __init__(self, model):
+        meta = model._meta
+        self.model = model
+        self.pk_field = meta.pk
+        self.fields = [f for f in meta.concrete_fields]
+        self.fk_fields = [f for f in self.fields if f.is_relation]
+        self.update_fields = [f.name for f in self.fields if not f.primary_key]
+        self.timestamp_fields = [
+            f for f in self.fields
+            if getattr(f, 'auto_now', False) or getattr(f, 'auto_now_add', False)
+        ]
+        self.m2m_fields = [
+            f for f in meta.many_to_many
+            if f.remote_field.through._meta.auto_created
+        ]
+        self.unique_keys = self._unique_keys(meta)
+
+    @staticmethod
+    def _unique_keys(meta):
+        """Tuplas de attnames que deben ser únicas (sin la pk ni constraints condicionales)."""
+        keys = []
+        for field in meta.concrete_fields:
+            if field.unique and not field.primary_key:
+                keys.append((field.attname,))
+        for fields in meta.unique_together:
+            keys.append(tuple(meta.get_field(name).attname for name in fields))
+        for constraint in meta.constraints:
+            if (
+                isinstance(constraint, UniqueConstraint)
+                and constraint.fields
+                and constraint.condition is None
+                and not constraint.expressions
+            ):
+                keys.append(tuple(meta.get_field(name).attname for name in constraint.fields))
+        return list(dict.fromkeys(keys))
+
+
+class BulkImportEngine:
+    """
+    Importa los modelos de un export por lotes, en una sola transacción.
+
+    Args:
+        service: PlatformImportService (para logs y progreso del job)
+        batch_size: registros por INSERT
+        overwrite: actualizar registros existentes (misma pk) en vez de saltarlos
+    """
+
+    def __init__(self, service, batch_size=1000, overwrite=False):
+        self.service = service
+        self.batch_size = max(1, int(batch_size))
+        self.overwrite = overwrite
+        self.models_data = {}
+        self._plans = {}
+        self._pk_index = {}
+
+    # ------------------------------------------------------------------
+    # Entrada
+    # ------------------------------------------------------------------
+
+    def run(self, models_data, model_order):
+        """
+        Importa `models_data` ({model_path: registros}) en el orden dado.
+
+        Returns:
+            dict {model_path: {'imported', 'skipped', 'errors', 'seconds', 'rows_per_sec'}}
+        """
+        self.models_data = models_data
+        stats = {}
+        paths = [path for path in model_order if models_data.get(path)]
+
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute('SET CONSTRAINTS ALL DEFERRED')
+
+            for idx, model_path in enumerate(paths, 1):
+                stats[model_path] = self.import_model(model_path, models_data[model_path])
+                self._report_progress(idx, len(paths), model_path, stats)
+
+            # Verificar ahora todos los FKs diferidos (falla aquí y no en el COMMIT)
+            with connection.cursor() as cursor:
+                cursor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+
+        return stats
+
+    def import_model(self, model_path, records):
+        """Importa los registros de un modelo por lotes y devuelve sus métricas."""
+        model = apps.get_model(model_path)
+        plan = self._plan(model)
+        started = time.perf_counter()
+
+        existing_pks = set(model._base_manager.values_list('pk', flat=True))
+        unique_index = self._load_unique_index(plan)
+        own_pks = self._pk_index.get(model._meta.label)
+
+        imported = skipped = 0
+        errors = []
+        batch = []
+
+        for record in records:
+            try:
+                values = self._record_values(plan, record)
+            except (ValidationError, ValueError, TypeError) as e:
+                errors.append({'pk': record.get('id') or record.get('pk'), 'error': str(e)})
+                continue
+
+            pk = values.get(plan.pk_field.attname)
+            if pk is not None and pk in existing_pks:
+                if not self.overwrite:
+                    skipped += 1
+                    continue
+            else:
+                keys = self._unique_values(plan, values)
+                if any(
+                    index.get(key, pk) != pk
+                    for index, key in zip(unique_index, keys) if key is not None
+                ):
+                    # Mismo valor único con otra pk: el registro no se puede importar
+                    skipped += 1
+                    if own_pks is not None and pk is not None:
+                        own_pks.discard(pk)
+                    continue
+                for index, key in zip(unique_index, keys):
+                    if key is not None:
+                        index[key] = pk
+                if pk is not None:
+                    existing_pks.add(pk)
+
+            batch.append((values, record))
+            if len(batch) >= self.batch_size:
+                imported += self._flush(plan, batch)
+                batch = []
+
+        if batch:
+            imported += self._flush(plan, batch)
+
+        seconds = time.perf_counter() - started
+        rows_per_sec = (imported / seconds) if seconds > 0 else 0.0
+        if errors:
+            logger.warning(f"{model_path}: {len(errors)} errores de {len(records)} registros")
+            for error in errors[:5]:
+                logger.warning(f"  {model_path} pk={error['pk']}: {error['error'][:200]}")
+
+        self.service.log(
+            'info',
+            f"[BULK] {model_path}: {imported} importados, {skipped} saltados en {seconds:.2f}s "
+            f"({rows_per_sec:,.0f} filas/s)",
+            model_name=model_path,
+            record_count=imported,
+            duration_ms=int(seconds * 1000),
+        )
+        return {
+            'imported': imported,
+            'skipped': skipped,
+            'errors': len(errors),
+            'seconds': round(seconds, 3),
+            'rows_per_sec': round(rows_per_sec, 1),
+        }
+
+    # ------------------------------------------------------------------
+    # Índices en memoria
+    # ------------------------------------------------------------------
+
+    def _plan(self, model):
+        label = model._meta.label
+        if label not in self._plans:
+            self._plans[label] = BulkModelPlan(model)
+        return self._plans[label]
+
+    def _load_unique_index(self, plan):
+        """[{clave: pk}] por cada clave única del modelo, con los valores ya en la DB."""
+        indexes = []
+        for attnames in plan.unique_keys:
+            rows = plan.model._base_manager.values_list(*attnames, 'pk')
+            indexes.append({
+                row[:-1]: row[-1] for row in rows.iterator(chunk_size=10000)
+                if None not in row[:-1]
+            })
+        return indexes
+
+    @staticmethod
+    def _unique_values(plan, values):
+        keys = []
+        for attnames in plan.unique_keys:
+            key = tuple(values.get(attname) for attname in attnames)
+            keys.append(None if None in key else key)
+        return keys
+
+    def _target_pks(self, model):
+        """pks válidos como destino de un FK: en la DB o presentes en el export."""
+        label = model._meta.label
+        if label not in self._pk_index:
+            pks = set(model._base_manager.values_list('pk', flat=True).iterator(chunk_size=10000))
+            records = self.models_data.get(label)
+            if records:
+                pk_field = model._meta.pk
+                for record in records:
+                    raw = record.get(pk_field.attname, record.get('pk'))
+                    if raw is not None:
+                        try:
+                            pks.add(pk_field.to_python(raw))
+                        except ValidationError:
+                            continue
+            self._pk_index[label] = pks
+        return self._pk_index[label]
+
+    # ------------------------------------------------------------------
+    # Registros -> instancias
+    # ------------------------------------------------------------------
+
+    def _record_values(self, plan, record):
+        """dict {attname: valor Python} para los campos presentes en el registro."""
+        values = {}
+        for field in plan.fields:
+            if field.attname in record:
+                raw = record[field.attname]
+            elif field.name in record:
+                raw = record[field.name]
+                if isinstance(raw, dict) and field.is_relation:
+                    raw = raw.get('id') or raw.get('pk')
+            else:
+                continue
+            values[field.attname] = None if raw is None else field.to_python(raw)
+
+        for field in plan.fk_fields:
+            value = values.get(field.attname)
+            if value is None or value in self._target_pks(field.related_model):
+                continue
+            if not field.null:
+                raise ValueError(f"FK {field.name}={value} no existe")
+            values[field.attname] = None
+        return values
+
+    def _flush(self, plan, batch):
+        model = plan.model
+        objs = [model(**values) for values, _ in batch]
+        manager = model._base_manager
+        if self.overwrite and plan.update_fields:
+            manager.bulk_create(
+                objs,
+                update_conflicts=True,
+                unique_fields=[plan.pk_field.name],
+                update_fields=plan.update_fields,
+            )
+        else:
+            manager.bulk_create(objs)
+
+        self._restore_timestamps(plan, batch)
+        self._write_m2m(plan, objs, batch)
+        return len(objs)
+
+    def _restore_timestamps(self, plan, batch):
+        """bulk_create pisa auto_now/auto_now_add: se reponen los valores del export."""
+        fields = [f for f in plan.timestamp_fields if any(f.attname in values for values, _ in batch)]
+        if not fields:
+            return
+        rows = [
+            (str(values[plan.pk_field.attname]), *[values.get(f.attname) for f in fields])
+            for values, _ in batch
+            if values.get(plan.pk_field.attname) is not None
+        ]
+        if not rows:
+            return
+
+        qn = connection.ops.quote_name
+        table = qn(plan.model._meta.db_table)
+        columns = ', '.join(qn(f.column) for f in fields)
+        assignments = ', '.join(
+            f"{qn(f.column)} = COALESCE(v.{qn(f.column)}::{f.db_type(connection)}, dst.{qn(f.column)})"
+            for f in fields
+        )
+        placeholders = ', '.join(['(' + ', '.join(['%s'] * (len(fields) + 1)) + ')'] * len(rows))
+        sql = (
+            f"UPDATE {table} AS dst SET {assignments} "
+            f"FROM (VALUES {placeholders}) AS v(pk, {columns}) "
+            f"WHERE dst.{qn(plan.pk_field.column)} = v.pk::{plan.pk_field.rel_db_type(connection)}"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [value for row in rows for value in row])
+
+    def _write_m2m(self, plan, objs, batch):
+        for field in plan.m2m_fields:
+            through = field.remote_field.through
+            source = f"{field.m2m_field_name()}_id"
+            target = f"{field.m2m_reverse_field_name()}_id"
+            target_pk = field.related_model._meta.pk
+            valid_targets = self._target_pks(field.related_model)
+
+            links = []
+            source_ids = []
+            for obj, (_, record) in zip(objs, batch):
+                related = (record.get('_m2m_relations') or {}).get(field.name, record.get(field.name))
+                if not isinstance(related, list):
+                    continue
+                source_ids.append(obj.pk)
+                for raw in related:
+                    try:
+                        value = target_pk.to_python(raw)
+                    except ValidationError:
+                        continue
+                    if value in valid_targets:
+                        links.append(through(**{source: obj.pk, target: value}))
+
+            if self.overwrite and source_ids:
+                through._base_manager.filter(**{f"{source}__in": source_ids}).delete()
+            if links:
+                through._base_manager.bulk_create(links, ignore_conflicts=True)
+
+    def _report_progress(self, idx, total, model_path, stats):
+        job = self.service.job
+        if not job:
+            return
+        job.progress_percent = int((idx / total) * 90)
+        job.current_step = f"Importando {model_path}"
+        job.models_completed = idx
+        job.records_processed = sum(s['imported'] for s in stats.values())
+        job.save(update_fields=['progress_percent', 'current_step', 'models_completed', 'records_processed'])
@@ -5,6 +5,7 @@ Servicio robusto para exportar toda la plataforma Tuki.
 """
 
 import gzip
+import io
 import json
 import logging
 import uuid
@@ -12,6 +13,7 @@ import decimal
 import tarfile
 import shutil
 import base64
+import tempfile
 from datetime import datetime, date
 from pathlib import Path
 from django.apps import apps
@@ -31,6 +33,7 @@ from ..utils import (
     format_file_size,
 )
 from ..serializers import get_migration_serializer_for_model
+from .streaming import MANIFEST_NAME, MEDIA_DIR, NDJSONWriter, model_member_name, tar_write_mode
 
 logger = logging.getLogger(__name__)
 
@@ -69,10 +72,10 @@ class PlatformExportService:
     - Metadatos de archivos media
     - Compresión gzip
     - Progress tracking
-    - Chunked export para grandes datasets
+    - Export en streaming (NDJSON por modelo + manifest) con memoria acotada
     """
     
-    EXPORT_VERSION = "1.0.0"
+    EXPORT_VERSION = "2.0.0"
     
     def __init__(self, job=None):
         """
@@ -109,10 +112,15 @@ class PlatformExportService:
     
     def export_all(self, output_file=None, **options):
         """
-        Exporta toda la plataforma.
+        Exporta toda la plataforma en streaming (formato 2.0.0, ver streaming.py).
+        
+        Cada modelo se lee por páginas keyset (pk > último pk) y se escribe
+        registro a registro a un NDJSON; la memoria usada no depende del tamaño
+        de la base de datos.
         
         Args:
-            output_file: Ruta del archivo de salida (opcional)
+            output_file: Ruta del archivo de salida (opcional). Sin archivo solo
+                se recorren los datos para calcular estadísticas.
             **options:
                 include_media: bool - Incluir metadatos de archivos (default True)
                 compress: bool - Comprimir con gzip (default True)
@@ -129,10 +137,11 @@ class PlatformExportService:
         if self.job:
             self.job.start()
         
+        staging_dir = None
         try:
-            # Preparar estructura de datos
-            export_data = {
+            manifest = {
                 'version': self.EXPORT_VERSION,
+                'format': 'ndjson',
                 'export_date': timezone.now().isoformat(),
                 'source_environment': self._get_environment_name(),
                 'database_version': get_database_version(),
@@ -142,6 +151,11 @@ class PlatformExportService:
                 'statistics': {}
             }
             
+            # Si el TAR ya va comprimido (.tar.gz) los NDJSON van sin comprimir
+            compress_members = bool(options.get('compress', True)) and tar_write_mode(output_file or '') == 'w'
+            if output_file:
+                staging_dir = Path(tempfile.mkdtemp(prefix='export_staging_', dir=self.export_dir))
+            
             # Obtener lista de modelos a exportar
             models_to_export = self._get_models_to_export(options)
             total_models = len(models_to_export)
@@ -154,6 +168,7 @@ class PlatformExportService:
             
             # Exportar cada modelo
             total_records = 0
+            model_counts = {}
             for idx, model_path in enumerate(models_to_export, 1):
                 self.log('info', f"Exportando {model_path}...", model_name=model_path)
                 
@@ -161,17 +176,26 @@ class PlatformExportService:
                 model = apps.get_model(app_label, model_name)
                 
                 model_start = datetime.now()
-                records = self.export_model(model, options.get('chunk_size', self.chunk_size))
+                records = self.iter_model_records(model, options.get('chunk_size', self.chunk_size))
+                if staging_dir is not None:
+                    member = model_member_name(model_path, compress_members)
+                    with NDJSONWriter(staging_dir / member, DjangoJSONEncoder, compress_members) as writer:
+                        for record in records:
+                            writer.write(record)
+                    count = writer.count
+                    manifest['models'][model_path] = {'file': member, 'count': count}
+                else:
+                    count = sum(1 for _ in records)
                 model_duration = (datetime.now() - model_start).total_seconds() * 1000
                 
-                export_data['models'][model_path] = records
-                total_records += len(records)
+                model_counts[model_path] = count
+                total_records += count
                 
                 self.log(
                     'info',
-                    f"Exportados {len(records)} registros de {model_path}",
+                    f"Exportados {count} registros de {model_path}",
                     model_name=model_path,
-                    record_count=len(records),
+                    record_count=count,
                     duration_ms=int(model_duration)
                 )
                 
@@ -186,60 +210,44 @@ class PlatformExportService:
             # Exportar metadatos de archivos media
             if options.get('include_media', True):
                 self.log('info', "Exportando metadatos de archivos media")
-                export_data['media_files'] = self.export_media_metadata()
+                manifest['media_files'] = self.export_media_metadata()
                 
                 if self.job:
                     self.job.update_progress(85, "Metadatos de archivos exportados")
             
             # Generar estadísticas
-            export_data['statistics'] = self.generate_statistics(export_data)
+            manifest['statistics'] = self.generate_statistics(model_counts, manifest['media_files'])
             
             if self.job:
                 self.job.total_records = total_records
-                self.job.total_files = len(export_data['media_files'])
+                self.job.total_files = len(manifest['media_files'])
                 self.job.save(update_fields=['total_records', 'total_files'])
             
             # Guardar a archivo si se especificó
             if output_file:
                 self.log('info', f"Guardando export a {output_file}")
                 
-                include_media = options.get('include_media', True)
-                has_media_files = bool(export_data.get('media_files'))
+                # Los archivos físicos solo se empaquetan en exports .tar.gz completos
+                # (los checkpoints llevan solo metadatos)
+                include_media_files = (
+                    options.get('include_media', True)
+                    and bool(manifest['media_files'])
+                    and str(output_file).endswith('.tar.gz')
+                )
+                if include_media_files and self.job:
+                    self.job.update_progress(90, "Empaquetando archivos media")
                 
-                # Si include_media=True y hay archivos, crear TAR.GZ completo
-                if include_media and has_media_files and output_file.endswith('.tar.gz'):
-                    # Guardar primero el JSON temporal
-                    json_path = output_file.replace('.tar.gz', '_data.json.gz')
-                    _, json_size = self.save_to_file(
-                        export_data,
-                        json_path,
-                        options.get('compress', True)
-                    )
-                    
-                    # Crear archivo TAR.GZ con JSON + archivos media
-                    if self.job:
-                        self.job.update_progress(90, "Empaquetando archivos media")
-                    
-                    file_path, file_size = self.create_full_backup(
-                        json_path,
-                        export_data['media_files'],
-                        output_file
-                    )
-                    
-                    # Limpiar JSON temporal
-                    Path(json_path).unlink(missing_ok=True)
-                else:
-                    # Solo JSON (sin media o checkpoint)
-                    file_path, file_size = self.save_to_file(
-                        export_data,
-                        output_file,
-                        options.get('compress', True)
-                    )
+                file_path, file_size, files_copied = self.write_archive(
+                    manifest,
+                    staging_dir,
+                    output_file,
+                    include_media_files=include_media_files
+                )
                 
                 if self.job:
                     self.job.export_file_path = file_path
                     self.job.export_file_size_mb = file_size
-                    self.job.files_transferred = len(export_data.get('media_files', []))
+                    self.job.files_transferred = files_copied
                     self.job.save(update_fields=['export_file_path', 'export_file_size_mb', 'files_transferred'])
             
             duration = (datetime.now() - start_time).total_seconds()
@@ -253,10 +261,10 @@ class PlatformExportService:
                 'success': True,
                 'file_path': output_file,
                 'size_mb': file_size if output_file else None,
-                'statistics': export_data['statistics'],
+                'statistics': manifest['statistics'],
                 'duration_seconds': duration,
-                'export_date': export_data['export_date'],
-                'source_environment': export_data['source_environment'],
+                'export_date': manifest['export_date'],
+                'source_environment': manifest['source_environment'],
             }
             
         except Exception as e:
@@ -265,46 +273,73 @@ class PlatformExportService:
                 import traceback
                 self.job.fail(str(e), traceback.format_exc())
             raise
+        finally:
+            if staging_dir is not None:
+                shutil.rmtree(staging_dir, ignore_errors=True)
     
-    def export_model(self, model, batch_size=1000):
+    def iter_model_records(self, model, batch_size=1000):
         """
-        Exporta un modelo específico usando MigrationSerializer.
+        Itera los registros serializados de un modelo, en orden de pk.
+        
+        Pagina por keyset (pk > último pk de la página anterior) en vez de
+        OFFSET, así cada página cuesta lo mismo sin importar cuántas filas
+        haya antes. Los M2M se precargan por página.
         
         Args:
             model: Django model class
-            batch_size: Tamaño del batch para procesar
+            batch_size: Tamaño de cada página
             
-        Returns:
-            List de registros serializados con FKs planos y M2M separados
+        Yields:
+            dict serializado con FKs planos y M2M separados
         """
         # Usar MigrationSerializer optimizado para migración
         serializer_class = get_migration_serializer_for_model(model)
         
-        queryset = model.objects.all()
-        total = queryset.count()
+        pk_name = model._meta.pk.attname
+        m2m_fields = [f.name for f in model._meta.many_to_many]
+        queryset = model._default_manager.order_by(pk_name)
+        if m2m_fields:
+            queryset = queryset.prefetch_related(*m2m_fields)
         
-        logger.debug(f"Exportando {total} registros de {model._meta.label}")
+        logger.debug(f"Exportando registros de {model._meta.label}")
         
-        exported = []
-        for i in range(0, total, batch_size):
-            batch = queryset[i:i+batch_size]
+        last_pk = None
+        while True:
+            page = queryset if last_pk is None else queryset.filter(**{f"{pk_name}__gt": last_pk})
+            batch = list(page[:batch_size])
+            if not batch:
+                break
+            last_pk = getattr(batch[-1], pk_name)
             
             # Serializar batch con MigrationSerializer
             try:
-                serializer = serializer_class(batch, many=True)
-                exported.extend(serializer.data)
+                yield from serializer_class(batch, many=True).data
             except Exception as e:
                 # Si el serializer falla, usar values() como fallback
                 logger.warning(f"MigrationSerializer falló para {model._meta.label}, usando values(): {e}")
-                batch_data = list(batch.values())
-                # Convertir dates/datetimes a strings
-                for item in batch_data:
+                batch_pks = [getattr(obj, pk_name) for obj in batch]
+                for item in model._default_manager.filter(pk__in=batch_pks).order_by(pk_name).values():
+                    # Convertir dates/datetimes a strings
                     for key, value in item.items():
                         if isinstance(value, (datetime, timezone.datetime)):
                             item[key] = value.isoformat()
-                exported.extend(batch_data)
+                    yield item
+            
+            if len(batch) < batch_size:
+                break
+    
+    def export_model(self, model, batch_size=1000):
+        """
+        Exporta un modelo específico usando MigrationSerializer.
         
-        return exported
+        Args:
+            model: Django model class
+            batch_size: Tamaño del batch para procesar
+            
+        Returns:
+            List de registros serializados con FKs planos y M2M separados
+        """
+        return list(self.iter_model_records(model, batch_size))
     
     def export_media_metadata(self):
         """
@@ -391,12 +426,13 @@ class PlatformExportService:
         self.log('info', f"Exportados metadatos de {len(media_files)} archivos válidos")
         return media_files
     
-    def generate_statistics(self, export_data):
+    def generate_statistics(self, model_counts, media_files):
         """
         Genera estadísticas del export.
         
         Args:
-            export_data: dict con datos exportados
+            model_counts: dict {model_path: cantidad de registros}
+            media_files: dict con metadatos de archivos
             
         Returns:
             dict con estadísticas
@@ -404,17 +440,17 @@ class PlatformExportService:
         stats = {}
         
         # Contar registros por modelo
-        for model_path, records in export_data['models'].items():
-            stats[f"count_{model_path}"] = len(records)
+        for model_path, count in model_counts.items():
+            stats[f"count_{model_path}"] = count
         
         # Totales
-        stats['total_models'] = len(export_data['models'])
-        stats['total_records'] = sum(len(records) for records in export_data['models'].values())
-        stats['total_files'] = len(export_data['media_files'])
+        stats['total_models'] = len(model_counts)
+        stats['total_records'] = sum(model_counts.values())
+        stats['total_files'] = len(media_files)
         
         # Tamaño total de archivos
         total_size = sum(
-            meta['size'] for meta in export_data['media_files'].values()
+            meta['size'] for meta in media_files.values()
             if meta.get('size')
         )
         stats['total_media_size_bytes'] = total_size
@@ -424,7 +460,10 @@ class PlatformExportService:
     
     def save_to_file(self, export_data, output_file, compress=True):
         """
-        Guarda export data a archivo.
+        Guarda export data en el formato JSON único anterior (1.0.0).
+        
+        Se codifica de forma incremental (iterencode) en vez de armar todo
+        el string en memoria.
         
         Args:
             export_data: dict con datos
@@ -437,17 +476,11 @@ class PlatformExportService:
         output_path = Path(output_file)
         output_path.parent.mkdir(parents=True, exist_ok=True)
         
-        # Serializar a JSON con encoder personalizado
-        json_data = json.dumps(export_data, indent=2, ensure_ascii=False, cls=DjangoJSONEncoder)
-        
-        if compress:
-            # Comprimir con gzip
-            with gzip.open(output_path, 'wt', encoding='utf-8') as f:
-                f.write(json_data)
-        else:
-            # Guardar sin comprimir
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(json_data)
+        encoder = DjangoJSONEncoder(ensure_ascii=False)
+        opener = gzip.open if compress else open
+        with opener(output_path, 'wt', encoding='utf-8') as f:
+            for chunk in encoder.iterencode(export_data):
+                f.write(chunk)
         
         # Calcular tamaño
         file_size = output_path.stat().st_size
@@ -457,95 +490,78 @@ class PlatformExportService:
         
         return str(output_path), size_mb
     
-    def create_full_backup(self, json_path, media_files_metadata, output_tar_path):
+    def write_archive(self, manifest, staging_dir, output_file, include_media_files=False):
         """
-        Crea un archivo TAR.GZ con datos JSON + archivos media físicos.
+        Empaqueta manifest + NDJSON de modelos (+ archivos media) en un TAR.
+        
+        El manifest va primero para que el import lo lea en una sola pasada.
+        Los archivos media se copian desde el storage directo al TAR, sin
+        staging en disco.
         
         Args:
-            json_path: Ruta al archivo JSON con metadatos
-            media_files_metadata: dict con metadatos de archivos
-            output_tar_path: Ruta del archivo TAR.GZ de salida
+            manifest: dict con metadatos, estadísticas y {modelo: {file, count}}
+            staging_dir: directorio con los NDJSON ya escritos
+            output_file: ruta del TAR de salida (.tar.gz se comprime entero)
+            include_media_files: incluir archivos físicos en media/
             
         Returns:
-            tuple: (file_path, size_in_mb)
+            tuple: (file_path, size_in_mb, files_copied)
         """
-        output_path = Path(output_tar_path)
+        output_path = Path(output_file)
         output_path.parent.mkdir(parents=True, exist_ok=True)
+        media_files = manifest.get('media_files', {})
+        files_copied = 0
+        files_skipped = 0
+        
+        with tarfile.open(output_path, tar_write_mode(output_path)) as tar:
+            manifest_bytes = json.dumps(manifest, ensure_ascii=False, cls=DjangoJSONEncoder).encode('utf-8')
+            info = tarfile.TarInfo(MANIFEST_NAME)
+            info.size = len(manifest_bytes)
+            info.mtime = int(datetime.now().timestamp())
+            tar.addfile(info, io.BytesIO(manifest_bytes))
+            
+            for entry in manifest['models'].values():
+                tar.add(Path(staging_dir) / entry['file'], arcname=entry['file'])
+            
+            if include_media_files:
+                self.log('info', f"Creando backup completo con {len(media_files)} archivos")
+                for file_path in media_files:
+                    try:
+                        if not default_storage.exists(file_path):
+                            files_skipped += 1
+                            logger.warning(f"Archivo no existe, omitiendo: {file_path}")
+                            continue
+                        
+                        info = tarfile.TarInfo(f"{MEDIA_DIR}/{file_path}")
+                        info.size = default_storage.size(file_path)
+                        info.mtime = int(datetime.now().timestamp())
+                        with default_storage.open(file_path, 'rb') as src:
+                            tar.addfile(info, src)
+                        files_copied += 1
+                        
+                        # Actualizar progreso cada 10 archivos
+                        if files_copied % 10 == 0 and self.job:
+                            progress = 90 + int((files_copied / len(media_files)) * 8)
+                            self.job.update_progress(
+                                min(progress, 98),
+                                f"Copiando archivos: {files_copied}/{len(media_files)}"
+                            )
+                            self.job.files_transferred = files_copied
+                            self.job.save(update_fields=['files_transferred'])
+                    except Exception as e:
+                        files_skipped += 1
+                        logger.warning(f"Error copiando {file_path}: {e}")
+                        continue
+                
+                self.log('info', f"Archivos copiados: {files_copied}, omitidos: {files_skipped}")
         
-        self.log('info', f"Creando backup completo con {len(media_files_metadata)} archivos")
+        # Calcular tamaño
+        file_size = output_path.stat().st_size
+        size_mb = round(file_size / (1024 * 1024), 2)
         
-        # Crear directorio temporal para staging
-        temp_dir = output_path.parent / f"temp_export_{uuid.uuid4().hex[:8]}"
-        temp_dir.mkdir(parents=True, exist_ok=True)
+        self.log('info', f"Archivo guardado: {output_path} ({size_mb} MB, {files_copied} archivos)")
         
-        try:
-            # Copiar JSON a temp dir
-            temp_json = temp_dir / 'data.json.gz'
-            shutil.copy2(json_path, temp_json)
-            
-            # Crear directorio media en temp
-            temp_media_dir = temp_dir / 'media'
-            temp_media_dir.mkdir(exist_ok=True)
-            
-            # Copiar archivos media
-            files_copied = 0
-            files_skipped = 0
-            
-            for file_path, metadata in media_files_metadata.items():
-                try:
-                    # Verificar si el archivo existe
-                    if not default_storage.exists(file_path):
-                        files_skipped += 1
-                        logger.warning(f"Archivo no existe, omitiendo: {file_path}")
-                        continue
-                    
-                    # Ruta de destino en temp
-                    dest_path = temp_media_dir / file_path
-                    dest_path.parent.mkdir(parents=True, exist_ok=True)
-                    
-                    # Copiar archivo
-                    with default_storage.open(file_path, 'rb') as src:
-                        with open(dest_path, 'wb') as dst:
-                            shutil.copyfileobj(src, dst)
-                    
-                    files_copied += 1
-                    
-                    # Actualizar progreso cada 10 archivos
-                    if files_copied % 10 == 0 and self.job:
-                        progress = 90 + int((files_copied / len(media_files_metadata)) * 8)
-                        self.job.update_progress(
-                            min(progress, 98),
-                            f"Copiando archivos: {files_copied}/{len(media_files_metadata)}"
-                        )
-                        self.job.files_transferred = files_copied
-                        self.job.save(update_fields=['files_transferred'])
-                    
-                except Exception as e:
-                    files_skipped += 1
-                    logger.warning(f"Error copiando {file_path}: {e}")
-                    continue
-            
-            self.log('info', f"Archivos copiados: {files_copied}, omitidos: {files_skipped}")
-            
-            # Crear archivo TAR.GZ
-            self.log('info', f"Creando archivo TAR.GZ: {output_path}")
-            with tarfile.open(output_path, 'w:gz') as tar:
-                tar.add(temp_json, arcname='data.json.gz')
-                if files_copied > 0:
-                    tar.add(temp_media_dir, arcname='media')
-            
-            # Calcular tamaño
-            file_size = output_path.stat().st_size
-            size_mb = round(file_size / (1024 * 1024), 2)
-            
-            self.log('info', f"Backup completo creado: {output_path} ({size_mb} MB, {files_copied} archivos)")
-            
-            return str(output_path), size_mb
-            
-        finally:
-            # Limpiar directorio temporal
-            if temp_dir.exists():
-                shutil.rmtree(temp_dir)
+        return str(output_path), size_mb, files_copied
     
     def _get_models_to_export(self, options):
         """
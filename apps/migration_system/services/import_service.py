@@ -25,6 +25,8 @@ from ..utils import (
     get_serializer_for_model,
 )
 from .export_service import PlatformExportService
+from .bulk_import import BulkImportEngine
+from .streaming import ModelRecordStream, StreamingExportData, read_export_archive
 
 logger = logging.getLogger(__name__)
 
@@ -57,10 +59,13 @@ class PlatformImportService:
             job: MigrationJob instance (opcional, para tracking)
         """
         self.job = job
-        self.checkpoint_dir = getattr(settings, 'MIGRATION_SYSTEM', {}).get(
+        migration_settings = getattr(settings, 'MIGRATION_SYSTEM', {})
+        self.checkpoint_dir = migration_settings.get(
             'CHECKPOINT_DIR',
             Path(settings.BASE_DIR) / 'checkpoints'
         )
+        self.bulk_import = migration_settings.get('BULK_IMPORT', True)
+        self.batch_size = migration_settings.get('CHUNK_SIZE', 1000)
         
         # Crear directorio si no existe
         Path(self.checkpoint_dir).mkdir(parents=True, exist_ok=True)
@@ -187,6 +192,8 @@ class PlatformImportService:
                 merge: bool - Merge con datos existentes
                 skip_existing: bool - Saltar registros existentes
                 auto_rollback: bool - Rollback automático si falla
+                bulk: bool - Import por lotes (default MIGRATION_SYSTEM['BULK_IMPORT'])
+                batch_size: int - Registros por INSERT en modo bulk
                 
         Returns:
             dict con resultado
@@ -199,12 +206,14 @@ class PlatformImportService:
         
         checkpoint = None
         source_file_path = None  # Guardar ruta para extracción de media
+        loaded_data = None  # Export cargado aquí (se cierra al terminar)
         
         try:
             # Cargar datos si es un archivo
             if isinstance(input_data, str):
                 source_file_path = input_data  # Guardar ruta original
                 input_data = self.load_from_file(input_data)
+                loaded_data = input_data
             
             # Validar formato
             if not self.validate_export_format(input_data):
@@ -228,65 +237,17 @@ class PlatformImportService:
                 self.job.total_files = input_data['statistics'].get('total_files', 0)
                 self.job.save(update_fields=['total_models', 'total_records', 'total_files'])
             
-            # Importar modelos - ARQUITECTURA ENTERPRISE
-            # Cada modelo se importa en su propia transacción para máxima resiliencia
             imported_counts = {}
-            failed_models = {}
+            bulk_stats = None
             
             if not options.get('dry_run'):
-                for idx, model_path in enumerate(self.MODEL_IMPORT_ORDER, 1):
-                    model_data = input_data['models'].get(model_path, [])
-                    
-                    if not model_data:
-                        continue
-                    
-                    self.log('info', f"Importando {model_path}...", model_name=model_path)
-                    
-                    model_start = datetime.now()
-                    
-                    # Cada modelo tiene su propia transacción - si falla, los anteriores se mantienen
-                    try:
-                        with transaction.atomic():
-                            count = self.import_model_enterprise(model_path, model_data, **options)
-                            imported_counts[model_path] = count
-                    except Exception as model_error:
-                        # Este modelo falló pero continuamos con los demás
-                        logger.error(f"Error importando modelo {model_path}: {model_error}")
-                        failed_models[model_path] = str(model_error)
-                        imported_counts[model_path] = 0
-                        # NO re-raise - continuamos con el siguiente modelo
-                    
-                    model_duration = (datetime.now() - model_start).total_seconds() * 1000
-                    
-                    self.log(
-                        'info',
-                        f"Importados {imported_counts.get(model_path, 0)}/{len(model_data)} registros de {model_path}",
-                        model_name=model_path,
-                        record_count=imported_counts.get(model_path, 0),
-                        duration_ms=int(model_duration)
-                    )
-                    
-                    # Actualizar progreso (en su propia mini-transacción)
-                    if self.job:
-                        try:
-                            with transaction.atomic():
-                                progress = int((idx / total_models) * 90)
-                                self.job.update_progress(progress, f"Importando {model_path}")
-                                self.job.models_completed = idx
-                                self.job.records_processed = sum(imported_counts.values())
-                                self.job.save(update_fields=['models_completed', 'records_processed'])
-                        except Exception:
-                            pass  # Silently ignore progress update failures
+                if options.get('bulk', self.bulk_import):
+                    bulk_stats = self._import_models_bulk(input_data, **options)
                 
-                # Resumen de modelos fallidos
-                if failed_models:
-                    self.log('warning', f"Modelos con errores: {list(failed_models.keys())}")
-                
-                # === SEGUNDA PASADA: Actualizar FKs circulares ===
-                self.log('info', "Ejecutando segunda pasada para FKs circulares...")
-                circular_updates = self._update_circular_fk_references(input_data)
-                if circular_updates > 0:
-                    self.log('info', f"Actualizados {circular_updates} registros con FKs circulares")
+                if bulk_stats is not None:
+                    imported_counts = {path: stats['imported'] for path, stats in bulk_stats.items()}
+                else:
+                    imported_counts = self._import_models_per_record(input_data, total_models, **options)
             else:
                 # Dry run - solo contar
                 for model_path, model_data in input_data['models'].items():
@@ -335,7 +296,8 @@ class PlatformImportService:
                 'checkpoint_id': checkpoint.id if checkpoint else None,
                 'duration_seconds': duration,
                 'dry_run': options.get('dry_run', False),
-                'media_files': media_result
+                'media_files': media_result,
+                'bulk_stats': bulk_stats
             }
             
         except Exception as e:
@@ -355,6 +317,129 @@ class PlatformImportService:
                 self.job.fail(str(e), traceback.format_exc())
             
             raise
+        finally:
+            if isinstance(loaded_data, StreamingExportData):
+                loaded_data.close()
+    
+    def _import_models_bulk(self, input_data, **options):
+        """
+        Import por lotes (BulkImportEngine) en una sola transacción.
+        
+        Returns:
+            dict {model_path: métricas} o None si falló (se revierte todo y se
+            usa el import registro a registro)
+        """
+        batch_size = options.get('batch_size') or self.batch_size
+        engine = BulkImportEngine(self, batch_size=batch_size, overwrite=options.get('overwrite', False))
+        
+        # Logs a buffer: dentro de la transacción no se deben escribir a DB
+        self._use_log_buffer = True
+        try:
+            stats = engine.run(input_data['models'], self.MODEL_IMPORT_ORDER)
+        except Exception as e:
+            self._use_log_buffer = False
+            self._log_buffer = []
+            logger.exception("Error en import bulk")
+            self.log('warning', f"Import bulk falló ({e}); reintentando registro a registro")
+            return None
+        self._use_log_buffer = False
+        self._flush_log_buffer()
+        
+        total_rows = sum(s['imported'] for s in stats.values())
+        total_seconds = sum(s['seconds'] for s in stats.values())
+        rate = total_rows / total_seconds if total_seconds else 0
+        self.log('info', f"[BULK] {total_rows} registros en {total_seconds:.2f}s ({rate:,.0f} filas/s)")
+        
+        if total_rows:
+            self._rebuild_derived_data()
+        return stats
+    
+    def _rebuild_derived_data(self):
+        """
+        bulk_create no dispara save()/señales: reconstruir los datos derivados
+        que normalmente se mantienen en Order.save y post_save.
+        """
+        from apps.landing_destinations.search_index import rebuild_search_index
+        from core.revenue_rollups import rebuild_revenue_rollups
+        
+        for name, rebuild in (
+            ('revenue rollups', rebuild_revenue_rollups),
+            ('índice de búsqueda', rebuild_search_index),
+        ):
+            try:
+                rebuild()
+            except Exception as e:
+                logger.exception(f"Error reconstruyendo {name}")
+                self.log('warning', f"No se pudo reconstruir {name}: {e}")
+    
+    def _import_models_per_record(self, input_data, total_models, **options):
+        """
+        Import registro a registro (import_model_enterprise), un modelo por
+        transacción. Es el modo anterior al bulk y el fallback si este falla.
+        
+        Returns:
+            dict {model_path: registros importados}
+        """
+        # Importar modelos - ARQUITECTURA ENTERPRISE
+        # Cada modelo se importa en su propia transacción para máxima resiliencia
+        imported_counts = {}
+        failed_models = {}
+        
+        for idx, model_path in enumerate(self.MODEL_IMPORT_ORDER, 1):
+            model_data = input_data['models'].get(model_path, [])
+            
+            if not model_data:
+                continue
+            
+            self.log('info', f"Importando {model_path}...", model_name=model_path)
+            
+            model_start = datetime.now()
+            
+            # Cada modelo tiene su propia transacción - si falla, los anteriores se mantienen
+            try:
+                with transaction.atomic():
+                    count = self.import_model_enterprise(model_path, model_data, **options)
+                    imported_counts[model_path] = count
+            except Exception as model_error:
+                # Este modelo falló pero continuamos con los demás
+                logger.error(f"Error importando modelo {model_path}: {model_error}")
+                failed_models[model_path] = str(model_error)
+                imported_counts[model_path] = 0
+                # NO re-raise - continuamos con el siguiente modelo
+            
+            model_duration = (datetime.now() - model_start).total_seconds() * 1000
+            
+            self.log(
+                'info',
+                f"Importados {imported_counts.get(model_path, 0)}/{len(model_data)} registros de {model_path}",
+                model_name=model_path,
+                record_count=imported_counts.get(model_path, 0),
+                duration_ms=int(model_duration)
+            )
+            
+            # Actualizar progreso (en su propia mini-transacción)
+            if self.job:
+                try:
+                    with transaction.atomic():
+                        progress = int((idx / total_models) * 90)
+                        self.job.update_progress(progress, f"Importando {model_path}")
+                        self.job.models_completed = idx
+                        self.job.records_processed = sum(imported_counts.values())
+                        self.job.save(update_fields=['models_completed', 'records_processed'])
+                except Exception:
+                    pass  # Silently ignore progress update failures
+        
+        # Resumen de modelos fallidos
+        if failed_models:
+            self.log('warning', f"Modelos con errores: {list(failed_models.keys())}")
+        
+        # === SEGUNDA PASADA: Actualizar FKs circulares ===
+        self.log('info', "Ejecutando segunda pasada para FKs circulares...")
+        circular_updates = self._update_circular_fk_references(input_data)
+        if circular_updates > 0:
+            self.log('info', f"Actualizados {circular_updates} registros con FKs circulares")
+        
+        return imported_counts
     
     def _validate_and_clean_fks(self, model, data: dict) -> dict:
         """
@@ -1234,7 +1319,7 @@ class PlatformImportService:
         # Exportar datos actuales
         export_service = PlatformExportService()
         timestamp = timezone.now().strftime('%Y%m%d-%H%M%S')
-        checkpoint_file = checkpoint_dir / f"{name}-{timestamp}.json.gz"
+        checkpoint_file = checkpoint_dir / f"{name}-{timestamp}.tar"
         
         result = export_service.export_all(
             output_file=str(checkpoint_file),
@@ -1283,13 +1368,17 @@ class PlatformImportService:
         checkpoint_data = self.load_from_file(checkpoint.snapshot_file_path)
         
         # Importar datos del checkpoint (esto restaura el estado anterior)
-        result = self.import_all(
-            checkpoint_data,
-            create_checkpoint=False,  # No crear otro checkpoint durante rollback
-            verify=True,
-            overwrite=True,  # Sobrescribir con datos del checkpoint
-            auto_rollback=False  # Evitar recursión infinita
-        )
+        try:
+            result = self.import_all(
+                checkpoint_data,
+                create_checkpoint=False,  # No crear otro checkpoint durante rollback
+                verify=True,
+                overwrite=True,  # Sobrescribir con datos del checkpoint
+                auto_rollback=False  # Evitar recursión infinita
+            )
+        finally:
+            if isinstance(checkpoint_data, StreamingExportData):
+                checkpoint_data.close()
         
         # Marcar checkpoint como usado
         checkpoint.mark_as_used()
@@ -1346,8 +1435,8 @@ class PlatformImportService:
         # Ambos son válidos, solo validamos que sean diccionarios con datos
         invalid_models = []
         for model_path, records in export_data['models'].items():
-            if records and isinstance(records, list) and len(records) > 0:
-                first_record = records[0]
+            if records and isinstance(records, (list, ModelRecordStream)):
+                first_record = next(iter(records), None)
                 if not isinstance(first_record, dict):
                     invalid_models.append(f"{model_path}: registros no son diccionarios")
                 elif not first_record:  # Diccionario vacío
@@ -1623,6 +1712,13 @@ class PlatformImportService:
         Detecta automáticamente el tipo de archivo por contenido (magic bytes),
         no por extensión.
         
+        Formato 2.0.0 (TAR con manifest + NDJSON por modelo): devuelve un
+        StreamingExportData cuyos modelos se leen registro a registro, sin
+        cargar el export completo en memoria. Llamar a close() al terminar.
+        
+        Formato anterior (JSON único, opcionalmente dentro de un TAR): se carga
+        completo como antes.
+        
         Args:
             file_path: ruta del archivo
             
@@ -1642,36 +1738,17 @@ class PlatformImportService:
         
         is_gzip = magic[:2] == b'\x1f\x8b'
         
-        # Intentar abrir como TAR.GZ primero (detectar por contenido, no extensión)
-        if is_gzip:
+        # Intentar como TAR (comprimido o no) primero: detectar por contenido, no extensión
+        if tarfile.is_tarfile(file_path):
             try:
-                with tarfile.open(file_path, 'r:gz') as tar:
-                    # Buscar el archivo de datos JSON dentro del tar
-                    data_file = None
-                    for member in tar.getmembers():
-                        if member.name == 'data.json.gz' or member.name.endswith('/data.json.gz'):
-                            data_file = member
-                            break
-                        elif member.name == 'data.json' or member.name.endswith('/data.json'):
-                            data_file = member
-                            break
-                    
-                    if data_file:
-                        # Es un TAR.GZ válido con datos
-                        extracted = tar.extractfile(data_file)
-                        if extracted is None:
-                            raise ValueError(f"No se pudo extraer {data_file.name}")
-                        
-                        if data_file.name.endswith('.gz'):
-                            with gzip.open(extracted, 'rt', encoding='utf-8') as f:
-                                return json.load(f)
-                        else:
-                            return json.loads(extracted.read().decode('utf-8'))
+                data = read_export_archive(file_path)
             except tarfile.TarError:
-                # No es un tar, intentar como gzip simple
-                pass
-            
-            # Intentar como gzip simple (JSON comprimido)
+                data = None
+            if data is not None:
+                return data
+        
+        # Intentar como gzip simple (JSON comprimido)
+        if is_gzip:
             try:
                 with gzip.open(file_path, 'rt', encoding='utf-8') as f:
                     return json.load(f)
@@ -0,0 +1,207 @@
+"""
+🚀 ENTERPRISE STREAMING EXPORT FORMAT
+
+Formato de export en streaming (versión 2.0.0). Un único archivo TAR con:
+
+    manifest.json                         metadatos, estadísticas, media_files y
+                                          {modelo: {'file', 'count'}}
+    models/<app_label.Model>.ndjson[.gz]  un registro JSON por línea, en orden de pk
+    media/...                             archivos físicos (opcional)
+
+El manifest va primero para que el lector pueda procesar el archivo en una sola
+pasada. Ni el export ni el import cargan un modelo completo en memoria: se escribe
+y se lee registro a registro.
+
+El formato anterior (un solo JSON con todos los modelos, o un TAR con data.json.gz)
+se sigue leyendo en read_export_file().
+"""
+
+import gzip
+import json
+import shutil
+import tarfile
+import tempfile
+import weakref
+from pathlib import Path
+
+MANIFEST_NAME = 'manifest.json'
+MODELS_DIR = 'models'
+MEDIA_DIR = 'media'
+LEGACY_DATA_NAMES = ('data.json.gz', 'data.json')
+
+
+def model_member_name(model_path, compressed):
+    """Ruta del archivo NDJSON de un modelo dentro del TAR."""
+    suffix = '.ndjson.gz' if compressed else '.ndjson'
+    return f"{MODELS_DIR}/{model_path}{suffix}"
+
+
+def tar_write_mode(output_file):
+    """El TAR se comprime entero solo si la extensión lo pide (.gz / .tgz)."""
+    name = str(output_file)
+    return 'w:gz' if name.endswith(('.gz', '.tgz')) else 'w'
+
+
+class NDJSONWriter:
+    """Escribe registros como NDJSON (opcionalmente gzip) y cuenta las líneas."""
+
+    def __init__(self, path, encoder_cls, compress=True):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.count = 0
+        self._encoder = encoder_cls(ensure_ascii=False, separators=(',', ':'))
+        raw = open(self.path, 'wb')
+        self._file = gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=6) if compress else raw
+        self._raw = raw
+
+    def write(self, record):
+        self._file.write(self._encoder.encode(record).encode('utf-8'))
+        self._file.write(b'\n')
+        self.count += 1
+
+    def close(self):
+        self._file.close()
+        if self._raw is not self._file:
+            self._raw.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ModelRecordStream:
+    """
+    Registros de un modelo leídos bajo demanda desde un archivo NDJSON.
+
+    Se comporta como la lista del formato anterior para el import: es iterable
+    (cada iteración relee el archivo), len() devuelve el count del manifest y
+    es falsy si no hay registros.
+    """
+
+    def __init__(self, path, count):
+        self.path = Path(path)
+        self.count = count
+
+    def _open(self):
+        if self.path.suffix == '.gz':
+            return gzip.open(self.path, 'rt', encoding='utf-8')
+        return open(self.path, 'r', encoding='utf-8')
+
+    def __iter__(self):
+        with self._open() as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def __len__(self):
+        return self.count
+
+    def __bool__(self):
+        return self.count > 0
+
+    def __repr__(self):
+        return f"<ModelRecordStream {self.path.name} ({self.count} registros)>"
+
+
+class StreamingExportData(dict):
+    """
+    Export cargado en modo streaming: mismas claves que el formato anterior
+    ('version', 'export_date', 'models', 'media_files', 'statistics', ...), pero
+    'models' contiene ModelRecordStream respaldados por un directorio temporal.
+
+    close() borra el directorio; si nadie lo llama, se borra al recolectar el objeto.
+    """
+
+    def __init__(self, manifest, workdir):
+        super().__init__(manifest)
+        self.workdir = Path(workdir)
+        self._finalizer = weakref.finalize(self, shutil.rmtree, str(workdir), True)
+
+    def close(self):
+        self._finalizer()
+
+
+def _copy_member(tar, member, target):
+    target.parent.mkdir(parents=True, exist_ok=True)
+    source = tar.extractfile(member)
+    with open(target, 'wb') as dst:
+        shutil.copyfileobj(source, dst, length=1024 * 1024)
+
+
+def _load_legacy_member(tar, member):
+    source = tar.extractfile(member)
+    if source is None:
+        raise ValueError(f"No se pudo extraer {member.name}")
+    if member.name.endswith('.gz'):
+        with gzip.open(source, 'rt', encoding='utf-8') as f:
+            return json.load(f)
+    return json.load(source)
+
+
+def read_export_archive(file_path):
+    """
+    Lee un TAR de export en una sola pasada (modo stream de tarfile).
+
+    Formato 2.0.0: copia los NDJSON de modelos a un directorio temporal (sin
+    descomprimirlos) y devuelve StreamingExportData. Los archivos media/ se
+    ignoran aquí (los extrae PlatformImportService.extract_media_files).
+
+    Formato anterior: devuelve el dict del data.json(.gz) embebido.
+    Devuelve None si el TAR no contiene datos de export.
+    """
+    workdir = None
+    manifest = None
+    extracted = {}
+    try:
+        with tarfile.open(file_path, 'r|*') as tar:
+            for member in tar:
+                if not member.isfile():
+                    continue
+                name = member.name.lstrip('./')
+                base_name = name.rsplit('/', 1)[-1]
+
+                if base_name in LEGACY_DATA_NAMES:
+                    return _load_legacy_member(tar, member)
+
+                if name == MANIFEST_NAME:
+                    manifest = json.load(tar.extractfile(member))
+                    continue
+
+                if name.startswith(f"{MODELS_DIR}/"):
+                    if workdir is None:
+                        workdir = Path(tempfile.mkdtemp(prefix='tuki_import_'))
+                    target = workdir / name
+                    _copy_member(tar, member, target)
+                    extracted[name] = target
+                    continue
+
+                # Los modelos van antes que media/: si ya están todos, no hace
+                # falta descomprimir el resto del archivo.
+                if manifest is not None and len(extracted) >= len(manifest.get('models', {})):
+                    break
+    except Exception:
+        if workdir is not None:
+            shutil.rmtree(workdir, ignore_errors=True)
+        raise
+
+    if manifest is None:
+        if workdir is not None:
+            shutil.rmtree(workdir, ignore_errors=True)
+        return None
+
+    if workdir is None:
+        workdir = Path(tempfile.mkdtemp(prefix='tuki_import_'))
+
+    models = {}
+    for model_path, info in manifest.get('models', {}).items():
+        target = extracted.get(info['file'])
+        if target is None:
+            shutil.rmtree(workdir, ignore_errors=True)
+            raise ValueError(f"Archivo de datos faltante en el export: {info['file']}")
+        models[model_path] = ModelRecordStream(target, info.get('count', 0))
+
+    data = StreamingExportData(manifest, workdir)
+    data['models'] = models
+    return data
@@ -81,3 +81,88 @@ class ExportServiceTestCase(TestCase):
         
         self.assertIsInstance(events_data, list)
         self.assertGreater(len(events_data), 0)
+
+
+class StreamingExportFormatTestCase(TestCase):
+    """Export 2.0.0: manifest + NDJSON por modelo, leído de vuelta en streaming."""
+    
+    def setUp(self):
+        import tempfile
+        from pathlib import Path
+        
+        self.organizer = Organizer.objects.create(
+            name='Stream Organizer',
+            slug='stream-organizer',
+            contact_email='stream@test.com'
+        )
+        self.events = [
+            Event.objects.create(title=f'Event {i}', slug=f'event-{i}', organizer=self.organizer)
+            for i in range(5)
+        ]
+        self.tmp_dir = Path(tempfile.mkdtemp())
+    
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+    
+    def test_keyset_pages_cover_every_record_in_pk_order(self):
+        service = PlatformExportService()
+        records = service.export_model(Event, batch_size=2)
+        
+        ids = [record['id'] for record in records]
+        self.assertEqual(ids, sorted(str(event.id) for event in self.events))
+        self.assertEqual(records[0]['organizer_id'], str(self.organizer.id))
+    
+    def test_fk_columns_are_read_without_extra_queries(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        
+        service = PlatformExportService()
+        with CaptureQueriesContext(connection) as ctx:
+            records = service.export_model(Event, batch_size=100)
+        
+        self.assertEqual(len(records), 5)
+        # Una página + prefetch de M2M; nada por registro
+        self.assertLess(len(ctx.captured_queries), 5)
+    
+    def test_archive_round_trip(self):
+        from apps.migration_system.services import PlatformImportService
+        from apps.migration_system.services.streaming import ModelRecordStream, StreamingExportData
+        
+        for name in ('export.tar', 'export.tar.gz'):
+            output = self.tmp_dir / name
+            result = PlatformExportService().export_all(
+                output_file=str(output),
+                models='organizers.Organizer,events.Event',
+                include_media=False
+            )
+            self.assertEqual(result['statistics']['count_events.Event'], 5)
+            
+            data = PlatformImportService().load_from_file(str(output))
+            self.assertIsInstance(data, StreamingExportData)
+            self.assertEqual(data['version'], PlatformExportService.EXPORT_VERSION)
+            events = data['models']['events.Event']
+            self.assertIsInstance(events, ModelRecordStream)
+            self.assertEqual(len(events), 5)
+            self.assertEqual({r['slug'] for r in events}, {e.slug for e in self.events})
+            self.assertTrue(PlatformImportService().validate_export_format(data))
+            
+            workdir = data.workdir
+            data.close()
+            self.assertFalse(workdir.exists())
+    
+    def test_legacy_json_exports_still_load(self):
+        from apps.migration_system.services import PlatformImportService
+        
+        output = self.tmp_dir / 'legacy.json.gz'
+        legacy = {
+            'version': '1.0.0',
+            'export_date': '2026-01-20T21:00:00Z',
+            'models': {'events.Event': PlatformExportService().export_model(Event)},
+            'statistics': {'total_records': 5},
+        }
+        PlatformExportService().save_to_file(legacy, str(output))
+        
+        data = PlatformImportService().load_from_file(str(output))
+        self.assertEqual(len(data['models']['events.Event']), 5)
+        self.assertEqual(data['models']['events.Event'][0]['id'], str(min(e.id for e in self.events)))
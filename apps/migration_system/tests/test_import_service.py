@@ -43,3 +43,135 @@ class ImportServiceTestCase(TestCase):
         }
         
         self.assertFalse(service.validate_export_format(invalid_data))
+
+
+class BulkImportTestCase(TestCase):
+    """Import por lotes (BulkImportEngine) desde un export 2.0.0."""
+    
+    MODELS = 'organizers.Organizer,events.Event,events.TicketTier,events.Coupon,core.PlatformFlow,events.Order'
+    
+    def setUp(self):
+        import tempfile
+        from datetime import timedelta
+        from decimal import Decimal
+        from pathlib import Path
+        from django.utils import timezone
+        from apps.events.models import Coupon, Event, Order
+        from core.models import PlatformFlow
+        from core.testing import create_event, create_organizer, create_ticket_tier
+        
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        self.organizer = create_organizer()
+        self.events = [
+            create_event(organizer=self.organizer, title=f'Event {i}', slug=f'event-{i}', pricing_mode='complex')
+            for i in range(3)
+        ]
+        self.tiers = [create_ticket_tier(event, name='General', price=Decimal('5000')) for event in self.events]
+        self.coupon = Coupon.objects.create(
+            code='BULK10', organizer=self.organizer, discount_type='percentage', discount_value=Decimal('10')
+        )
+        self.coupon.ticket_tiers.set(self.tiers[:2])
+        
+        # FK circular: Order.flow -> PlatformFlow y PlatformFlow.primary_order -> Order
+        self.flow = PlatformFlow.objects.create(flow_type='ticket_checkout', organizer=self.organizer)
+        self.order = Order.objects.create(
+            event=self.events[0], email='buyer@test.com', first_name='Buyer', last_name='Test',
+            subtotal=Decimal('5000'), service_fee=Decimal('0'), total=Decimal('5000'), flow=self.flow
+        )
+        self.flow.primary_order = self.order
+        self.flow.save(update_fields=['primary_order'])
+        
+        self.created_at = timezone.now() - timedelta(days=40)
+        Event.objects.filter(pk=self.events[0].pk).update(created_at=self.created_at)
+        
+        self.export_file = self.tmp_dir / 'export.tar'
+        PlatformExportService().export_all(
+            output_file=str(self.export_file), models=self.MODELS, include_media=False
+        )
+    
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+    
+    def _wipe(self):
+        from apps.events.models import Order
+        from core.models import PlatformFlow
+        Order.objects.all().delete()
+        PlatformFlow.objects.all().delete()
+        self.organizer.delete()
+    
+    def _import(self, **options):
+        options.setdefault('create_checkpoint', False)
+        options.setdefault('verify', False)
+        return PlatformImportService().import_all(str(self.export_file), **options)
+    
+    def test_restores_snapshot_with_circular_fks_m2m_and_timestamps(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from apps.events.models import Coupon, Event, Order
+        from core.models import PlatformFlow
+        
+        self._wipe()
+        with CaptureQueriesContext(connection) as ctx:
+            result = self._import()
+        
+        self.assertEqual(result['imported_counts']['events.Event'], 3)
+        self.assertEqual(result['bulk_stats']['events.TicketTier']['imported'], 3)
+        self.assertIn('rows_per_sec', result['bulk_stats']['events.Order'])
+        self.assertTrue(any('SET CONSTRAINTS ALL DEFERRED' in q['sql'] for q in ctx.captured_queries))
+        
+        order = Order.objects.get(pk=self.order.pk)
+        self.assertEqual(order.flow_id, self.flow.pk)
+        self.assertEqual(PlatformFlow.objects.get(pk=self.flow.pk).primary_order_id, self.order.pk)
+        self.assertEqual(
+            set(Coupon.objects.get(pk=self.coupon.pk).ticket_tiers.values_list('pk', flat=True)),
+            {tier.pk for tier in self.tiers[:2]}
+        )
+        self.assertEqual(Event.objects.get(pk=self.events[0].pk).created_at, self.created_at)
+    
+    def test_existing_rows_are_skipped_or_overwritten(self):
+        from apps.events.models import Event
+        
+        Event.objects.filter(pk=self.events[1].pk).update(title='Changed')
+        result = self._import()
+        self.assertEqual(result['bulk_stats']['events.Event']['skipped'], 3)
+        self.assertEqual(Event.objects.get(pk=self.events[1].pk).title, 'Changed')
+        
+        result = self._import(overwrite=True)
+        self.assertEqual(result['imported_counts']['events.Event'], 3)
+        self.assertEqual(Event.objects.get(pk=self.events[1].pk).title, 'Event 1')
+    
+    def test_unique_key_conflicts_are_skipped(self):
+        from apps.events.models import Coupon
+        
+        self._wipe()
+        from core.testing import create_organizer
+        Coupon.objects.create(
+            code='BULK10', organizer=create_organizer(name='Other', slug='other'),
+            discount_type='fixed', discount_value=1
+        )
+        result = self._import()
+        
+        self.assertEqual(result['bulk_stats']['events.Coupon']['skipped'], 1)
+        self.assertEqual(Coupon.objects.get(code='BULK10').discount_type, 'fixed')
+        self.assertEqual(result['imported_counts']['events.Event'], 3)
+    
+    def test_query_count_does_not_grow_with_rows(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from apps.events.models import Event
+        
+        Event.objects.bulk_create([
+            Event(title=f'Bulk {i}', slug=f'bulk-{i}', organizer=self.organizer) for i in range(200)
+        ])
+        PlatformExportService().export_all(
+            output_file=str(self.export_file), models='organizers.Organizer,events.Event', include_media=False
+        )
+        self._wipe()
+        
+        with CaptureQueriesContext(connection) as ctx:
+            result = self._import(batch_size=500)
+        
+        self.assertEqual(result['imported_counts']['events.Event'], 203)
+        event_queries = [q for q in ctx.captured_queries if '"events_event"' in q['sql']]
+        self.assertLess(len(event_queries), 15)
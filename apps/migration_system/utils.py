@@ -386,6 +386,7 @@ def get_all_models_in_order():
         'terminal.TerminalExcelUpload',
         'terminal.TerminalAdvertisingSpace',
         'terminal.TerminalAdvertisingInteraction',
+        'terminal.TerminalAdvertisingDailyStats',
         'terminal.TerminalDestinationExperienceConfig',
         
         # === NIVEL 17: Payments (si existen) ===
@@ -1,6 +1,7 @@
 """Signals for the organizers app."""
 
-from django.db.models.signals import post_save, pre_save
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 from django.utils.text import slugify
 from django.contrib.auth import get_user_model
@@ -23,4 +24,12 @@ def create_organizer_slug(sender, instance, **kwargs):
             slug = f"{base_slug}-{counter}"
             counter += 1
         
-        instance.slug = slug
\ No newline at end of file
+        instance.slug = slug
+
+
+@receiver([post_save, post_delete], sender=Organizer)
+def invalidate_platform_analytics(sender, instance, **kwargs):
+    """Organizer status, modules and fee rate are part of the cached SuperAdmin organizer sales."""
+    from core import platform_analytics
+
+    transaction.on_commit(platform_analytics.invalidate)
@@ -392,8 +392,10 @@ class OTPService:
                     logo_negro.add_header('Content-Disposition', 'inline', filename='logo-negro.png')
                     email.attach(logo_negro)
             
-            # Enviar email
-            email.send(fail_silently=False)
+            # Enviar email por una conexión SMTP persistente del pool
+            from core.smtp_pool import send_messages, smtp_connection
+            with smtp_connection() as connection:
+                send_messages(connection, [email])
 
             logger.info(f"📧 [OTP EMAIL] Sent OTP email for purpose {otp.purpose} to {otp.email}")
             return (True, None)
@@ -877,12 +877,15 @@ class DjangoORMClient:
             
             # 🔥 FORZAR fechas de WooCommerce con SQL directo (bypass auto_now/auto_now_add)
             from django.db import connection
+            from core.revenue_rollups import tracking_order_revenue
             with connection.cursor() as cursor:
-                cursor.execute("""
-                    UPDATE events_order 
-                    SET created_at = %s, updated_at = %s 
-                    WHERE id = %s
-                """, [order_date, order_date, str(order.id)])
+                # Mover la orden al bucket de rollups de su fecha original (el SQL no pasa por Order.save)
+                with tracking_order_revenue(order.id):
+                    cursor.execute("""
+                        UPDATE events_order 
+                        SET created_at = %s, updated_at = %s 
+                        WHERE id = %s
+                    """, [order_date, order_date, str(order.id)])
                 logger.info(f"📅 Fechas forzadas a: {order_date}")
                 
                 # Verificar que se guardó correctamente
@@ -1485,6 +1488,9 @@ class EventMigrator:
             # ✅ ACTUALIZAR PRECIO PROMEDIO DEL TICKET TIER
             self._update_ticket_tier_average_price(event['id'])
             
+            # ✅ RECALCULAR ROLLUPS DE INGRESOS (bulk_create y SQL directo no pasan por Order.save)
+            self._rebuild_revenue_rollups(event['id'])
+            
             # Estadísticas finales
             total_orders = len(migrated_orders) + len(updated_orders)
             total_tickets = len(migrated_tickets) + len(updated_tickets)
@@ -1556,6 +1562,18 @@ class EventMigrator:
         except Exception as e:
             logger.warning(f"⚠️ No se pudo actualizar precio promedio del TicketTier: {e}")
     
+    def _rebuild_revenue_rollups(self, event_id: str):
+        """
+        Recalcula los rollups de ingresos del evento con las órdenes ya migradas
+        """
+        try:
+            from core.revenue_rollups import rebuild_revenue_rollups
+            
+            result = rebuild_revenue_rollups(event_id=event_id)
+            logger.info(f"💰 Rollups de ingresos recalculados: {result['rows']} filas de {result['orders']} órdenes")
+        except Exception as e:
+            logger.warning(f"⚠️ No se pudieron recalcular los rollups de ingresos: {e}")
+    
     def _cleanup_existing_event_data(self, event_id: str):
         """
         🚀 BLANQUEO TOTAL: Elimina todas las órdenes y tickets existentes del evento
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.8 on 2026-10-16 21:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('terminal', '0002_terminaladvertisinginteraction_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TerminalAdvertisingDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='Created at')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated at')),
+                ('date', models.DateField(verbose_name='date')),
+                ('views', models.PositiveIntegerField(default=0, verbose_name='views')),
+                ('clicks', models.PositiveIntegerField(default=0, verbose_name='clicks')),
+                ('impressions', models.PositiveIntegerField(default=0, verbose_name='impressions')),
+                ('advertising_space', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='terminal.terminaladvertisingspace', verbose_name='advertising space')),
+            ],
+            options={
+                'verbose_name': 'Terminal Advertising Daily Stats',
+                'verbose_name_plural': 'Terminal Advertising Daily Stats',
+                'indexes': [models.Index(fields=['date'], name='terminal_te_date_e79bbd_idx')],
+                'unique_together': {('advertising_space', 'date')},
+            },
+        ),
+    ]
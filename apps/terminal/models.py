@@ -665,6 +665,32 @@ class TerminalAdvertisingInteraction(TimeStampedModel):
         return f"{self.advertising_space} - {self.get_interaction_type_display()} - {self.created_at}"
 
 
+class TerminalAdvertisingDailyStats(TimeStampedModel):
+    """Per-day interaction counters of an advertising space (updated by the analytics ingestion drain)."""
+    
+    advertising_space = models.ForeignKey(
+        TerminalAdvertisingSpace,
+        on_delete=models.CASCADE,
+        related_name='daily_stats',
+        verbose_name=_('advertising space'),
+    )
+    date = models.DateField(_('date'))
+    views = models.PositiveIntegerField(_('views'), default=0)
+    clicks = models.PositiveIntegerField(_('clicks'), default=0)
+    impressions = models.PositiveIntegerField(_('impressions'), default=0)
+    
+    class Meta:
+        verbose_name = _('Terminal Advertising Daily Stats')
+        verbose_name_plural = _('Terminal Advertising Daily Stats')
+        unique_together = ['advertising_space', 'date']
+        indexes = [
+            models.Index(fields=['date']),
+        ]
+    
+    def __str__(self):
+        return f"{self.advertising_space} - {self.date}"
+
+
 class TerminalDestinationExperienceConfig(BaseModel):
     """Configuration of experiences for each destination."""
     
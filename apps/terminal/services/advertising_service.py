@@ -4,6 +4,7 @@ import logging
 from django.utils import timezone
 from django.db.models import Q
 
+from core.analytics_ingest import record_ad_interaction
 from ..models import TerminalAdvertisingSpace, TerminalAdvertisingInteraction
 
 logger = logging.getLogger(__name__)
@@ -15,11 +16,16 @@ def track_interaction(
     user_ip: str = None,
     user_agent: str = None,
     referrer: str = None,
-    destination: str = None
+    destination: str = None,
+    advertising_space: TerminalAdvertisingSpace = None
 ) -> TerminalAdvertisingInteraction:
     """
     Track an interaction with an advertising space.
     
+    The row is written through core.analytics_ingest: inserted immediately, or
+    queued and bulk-inserted by the drain task when ANALYTICS_INGEST_BUFFERED is on
+    (the returned instance then has no id yet).
+    
     Args:
         advertising_space_id: UUID of the advertising space
         interaction_type: 'view', 'click', or 'impression'
@@ -27,24 +33,26 @@ def track_interaction(
         user_agent: User agent string (optional)
         referrer: Referrer URL (optional)
         destination: Destination context (optional)
+        advertising_space: Already loaded space, skips the lookup (optional)
     
     Returns:
         TerminalAdvertisingInteraction instance
     """
-    try:
-        advertising_space = TerminalAdvertisingSpace.objects.get(id=advertising_space_id)
-    except TerminalAdvertisingSpace.DoesNotExist:
-        logger.error(f"Advertising space not found: {advertising_space_id}")
-        raise ValueError(f"Advertising space not found: {advertising_space_id}")
-    
-    interaction = TerminalAdvertisingInteraction.objects.create(
+    if advertising_space is None:
+        try:
+            advertising_space = TerminalAdvertisingSpace.objects.get(id=advertising_space_id)
+        except TerminalAdvertisingSpace.DoesNotExist:
+            logger.error(f"Advertising space not found: {advertising_space_id}")
+            raise ValueError(f"Advertising space not found: {advertising_space_id}")
+    
+    interaction = record_ad_interaction(TerminalAdvertisingInteraction(
         advertising_space=advertising_space,
         interaction_type=interaction_type,
         user_ip=user_ip,
         user_agent=user_agent,
         referrer=referrer,
         destination=destination
-    )
+    ))
     
     logger.debug(f"Tracked {interaction_type} for advertising space {advertising_space_id}")
     return interaction
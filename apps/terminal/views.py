@@ -481,10 +481,13 @@ class TerminalAdvertisingSpaceViewSet(viewsets.ModelViewSet):
                 user_ip=user_ip,
                 user_agent=user_agent,
                 referrer=referrer,
-                destination=destination
+                destination=destination,
+                advertising_space=space
             )
             serializer = TerminalAdvertisingInteractionSerializer(interaction)
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
+            # Buffered interactions are persisted by the analytics drain task
+            response_status = status.HTTP_201_CREATED if interaction.pk else status.HTTP_202_ACCEPTED
+            return Response(serializer.data, status=response_status)
         except Exception as e:
             logger.error(f"Error tracking interaction: {e}", exc_info=True)
             return Response(
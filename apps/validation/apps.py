@@ -5,3 +5,6 @@ class ValidationConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.validation'
     verbose_name = '🚀 Enterprise Validation System'
+
+    def ready(self):
+        import apps.validation.signals  # noqa
@@ -0,0 +1,576 @@
+"""
+🚀 ENTERPRISE: Scanner validation engine.
+
+The door-open hot path (``validate_ticket_enterprise`` / ``checkin_ticket_enterprise``)
+used to run in a transaction per scan: session lookup, a three-table join to find the
+ticket, a TicketValidationLog INSERT and a full ``session.save()``.
+
+With ``VALIDATION_ENGINE=redis``:
+
+- Starting a validator session warms a per-event index in Redis: one hash per event,
+  ``ticket_number -> {id, status, check-in state, tier, order}``, built with a single
+  query. Scans resolve the ticket with one HGET (tickets sold after warm-up are read
+  from the database once and added).
+- The session (and the event data the response needs) is cached next to it.
+- Validation logs are appended to a Redis list and bulk-inserted by
+  ``flush_validation_logs`` (Celery beat, every few seconds).
+
+In both modes session counters are incremented with ``F()`` expressions and check-in
+is a conditional UPDATE (only an active ticket not yet checked in), so two scanners
+can never admit the same ticket twice. Ticket saves made elsewhere (manual check-in,
+refunds) refresh the index entry through a post_save signal.
+
+When the engine is ``database`` (default) or Redis cannot be reached, lookups go to the
+database and logs are written inline.
+"""
+
+import json
+import logging
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from core.redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'tuki:validation'
+
+# Scans are accepted from this long before the event starts
+EARLY_ENTRY_WINDOW = timedelta(hours=2)
+
+TICKET_VALUES = (
+    'id',
+    'ticket_number',
+    'status',
+    'check_in_status',
+    'check_in_time',
+    'first_name',
+    'last_name',
+    'email',
+    'form_data',
+    'order_item__ticket_tier__name',
+    'order_item__ticket_tier__price',
+    'order_item__order_id',
+    'order_item__order__created_at',
+    'order_item__order__total',
+)
+
+# KEYS[1] = queue. ARGV[1] = batch size.
+POP_BATCH_SCRIPT = """
+local items = redis.call('LRANGE', KEYS[1], 0, tonumber(ARGV[1]) - 1)
+if #items > 0 then
+    redis.call('LTRIM', KEYS[1], #items, -1)
+end
+return items
+"""
+
+
+def _engine_settings():
+    return getattr(settings, 'VALIDATION_ENGINE', {})
+
+
+_index = None
+
+
+def get_ticket_index():
+    """Return the configured TicketIndex, or None when the database path is active."""
+    global _index
+    if _engine_settings().get('ENGINE', 'database') != 'redis':
+        return None
+    if _index is None:
+        _index = TicketIndex(get_redis_client(_engine_settings().get('REDIS_URL')))
+    return _index
+
+
+def _isoformat(value):
+    return value.isoformat() if value else None
+
+
+def ticket_entry(row):
+    """Index entry for a ``Ticket.objects.values(*TICKET_VALUES)`` row."""
+    return {
+        'id': str(row['id']),
+        'ticket_number': row['ticket_number'],
+        'status': row['status'],
+        'check_in_status': row['check_in_status'],
+        'check_in_time': _isoformat(row['check_in_time']),
+        'first_name': row['first_name'],
+        'last_name': row['last_name'],
+        'email': row['email'],
+        'form_data': row['form_data'] or {},
+        'tier_name': row['order_item__ticket_tier__name'],
+        'tier_price': float(row['order_item__ticket_tier__price']),
+        'order_id': str(row['order_item__order_id']),
+        'order_created_at': _isoformat(row['order_item__order__created_at']),
+        'order_total': float(row['order_item__order__total']),
+    }
+
+
+def session_snapshot(session):
+    """What a scan needs from the session and its event, without touching the database."""
+    event = session.event
+    return {
+        'id': str(session.id),
+        'user_id': session.user_id,
+        'validator_name': session.validator_name,
+        'event': {
+            'id': str(event.id),
+            'title': event.title,
+            'start_date': _isoformat(event.start_date),
+            'end_date': _isoformat(event.end_date),
+            'location': event.location.name if event.location else None,
+        },
+    }
+
+
+def _event_tickets(event_id):
+    from apps.events.models import Ticket
+
+    return Ticket.objects.filter(order_item__order__event_id=event_id).values(*TICKET_VALUES)
+
+
+class TicketIndex:
+    """Per-event ticket lookup, cached validator sessions and the validation log queue in Redis."""
+
+    def __init__(self, client, prefix=KEY_PREFIX):
+        self.client = client
+        self.prefix = prefix
+        self._pop_batch = client.register_script(POP_BATCH_SCRIPT)
+
+    # ------------------------------------------------------------------
+    # Keys
+    # ------------------------------------------------------------------
+
+    def tickets_key(self, event_id):
+        return f'{self.prefix}:event:{event_id}:tickets'
+
+    def warm_lock_key(self, event_id):
+        return f'{self.prefix}:event:{event_id}:warming'
+
+    def session_key(self, session_id):
+        return f'{self.prefix}:session:{session_id}'
+
+    @property
+    def warm_events_key(self):
+        return f'{self.prefix}:warm_events'
+
+    @property
+    def logs_key(self):
+        return f'{self.prefix}:logs'
+
+    @property
+    def ttl(self):
+        return _engine_settings().get('INDEX_TTL_SECONDS', 86400)
+
+    # ------------------------------------------------------------------
+    # Ticket index
+    # ------------------------------------------------------------------
+
+    def warm(self, event_id, force=False):
+        """Build the event's ticket hash with one query. Returns the number of tickets indexed."""
+        key = self.tickets_key(event_id)
+        if not force and self.client.exists(key):
+            return 0
+        # Validators starting together: the first one builds, the others use the database until it is ready
+        if not self.client.set(self.warm_lock_key(event_id), 1, nx=True, ex=120):
+            return 0
+        try:
+            building_key = f'{key}:building'
+            self.client.delete(building_key)
+            count = 0
+            pipe = self.client.pipeline(transaction=False)
+            for row in _event_tickets(event_id).iterator(chunk_size=2000):
+                pipe.hset(building_key, row['ticket_number'], json.dumps(ticket_entry(row)))
+                count += 1
+                if count % 1000 == 0:
+                    pipe.execute()
+            # Empty hashes do not exist in Redis: keep a marker so the event still reads as warm
+            pipe.hset(building_key, '', '{}')
+            pipe.rename(building_key, key)
+            pipe.expire(key, self.ttl)
+            pipe.sadd(self.warm_events_key, str(event_id))
+            pipe.expire(self.warm_events_key, self.ttl)
+            pipe.execute()
+            return count
+        finally:
+            self.client.delete(self.warm_lock_key(event_id))
+
+    def is_warm(self, event_id):
+        return bool(self.client.exists(self.tickets_key(event_id)))
+
+    def has_warm_events(self):
+        return bool(self.client.scard(self.warm_events_key))
+
+    def is_warm_event(self, event_id):
+        return bool(self.client.sismember(self.warm_events_key, str(event_id)))
+
+    def get_entry(self, event_id, ticket_number):
+        raw = self.client.hget(self.tickets_key(event_id), ticket_number)
+        return json.loads(raw) if raw else None
+
+    def put_entry(self, event_id, entry):
+        key = self.tickets_key(event_id)
+        # Only refresh warm indexes: HSET on a missing key would create a partial index
+        if self.client.exists(key):
+            self.client.hset(key, entry['ticket_number'], json.dumps(entry))
+
+    def update_entry(self, event_id, ticket_number, **changes):
+        entry = self.get_entry(event_id, ticket_number)
+        if entry is not None:
+            entry.update(changes)
+            self.put_entry(event_id, entry)
+
+    def drop(self, event_id):
+        self.client.delete(self.tickets_key(event_id))
+        self.client.srem(self.warm_events_key, str(event_id))
+
+    # ------------------------------------------------------------------
+    # Sessions
+    # ------------------------------------------------------------------
+
+    def get_session(self, session_id):
+        raw = self.client.get(self.session_key(session_id))
+        return json.loads(raw) if raw else None
+
+    def put_session(self, snapshot):
+        self.client.set(self.session_key(snapshot['id']), json.dumps(snapshot), ex=self.ttl)
+
+    def drop_session(self, session_id):
+        self.client.delete(self.session_key(session_id))
+
+    # ------------------------------------------------------------------
+    # Validation logs
+    # ------------------------------------------------------------------
+
+    def push_log(self, record):
+        return self.client.rpush(self.logs_key, json.dumps(record, default=str))
+
+    def pending_logs(self):
+        return self.client.llen(self.logs_key)
+
+    def flush_logs(self, batch_size=None, max_batches=None):
+        """
+        Pop queued logs and bulk-insert them. A batch that fails is pushed back to the
+        head of the queue (order preserved) and the error re-raised. Returns the count.
+        """
+        batch_size = batch_size or _engine_settings().get('LOG_BATCH_SIZE', 1000)
+        persisted = 0
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            raw_records = self._pop_batch(keys=[self.logs_key], args=[batch_size])
+            if not raw_records:
+                break
+            try:
+                persist_logs([json.loads(r) for r in raw_records])
+            except Exception:
+                self.client.lpush(self.logs_key, *reversed(raw_records))
+                raise
+            persisted += len(raw_records)
+            batches += 1
+        return persisted
+
+
+def persist_logs(records):
+    """Bulk-insert validation log records; tickets or sessions deleted meanwhile are dropped."""
+    from apps.events.models import Ticket
+    from apps.validation.models import TicketValidationLog, ValidatorSession
+
+    if not records:
+        return []
+    session_ids = {str(pk) for pk in ValidatorSession.objects.filter(
+        id__in={r['validator_session_id'] for r in records}
+    ).values_list('id', flat=True)}
+    ticket_ids = {str(pk) for pk in Ticket.objects.filter(
+        id__in={r['ticket_id'] for r in records if r.get('ticket_id')}
+    ).values_list('id', flat=True)}
+
+    logs = []
+    for record in records:
+        if record['validator_session_id'] not in session_ids:
+            continue
+        if record.get('ticket_id') and record['ticket_id'] not in ticket_ids:
+            record['ticket_id'] = None
+        logs.append(TicketValidationLog(**record))
+    return TicketValidationLog.objects.bulk_create(logs, batch_size=500)
+
+
+def flush_validation_logs():
+    """Persist queued validation logs (no-op on the database engine)."""
+    index = get_ticket_index()
+    if index is None:
+        return 0
+    return index.flush_logs()
+
+
+# ============================================================================
+# Hot path
+# ============================================================================
+
+def _safe(call, *args, **kwargs):
+    """Run a Redis call; on connection errors log and return None (database fallback)."""
+    try:
+        return call(*args, **kwargs)
+    except Exception as e:
+        logger.warning(f"⚠️ [VALIDATION] Redis unavailable, using database path: {e}")
+        return None
+
+
+def warm_event_index(event):
+    """Warm the event's ticket index (Redis engine only). Returns tickets indexed, or None."""
+    index = get_ticket_index()
+    if index is None:
+        return None
+    return _safe(index.warm, event.id)
+
+
+def remember_session(session):
+    index = get_ticket_index()
+    if index is not None:
+        _safe(index.put_session, session_snapshot(session))
+
+
+def forget_session(session_id):
+    index = get_ticket_index()
+    if index is not None:
+        _safe(index.drop_session, session_id)
+
+
+def load_session(session_id, user_id):
+    """Active session snapshot for this validator, or None."""
+    from apps.validation.models import ValidatorSession
+
+    index = get_ticket_index()
+    if index is not None:
+        snapshot = _safe(index.get_session, session_id)
+        if snapshot is not None:
+            return snapshot if snapshot['user_id'] == user_id else None
+
+    session = ValidatorSession.objects.select_related('event__location').filter(
+        id=session_id, user_id=user_id, is_active=True
+    ).first()
+    if session is None:
+        return None
+    snapshot = session_snapshot(session)
+    if index is not None:
+        _safe(index.put_session, snapshot)
+    return snapshot
+
+
+def lookup_ticket(event_id, ticket_number):
+    """Index entry for a ticket of the event: Redis first, then the database."""
+    index = get_ticket_index()
+    if index is not None:
+        entry = _safe(index.get_entry, event_id, ticket_number)
+        if entry is not None:
+            return entry
+
+    row = _event_tickets(event_id).filter(ticket_number=ticket_number).first()
+    if row is None:
+        return None
+    entry = ticket_entry(row)
+    if index is not None:
+        # Ticket sold after the index was warmed
+        _safe(index.put_entry, event_id, entry)
+    return entry
+
+
+def record_log(session_id, action, status, message, ticket_id=None, **fields):
+    """Queue a TicketValidationLog (inserted inline on the database engine)."""
+    from apps.validation.models import TicketValidationLog
+
+    record = {
+        'id': str(uuid.uuid4()),
+        'ticket_id': str(ticket_id) if ticket_id else None,
+        'validator_session_id': str(session_id),
+        'action': action,
+        'status': status,
+        'message': message,
+        **fields,
+    }
+    index = get_ticket_index()
+    # push_log returns the queue length; None means Redis failed and the log is written inline
+    if index is not None and _safe(index.push_log, record) is not None:
+        return
+    TicketValidationLog.objects.create(**record)
+
+
+def _increment_session(session_id, **counters):
+    from apps.validation.models import ValidatorSession
+
+    ValidatorSession.objects.filter(id=session_id).update(
+        **{name: F(name) + amount for name, amount in counters.items()}
+    )
+
+
+def _ticket_payload(entry):
+    return {
+        'ticket_number': entry['ticket_number'],
+        'attendee_name': f"{entry['first_name']} {entry['last_name']}",
+        'status': entry['status'],
+        'check_in_status': entry['check_in_status'],
+    }
+
+
+def validate_scan(session, ticket_number, qr_data='', scan_time_ms=0, device_location=None):
+    """
+    Validate a scanned ticket for the session's event. Returns the response payload
+    (same shape as before); nothing is written except the session counters and the log.
+    """
+    event = session['event']
+    scan_time_ms = int(scan_time_ms or 0)
+    log_fields = {'scan_time_ms': scan_time_ms, 'qr_data': qr_data or '', 'device_location': device_location or {}}
+
+    entry = lookup_ticket(event['id'], ticket_number)
+    if entry is None:
+        record_log(session['id'], 'validate', 'error', f'Ticket no encontrado: {ticket_number}', **log_fields)
+        _increment_session(session['id'], total_scans=1, failed_validations=1, total_validation_time_ms=scan_time_ms)
+        return {
+            'valid': False,
+            'error': 'TICKET_NOT_FOUND',
+            'message': 'Ticket no encontrado o no pertenece a este evento'
+        }
+
+    now = timezone.now()
+    validation_errors = []
+    if entry['status'] != 'active':
+        validation_errors.append(f"Ticket no activo (estado: {entry['status']})")
+    if entry['check_in_status'] == 'checked_in':
+        validation_errors.append(f"Ticket ya ingresado el {entry['check_in_time']}")
+    end_date = parse_datetime(event['end_date']) if event['end_date'] else None
+    if end_date and now > end_date:
+        validation_errors.append('El evento ya terminó')
+    start_date = parse_datetime(event['start_date']) if event['start_date'] else None
+    if start_date and now < start_date - EARLY_ENTRY_WINDOW:
+        validation_errors.append('Muy temprano para ingresar')
+
+    if validation_errors:
+        error_message = '; '.join(validation_errors)
+        record_log(session['id'], 'validate', 'error', error_message, ticket_id=entry['id'], **log_fields)
+        _increment_session(session['id'], total_scans=1, failed_validations=1, total_validation_time_ms=scan_time_ms)
+        return {
+            'valid': False,
+            'error': 'VALIDATION_FAILED',
+            'message': error_message,
+            'ticket_info': _ticket_payload(entry),
+        }
+
+    record_log(session['id'], 'validate', 'success', 'Ticket validado correctamente', ticket_id=entry['id'], **log_fields)
+    _increment_session(session['id'], total_scans=1, successful_validations=1, total_validation_time_ms=scan_time_ms)
+    return {
+        'valid': True,
+        'message': 'Ticket válido - Listo para check-in',
+        'ticket': {
+            'id': entry['id'],
+            'ticket_number': entry['ticket_number'],
+            'attendee_name': f"{entry['first_name']} {entry['last_name']}",
+            'email': entry['email'],
+            'status': entry['status'],
+            'check_in_status': entry['check_in_status'],
+            'tier_name': entry['tier_name'],
+            'tier_price': entry['tier_price'],
+            'form_data': entry['form_data'],
+            'order_info': {
+                'order_id': entry['order_id'],
+                'purchase_date': entry['order_created_at'],
+                'total_amount': entry['order_total'],
+            }
+        },
+        'event': {
+            'id': event['id'],
+            'title': event['title'],
+            'start_date': event['start_date'],
+            'location': event['location'],
+        },
+        'validation_info': {
+            'validator_name': session['validator_name'],
+            'validation_time': now,
+            'scan_time_ms': scan_time_ms,
+        }
+    }
+
+
+def check_in_ticket(session, ticket_id, user, notes='', device_location=None):
+    """
+    Check a ticket in with one conditional UPDATE. Returns ``(payload, ok)``; a ticket
+    already checked in (by any scanner) or not active is rejected.
+    """
+    from apps.events.models import Ticket
+    from apps.validation.models import TicketNote
+
+    event_id = session['event']['id']
+    now = timezone.now()
+    tickets = Ticket.objects.filter(id=ticket_id, order_item__order__event_id=event_id)
+    updated = tickets.filter(status='active').exclude(check_in_status='checked_in').update(
+        check_in_status='checked_in',
+        checked_in=True,  # Legacy field
+        check_in_time=now,
+        check_in_by=user,
+        status='used',
+        updated_at=now,
+    )
+    row = tickets.values('id', 'ticket_number', 'first_name', 'last_name', 'check_in_status', 'check_in_time').first()
+    if row is None:
+        raise Ticket.DoesNotExist(f'Ticket {ticket_id} not found for this event')
+    if not updated:
+        return {
+            'success': False,
+            'message': f"Ticket ya tiene check-in desde {row['check_in_time']}"
+            if row['check_in_status'] == 'checked_in' else 'Ticket no activo',
+        }, False
+
+    mark_checked_in(event_id, row['ticket_number'], now)
+    _increment_session(session['id'], tickets_checked_in=1)
+    record_log(
+        session['id'], 'check_in', 'success', f"Check-in realizado por {session['validator_name']}",
+        ticket_id=row['id'], device_location=device_location or {},
+        metadata={'notes': notes} if notes else {},
+    )
+    if notes:
+        TicketNote.objects.create(
+            ticket_id=row['id'], user=user, validator_session_id=session['id'], content=notes, note_type='check_in'
+        )
+
+    return {
+        'success': True,
+        'message': 'Check-in realizado exitosamente',
+        'ticket': {
+            'id': row['id'],
+            'ticket_number': row['ticket_number'],
+            'attendee_name': f"{row['first_name']} {row['last_name']}",
+            'check_in_status': 'checked_in',
+            'check_in_time': now,
+            'checked_in_by': session['validator_name'],
+        }
+    }, True
+
+
+def mark_checked_in(event_id, ticket_number, check_in_time):
+    """Reflect a check-in made with a queryset UPDATE (no post_save) in the event index."""
+    index = get_ticket_index()
+    if index is not None:
+        _safe(index.update_entry, event_id, ticket_number,
+              status='used', check_in_status='checked_in', check_in_time=_isoformat(check_in_time))
+
+
+def refresh_ticket(ticket):
+    """Re-index a saved ticket if its event has a warm index (post_save signal)."""
+    index = get_ticket_index()
+    if index is None or not _safe(index.has_warm_events):
+        return
+    row = _event_tickets_for_ticket(ticket.id)
+    if row is None:
+        return
+    event_id = row.pop('order_item__order__event_id')
+    if _safe(index.is_warm_event, event_id):
+        _safe(index.put_entry, event_id, ticket_entry(row))
+
+
+def _event_tickets_for_ticket(ticket_id):
+    from apps.events.models import Ticket
+
+    return Ticket.objects.filter(id=ticket_id).values(*TICKET_VALUES, 'order_item__order__event_id').first()
@@ -0,0 +1,131 @@
+"""
+🚀 ENTERPRISE COMMAND: Benchmark scanner validation.
+
+Runs N scans (random tickets of the event, so both valid and already-used tickets)
+through apps.validation.engine for a throwaway validator session, first on the
+database path and then on the Redis ticket index, and reports latency percentiles
+and queries per scan. The session and its logs are deleted afterwards.
+
+Usage:
+    python manage.py benchmark_scan --event <event_id>
+    python manage.py benchmark_scan --event <event_id> --scans 5000 --user <user_id>
+"""
+
+import contextlib
+import random
+import statistics
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.events.models import Event, Ticket
+from apps.validation import engine
+from apps.validation.engine import TicketIndex
+from apps.validation.models import ValidatorSession
+from core.redis_client import get_redis_client
+
+
+@contextlib.contextmanager
+def engine_index(index):
+    """Force get_ticket_index() to return ``index`` (None = database path) inside the block."""
+    original = engine.get_ticket_index
+    engine.get_ticket_index = lambda: index
+    try:
+        yield
+    finally:
+        engine.get_ticket_index = original
+
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class Command(BaseCommand):
+    help = '🚀 ENTERPRISE: Benchmark scanner validation (database vs Redis ticket index)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--event', type=str, required=True, help='Event id')
+        parser.add_argument('--scans', type=int, default=2000, help='Scans per engine')
+        parser.add_argument('--user', type=int, default=None, help='Validator user id (default: first superuser)')
+
+    def handle(self, *args, **options):
+        event = Event.objects.select_related('organizer', 'location').filter(id=options['event']).first()
+        if event is None:
+            raise CommandError(f"Event {options['event']} not found")
+        numbers = list(
+            Ticket.objects.filter(order_item__order__event=event).values_list('ticket_number', flat=True)
+        )
+        if not numbers:
+            raise CommandError('Event has no tickets')
+
+        User = get_user_model()
+        user = User.objects.filter(id=options['user']).first() if options['user'] else \
+            User.objects.filter(is_superuser=True).first()
+        if user is None:
+            raise CommandError('No validator user; pass --user <user_id>')
+
+        session = ValidatorSession.objects.create(
+            validator_name='benchmark', organizer=event.organizer, event=event, user=user
+        )
+        scans = [random.choice(numbers) for _ in range(options['scans'])]
+        self.stdout.write(f"🎫 {options['scans']} scans over {len(numbers)} tickets of {event.title}")
+
+        try:
+            results = [self._run('database', None, session, scans)]
+            try:
+                index = TicketIndex(
+                    get_redis_client(settings.VALIDATION_ENGINE.get('REDIS_URL')),
+                    prefix=f'{engine.KEY_PREFIX}:benchmark',
+                )
+                index.client.ping()
+            except Exception as e:
+                self.stdout.write(self.style.WARNING(f"⚠️ Redis unavailable, skipping index run: {e}"))
+            else:
+                started = time.perf_counter()
+                indexed = index.warm(event.id, force=True)
+                self.stdout.write(f"  index warm-up: {indexed} tickets in {(time.perf_counter() - started) * 1000:.0f}ms")
+                try:
+                    results.append(self._run('redis', index, session, scans))
+                    index.flush_logs()
+                finally:
+                    index.drop(event.id)
+                    index.drop_session(session.id)
+        finally:
+            session.delete()
+
+        self.stdout.write('')
+        self.stdout.write(f"{'engine':<10} {'scans':>7} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'queries/scan':>13}")
+        for r in results:
+            self.stdout.write(
+                f"{r['engine']:<10} {r['scans']:>7} {r['mean']:>9.2f} {r['p50']:>9.2f} {r['p95']:>9.2f} "
+                f"{r['p99']:>9.2f} {r['queries']:>13.1f}"
+            )
+        if len(results) == 2 and results[1]['p99']:
+            self.stdout.write(self.style.SUCCESS(f"✅ p99 speed-up: {results[0]['p99'] / results[1]['p99']:.1f}x"))
+
+    def _run(self, name, index, session, scans):
+        timings = []
+        with engine_index(index), CaptureQueriesContext(connection) as queries:
+            for number in scans:
+                started = time.perf_counter()
+                snapshot = engine.load_session(session.id, session.user_id)
+                engine.validate_scan(snapshot, number)
+                timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        return {
+            'engine': name,
+            'scans': len(scans),
+            'mean': statistics.mean(timings),
+            'p50': statistics.median(timings),
+            'p95': _percentile(timings, 95),
+            'p99': _percentile(timings, 99),
+            'queries': len(queries) / len(scans),
+        }
+
@@ -0,0 +1,14 @@
+"""Signals for the validation app."""
+
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from apps.events.models import Ticket
+from apps.validation.engine import refresh_ticket
+
+
+@receiver(post_save, sender=Ticket)
+def refresh_ticket_index(sender, instance, **kwargs):
+    """Keep warm scanner indexes in sync with ticket changes made outside the scanner (refunds, manual check-in)."""
+    transaction.on_commit(lambda: refresh_ticket(instance))
@@ -0,0 +1,212 @@
+"""
+🚀 ENTERPRISE: Offline sync for validator devices.
+
+Pull: ``ticket_snapshot`` returns an event's tickets as compact rows ordered by
+``(updated_at, id)``, paged with an opaque cursor. Without a cursor it is a full
+snapshot (admissible tickets only); with one it is the delta since that cursor,
+including tickets that were refunded or cancelled so the device can drop them.
+Rows newer than SYNC_SETTLE_SECONDS are held back so a transaction that commits
+late can never slip behind a cursor.
+
+Push: ``apply_offline_scans`` applies a batch of check-ins scanned offline in one
+transaction. Each scan carries a device-generated UUID used as the id of its
+TicketValidationLog, so re-uploading a batch after a dropped response is a no-op.
+Scans are applied in scan order; a ticket already checked in (by another device or
+earlier in the batch) is reported as a conflict.
+"""
+
+import base64
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from apps.events.models import Ticket
+from apps.validation import engine
+from apps.validation.models import TicketValidationLog, ValidatorSession
+
+SNAPSHOT_FIELDS = ['id', 'ticket_number', 'status', 'check_in_status', 'check_in_time', 'attendee_name', 'tier_name']
+
+ADMISSIBLE_STATUSES = ('active', 'used')
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def _sync_settings():
+    return getattr(settings, 'VALIDATION_ENGINE', {})
+
+
+def encode_cursor(updated_at, ticket_id):
+    raw = f'{updated_at.isoformat()}|{ticket_id}'
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        updated_at, ticket_id = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        parsed = parse_datetime(updated_at)
+        if parsed is None:
+            raise ValueError(updated_at)
+        return parsed, uuid.UUID(ticket_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise InvalidCursor(f'Invalid cursor: {cursor}') from e
+
+
+def ticket_snapshot(event_id, cursor=None, limit=None):
+    """
+    One page of the event's tickets for a device. Returns
+    ``{'fields', 'tickets', 'cursor', 'has_more', 'full'}``; pass ``cursor`` back to
+    get the next page, and keep the last one to pull deltas later.
+    """
+    limit = limit or _sync_settings().get('SYNC_PAGE_SIZE', 5000)
+    settled = timezone.now() - timedelta(seconds=_sync_settings().get('SYNC_SETTLE_SECONDS', 2))
+
+    tickets = Ticket.objects.filter(order_item__order__event_id=event_id, updated_at__lte=settled)
+    if cursor:
+        updated_at, ticket_id = decode_cursor(cursor)
+        tickets = tickets.filter(Q(updated_at__gt=updated_at) | Q(updated_at=updated_at, id__gt=ticket_id))
+    else:
+        tickets = tickets.filter(status__in=ADMISSIBLE_STATUSES)
+
+    rows = list(tickets.order_by('updated_at', 'id').values(
+        'id', 'ticket_number', 'status', 'check_in_status', 'check_in_time',
+        'first_name', 'last_name', 'order_item__ticket_tier__name', 'updated_at',
+    )[:limit + 1])
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    if rows:
+        next_cursor = encode_cursor(rows[-1]['updated_at'], rows[-1]['id'])
+    elif cursor:
+        next_cursor = cursor
+    else:
+        # Nothing yet: later deltas start from here
+        next_cursor = encode_cursor(settled, uuid.UUID(int=0))
+
+    return {
+        'fields': SNAPSHOT_FIELDS,
+        'tickets': [
+            [
+                str(row['id']),
+                row['ticket_number'],
+                row['status'],
+                row['check_in_status'],
+                row['check_in_time'].isoformat() if row['check_in_time'] else None,
+                f"{row['first_name']} {row['last_name']}",
+                row['order_item__ticket_tier__name'],
+            ]
+            for row in rows
+        ],
+        'cursor': next_cursor,
+        'has_more': has_more,
+        'full': not cursor,
+    }
+
+
+def _scanned_at(value, now):
+    """Device clock, trusted up to the server's: scans cannot be in the future."""
+    scanned_at = parse_datetime(value) if isinstance(value, str) else None
+    if scanned_at is None:
+        return now
+    if timezone.is_naive(scanned_at):
+        scanned_at = timezone.make_aware(scanned_at)
+    return min(scanned_at, now)
+
+
+def apply_offline_scans(session, scans, user):
+    """
+    Apply offline check-ins for ``session`` (an active ValidatorSession). ``scans`` is a
+    list of ``{'scan_id', 'ticket_number', 'scanned_at', 'device_id'?}``.
+
+    Returns one result per scan, in input order, with ``status`` one of:
+    ``checked_in``, ``already_applied`` (scan_id seen before), ``conflict`` (ticket was
+    already checked in), ``invalid`` (ticket not active) or ``not_found``.
+    """
+    now = timezone.now()
+    parsed = []
+    for scan in scans:
+        parsed.append({
+            'scan_id': uuid.UUID(str(scan['scan_id'])),
+            'ticket_number': scan['ticket_number'],
+            'scanned_at': _scanned_at(scan.get('scanned_at'), now),
+            'device_id': scan.get('device_id', ''),
+        })
+
+    results = {}  # Input position -> result
+    with transaction.atomic():
+        applied_ids = set(TicketValidationLog.objects.filter(
+            id__in=[s['scan_id'] for s in parsed]
+        ).values_list('id', flat=True))
+        tickets = {
+            t.ticket_number: t
+            for t in Ticket.objects.select_for_update().filter(
+                order_item__order__event_id=session.event_id,
+                ticket_number__in={s['ticket_number'] for s in parsed},
+            ).only('id', 'ticket_number', 'status', 'check_in_status', 'check_in_time', 'check_in_by')
+        }
+
+        logs = []
+        checked_in = []
+        for position, scan in sorted(enumerate(parsed), key=lambda p: p[1]['scanned_at']):
+            scan_id = scan['scan_id']
+            if scan_id in applied_ids:
+                results[position] = {'status': 'already_applied'}
+                continue
+            applied_ids.add(scan_id)
+
+            ticket = tickets.get(scan['ticket_number'])
+            log = TicketValidationLog(
+                id=scan_id,
+                ticket=ticket,
+                validator_session=session,
+                action='check_in',
+                metadata={'offline': True, 'device_id': scan['device_id'], 'scanned_at': scan['scanned_at'].isoformat()},
+            )
+            if ticket is None:
+                results[position] = {'status': 'not_found'}
+                log.status, log.message = 'error', f"Ticket no encontrado: {scan['ticket_number']}"
+            elif ticket.check_in_status == 'checked_in':
+                results[position] = {
+                    'status': 'conflict',
+                    'check_in_time': ticket.check_in_time,
+                    'check_in_by': ticket.check_in_by_id,
+                }
+                log.status, log.error_code = 'warning', 'DOUBLE_CHECK_IN'
+                log.message = f'Ticket ya ingresado el {ticket.check_in_time}'
+            elif ticket.status != 'active':
+                results[position] = {'status': 'invalid', 'ticket_status': ticket.status}
+                log.status, log.message = 'error', f'Ticket no activo (estado: {ticket.status})'
+            else:
+                ticket.status = 'used'
+                ticket.check_in_status = 'checked_in'
+                ticket.checked_in = True  # Legacy field
+                ticket.check_in_time = scan['scanned_at']
+                ticket.check_in_by = user
+                ticket.updated_at = now
+                checked_in.append(ticket)
+                results[position] = {'status': 'checked_in', 'check_in_time': ticket.check_in_time}
+                log.status, log.message = 'success', f'Check-in offline sincronizado ({session.validator_name})'
+            logs.append(log)
+
+        Ticket.objects.bulk_update(
+            checked_in, ['status', 'check_in_status', 'checked_in', 'check_in_time', 'check_in_by', 'updated_at']
+        )
+        TicketValidationLog.objects.bulk_create(logs)
+        failed = sum(1 for log in logs if log.status != 'success')
+        ValidatorSession.objects.filter(id=session.id).update(
+            total_scans=F('total_scans') + len(logs),
+            successful_validations=F('successful_validations') + len(checked_in),
+            failed_validations=F('failed_validations') + failed,
+            tickets_checked_in=F('tickets_checked_in') + len(checked_in),
+        )
+
+    for ticket in checked_in:
+        engine.mark_checked_in(session.event_id, ticket.ticket_number, ticket.check_in_time)
+
+    return [{'scan_id': str(scan['scan_id']), **results[position]} for position, scan in enumerate(parsed)]
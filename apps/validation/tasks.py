@@ -0,0 +1,24 @@
+"""
+🚀 ENTERPRISE: Validation Celery tasks.
+"""
+
+import logging
+
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def flush_validation_logs():
+    """
+    🚀 ENTERPRISE: Persist validation logs queued by the Redis validation engine.
+
+    No-op when VALIDATION_ENGINE is 'database' (logs are written per scan).
+    """
+    from apps.validation.engine import flush_validation_logs as flush
+
+    flushed = flush()
+    if flushed:
+        logger.info(f"🎫 [VALIDATION] Flushed {flushed} validation logs")
+    return {'flushed': flushed}
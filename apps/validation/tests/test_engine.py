@@ -0,0 +1,156 @@
+"""
+Tests for the scanner validation engine (apps.validation.engine).
+
+Database path: scans validate against the event's tickets, counters are incremented
+in place and check-in admits a ticket only once. Redis path: the event index is warmed
+with one query, tickets sold later are picked up, ticket saves refresh the index and
+queued logs are bulk-inserted. Redis tests are skipped when no server is reachable.
+"""
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from apps.events.models import Order, OrderItem, Ticket
+from apps.validation import engine
+from apps.validation.engine import TicketIndex
+from apps.validation.models import TicketValidationLog, ValidatorSession
+from core.testing import create_event, create_ticket_tier, redis_test_client
+
+
+REDIS = redis_test_client()
+
+
+class ValidationEngineTestCase(TestCase):
+
+    def setUp(self):
+        now = timezone.now()
+        self.event = create_event(start_date=now - timedelta(hours=1), end_date=now + timedelta(hours=3))
+        self.tier = create_ticket_tier(self.event, price=Decimal('5000'))
+        self.order = Order.objects.create(
+            event=self.event, email='guest@example.com', first_name='Guest', last_name='User', status='paid'
+        )
+        self.item = OrderItem.objects.create(order=self.order, ticket_tier=self.tier, quantity=2, unit_price=Decimal('5000'))
+        self.tickets = [self._ticket(i) for i in range(2)]
+        self.user = get_user_model().objects.create_user(username='validator', email='validator@example.com', password='x')
+        self.session = ValidatorSession.objects.create(
+            validator_name='Puerta 1', organizer=self.event.organizer, event=self.event, user=self.user
+        )
+
+    def _ticket(self, i):
+        return Ticket.objects.create(order_item=self.item, first_name='Guest', last_name=str(i), email='guest@example.com')
+
+    def _snapshot(self):
+        return engine.load_session(self.session.id, self.user.id)
+
+
+@override_settings(VALIDATION_ENGINE={'ENGINE': 'database'})
+class DatabaseEngineTests(ValidationEngineTestCase):
+
+    def test_valid_scan_logs_and_counts(self):
+        result = engine.validate_scan(self._snapshot(), self.tickets[0].ticket_number, scan_time_ms=40)
+
+        self.assertTrue(result['valid'])
+        self.assertEqual(result['ticket']['order_info']['total_amount'], float(self.order.total))
+        self.session.refresh_from_db()
+        self.assertEqual((self.session.total_scans, self.session.successful_validations), (1, 1))
+        self.assertEqual(self.session.total_validation_time_ms, 40)
+        self.assertTrue(TicketValidationLog.objects.filter(ticket=self.tickets[0], status='success').exists())
+
+    def test_unknown_ticket_is_rejected(self):
+        result = engine.validate_scan(self._snapshot(), 'NOPE')
+
+        self.assertEqual(result['error'], 'TICKET_NOT_FOUND')
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.failed_validations, 1)
+
+    def test_session_of_another_user_is_not_loaded(self):
+        self.assertIsNone(engine.load_session(self.session.id, self.user.id + 1))
+
+    def test_check_in_admits_once(self):
+        snapshot = self._snapshot()
+        _, first = engine.check_in_ticket(snapshot, self.tickets[0].id, self.user, notes='VIP')
+        payload, second = engine.check_in_ticket(snapshot, self.tickets[0].id, self.user)
+
+        self.assertTrue(first)
+        self.assertFalse(second)
+        self.assertIn('check-in', payload['message'])
+        self.tickets[0].refresh_from_db()
+        self.assertEqual((self.tickets[0].status, self.tickets[0].check_in_status), ('used', 'checked_in'))
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.tickets_checked_in, 1)
+
+        result = engine.validate_scan(snapshot, self.tickets[0].ticket_number)
+        self.assertEqual(result['error'], 'VALIDATION_FAILED')
+
+
+class RedisEngineTests(ValidationEngineTestCase):
+
+    def setUp(self):
+        if REDIS is None:
+            self.skipTest('Redis not available')
+        super().setUp()
+        self.prefix = f'test:validation:{uuid.uuid4().hex[:8]}'
+        self.index = TicketIndex(REDIS, prefix=self.prefix)
+        patcher = mock.patch.object(engine, 'get_ticket_index', return_value=self.index)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        keys = REDIS.keys(f'{self.prefix}:*')
+        if keys:
+            REDIS.delete(*keys)
+
+    def test_warm_indexes_event_tickets(self):
+        self.assertEqual(self.index.warm(self.event.id), 2)
+        entry = self.index.get_entry(self.event.id, self.tickets[1].ticket_number)
+        self.assertEqual(entry['id'], str(self.tickets[1].id))
+        self.assertEqual(entry['tier_name'], self.tier.name)
+        # Already warm: not rebuilt
+        self.assertEqual(self.index.warm(self.event.id), 0)
+
+    def test_scan_uses_index_and_queues_log(self):
+        self.index.warm(self.event.id)
+        snapshot = self._snapshot()
+
+        with self.assertNumQueries(1):  # Session counters only
+            result = engine.validate_scan(snapshot, self.tickets[0].ticket_number)
+
+        self.assertTrue(result['valid'])
+        self.assertEqual(self.index.pending_logs(), 1)
+        self.assertFalse(TicketValidationLog.objects.exists())
+        self.assertEqual(self.index.flush_logs(), 1)
+        self.assertTrue(TicketValidationLog.objects.filter(ticket=self.tickets[0], status='success').exists())
+
+    def test_ticket_sold_after_warm_is_found(self):
+        self.index.warm(self.event.id)
+        late = self._ticket(9)
+        self.assertTrue(engine.validate_scan(self._snapshot(), late.ticket_number)['valid'])
+        self.assertIsNotNone(self.index.get_entry(self.event.id, late.ticket_number))
+
+    def test_ticket_save_refreshes_entry(self):
+        self.index.warm(self.event.id)
+        ticket = self.tickets[0]
+        ticket.status = 'refunded'
+        ticket.save()
+        engine.refresh_ticket(ticket)  # on_commit does not fire inside TestCase
+        self.assertEqual(self.index.get_entry(self.event.id, ticket.ticket_number)['status'], 'refunded')
+
+    def test_check_in_updates_index(self):
+        self.index.warm(self.event.id)
+        snapshot = self._snapshot()
+        engine.check_in_ticket(snapshot, self.tickets[0].id, self.user)
+
+        result = engine.validate_scan(snapshot, self.tickets[0].ticket_number)
+        self.assertEqual(result['error'], 'VALIDATION_FAILED')
+
+    def test_failed_flush_keeps_logs(self):
+        engine.validate_scan(self._snapshot(), 'NOPE')
+        with mock.patch.object(engine, 'persist_logs', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                self.index.flush_logs()
+        self.assertEqual(self.index.pending_logs(), 1)
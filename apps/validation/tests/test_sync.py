@@ -0,0 +1,86 @@
+"""
+Tests for offline device sync (apps.validation.sync).
+
+Snapshot pages are cursor-ordered and deltas return only changed tickets; offline
+check-in uploads are idempotent per scan_id and report double check-ins as conflicts.
+"""
+import uuid
+from datetime import timedelta
+
+from django.test import override_settings
+from django.utils import timezone
+
+from apps.events.models import Ticket
+from apps.validation import sync
+from apps.validation.models import TicketValidationLog
+from apps.validation.tests.test_engine import ValidationEngineTestCase
+
+SYNC_SETTINGS = {'ENGINE': 'database', 'SYNC_PAGE_SIZE': 5000, 'SYNC_SETTLE_SECONDS': 0}
+
+
+@override_settings(VALIDATION_ENGINE=SYNC_SETTINGS)
+class TicketSnapshotTests(ValidationEngineTestCase):
+
+    def test_full_snapshot_pages_through_tickets(self):
+        self._ticket(2)
+        first = sync.ticket_snapshot(self.event.id, limit=2)
+        second = sync.ticket_snapshot(self.event.id, cursor=first['cursor'], limit=2)
+
+        self.assertTrue(first['full'])
+        self.assertTrue(first['has_more'])
+        self.assertFalse(second['has_more'])
+        numbers = [row[1] for row in first['tickets'] + second['tickets']]
+        self.assertCountEqual(numbers, Ticket.objects.values_list('ticket_number', flat=True))
+
+    def test_delta_returns_changed_tickets_only(self):
+        cursor = sync.ticket_snapshot(self.event.id)['cursor']
+        ticket = self.tickets[0]
+        ticket.status = 'refunded'
+        ticket.save()
+
+        delta = sync.ticket_snapshot(self.event.id, cursor=cursor)
+        self.assertFalse(delta['full'])
+        self.assertEqual([(row[1], row[2]) for row in delta['tickets']], [(ticket.ticket_number, 'refunded')])
+
+    def test_invalid_cursor(self):
+        with self.assertRaises(sync.InvalidCursor):
+            sync.ticket_snapshot(self.event.id, cursor='garbage')
+
+
+@override_settings(VALIDATION_ENGINE=SYNC_SETTINGS)
+class OfflineScanTests(ValidationEngineTestCase):
+
+    def _scan(self, ticket_number, minutes_ago=5, device_id='puerta-1'):
+        return {
+            'scan_id': str(uuid.uuid4()),
+            'ticket_number': ticket_number,
+            'scanned_at': (timezone.now() - timedelta(minutes=minutes_ago)).isoformat(),
+            'device_id': device_id,
+        }
+
+    def test_batch_checks_in_and_logs(self):
+        scans = [self._scan(t.ticket_number) for t in self.tickets] + [self._scan('NOPE')]
+        results = sync.apply_offline_scans(self.session, scans, self.user)
+
+        self.assertEqual([r['status'] for r in results], ['checked_in', 'checked_in', 'not_found'])
+        self.assertEqual(Ticket.objects.filter(check_in_status='checked_in').count(), 2)
+        self.assertEqual(TicketValidationLog.objects.filter(id__in=[s['scan_id'] for s in scans]).count(), 3)
+        self.session.refresh_from_db()
+        self.assertEqual((self.session.total_scans, self.session.tickets_checked_in), (3, 2))
+
+    def test_reupload_is_idempotent(self):
+        scans = [self._scan(self.tickets[0].ticket_number)]
+        sync.apply_offline_scans(self.session, scans, self.user)
+        results = sync.apply_offline_scans(self.session, scans, self.user)
+
+        self.assertEqual(results[0]['status'], 'already_applied')
+        self.assertEqual(TicketValidationLog.objects.count(), 1)
+
+    def test_double_check_in_across_devices_is_a_conflict(self):
+        number = self.tickets[0].ticket_number
+        scans = [self._scan(number, minutes_ago=1, device_id='puerta-2'), self._scan(number, minutes_ago=3)]
+        results = sync.apply_offline_scans(self.session, scans, self.user)
+
+        # Earliest scan wins regardless of upload order
+        self.assertEqual([r['status'] for r in results], ['conflict', 'checked_in'])
+        self.assertTrue(TicketValidationLog.objects.filter(error_code='DOUBLE_CHECK_IN').exists())
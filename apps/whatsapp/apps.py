@@ -8,3 +8,6 @@ class WhatsAppConfig(AppConfig):
     name = 'apps.whatsapp'
     verbose_name = 'WhatsApp Integration'
 
+    def ready(self):
+        """Connect code index signals."""
+        import apps.whatsapp.signals  # noqa
@@ -0,0 +1,113 @@
+"""
+🚀 ENTERPRISE: Benchmark del matcher de códigos de WhatsApp (índice en memoria vs DB).
+
+Usage:
+    python manage.py benchmark_code_matcher [--codes 50000] [--messages 2000] [--db-messages 50]
+
+Todo corre dentro de una transacción que se revierte al final:
+1. Crea --codes WhatsAppReservationCode pendientes (bulk_create, sin señales)
+2. Carga el índice (code_index.load) y mide tiempo y tamaño
+3. Busca códigos en --messages mensajes (mitad sin código, mitad con un código
+   activo embebido en minúsculas) con el índice
+4. Repite con el scan legacy de la DB sobre --db-messages mensajes
+"""
+
+import random
+import secrets
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.whatsapp.models import WhatsAppReservationCode
+from apps.whatsapp.services.code_index import KIND_RESERVATION, ActiveCodeIndex
+from apps.whatsapp.services.message_parser import MessageParser
+
+
+class _Rollback(Exception):
+    pass
+
+
+FILLER = [
+    'Hola! quería consultar disponibilidad para el fin de semana',
+    'Buenas tardes, somos 4 personas, ¿tienen cupos?',
+    'Gracias por la info, ¿aceptan transferencia?',
+    'Hola, mi código de reserva es',
+]
+
+
+class Command(BaseCommand):
+    help = 'Benchmark del matcher de códigos de WhatsApp: índice en memoria vs scan de DB (datos revertidos)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--codes', type=int, default=50000, help='Códigos activos sintéticos')
+        parser.add_argument('--messages', type=int, default=2000, help='Mensajes a procesar con el índice')
+        parser.add_argument('--db-messages', type=int, default=50, help='Mensajes a procesar con el scan de DB (0 = omitir)')
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self._run(options)
+                raise _Rollback()
+        except _Rollback:
+            self.stdout.write('Datos sintéticos revertidos.')
+
+    def _seed(self, total):
+        expires_at = timezone.now() + timedelta(days=1)
+        codes = [f"BNCH{secrets.token_hex(3).upper()}-{i:06d}" for i in range(total)]
+        WhatsAppReservationCode.objects.bulk_create(
+            (WhatsAppReservationCode(code=code, status='pending', expires_at=expires_at) for code in codes),
+            batch_size=5000,
+        )
+        return codes
+
+    def _messages(self, codes, total):
+        rng = random.Random(42)
+        messages = []
+        for i in range(total):
+            text = rng.choice(FILLER)
+            if i % 2:
+                text = f"{text} {rng.choice(codes).lower()}, gracias!"
+            messages.append(text)
+        return messages
+
+    def _time(self, finder, messages):
+        found = 0
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            for text in messages:
+                if finder(text):
+                    found += 1
+            elapsed = time.perf_counter() - started
+        return elapsed, found, len(queries)
+
+    def _run(self, options):
+        started = time.perf_counter()
+        codes = self._seed(options['codes'])
+        self.stdout.write(f"{len(codes):,} códigos activos creados en {time.perf_counter() - started:.1f}s")
+
+        index = ActiveCodeIndex()
+        started = time.perf_counter()
+        index.load()
+        self.stdout.write(f"Carga del índice: {(time.perf_counter() - started) * 1000:.0f} ms")
+
+        messages = self._messages(codes, options['messages'])
+        elapsed, found, queries = self._time(lambda text: index.find(KIND_RESERVATION, text), messages)
+        per_msg = elapsed / len(messages) * 1e6
+        self.stdout.write(
+            f"Índice: {len(messages):,} mensajes en {elapsed * 1000:.1f} ms "
+            f"({per_msg:,.1f} µs/mensaje, {found:,} con código, {queries} queries)"
+        )
+
+        if options['db_messages']:
+            db_messages = messages[:options['db_messages']]
+            db_elapsed, db_found, db_queries = self._time(MessageParser._find_code_in_db, db_messages)
+            db_per_msg = db_elapsed / len(db_messages) * 1e6
+            self.stdout.write(
+                f"Scan DB: {len(db_messages):,} mensajes en {db_elapsed * 1000:.1f} ms "
+                f"({db_per_msg:,.1f} µs/mensaje, {db_found:,} con código, {db_queries} queries)"
+            )
+            self.stdout.write(self.style.SUCCESS(f"Speedup: {db_per_msg / per_msg:,.0f}x"))
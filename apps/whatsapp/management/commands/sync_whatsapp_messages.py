@@ -41,7 +41,8 @@ class Command(BaseCommand):
                 result = sync_service.sync_chat_messages(chat_id, limit=limit)
                 self.stdout.write(
                     self.style.SUCCESS(
-                        f'Successfully synced {result["created"]} messages for chat {chat_id}'
+                        f'Successfully synced {result["created"]} messages for chat {chat_id} '
+                        f'({result["messages_per_sec"]} messages/s)'
                     )
                 )
             except Exception as e:
@@ -51,24 +52,22 @@ class Command(BaseCommand):
         elif all_chats:
             # Sync all chats
             self.stdout.write('Syncing messages for all chats...')
-            chats = WhatsAppChat.objects.filter(is_active=True)
-            total_created = 0
+            chats = {chat.chat_id: chat.name for chat in WhatsAppChat.objects.filter(is_active=True)}
+            result = sync_service.sync_chats_messages(list(chats), limit=limit)
             
-            for chat in chats:
-                try:
-                    result = sync_service.sync_chat_messages(chat.chat_id, limit=limit)
-                    total_created += result['created']
-                    self.stdout.write(
-                        f'  Chat {chat.name}: {result["created"]} messages created'
-                    )
-                except Exception as e:
-                    self.stdout.write(
-                        self.style.WARNING(f'  Error syncing chat {chat.chat_id}: {e}')
-                    )
+            for chat_id, chat_result in result['chats'].items():
+                self.stdout.write(
+                    f'  Chat {chats[chat_id]}: {chat_result["created"]} messages created'
+                )
+            for chat_id, error in result['errors'].items():
+                self.stdout.write(
+                    self.style.WARNING(f'  Error syncing chat {chat_id}: {error}')
+                )
             
             self.stdout.write(
                 self.style.SUCCESS(
-                    f'Total messages synced: {total_created}'
+                    f'Total messages synced: {result["created"]} '
+                    f'({result["total"]} processed, {result["messages_per_sec"]} messages/s)'
                 )
             )
         else:
@@ -0,0 +1,272 @@
+"""
+🚀 ENTERPRISE: In-process index of active WhatsApp codes for MessageParser.
+
+MessageParser used to query the DB on every inbound message: a scan of every pending
+WhatsAppReservationCode (substring test per code) plus one query per ERAS/CONC regex
+match. This module keeps those code sets in memory in each worker:
+
+- ``reservation``: WhatsAppReservationCode pending and not linked
+- ``erasmus``:     ErasmusMagicLink.verification_code waiting for the WhatsApp message
+- ``contest``:     every ContestParticipationCode (confirmed codes get the reply again)
+
+Matching (CodeMatcher) is one pass over the message: at each position the text is
+tested against a hash set per distinct code length. Codes come from a few fixed-length
+formats (RES-XXXXXX-YYYYMMDD-XXXXXXXX, ERAS-XXXXXX, ...), so this costs a handful of
+set lookups per character with a few MB of memory for 50k codes, instead of the
+per-node trie of an Aho-Corasick automaton (~100 MB in pure Python for 50k codes).
+
+Updates are incremental. Signals (signals.py) record every change after commit:
+the local index is updated in place, the version key in the cache is incremented
+and the change is stored under ``<prefix>:change:<version>``. Other workers replay
+the missing versions on their next message (one cache round-trip when nothing
+changed). A gap in the change log, a cache outage or MAX_AGE_SECONDS without a
+full load triggers a full reload from the DB.
+"""
+
+import logging
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+CACHE_PREFIX = 'whatsapp:code_index'
+VERSION_KEY = f'{CACHE_PREFIX}:version'
+
+KIND_RESERVATION = 'reservation'
+KIND_ERASMUS = 'erasmus'
+KIND_CONTEST = 'contest'
+
+
+def _settings():
+    return getattr(settings, 'WHATSAPP_CODE_INDEX', {})
+
+
+def index_enabled():
+    return _settings().get('ENABLED', True)
+
+
+def _change_key(version):
+    return f'{CACHE_PREFIX}:change:{version}'
+
+
+class CodeMatcher:
+    """Set of codes (case-insensitive) with a single-pass substring search."""
+
+    def __init__(self, codes=()):
+        self._codes = set()
+        self._lengths = Counter()
+        self._scan_lengths = ()
+        for code in codes:
+            self.add(code)
+
+    def _refresh_lengths(self):
+        # Longest first: at a given position the longest code wins
+        self._scan_lengths = tuple(sorted(self._lengths, reverse=True))
+
+    def add(self, code):
+        code = (code or '').upper()
+        if not code or code in self._codes:
+            return
+        self._codes.add(code)
+        self._lengths[len(code)] += 1
+        if self._lengths[len(code)] == 1:
+            self._refresh_lengths()
+
+    def discard(self, code):
+        code = (code or '').upper()
+        if code not in self._codes:
+            return
+        self._codes.discard(code)
+        self._lengths[len(code)] -= 1
+        if not self._lengths[len(code)]:
+            del self._lengths[len(code)]
+            self._refresh_lengths()
+
+    def __contains__(self, code):
+        return bool(code) and code.upper() in self._codes
+
+    def __len__(self):
+        return len(self._codes)
+
+    def find(self, text):
+        """Leftmost (then longest) code contained in `text`, uppercased; None if none."""
+        if not text or not self._codes:
+            return None
+        text = text.upper()
+        codes = self._codes
+        lengths = self._scan_lengths
+        size = len(text)
+        for start in range(size):
+            for length in lengths:
+                end = start + length
+                if end <= size and text[start:end] in codes:
+                    return text[start:end]
+        return None
+
+
+def _sources():
+    """kind -> (model, code field, Q of active rows, is_active(instance))."""
+    from django.db.models import Q
+
+    from apps.erasmus.models import ContestParticipationCode, ErasmusMagicLink
+    from apps.whatsapp.models import WhatsAppReservationCode
+
+    return {
+        KIND_RESERVATION: (
+            WhatsAppReservationCode,
+            'code',
+            Q(status='pending', linked_reservation__isnull=True),
+            lambda obj: obj.status == 'pending' and obj.linked_reservation_id is None,
+        ),
+        KIND_ERASMUS: (
+            ErasmusMagicLink,
+            'verification_code',
+            Q(status=ErasmusMagicLink.STATUS_PENDING),
+            lambda obj: obj.status == ErasmusMagicLink.STATUS_PENDING,
+        ),
+        KIND_CONTEST: (
+            ContestParticipationCode,
+            'code',
+            Q(),
+            lambda obj: True,
+        ),
+    }
+
+
+def kind_for(instance):
+    """Index kind for a model instance (None if the model is not indexed)."""
+    for kind, (model, _, _, _) in _sources().items():
+        if isinstance(instance, model):
+            return kind
+    return None
+
+
+class ActiveCodeIndex:
+    """Per-process code sets, kept in sync through the cache change log."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._matchers = {}
+        self._version = None
+        self._loaded_at = None
+
+    # ------------------------------------------------------------------
+    # Read
+    # ------------------------------------------------------------------
+
+    def matcher(self, kind):
+        self.refresh()
+        return self._matchers[kind]
+
+    def find(self, kind, text):
+        return self.matcher(kind).find(text)
+
+    def contains(self, kind, code):
+        return code in self.matcher(kind)
+
+    # ------------------------------------------------------------------
+    # Sync
+    # ------------------------------------------------------------------
+
+    def load(self):
+        """Full reload from the DB (one query per kind)."""
+        started = time.perf_counter()
+        version = self._cache_version()
+        matchers = {}
+        for kind, (model, field, active, _) in _sources().items():
+            codes = model._default_manager.filter(active).values_list(field, flat=True)
+            matchers[kind] = CodeMatcher(codes.iterator(chunk_size=5000))
+        with self._lock:
+            self._matchers = matchers
+            self._version = version
+            self._loaded_at = time.monotonic()
+        logger.info(
+            "[CODE_INDEX] Loaded %s in %.0f ms",
+            ', '.join(f'{kind}={len(m)}' for kind, m in matchers.items()),
+            (time.perf_counter() - started) * 1000,
+        )
+
+    def refresh(self):
+        """Apply pending changes from other workers (or reload when they cannot be replayed)."""
+        max_age = _settings().get('MAX_AGE_SECONDS', 300)
+        if self._loaded_at is None or time.monotonic() - self._loaded_at > max_age:
+            self.load()
+            return
+
+        version = self._cache_version()
+        if version is None or version == self._version:
+            return
+        with self._lock:
+            if self._version is None or version < self._version or version - self._version > _settings().get('MAX_REPLAY', 1000):
+                self.load()
+                return
+            pending = range(self._version + 1, version + 1)
+            try:
+                changes = cache.get_many([_change_key(v) for v in pending])
+            except Exception:
+                changes = {}
+            if len(changes) != len(pending):
+                self.load()
+                return
+            for v in pending:
+                kind, code, active = changes[_change_key(v)]
+                self._apply(kind, code, active)
+            self._version = version
+
+    def record_change(self, kind, code, active):
+        """Apply a committed change locally and publish it to the other workers."""
+        with self._lock:
+            if self._loaded_at is not None:
+                self._apply(kind, code, active)
+        try:
+            cache.add(VERSION_KEY, 0, None)
+            version = cache.incr(VERSION_KEY)
+            cache.set(_change_key(version), (kind, code, active), _settings().get('CHANGE_TTL', 3600))
+        except Exception as e:
+            logger.warning("[CODE_INDEX] Could not publish code change: %s", e)
+            return
+        with self._lock:
+            # Our own change: skip it in refresh() if we were up to date
+            if self._version is not None and version == self._version + 1:
+                self._version = version
+
+    def _apply(self, kind, code, active):
+        matcher = self._matchers.get(kind)
+        if matcher is None:
+            return
+        if active:
+            matcher.add(code)
+        else:
+            matcher.discard(code)
+
+    @staticmethod
+    def _cache_version():
+        try:
+            return cache.get(VERSION_KEY, 0)
+        except Exception:
+            return None
+
+    def reset(self):
+        """Drop the in-memory sets (next access reloads from the DB)."""
+        with self._lock:
+            self._matchers = {}
+            self._version = None
+            self._loaded_at = None
+
+
+code_index = ActiveCodeIndex()
+
+
+def record_instance_change(instance, deleted=False):
+    """Signal helper: publish the new state of a code row."""
+    kind = kind_for(instance)
+    if kind is None:
+        return
+    _, field, _, is_active = _sources()[kind]
+    code = getattr(instance, field, None)
+    if code:
+        code_index.record_change(kind, code, (not deleted) and is_active(instance))
@@ -3,6 +3,14 @@ import re
 import logging
 from typing import Optional, Dict
 
+from apps.whatsapp.services.code_index import (
+    KIND_CONTEST,
+    KIND_ERASMUS,
+    KIND_RESERVATION,
+    code_index,
+    index_enabled,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -133,7 +141,8 @@ class MessageParser:
     def extract_reservation_code(cls, message: str) -> Optional[str]:
         """
         Extract reservation code (RES-XXX format) from message.
-        Falls back to DB lookup if message contains a code-like substring.
+        Falls back to the active code index (see code_index) if message contains
+        an active code as a substring.
         
         Args:
             message: Message text
@@ -154,11 +163,11 @@ class MessageParser:
         match = re.search(alt_pattern, message, re.IGNORECASE)
         if match:
             code = match.group(0).upper()
-            if cls._code_exists_in_db(code):
+            if cls._is_active_code(KIND_RESERVATION, code) or cls._code_exists_in_db(code):
                 logger.info(f"Extracted reservation code (alt format): {code}")
                 return code
 
-        # 3. Fallback: Search message for any existing code in DB
+        # 3. Fallback: Search message for any active code (in-memory index)
         return cls._find_code_in_message(message)
     
     @classmethod
@@ -170,11 +179,37 @@ class MessageParser:
         except Exception:
             return False
     
+    @classmethod
+    def _is_active_code(cls, kind: str, code: str) -> bool:
+        """Membership in the in-memory index (False when disabled or unavailable)."""
+        if not index_enabled():
+            return False
+        try:
+            return code_index.contains(kind, code)
+        except Exception as e:
+            logger.warning(f"Code index lookup failed: {e}")
+            return False
+
     @classmethod
     def _find_code_in_message(cls, message: str) -> Optional[str]:
         """
-        Search message for substring matching any active reservation code in DB.
+        Search message for substring matching any active reservation code.
+        Single pass over the message with the in-memory index; DB scan only when the
+        index is disabled or cannot be loaded.
         """
+        if index_enabled():
+            try:
+                code = code_index.find(KIND_RESERVATION, message)
+                if code:
+                    logger.info(f"Extracted reservation code (index match): {code}")
+                return code
+            except Exception as e:
+                logger.warning(f"Code index lookup failed, scanning DB: {e}")
+        return cls._find_code_in_db(message)
+
+    @classmethod
+    def _find_code_in_db(cls, message: str) -> Optional[str]:
+        """Legacy path: substring test against every active reservation code in DB."""
         try:
             from apps.whatsapp.models import WhatsAppReservationCode
             message_upper = message.upper()
@@ -222,8 +257,12 @@ class MessageParser:
         match = re.search(pattern, message, re.IGNORECASE)
         if match:
             code = match.group(0).upper()
+            if cls._is_active_code(KIND_CONTEST, code):
+                logger.info("Extracted contest code: %s", code)
+                return code
             try:
                 from apps.erasmus.models import ContestParticipationCode
+                # Index disabled or not yet synced with a code created elsewhere
                 if ContestParticipationCode.objects.filter(code=code).exists():
                     logger.info("Extracted contest code: %s", code)
                     return code
@@ -244,7 +283,16 @@ class MessageParser:
             code = match.group(0).upper()
             logger.info("[ErasmusAccess] Extracted Erasmus code: %s", code)
             return code
-        # Fallback: any ERAS-XXX pattern present in DB
+        # Fallback: any ERAS-XXX pattern waiting for its WhatsApp message
+        if index_enabled():
+            try:
+                for match in re.finditer(r'\bERAS-[A-Z0-9]{4,10}\b', message, re.IGNORECASE):
+                    code = match.group(0).upper()
+                    if code_index.contains(KIND_ERASMUS, code):
+                        return code
+                return None
+            except Exception as exc:
+                logger.warning("[ErasmusAccess] Code index lookup failed: %s", exc)
         return cls._find_erasmus_code_in_db(message)
 
     @classmethod
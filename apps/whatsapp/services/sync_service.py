@@ -1,18 +1,51 @@
 """
 Service for synchronizing WhatsApp data from Node.js service to database.
+
+🚀 ENTERPRISE: chats and messages are written in batches. Known chat_ids and
+whatsapp_ids are prefetched into memory, new rows go in with
+bulk_create(ignore_conflicts=True) in chunks of BULK_BATCH_SIZE and changed chats
+with a single bulk_update, so re-syncing a busy chat is a handful of queries
+instead of two per message.
 """
 import logging
+import time
 from typing import Dict, List, Optional, Any
 from django.utils import timezone
 from django.db import transaction
-from apps.whatsapp.models import WhatsAppChat
+from apps.whatsapp.models import WhatsAppChat, WhatsAppMessage
 from apps.whatsapp.services.whatsapp_client import WhatsAppWebService
 
 logger = logging.getLogger(__name__)
 
+# Chat.last_message_at comes in ms above 1e12; message timestamps above 1e10
+CHAT_TIMESTAMP_MS_THRESHOLD = 1000000000000
+MESSAGE_TIMESTAMP_MS_THRESHOLD = 10000000000
+
+
+def _parse_epoch(value, ms_threshold):
+    """Epoch seconds or milliseconds -> aware datetime (UTC). Raises on invalid values."""
+    if value > ms_threshold:
+        value = value / 1000
+    return timezone.datetime.fromtimestamp(value, tz=timezone.utc)
+
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _rate(count, seconds):
+    return round(count / seconds, 1) if seconds > 0 else 0.0
+
 
 class WhatsAppSyncService:
     """Service for synchronizing WhatsApp data."""
+
+    BULK_BATCH_SIZE = 500
+    CHAT_UPDATE_FIELDS = [
+        'name', 'type', 'whatsapp_name', 'profile_picture_url', 'unread_count',
+        'last_message_at', 'last_message_preview', 'group_description', 'participants',
+    ]
     
     def __init__(self):
         self.whatsapp_service = WhatsAppWebService()
@@ -28,28 +61,115 @@ class WhatsAppSyncService:
             chats_data = response.get('chats', [])
             
             logger.info(f"Syncing {len(chats_data)} chats from Node.js service...")
-            
-            created_count = 0
-            updated_count = 0
-            
-            with transaction.atomic():
-                for chat_data in chats_data:
-                    result = self.sync_chat(chat_data, commit=False)
-                    if result == 'created':
-                        created_count += 1
-                    elif result == 'updated':
-                        updated_count += 1
-            
-            logger.info(f"Chat sync completed: {created_count} created, {updated_count} updated")
-            
-            return {
-                'created': created_count,
-                'updated': updated_count,
-                'total': len(chats_data)
-            }
+            result = self.sync_chats_bulk(chats_data)
+            logger.info(f"Chat sync completed: {result['created']} created, {result['updated']} updated")
+            return result
         except Exception as e:
             logger.error(f"Error syncing all chats: {e}", exc_info=True)
             raise
+
+    @staticmethod
+    def _parse_chat_data(chat_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Normalized fields of a chat payload from the Node.js service."""
+        chat_id = chat_data.get('chat_id')
+        chat_type = chat_data.get('type', 'individual')
+
+        # Parse last message timestamp
+        last_message_at = None
+        last_message = chat_data.get('last_message')
+        if last_message and last_message.get('timestamp'):
+            timestamp = last_message['timestamp']
+            if isinstance(timestamp, (int, float)):
+                try:
+                    last_message_at = _parse_epoch(timestamp, CHAT_TIMESTAMP_MS_THRESHOLD)
+                except (ValueError, TypeError, OSError) as e:
+                    logger.warning(f"Could not parse timestamp for chat {chat_id}: {e}")
+
+        last_message_preview = ''
+        if last_message:
+            raw = last_message.get('text') or last_message.get('body') or ''
+            last_message_preview = (str(raw)[:255] if raw else '')
+
+        defaults = {
+            'name': chat_data.get('name', 'Unknown'),
+            'type': chat_type,
+            'is_active': True,
+            'whatsapp_name': chat_data.get('whatsapp_name') or '',  # NOT NULL: @lid devuelve null
+            'profile_picture_url': chat_data.get('profile_picture_url') or '',
+            'unread_count': chat_data.get('unread_count', 0) or 0,
+            'last_message_at': last_message_at,
+            'last_message_preview': last_message_preview
+        }
+        # For groups, get additional info
+        if chat_type == 'group':
+            defaults['group_description'] = chat_data.get('description', '') or ''
+            defaults['participants'] = chat_data.get('participants', []) or []
+        return defaults
+
+    @staticmethod
+    def _apply_chat_changes(chat: WhatsAppChat, chat_data: Dict[str, Any], values: Dict[str, Any]) -> List[str]:
+        """Update an existing chat in memory from a sync payload; returns the changed fields."""
+        update_fields = []
+        chat_type = values['type']
+        
+        # Update name if better (not Unknown, longer, or starts with +)
+        new_name = chat_data.get('name')
+        if new_name and new_name != chat.name and new_name != 'Unknown':
+            if (chat.name == 'Unknown' or 
+                'Unknown' in chat.name or
+                len(new_name) > len(chat.name) or
+                (new_name.startswith('+') and not chat.name.startswith('+'))):
+                chat.name = new_name
+                update_fields.append('name')
+        
+        # Update type if changed
+        if chat.type != chat_type:
+            chat.type = chat_type
+            update_fields.append('type')
+        
+        # Update WhatsApp name
+        whatsapp_name = values['whatsapp_name']
+        if whatsapp_name and whatsapp_name != chat.whatsapp_name:
+            chat.whatsapp_name = whatsapp_name
+            update_fields.append('whatsapp_name')
+        
+        # Update profile picture
+        profile_picture_url = values['profile_picture_url']
+        if profile_picture_url and profile_picture_url != chat.profile_picture_url:
+            chat.profile_picture_url = profile_picture_url
+            update_fields.append('profile_picture_url')
+        
+        # Update unread count
+        unread_count = chat_data.get('unread_count', 0)
+        if unread_count is not None and unread_count != chat.unread_count:
+            chat.unread_count = unread_count
+            update_fields.append('unread_count')
+        
+        # Update last message time if newer
+        last_message_at = values['last_message_at']
+        if last_message_at and (
+            not chat.last_message_at or last_message_at > chat.last_message_at
+        ):
+            chat.last_message_at = last_message_at
+            update_fields.append('last_message_at')
+        # Enterprise: update preview when sync has it (Node's latest message)
+        last_message_preview = values['last_message_preview']
+        if last_message_preview and last_message_preview != getattr(chat, 'last_message_preview', ''):
+            chat.last_message_preview = last_message_preview
+            update_fields.append('last_message_preview')
+        
+        # For groups, update description and participants
+        if chat_type == 'group':
+            description = chat_data.get('description', '')
+            if description and description != chat.group_description:
+                chat.group_description = description
+                update_fields.append('group_description')
+            
+            participants = chat_data.get('participants', [])
+            if participants:
+                chat.participants = participants
+                update_fields.append('participants')
+        return update_fields
     
     def sync_chat(self, chat_data: Dict[str, Any], commit: bool = True) -> Optional[str]:
         """
@@ -62,131 +182,83 @@ class WhatsAppSyncService:
                 logger.warning("Chat data missing chat_id, skipping")
                 return None
             
-            chat_type = chat_data.get('type', 'individual')
-            chat_name = chat_data.get('name', 'Unknown')
-            whatsapp_name = chat_data.get('whatsapp_name') or ''  # NOT NULL: @lid devuelve null
-            profile_picture_url = chat_data.get('profile_picture_url') or ''
-            
-            # Parse last message timestamp
-            last_message_at = None
-            last_message = chat_data.get('last_message')
-            if last_message and last_message.get('timestamp'):
-                try:
-                    timestamp = last_message['timestamp']
-                    if isinstance(timestamp, (int, float)):
-                        if timestamp > 1000000000000:  # Milliseconds
-                            last_message_at = timezone.datetime.fromtimestamp(
-                                timestamp / 1000, tz=timezone.utc
-                            )
-                        else:  # Seconds
-                            last_message_at = timezone.datetime.fromtimestamp(
-                                timestamp, tz=timezone.utc
-                            )
-                except (ValueError, TypeError, OSError) as e:
-                    logger.warning(f"Could not parse timestamp for chat {chat_id}: {e}")
-            
-            last_message_preview = ''
-            if last_message:
-                raw = last_message.get('text') or last_message.get('body') or ''
-                last_message_preview = (str(raw)[:255] if raw else '')
-            
-            # For groups, get additional info
-            defaults = {
-                'name': chat_name,
-                'type': chat_type,
-                'is_active': True,
-                'whatsapp_name': whatsapp_name,
-                'profile_picture_url': profile_picture_url,
-                'unread_count': chat_data.get('unread_count', 0) or 0,
-                'last_message_at': last_message_at,
-                'last_message_preview': last_message_preview
-            }
-            
-            if chat_type == 'group':
-                defaults['group_description'] = chat_data.get('description', '') or ''
-                defaults['participants'] = chat_data.get('participants', []) or []
+            values = self._parse_chat_data(chat_data)
+            chat_name = values['name']
             
             # Get or create chat
             chat, created = WhatsAppChat.objects.get_or_create(
                 chat_id=chat_id,
-                defaults=defaults
+                defaults=values
             )
             
             if created:
-                logger.info(f"Created chat: {chat_name} ({chat_type})")
+                logger.info(f"Created chat: {chat_name} ({values['type']})")
                 return 'created'
-            else:
-                # Update existing chat
-                update_fields = []
-                
-                # Update name if better (not Unknown, longer, or starts with +)
-                new_name = chat_data.get('name')
-                if new_name and new_name != chat.name and new_name != 'Unknown':
-                    if (chat.name == 'Unknown' or 
-                        'Unknown' in chat.name or
-                        len(new_name) > len(chat.name) or
-                        (new_name.startswith('+') and not chat.name.startswith('+'))):
-                        chat.name = new_name
-                        update_fields.append('name')
-                
-                # Update type if changed
-                if chat.type != chat_type:
-                    chat.type = chat_type
-                    update_fields.append('type')
-                
-                # Update WhatsApp name
-                if whatsapp_name and whatsapp_name != chat.whatsapp_name:
-                    chat.whatsapp_name = whatsapp_name
-                    update_fields.append('whatsapp_name')
-                
-                # Update profile picture
-                if profile_picture_url and profile_picture_url != chat.profile_picture_url:
-                    chat.profile_picture_url = profile_picture_url
-                    update_fields.append('profile_picture_url')
-                
-                # Update unread count
-                unread_count = chat_data.get('unread_count', 0)
-                if unread_count is not None and unread_count != chat.unread_count:
-                    chat.unread_count = unread_count
-                    update_fields.append('unread_count')
-                
-                # Update last message time if newer
-                if last_message_at and (
-                    not chat.last_message_at or last_message_at > chat.last_message_at
-                ):
-                    chat.last_message_at = last_message_at
-                    update_fields.append('last_message_at')
-                # Enterprise: update preview when sync has it (Node's latest message)
-                if last_message_preview and last_message_preview != getattr(chat, 'last_message_preview', ''):
-                    chat.last_message_preview = last_message_preview
-                    update_fields.append('last_message_preview')
-                
-                # For groups, update description and participants
-                if chat_type == 'group':
-                    description = chat_data.get('description', '')
-                    if description and description != chat.group_description:
-                        chat.group_description = description
-                        update_fields.append('group_description')
-                    
-                    participants = chat_data.get('participants', [])
-                    if participants:
-                        chat.participants = participants
-                        update_fields.append('participants')
-                
-                if update_fields:
-                    if commit:
-                        chat.save(update_fields=update_fields)
-                    else:
-                        # In transaction, will be saved when transaction commits
-                        chat.save(update_fields=update_fields)
-                    logger.info(f"Updated chat: {chat_name} ({', '.join(update_fields)})")
-                    return 'updated'
-                
-                return None
+
+            update_fields = self._apply_chat_changes(chat, chat_data, values)
+            if update_fields:
+                chat.save(update_fields=update_fields)
+                logger.info(f"Updated chat: {chat_name} ({', '.join(update_fields)})")
+                return 'updated'
+            
+            return None
                 
         except Exception as e:
             logger.error(f"Error syncing chat {chat_data.get('chat_id', 'unknown')}: {e}", exc_info=True)
             return None
+
+    def sync_chats_bulk(self, chats_data: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        🚀 ENTERPRISE: Sync many chats with one prefetch, chunked bulk_create and one bulk_update.
+
+        Same create/update rules as sync_chat. Returns
+        {'created', 'updated', 'total', 'seconds', 'chats_per_sec'}.
+        """
+        started = time.perf_counter()
+        payloads = {}
+        for chat_data in chats_data:
+            chat_id = chat_data.get('chat_id')
+            if not chat_id:
+                logger.warning("Chat data missing chat_id, skipping")
+                continue
+            payloads[chat_id] = chat_data  # Last payload wins for duplicated chat_ids
+
+        existing = {}
+        for ids in _chunks(list(payloads), self.BULK_BATCH_SIZE * 2):
+            existing.update((chat.chat_id, chat) for chat in WhatsAppChat.objects.filter(chat_id__in=ids))
+
+        to_create = []
+        to_update = []
+        for chat_id, chat_data in payloads.items():
+            try:
+                values = self._parse_chat_data(chat_data)
+                chat = existing.get(chat_id)
+                if chat is None:
+                    to_create.append(WhatsAppChat(chat_id=chat_id, **values))
+                elif self._apply_chat_changes(chat, chat_data, values):
+                    to_update.append(chat)
+            except Exception as e:
+                logger.error(f"Error syncing chat {chat_id}: {e}", exc_info=True)
+
+        with transaction.atomic():
+            for batch in _chunks(to_create, self.BULK_BATCH_SIZE):
+                WhatsAppChat.objects.bulk_create(batch, ignore_conflicts=True)
+            if to_update:
+                WhatsAppChat.objects.bulk_update(to_update, self.CHAT_UPDATE_FIELDS, batch_size=self.BULK_BATCH_SIZE)
+
+        seconds = time.perf_counter() - started
+        synced = len(to_create) + len(to_update)
+        logger.info(
+            f"[SYNC] Chats: {len(to_create)} created, {len(to_update)} updated in {seconds:.2f}s "
+            f"({_rate(synced, seconds)} chats/s)"
+        )
+        return {
+            'created': len(to_create),
+            'updated': len(to_update),
+            'total': len(chats_data),
+            'seconds': round(seconds, 3),
+            'chats_per_sec': _rate(synced, seconds),
+        }
     
     def sync_all_groups(self) -> Dict[str, int]:
         """
@@ -200,26 +272,12 @@ class WhatsAppSyncService:
             
             logger.info(f"Syncing {len(groups_data)} groups from Node.js service...")
             
-            created_count = 0
-            updated_count = 0
-            
-            with transaction.atomic():
-                for group_data in groups_data:
-                    # Asegurar que el tipo sea 'group' para datos de grupos
-                    group_data['type'] = 'group'
-                    result = self.sync_chat(group_data, commit=False)
-                    if result == 'created':
-                        created_count += 1
-                    elif result == 'updated':
-                        updated_count += 1
-            
-            logger.info(f"Group sync completed: {created_count} created, {updated_count} updated")
-            
-            return {
-                'created': created_count,
-                'updated': updated_count,
-                'total': len(groups_data)
-            }
+            # Asegurar que el tipo sea 'group' para datos de grupos
+            for group_data in groups_data:
+                group_data['type'] = 'group'
+            result = self.sync_chats_bulk(groups_data)
+            logger.info(f"Group sync completed: {result['created']} created, {result['updated']} updated")
+            return result
         except Exception as e:
             logger.error(f"Error syncing all groups: {e}", exc_info=True)
             raise
@@ -261,109 +319,182 @@ class WhatsAppSyncService:
         """
         Sync message history for a specific chat.
         Returns dict with counts: {'created': X, 'updated': Y, 'total': Z}
+        plus 'seconds' and 'messages_per_sec'.
         """
-        from apps.whatsapp.models import WhatsAppMessage, WhatsAppChat
-        from django.db import transaction
-        
-        try:
-            # Get messages from Node.js service
-            response = self.whatsapp_service.get_chat_messages(chat_id, limit=limit)
-            messages_data = response.get('messages', [])
-            
-            logger.info(f"Syncing {len(messages_data)} messages for chat {chat_id}...")
-            
-            # Get or create chat (robustez: crear si no existe para evitar fallo silencioso)
+        result = self.sync_chats_messages([chat_id], limit=limit)
+        chat_result = result['chats'].get(chat_id)
+        if chat_result is None:
+            raise RuntimeError(result['errors'].get(chat_id, f"Message sync failed for {chat_id}"))
+        return chat_result
+
+    def sync_chats_messages(self, chat_ids: List[str], limit: int = 1000) -> Dict[str, Any]:
+        """
+        🚀 ENTERPRISE: Sync message history for several chats.
+
+        Messages are inserted per chat in chunked bulk_create calls; the preview /
+        last-message fields of every chat are written with one bulk_update at the end.
+        Returns {'chats': {chat_id: counts}, 'errors': {chat_id: error}, 'created',
+        'total', 'seconds', 'messages_per_sec'}.
+        """
+        started = time.perf_counter()
+        chats = self._get_or_create_chats(chat_ids)
+        results = {}
+        errors = {}
+        changed_chats = {}
+
+        for chat_id in chat_ids:
+            chat_started = time.perf_counter()
             try:
-                chat = WhatsAppChat.objects.get(chat_id=chat_id)
-            except WhatsAppChat.DoesNotExist:
-                chat_type = 'group' if '@g.us' in chat_id else 'individual'
-                chat = WhatsAppChat.objects.create(
-                    chat_id=chat_id,
-                    name=chat_id,
-                    type=chat_type,
-                    is_active=True,
-                    whatsapp_name='',
-                    last_message_preview=''
-                )
-                logger.info(f"Created chat {chat_id} for message sync")
-            
-            created_count = 0
-            updated_count = 0
-            
-            with transaction.atomic():
-                for msg_data in messages_data:
-                    whatsapp_id = msg_data.get('whatsapp_id') or msg_data.get('id')
-                    if not whatsapp_id:
-                        logger.warning(f"Message missing whatsapp_id, skipping")
-                        continue
-                    
-                    # Check if message already exists (idempotency)
-                    existing_message = WhatsAppMessage.objects.filter(whatsapp_id=whatsapp_id).first()
-                    
-                    if existing_message:
-                        # Message already exists, skip
-                        continue
-                    
-                    # Parse timestamp
-                    raw_timestamp = msg_data.get('timestamp')
-                    message_timestamp = timezone.now()
-                    
-                    if isinstance(raw_timestamp, (int, float)) and raw_timestamp > 0:
-                        try:
-                            if raw_timestamp > 10000000000:  # Milliseconds
-                                message_timestamp = timezone.datetime.fromtimestamp(
-                                    raw_timestamp / 1000, tz=timezone.utc
-                                )
-                            else:  # Seconds
-                                message_timestamp = timezone.datetime.fromtimestamp(
-                                    raw_timestamp, tz=timezone.utc
-                                )
-                        except (ValueError, OSError) as e:
-                            logger.warning(f"Could not parse timestamp {raw_timestamp}: {e}")
-                            message_timestamp = timezone.now()
-                    
-                    # Prepare metadata for group messages
-                    message_metadata = {}
-                    if msg_data.get('chat_type') == 'group' and msg_data.get('sender_name'):
-                        message_metadata['sender_name'] = msg_data.get('sender_name')
-                    if msg_data.get('chat_type') == 'group' and msg_data.get('sender_phone'):
-                        message_metadata['sender_phone'] = msg_data.get('sender_phone')
-                    
-                    # Create message
-                    create_kwargs = dict(
-                        whatsapp_id=whatsapp_id,
-                        phone=msg_data.get('phone', ''),
-                        type=msg_data.get('type', 'in'),
-                        content=msg_data.get('content', ''),
-                        timestamp=message_timestamp,
-                        chat=chat,
-                        is_automated=False,
-                        metadata=message_metadata if message_metadata else {}
-                    )
-                    if msg_data.get('media_type'):
-                        create_kwargs['media_type'] = msg_data.get('media_type')
-                    if msg_data.get('reply_to_whatsapp_id'):
-                        create_kwargs['reply_to_whatsapp_id'] = msg_data.get('reply_to_whatsapp_id')
-                    WhatsAppMessage.objects.create(**create_kwargs)
-                    created_count += 1
-            
-            # Enterprise: update chat last_message_preview from most recent message
-            if messages_data:
-                latest = max(messages_data, key=lambda m: m.get('timestamp') or 0)  # by timestamp desc
-                preview_raw = latest.get('content') or latest.get('text') or latest.get('body') or ''
-                preview = (str(preview_raw)[:255] if preview_raw else '')
-                if preview and (not chat.last_message_preview or preview != chat.last_message_preview):
-                    chat.last_message_preview = preview
-                    chat.save(update_fields=['last_message_preview'])
-            
-            logger.info(f"Message sync completed for {chat_id}: {created_count} created")
-            
-            return {
+                # Get messages from Node.js service
+                response = self.whatsapp_service.get_chat_messages(chat_id, limit=limit)
+                messages_data = response.get('messages', [])
+                logger.info(f"Syncing {len(messages_data)} messages for chat {chat_id}...")
+
+                chat = chats[chat_id]
+                created_count = self._bulk_insert_messages(chat, messages_data)
+                if self._apply_latest_message(chat, messages_data):
+                    changed_chats[chat_id] = chat
+            except Exception as e:
+                logger.error(f"Error syncing messages for chat {chat_id}: {e}", exc_info=True)
+                errors[chat_id] = str(e)
+                continue
+
+            seconds = time.perf_counter() - chat_started
+            results[chat_id] = {
                 'created': created_count,
-                'updated': updated_count,
-                'total': len(messages_data)
+                'updated': 0,
+                'total': len(messages_data),
+                'seconds': round(seconds, 3),
+                'messages_per_sec': _rate(len(messages_data), seconds),
             }
-        except Exception as e:
-            logger.error(f"Error syncing messages for chat {chat_id}: {e}", exc_info=True)
-            raise
+            logger.info(
+                f"Message sync completed for {chat_id}: {created_count} created "
+                f"({results[chat_id]['messages_per_sec']} messages/s)"
+            )
+
+        if changed_chats:
+            WhatsAppChat.objects.bulk_update(
+                list(changed_chats.values()),
+                ['last_message_preview', 'last_message_at'],
+                batch_size=self.BULK_BATCH_SIZE,
+            )
+
+        seconds = time.perf_counter() - started
+        total = sum(r['total'] for r in results.values())
+        created = sum(r['created'] for r in results.values())
+        logger.info(
+            f"[SYNC] Messages: {created} created of {total} in {len(results)} chats in {seconds:.2f}s "
+            f"({_rate(total, seconds)} messages/s)"
+        )
+        return {
+            'chats': results,
+            'errors': errors,
+            'created': created,
+            'total': total,
+            'seconds': round(seconds, 3),
+            'messages_per_sec': _rate(total, seconds),
+        }
 
+    def _get_or_create_chats(self, chat_ids: List[str]) -> Dict[str, WhatsAppChat]:
+        """Chats by chat_id; missing ones are created (robustez: evitar fallo silencioso)."""
+        chats = {chat.chat_id: chat for chat in WhatsAppChat.objects.filter(chat_id__in=chat_ids)}
+        missing = [
+            WhatsAppChat(
+                chat_id=chat_id,
+                name=chat_id,
+                type='group' if '@g.us' in chat_id else 'individual',
+                is_active=True,
+                whatsapp_name='',
+                last_message_preview='',
+            )
+            for chat_id in dict.fromkeys(chat_ids) if chat_id not in chats
+        ]
+        if missing:
+            WhatsAppChat.objects.bulk_create(missing, ignore_conflicts=True)
+            chats.update(
+                (chat.chat_id, chat)
+                for chat in WhatsAppChat.objects.filter(chat_id__in=[c.chat_id for c in missing])
+            )
+            logger.info(f"Created {len(missing)} chats for message sync")
+        return chats
+
+    @staticmethod
+    def _build_message(chat: WhatsAppChat, whatsapp_id: str, msg_data: Dict[str, Any]) -> WhatsAppMessage:
+        # Parse timestamp
+        raw_timestamp = msg_data.get('timestamp')
+        message_timestamp = timezone.now()
+        if isinstance(raw_timestamp, (int, float)) and raw_timestamp > 0:
+            try:
+                message_timestamp = _parse_epoch(raw_timestamp, MESSAGE_TIMESTAMP_MS_THRESHOLD)
+            except (ValueError, OSError) as e:
+                logger.warning(f"Could not parse timestamp {raw_timestamp}: {e}")
+
+        # Prepare metadata for group messages
+        message_metadata = {}
+        if msg_data.get('chat_type') == 'group' and msg_data.get('sender_name'):
+            message_metadata['sender_name'] = msg_data.get('sender_name')
+        if msg_data.get('chat_type') == 'group' and msg_data.get('sender_phone'):
+            message_metadata['sender_phone'] = msg_data.get('sender_phone')
+
+        message = WhatsAppMessage(
+            whatsapp_id=whatsapp_id,
+            phone=msg_data.get('phone', ''),
+            type=msg_data.get('type', 'in'),
+            content=msg_data.get('content', ''),
+            timestamp=message_timestamp,
+            chat=chat,
+            is_automated=False,
+            metadata=message_metadata,
+        )
+        if msg_data.get('media_type'):
+            message.media_type = msg_data.get('media_type')
+        if msg_data.get('reply_to_whatsapp_id'):
+            message.reply_to_whatsapp_id = msg_data.get('reply_to_whatsapp_id')
+        return message
+
+    def _bulk_insert_messages(self, chat: WhatsAppChat, messages_data: List[Dict[str, Any]]) -> int:
+        """Insert the messages not stored yet (idempotent by whatsapp_id); returns how many."""
+        by_id = {}
+        for msg_data in messages_data:
+            whatsapp_id = msg_data.get('whatsapp_id') or msg_data.get('id')
+            if not whatsapp_id:
+                logger.warning("Message missing whatsapp_id, skipping")
+                continue
+            by_id.setdefault(whatsapp_id, msg_data)
+
+        known = set()
+        for ids in _chunks(list(by_id), self.BULK_BATCH_SIZE * 2):
+            known.update(WhatsAppMessage.objects.filter(whatsapp_id__in=ids).values_list('whatsapp_id', flat=True))
+
+        new_messages = [
+            self._build_message(chat, whatsapp_id, msg_data)
+            for whatsapp_id, msg_data in by_id.items() if whatsapp_id not in known
+        ]
+        with transaction.atomic():
+            for batch in _chunks(new_messages, self.BULK_BATCH_SIZE):
+                # ignore_conflicts: a concurrent webhook may store the same message first
+                WhatsAppMessage.objects.bulk_create(batch, ignore_conflicts=True)
+        return len(new_messages)
+
+    @staticmethod
+    def _apply_latest_message(chat: WhatsAppChat, messages_data: List[Dict[str, Any]]) -> bool:
+        """Enterprise: update chat preview / last_message_at from the most recent message (in memory)."""
+        if not messages_data:
+            return False
+        latest = max(messages_data, key=lambda m: m.get('timestamp') or 0)  # by timestamp desc
+        changed = False
+        preview_raw = latest.get('content') or latest.get('text') or latest.get('body') or ''
+        preview = (str(preview_raw)[:255] if preview_raw else '')
+        if preview and (not chat.last_message_preview or preview != chat.last_message_preview):
+            chat.last_message_preview = preview
+            changed = True
+        raw_timestamp = latest.get('timestamp')
+        if isinstance(raw_timestamp, (int, float)) and raw_timestamp > 0:
+            try:
+                latest_at = _parse_epoch(raw_timestamp, MESSAGE_TIMESTAMP_MS_THRESHOLD)
+            except (ValueError, OSError):
+                latest_at = None
+            if latest_at and (not chat.last_message_at or latest_at > chat.last_message_at):
+                chat.last_message_at = latest_at
+                changed = True
+        return changed
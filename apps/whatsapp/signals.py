@@ -0,0 +1,27 @@
+"""Signals for the WhatsApp app: keep the in-process code index in sync."""
+
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from apps.erasmus.models import ContestParticipationCode, ErasmusMagicLink
+from apps.whatsapp.models import WhatsAppReservationCode
+from apps.whatsapp.services.code_index import record_instance_change
+
+INDEXED_CODE_MODELS = (WhatsAppReservationCode, ErasmusMagicLink, ContestParticipationCode)
+
+
+def code_saved(sender, instance, raw=False, **kwargs):
+    """Publish the code state once the transaction commits (rolled back changes never reach the index)."""
+    if not raw:
+        transaction.on_commit(partial(record_instance_change, instance))
+
+
+def code_deleted(sender, instance, **kwargs):
+    transaction.on_commit(partial(record_instance_change, instance, deleted=True))
+
+
+for _model in INDEXED_CODE_MODELS:
+    post_save.connect(code_saved, sender=_model, dispatch_uid=f"code_index_save_{_model.__name__}")
+    post_delete.connect(code_deleted, sender=_model, dispatch_uid=f"code_index_delete_{_model.__name__}")
@@ -0,0 +1,107 @@
+"""
+Tests for the in-process code index used by MessageParser (apps.whatsapp.services.code_index).
+Matching, sync through signals / cache change log, and parse_message without DB queries.
+"""
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from apps.whatsapp.services.code_index import (
+    KIND_ERASMUS,
+    KIND_RESERVATION,
+    ActiveCodeIndex,
+    CodeMatcher,
+    code_index,
+)
+from apps.whatsapp.services.message_parser import MessageParser
+from core.testing import create_reservation_code_raw
+
+
+class CodeMatcherTests(TestCase):
+    """Single-pass substring search over a set of codes."""
+
+    def test_find_is_case_insensitive_leftmost_then_longest(self):
+        matcher = CodeMatcher(["promo-ab", "PROMO-ABC", "ZZ-1"])
+        self.assertEqual(matcher.find("hola, mi código es promo-abc y zz-1"), "PROMO-ABC")
+        self.assertEqual(matcher.find("zz-1 antes que PROMO-AB"), "ZZ-1")
+        self.assertIsNone(matcher.find("sin códigos"))
+        self.assertIsNone(CodeMatcher().find("PROMO-ABC"))
+
+    def test_add_and_discard(self):
+        matcher = CodeMatcher(["ONE-1"])
+        matcher.add("two-22")
+        self.assertIn("TWO-22", matcher)
+        matcher.discard("ONE-1")
+        self.assertNotIn("one-1", matcher)
+        self.assertEqual(len(matcher), 1)
+        self.assertEqual(matcher.find("x two-22 x"), "TWO-22")
+
+
+class CodeIndexSyncTests(TestCase):
+    """Index contents follow committed changes in this and other workers."""
+
+    def setUp(self):
+        cache.clear()
+        code_index.reset()
+
+    def test_parse_message_finds_active_code_without_db_queries(self):
+        create_reservation_code_raw(code="PROMO2026XYZ")
+        code_index.load()
+
+        with self.assertNumQueries(0):
+            parsed = MessageParser.parse_message("Hola! quiero reservar con promo2026xyz para 2 personas")
+        self.assertEqual(parsed["reservation_code"], "PROMO2026XYZ")
+        self.assertEqual(parsed["passengers"], 2)
+
+        with self.assertNumQueries(0):
+            parsed = MessageParser.parse_message("Hola, ¿tienen disponibilidad?")
+        self.assertIsNone(parsed["reservation_code"])
+        self.assertIsNone(parsed["erasmus_code"])
+
+    def test_signals_add_and_remove_codes_after_commit(self):
+        code_index.load()
+        with self.captureOnCommitCallbacks(execute=True):
+            code_obj = create_reservation_code_raw(code="PROMO-NEW-1")
+        self.assertTrue(code_index.contains(KIND_RESERVATION, "PROMO-NEW-1"))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            code_obj.status = "linked"
+            code_obj.save(update_fields=["status"])
+        self.assertFalse(code_index.contains(KIND_RESERVATION, "PROMO-NEW-1"))
+
+    def test_other_worker_replays_changes_from_cache(self):
+        worker = ActiveCodeIndex()
+        worker.load()
+        code_index.load()
+
+        code_index.record_change(KIND_RESERVATION, "PROMO-REPLAY", True)
+        code_index.record_change(KIND_ERASMUS, "ERAS-QWERTY12", True)
+        with self.assertNumQueries(0):
+            self.assertEqual(worker.find(KIND_RESERVATION, "usar promo-replay"), "PROMO-REPLAY")
+            self.assertTrue(worker.contains(KIND_ERASMUS, "ERAS-QWERTY12"))
+
+        code_index.record_change(KIND_RESERVATION, "PROMO-REPLAY", False)
+        self.assertIsNone(worker.find(KIND_RESERVATION, "usar promo-replay"))
+
+    def test_missing_change_log_entry_triggers_full_reload(self):
+        create_reservation_code_raw(code="PROMO-DB-ONLY")
+        worker = ActiveCodeIndex()
+        worker.load()
+        code_index.load()
+        code_index.record_change(KIND_RESERVATION, "PROMO-EVICTED", True)
+        cache.delete("whatsapp:code_index:change:1")
+
+        with self.assertNumQueries(3):
+            self.assertTrue(worker.contains(KIND_RESERVATION, "PROMO-DB-ONLY"))
+        self.assertFalse(worker.contains(KIND_RESERVATION, "PROMO-EVICTED"))
+
+    def test_erasmus_fallback_uses_index(self):
+        code_index.load()
+        code_index.record_change(KIND_ERASMUS, "ERAS-ZZ99", True)
+        with self.assertNumQueries(0):
+            self.assertEqual(MessageParser.extract_erasmus_code("mi código: eras-zz99"), "ERAS-ZZ99")
+            self.assertIsNone(MessageParser.extract_erasmus_code("mi código: ERAS-ZZ98"))
+
+    @override_settings(WHATSAPP_CODE_INDEX={'ENABLED': False})
+    def test_disabled_index_falls_back_to_db(self):
+        create_reservation_code_raw(code="PROMO-LEGACY")
+        self.assertEqual(MessageParser.extract_reservation_code("promo-legacy"), "PROMO-LEGACY")
@@ -0,0 +1,121 @@
+"""
+Tests for WhatsAppSyncService batched sync: chats (bulk create/update) and message history
+(prefetched whatsapp_ids, chunked bulk_create, one chat bulk_update).
+"""
+from unittest.mock import patch
+
+from django.test import TestCase
+
+from apps.whatsapp.models import WhatsAppChat, WhatsAppMessage
+from apps.whatsapp.services.sync_service import WhatsAppSyncService
+from core.testing import create_whatsapp_chat, create_whatsapp_message
+
+BASE_TS = 1767225600  # 2026-01-01T00:00:00Z
+
+
+def _messages(count, start=0, chat_type='group'):
+    return [
+        {
+            'whatsapp_id': f'wa-{i}',
+            'phone': '56911111111',
+            'type': 'in',
+            'content': f'mensaje {i}',
+            'timestamp': (BASE_TS + i) * 1000,
+            'chat_type': chat_type,
+            'sender_name': 'Ana',
+        }
+        for i in range(start, start + count)
+    ]
+
+
+@patch('apps.whatsapp.services.sync_service.WhatsAppWebService')
+class WhatsAppSyncServiceMessagesTests(TestCase):
+    """sync_chat_messages / sync_chats_messages."""
+
+    def test_inserts_only_new_messages_in_constant_queries(self, mock_client):
+        chat = create_whatsapp_chat(chat_id='120363000000000001@g.us', name='Grupo', type='group')
+        create_whatsapp_message(chat=chat, whatsapp_id='wa-0', content='ya guardado')
+        messages = _messages(1200) + _messages(3)  # duplicated ids in the payload
+        mock_client.return_value.get_chat_messages.return_value = {'messages': messages}
+
+        service = WhatsAppSyncService()
+        service.BULK_BATCH_SIZE = 500
+        with self.assertNumQueries(9):
+            result = service.sync_chat_messages(chat.chat_id, limit=2000)
+
+        self.assertEqual(result['created'], 1199)
+        self.assertEqual(result['total'], 1203)
+        self.assertGreater(result['messages_per_sec'], 0)
+        self.assertEqual(WhatsAppMessage.objects.filter(chat=chat).count(), 1200)
+        stored = WhatsAppMessage.objects.get(whatsapp_id='wa-5')
+        self.assertEqual(stored.metadata, {'sender_name': 'Ana'})
+        self.assertEqual(int(stored.timestamp.timestamp()), BASE_TS + 5)
+
+        chat.refresh_from_db()
+        self.assertEqual(chat.last_message_preview, 'mensaje 1199')
+        self.assertEqual(int(chat.last_message_at.timestamp()), BASE_TS + 1199)
+
+        # Re-sync is idempotent
+        result = service.sync_chat_messages(chat.chat_id)
+        self.assertEqual(result['created'], 0)
+        self.assertEqual(WhatsAppMessage.objects.filter(chat=chat).count(), 1200)
+
+    def test_sync_chats_messages_creates_missing_chat_and_reports_errors(self, mock_client):
+        def get_chat_messages(chat_id, limit):
+            if chat_id == 'broken@c.us':
+                raise ConnectionError('503')
+            return {'messages': _messages(2, chat_type='individual')}
+
+        mock_client.return_value.get_chat_messages.side_effect = get_chat_messages
+
+        result = WhatsAppSyncService().sync_chats_messages(['56922222222@c.us', 'broken@c.us'])
+
+        self.assertEqual(result['created'], 2)
+        self.assertIn('broken@c.us', result['errors'])
+        chat = WhatsAppChat.objects.get(chat_id='56922222222@c.us')
+        self.assertEqual(chat.type, 'individual')
+        self.assertEqual(chat.messages.count(), 2)
+        self.assertEqual(chat.last_message_preview, 'mensaje 1')
+
+        with self.assertRaises(RuntimeError):
+            WhatsAppSyncService().sync_chat_messages('broken@c.us')
+
+
+@patch('apps.whatsapp.services.sync_service.WhatsAppWebService')
+class WhatsAppSyncServiceChatsTests(TestCase):
+    """sync_all_chats / sync_all_groups."""
+
+    def test_sync_all_chats_bulk_creates_and_updates(self, mock_client):
+        create_whatsapp_chat(chat_id='56933333333@c.us', name='Unknown', type='individual')
+        create_whatsapp_chat(chat_id='56944444444@c.us', name='Sin cambios', type='individual')
+        chats = [
+            {'chat_id': '56933333333@c.us', 'name': 'Juan Pérez', 'type': 'individual',
+             'last_message': {'timestamp': (BASE_TS + 10) * 1000, 'text': 'hola'}},
+            {'chat_id': '56944444444@c.us', 'name': 'Sin cambios', 'type': 'individual', 'unread_count': 0},
+        ] + [
+            {'chat_id': f'5695{i:07d}@c.us', 'name': f'Cliente {i}', 'type': 'individual'}
+            for i in range(50)
+        ] + [{'name': 'sin id'}]
+        mock_client.return_value.get_chats.return_value = {'chats': chats}
+
+        with self.assertNumQueries(5):
+            result = WhatsAppSyncService().sync_all_chats()
+
+        self.assertEqual(result, {**result, 'created': 50, 'updated': 1, 'total': 53})
+        updated = WhatsAppChat.objects.get(chat_id='56933333333@c.us')
+        self.assertEqual(updated.name, 'Juan Pérez')
+        self.assertEqual(updated.last_message_preview, 'hola')
+        self.assertEqual(int(updated.last_message_at.timestamp()), BASE_TS + 10)
+        self.assertEqual(WhatsAppChat.objects.count(), 52)
+
+    def test_sync_all_groups_sets_group_type_and_participants(self, mock_client):
+        mock_client.return_value.get_groups.return_value = {'groups': [
+            {'chat_id': '120363000000000002@g.us', 'name': 'Operadores', 'participants': [{'id': 'a'}]},
+        ]}
+
+        result = WhatsAppSyncService().sync_all_groups()
+
+        self.assertEqual(result['created'], 1)
+        group = WhatsAppChat.objects.get(chat_id='120363000000000002@g.us')
+        self.assertEqual(group.type, 'group')
+        self.assertEqual(group.participants, [{'id': 'a'}])
@@ -25,10 +25,10 @@ app.autodiscover_tasks()
 
 # 🚀 ENTERPRISE PERIODIC TASKS SCHEDULE
 app.conf.beat_schedule = {
-    # Critical: Clean expired ticket holds every 5 minutes
+    # Critical: Sweep expired holds (tickets, coupons, experiences) every minute
     'cleanup-expired-holds': {
         'task': 'apps.events.tasks.cleanup_expired_ticket_holds',
-        'schedule': crontab(minute='*/5'),  # Every 5 minutes
+        'schedule': crontab(minute='*'),  # Every minute (request paths no longer release holds)
         'options': {
             'queue': 'critical',  # High priority queue
             'routing_key': 'critical.cleanup_holds',
@@ -86,6 +86,24 @@ app.conf.beat_schedule = {
             'routing_key': 'maintenance.uptime_cleanup',
         }
     },
+    # Revenue rollups: drop hour buckets outside the retention window (day buckets are kept)
+    'prune-hourly-revenue-rollups': {
+        'task': 'core.tasks.prune_hourly_revenue_rollups',
+        'schedule': crontab(hour=4, minute=15),  # Daily at 4:15 AM
+        'options': {
+            'queue': 'maintenance',
+            'routing_key': 'maintenance.revenue_rollups',
+        }
+    },
+    # Background exports: delete files once their download window (EVENT_EXPORTS['LINK_TTL']) is over
+    'purge-expired-event-exports': {
+        'task': 'apps.events.tasks.purge_expired_event_exports',
+        'schedule': crontab(minute=30),  # Hourly
+        'options': {
+            'queue': 'maintenance',
+            'routing_key': 'maintenance.exports',
+        }
+    },
     # WhatsApp group outreach: primer mensaje a participantes (delays humanos, 1 por run)
     'run-group-outreach': {
         'task': 'apps.whatsapp.tasks.run_group_outreach',
@@ -100,6 +118,8 @@ app.conf.beat_schedule = {
 # 🚀 ENTERPRISE TASK ROUTING
 app.conf.task_routes = {
     'apps.events.tasks.cleanup_expired_ticket_holds': {'queue': 'critical'},
+    'apps.events.tasks.flush_ticket_inventory': {'queue': 'critical'},
+    'apps.events.tasks.reconcile_ticket_inventory': {'queue': 'critical'},
     'apps.events.tasks.send_ticket_confirmation_email': {'queue': 'emails'},
     'apps.events.tasks.send_order_confirmation_email': {'queue': 'emails'},  # 🚀 ENTERPRISE: Routing explícito para emails instantáneos
     'apps.events.tasks.ensure_pending_emails_sent': {'queue': 'emails'},  # 🚀 ENTERPRISE: Fallback automático
@@ -107,6 +127,10 @@ app.conf.task_routes = {
     'apps.events.tasks.send_welcome_organizer_email': {'queue': 'emails'},
     'apps.events.tasks.schedule_event_reminders': {'queue': 'emails'},
     'apps.events.tasks.generate_ticket_pdf': {'queue': 'documents'},
+    'apps.events.tasks.generate_order_tickets_qr': {'queue': 'documents'},
+    'apps.events.tasks.export_event_data': {'queue': 'documents'},
+    'apps.media.tasks.generate_media_derivatives': {'queue': 'documents'},
+    'apps.validation.tasks.flush_validation_logs': {'queue': 'critical'},
 
     # Experiences emails
     'apps.experiences.tasks.send_experience_confirmation_email': {'queue': 'emails'},
@@ -116,6 +140,11 @@ app.conf.task_routes = {
     # Uptime heartbeat + cleanup
     'core.tasks.record_platform_uptime_heartbeat': {'queue': 'maintenance'},
     'core.tasks.cleanup_old_uptime_heartbeats': {'queue': 'maintenance'},
+    'core.tasks.prune_hourly_revenue_rollups': {'queue': 'maintenance'},
+    'core.tasks.drain_analytics_buffer': {'queue': 'maintenance'},
+    'core.tasks.prune_celery_task_stats': {'queue': 'maintenance'},
+    'core.tasks.drain_flow_event_stream': {'queue': 'maintenance'},
+    'apps.events.tasks.purge_expired_event_exports': {'queue': 'maintenance'},
 
     # WhatsApp group outreach
     'apps.whatsapp.tasks.run_group_outreach': {'queue': 'default'},
@@ -150,6 +179,79 @@ if getattr(settings, 'WOOCOMMERCE_SYNC_ENABLED', False):
     'apps.sync_woocommerce.tasks.test_woocommerce_connection': {'queue': 'default'},
     })
 
+# Redis inventory engine: drain the hold log every few seconds and reconcile counters every minute
+if getattr(settings, 'TICKET_INVENTORY', {}).get('ENGINE') == 'redis':
+    app.conf.beat_schedule.update({
+        'flush-ticket-inventory': {
+            'task': 'apps.events.tasks.flush_ticket_inventory',
+            'schedule': settings.TICKET_INVENTORY.get('FLUSH_INTERVAL_SECONDS', 5),
+            'options': {
+                'queue': 'critical',
+                'routing_key': 'critical.inventory_flush',
+            }
+        },
+        'reconcile-ticket-inventory': {
+            'task': 'apps.events.tasks.reconcile_ticket_inventory',
+            'schedule': crontab(minute='*'),  # Every minute
+            'options': {
+                'queue': 'critical',
+                'routing_key': 'critical.inventory_reconcile',
+            }
+        },
+    })
+
+# Redis validation engine: persist queued scanner validation logs every few seconds
+if getattr(settings, 'VALIDATION_ENGINE', {}).get('ENGINE') == 'redis':
+    app.conf.beat_schedule.update({
+        'flush-validation-logs': {
+            'task': 'apps.validation.tasks.flush_validation_logs',
+            'schedule': settings.VALIDATION_ENGINE.get('LOG_FLUSH_INTERVAL_SECONDS', 5),
+            'options': {
+                'queue': 'critical',
+                'routing_key': 'critical.validation_logs',
+            }
+        },
+    })
+
+# Buffered analytics ingestion: bulk-write queued event views and ad interactions every few seconds
+if getattr(settings, 'ANALYTICS_INGEST', {}).get('BUFFERED'):
+    app.conf.beat_schedule.update({
+        'drain-analytics-buffer': {
+            'task': 'core.tasks.drain_analytics_buffer',
+            'schedule': settings.ANALYTICS_INGEST.get('DRAIN_INTERVAL_SECONDS', 5),
+            'options': {
+                'queue': 'maintenance',
+                'routing_key': 'maintenance.analytics_drain',
+            }
+        },
+    })
+
+# Aggregated task telemetry: drop CeleryTaskStat buckets past retention
+if getattr(settings, 'CELERY_TELEMETRY', {}).get('MODE') == 'aggregate':
+    app.conf.beat_schedule.update({
+        'prune-celery-task-stats': {
+            'task': 'core.tasks.prune_celery_task_stats',
+            'schedule': crontab(hour=4, minute=30),  # Daily at 4:30 AM
+            'options': {
+                'queue': 'maintenance',
+                'routing_key': 'maintenance.task_stats',
+            }
+        },
+    })
+
+# Streamed flow events: bulk-write PlatformFlowEvent rows queued in Redis every few seconds
+if getattr(settings, 'FLOW_LOGGER', {}).get('MODE') == 'stream':
+    app.conf.beat_schedule.update({
+        'drain-flow-event-stream': {
+            'task': 'core.tasks.drain_flow_event_stream',
+            'schedule': settings.FLOW_LOGGER.get('DRAIN_INTERVAL_SECONDS', 5),
+            'options': {
+                'queue': 'maintenance',
+                'routing_key': 'maintenance.flow_events',
+            }
+        },
+    })
+
 # 🚀 ENTERPRISE CELERY CONFIGURATION
 app.conf.update(
     timezone='America/Santiago',
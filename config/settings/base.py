@@ -27,6 +27,7 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'django.contrib.sites',
+    'django.contrib.postgres',  # Full-text/trigram search lookups (public search index)
     
     # Third party apps
     'rest_framework',
@@ -82,6 +83,7 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'allauth.account.middleware.AccountMiddleware',
+    'core.middleware.FlowEventBufferMiddleware',  # No-op unless FLOW_LOGGER['MODE'] buffers
 ]
 
 ROOT_URLCONF = 'config.urls'
@@ -274,6 +276,16 @@ EMAIL_TIMEOUT = 10  # 10 segundos (antes 30s)
 EMAIL_SSL_CERTFILE = None
 EMAIL_SSL_KEYFILE = None
 
+# 🚀 ENTERPRISE: Persistent SMTP connections per worker (core.smtp_pool)
+SMTP_POOL = {
+    'ENABLED': config('SMTP_POOL_ENABLED', default=True, cast=bool),  # False = new connection per send
+    'MAX_CONNECTIONS': config('SMTP_POOL_MAX_CONNECTIONS', default=4, cast=int),  # Per process
+    'BATCH_CONNECTIONS': config('SMTP_POOL_BATCH_CONNECTIONS', default=2, cast=int),  # Used by send_batch backlogs
+    'MAX_IDLE_SECONDS': 240,  # Close connections idle longer than this (servers drop them around 5 min)
+    'NOOP_AFTER_SECONDS': 30,  # Probe connections idle longer than this with NOOP before reuse
+    'ACQUIRE_TIMEOUT': 30,
+}
+
 # Stripe settings
 STRIPE_PUBLIC_KEY = config('STRIPE_PUBLIC_KEY', default='')
 STRIPE_SECRET_KEY = config('STRIPE_SECRET_KEY', default='')
@@ -305,6 +317,7 @@ MIGRATION_SYSTEM = {
     'CHECKPOINT_DIR': BASE_DIR / 'checkpoints',
     'MAX_EXPORT_SIZE_GB': 10,
     'CHUNK_SIZE': 1000,  # Registros por chunk
+    'BULK_IMPORT': True,  # Import por lotes (bulk_create); False = registro a registro
     'FILE_CHUNK_SIZE_MB': 10,  # MB por chunk de archivo
     'PARALLEL_TRANSFERS': 5,  # Archivos en paralelo
     'TOKEN_EXPIRY_HOURS': 24,
@@ -320,10 +333,154 @@ MIGRATION_SYSTEM = {
     'VERIFY_SSL': True,  # Verificar certificados SSL en producción
 }
 
+# 🚀 ENTERPRISE: Ticket inventory engine for EventViewSet.reserve
+# 'database' = row locks on TicketTier (default), 'redis' = atomic Lua counters + bulk hold writes
+TICKET_INVENTORY = {
+    'ENGINE': config('TICKET_INVENTORY_ENGINE', default='database'),
+    'REDIS_URL': config('TICKET_INVENTORY_REDIS_URL', default=''),  # Empty = django-redis cache connection
+    'FLUSH_BATCH_SIZE': 500,  # Hold log records per bulk write
+    'FLUSH_INTERVAL_SECONDS': 5,
+    'LOCK_TIMEOUT': 30,
+    'LOCK_WAIT': 5,
+}
+
+# 🚀 ENTERPRISE: Scanner validation engine (apps.validation.engine)
+# 'database' = ticket lookup + log INSERT per scan (default), 'redis' = per-event ticket index + queued logs
+VALIDATION_ENGINE = {
+    'ENGINE': config('VALIDATION_ENGINE', default='database'),
+    'REDIS_URL': config('VALIDATION_ENGINE_REDIS_URL', default=''),  # Empty = django-redis cache connection
+    'INDEX_TTL_SECONDS': 86400,  # Event ticket index and cached sessions
+    'LOG_BATCH_SIZE': 1000,  # Validation logs per bulk write
+    'LOG_FLUSH_INTERVAL_SECONDS': 5,
+    # Offline device sync (apps.validation.sync)
+    'SYNC_PAGE_SIZE': 5000,  # Tickets per snapshot/delta page
+    'SYNC_SETTLE_SECONDS': 2,  # Rows newer than this are left for the next pull
+    'SYNC_MAX_SCANS': 1000,  # Offline scans per upload
+}
+
+# 🚀 ENTERPRISE: Analytics ingestion (core.analytics_ingest) for event views and terminal ad interactions
+# False = synchronous INSERT per request, True = Redis queue drained with bulk writes by Celery beat
+ANALYTICS_INGEST = {
+    'BUFFERED': config('ANALYTICS_INGEST_BUFFERED', default=False, cast=bool),
+    'REDIS_URL': config('ANALYTICS_INGEST_REDIS_URL', default=''),  # Empty = django-redis cache connection
+    'DRAIN_BATCH_SIZE': 1000,  # Queued records per bulk write
+    'DRAIN_INTERVAL_SECONDS': 5,
+    'MAX_BATCHES_PER_RUN': 50,
+    'DEAD_LETTER_MAXLEN': 10000,  # Records that failed on their own, kept for inspection
+}
+
+# 🚀 ENTERPRISE: Expired-hold sweeper (tickets, coupons, experiences)
+HOLD_SWEEPER = {
+    'BATCH_SIZE': config('HOLD_SWEEPER_BATCH_SIZE', default=5000, cast=int),  # Rows per UPDATE ... RETURNING
+}
+
+# 🚀 ENTERPRISE: Pre-rendered ticket QR images (apps.events.qr_generator), generated when orders are paid
+QR_STORE = {
+    'PATH_PREFIX': 'tickets/qr',  # Content-addressed: tickets/qr/ab/<sha256>.png in DEFAULT_FILE_STORAGE
+    'PROCESS_POOL_MIN_TICKETS': config('QR_STORE_PROCESS_POOL_MIN_TICKETS', default=200, cast=int),  # Bulk batches render in processes
+    'UPDATE_BATCH_SIZE': 500,
+}
+
+# 🚀 ENTERPRISE: Responsive image derivatives for the media library (apps.media.derivatives)
+MEDIA_DERIVATIVES = {
+    'ENABLED': config('MEDIA_DERIVATIVES_ENABLED', default=True, cast=bool),  # False = synchronous thumbnail only
+    'WIDTHS': [320, 640, 960, 1280, 1920],  # Never upscaled: smaller originals stop at their own width
+    'FORMATS': ['webp', 'jpeg'],
+    'QUALITY': {'webp': 80, 'jpeg': 82},
+    'PUBLIC_WIDTH': 1280,  # JPEG width served as the plain image URL in public payloads
+    'THUMBNAIL_SIZE': 300,
+    'PROCESS_POOL_MIN_ASSETS': 4,  # Batches render in processes (threads inside Celery prefork workers)
+    'MAX_WORKERS': config('MEDIA_DERIVATIVES_MAX_WORKERS', default=4, cast=int),
+}
+
+# 🚀 ENTERPRISE: Event image proxy (apps.events.image_proxy) used by html2canvas ticket PDFs
+IMAGE_PROXY = {
+    'CACHE_DIR': config('IMAGE_PROXY_CACHE_DIR', default=''),  # Empty = <tmp>/tuki-image-proxy (per instance)
+    'MAX_CACHE_BYTES': config('IMAGE_PROXY_MAX_CACHE_MB', default=256, cast=int) * 1024 * 1024,  # LRU-evicted above this (64 MB on Cloud Run)
+    'MAX_OBJECT_BYTES': 20 * 1024 * 1024,
+    'REVALIDATE_AFTER_SECONDS': 300,  # Served from disk without asking GCS; then If-None-Match
+    'TIMEOUT': 10,
+    'POOL_SIZE': 20,  # Keep-alive connections to storage per process
+    'ALLOWED_HOSTS': ['storage.googleapis.com'],  # Plus GS_BUCKET_NAME hosts
+}
+
+# 🚀 ENTERPRISE: Celery task telemetry (core.celery_telemetry). 'log' writes a CeleryTaskLog row per
+# execution; 'aggregate' buffers timings per worker process and flushes CeleryTaskStat rows
+CELERY_TELEMETRY = {
+    'MODE': config('CELERY_TELEMETRY_MODE', default='log'),
+    'FLUSH_INTERVAL_SECONDS': config('CELERY_TELEMETRY_FLUSH_INTERVAL', default=30, cast=int),
+    'BUFFER_SIZE': 20000,  # Timings kept per worker process between flushes; oldest dropped when full
+    'BUCKET_SECONDS': 60,
+    'HISTOGRAM_BOUNDS_MS': [10, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000],  # Changing splits old rows
+    'RETENTION_DAYS': 30,
+    # Aggregate mode: share of executions that still get a CeleryTaskLog row (fnmatch on task name,
+    # first match wins). Failures and tasks called with flow_id are always logged.
+    'DEFAULT_SAMPLE_RATE': config('CELERY_TELEMETRY_SAMPLE_RATE', default=0.01, cast=float),
+    'SAMPLE_RATES': {
+        '*email*': 1.0,  # Flow events EMAIL_SENT / EMAIL_FAILED hang off these rows
+        'core.tasks.record_platform_uptime_heartbeat': 0.0,
+        'core.tasks.drain_analytics_buffer': 0.0,
+        'apps.validation.tasks.flush_validation_logs': 0.0,
+    },
+}
+
+# 🚀 ENTERPRISE: FlowLogger event writes (core.flow_buffer). 'sync' INSERTs each PlatformFlowEvent;
+# 'buffered' bulk-creates a request's/task's events when it ends; 'stream' queues them in a Redis
+# stream drained by Celery beat
+FLOW_LOGGER = {
+    'MODE': config('FLOW_LOGGER_MODE', default='sync'),
+    'MAX_EVENTS_PER_SCOPE': 200,  # Flushed early past this many events in one request/task
+    'SERVER_TIMING': DEBUG,  # Server-Timing header with the request's event count and flush time
+    'SYNC_STEPS': ['EMAIL_*'],  # fnmatch patterns INSERTed immediately: read back by email idempotency guards
+    'REDIS_URL': config('FLOW_LOGGER_REDIS_URL', default=''),  # Empty = django-redis cache connection
+    'STREAM_KEY': 'tuki:flow-events',
+    'STREAM_MAXLEN': 1000000,  # Approximate cap if the drain stops
+    'DRAIN_BATCH_SIZE': 500,
+    'DRAIN_INTERVAL_SECONDS': 5,
+    'MAX_BATCHES_PER_RUN': 20,
+}
+
+# 🚀 ENTERPRISE: Attendee/order exports (apps.events.exports)
+EVENT_EXPORTS = {
+    'CHUNK_SIZE': config('EVENT_EXPORTS_CHUNK_SIZE', default=2000, cast=int),  # Rows per server-side cursor fetch
+    'STORAGE_PREFIX': 'exports/events',  # Background exports: <prefix>/<event_id>/<job_id>/<filename>
+    'LINK_TTL': 86400,  # Seconds a background job record, its link and its file stay available
+    'STORAGE': None,  # {'BACKEND': dotted path, 'OPTIONS': {...}} for export files; None = DEFAULT_FILE_STORAGE
+}
+
+# 🚀 ENTERPRISE: Revenue rollups (core.RevenueRollup) for dashboards and analytics
+REVENUE_ROLLUPS = {
+    'READ_FROM_ROLLUPS': config('REVENUE_ROLLUPS_READ', default=True, cast=bool),  # False = aggregate orders live
+    'HOURLY_RETENTION_DAYS': config('REVENUE_ROLLUPS_HOURLY_RETENTION_DAYS', default=2, cast=int),
+}
+
+# 🚀 ENTERPRISE: Conversion funnel (core.conversion_metrics) cache
+CONVERSION_METRICS = {
+    'CACHE_TTL': config('CONVERSION_METRICS_CACHE_TTL', default=300, cast=int),  # Seconds per (flow_type, organizer, event, window)
+}
+
+# 🚀 ENTERPRISE: Public accommodation listing (apps.accommodations.listing_cache)
+ACCOMMODATION_PUBLIC_LIST = {
+    'CACHE_TTL': config('ACCOMMODATION_PUBLIC_LIST_CACHE_TTL', default=60, cast=int),  # Seconds per (filters, cursor); 0 = no cache
+}
+
+# 🚀 ENTERPRISE: SuperAdmin analytics query layer (core.platform_analytics)
+PLATFORM_ANALYTICS = {
+    'CACHE_TTL': config('PLATFORM_ANALYTICS_CACHE_TTL', default=300, cast=int),  # Seconds per (endpoint, range, filters); 0 = no cache
+}
+
 # Transbank Oneclick Settings (for future implementation)
 TRANSBANK_ONECLICK_COMMERCE_CODE = config('TRANSBANK_ONECLICK_COMMERCE_CODE', default='597055555541')
 TRANSBANK_ONECLICK_API_KEY = config('TRANSBANK_ONECLICK_API_KEY', default='579B532A7440BB0C9079DED94D31EA1615BACEB56610332264630D42D0A36B1C')
 TRANSBANK_ONECLICK_SANDBOX = config('TRANSBANK_ONECLICK_SANDBOX', default=True, cast=bool)
 
+# 🚀 ENTERPRISE: In-process index of active WhatsApp codes (apps.whatsapp.services.code_index)
+WHATSAPP_CODE_INDEX = {
+    'ENABLED': config('WHATSAPP_CODE_INDEX_ENABLED', default=True, cast=bool),  # False = DB lookups per message
+    'MAX_AGE_SECONDS': 300,  # Full reload from the DB at least this often
+    'MAX_REPLAY': 1000,  # More pending changes than this = full reload
+    'CHANGE_TTL': 3600,  # Seconds each change stays in the cache change log
+}
+
 # WhatsApp service HTTP timeout (seconds). In production Chromium can take >10s to respond; increase if needed.
 WHATSAPP_SERVICE_TIMEOUT = config('WHATSAPP_SERVICE_TIMEOUT', default=25, cast=int) 
\ No newline at end of file
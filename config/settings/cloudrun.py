@@ -6,6 +6,7 @@ These settings are optimized for Google Cloud Run deployment.
 
 import os
 from .base import *  # noqa
+from .base import EVENT_EXPORTS, IMAGE_PROXY  # Updated below, keep the dependency explicit
 from decouple import config, Csv
 
 # Security settings
@@ -157,6 +158,19 @@ GS_FILE_OVERWRITE = False
 # 🚀 ENTERPRISE: Media URL - will be generated by custom storage backend
 MEDIA_URL = f"https://storage.googleapis.com/{GS_BUCKET_NAME}/"
 
+# 🚀 ENTERPRISE: Attendee/order exports hold personal data. Set EVENT_EXPORTS_BUCKET_NAME to a
+# bucket without public read; files are served only through the authenticated export_download
+# endpoint (no signed URLs, so no private key needed) and deleted after EVENT_EXPORTS['LINK_TTL'].
+EVENT_EXPORTS['STORAGE'] = {
+    'BACKEND': 'core.storage.PrivateGoogleCloudStorage',
+    'OPTIONS': {'bucket_name': config('EVENT_EXPORTS_BUCKET_NAME', default=GS_BUCKET_NAME)},
+}
+
+# 🚀 ENTERPRISE: Image proxy disk cache. Cloud Run's filesystem (including /tmp) is in-memory and
+# counts against the instance memory limit, so the per-instance LRU defaults to 64 MB here instead
+# of 256 MB. Point IMAGE_PROXY_CACHE_DIR at a mounted volume to use a larger IMAGE_PROXY_MAX_CACHE_MB.
+IMAGE_PROXY['MAX_CACHE_BYTES'] = config('IMAGE_PROXY_MAX_CACHE_MB', default=64, cast=int) * 1024 * 1024
+
 # Rate limiting
 REST_FRAMEWORK['DEFAULT_THROTTLE_CLASSES'] = [
     'rest_framework.throttling.AnonRateThrottle',
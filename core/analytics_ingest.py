@@ -0,0 +1,388 @@
+"""
+🚀 ENTERPRISE: Buffered analytics ingestion.
+
+Event page views (``EventViewSet.track_view``), terminal ad interactions
+(``TerminalAdvertisingSpaceViewSet.track``) and time-on-page updates
+(``update_event_view_metrics``) are high-volume, low-value writes. With
+``ANALYTICS_INGEST_BUFFERED=True`` the request path only appends a compact JSON
+record to a Redis list; ``drain()`` (Celery beat, every few seconds) pops
+batches and writes them with ``bulk_create``, applies time-on-page updates with
+one ``bulk_update``, and increments the per-day counters of
+``EventPerformanceMetrics`` and ``TerminalAdvertisingDailyStats`` from the same
+batch.
+
+Counters are incremental: ``unique_views``, conversions and revenue are still
+computed by ``calculate_daily_event_metrics``, which overwrites the whole row.
+
+Records keep the time of the request (``created_at``), however late they are
+drained. A batch that fails is retried record by record: records that still fail
+are moved to a capped dead-letter list (``<prefix>:dead``) so one bad record
+cannot block ingestion; database outages leave the batch queued for the next run.
+
+When buffering is off, or Redis cannot be reached, every write falls back to
+the original synchronous INSERT/UPDATE.
+"""
+
+import json
+import logging
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import InterfaceError, OperationalError, models, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from core.redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'tuki:analytics'
+
+KIND_EVENT_VIEW = 'event_view'
+KIND_AD_INTERACTION = 'ad_interaction'
+KIND_TIME_ON_PAGE = 'time_on_page'
+
+# Fields filled by auto_now on insert (created_at is kept: it is the request time)
+SKIPPED_FIELDS = {'updated_at'}
+
+# Drained later than this after the request -> created_at is set back to the request time
+RESTORE_CREATED_AT_AFTER = timedelta(seconds=1)
+
+# Failures that say nothing about the record: keep it queued and stop the drain
+OPERATIONAL_ERRORS = (OperationalError, InterfaceError)
+
+# EventPerformanceMetrics counter -> predicate on a view record (same definitions as calculate_daily_metrics)
+EVENT_VIEW_COUNTERS = {
+    'total_views': lambda view: True,
+    'web_views': lambda view: view.view_source == 'web',
+    'mobile_views': lambda view: view.device_type == 'mobile',
+    'social_media_views': lambda view: view.view_source == 'social_media',
+    'direct_views': lambda view: view.view_source == 'direct',
+}
+
+# TerminalAdvertisingInteraction.interaction_type -> TerminalAdvertisingDailyStats counter
+AD_INTERACTION_COUNTERS = {
+    'view': 'views',
+    'click': 'clicks',
+    'impression': 'impressions',
+}
+
+# KEYS[1] = queue. ARGV[1] = batch size.
+POP_BATCH_SCRIPT = """
+local items = redis.call('LRANGE', KEYS[1], 0, tonumber(ARGV[1]) - 1)
+if #items > 0 then
+    redis.call('LTRIM', KEYS[1], #items, -1)
+end
+return items
+"""
+
+
+def _ingest_settings():
+    return getattr(settings, 'ANALYTICS_INGEST', {})
+
+
+_buffer = None
+
+
+def get_analytics_buffer():
+    """Return the configured AnalyticsBuffer, or None when writes are synchronous."""
+    global _buffer
+    if not _ingest_settings().get('BUFFERED', False):
+        return None
+    if _buffer is None:
+        _buffer = AnalyticsBuffer(get_redis_client(_ingest_settings().get('REDIS_URL')))
+    return _buffer
+
+
+def _serialize(instance):
+    """
+    Concrete field values of an unsaved instance, keyed by attname (FKs as ids).
+    created_at is stamped now; strings are clipped to their column (long referers / utm_*).
+    """
+    data = {}
+    for field in instance._meta.concrete_fields:
+        if field.name in SKIPPED_FIELDS:
+            continue
+        value = getattr(instance, field.attname)
+        if value is None and field.primary_key:
+            continue
+        if field.name == 'created_at' and value is None:
+            value = timezone.now()
+        if isinstance(field, models.CharField) and field.max_length and isinstance(value, str):
+            value = value[:field.max_length]
+        data[field.attname] = value
+    return data
+
+
+class AnalyticsBuffer:
+    """Redis list of pending analytics records, drained in bulk by a Celery task."""
+
+    def __init__(self, client, prefix=KEY_PREFIX):
+        self.client = client
+        self.prefix = prefix
+        self._pop_batch = client.register_script(POP_BATCH_SCRIPT)
+
+    @property
+    def queue_key(self):
+        return f'{self.prefix}:queue'
+
+    @property
+    def dead_letter_key(self):
+        return f'{self.prefix}:dead'
+
+    def push(self, kind, data):
+        self.client.rpush(self.queue_key, json.dumps({'kind': kind, 'data': data}, default=str))
+
+    def pending(self):
+        return self.client.llen(self.queue_key)
+
+    def dead_letters(self):
+        return self.client.llen(self.dead_letter_key)
+
+    def _dead_letter(self, raw, error):
+        maxlen = _ingest_settings().get('DEAD_LETTER_MAXLEN', 10000)
+        entry = json.dumps({'record': raw if isinstance(raw, str) else raw.decode(), 'error': str(error)[:500]})
+        pipe = self.client.pipeline(transaction=False)
+        pipe.rpush(self.dead_letter_key, entry)
+        pipe.ltrim(self.dead_letter_key, -maxlen, -1)
+        pipe.execute()
+
+    # ------------------------------------------------------------------
+    # Background persistence
+    # ------------------------------------------------------------------
+
+    def drain(self, batch_size=None, max_batches=None):
+        """
+        Pop queued records and persist them in batches.
+
+        A batch that fails is written record by record; records that fail on their
+        own are dead-lettered. On a database outage the unwritten records are pushed
+        back to the head of the queue (order preserved) and the error is re-raised.
+        Returns the number of records persisted.
+        """
+        config = _ingest_settings()
+        batch_size = batch_size or config.get('DRAIN_BATCH_SIZE', 1000)
+        if max_batches is None:
+            max_batches = config.get('MAX_BATCHES_PER_RUN')
+        persisted = 0
+        batches = 0
+
+        while max_batches is None or batches < max_batches:
+            raw_records = self._pop_batch(keys=[self.queue_key], args=[batch_size])
+            if not raw_records:
+                break
+            try:
+                persist_records([json.loads(r) for r in raw_records])
+                persisted += len(raw_records)
+            except OPERATIONAL_ERRORS:
+                self.client.lpush(self.queue_key, *reversed(raw_records))
+                raise
+            except Exception as e:
+                logger.warning(f"[ANALYTICS] Batch of {len(raw_records)} records failed, writing one by one: {e}")
+                persisted += self._persist_one_by_one(raw_records)
+            batches += 1
+
+        return persisted
+
+    def _persist_one_by_one(self, raw_records):
+        persisted = 0
+        for index, raw in enumerate(raw_records):
+            try:
+                persist_records([json.loads(raw)])
+                persisted += 1
+            except OPERATIONAL_ERRORS:
+                self.client.lpush(self.queue_key, *reversed(raw_records[index:]))
+                raise
+            except Exception as e:
+                logger.error(f"[ANALYTICS] Dead-lettering record that cannot be written: {e}")
+                self._dead_letter(raw, e)
+        return persisted
+
+
+def persist_records(records):
+    """Write a batch of buffered records: bulk inserts, time-on-page updates and day counters."""
+    by_kind = defaultdict(list)
+    for record in records:
+        by_kind[record['kind']].append(record['data'])
+
+    with transaction.atomic():
+        views = _insert_event_views(by_kind[KIND_EVENT_VIEW])
+        interactions = _insert_ad_interactions(by_kind[KIND_AD_INTERACTION])
+        _apply_time_on_page(by_kind[KIND_TIME_ON_PAGE])
+        _increment_event_metrics(views)
+        _increment_ad_stats(interactions)
+
+
+def _insert_event_views(rows):
+    from django.contrib.auth import get_user_model
+    from apps.events.analytics_models import EventView
+    from apps.events.models import Event
+
+    if not rows:
+        return []
+    # Events or users deleted since the request would fail the whole batch on FK checks
+    event_ids = {str(pk) for pk in Event.objects.filter(
+        id__in={row['event_id'] for row in rows}
+    ).values_list('id', flat=True)}
+    user_ids = {str(row['user_id']) for row in rows if row.get('user_id')}
+    if user_ids:
+        user_ids = {str(pk) for pk in get_user_model().objects.filter(
+            id__in=user_ids
+        ).values_list('id', flat=True)}
+
+    views = []
+    for row in rows:
+        if row['event_id'] not in event_ids:
+            continue
+        if row.get('user_id') and str(row['user_id']) not in user_ids:
+            row['user_id'] = None
+        views.append(EventView(**row))
+    return _bulk_insert(EventView, views)
+
+
+def _insert_ad_interactions(rows):
+    from apps.terminal.models import TerminalAdvertisingInteraction, TerminalAdvertisingSpace
+
+    if not rows:
+        return []
+    space_ids = {str(pk) for pk in TerminalAdvertisingSpace.objects.filter(
+        id__in={row['advertising_space_id'] for row in rows}
+    ).values_list('id', flat=True)}
+    interactions = [
+        TerminalAdvertisingInteraction(**row)
+        for row in rows
+        if row['advertising_space_id'] in space_ids
+    ]
+    return _bulk_insert(TerminalAdvertisingInteraction, interactions)
+
+
+def _bulk_insert(model, instances):
+    """bulk_create stamps insert time (auto_now_add); put back the request time of late records."""
+    requested_at = [
+        parse_datetime(instance.created_at) if isinstance(instance.created_at, str) else instance.created_at
+        for instance in instances
+    ]
+    created = model.objects.bulk_create(instances, batch_size=500)
+    late = []
+    for instance, created_at in zip(created, requested_at):
+        if created_at and instance.created_at - created_at > RESTORE_CREATED_AT_AFTER:
+            instance.created_at = created_at
+            late.append(instance)
+    if late:
+        model.objects.bulk_update(late, ['created_at'], batch_size=500)
+    return created
+
+
+def _apply_time_on_page(rows):
+    """Set time_on_page on the latest view of each (event, session), unless already set."""
+    from apps.events.analytics_models import EventView
+
+    if not rows:
+        return 0
+    seconds = {(str(row['event_id']), row['session_id']): row['time_on_page'] for row in rows}
+    latest = {}
+    candidates = EventView.objects.filter(
+        event_id__in={key[0] for key in seconds},
+        session_id__in={key[1] for key in seconds},
+    ).order_by('-created_at').values_list('id', 'event_id', 'session_id', 'time_on_page')
+    for view_id, event_id, session_id, time_on_page in candidates:
+        latest.setdefault((str(event_id), session_id), (view_id, time_on_page))
+
+    updates = [
+        EventView(id=view_id, time_on_page=seconds[key])
+        for key, (view_id, time_on_page) in latest.items()
+        if key in seconds and not time_on_page
+    ]
+    if updates:
+        EventView.objects.bulk_update(updates, ['time_on_page'], batch_size=500)
+    return len(updates)
+
+
+def _increment_event_metrics(views):
+    from apps.events.analytics_models import EventPerformanceMetrics
+
+    increments = defaultdict(lambda: dict.fromkeys(EVENT_VIEW_COUNTERS, 0))
+    for view in views:
+        counters = increments[(view.event_id, timezone.localdate(view.created_at))]
+        for name, matches in EVENT_VIEW_COUNTERS.items():
+            if matches(view):
+                counters[name] += 1
+    _increment_daily_rows(EventPerformanceMetrics, 'event_id', increments)
+
+
+def _increment_ad_stats(interactions):
+    from apps.terminal.models import TerminalAdvertisingDailyStats
+
+    increments = defaultdict(lambda: dict.fromkeys(AD_INTERACTION_COUNTERS.values(), 0))
+    for interaction in interactions:
+        counter = AD_INTERACTION_COUNTERS.get(interaction.interaction_type)
+        if counter:
+            key = (interaction.advertising_space_id, timezone.localdate(interaction.created_at))
+            increments[key][counter] += 1
+    _increment_daily_rows(TerminalAdvertisingDailyStats, 'advertising_space_id', increments)
+
+
+def _increment_daily_rows(model, owner_field, increments):
+    """Create missing (owner, date) rows, then add the counters with one UPDATE per row."""
+    if not increments:
+        return
+    model.objects.bulk_create(
+        [model(**{owner_field: owner_id, 'date': date}) for owner_id, date in increments],
+        ignore_conflicts=True,
+    )
+    # Sorted so concurrent drains lock rows in the same order
+    for (owner_id, date), counters in sorted(increments.items(), key=lambda item: (str(item[0][0]), item[0][1])):
+        model.objects.filter(**{owner_field: owner_id, 'date': date}).update(
+            **{name: F(name) + value for name, value in counters.items() if value},
+            updated_at=timezone.now(),
+        )
+
+
+# ----------------------------------------------------------------------
+# Request-path entry points
+# ----------------------------------------------------------------------
+
+def _push(kind, data):
+    """Queue a record; False when buffering is off or Redis is unreachable."""
+    buffer = get_analytics_buffer()
+    if buffer is None:
+        return False
+    try:
+        buffer.push(kind, data)
+        return True
+    except Exception as e:
+        logger.warning(f"[ANALYTICS] Buffer unavailable, writing synchronously: {e}")
+        return False
+
+
+def record_event_view(view):
+    """Persist an unsaved EventView (see EventView.build_view), buffered when enabled."""
+    if not _push(KIND_EVENT_VIEW, _serialize(view)):
+        view.save(force_insert=True)
+    return view
+
+
+def record_ad_interaction(interaction):
+    """Persist an unsaved TerminalAdvertisingInteraction, buffered when enabled."""
+    if not _push(KIND_AD_INTERACTION, _serialize(interaction)):
+        interaction.save(force_insert=True)
+    return interaction
+
+
+def record_time_on_page(event_id, session_id, time_on_page):
+    """Queue a time-on-page update; False when the caller must apply it synchronously."""
+    return _push(KIND_TIME_ON_PAGE, {
+        'event_id': str(event_id),
+        'session_id': session_id,
+        'time_on_page': int(time_on_page),
+    })
+
+
+def drain_analytics_buffer(batch_size=None, max_batches=None):
+    """Drain the configured buffer (no-op when buffering is off)."""
+    buffer = get_analytics_buffer()
+    if buffer is None:
+        return 0
+    return buffer.drain(batch_size=batch_size, max_batches=max_batches)
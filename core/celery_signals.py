@@ -14,21 +14,50 @@ Signals handled:
 The handlers automatically extract business context (flow_id, order_id, user_id)
 from task arguments to enable cross-referencing with business entities.
 
+Each task is also a core.flow_buffer scope: with FLOW_LOGGER['MODE'] 'buffered' or
+'stream' the FlowLogger events it logs are written in one batch after it finishes.
+
+With CELERY_TELEMETRY['MODE'] = 'aggregate' only sampled executions, failures and
+flow tasks get a CeleryTaskLog row; every execution's timing goes to the in-memory
+buffer of core.celery_telemetry, flushed as aggregated CeleryTaskStat rows.
+
 Setup:
     Import this module in config/celery.py to register the signals:
     
     from core import celery_signals  # noqa
 """
 
-from celery.signals import task_prerun, task_postrun, task_failure, task_retry
+from celery.signals import (
+    task_prerun, task_postrun, task_failure, task_retry, worker_process_shutdown, worker_shutdown,
+)
+from collections import OrderedDict
 from django.utils import timezone
 import logging
 import time
 
+from core import celery_telemetry, flow_buffer
+
 logger = logging.getLogger(__name__)
 
-# Store task start times for duration calculation
-_task_start_times = {}
+# task_id -> (start time, has a CeleryTaskLog row). Entries are removed in task_postrun;
+# bounded so tasks killed mid-run cannot grow it forever.
+MAX_TRACKED_TASKS = 10000
+_task_start_times = OrderedDict()
+
+
+def _track_start(task_id, logged):
+    _task_start_times[task_id] = (time.time(), logged)
+    while len(_task_start_times) > MAX_TRACKED_TASKS:
+        _task_start_times.popitem(last=False)
+
+
+def _elapsed(task_id, finish=False):
+    """(duration_ms or None, logged) for a tracked task; ``finish`` stops tracking it."""
+    entry = _task_start_times.pop(task_id, None) if finish else _task_start_times.get(task_id)
+    if entry is None:
+        return None, True
+    started_at, logged = entry
+    return int((time.time() - started_at) * 1000), logged
 
 
 def _resolve_context(task_name, args, kwargs):
@@ -121,7 +150,10 @@ def log_task_started(sender=None, task_id=None, args=None, kwargs=None, **extras
         from core.models import CeleryTaskLog
         
         # Store start time for duration calculation
-        _task_start_times[task_id] = time.time()
+        logged = celery_telemetry.should_log(sender.name, kwargs or {})
+        _track_start(task_id, logged)
+        if not logged:
+            return
         
         # Resolve business context
         flow, order, user = _resolve_context(sender.name, args or [], kwargs or {})
@@ -166,7 +198,7 @@ def log_task_started(sender=None, task_id=None, args=None, kwargs=None, **extras
 
 
 @task_postrun.connect
-def log_task_success(sender=None, task_id=None, retval=None, **extras):
+def log_task_success(sender=None, task_id=None, retval=None, state=None, **extras):
     """
     Log when a Celery task completes successfully.
     
@@ -176,6 +208,7 @@ def log_task_success(sender=None, task_id=None, retval=None, **extras):
         sender: Task class
         task_id: Unique task execution ID (UUID)
         retval: Task return value
+        state: Final task state (SUCCESS, FAILURE, RETRY, ...)
         **extras: Additional signal data
     """
     try:
@@ -183,10 +216,18 @@ def log_task_success(sender=None, task_id=None, retval=None, **extras):
         from core.models import CeleryTaskLog
         
         # Calculate duration
-        duration_ms = None
-        if task_id in _task_start_times:
-            duration_ms = int((time.time() - _task_start_times[task_id]) * 1000)
-            del _task_start_times[task_id]
+        duration_ms, logged = _elapsed(task_id, finish=True)
+        
+        if celery_telemetry.aggregate_enabled():
+            celery_telemetry.record(
+                sender.name,
+                celery_telemetry.task_queue(sender),
+                celery_telemetry.POSTRUN_STATUSES.get(state, 'success'),
+                duration_ms,
+            )
+            # Failures and retries were already logged by their own handlers
+            if not logged or state != 'SUCCESS':
+                return
         
         # Update existing task log
         task_log = CeleryTaskLog.objects.filter(task_id=task_id, status='started').first()
@@ -257,11 +298,8 @@ def log_task_failure(sender=None, task_id=None, exception=None, traceback=None,
         # Import models here to avoid AppRegistryNotReady error
         from core.models import CeleryTaskLog
         
-        # Calculate duration
-        duration_ms = None
-        if task_id in _task_start_times:
-            duration_ms = int((time.time() - _task_start_times[task_id]) * 1000)
-            del _task_start_times[task_id]
+        # Calculate duration (task_postrun still runs after this and stops tracking the task)
+        duration_ms, _ = _elapsed(task_id)
         
         # Resolve business context
         flow, order, user = _resolve_context(sender.name, args or [], kwargs or {})
@@ -351,8 +389,11 @@ def log_task_retry(sender=None, request=None, reason=None, einfo=None, **extras)
         # Get traceback string
         traceback_str = str(getattr(einfo, 'traceback', ''))
         
+        # In aggregate mode retries of unsampled executions are only counted in CeleryTaskStat
+        _, logged = _elapsed(effective_task_id)
+        
         # Create retry log only if we have a valid task_id (NOT NULL constraint)
-        if effective_task_id:
+        if effective_task_id and logged:
             CeleryTaskLog.objects.create(
                 task_id=effective_task_id,
                 task_name=task_name,
@@ -380,7 +421,7 @@ def cleanup_task_start_times():
     """
     current_time = time.time()
     old_task_ids = [
-        task_id for task_id, start_time in _task_start_times.items()
+        task_id for task_id, (start_time, _) in _task_start_times.items()
         if current_time - start_time > 3600  # 1 hour
     ]
     
@@ -390,3 +431,28 @@ def cleanup_task_start_times():
     if old_task_ids:
         logger.info(f"🧹 [CELERY] Cleaned up {len(old_task_ids)} old task start times")
 
+
+# task_id -> flow event buffer opened for it (none when events are synchronous)
+_flow_event_scopes = {}
+
+
+@task_prerun.connect
+def open_flow_event_scope(sender=None, task_id=None, **extras):
+    """Buffer FlowLogger events logged by the task (connected after log_task_started)."""
+    buffer = flow_buffer.open_scope(f'task {sender.name}')
+    if buffer is not None:
+        _flow_event_scopes[task_id] = buffer
+
+
+@task_postrun.connect
+def close_flow_event_scope(sender=None, task_id=None, **extras):
+    """Write the task's flow events, including those of the postrun/failure handlers above."""
+    flow_buffer.close_scope(_flow_event_scopes.pop(task_id, None))
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def flush_task_telemetry(**kwargs):
+    """Write buffered task timings before a worker (process) exits, e.g. on max_tasks_per_child."""
+    if celery_telemetry.aggregate_enabled():
+        celery_telemetry.flush()
@@ -0,0 +1,326 @@
+"""
+🚀 ENTERPRISE: Low-overhead Celery task telemetry.
+
+With ``CELERY_TELEMETRY['MODE'] = 'log'`` (default) the signal handlers in
+core.celery_signals write one CeleryTaskLog row per execution, as they always did.
+
+With ``'aggregate'`` they only append ``(time, task, queue, status, duration)`` to an
+in-process ring buffer. Once FLUSH_INTERVAL_SECONDS have passed, the next finishing
+task (or the worker process shutting down) folds the buffer into CeleryTaskStat rows,
+one per (bucket, task, queue, status), with a single locked read and one bulk write.
+A sample of executions (SAMPLE_RATES, fnmatch patterns on the task name, first match
+wins) still gets a full CeleryTaskLog row; failures and tasks called with ``flow_id``
+always do, so flow traces and error drill-downs keep working.
+"""
+
+import fnmatch
+import logging
+import random
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict, deque
+from datetime import datetime, timedelta, timezone as dt_timezone
+from itertools import zip_longest
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Q, Sum
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+MODE_LOG = 'log'
+MODE_AGGREGATE = 'aggregate'
+
+DEFAULT_HISTOGRAM_BOUNDS_MS = (10, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+
+# Celery task_postrun ``state`` -> CeleryTaskStat.status
+POSTRUN_STATUSES = {
+    'SUCCESS': 'success',
+    'FAILURE': 'failure',
+    'RETRY': 'retry',
+}
+
+
+def _telemetry_settings():
+    return getattr(settings, 'CELERY_TELEMETRY', {})
+
+
+def aggregate_enabled():
+    return _telemetry_settings().get('MODE', MODE_LOG) == MODE_AGGREGATE
+
+
+def histogram_bounds():
+    return tuple(_telemetry_settings().get('HISTOGRAM_BOUNDS_MS') or DEFAULT_HISTOGRAM_BOUNDS_MS)
+
+
+def sample_rate(task_name):
+    for pattern, rate in (_telemetry_settings().get('SAMPLE_RATES') or {}).items():
+        if fnmatch.fnmatchcase(task_name, pattern):
+            return rate
+    return _telemetry_settings().get('DEFAULT_SAMPLE_RATE', 0.0)
+
+
+def should_log(task_name, kwargs):
+    """Whether this execution gets a full CeleryTaskLog row."""
+    if not aggregate_enabled():
+        return True
+    if kwargs.get('flow_id'):
+        return True
+    rate = sample_rate(task_name)
+    return rate >= 1 or (rate > 0 and random.random() < rate)
+
+
+def task_queue(task):
+    """
+    Queue the task was delivered on. Routing keys in config/celery.py are ``<queue>``
+    or ``<queue>.<purpose>``, so the first segment is the queue.
+    """
+    queue = getattr(task, 'queue', None)
+    if queue:
+        return queue
+    delivery_info = getattr(getattr(task, 'request', None), 'delivery_info', None) or {}
+    routing_key = delivery_info.get('routing_key') or ''
+    return routing_key.split('.', 1)[0]
+
+
+def bucket_start(timestamp):
+    """Start (aware UTC datetime) of the BUCKET_SECONDS window holding a unix timestamp."""
+    size = _telemetry_settings().get('BUCKET_SECONDS', 60)
+    return datetime.fromtimestamp(timestamp - timestamp % size, tz=dt_timezone.utc)
+
+
+def histogram_index(duration_ms, bounds):
+    """Index of the first bound >= duration_ms; len(bounds) is the overflow bucket."""
+    return bisect_left(bounds, duration_ms)
+
+
+def histogram_percentile(histogram, bounds, quantile):
+    """Upper bound (ms) of the bucket holding the quantile, None when empty or in overflow."""
+    total = sum(histogram)
+    if not total:
+        return None
+    rank = quantile * total
+    seen = 0
+    for index, count in enumerate(histogram):
+        seen += count
+        if seen >= rank:
+            return bounds[index] if index < len(bounds) else None
+    return None
+
+
+class TelemetryBuffer:
+    """Bounded per-process buffer of finished task timings. Oldest records are dropped when full."""
+
+    def __init__(self, size, flush_interval):
+        self.records = deque(maxlen=size)
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    def append(self, record):
+        with self._lock:
+            if len(self.records) == self.records.maxlen:
+                self.dropped += 1
+            self.records.append(record)
+
+    def due(self):
+        return bool(self.records) and time.monotonic() - self._last_flush >= self.flush_interval
+
+    def drain(self):
+        with self._lock:
+            records = list(self.records)
+            self.records.clear()
+            self._last_flush = time.monotonic()
+        return records
+
+
+_buffer = None
+
+
+def get_buffer():
+    global _buffer
+    if _buffer is None:
+        options = _telemetry_settings()
+        _buffer = TelemetryBuffer(
+            size=options.get('BUFFER_SIZE', 20000),
+            flush_interval=options.get('FLUSH_INTERVAL_SECONDS', 30),
+        )
+    return _buffer
+
+
+def reset_buffer():
+    """Drop the process buffer (tests, or after settings change)."""
+    global _buffer
+    _buffer = None
+
+
+def record(task_name, queue, status, duration_ms):
+    """Buffer one finished execution; flush when the interval has elapsed."""
+    buffer = get_buffer()
+    buffer.append((time.time(), task_name, queue or '', status, max(int(duration_ms or 0), 0)))
+    if buffer.due():
+        flush()
+
+
+def aggregate(records):
+    """
+    Fold buffered records into per-row totals:
+    {(bucket_start, task_name, queue, status): {'count', 'total_duration_ms', 'max_duration_ms', 'histogram'}}
+    """
+    bounds = histogram_bounds()
+    totals = defaultdict(lambda: {
+        'count': 0, 'total_duration_ms': 0, 'max_duration_ms': 0, 'histogram': [0] * (len(bounds) + 1),
+    })
+    for timestamp, task_name, queue, status, duration_ms in records:
+        row = totals[(bucket_start(timestamp), task_name[:255], queue[:100], status)]
+        row['count'] += 1
+        row['total_duration_ms'] += duration_ms
+        row['max_duration_ms'] = max(row['max_duration_ms'], duration_ms)
+        row['histogram'][histogram_index(duration_ms, bounds)] += 1
+    return dict(totals)
+
+
+def _merge_histograms(current, delta):
+    return [a + b for a, b in zip_longest(current or [], delta or [], fillvalue=0)]
+
+
+def _apply_once(totals):
+    from core.models import CeleryTaskStat
+
+    keys = Q()
+    for bucket, task_name, queue, status in totals:
+        keys |= Q(bucket_start=bucket, task_name=task_name, queue=queue, status=status)
+
+    with transaction.atomic():
+        existing = {
+            (row.bucket_start, row.task_name, row.queue, row.status): row
+            # Lock in id order so concurrent flushes from other processes cannot deadlock
+            for row in CeleryTaskStat.objects.select_for_update().filter(keys).order_by('id')
+        }
+        now = timezone.now()
+        to_update, to_create = [], []
+        for key, delta in totals.items():
+            row = existing.get(key)
+            if row is None:
+                bucket, task_name, queue, status = key
+                to_create.append(CeleryTaskStat(
+                    bucket_start=bucket, task_name=task_name, queue=queue, status=status, **delta
+                ))
+                continue
+            row.count += delta['count']
+            row.total_duration_ms += delta['total_duration_ms']
+            row.max_duration_ms = max(row.max_duration_ms, delta['max_duration_ms'])
+            row.histogram = _merge_histograms(row.histogram, delta['histogram'])
+            row.updated_at = now  # bulk_update skips auto_now
+            to_update.append(row)
+        if to_update:
+            CeleryTaskStat.objects.bulk_update(
+                to_update, ['count', 'total_duration_ms', 'max_duration_ms', 'histogram', 'updated_at']
+            )
+        if to_create:
+            CeleryTaskStat.objects.bulk_create(to_create)
+
+
+def apply_stats(totals):
+    """Add aggregated totals to CeleryTaskStat rows, creating missing ones."""
+    if not totals:
+        return
+    try:
+        _apply_once(totals)
+    except IntegrityError:
+        # Another worker process created one of the rows concurrently: now it is locked and merged
+        _apply_once(totals)
+
+
+def flush():
+    """Write this process's buffered timings. Returns the number of executions flushed."""
+    buffer = get_buffer()
+    records = buffer.drain()
+    if not records:
+        return 0
+    try:
+        apply_stats(aggregate(records))
+    except Exception as e:
+        # Telemetry must never break task execution; these timings are lost
+        logger.warning(f"⚠️ [CELERY] Could not flush {len(records)} task timings: {e}")
+        return 0
+    if buffer.dropped:
+        logger.warning(f"⚠️ [CELERY] Telemetry buffer full: dropped {buffer.dropped} task timings")
+        buffer.dropped = 0
+    return len(records)
+
+
+def task_stats(since, task_name=None, status=None):
+    """
+    Totals from CeleryTaskStat since a datetime, for the superadmin task views:
+    {'status_counts': {status: count}, 'total': int, 'tasks': [per-task summary, ...]}
+    """
+    from core.models import CeleryTaskStat
+
+    rows = CeleryTaskStat.objects.filter(bucket_start__gte=since)
+    if task_name:
+        rows = rows.filter(task_name__icontains=task_name)
+    if status:
+        rows = rows.filter(status=status)
+
+    bounds = histogram_bounds()
+    status_counts = defaultdict(int)
+    tasks = {}
+    for row in rows.values_list(
+        'task_name', 'queue', 'status', 'count', 'total_duration_ms', 'max_duration_ms', 'histogram'
+    ).iterator():
+        name, queue, row_status, count, total_ms, max_ms, histogram = row
+        status_counts[row_status] += count
+        summary = tasks.setdefault(name, {
+            'task_name': name, 'queues': set(), 'count': 0, 'total_duration_ms': 0, 'max_duration_ms': 0,
+            'status_counts': defaultdict(int), 'histogram': [0] * (len(bounds) + 1),
+        })
+        summary['queues'].add(queue)
+        summary['count'] += count
+        summary['total_duration_ms'] += total_ms
+        summary['max_duration_ms'] = max(summary['max_duration_ms'], max_ms)
+        summary['status_counts'][row_status] += count
+        summary['histogram'] = _merge_histograms(summary['histogram'], histogram or [])
+
+    summaries = []
+    for summary in sorted(tasks.values(), key=lambda s: s['count'], reverse=True):
+        summaries.append({
+            'task_name': summary['task_name'],
+            'queues': sorted(q for q in summary['queues'] if q),
+            'count': summary['count'],
+            'status_counts': dict(summary['status_counts']),
+            'avg_duration_ms': round(summary['total_duration_ms'] / summary['count']) if summary['count'] else None,
+            'p50_duration_ms': histogram_percentile(summary['histogram'], bounds, 0.5),
+            'p95_duration_ms': histogram_percentile(summary['histogram'], bounds, 0.95),
+            'max_duration_ms': summary['max_duration_ms'],
+        })
+    return {
+        'status_counts': dict(status_counts),
+        'total': sum(status_counts.values()),
+        'tasks': summaries,
+    }
+
+
+def status_counts(since):
+    """{status: executions} from CeleryTaskStat since a datetime (one grouped query)."""
+    from core.models import CeleryTaskStat
+
+    rows = (
+        CeleryTaskStat.objects.filter(bucket_start__gte=since)
+        .values('status')
+        .annotate(total=Sum('count'))
+    )
+    return {row['status']: row['total'] for row in rows}
+
+
+def prune_task_stats(days=None):
+    """Delete CeleryTaskStat buckets older than RETENTION_DAYS. Returns rows deleted."""
+    from core.models import CeleryTaskStat
+
+    days = days if days is not None else _telemetry_settings().get('RETENTION_DAYS', 30)
+    cutoff = timezone.now() - timedelta(days=days)
+    deleted, _ = CeleryTaskStat.objects.filter(bucket_start__lt=cutoff).delete()
+    return deleted
@@ -5,6 +5,9 @@ Calculates historical conversion rates for each step in platform flows,
 enabling comparison of individual transactions vs platform averages.
 """
 
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
 from django.db.models import Count, Q, F
 from django.utils import timezone
 from datetime import timedelta, datetime
@@ -37,6 +40,39 @@ TICKET_CHECKOUT_STEPS = [
 ]
 
 
+HISTORICAL_RATES_CACHE_PREFIX = 'conversion_metrics:historical'
+
+
+def _historical_rates_cache_key(flow_type, days_back, from_date, to_date, organizer_id, event_id):
+    """One key per (flow_type, organizer, event, window); relative windows key on days_back."""
+    window = (
+        f"{from_date.isoformat()}:{to_date.isoformat() if to_date else ''}"
+        if from_date is not None else f"{days_back}d:{to_date.isoformat() if to_date else ''}"
+    )
+    return f"{HISTORICAL_RATES_CACHE_PREFIX}:{flow_type}:{organizer_id or '-'}:{event_id or '-'}:{window}"
+
+
+def count_flows_per_step(flows_qs, steps=TICKET_CHECKOUT_STEPS):
+    """
+    🚀 ENTERPRISE: Number of distinct flows of ``flows_qs`` that reached each step.
+
+    Single grouped query instead of materializing flow ids and counting step by step:
+    the distinct (flow, step) pairs are hashed once and counted per step, which is
+    cheaper than COUNT(DISTINCT flow_id) (a sort per step group).
+    """
+    pairs = PlatformFlowEvent.objects.filter(
+        flow__in=flows_qs,
+        step__in=steps,
+    ).values('flow_id', 'step').distinct().order_by()
+    sql, params = pairs.query.sql_with_params()
+
+    counts = dict.fromkeys(steps, 0)
+    with connection.cursor() as cursor:
+        cursor.execute(f'SELECT pairs.step, COUNT(*) FROM ({sql}) pairs GROUP BY pairs.step', params)
+        counts.update(cursor.fetchall())
+    return counts
+
+
 class ConversionMetricsService:
     """
     Service for calculating conversion rates at each step of platform flows.
@@ -77,7 +113,18 @@ class ConversionMetricsService:
                 },
                 ...
             }
+        
+        Results are cached per (flow_type, organizer, event, window) for
+        CONVERSION_METRICS['CACHE_TTL'] seconds.
         """
+        cache_key = _historical_rates_cache_key(flow_type, days_back, from_date, to_date, organizer_id, event_id)
+        try:
+            cached = cache.get(cache_key)
+        except Exception:
+            cached = None
+        if cached is not None:
+            return cached
+        
         try:
             # 🚨 IMPORTANT:
             # If from_date is provided, we respect it STRICTLY
@@ -103,24 +150,10 @@ class ConversionMetricsService:
             if event_id:
                 flows_qs = flows_qs.filter(event_id=event_id)
             
-            flow_ids = list(flows_qs.values_list('id', flat=True))
-            
-            if not flow_ids:
+            step_counts = count_flows_per_step(flows_qs)
+            if not any(step_counts.values()):
                 return {}
             
-            # Get all events for these flows, grouped by step
-            events_qs = PlatformFlowEvent.objects.filter(
-                flow_id__in=flow_ids,
-                step__in=TICKET_CHECKOUT_STEPS
-            )
-            
-            # Count how many flows reached each step
-            step_counts = {}
-            for step in TICKET_CHECKOUT_STEPS:
-                # Count unique flows that have this step
-                reached_count = events_qs.filter(step=step).values('flow_id').distinct().count()
-                step_counts[step] = reached_count
-            
             # Calculate conversion rates
             conversion_rates = {}
             previous_step = None
@@ -148,6 +181,15 @@ class ConversionMetricsService:
                 
                 previous_step = step
             
+            try:
+                cache.set(
+                    cache_key,
+                    conversion_rates,
+                    getattr(settings, 'CONVERSION_METRICS', {}).get('CACHE_TTL', 300),
+                )
+            except Exception as e:
+                logger.warning(f"⚠️ [CONVERSION] Could not cache historical rates: {e}")
+            
             return conversion_rates
             
         except Exception as e:
@@ -0,0 +1,116 @@
+"""
+🚀 ENTERPRISE: Rendering service for confirmation emails (events, experiences, Erasmus).
+
+- Compiled templates are looked up once per process and reused (no loader walk per send).
+- The per-event, per-organizer and per-activity parts of the email context are built
+  once and cached in process, keyed by ``(kind, pk, updated_at)``: editing the object
+  invalidates them on the next send. A TTL bounds staleness for related rows that do
+  not touch ``updated_at`` (e.g. a new event image).
+- Static inline images (logos) are read from disk once.
+
+Only per-order and per-ticket values are computed on each send.
+
+Usage:
+    from core.email_rendering import cached_fragment, render_email
+
+    event_data = cached_fragment('event', event, _build_event_data)
+    html = render_email('emails/order_confirmation.html', context)
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import lru_cache
+
+from django.conf import settings
+from django.template.loader import get_template, render_to_string
+
+logger = logging.getLogger(__name__)
+
+MAX_CACHED_FRAGMENTS = 2048
+FRAGMENT_TTL_SECONDS = 600
+
+_fragments = OrderedDict()  # (kind, pk, updated_at) -> (built_at, value)
+_fragments_lock = threading.Lock()
+_enabled = True
+
+
+@lru_cache(maxsize=None)
+def _compiled_template(template_name):
+    return get_template(template_name)
+
+
+def render_email(template_name, context):
+    """render_to_string() over a template compiled once per process (re-read on every call in DEBUG)."""
+    if settings.DEBUG or not _enabled:
+        return render_to_string(template_name, context)
+    return _compiled_template(template_name).render(context)
+
+
+def cached_fragment(kind, obj, builder):
+    """
+    Return ``builder(obj)``, cached per ``(kind, obj.pk, obj.updated_at)``.
+
+    The builder must only read ``obj`` and rows that hang off it (no order or ticket
+    data): the result is shared by every email sent for that object.
+    """
+    if obj is None:
+        return builder(obj)
+    if not _enabled:
+        return builder(obj)
+
+    key = (kind, obj.pk, getattr(obj, 'updated_at', None))
+    now = time.monotonic()
+    with _fragments_lock:
+        entry = _fragments.get(key)
+        if entry is not None and now - entry[0] < FRAGMENT_TTL_SECONDS:
+            _fragments.move_to_end(key)
+            return entry[1]
+
+    value = builder(obj)
+    with _fragments_lock:
+        _fragments[key] = (now, value)
+        _fragments.move_to_end(key)
+        while len(_fragments) > MAX_CACHED_FRAGMENTS:
+            _fragments.popitem(last=False)
+    return value
+
+
+@lru_cache(maxsize=32)
+def _static_file_bytes(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def static_image_bytes(relative_path):
+    """Bytes of a file under BASE_DIR (e.g. 'static/images/logos/logo-negro.png'), or None if missing."""
+    path = os.path.join(settings.BASE_DIR, relative_path)
+    if not os.path.exists(path):
+        return None
+    if not _enabled:
+        with open(path, 'rb') as f:
+            return f.read()
+    return _static_file_bytes(path)
+
+
+def clear_caches():
+    """Drop compiled templates, context fragments and static files (tests, benchmarks)."""
+    _compiled_template.cache_clear()
+    _static_file_bytes.cache_clear()
+    with _fragments_lock:
+        _fragments.clear()
+
+
+@contextmanager
+def caching_disabled():
+    """Render and build context as before the service existed (benchmark baseline)."""
+    global _enabled
+    previous = _enabled
+    _enabled = False
+    try:
+        yield
+    finally:
+        _enabled = previous
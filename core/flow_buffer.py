@@ -0,0 +1,393 @@
+"""
+🚀 ENTERPRISE: Buffered PlatformFlowEvent writes for FlowLogger.
+
+``FLOW_LOGGER['MODE']``:
+
+- ``'sync'`` (default): ``FlowLogger.log_event`` INSERTs every event right away.
+- ``'buffered'``: inside a scope (each HTTP request through FlowEventBufferMiddleware,
+  each Celery task through core.celery_signals, or ``with flow_buffer.buffered():``)
+  events are collected in memory and written with one ``bulk_create`` when the scope
+  ends, after the response or task result is produced. Checkout and payment code no
+  longer INSERTs while holding Order / TicketTier row locks.
+- ``'stream'``: same scopes, but the scope end appends the events to a Redis stream in
+  one pipeline and ``drain_flow_event_stream`` (Celery beat) bulk-creates them.
+
+An event logged inside ``transaction.atomic`` is only queued when that transaction
+commits (``transaction.on_commit``); if it rolls back the event is dropped, exactly as
+the synchronous INSERT would have been rolled back with it. A scope opened inside a
+transaction (``buffered()`` within ``atomic``, tests) writes into that transaction
+instead, so its events commit or roll back with it.
+
+Steps matching ``FLOW_LOGGER['SYNC_STEPS']`` (``EMAIL_*`` by default) are always
+INSERTed right away: EMAIL_SENT / EMAIL_PENDING are read back as state by the email
+double-send guards and ``ensure_pending_emails_sent``, so they cannot wait for the scope.
+
+Fallbacks: no scope -> synchronous INSERT; the scope ends with an exception -> the
+events are still written; a failing ``bulk_create`` -> row-by-row INSERTs (bad rows
+are logged and skipped); Redis unreachable -> ``bulk_create``. Events still in memory
+when a process is killed are lost, as are in-flight synchronous INSERTs today.
+"""
+
+import fnmatch
+import json
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import timedelta
+from functools import partial
+
+from django.conf import settings
+from django.db import InterfaceError, OperationalError, transaction
+from django.utils import timezone
+
+from core.cache_counters import CacheCounters
+from core.redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+MODE_SYNC = 'sync'
+MODE_BUFFERED = 'buffered'
+MODE_STREAM = 'stream'
+
+# Steps other code reads back as state: never buffered
+DEFAULT_SYNC_STEPS = ('EMAIL_*',)
+
+STREAM_GROUP = 'flow-event-drain'
+STREAM_CONSUMER = 'drainer'
+
+_counters = CacheCounters(
+    'flow_buffer:count:',
+    ('scopes', 'events', 'flushes', 'flush_ms', 'rolled_back', 'fallback_rows', 'streamed', 'drained'),
+)
+
+# Failures that say nothing about the event: the drain leaves it pending and stops
+OPERATIONAL_ERRORS = (OperationalError, InterfaceError)
+
+# Written later than this after being logged -> created_at is set back to the logging time
+RESTORE_CREATED_AT_AFTER = timedelta(seconds=1)
+
+_current = ContextVar('flow_event_buffer', default=None)
+
+
+def _flow_settings():
+    return getattr(settings, 'FLOW_LOGGER', {})
+
+
+def flow_logger_mode():
+    return _flow_settings().get('MODE', MODE_SYNC)
+
+
+def writes_immediately(step):
+    """True for steps that are INSERTed at once even inside a scope (FLOW_LOGGER['SYNC_STEPS'])."""
+    patterns = _flow_settings().get('SYNC_STEPS', DEFAULT_SYNC_STEPS)
+    return any(fnmatch.fnmatchcase(step, pattern) for pattern in patterns)
+
+
+def _stream_key():
+    return _flow_settings().get('STREAM_KEY', 'tuki:flow-events')
+
+
+# ---------------------------------------------------------------------------
+# Stats
+# ---------------------------------------------------------------------------
+
+def get_flow_buffer_stats():
+    """Counters since the last reset, plus per-scope and per-flush averages."""
+    stats = _counters.values()
+    stats['events_per_scope'] = round(stats['events'] / stats['scopes'], 2) if stats['scopes'] else None
+    stats['avg_flush_ms'] = round(stats['flush_ms'] / stats['flushes'], 2) if stats['flushes'] else None
+    return stats
+
+
+def reset_flow_buffer_stats():
+    _counters.reset()
+
+
+# ---------------------------------------------------------------------------
+# Writes
+# ---------------------------------------------------------------------------
+
+def _restore_created_at(events, logged_at):
+    """bulk_create stamps insert time (auto_now_add); put back when each event was logged."""
+    now = timezone.now()
+    late = [event for event in events if now - logged_at[event.pk] > RESTORE_CREATED_AT_AFTER]
+    if not late:
+        return
+    from core.models import PlatformFlowEvent
+
+    for event in late:
+        event.created_at = logged_at[event.pk]
+    PlatformFlowEvent.objects.bulk_update(late, ['created_at'])
+
+
+def write_events(events, ignore_conflicts=False):
+    """
+    Persist unsaved PlatformFlowEvent instances with one bulk_create, falling back to
+    one INSERT per event when the batch fails (e.g. an order deleted meanwhile).
+    Returns the number of events written.
+    """
+    written, _ = _write_events(events, ignore_conflicts)
+    return len(written)
+
+
+def _write_events(events, ignore_conflicts=False, stop_on_operational=False):
+    """
+    write_events, returning (written events, events left unattempted). With
+    stop_on_operational the row-by-row fallback stops at the first database outage
+    instead of dropping every remaining event; rows failing on their own are dropped.
+    """
+    from core.models import PlatformFlowEvent
+
+    if not events:
+        return [], []
+    logged_at = {event.pk: event.created_at or timezone.now() for event in events}
+    try:
+        with transaction.atomic():
+            PlatformFlowEvent.objects.bulk_create(events, ignore_conflicts=ignore_conflicts)
+            _restore_created_at(events, logged_at)
+        return list(events), []
+    except Exception as e:
+        logger.warning(f"⚠️ [FLOW] Bulk write of {len(events)} flow events failed, writing one by one: {e}")
+
+    written = []
+    for index, event in enumerate(events):
+        try:
+            with transaction.atomic():
+                event._state.adding = True
+                event.save(force_insert=True)
+                _restore_created_at([event], logged_at)
+            written.append(event)
+        except Exception as e:
+            if stop_on_operational and isinstance(e, OPERATIONAL_ERRORS):
+                logger.error(f"❌ [FLOW] Database unavailable, {len(events) - index} flow events left for retry: {e}")
+                _counters.incr('fallback_rows', index)
+                return written, events[index:]
+            logger.error(f"❌ [FLOW {str(event.flow_id)[:8]}] Failed to log event {event.step}: {e}")
+    _counters.incr('fallback_rows', len(events))
+    return written, []
+
+
+def _serialize(event):
+    """Concrete field values (FKs as ids) of an unsaved event, JSON-encoded for the stream."""
+    data = {
+        field.attname: getattr(event, field.attname)
+        for field in event._meta.concrete_fields
+        if field.name != 'updated_at'
+    }
+    return json.dumps(data, default=str)
+
+
+def _deserialize(raw):
+    from core.models import PlatformFlowEvent
+
+    data = json.loads(raw)
+    fields = {field.attname: field for field in PlatformFlowEvent._meta.concrete_fields}
+    return PlatformFlowEvent(**{
+        name: fields[name].to_python(value) for name, value in data.items() if name in fields
+    })
+
+
+def stream_events(events):
+    """Append events to the Redis stream in one round-trip; falls back to bulk_create."""
+    try:
+        client = get_redis_client(_flow_settings().get('REDIS_URL'))
+        maxlen = _flow_settings().get('STREAM_MAXLEN')
+        pipe = client.pipeline(transaction=False)
+        for event in events:
+            pipe.xadd(_stream_key(), {'event': _serialize(event)}, maxlen=maxlen, approximate=True)
+        pipe.execute()
+        _counters.incr('streamed', len(events))
+        return len(events)
+    except Exception as e:
+        logger.warning(f"⚠️ [FLOW] Could not stream {len(events)} flow events, writing to DB: {e}")
+        return write_events(events)
+
+
+# ---------------------------------------------------------------------------
+# Scopes
+# ---------------------------------------------------------------------------
+
+class FlowEventBuffer:
+    """Events logged in one request or task, flushed together when it ends."""
+
+    def __init__(self, label, mode, max_events):
+        self.label = label
+        self.mode = mode
+        self.max_events = max_events
+        self.ready = []
+        self.logged = 0
+        self.committed = 0
+        self.written = 0
+        self.flush_ms = 0.0
+        self.closed = False
+        self.opened_in_atomic = transaction.get_connection().in_atomic_block
+
+    def add(self, event):
+        # Sort key for events becoming ready in a different order (on_commit)
+        event.created_at = timezone.now()
+        self.logged += 1
+        if self.opened_in_atomic:
+            self._ready(event)
+        else:
+            # Runs at once outside transaction.atomic; on commit (or never, on rollback) inside it
+            transaction.on_commit(partial(self._ready, event))
+
+    def _ready(self, event):
+        self.committed += 1
+        self.ready.append(event)
+        # Past the cap, or committed after the scope ended (scope opened inside the transaction)
+        if self.closed or len(self.ready) >= self.max_events:
+            self.flush()
+
+    def flush(self):
+        if not self.ready:
+            return 0
+        events = sorted(self.ready, key=lambda event: event.created_at)
+        self.ready = []
+        started = time.perf_counter()
+        try:
+            if self.mode == MODE_STREAM:
+                written = stream_events(events)
+            else:
+                written = write_events(events)
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self.flush_ms += elapsed_ms
+            _counters.incr('flushes')
+            _counters.incr('flush_ms', round(elapsed_ms))
+        self.written += written
+        return written
+
+    def close(self):
+        self.closed = True
+        self.flush()
+        # Logged inside a transaction that rolled back (or has not committed yet)
+        rolled_back = self.logged - self.committed
+        _counters.incr('scopes')
+        _counters.incr('events', self.written)
+        if rolled_back > 0:
+            _counters.incr('rolled_back', rolled_back)
+        if self.logged:
+            logger.debug(
+                f"📊 [FLOW] {self.label}: {self.written} flow events written in {self.flush_ms:.1f}ms"
+                + (f" ({rolled_back} rolled back)" if rolled_back > 0 else "")
+            )
+
+
+def current_buffer():
+    return _current.get()
+
+
+def open_scope(label):
+    """
+    Start buffering flow events for the current request/task. Returns the buffer, or
+    None when events are synchronous or a scope is already open (nested scopes join it).
+    """
+    mode = flow_logger_mode()
+    if mode not in (MODE_BUFFERED, MODE_STREAM) or _current.get() is not None:
+        return None
+    buffer = FlowEventBuffer(label, mode, _flow_settings().get('MAX_EVENTS_PER_SCOPE', 200))
+    _current.set(buffer)
+    return buffer
+
+
+def close_scope(buffer):
+    """Write what ``buffer`` collected and stop buffering. Never raises."""
+    if buffer is None:
+        return
+    if _current.get() is buffer:
+        _current.set(None)
+    try:
+        buffer.close()
+    except Exception as e:
+        logger.error(f"❌ [FLOW] Failed to flush flow events for {buffer.label}: {e}", exc_info=True)
+
+
+@contextmanager
+def buffered(label='block'):
+    """Buffer flow events logged in the block (management commands, scripts)."""
+    buffer = open_scope(label)
+    try:
+        yield buffer
+    finally:
+        close_scope(buffer)
+
+
+def add(event):
+    """
+    Queue an unsaved PlatformFlowEvent in the open scope. False when there is none or
+    the step must be written immediately; the caller then INSERTs it.
+    """
+    buffer = _current.get()
+    if buffer is None or writes_immediately(event.step):
+        return False
+    buffer.add(event)
+    return True
+
+
+# ---------------------------------------------------------------------------
+# Stream drain
+# ---------------------------------------------------------------------------
+
+def _ensure_group(client):
+    try:
+        client.xgroup_create(_stream_key(), STREAM_GROUP, id='0', mkstream=True)
+    except Exception as e:
+        if 'BUSYGROUP' not in str(e):
+            raise
+
+
+def drain_flow_event_stream(batch_size=None, max_batches=None):
+    """
+    Bulk-create streamed flow events. Entries are acknowledged only once written, or
+    when they can never be (unreadable, rejected row); on a database outage the rest
+    stay pending and the run stops. Pending entries are re-read first by the next run.
+    Writes ignore conflicts on the (client-generated) primary key, so a re-read entry
+    is a no-op. Returns the number of events written.
+    """
+    if flow_logger_mode() != MODE_STREAM:
+        return 0
+    options = _flow_settings()
+    batch_size = batch_size or options.get('DRAIN_BATCH_SIZE', 500)
+    max_batches = max_batches or options.get('MAX_BATCHES_PER_RUN', 20)
+    client = get_redis_client(_flow_settings().get('REDIS_URL'))
+    key = _stream_key()
+    _ensure_group(client)
+
+    drained = 0
+    batches = 0
+    start_id = '0'  # Pending entries first, then new ones
+    while batches < max_batches:
+        response = client.xreadgroup(STREAM_GROUP, STREAM_CONSUMER, {key: start_id}, count=batch_size)
+        entries = response[0][1] if response else []
+        if not entries:
+            if start_id == '0':
+                start_id = '>'
+                continue
+            break
+        events = []
+        entry_of = {}
+        for entry_id, fields in entries:
+            raw = fields.get(b'event') or fields.get('event')
+            try:
+                event = _deserialize(raw)
+            except Exception as e:
+                logger.error(f"❌ [FLOW] Dropping unreadable streamed flow event {entry_id}: {e}")
+                continue
+            events.append(event)
+            entry_of[event.pk] = entry_id
+        written, unwritten = _write_events(events, ignore_conflicts=True, stop_on_operational=True)
+        pending = {entry_of[event.pk] for event in unwritten}
+        done = [entry_id for entry_id, _ in entries if entry_id not in pending]
+        if done:
+            client.xack(key, STREAM_GROUP, *done)
+            client.xdel(key, *done)
+        drained += len(written)
+        batches += 1
+        if unwritten:
+            break
+
+    if drained:
+        _counters.incr('drained', drained)
+    return drained
@@ -36,7 +36,8 @@ Usage Examples:
     flow.fail(message="Email delivery failed", error=exception)
 
 Design Principles:
-- Non-blocking: All operations are fast database writes
+- Non-blocking: All operations are fast database writes; with FLOW_LOGGER['MODE']
+  'buffered' or 'stream' events are batched per request/task (see core.flow_buffer)
 - Fail-safe: Errors in logging don't break business logic
 - Queryable: All data stored in structured DB tables
 - Extensible: Metadata fields support arbitrary JSON data
@@ -47,6 +48,7 @@ import logging
 
 from django.utils import timezone
 from django.db import transaction
+from core import flow_buffer
 from core.models import PlatformFlow, PlatformFlowEvent
 
 logger = logging.getLogger(__name__)
@@ -179,7 +181,7 @@ class FlowLogger:
             metadata: Step-specific data as dict (optional)
         
         Returns:
-            PlatformFlowEvent instance or None if logging failed
+            PlatformFlowEvent instance (not yet saved when buffered) or None if logging failed
         
         Example:
             flow.log_event(
@@ -196,7 +198,7 @@ class FlowLogger:
             return None
         
         try:
-            event = PlatformFlowEvent.objects.create(
+            event = PlatformFlowEvent(
                 flow=self.flow,
                 step=step,
                 source=source,
@@ -208,6 +210,9 @@ class FlowLogger:
                 celery_task_log=celery_task_log,
                 metadata=_json_safe_metadata(metadata or {})
             )
+            # Buffered until the request/task ends when a flow_buffer scope is open
+            if not flow_buffer.add(event):
+                event.save(force_insert=True)
             
             # Log to standard logger as well for immediate visibility
             emoji = {
@@ -0,0 +1,39 @@
+"""
+Reconstruye la tabla RevenueRollup desde las órdenes pagadas (todas o por organizador/evento).
+Uso tras cargas masivas o `QuerySet.update()` sobre órdenes (no pasan por Order.save).
+Uso: python manage.py rebuild_revenue_rollups [--organizer=<uuid>] [--event=<uuid>]
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.revenue_rollups import prune_hourly_rollups, rebuild_revenue_rollups
+
+
+class Command(BaseCommand):
+    help = "Reconstruye los rollups de ingresos (día/hora) desde las órdenes elegibles."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--organizer", help="Solo este organizador (UUID).")
+        parser.add_argument("--event", help="Solo este evento (UUID).")
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=5000,
+            help="Órdenes leídas por lote (default: 5000).",
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        result = rebuild_revenue_rollups(
+            organizer_id=options["organizer"],
+            event_id=options["event"],
+            chunk_size=max(1, options["chunk_size"]),
+        )
+        pruned = prune_hourly_rollups()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Rollups reconstruidos: {result['rows']} filas desde {result['orders']} órdenes "
+            f"en {elapsed:.2f}s ({pruned} buckets horarios antiguos eliminados)."
+        ))
@@ -0,0 +1,33 @@
+"""
+🚀 ENTERPRISE: Core middleware.
+"""
+
+from django.conf import settings
+
+from core import flow_buffer
+
+
+class FlowEventBufferMiddleware:
+    """
+    Buffers the FlowLogger events of each request and writes them in one batch after
+    the view returns (or raises). No-op when FLOW_LOGGER['MODE'] is 'sync'.
+
+    With FLOW_LOGGER['SERVER_TIMING'] the response reports the request's event count
+    and flush latency in a ``Server-Timing: flowlog;dur=<ms>;desc="<n> events"`` header.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        buffer = flow_buffer.open_scope(f'{request.method} {request.path}')
+        if buffer is None:
+            return self.get_response(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            flow_buffer.close_scope(buffer)
+        request.flow_events = {'count': buffer.written, 'flush_ms': round(buffer.flush_ms, 2)}
+        if buffer.logged and getattr(settings, 'FLOW_LOGGER', {}).get('SERVER_TIMING'):
+            response['Server-Timing'] = f'flowlog;dur={buffer.flush_ms:.1f};desc="{buffer.written} events"'
+        return response
@@ -0,0 +1,159 @@
+# Generated by Django 4.2.8 on 2026-10-16 19:28
+
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+from decimal import Decimal, ROUND_HALF_UP
+
+from django.db import migrations, models
+from django.db.models import Sum
+from django.utils import timezone
+import django.db.models.deletion
+
+AMOUNT_FIELDS = (
+    'total_revenue', 'gross_revenue', 'service_fees',
+    'subtotal_original', 'service_fees_original', 'total_discount',
+)
+HOURLY_DAYS = 2
+CHUNK_SIZE = 5000
+
+
+def _day_bucket(value):
+    return timezone.make_aware(datetime.combine(timezone.localtime(value).date(), time.min))
+
+
+def _hour_bucket(value):
+    return timezone.localtime(value).replace(minute=0, second=0, microsecond=0)
+
+
+def _amounts(order):
+    total = Decimal(str(order['total'] or 0))
+    subtotal = Decimal(str(order['subtotal'] or 0))
+    service_fee = Decimal(str(order['service_fee'] or 0))
+    if order['subtotal_effective'] is not None and order['service_fee_effective'] is not None:
+        gross, fees = Decimal(str(order['subtotal_effective'])), Decimal(str(order['service_fee_effective']))
+    elif subtotal + service_fee > 0:
+        ratio = total / (subtotal + service_fee)
+        gross = (subtotal * ratio).quantize(Decimal('1'), rounding=ROUND_HALF_UP)
+        fees = (service_fee * ratio).quantize(Decimal('1'), rounding=ROUND_HALF_UP)
+    else:
+        gross, fees = Decimal('0'), Decimal('0')
+    return {
+        'total_revenue': total, 'gross_revenue': gross, 'service_fees': fees,
+        'subtotal_original': subtotal, 'service_fees_original': service_fee,
+        'total_discount': Decimal(str(order['discount'] or 0)),
+    }
+
+
+def backfill_revenue_rollups(apps, schema_editor):
+    """
+    Build rollups from existing revenue-eligible orders with the historical models
+    (the rules of core.revenue_rollups.rebuild_revenue_rollups as of this migration).
+    """
+    Order = apps.get_model('events', 'Order')
+    OrderItem = apps.get_model('events', 'OrderItem')
+    RevenueRollup = apps.get_model('core', 'RevenueRollup')
+
+    orders = Order.objects.filter(
+        status='paid', is_sandbox=False, deleted_at__isnull=True, exclude_from_revenue=False,
+        event__isnull=False,
+    ).values(
+        'id', 'event_id', 'event__organizer_id', 'created_at', 'total', 'subtotal', 'service_fee',
+        'discount', 'subtotal_effective', 'service_fee_effective',
+    )
+    hourly_since = _day_bucket(timezone.now()) - timedelta(days=HOURLY_DAYS)
+    totals = defaultdict(lambda: dict.fromkeys(('orders', 'tickets') + AMOUNT_FIELDS, 0))
+
+    def add(batch):
+        quantities = defaultdict(dict)
+        for row in OrderItem.objects.filter(order_id__in=[o['id'] for o in batch]).values(
+            'order_id', 'ticket_tier_id'
+        ).annotate(quantity=Sum('quantity')):
+            quantities[row['order_id']][row['ticket_tier_id']] = row['quantity']
+
+        for o in batch:
+            amounts = _amounts(o)
+            tiers = quantities.get(o['id'], {})
+            tickets = sum(tiers.values())
+            contribution = {None: {'orders': 1, 'tickets': tickets, **amounts}}
+            for tier_id, quantity in (tiers.items() if tickets else ()):
+                share = Decimal(quantity) / Decimal(tickets)
+                contribution[tier_id] = {
+                    'orders': 1, 'tickets': quantity,
+                    **{name: (value * share).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+                       for name, value in amounts.items()},
+                }
+            buckets = [('day', _day_bucket(o['created_at']))]
+            if o['created_at'] >= hourly_since:
+                buckets.append(('hour', _hour_bucket(o['created_at'])))
+            for granularity, bucket in buckets:
+                for tier_id, metrics in contribution.items():
+                    row = totals[(o['event__organizer_id'], o['event_id'], tier_id, granularity, bucket)]
+                    for name, value in metrics.items():
+                        row[name] += value
+
+    batch = []
+    for order in orders.iterator(chunk_size=CHUNK_SIZE):
+        batch.append(order)
+        if len(batch) >= CHUNK_SIZE:
+            add(batch)
+            batch = []
+    if batch:
+        add(batch)
+
+    RevenueRollup.objects.bulk_create(
+        (
+            RevenueRollup(
+                organizer_id=organizer, event_id=event, ticket_tier_id=tier,
+                granularity=granularity, bucket_start=bucket, **metrics,
+            )
+            for (organizer, event, tier, granularity, bucket), metrics in totals.items()
+        ),
+        batch_size=CHUNK_SIZE,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0052_order_booking_date_order_cancellation_date_and_more'),
+        ('organizers', '0019_add_payout_model'),
+        ('core', '0016_alter_platformflow_flow_type'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RevenueRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('granularity', models.CharField(choices=[('day', 'Day'), ('hour', 'Hour')], max_length=4, verbose_name='granularity')),
+                ('bucket_start', models.DateTimeField(help_text='Local midnight (day) or start of hour', verbose_name='bucket start')),
+                ('orders', models.IntegerField(default=0, verbose_name='orders')),
+                ('tickets', models.IntegerField(default=0, verbose_name='tickets')),
+                ('total_revenue', models.DecimalField(decimal_places=2, default=0, max_digits=16, verbose_name='total revenue')),
+                ('gross_revenue', models.DecimalField(decimal_places=2, default=0, max_digits=16, verbose_name='gross revenue')),
+                ('service_fees', models.DecimalField(decimal_places=2, default=0, max_digits=16, verbose_name='service fees')),
+                ('subtotal_original', models.DecimalField(decimal_places=2, default=0, max_digits=16, verbose_name='original subtotal')),
+                ('service_fees_original', models.DecimalField(decimal_places=2, default=0, max_digits=16, verbose_name='original service fees')),
+                ('total_discount', models.DecimalField(decimal_places=2, default=0, max_digits=16, verbose_name='total discount')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated at')),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='revenue_rollups', to='events.event', verbose_name='event')),
+                ('organizer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='revenue_rollups', to='organizers.organizer', verbose_name='organizer')),
+                ('ticket_tier', models.ForeignKey(blank=True, help_text='Empty for event-level totals', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='revenue_rollups', to='events.tickettier', verbose_name='ticket tier')),
+            ],
+            options={
+                'verbose_name': 'Revenue rollup',
+                'verbose_name_plural': 'Revenue rollups',
+                'ordering': ['bucket_start'],
+                'indexes': [models.Index(fields=['organizer', 'granularity', 'bucket_start'], name='core_revroll_org_bucket_idx'), models.Index(fields=['event', 'granularity', 'bucket_start'], name='core_revroll_event_bucket_idx'), models.Index(fields=['ticket_tier', 'granularity', 'bucket_start'], name='core_revroll_tier_bucket_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='revenuerollup',
+            constraint=models.UniqueConstraint(condition=models.Q(('ticket_tier__isnull', False)), fields=('event', 'ticket_tier', 'granularity', 'bucket_start'), name='core_revenuerollup_unique_tier_bucket'),
+        ),
+        migrations.AddConstraint(
+            model_name='revenuerollup',
+            constraint=models.UniqueConstraint(condition=models.Q(('ticket_tier__isnull', True)), fields=('event', 'granularity', 'bucket_start'), name='core_revenuerollup_unique_event_bucket'),
+        ),
+        migrations.RunPython(backfill_revenue_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.8 on 2026-10-16 19:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0017_revenue_rollup'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='platformflow',
+            index=models.Index(fields=['flow_type', 'created_at'], name='core_platfo_flow_ty_82681a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='platformflowevent',
+            index=models.Index(fields=['flow', 'step'], name='core_platfo_flow_id_3c6c3a_idx'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.8 on 2026-10-16 21:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0018_conversion_funnel_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CeleryTaskStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket_start', models.DateTimeField(verbose_name='bucket start')),
+                ('task_name', models.CharField(max_length=255, verbose_name='task name')),
+                ('queue', models.CharField(blank=True, max_length=100, verbose_name='queue')),
+                ('status', models.CharField(choices=[('success', 'Success'), ('failure', 'Failure'), ('retry', 'Retry')], max_length=20, verbose_name='status')),
+                ('count', models.IntegerField(default=0, verbose_name='count')),
+                ('total_duration_ms', models.BigIntegerField(default=0, verbose_name='total duration (ms)')),
+                ('max_duration_ms', models.IntegerField(default=0, verbose_name='max duration (ms)')),
+                ('histogram', models.JSONField(blank=True, default=list, verbose_name='duration histogram')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated at')),
+            ],
+            options={
+                'verbose_name': 'Celery task stat',
+                'verbose_name_plural': 'Celery task stats',
+                'ordering': ['-bucket_start'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='celerytaskstat',
+            constraint=models.UniqueConstraint(fields=('bucket_start', 'task_name', 'queue', 'status'), name='core_celerytaskstat_unique_bucket'),
+        ),
+        migrations.AddIndex(
+            model_name='celerytaskstat',
+            index=models.Index(fields=['task_name', 'bucket_start'], name='core_taskstat_task_bucket_idx'),
+        ),
+    ]
@@ -204,6 +204,7 @@ class PlatformFlow(BaseModel):
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['flow_type', 'status', 'created_at']),
+            models.Index(fields=['flow_type', 'created_at']),  # Conversion funnel window
             models.Index(fields=['user', 'created_at']),
             models.Index(fields=['organizer', 'created_at']),
             models.Index(fields=['status', 'created_at']),
@@ -382,6 +383,7 @@ class PlatformFlowEvent(BaseModel):
         ordering = ['created_at']
         indexes = [
             models.Index(fields=['flow', 'created_at']),
+            models.Index(fields=['flow', 'step']),  # Conversion funnel (index-only scan)
             models.Index(fields=['step', 'status', 'created_at']),
             models.Index(fields=['order', 'created_at']),
         ]
@@ -516,6 +518,52 @@ class CeleryTaskLog(BaseModel):
         return f"{task_short} [{self.status}] - {self.task_id[:8]}"
 
 
+class CeleryTaskStat(models.Model):
+    """
+    🚀 ENTERPRISE: Aggregated Celery task timings per time bucket, task, queue and outcome.
+
+    Written by core.celery_telemetry when CELERY_TELEMETRY['MODE'] is 'aggregate':
+    each worker process buffers timings in memory and folds them into these rows
+    every few seconds. ``histogram`` holds execution counts per duration bucket
+    (CELERY_TELEMETRY['HISTOGRAM_BOUNDS_MS'] upper bounds, plus one overflow bucket).
+    """
+
+    STATUS_CHOICES = [
+        ('success', 'Success'),
+        ('failure', 'Failure'),
+        ('retry', 'Retry'),
+    ]
+
+    bucket_start = models.DateTimeField(_("bucket start"))
+    task_name = models.CharField(_("task name"), max_length=255)
+    queue = models.CharField(_("queue"), max_length=100, blank=True)
+    status = models.CharField(_("status"), max_length=20, choices=STATUS_CHOICES)
+
+    count = models.IntegerField(_("count"), default=0)
+    total_duration_ms = models.BigIntegerField(_("total duration (ms)"), default=0)
+    max_duration_ms = models.IntegerField(_("max duration (ms)"), default=0)
+    histogram = models.JSONField(_("duration histogram"), default=list, blank=True)
+
+    updated_at = models.DateTimeField(_("Updated at"), auto_now=True)
+
+    class Meta:
+        verbose_name = _("Celery task stat")
+        verbose_name_plural = _("Celery task stats")
+        ordering = ['-bucket_start']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['bucket_start', 'task_name', 'queue', 'status'],
+                name='core_celerytaskstat_unique_bucket',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['task_name', 'bucket_start'], name='core_taskstat_task_bucket_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.task_name} [{self.status}] x{self.count} @ {self.bucket_start.isoformat()}"
+
+
 class PlatformUptimeHeartbeat(models.Model):
     """
     Heartbeat para medir uptime real de la plataforma en BD.
@@ -660,4 +708,84 @@ class Country(TimeStampedModel):
         ]
     
     def __str__(self):
-        return self.name 
\ No newline at end of file
+        return self.name 
+
+class RevenueRollup(models.Model):
+    """
+    🚀 ENTERPRISE: Materialized revenue per organizer / event / ticket tier and time bucket.
+
+    Maintained incrementally by Order.save (see core.revenue_rollups) and rebuilt with
+    `manage.py rebuild_revenue_rollups`. Rows with ticket_tier=NULL hold the exact
+    event-level totals; tier rows hold each order's amounts split by ticket quantity.
+    Day buckets are kept forever; hour buckets only for recent days (today's chart).
+    """
+
+    GRANULARITY_DAY = 'day'
+    GRANULARITY_HOUR = 'hour'
+    GRANULARITY_CHOICES = (
+        (GRANULARITY_DAY, _('Day')),
+        (GRANULARITY_HOUR, _('Hour')),
+    )
+
+    organizer = models.ForeignKey(
+        'organizers.Organizer',
+        on_delete=models.CASCADE,
+        related_name='revenue_rollups',
+        verbose_name=_("organizer"),
+    )
+    event = models.ForeignKey(
+        'events.Event',
+        on_delete=models.CASCADE,
+        related_name='revenue_rollups',
+        verbose_name=_("event"),
+    )
+    ticket_tier = models.ForeignKey(
+        'events.TicketTier',
+        on_delete=models.CASCADE,
+        related_name='revenue_rollups',
+        verbose_name=_("ticket tier"),
+        null=True,
+        blank=True,
+        help_text=_("Empty for event-level totals"),
+    )
+    granularity = models.CharField(_("granularity"), max_length=4, choices=GRANULARITY_CHOICES)
+    bucket_start = models.DateTimeField(_("bucket start"), help_text=_("Local midnight (day) or start of hour"))
+
+    orders = models.IntegerField(_("orders"), default=0)
+    tickets = models.IntegerField(_("tickets"), default=0)
+    total_revenue = models.DecimalField(_("total revenue"), max_digits=16, decimal_places=2, default=0)
+    gross_revenue = models.DecimalField(_("gross revenue"), max_digits=16, decimal_places=2, default=0)
+    service_fees = models.DecimalField(_("service fees"), max_digits=16, decimal_places=2, default=0)
+    subtotal_original = models.DecimalField(_("original subtotal"), max_digits=16, decimal_places=2, default=0)
+    service_fees_original = models.DecimalField(
+        _("original service fees"), max_digits=16, decimal_places=2, default=0
+    )
+    total_discount = models.DecimalField(_("total discount"), max_digits=16, decimal_places=2, default=0)
+
+    updated_at = models.DateTimeField(_("Updated at"), auto_now=True)
+
+    class Meta:
+        verbose_name = _("Revenue rollup")
+        verbose_name_plural = _("Revenue rollups")
+        ordering = ['bucket_start']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['event', 'ticket_tier', 'granularity', 'bucket_start'],
+                condition=models.Q(ticket_tier__isnull=False),
+                name='core_revenuerollup_unique_tier_bucket',
+            ),
+            models.UniqueConstraint(
+                fields=['event', 'granularity', 'bucket_start'],
+                condition=models.Q(ticket_tier__isnull=True),
+                name='core_revenuerollup_unique_event_bucket',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['organizer', 'granularity', 'bucket_start'], name='core_revroll_org_bucket_idx'),
+            models.Index(fields=['event', 'granularity', 'bucket_start'], name='core_revroll_event_bucket_idx'),
+            models.Index(fields=['ticket_tier', 'granularity', 'bucket_start'], name='core_revroll_tier_bucket_idx'),
+        ]
+
+    def __str__(self):
+        scope = self.ticket_tier_id or 'event'
+        return f"Revenue {self.event_id}/{scope} {self.granularity}@{self.bucket_start.isoformat()}"
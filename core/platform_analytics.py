@@ -0,0 +1,346 @@
+"""
+🚀 ENTERPRISE PLATFORM ANALYTICS
+================================
+
+Query layer for the SuperAdmin analytics endpoints (organizer sales and dashboard
+time series). Everything is computed with a constant number of grouped queries:
+
+- organizer_sales_rows: one GROUP BY organizer per metric (orders, events,
+  experiences, accommodations) plus one query for the organizers themselves,
+  instead of 5+ queries per organizer.
+- dashboard_time_series_data: one GROUP BY day per entity, filtered on the raw
+  timestamp range (index friendly, unlike ``created_at__date``).
+
+Results are cached per (endpoint, range, filters) for PLATFORM_ANALYTICS['CACHE_TTL']
+seconds. Every key embeds a version number that is bumped when an order is paid,
+cancelled or refunded (apps.events.signals) and when an organizer is saved or deleted
+(apps.organizers.signals), so revenue figures and organizer status, modules and fee
+rates show up right away; the TTL bounds staleness for counts (new users, products).
+"""
+
+import hashlib
+import json
+import logging
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models import Count, F, Min, Sum
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+
+from core.revenue_rollups import day_bucket
+from core.revenue_system import order_revenue_eligible_q
+
+logger = logging.getLogger(__name__)
+
+CACHE_PREFIX = 'platform_analytics'
+VERSION_KEY = f'{CACHE_PREFIX}:version'
+
+# Order statuses whose save can change revenue figures
+REVENUE_STATUSES = ('paid', 'cancelled', 'refunded')
+
+
+def _settings():
+    return getattr(settings, 'PLATFORM_ANALYTICS', {})
+
+
+def cache_ttl():
+    return _settings().get('CACHE_TTL', 300)
+
+
+# ============================================================================
+# CACHE
+# ============================================================================
+
+def _version():
+    try:
+        version = cache.get(VERSION_KEY)
+        if version is None:
+            cache.add(VERSION_KEY, 1, None)
+            version = cache.get(VERSION_KEY) or 1
+        return version
+    except Exception:
+        return 0
+
+
+def invalidate():
+    """Drop every cached analytics result (new version; old keys expire with their TTL)."""
+    try:
+        try:
+            cache.incr(VERSION_KEY)
+        except ValueError:
+            cache.add(VERSION_KEY, 2, None)
+    except Exception as e:
+        logger.warning(f"⚠️ [ANALYTICS] Could not invalidate platform analytics cache: {e}")
+
+
+def cache_key(name, params):
+    raw = json.dumps(sorted(params.items()), default=str, separators=(',', ':'))
+    digest = hashlib.md5(raw.encode('utf-8')).hexdigest()
+    return f"{CACHE_PREFIX}:v{_version()}:{name}:{digest}"
+
+
+def cached(name, params, compute):
+    """Return the cached result for (name, params) or compute and store it."""
+    ttl = cache_ttl()
+    key = cache_key(name, params) if ttl else None
+    if key:
+        try:
+            data = cache.get(key)
+        except Exception:
+            data = None
+        if data is not None:
+            return data
+    data = compute()
+    if key:
+        try:
+            cache.set(key, data, ttl)
+        except Exception as e:
+            logger.warning(f"⚠️ [ANALYTICS] Could not cache {name}: {e}")
+    return data
+
+
+# ============================================================================
+# ORGANIZER SALES
+# ============================================================================
+
+def _normalize_dashboard_template(template):
+    """Legacy experience dashboard template values."""
+    if template == 'standard':
+        return 'v0'
+    if template == 'free_tours':
+        return 'principal'
+    return template
+
+
+def _count_by_organizer(queryset, organizer_id=None):
+    if organizer_id:
+        queryset = queryset.filter(organizer_id=organizer_id)
+    rows = queryset.values('organizer_id').annotate(n=Count('id')).order_by()
+    return {row['organizer_id']: row['n'] for row in rows}
+
+
+def organizer_sales_rows(organizer_id=None):
+    """
+    Sales, fees and product counts per organizer, sorted by total_sales desc.
+
+    Sales are revenue-eligible orders of the organizer's events (subtotal / service_fee).
+    Experiences and accommodations are only counted for organizers with the module.
+    """
+    from apps.events.models import Event, Order
+    from apps.organizers.models import Organizer
+
+    organizers = Organizer.objects.all()
+    orders = Order.objects.filter(order_revenue_eligible_q(), event__isnull=False)
+    if organizer_id:
+        organizers = organizers.filter(id=organizer_id)
+        orders = orders.filter(event__organizer_id=organizer_id)
+
+    sales = {
+        row['organizer_id']: row
+        for row in orders.values(organizer_id=F('event__organizer_id')).annotate(
+            total_sales=Sum('subtotal'),
+            total_fees=Sum('service_fee'),
+            orders_count=Count('id'),
+        ).order_by()
+    }
+    events_counts = _count_by_organizer(Event.objects.filter(deleted_at__isnull=True), organizer_id)
+
+    experiences_counts = {}
+    try:
+        from apps.experiences.models import Experience
+        experiences_counts = _count_by_organizer(
+            Experience.objects.filter(deleted_at__isnull=True, organizer__has_experience_module=True),
+            organizer_id,
+        )
+    except Exception:
+        pass
+
+    accommodations_counts = {}
+    try:
+        from apps.accommodations.models import Accommodation
+        accommodations_counts = _count_by_organizer(
+            Accommodation.objects.filter(deleted_at__isnull=True, organizer__has_accommodation_module=True),
+            organizer_id,
+        )
+    except Exception:
+        pass
+
+    rows = []
+    for organizer in organizers:
+        sales_data = sales.get(organizer.id, {})
+        total_sales = float(sales_data.get('total_sales') or 0)
+        total_fees = float(sales_data.get('total_fees') or 0)
+        avg_fee_percentage = (total_fees / total_sales) * 100 if total_sales > 0 else 0
+        configured_rate = organizer.default_service_fee_rate
+
+        rows.append({
+            'organizer_id': str(organizer.id),
+            'organizer_name': organizer.name,
+            'organizer_email': organizer.contact_email,
+            'total_sales': total_sales,
+            'total_service_fees': total_fees,
+            'gross_total': total_sales + total_fees,
+            'orders_count': sales_data.get('orders_count') or 0,
+            'average_fee_percentage': round(avg_fee_percentage, 2),
+            'default_service_fee_rate': float(configured_rate) if configured_rate is not None else None,
+            'effective_service_fee_rate': float(configured_rate) if configured_rate is not None else 0.15,
+            'service_fee_source': 'organizer' if configured_rate is not None else 'platform',
+            'status': organizer.status,
+            'has_events_module': organizer.has_events_module,
+            'has_experience_module': organizer.has_experience_module,
+            'has_accommodation_module': organizer.has_accommodation_module,
+            'is_student_center': organizer.is_student_center,
+            'experience_dashboard_template': _normalize_dashboard_template(organizer.experience_dashboard_template),
+            'events_count': events_counts.get(organizer.id, 0),
+            'experiences_count': experiences_counts.get(organizer.id, 0),
+            'accommodations_count': accommodations_counts.get(organizer.id, 0),
+        })
+
+    rows.sort(key=lambda row: row['total_sales'], reverse=True)
+    return rows
+
+
+# ============================================================================
+# DASHBOARD TIME SERIES
+# ============================================================================
+
+def first_activity_date():
+    """
+    Fecha más antigua con actividad contable: primera orden con revenue, primer usuario,
+    primer alojamiento, primera experiencia, primer organizador.
+    Así "Todo" solo muestra desde que la plataforma tiene datos reales.
+    """
+    from apps.events.models import Order
+    from apps.organizers.models import Organizer
+
+    end = timezone.now().date()
+    sources = [
+        (Order.objects.filter(order_revenue_eligible_q()).exclude(order_kind='erasmus_activity'), 'created_at'),
+        (get_user_model().objects.all(), 'date_joined'),
+        (Organizer.objects.all(), 'created_at'),
+    ]
+    optional = [
+        ('accommodations.Accommodation', {}),
+        ('experiences.Experience', {}),
+        ('erasmus.ErasmusActivityInscriptionPayment', {'exclude_from_revenue': False}),
+        ('car_rental.Car', {}),
+    ]
+    for model_label, filters in optional:
+        try:
+            sources.append((apps.get_model(model_label).objects.filter(**filters), 'created_at'))
+        except LookupError:
+            pass
+
+    candidates = []
+    for queryset, field in sources:
+        try:
+            first = queryset.aggregate(m=Min(field))['m']
+        except Exception:
+            continue
+        if first:
+            candidates.append(timezone.localtime(first).date())
+    if not candidates:
+        return end - timedelta(days=365)
+    return min(candidates)
+
+
+def _daily(queryset, field, start_date, end_date, value=None):
+    """{date: value} for [start_date, end_date] (local days) in one GROUP BY query."""
+    rows = (
+        queryset.filter(**{
+            f'{field}__gte': day_bucket(start_date),
+            f'{field}__lt': day_bucket(end_date + timedelta(days=1)),
+        })
+        .annotate(day=TruncDate(field))
+        .values('day')
+        .annotate(value=value if value is not None else Count('id'))
+        .order_by()
+    )
+    return {row['day']: row['value'] for row in rows if row['day']}
+
+
+def _series(days, values, as_float=False):
+    """[{date, value, cumulative}] over every day of the range (0 for missing days)."""
+    series = []
+    cumulative = 0
+    for day in days:
+        value = values.get(day) or 0
+        if as_float:
+            value = float(value)
+        cumulative += value
+        if as_float:
+            series.append({'date': day.isoformat(), 'value': round(value, 0), 'cumulative': round(cumulative, 0)})
+        else:
+            series.append({'date': day.isoformat(), 'value': value, 'cumulative': cumulative})
+    return series
+
+
+def _optional_daily(model_label, start_date, end_date):
+    """New rows per day of an optional app's model ({} when the app is not installed)."""
+    try:
+        model = apps.get_model(model_label)
+    except LookupError:
+        return {}
+    return _daily(model.objects.all(), 'created_at', start_date, end_date)
+
+
+def dashboard_time_series_data(start_date, end_date):
+    """
+    Daily series for the SuperAdmin dashboard (see api.v1.superadmin dashboard_time_series).
+
+    - revenue: nuestro revenue (service_fee_effective o service_fee) + ingresos Erasmus.
+    - users, accommodations, experiences, organizers, transports: nuevos por día.
+    start_date=None means "since the first activity" (first_activity_date()).
+    """
+    from apps.events.models import Order
+    from apps.organizers.models import Organizer
+
+    if start_date is None:
+        start_date = first_activity_date()
+
+    revenue = _daily(
+        Order.objects.filter(order_revenue_eligible_q()).exclude(order_kind='erasmus_activity'),
+        'created_at', start_date, end_date,
+        value=Sum(Coalesce(F('service_fee_effective'), F('service_fee'))),
+    )
+    try:
+        from apps.erasmus.models import ErasmusActivityInscriptionPayment
+        erasmus = _daily(
+            ErasmusActivityInscriptionPayment.objects.filter(exclude_from_revenue=False),
+            'created_at', start_date, end_date, value=Sum('amount'),
+        )
+        for day, amount in erasmus.items():
+            revenue[day] = float(revenue.get(day) or 0) + float(amount or 0)
+    except Exception:
+        pass
+
+    days = [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
+    revenue_series = _series(days, revenue, as_float=True)
+    users_series = _series(days, _daily(get_user_model().objects.all(), 'date_joined', start_date, end_date))
+    organizers_series = _series(days, _daily(Organizer.objects.all(), 'created_at', start_date, end_date))
+
+    def last(series, n):
+        return sum(point['value'] for point in series[-n:])
+
+    return {
+        'start_date': start_date.isoformat(),
+        'end_date': end_date.isoformat(),
+        'revenue': revenue_series,
+        'users': users_series,
+        'accommodations': _series(days, _optional_daily('accommodations.Accommodation', start_date, end_date)),
+        'experiences': _series(days, _optional_daily('experiences.Experience', start_date, end_date)),
+        'organizers': organizers_series,
+        'transports': _series(days, _optional_daily('car_rental.Car', start_date, end_date)),
+        'summary': {
+            'revenue_last_7d': round(last(revenue_series, 7), 0),
+            'revenue_last_30d': round(last(revenue_series, 30), 0),
+            'users_new_7d': last(users_series, 7),
+            'users_new_30d': last(users_series, 30),
+            'organizers_new_7d': last(organizers_series, 7),
+            'organizers_new_30d': last(organizers_series, 30),
+        },
+    }
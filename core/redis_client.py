@@ -0,0 +1,21 @@
+"""
+🚀 ENTERPRISE: Redis connections for the Redis-backed fast paths.
+
+Each fast path accepts its own ``REDIS_URL`` setting; when it is empty they share
+the django-redis cache connection, or the Celery broker when the cache is not Redis.
+"""
+
+from django.conf import settings
+
+
+def get_redis_client(url=None):
+    """Dedicated client for ``url``, else the django-redis connection, else CELERY_BROKER_URL."""
+    if not url:
+        try:
+            from django_redis import get_redis_connection
+            return get_redis_connection('default')
+        except Exception:
+            url = getattr(settings, 'CELERY_BROKER_URL', 'redis://localhost:6379/0')
+
+    import redis
+    return redis.Redis.from_url(url)
@@ -0,0 +1,432 @@
+"""
+🚀 ENTERPRISE REVENUE ROLLUPS
+=============================
+
+Materialized revenue per organizer / event / ticket tier and day (plus hour buckets
+for recent days) in core.RevenueRollup, so dashboards read a handful of pre-aggregated
+rows instead of re-aggregating every revenue-eligible Order.
+
+Write paths:
+- Order.save -> sync_order_revenue_rollups(order): when an order enters, leaves or
+  changes while revenue-eligible (core.revenue_system.order_revenue_eligible_q), its
+  previous contribution is subtracted and the new one added, in the same transaction.
+- OrderItem.save / OrderItem.delete / Order.delete and raw SQL on an order row ->
+  `with tracking_order_revenue(order_id):` swaps the stored contribution before the
+  block for the one after it (tickets per tier, created_at bucket, removed orders).
+- manage.py rebuild_revenue_rollups -> rebuild_revenue_rollups(): full/scoped backfill.
+  Use it after bulk `QuerySet.update()` / `bulk_create()` on orders or items, which
+  bypass the hooks above.
+
+Read paths: core.revenue_system.get_event_revenue / get_ticket_tier_revenue /
+get_organizer_revenue and EventViewSet.analytics.
+"""
+
+import logging
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime, time, timedelta
+from decimal import Decimal, ROUND_HALF_UP
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+AMOUNT_FIELDS = (
+    'total_revenue', 'gross_revenue', 'service_fees',
+    'subtotal_original', 'service_fees_original', 'total_discount',
+)
+COUNT_FIELDS = ('orders', 'tickets')
+METRIC_FIELDS = COUNT_FIELDS + AMOUNT_FIELDS
+
+CENT = Decimal('0.01')
+
+
+def _rollup_settings():
+    return getattr(settings, 'REVENUE_ROLLUPS', {})
+
+
+def hourly_retention_days():
+    """Days of hour buckets kept (today is always kept)."""
+    return _rollup_settings().get('HOURLY_RETENTION_DAYS', 2)
+
+
+# ============================================================================
+# BUCKETS
+# ============================================================================
+
+def day_bucket(value):
+    """Local midnight (aware) for a datetime or date."""
+    if isinstance(value, datetime):
+        value = timezone.localtime(value).date()
+    return timezone.make_aware(datetime.combine(value, time.min))
+
+
+def hour_bucket(value):
+    """Start of the local hour (aware) for a datetime."""
+    return timezone.localtime(value).replace(minute=0, second=0, microsecond=0)
+
+
+def is_day_aligned(value):
+    """True for dates and for datetimes at local midnight."""
+    if not isinstance(value, datetime):
+        return True
+    return timezone.localtime(value).time() == time.min
+
+
+# ============================================================================
+# ORDER CONTRIBUTION
+# ============================================================================
+
+# Order fields read by order_revenue_snapshot (Order.from_db only snapshots when all are loaded)
+SNAPSHOT_FIELDS = (
+    'status', 'is_sandbox', 'deleted_at', 'exclude_from_revenue', 'event_id', 'created_at',
+    'total', 'subtotal', 'service_fee', 'discount', 'subtotal_effective', 'service_fee_effective',
+)
+
+
+def order_revenue_snapshot(order):
+    """
+    Fields that decide an order's rollup contribution.
+
+    Returns None when the order does not count for revenue (or has no event).
+    """
+    if not order.event_id or not order.counts_for_revenue:
+        return None
+    return (
+        order.event_id, order.created_at, order.total, order.subtotal, order.service_fee,
+        order.discount, order.subtotal_effective, order.service_fee_effective,
+    )
+
+
+def load_order_revenue_snapshot(order):
+    """Snapshot of the order as currently stored (for instances not loaded with every field)."""
+    stored = type(order).objects.filter(pk=order.pk).only(*SNAPSHOT_FIELDS).first()
+    return order_revenue_snapshot(stored) if stored else None
+
+
+def _effective_amounts(total, subtotal, service_fee, discount, subtotal_effective, service_fee_effective):
+    """Stored effective values, or the proportional fallback used by revenue_system."""
+    if subtotal_effective is not None and service_fee_effective is not None:
+        return Decimal(str(subtotal_effective)), Decimal(str(service_fee_effective))
+
+    total = Decimal(str(total or 0))
+    subtotal = Decimal(str(subtotal or 0))
+    service_fee = Decimal(str(service_fee or 0))
+    original = subtotal + service_fee
+    if original <= 0:
+        return Decimal('0'), Decimal('0')
+    ratio = total / original
+    return (
+        (subtotal * ratio).quantize(Decimal('1'), rounding=ROUND_HALF_UP),
+        (service_fee * ratio).quantize(Decimal('1'), rounding=ROUND_HALF_UP),
+    )
+
+
+def order_contribution(snapshot, tier_quantities):
+    """
+    Metrics an order adds, keyed by ticket tier (None = event-level row).
+
+    Amounts on tier rows are the order's amounts split by ticket quantity,
+    the same allocation get_ticket_tier_revenue always used.
+    """
+    _, _, total, subtotal, service_fee, discount, subtotal_effective, service_fee_effective = snapshot
+    gross, fees = _effective_amounts(
+        total, subtotal, service_fee, discount, subtotal_effective, service_fee_effective
+    )
+    amounts = {
+        'total_revenue': Decimal(str(total or 0)),
+        'gross_revenue': gross,
+        'service_fees': fees,
+        'subtotal_original': Decimal(str(subtotal or 0)),
+        'service_fees_original': Decimal(str(service_fee or 0)),
+        'total_discount': Decimal(str(discount or 0)),
+    }
+    total_quantity = sum(tier_quantities.values())
+
+    contribution = {None: {'orders': 1, 'tickets': total_quantity, **amounts}}
+    if total_quantity:
+        for tier_id, quantity in tier_quantities.items():
+            share = Decimal(quantity) / Decimal(total_quantity)
+            contribution[tier_id] = {
+                'orders': 1,
+                'tickets': quantity,
+                **{name: (value * share).quantize(CENT, rounding=ROUND_HALF_UP) for name, value in amounts.items()},
+            }
+    return contribution
+
+
+def _tier_quantities(order_id):
+    from apps.events.models import OrderItem
+
+    return {
+        row['ticket_tier_id']: row['quantity']
+        for row in OrderItem.objects.filter(order_id=order_id).values('ticket_tier_id').annotate(
+            quantity=Sum('quantity')
+        )
+    }
+
+
+def _bucket_deltas(organizer_id, snapshot, contribution, sign, deltas):
+    """Add ±contribution to the day and hour buckets of the order's creation time."""
+    event_id, created_at = snapshot[0], snapshot[1]
+    for granularity, bucket in (('day', day_bucket(created_at)), ('hour', hour_bucket(created_at))):
+        for tier_id, metrics in contribution.items():
+            key = (organizer_id, event_id, tier_id, granularity, bucket)
+            row = deltas[key]
+            for name, value in metrics.items():
+                row[name] = row.get(name, 0) + sign * value
+
+
+def apply_rollup_deltas(deltas):
+    """
+    Add metric deltas to rollup rows, creating missing rows.
+
+    deltas: {(organizer_id, event_id, tier_id, granularity, bucket_start): {metric: delta}}
+    """
+    from core.models import RevenueRollup
+
+    for (organizer_id, event_id, tier_id, granularity, bucket), metrics in deltas.items():
+        metrics = {name: value for name, value in metrics.items() if value}
+        if not metrics:
+            continue
+        lookup = {
+            'event_id': event_id, 'ticket_tier_id': tier_id,
+            'granularity': granularity, 'bucket_start': bucket,
+        }
+        updates = {name: F(name) + value for name, value in metrics.items()}
+        if RevenueRollup.objects.filter(**lookup).update(**updates):
+            continue
+        try:
+            with transaction.atomic():
+                RevenueRollup.objects.create(organizer_id=organizer_id, **lookup, **metrics)
+        except IntegrityError:
+            # Created concurrently by another order of the same bucket
+            RevenueRollup.objects.filter(**lookup).update(**updates)
+
+
+def _apply_contribution_change(before, after):
+    """Subtract the `before` contribution and add the `after` one; each is (snapshot, tier_quantities) or None."""
+    from apps.events.models import Event
+
+    deltas = defaultdict(dict)
+    for state, sign in ((before, -1), (after, 1)):
+        if state is None:
+            continue
+        snapshot, tier_quantities = state
+        organizer_id = Event.objects.filter(id=snapshot[0]).values_list('organizer_id', flat=True).first()
+        if organizer_id is None:
+            continue
+        _bucket_deltas(organizer_id, snapshot, order_contribution(snapshot, tier_quantities), sign, deltas)
+    apply_rollup_deltas(deltas)
+
+
+def sync_order_revenue_rollups(order):
+    """
+    🚀 ENTERPRISE: Called from Order.save. Applies the change in the order's revenue
+    contribution since it was loaded (or last synced). No queries when nothing changed.
+    """
+    previous = getattr(order, '_revenue_snapshot', None)
+    current = order_revenue_snapshot(order)
+    order._revenue_snapshot = current
+    if previous == current:
+        return
+
+    try:
+        with transaction.atomic():
+            tier_quantities = _tier_quantities(order.pk)
+            _apply_contribution_change(
+                (previous, tier_quantities) if previous is not None else None,
+                (current, tier_quantities) if current is not None else None,
+            )
+    except Exception as e:
+        # Never break an order write; `rebuild_revenue_rollups` repairs any drift
+        logger.error(f"💰 [ROLLUPS] Could not sync revenue rollups for order {order.pk}: {e}")
+
+
+def stored_order_contribution(order_id):
+    """(snapshot, tier_quantities) of the order as stored, or None when it does not count for revenue."""
+    from apps.events.models import Order
+
+    stored = Order.objects.filter(pk=order_id).only(*SNAPSHOT_FIELDS).first()
+    snapshot = order_revenue_snapshot(stored) if stored else None
+    if snapshot is None:
+        return None
+    return snapshot, _tier_quantities(order_id)
+
+
+_UNKNOWN = object()
+
+
+@contextmanager
+def tracking_order_revenue(order_id, order_changes=True):
+    """
+    🚀 ENTERPRISE: Resync an order's rollups around writes Order.save does not see
+    (its items, deleting it, raw SQL on its row). The contribution stored before the
+    block is replaced by the one stored after it, in the caller's transaction.
+
+    order_changes=False: the block only writes items, so an order that does not count
+    for revenue before it cannot count after it (one query, no resync).
+    Never breaks the write; `rebuild_revenue_rollups` repairs any drift.
+    """
+    before = _UNKNOWN
+    if order_id is not None:
+        try:
+            with transaction.atomic():
+                before = stored_order_contribution(order_id)
+        except Exception as e:
+            logger.error(f"💰 [ROLLUPS] Could not read revenue contribution of order {order_id}: {e}")
+
+    yield
+
+    if before is _UNKNOWN or (before is None and not order_changes):
+        return
+    try:
+        with transaction.atomic():
+            after = stored_order_contribution(order_id)
+            if after != before:
+                _apply_contribution_change(before, after)
+    except Exception as e:
+        logger.error(f"💰 [ROLLUPS] Could not sync revenue rollups for order {order_id}: {e}")
+
+
+# ============================================================================
+# REBUILD
+# ============================================================================
+
+def rebuild_revenue_rollups(organizer_id=None, event_id=None, chunk_size=5000):
+    """
+    🚀 ENTERPRISE: Recompute rollups from revenue-eligible orders (optionally scoped).
+
+    Day buckets for every order, hour buckets for the retention window. Runs in one
+    transaction so dashboards never read a half-built scope. Returns a summary dict.
+    """
+    from apps.events.models import Order, OrderItem
+    from core.models import RevenueRollup
+    from core.revenue_system import order_revenue_eligible_q
+
+    orders = Order.objects.filter(order_revenue_eligible_q(), event__isnull=False)
+    scope = {}
+    if organizer_id:
+        scope['organizer_id'] = organizer_id
+        orders = orders.filter(event__organizer_id=organizer_id)
+    if event_id:
+        scope['event_id'] = event_id
+        orders = orders.filter(event_id=event_id)
+
+    hourly_since = day_bucket(timezone.now()) - timedelta(days=hourly_retention_days())
+    totals = defaultdict(lambda: dict.fromkeys(METRIC_FIELDS, 0))
+    processed = 0
+
+    fields = (
+        'id', 'event_id', 'event__organizer_id', 'created_at', 'total', 'subtotal', 'service_fee',
+        'discount', 'subtotal_effective', 'service_fee_effective',
+    )
+    batch = []
+
+    def flush(batch):
+        quantities = defaultdict(dict)
+        for row in OrderItem.objects.filter(order_id__in=[o['id'] for o in batch]).values(
+            'order_id', 'ticket_tier_id'
+        ).annotate(quantity=Sum('quantity')):
+            quantities[row['order_id']][row['ticket_tier_id']] = row['quantity']
+
+        for o in batch:
+            snapshot = (
+                o['event_id'], o['created_at'], o['total'], o['subtotal'], o['service_fee'],
+                o['discount'], o['subtotal_effective'], o['service_fee_effective'],
+            )
+            contribution = order_contribution(snapshot, quantities.get(o['id'], {}))
+            buckets = [('day', day_bucket(o['created_at']))]
+            if o['created_at'] >= hourly_since:
+                buckets.append(('hour', hour_bucket(o['created_at'])))
+            for granularity, bucket in buckets:
+                for tier_id, metrics in contribution.items():
+                    row = totals[(o['event__organizer_id'], o['event_id'], tier_id, granularity, bucket)]
+                    for name, value in metrics.items():
+                        row[name] += value
+
+    for order in orders.values(*fields).iterator(chunk_size=chunk_size):
+        batch.append(order)
+        if len(batch) >= chunk_size:
+            flush(batch)
+            processed += len(batch)
+            batch = []
+    if batch:
+        flush(batch)
+        processed += len(batch)
+
+    rows = [
+        RevenueRollup(
+            organizer_id=organizer, event_id=event, ticket_tier_id=tier,
+            granularity=granularity, bucket_start=bucket, **metrics,
+        )
+        for (organizer, event, tier, granularity, bucket), metrics in totals.items()
+    ]
+    with transaction.atomic():
+        RevenueRollup.objects.filter(**scope).delete()
+        RevenueRollup.objects.bulk_create(rows, batch_size=chunk_size)
+
+    logger.info(f"💰 [ROLLUPS] Rebuilt {len(rows)} rollup rows from {processed} orders (scope={scope or 'all'})")
+    return {'orders': processed, 'rows': len(rows)}
+
+
+def prune_hourly_rollups(now=None):
+    """Delete hour buckets older than the retention window. Returns rows deleted."""
+    from core.models import RevenueRollup
+
+    cutoff = day_bucket(now or timezone.now()) - timedelta(days=hourly_retention_days())
+    deleted, _ = RevenueRollup.objects.filter(granularity='hour', bucket_start__lt=cutoff).delete()
+    return deleted
+
+
+# ============================================================================
+# READS
+# ============================================================================
+
+def rollup_queryset(organizer=None, event=None, ticket_tier=None, start_date=None, end_date=None,
+                    granularity='day'):
+    """
+    Rollup rows for a scope. Without ticket_tier only event-level rows are returned.
+
+    start_date/end_date must be day-aligned for day buckets (see rollups_cover_range).
+    A bucket is included when it starts before end_date.
+    """
+    from core.models import RevenueRollup
+
+    rows = RevenueRollup.objects.filter(granularity=granularity)
+    if ticket_tier is not None:
+        rows = rows.filter(ticket_tier=ticket_tier)
+    else:
+        rows = rows.filter(ticket_tier__isnull=True)
+    if event is not None:
+        rows = rows.filter(event=event)
+    if organizer is not None:
+        rows = rows.filter(organizer=organizer)
+    if start_date is not None:
+        rows = rows.filter(bucket_start__gte=day_bucket(start_date) if granularity == 'day' else start_date)
+    if end_date is not None:
+        rows = rows.filter(bucket_start__lt=end_date if isinstance(end_date, datetime) else day_bucket(end_date))
+    return rows
+
+
+def rollups_cover_range(start_date=None, end_date=None):
+    """
+    True when [start_date, end_date] maps exactly onto day buckets: no bounds,
+    day-aligned bounds, or an end bound in the future (open range up to now).
+    """
+    if start_date is not None and not is_day_aligned(start_date):
+        return False
+    if end_date is not None and not is_day_aligned(end_date):
+        end = end_date if isinstance(end_date, datetime) else day_bucket(end_date)
+        if end < timezone.now():
+            return False
+    return True
+
+
+def sum_rollups(rows):
+    """Aggregate metric totals over rollup rows (zeros when empty)."""
+    totals = rows.aggregate(**{name: Sum(name) for name in METRIC_FIELDS})
+    return {name: totals[name] or 0 for name in METRIC_FIELDS}
@@ -45,6 +45,9 @@ calculate_and_store_effective_values(order)
 # For analytics/reporting:
 from core.revenue_system import get_event_revenue, get_ticket_tier_revenue
 revenue = get_event_revenue(event, start_date, end_date)
+
+Reads are served from core.RevenueRollup (see core.revenue_rollups) when the date
+range maps onto day buckets; other ranges fall back to aggregating orders.
 """
 
 from decimal import Decimal, ROUND_HALF_UP
@@ -254,6 +257,22 @@ def calculate_and_store_effective_values(order):
 # REVENUE QUERY FUNCTIONS
 # ============================================================================
 
+def _use_rollups(start_date, end_date):
+    """Rollups serve the read when enabled and the range maps onto day buckets."""
+    from django.conf import settings
+    from core.revenue_rollups import rollups_cover_range
+
+    if not getattr(settings, 'REVENUE_ROLLUPS', {}).get('READ_FROM_ROLLUPS', True):
+        return False
+    return rollups_cover_range(start_date, end_date)
+
+
+def _rollup_totals(**scope):
+    from core.revenue_rollups import rollup_queryset, sum_rollups
+
+    return sum_rollups(rollup_queryset(**scope))
+
+
 def get_event_revenue(event, start_date=None, end_date=None, validate=True):
     """
     🚀 ENTERPRISE: Get revenue metrics for an event.
@@ -272,6 +291,23 @@ def get_event_revenue(event, start_date=None, end_date=None, validate=True):
     """
     from apps.events.models import Order, OrderItem
     
+    if _use_rollups(start_date, end_date):
+        totals = _rollup_totals(event=event, start_date=start_date, end_date=end_date)
+        result = {
+            'total_revenue': float(totals['total_revenue']),
+            'gross_revenue': float(totals['gross_revenue']),
+            'service_fees': float(totals['service_fees']),
+            'subtotal_original': float(totals['subtotal_original']),
+            'service_fees_original': float(totals['service_fees_original']),
+            'total_discount': float(totals['total_discount']),
+            'total_orders': totals['orders'],
+            'calculation_method': 'revenue_rollup',
+            'total_tickets': totals['tickets'],
+        }
+        if validate:
+            result['validation'] = validate_revenue_calculation(None, result)
+        return result
+    
     # Build queryset — exclude sandbox, soft-deleted, and manually excluded (they do not count for revenue)
     orders = Order.objects.filter(event=event).filter(order_revenue_eligible_q())
 
@@ -373,6 +409,20 @@ def get_ticket_tier_revenue(ticket_tier, start_date=None, end_date=None, validat
     """
     from apps.events.models import Order, OrderItem
     
+    if _use_rollups(start_date, end_date):
+        totals = _rollup_totals(
+            event=ticket_tier.event_id, ticket_tier=ticket_tier, start_date=start_date, end_date=end_date
+        )
+        return {
+            'total_revenue': float(Decimal(totals['total_revenue']).quantize(Decimal('1'), rounding=ROUND_HALF_UP)),
+            'gross_revenue': float(Decimal(totals['gross_revenue']).quantize(Decimal('1'), rounding=ROUND_HALF_UP)),
+            'service_fees': float(Decimal(totals['service_fees']).quantize(Decimal('1'), rounding=ROUND_HALF_UP)),
+            'total_tickets': totals['tickets'],
+            'total_orders': totals['orders'],
+            'ticket_tier_name': ticket_tier.name,
+            'ticket_tier_id': ticket_tier.id
+        }
+    
     # Get orders containing this tier — exclude sandbox, soft-deleted, and manually excluded
     orders = Order.objects.filter(
         items__ticket_tier=ticket_tier,
@@ -468,6 +518,17 @@ def get_organizer_revenue(organizer, start_date=None, end_date=None):
     # Get all events for this organizer
     events = Event.objects.filter(organizer=organizer)
     
+    if _use_rollups(start_date, end_date):
+        totals = _rollup_totals(organizer=organizer, start_date=start_date, end_date=end_date)
+        return {
+            'total_revenue': float(totals['total_revenue']),
+            'gross_revenue': float(totals['gross_revenue']),
+            'service_fees': float(totals['service_fees']),
+            'total_tickets': totals['tickets'],
+            'total_orders': totals['orders'],
+            'total_events': events.count()
+        }
+    
     # Aggregate revenue from all events
     total_revenue = 0
     total_gross_revenue = 0
@@ -507,7 +568,8 @@ def validate_revenue_calculation(orders_queryset, calculated_result):
     3. All effective values are present (no NULL)
     
     Args:
-        orders_queryset: QuerySet of Order objects
+        orders_queryset: QuerySet of Order objects, or None for rollup-backed results
+            (checks 2 and 3 scan orders and are skipped)
         calculated_result: Dict with calculated revenue metrics
     
     Returns:
@@ -540,6 +602,9 @@ def validate_revenue_calculation(orders_queryset, calculated_result):
             'message': f"Effective values don't sum: {calculated_total} ≠ {expected_total} (diff: {diff})"
         })
     
+    if orders_queryset is None:
+        return validation
+    
     # Check 2: Sum from items equals sum from orders
     items_total = OrderItem.objects.filter(
         order__in=orders_queryset
@@ -0,0 +1,264 @@
+"""
+🚀 ENTERPRISE: Per-worker pool of persistent SMTP connections.
+
+Confirmation senders (events, experiences, Erasmus, OTP) used to call
+``get_connection()`` for every message: TCP connect, EHLO, STARTTLS and AUTH per
+email. The pool keeps up to ``SMTP_POOL['MAX_CONNECTIONS']`` open connections per
+process, probes idle ones with NOOP before reuse, closes those idle for too long
+and reconnects once when the server has dropped the session.
+
+``send_batch()`` drains a backlog (``retry_failed_emails``,
+``ensure_pending_emails_sent``) over a handful of pooled connections.
+
+Usage:
+    from core.smtp_pool import smtp_connection, send_messages
+
+    with smtp_connection(metrics=metrics) as connection:
+        send_messages(connection, [message])
+"""
+
+import logging
+import os
+import smtplib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.db import connections as db_connections
+
+logger = logging.getLogger(__name__)
+
+
+def _pool_settings():
+    return getattr(settings, 'SMTP_POOL', {})
+
+
+def _elapsed_ms(start):
+    return int((time.time() - start) * 1000)
+
+
+class SMTPConnectionPool:
+    """Bounded set of open email backend connections, reused across sends in one process."""
+
+    def __init__(self, max_connections=4, max_idle_seconds=240, noop_after_seconds=30, acquire_timeout=30):
+        self.max_connections = max_connections
+        self.max_idle_seconds = max_idle_seconds
+        self.noop_after_seconds = noop_after_seconds
+        self.acquire_timeout = acquire_timeout
+        self._reset()
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.max_connections)
+        self._idle = []  # [(connection, last_used)], most recently used last
+
+    def _check_fork(self):
+        # Celery prefork children must not share sockets opened by the parent
+        if self._pid != os.getpid():
+            self._reset()
+
+    @contextmanager
+    def connection(self):
+        """Check out an open connection; it is returned to the pool unless the block raised."""
+        self._check_fork()
+        if not self._slots.acquire(timeout=self.acquire_timeout):
+            raise TimeoutError('No SMTP connection available in the pool')
+        connection = None
+        try:
+            connection = self._checkout()
+            yield connection
+        except Exception:
+            if connection is not None:
+                self._close(connection)
+            raise
+        else:
+            with self._lock:
+                self._idle.append((connection, time.monotonic()))
+        finally:
+            self._slots.release()
+
+    def _checkout(self):
+        now = time.monotonic()
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                connection, last_used = self._idle.pop()
+            idle = now - last_used
+            if idle > self.max_idle_seconds:
+                self._close(connection)
+                continue
+            if idle < self.noop_after_seconds or self._is_alive(connection):
+                return connection
+            self._close(connection)
+
+        connection = get_connection(fail_silently=False)
+        connection.open()
+        return connection
+
+    @staticmethod
+    def _is_alive(connection):
+        smtp = getattr(connection, 'connection', None)
+        if smtp is None:
+            # Non-SMTP backends (console, locmem) have nothing to probe
+            return not hasattr(connection, 'connection')
+        try:
+            return smtp.noop()[0] == 250
+        except Exception:
+            return False
+
+    @staticmethod
+    def _close(connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def send(self, connection, messages):
+        """send_messages() with one reconnect when the server dropped the session."""
+        try:
+            return connection.send_messages(messages)
+        except smtplib.SMTPServerDisconnected:
+            logger.info("📧 [SMTP_POOL] Connection dropped by server, reconnecting")
+            self._close(connection)
+            connection.open()
+            return connection.send_messages(messages)
+
+    def close_all(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection, _ in idle:
+            self._close(connection)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_smtp_pool():
+    """Return this process's pool, or None when pooling is disabled."""
+    global _pool
+    config = _pool_settings()
+    if not config.get('ENABLED', True):
+        return None
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = SMTPConnectionPool(
+                    max_connections=config.get('MAX_CONNECTIONS', 4),
+                    max_idle_seconds=config.get('MAX_IDLE_SECONDS', 240),
+                    noop_after_seconds=config.get('NOOP_AFTER_SECONDS', 30),
+                    acquire_timeout=config.get('ACQUIRE_TIMEOUT', 30),
+                )
+    return _pool
+
+
+@contextmanager
+def smtp_connection(connection=None, metrics=None):
+    """
+    Yield ``connection`` when the caller already holds one (batch sends), else a
+    pooled connection (or a fresh one when pooling is disabled). Time spent waiting
+    for / opening it is added to ``metrics['connection_time_ms']``.
+    """
+    if connection is not None:
+        yield connection
+        return
+
+    start = time.time()
+    pool = get_smtp_pool()
+    if pool is None:
+        connection = get_connection(fail_silently=False)
+        connection.open()
+        if metrics is not None:
+            metrics['connection_time_ms'] = metrics.get('connection_time_ms', 0) + _elapsed_ms(start)
+        try:
+            yield connection
+        finally:
+            SMTPConnectionPool._close(connection)
+        return
+
+    with pool.connection() as connection:
+        if metrics is not None:
+            metrics['connection_time_ms'] = metrics.get('connection_time_ms', 0) + _elapsed_ms(start)
+        yield connection
+
+
+def send_messages(connection, messages):
+    """Send on a connection from smtp_connection(), reconnecting once on a dropped session."""
+    pool = get_smtp_pool()
+    if pool is None:
+        return connection.send_messages(messages)
+    return pool.send(connection, messages)
+
+
+def send_batch(items, send_one, max_connections=None):
+    """
+    Call ``send_one(item, connection)`` for every item over at most ``max_connections``
+    pooled connections (one worker thread each; inline when only one is used).
+
+    Exceptions are caught per item. Returns ``{'results', 'metrics'}`` where results
+    are aligned with ``items`` (the send_one return value, or
+    ``{'status': 'error', 'error': ...}``) and metrics holds the per-stage timing.
+    """
+    items = list(items)
+    start = time.time()
+    metrics = {
+        'items': len(items),
+        'connections': 0,
+        'connection_time_ms': 0,
+        'send_time_ms': 0,
+        'total_time_ms': 0,
+    }
+    results = [None] * len(items)
+    if not items:
+        return {'results': results, 'metrics': metrics}
+
+    if max_connections is None:
+        max_connections = _pool_settings().get('BATCH_CONNECTIONS', 2)
+    workers = max(1, min(max_connections, len(items)))
+    metrics['connections'] = workers
+    metrics_lock = threading.Lock()
+
+    def run(indexes):
+        stage = {}
+        send_start = None
+        try:
+            with smtp_connection(metrics=stage) as connection:
+                send_start = time.time()
+                for index in indexes:
+                    try:
+                        results[index] = send_one(items[index], connection)
+                    except Exception as e:
+                        logger.error(f"❌ [SMTP_POOL] Batch item failed: {e}", exc_info=True)
+                        results[index] = {'status': 'error', 'error': str(e)}
+        except Exception as e:
+            logger.error(f"❌ [SMTP_POOL] Could not open batch connection: {e}", exc_info=True)
+            for index in indexes:
+                if results[index] is None:
+                    results[index] = {'status': 'error', 'error': str(e)}
+        finally:
+            with metrics_lock:
+                metrics['connection_time_ms'] += stage.get('connection_time_ms', 0)
+                if send_start is not None:
+                    metrics['send_time_ms'] += _elapsed_ms(send_start)
+
+    chunks = [list(range(i, len(items), workers)) for i in range(workers)]
+    if workers == 1:
+        run(chunks[0])
+    else:
+        def run_in_thread(indexes):
+            try:
+                run(indexes)
+            finally:
+                db_connections.close_all()
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(run_in_thread, chunks))
+
+    metrics['total_time_ms'] = _elapsed_ms(start)
+    logger.info(f"📧 [SMTP_POOL] Batch of {len(items)} over {workers} connection(s): {metrics}")
+    return {'results': results, 'metrics': metrics}
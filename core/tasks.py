@@ -45,3 +45,58 @@ def cleanup_old_uptime_heartbeats(days: int = None):
     deleted, _ = PlatformUptimeHeartbeat.objects.filter(recorded_at__lt=cutoff).delete()
     if deleted:
         logger.info("Cleaned up %s old uptime heartbeats (older than %s)", deleted, cutoff.date())
+
+
+@shared_task(name="core.tasks.prune_hourly_revenue_rollups", ignore_result=True)
+def prune_hourly_revenue_rollups():
+    """
+    Elimina buckets horarios de RevenueRollup fuera de la ventana de retención.
+    Los buckets diarios se mantienen. Ejecutado diariamente por Celery Beat.
+    """
+    from core.revenue_rollups import prune_hourly_rollups
+
+    deleted = prune_hourly_rollups()
+    if deleted:
+        logger.info("Pruned %s hourly revenue rollup rows", deleted)
+    return deleted
+
+
+@shared_task(name="core.tasks.drain_analytics_buffer", ignore_result=True)
+def drain_analytics_buffer():
+    """
+    Persiste en bloque las vistas de eventos e interacciones de publicidad encoladas
+    en Redis (core.analytics_ingest). Ejecutado cada pocos segundos por Celery Beat.
+    """
+    from core.analytics_ingest import drain_analytics_buffer as drain
+
+    persisted = drain()
+    if persisted:
+        logger.debug("Drained %s analytics records", persisted)
+
+
+@shared_task(name="core.tasks.prune_celery_task_stats", ignore_result=True)
+def prune_celery_task_stats():
+    """
+    Elimina buckets de CeleryTaskStat fuera de CELERY_TELEMETRY['RETENTION_DAYS'].
+    Ejecutado diariamente por Celery Beat.
+    """
+    from core.celery_telemetry import prune_task_stats
+
+    deleted = prune_task_stats()
+    if deleted:
+        logger.info("Pruned %s celery task stat rows", deleted)
+    return deleted
+
+
+@shared_task(name="core.tasks.drain_flow_event_stream", ignore_result=True)
+def drain_flow_event_stream():
+    """
+    Persiste en bloque los eventos de flujo encolados en el stream de Redis
+    (core.flow_buffer, FLOW_LOGGER['MODE'] = 'stream'). Ejecutado cada pocos segundos por Celery Beat.
+    """
+    from core.flow_buffer import drain_flow_event_stream as drain
+
+    drained = drain()
+    if drained:
+        logger.debug("Drained %s flow events", drained)
+    return drained
@@ -6,6 +6,8 @@ from core.testing.fixtures import (
 )
 from core.testing.factories import (
     create_organizer,
+    create_event,
+    create_ticket_tier,
     create_accommodation,
     create_whatsapp_chat,
     create_tour_operator,
@@ -17,12 +19,15 @@ from core.testing.factories import (
     create_accommodation_reservation,
     create_order_accommodation,
 )
+from core.testing.redis import redis_test_client
 
 __all__ = [
     "CHECKOUT_DATA_ACCOMMODATION_MINIMAL",
     "CHECKOUT_DATA_ACCOMMODATION_FULL",
     "RESERVATION_STATUSES_READY_FOR_PAYMENT",
     "create_organizer",
+    "create_event",
+    "create_ticket_tier",
     "create_accommodation",
     "create_whatsapp_chat",
     "create_tour_operator",
@@ -33,4 +38,5 @@ __all__ = [
     "create_whatsapp_reservation_request",
     "create_accommodation_reservation",
     "create_order_accommodation",
+    "redis_test_client",
 ]
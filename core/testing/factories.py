@@ -7,6 +7,7 @@ from django.utils import timezone
 from datetime import timedelta
 
 from apps.organizers.models import Organizer
+from apps.events.models import Event, TicketTier
 from apps.accommodations.models import Accommodation, AccommodationReservation
 from apps.whatsapp.models import (
     WhatsAppReservationCode,
@@ -24,6 +25,37 @@ def create_organizer(name="Test Org", slug="test-org"):
     return Organizer.objects.create(name=name, slug=slug)
 
 
+def create_event(organizer=None, title="Test Event", slug="test-event", status="published", **kwargs):
+    """Create published public Event; creates organizer if not provided. kwargs override defaults."""
+    if organizer is None:
+        organizer = create_organizer()
+    defaults = {
+        "title": title,
+        "slug": slug,
+        "organizer": organizer,
+        "status": status,
+        "visibility": "public",
+        "start_date": timezone.now() + timedelta(days=30),
+        "end_date": timezone.now() + timedelta(days=30, hours=4),
+    }
+    defaults.update(kwargs)
+    return Event.objects.create(**defaults)
+
+
+def create_ticket_tier(event, name="General", price=Decimal("10000"), capacity=100, **kwargs):
+    """Create TicketTier with available = capacity (limited inventory). kwargs override defaults."""
+    defaults = {
+        "event": event,
+        "name": name,
+        "price": price,
+        "capacity": capacity,
+        "available": capacity,
+        "currency": "CLP",
+    }
+    defaults.update(kwargs)
+    return TicketTier.objects.create(**defaults)
+
+
 def create_accommodation(organizer=None, title="Test Cabin", slug="test-cabin", status="published", **kwargs):
     """Create published Accommodation; creates organizer if not provided. kwargs override defaults."""
     if organizer is None:
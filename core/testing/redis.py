@@ -0,0 +1,15 @@
+"""
+Redis availability for tests of the Redis-backed fast paths.
+Tests skip themselves when no Redis server is reachable.
+"""
+from core.redis_client import get_redis_client
+
+
+def redis_test_client(url=None):
+    """A connected client (see core.redis_client.get_redis_client), or None when Redis is unreachable."""
+    try:
+        client = get_redis_client(url)
+        client.ping()
+        return client
+    except Exception:
+        return None
@@ -0,0 +1,171 @@
+"""
+Tests for buffered analytics ingestion (core.analytics_ingest).
+
+Drain: bulk EventView / TerminalAdvertisingInteraction inserts, time-on-page updates,
+per-day counters, records for deleted events dropped, request time kept, records that
+cannot be written dead-lettered, database outages requeued. Synchronous fallback when
+buffering is off. Buffer tests are skipped when no Redis server is reachable.
+"""
+import uuid
+from datetime import timedelta
+from unittest import mock
+
+from django.db import OperationalError
+from django.test import RequestFactory, TestCase, override_settings
+from django.contrib.auth.models import AnonymousUser
+from django.utils import timezone
+
+from apps.events.analytics_models import EventPerformanceMetrics, EventView
+from apps.terminal.models import (
+    TerminalAdvertisingDailyStats,
+    TerminalAdvertisingInteraction,
+    TerminalAdvertisingSpace,
+)
+from core import analytics_ingest
+from core.analytics_ingest import (
+    KIND_AD_INTERACTION,
+    KIND_EVENT_VIEW,
+    AnalyticsBuffer,
+    _serialize,
+    record_event_view,
+)
+from core.testing import create_event, redis_test_client
+
+
+REDIS = redis_test_client()
+
+
+def _build_view(event, session_id='s1', referer=''):
+    request = RequestFactory().get('/', HTTP_REFERER=referer, HTTP_USER_AGENT='Mozilla/5.0')
+    request.user = AnonymousUser()
+    return EventView.build_view(event, request, session_id=session_id)
+
+
+def _space():
+    return TerminalAdvertisingSpace.objects.create(
+        space_type='hero_slider', position=f'home_{uuid.uuid4().hex[:6]}', content_type='banner'
+    )
+
+
+class AnalyticsBufferTestCase(TestCase):
+    """Buffer bound to a per-test key prefix; keys are deleted on teardown."""
+
+    def setUp(self):
+        if REDIS is None:
+            self.skipTest('Redis not available')
+        self.prefix = f'test:analytics:{uuid.uuid4().hex[:8]}'
+        self.buffer = AnalyticsBuffer(REDIS, prefix=self.prefix)
+        self.event = create_event()
+
+    def tearDown(self):
+        keys = REDIS.keys(f'{self.prefix}:*')
+        if keys:
+            REDIS.delete(*keys)
+
+    def _push_view(self, event=None, **kwargs):
+        view = _build_view(event or self.event, **kwargs)
+        self.buffer.push(KIND_EVENT_VIEW, _serialize(view))
+        return view
+
+
+class DrainTests(AnalyticsBufferTestCase):
+
+    def test_drain_bulk_inserts_views_and_updates_daily_counters(self):
+        pushed = [self._push_view(session_id=f's{i}') for i in range(3)]
+        self._push_view(referer='https://www.facebook.com/')
+        self.assertFalse(EventView.objects.exists())
+
+        self.assertEqual(self.buffer.drain(batch_size=2), 4)
+
+        self.assertEqual(self.buffer.pending(), 0)
+        self.assertEqual(EventView.objects.filter(event=self.event).count(), 4)
+        self.assertTrue(EventView.objects.filter(id=pushed[0].id).exists())
+        metrics = EventPerformanceMetrics.objects.get(event=self.event, date=timezone.localdate())
+        self.assertEqual(metrics.total_views, 4)
+        self.assertEqual(metrics.direct_views, 3)
+        self.assertEqual(metrics.social_media_views, 1)
+        self.assertEqual(metrics.mobile_views, 0)
+
+    def test_counters_accumulate_across_drains(self):
+        self._push_view()
+        self.buffer.drain()
+        self._push_view(session_id='s2')
+        self.buffer.drain()
+        metrics = EventPerformanceMetrics.objects.get(event=self.event, date=timezone.localdate())
+        self.assertEqual(metrics.total_views, 2)
+
+    def test_views_of_deleted_events_are_dropped(self):
+        other = create_event(organizer=self.event.organizer, title='Deleted', slug='deleted')
+        self._push_view(event=other)
+        self._push_view()
+        other.delete()
+
+        self.assertEqual(self.buffer.drain(), 2)
+        self.assertEqual(EventView.objects.count(), 1)
+
+    def test_time_on_page_applies_to_latest_view(self):
+        self._push_view(session_id='abc')
+        self.buffer.push(analytics_ingest.KIND_TIME_ON_PAGE, {
+            'event_id': str(self.event.id), 'session_id': 'abc', 'time_on_page': 42,
+        })
+        self.buffer.drain()
+        self.assertEqual(EventView.objects.get(session_id='abc').time_on_page, 42)
+
+    def test_ad_interactions_update_daily_stats(self):
+        space = _space()
+        for interaction_type in ['impression', 'impression', 'click']:
+            interaction = TerminalAdvertisingInteraction(advertising_space=space, interaction_type=interaction_type)
+            self.buffer.push(KIND_AD_INTERACTION, _serialize(interaction))
+
+        self.buffer.drain()
+
+        self.assertEqual(TerminalAdvertisingInteraction.objects.filter(advertising_space=space).count(), 3)
+        stats = TerminalAdvertisingDailyStats.objects.get(advertising_space=space, date=timezone.localdate())
+        self.assertEqual((stats.impressions, stats.clicks, stats.views), (2, 1, 0))
+
+    def test_views_keep_the_request_time(self):
+        view = _build_view(self.event)
+        view.created_at = timezone.now() - timedelta(days=1)
+        self.buffer.push(KIND_EVENT_VIEW, _serialize(view))
+
+        self.buffer.drain()
+
+        self.assertEqual(EventView.objects.get(id=view.id).created_at, view.created_at)
+        metrics = EventPerformanceMetrics.objects.get(event=self.event)
+        self.assertEqual(metrics.date, timezone.localdate(view.created_at))
+
+    def test_long_referers_are_clipped(self):
+        self._push_view(referer='https://l.facebook.com/?fbclid=' + 'x' * 500)
+        self.assertEqual(self.buffer.drain(), 1)
+        self.assertEqual(len(EventView.objects.get().referer), EventView._meta.get_field('referer').max_length)
+
+    def test_bad_record_is_dead_lettered(self):
+        self._push_view()
+        self.buffer.push(KIND_EVENT_VIEW, {'event_id': str(self.event.id), 'no_such_field': 1})
+        self._push_view(session_id='s2')
+
+        self.assertEqual(self.buffer.drain(), 2)
+
+        self.assertEqual(self.buffer.pending(), 0)
+        self.assertEqual(self.buffer.dead_letters(), 1)
+        self.assertEqual(EventView.objects.count(), 2)
+
+    def test_database_outage_requeues_the_batch(self):
+        self._push_view()
+        self._push_view(session_id='s2')
+        with mock.patch.object(analytics_ingest, 'persist_records', side_effect=OperationalError('down')):
+            with self.assertRaises(OperationalError):
+                self.buffer.drain()
+        self.assertEqual(self.buffer.pending(), 2)
+        self.assertEqual(self.buffer.dead_letters(), 0)
+        self.assertFalse(EventView.objects.exists())
+
+
+@override_settings(ANALYTICS_INGEST={'BUFFERED': False})
+class SynchronousFallbackTests(TestCase):
+
+    def test_record_event_view_inserts_immediately(self):
+        event = create_event()
+        view = record_event_view(_build_view(event))
+        self.assertTrue(EventView.objects.filter(id=view.id).exists())
+        self.assertEqual(analytics_ingest.drain_analytics_buffer(), 0)
@@ -0,0 +1,191 @@
+"""
+Tests for Celery task telemetry (core.celery_telemetry / core.celery_signals).
+
+Log mode keeps one CeleryTaskLog row per execution. Aggregate mode buffers timings,
+flushes them into CeleryTaskStat rows (merging with existing buckets), logs only
+sampled executions, failures and flow tasks, and the superadmin task list reads
+counts and per-task timings from the aggregates.
+"""
+import time
+from types import SimpleNamespace
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from core import celery_signals, celery_telemetry
+from core.models import CeleryTaskLog, CeleryTaskStat
+
+User = get_user_model()
+
+TASKS_URL = '/api/v1/superadmin/celery-tasks/'
+
+TELEMETRY = {
+    'MODE': 'aggregate',
+    'FLUSH_INTERVAL_SECONDS': 3600,  # Flushed explicitly by the tests
+    'BUFFER_SIZE': 100,
+    'BUCKET_SECONDS': 60,
+    'HISTOGRAM_BOUNDS_MS': [10, 100, 1000],
+    'DEFAULT_SAMPLE_RATE': 0.0,
+    'SAMPLE_RATES': {'*email*': 1.0},
+}
+
+AGGREGATE = override_settings(CELERY_TELEMETRY=TELEMETRY)
+
+
+def _task(name, routing_key='maintenance.uptime'):
+    return SimpleNamespace(
+        name=name, queue=None, routing_key='',
+        request=SimpleNamespace(delivery_info={'routing_key': routing_key}),
+    )
+
+
+def _run(task, task_id, state='SUCCESS', kwargs=None):
+    celery_signals.log_task_started(sender=task, task_id=task_id, args=[], kwargs=kwargs or {})
+    if state == 'FAILURE':
+        celery_signals.log_task_failure(sender=task, task_id=task_id, exception=ValueError('boom'), args=[], kwargs={})
+    celery_signals.log_task_success(sender=task, task_id=task_id, retval=None, state=state)
+
+
+class TelemetryTestCase(TestCase):
+
+    def setUp(self):
+        celery_telemetry.reset_buffer()
+        self.addCleanup(celery_telemetry.reset_buffer)
+
+
+class AggregateTests(TelemetryTestCase):
+
+    @AGGREGATE
+    def test_records_fold_into_buckets_and_histograms(self):
+        now = time.time()
+        start = now - now % 60
+        totals = celery_telemetry.aggregate([
+            (start + 1, 'a', 'maintenance', 'success', 5),
+            (start + 2, 'a', 'maintenance', 'success', 500),
+            (start + 3, 'a', 'maintenance', 'success', 5000),
+            (start + 4, 'a', 'maintenance', 'failure', 50),
+        ])
+
+        bucket = celery_telemetry.bucket_start(start)
+        success = totals[(bucket, 'a', 'maintenance', 'success')]
+        self.assertEqual(success['count'], 3)
+        self.assertEqual(success['total_duration_ms'], 5505)
+        self.assertEqual(success['max_duration_ms'], 5000)
+        self.assertEqual(success['histogram'], [1, 0, 1, 1])
+        self.assertEqual(totals[(bucket, 'a', 'maintenance', 'failure')]['count'], 1)
+
+    def test_histogram_percentile(self):
+        bounds = (10, 100, 1000)
+        self.assertEqual(celery_telemetry.histogram_percentile([8, 1, 1, 0], bounds, 0.5), 10)
+        self.assertEqual(celery_telemetry.histogram_percentile([8, 1, 1, 0], bounds, 0.95), 1000)
+        self.assertIsNone(celery_telemetry.histogram_percentile([0, 0, 0, 0], bounds, 0.5))
+
+    @AGGREGATE
+    def test_flush_creates_then_merges_rows(self):
+        for duration in (5, 50):
+            celery_telemetry.record('core.tasks.a', 'maintenance', 'success', duration)
+        self.assertEqual(celery_telemetry.flush(), 2)
+        celery_telemetry.record('core.tasks.a', 'maintenance', 'success', 2000)
+        celery_telemetry.flush()
+
+        stat = CeleryTaskStat.objects.get(task_name='core.tasks.a')
+        self.assertEqual(stat.count, 3)
+        self.assertEqual(stat.total_duration_ms, 2055)
+        self.assertEqual(stat.max_duration_ms, 2000)
+        self.assertEqual(stat.histogram, [1, 1, 0, 1])
+        self.assertEqual(celery_telemetry.flush(), 0)
+
+    @override_settings(CELERY_TELEMETRY={**TELEMETRY, 'BUFFER_SIZE': 2})
+    def test_full_buffer_drops_oldest(self):
+        for duration in (1, 2, 3):
+            celery_telemetry.record('core.tasks.a', '', 'success', duration)
+        buffer = celery_telemetry.get_buffer()
+        self.assertEqual([r[4] for r in buffer.records], [2, 3])
+        self.assertEqual(buffer.dropped, 1)
+
+    @override_settings(CELERY_TELEMETRY={**TELEMETRY, 'FLUSH_INTERVAL_SECONDS': 0})
+    def test_record_flushes_when_interval_elapsed(self):
+        celery_telemetry.record('core.tasks.a', '', 'success', 1)
+        self.assertEqual(CeleryTaskStat.objects.get(task_name='core.tasks.a').count, 1)
+
+
+class SignalTests(TelemetryTestCase):
+
+    def test_log_mode_writes_a_row_per_execution(self):
+        _run(_task('core.tasks.a'), 'task-1')
+        log = CeleryTaskLog.objects.get(task_id='task-1')
+        self.assertEqual(log.status, 'success')
+        self.assertIsNotNone(log.duration_ms)
+        self.assertFalse(CeleryTaskStat.objects.exists())
+
+    @AGGREGATE
+    def test_aggregate_mode_skips_unsampled_logs(self):
+        task = _task('core.tasks.record_platform_uptime_heartbeat')
+        for i in range(3):
+            _run(task, f'task-{i}')
+        self.assertFalse(CeleryTaskLog.objects.exists())
+
+        celery_telemetry.flush()
+        stat = CeleryTaskStat.objects.get()
+        self.assertEqual((stat.task_name, stat.queue, stat.status, stat.count),
+                         ('core.tasks.record_platform_uptime_heartbeat', 'maintenance', 'success', 3))
+        self.assertEqual(celery_signals._task_start_times, {})
+
+    @AGGREGATE
+    def test_aggregate_mode_logs_sampled_and_failed_tasks(self):
+        _run(_task('apps.events.tasks.send_order_confirmation_email', 'emails'), 'sampled')
+        _run(_task('core.tasks.a'), 'failed', state='FAILURE')
+        _run(_task('core.tasks.a'), 'skipped')
+
+        self.assertEqual(CeleryTaskLog.objects.get(task_id='sampled').status, 'success')
+        self.assertEqual(CeleryTaskLog.objects.get(task_id='failed').status, 'failure')
+        self.assertFalse(CeleryTaskLog.objects.filter(task_id='skipped').exists())
+
+        celery_telemetry.flush()
+        counts = {(s.task_name, s.status): s.count for s in CeleryTaskStat.objects.all()}
+        self.assertEqual(counts[('core.tasks.a', 'failure')], 1)
+        self.assertEqual(counts[('core.tasks.a', 'success')], 1)
+
+    @AGGREGATE
+    def test_flow_id_forces_a_log_row(self):
+        self.assertTrue(celery_telemetry.should_log('core.tasks.a', {'flow_id': 'abc'}))
+        self.assertFalse(celery_telemetry.should_log('core.tasks.a', {}))
+        self.assertTrue(celery_telemetry.should_log('apps.otp.tasks.send_otp_email_task', {}))
+
+
+@AGGREGATE
+class SuperadminTaskListTests(TelemetryTestCase):
+
+    def setUp(self):
+        super().setUp()
+        superuser = User.objects.create_superuser(
+            username='super', email='super@test.com', password='superpass123',
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=superuser)
+
+    def test_counts_and_timings_come_from_aggregates(self):
+        task = _task('core.tasks.a')
+        for i in range(4):
+            _run(task, f'ok-{i}')
+        _run(task, 'bad', state='FAILURE')
+        celery_telemetry.flush()
+
+        response = self.client.get(TASKS_URL)
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['telemetry_mode'], 'aggregate')
+        self.assertEqual(data['status_counts']['success'], 4)
+        self.assertEqual(data['status_counts']['failure'], 1)
+        self.assertEqual(data['total'], 5)
+        self.assertEqual([log['task_id'] for log in data['logs']], ['bad'])
+        summary = data['task_stats'][0]
+        self.assertEqual(summary['task_name'], 'core.tasks.a')
+        self.assertEqual(summary['count'], 5)
+        self.assertEqual(summary['queues'], ['maintenance'])
+        self.assertEqual(summary['status_counts'], {'success': 4, 'failure': 1})
+
+        response = self.client.get(TASKS_URL, {'status': 'failure'})
+        self.assertEqual(response.json()['total'], 1)
@@ -0,0 +1,65 @@
+"""
+Tests for the conversion funnel (ConversionMetricsService.get_historical_conversion_rates).
+
+Step counts come from a single grouped query and results are cached per
+(flow_type, organizer, event, window).
+"""
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from core.conversion_metrics import TICKET_CHECKOUT_STEPS, ConversionMetricsService
+from core.models import PlatformFlow, PlatformFlowEvent
+from core.testing import create_event, create_organizer
+
+
+def _flow(reached_steps, repeat_first=False, **kwargs):
+    flow = PlatformFlow.objects.create(flow_type='ticket_checkout', **kwargs)
+    steps = TICKET_CHECKOUT_STEPS[:reached_steps]
+    if repeat_first:
+        steps = [steps[0]] + list(steps)
+    PlatformFlowEvent.objects.bulk_create([
+        PlatformFlowEvent(flow=flow, step=step, source='api', status='success') for step in steps
+    ])
+    return flow
+
+
+class HistoricalConversionRatesTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.organizer = create_organizer()
+        self.event = create_event(organizer=self.organizer)
+        _flow(10, organizer=self.organizer, event=self.event)
+        _flow(3, repeat_first=True, organizer=self.organizer, event=self.event)
+        _flow(3, organizer=self.organizer, event=self.event)
+        _flow(1)  # other organizer/event
+        PlatformFlow.objects.create(flow_type='experience_booking')
+
+    def test_counts_distinct_flows_per_step_in_one_query(self):
+        with CaptureQueriesContext(connection) as ctx:
+            rates = ConversionMetricsService.get_historical_conversion_rates()
+
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertEqual(rates['RESERVATION_REQUESTED']['reached_count'], 4)
+        self.assertEqual(rates['ORDER_CREATED']['reached_count'], 3)
+        self.assertEqual(rates['ORDER_MARKED_PAID']['reached_count'], 1)
+        self.assertEqual(rates['ORDER_MARKED_PAID']['conversion_rate'], round(1 / 3, 4))
+        self.assertEqual(rates['FLOW_COMPLETED']['previous_count'], 1)
+
+        scoped = ConversionMetricsService.get_historical_conversion_rates(
+            organizer_id=str(self.organizer.id), event_id=str(self.event.id)
+        )
+        self.assertEqual(scoped['RESERVATION_REQUESTED']['reached_count'], 3)
+
+    def test_results_are_cached_per_scope_and_window(self):
+        first = ConversionMetricsService.get_historical_conversion_rates(days_back=30)
+        _flow(10)
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(ConversionMetricsService.get_historical_conversion_rates(days_back=30), first)
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+        fresh = ConversionMetricsService.get_historical_conversion_rates(days_back=7)
+        self.assertEqual(fresh['FLOW_COMPLETED']['reached_count'], 2)
@@ -0,0 +1,81 @@
+"""
+Tests for the confirmation email rendering service (core.email_rendering).
+
+Context fragments are built once per (kind, pk, updated_at) and rebuilt when the
+object changes or the TTL expires; caching can be switched off for baselines.
+"""
+import datetime
+from types import SimpleNamespace
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from core import email_rendering
+from core.email_rendering import cached_fragment, caching_disabled, clear_caches, render_email
+
+
+class CachedFragmentTests(SimpleTestCase):
+
+    def setUp(self):
+        clear_caches()
+        self.addCleanup(clear_caches)
+        self.calls = 0
+        self.obj = SimpleNamespace(pk=1, updated_at=datetime.datetime(2026, 1, 1), title='Fiesta')
+
+    def build(self, obj):
+        self.calls += 1
+        return {'title': obj.title}
+
+    def test_fragment_is_built_once_per_version(self):
+        first = cached_fragment('event', self.obj, self.build)
+        second = cached_fragment('event', self.obj, self.build)
+        self.assertEqual(first, {'title': 'Fiesta'})
+        self.assertIs(first, second)
+        self.assertEqual(self.calls, 1)
+
+    def test_update_invalidates_fragment(self):
+        cached_fragment('event', self.obj, self.build)
+        self.obj.title = 'Fiesta 2'
+        self.obj.updated_at = datetime.datetime(2026, 1, 2)
+        self.assertEqual(cached_fragment('event', self.obj, self.build), {'title': 'Fiesta 2'})
+        self.assertEqual(self.calls, 2)
+
+    def test_kinds_do_not_collide(self):
+        cached_fragment('event', self.obj, self.build)
+        cached_fragment('organizer', self.obj, self.build)
+        self.assertEqual(self.calls, 2)
+
+    def test_expired_fragment_is_rebuilt(self):
+        cached_fragment('event', self.obj, self.build)
+        with mock.patch.object(email_rendering, 'FRAGMENT_TTL_SECONDS', 0):
+            cached_fragment('event', self.obj, self.build)
+        self.assertEqual(self.calls, 2)
+
+    def test_cache_is_bounded(self):
+        with mock.patch.object(email_rendering, 'MAX_CACHED_FRAGMENTS', 2):
+            for pk in range(3):
+                cached_fragment('event', SimpleNamespace(pk=pk, updated_at=None, title=str(pk)), self.build)
+            self.assertEqual(len(email_rendering._fragments), 2)
+
+    def test_caching_disabled_always_builds(self):
+        with caching_disabled():
+            cached_fragment('event', self.obj, self.build)
+            cached_fragment('event', self.obj, self.build)
+        self.assertEqual(self.calls, 2)
+
+
+@override_settings(DEBUG=False)
+class RenderEmailTests(SimpleTestCase):
+
+    def setUp(self):
+        clear_caches()
+        self.addCleanup(clear_caches)
+
+    def test_template_is_compiled_once(self):
+        template = mock.Mock()
+        template.render.return_value = 'html'
+        with mock.patch.object(email_rendering, 'get_template', return_value=template) as get_template:
+            self.assertEqual(render_email('emails/x.html', {'a': 1}), 'html')
+            self.assertEqual(render_email('emails/x.html', {'a': 2}), 'html')
+        get_template.assert_called_once_with('emails/x.html')
+        self.assertEqual(template.render.call_count, 2)
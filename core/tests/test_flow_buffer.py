@@ -0,0 +1,186 @@
+"""
+Tests for buffered FlowLogger writes (core.flow_buffer).
+
+Sync mode INSERTs per event. Buffered scopes write all events of a request/task with
+one bulk insert (EMAIL_* steps excepted), drop events whose transaction rolled back, fall back to row-by-row
+INSERTs when the batch fails, and report count and flush latency. The stream drain
+acknowledges only written or rejected entries. Stream tests are skipped when no Redis
+server is reachable.
+"""
+import uuid
+from datetime import timedelta
+from unittest import mock
+
+from django.db import OperationalError, connection, transaction
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from core import flow_buffer
+from core.flow_logger import FlowLogger
+from core.middleware import FlowEventBufferMiddleware
+from core.models import PlatformFlowEvent
+from core.testing import redis_test_client
+
+BUFFERED = override_settings(FLOW_LOGGER={'MODE': 'buffered', 'MAX_EVENTS_PER_SCOPE': 200, 'SERVER_TIMING': True})
+
+
+REDIS = redis_test_client()
+
+
+def _inserts(queries):
+    return [q for q in queries if q['sql'].startswith('INSERT INTO "core_platformflowevent"')]
+
+
+class FlowBufferMixin:
+
+    def setUp(self):
+        self.flow = FlowLogger.start_flow('ticket_checkout')
+        flow_buffer.reset_flow_buffer_stats()
+
+    def steps(self):
+        return list(PlatformFlowEvent.objects.filter(flow=self.flow.flow).values_list('step', flat=True))
+
+
+class FlowBufferTestCase(FlowBufferMixin, TestCase):
+    """Scopes open inside the test transaction: events are written when the scope closes."""
+
+
+class SyncModeTests(FlowBufferTestCase):
+
+    def test_events_are_written_immediately(self):
+        with flow_buffer.buffered():
+            self.flow.log_event('ORDER_CREATED', message='created')
+            self.assertEqual(PlatformFlowEvent.objects.filter(flow=self.flow.flow).count(), 1)
+
+
+@BUFFERED
+class BufferedModeTests(FlowBufferTestCase):
+
+    def test_scope_writes_events_in_one_insert(self):
+        with CaptureQueriesContext(connection) as queries:
+            with flow_buffer.buffered('checkout'):
+                for step in ('RESERVATION_CREATED', 'ORDER_CREATED', 'PAYMENT_INITIATED'):
+                    self.flow.log_event(step)
+                self.assertEqual(self.steps(), [])
+
+        self.assertEqual(len(_inserts(queries.captured_queries)), 1)
+        self.assertEqual(self.steps(), ['RESERVATION_CREATED', 'ORDER_CREATED', 'PAYMENT_INITIATED'])
+
+    def test_email_steps_are_written_immediately(self):
+        with flow_buffer.buffered():
+            self.flow.log_event('ORDER_CREATED')
+            self.flow.log_event('EMAIL_SENT')
+            self.assertEqual(self.steps(), ['EMAIL_SENT'])
+
+        self.assertEqual(set(self.steps()), {'ORDER_CREATED', 'EMAIL_SENT'})
+
+    def test_failed_batch_falls_back_to_row_inserts(self):
+        with flow_buffer.buffered():
+            self.flow.log_event('ORDER_CREATED')
+            self.flow.log_event('PAYMENT_FAILED', message='x' * 600)  # Longer than the column
+            self.flow.log_event('FLOW_FAILED')
+
+        self.assertEqual(set(self.steps()), {'ORDER_CREATED', 'FLOW_FAILED'})
+        self.assertEqual(flow_buffer.get_flow_buffer_stats()['fallback_rows'], 3)
+
+    def test_events_are_flushed_when_the_scope_raises(self):
+        with self.assertRaises(RuntimeError):
+            with flow_buffer.buffered():
+                self.flow.log_event('ORDER_CREATED')
+                raise RuntimeError('view crashed')
+
+        self.assertEqual(self.steps(), ['ORDER_CREATED'])
+
+    def test_late_writes_keep_the_logging_time(self):
+        logged_at = timezone.now() - timedelta(minutes=5)
+        event = PlatformFlowEvent(flow=self.flow.flow, step='ORDER_CREATED', created_at=logged_at)
+
+        flow_buffer.write_events([event])
+
+        self.assertEqual(PlatformFlowEvent.objects.get(pk=event.pk).created_at, logged_at)
+
+    def test_middleware_reports_count_and_flush_latency(self):
+        def view(request):
+            self.flow.log_event('ORDER_CREATED')
+            self.flow.log_event('PAYMENT_INITIATED')
+            return HttpResponse('ok')
+
+        request = RequestFactory().post('/api/v1/orders/')
+        response = FlowEventBufferMiddleware(view)(request)
+
+        self.assertEqual(request.flow_events['count'], 2)
+        self.assertIn('desc="2 events"', response['Server-Timing'])
+        stats = flow_buffer.get_flow_buffer_stats()
+        self.assertEqual((stats['scopes'], stats['events'], stats['flushes']), (1, 2, 1))
+        self.assertIsNone(flow_buffer.current_buffer())
+
+
+@BUFFERED
+class TransactionTests(FlowBufferMixin, TransactionTestCase):
+    """Scopes opened in autocommit, like requests and tasks."""
+
+    def test_events_wait_for_commit_and_are_dropped_on_rollback(self):
+        with flow_buffer.buffered():
+            self.flow.log_event('ORDER_CREATED')
+            with transaction.atomic():
+                self.flow.log_event('PAYMENT_AUTHORIZED')
+                self.assertEqual(self.steps(), [])
+            try:
+                with transaction.atomic():
+                    self.flow.log_event('PAYMENT_FAILED')
+                    raise ValueError('rollback')
+            except ValueError:
+                pass
+
+        self.assertEqual(self.steps(), ['ORDER_CREATED', 'PAYMENT_AUTHORIZED'])
+        self.assertEqual(flow_buffer.get_flow_buffer_stats()['rolled_back'], 1)
+
+
+class StreamModeTests(FlowBufferTestCase):
+
+    def setUp(self):
+        if REDIS is None:
+            self.skipTest('Redis not available')
+        super().setUp()
+        key = f'test:flow-events:{uuid.uuid4().hex}'
+        settings_override = override_settings(FLOW_LOGGER={'MODE': 'stream', 'STREAM_KEY': key})
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.addCleanup(REDIS.delete, key)
+
+    def test_streamed_events_are_drained_once(self):
+        with flow_buffer.buffered():
+            self.flow.log_event('ORDER_CREATED', metadata={'total': 1000})
+            self.flow.log_event('PAYMENT_INITIATED')
+        self.assertEqual(self.steps(), [])
+
+        self.assertEqual(flow_buffer.drain_flow_event_stream(), 2)
+        self.assertEqual(flow_buffer.drain_flow_event_stream(), 0)
+
+        event = PlatformFlowEvent.objects.get(flow=self.flow.flow, step='ORDER_CREATED')
+        self.assertEqual(event.metadata, {'total': 1000})
+        self.assertEqual(len(self.steps()), 2)
+
+    def test_rejected_rows_are_acked_but_not_counted(self):
+        with flow_buffer.buffered():
+            self.flow.log_event('ORDER_CREATED')
+            self.flow.log_event('PAYMENT_FAILED', message='x' * 600)  # Longer than the column
+
+        self.assertEqual(flow_buffer.drain_flow_event_stream(), 1)
+        self.assertEqual(REDIS.xlen(flow_buffer._stream_key()), 0)
+        self.assertEqual(self.steps(), ['ORDER_CREATED'])
+
+    def test_database_outage_leaves_entries_pending(self):
+        with flow_buffer.buffered():
+            self.flow.log_event('ORDER_CREATED')
+            self.flow.log_event('PAYMENT_INITIATED')
+
+        with mock.patch.object(PlatformFlowEvent, 'save', side_effect=OperationalError('down')), \
+                mock.patch.object(PlatformFlowEvent.objects, 'bulk_create', side_effect=OperationalError('down')):
+            self.assertEqual(flow_buffer.drain_flow_event_stream(), 0)
+        self.assertEqual(REDIS.xlen(flow_buffer._stream_key()), 2)
+
+        self.assertEqual(flow_buffer.drain_flow_event_stream(), 2)
+        self.assertEqual(len(self.steps()), 2)
@@ -0,0 +1,173 @@
+"""
+Tests for the SuperAdmin analytics query layer (core.platform_analytics).
+
+organizer-sales and dashboard-time-series run a constant number of grouped queries
+regardless of how many organizers exist, results are cached per (range, filters) and
+the cache is dropped when an order is paid or an organizer changes.
+"""
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.events.models import Order
+from apps.organizers.models import Organizer
+from core import platform_analytics
+from core.testing import create_accommodation, create_event, create_organizer
+
+User = get_user_model()
+
+ORGANIZER_SALES_URL = '/api/v1/superadmin/organizer-sales/'
+TIME_SERIES_URL = '/api/v1/superadmin/dashboard-time-series/'
+
+
+def _order(event, subtotal, service_fee, status='paid', **kwargs):
+    return Order.objects.create(
+        event=event, email='', first_name='Guest', last_name='User', status=status,
+        subtotal=Decimal(subtotal), service_fee=Decimal(service_fee),
+        total=Decimal(subtotal) + Decimal(service_fee), **kwargs
+    )
+
+
+class OrganizerSalesTests(TestCase):
+    """organizer_sales_rows: grouped aggregates, same payload as the per-organizer loop."""
+
+    def setUp(self):
+        cache.clear()
+        self.superuser = User.objects.create_superuser(
+            username='super', email='super@test.com', password='superpass123',
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.superuser)
+
+        self.top = create_organizer(name='Top', slug='top')
+        self.top.has_accommodation_module = True
+        self.top.default_service_fee_rate = Decimal('0.10')
+        self.top.experience_dashboard_template = 'free_tours'
+        self.top.save()
+        event = create_event(organizer=self.top, slug='top-event')
+        create_event(organizer=self.top, slug='top-deleted', deleted_at=timezone.now())
+        create_accommodation(organizer=self.top, slug='top-cabin')
+        _order(event, '10000', '1000')
+        _order(event, '30000', '3000')
+        _order(event, '99999', '999', status='pending')
+        _order(event, '99999', '999', is_sandbox=True)
+
+        self.other = create_organizer(name='Other', slug='other')
+        create_accommodation(organizer=self.other, slug='other-cabin')  # module disabled: not counted
+        _order(create_event(organizer=self.other, slug='other-event'), '5000', '500')
+
+        Organizer.objects.bulk_create([
+            Organizer(name=f'Empty {i}', slug=f'empty-{i}') for i in range(30)
+        ])
+
+    def test_rows_are_computed_with_constant_queries(self):
+        with self.assertNumQueries(5):
+            rows = platform_analytics.organizer_sales_rows()
+
+        self.assertEqual(len(rows), 32)
+        self.assertEqual([row['organizer_name'] for row in rows[:2]], ['Top', 'Other'])
+        top = rows[0]
+        self.assertEqual(top, {
+            **top,
+            'total_sales': 40000.0,
+            'total_service_fees': 4000.0,
+            'gross_total': 44000.0,
+            'orders_count': 2,
+            'average_fee_percentage': 10.0,
+            'default_service_fee_rate': 0.1,
+            'effective_service_fee_rate': 0.1,
+            'service_fee_source': 'organizer',
+            'experience_dashboard_template': 'principal',
+            'events_count': 1,
+            'experiences_count': 0,
+            'accommodations_count': 1,
+        })
+        self.assertEqual(rows[1]['accommodations_count'], 0)
+        self.assertEqual(rows[1]['effective_service_fee_rate'], 0.15)
+        self.assertEqual(rows[-1]['orders_count'], 0)
+
+    def test_endpoint_filters_caches_and_invalidates_on_payment(self):
+        response = self.client.get(ORGANIZER_SALES_URL, {'organizer_id': str(self.other.id)})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(response.data['organizers'][0]['total_sales'], 5000.0)
+
+        # Served from the cache
+        with self.assertNumQueries(0):
+            platform_analytics.cached('organizer_sales', {'organizer_id': str(self.other.id)}, list)
+
+        order = _order(Order.objects.filter(event__organizer=self.other).first().event, '7000', '700', status='pending')
+        response = self.client.get(ORGANIZER_SALES_URL, {'organizer_id': str(self.other.id)})
+        self.assertEqual(response.data['organizers'][0]['total_sales'], 5000.0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            order.status = 'paid'
+            order.save()
+        response = self.client.get(ORGANIZER_SALES_URL, {'organizer_id': str(self.other.id)})
+        self.assertEqual(response.data['organizers'][0]['total_sales'], 12000.0)
+        self.assertEqual(response.data['organizers'][0]['orders_count'], 2)
+
+    def test_organizer_changes_invalidate_cached_rows(self):
+        self.client.get(ORGANIZER_SALES_URL, {'organizer_id': str(self.other.id)})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.other.default_service_fee_rate = Decimal('0.05')
+            self.other.has_accommodation_module = True
+            self.other.save()
+        row = self.client.get(ORGANIZER_SALES_URL, {'organizer_id': str(self.other.id)}).data['organizers'][0]
+        self.assertEqual(row['default_service_fee_rate'], 0.05)
+        self.assertEqual(row['accommodations_count'], 1)
+
+
+class DashboardTimeSeriesTests(TestCase):
+    """dashboard_time_series_data: one GROUP BY day per entity, zero-filled days."""
+
+    def setUp(self):
+        cache.clear()
+        self.superuser = User.objects.create_superuser(
+            username='super', email='super@test.com', password='superpass123',
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.superuser)
+        self.event = create_event()
+        self.today = timezone.localdate()
+
+    def test_series_counts_and_revenue_per_day(self):
+        old = _order(self.event, '10000', '1000')
+        Order.objects.filter(id=old.id).update(created_at=timezone.now() - timedelta(days=3))
+        _order(self.event, '20000', '2000', service_fee_effective=Decimal('1500'))
+        _order(self.event, '50000', '5000', status='pending')
+
+        start = self.today - timedelta(days=6)
+        with self.assertNumQueries(7):
+            data = platform_analytics.dashboard_time_series_data(start, self.today)
+
+        self.assertEqual(len(data['revenue']), 7)
+        self.assertEqual(data['revenue'][-1], {'date': self.today.isoformat(), 'value': 1500, 'cumulative': 2500})
+        self.assertEqual(data['revenue'][-4]['value'], 1000)
+        self.assertEqual(data['revenue'][0], {'date': start.isoformat(), 'value': 0, 'cumulative': 0})
+        self.assertEqual(data['users'][-1]['cumulative'], 1)
+        self.assertEqual(data['organizers'][-1]['value'], 1)
+        self.assertEqual(data['summary']['revenue_last_7d'], 2500)
+        self.assertEqual(data['summary']['users_new_7d'], 1)
+
+    def test_endpoint_all_range_starts_at_first_activity_and_is_cached(self):
+        response = self.client.get(TIME_SERIES_URL, {'range': 'all'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['range'], 'all')
+        self.assertEqual(response.data['start_date'], self.today.isoformat())
+        self.assertEqual(response.data['users'][-1]['cumulative'], 1)
+
+        # Relative ranges end today (server date, as in _parse_range)
+        end = timezone.now().date()
+        key_params = {'range': '30d', 'start_date': end - timedelta(days=30), 'end_date': end}
+        response = self.client.get(TIME_SERIES_URL, {'range': '30d'})
+        self.assertEqual(len(response.data['revenue']), 31)
+        with self.assertNumQueries(0):
+            cached = platform_analytics.cached('dashboard_time_series', key_params, dict)
+        self.assertEqual(cached['end_date'], end.isoformat())
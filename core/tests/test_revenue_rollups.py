@@ -0,0 +1,236 @@
+"""
+Tests for revenue rollups (core.RevenueRollup / core.revenue_rollups).
+
+Order.save keeps rollups in step with paid/refunded orders, item writes, deletes and
+raw created_at rewrites resync through tracking_order_revenue, rebuild_revenue_rollups
+reproduces the live order aggregation, and the analytics endpoint reads rollups with
+a fixed number of queries regardless of how many orders exist.
+"""
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.events.models import Order, OrderItem
+from apps.organizers.models import OrganizerUser
+from core.models import RevenueRollup
+from core.revenue_rollups import day_bucket, rebuild_revenue_rollups, tracking_order_revenue
+from core.revenue_system import get_event_revenue, get_organizer_revenue, get_ticket_tier_revenue
+from core.testing import create_event, create_organizer, create_ticket_tier
+
+LIVE = override_settings(REVENUE_ROLLUPS={'READ_FROM_ROLLUPS': False, 'HOURLY_RETENTION_DAYS': 2})
+
+
+def _order(event, items, discount=Decimal('0'), **kwargs):
+    """Pending order with items [(tier, quantity)]; totals follow the items like checkout does."""
+    subtotal = sum(tier.price * quantity for tier, quantity in items)
+    service_fee = sum(Decimal('100') * quantity for _, quantity in items)
+    order = Order.objects.create(
+        event=event, email='', first_name='Guest', last_name='User',
+        subtotal=subtotal, service_fee=service_fee, discount=discount,
+        total=subtotal + service_fee - discount, **kwargs
+    )
+    OrderItem.objects.bulk_create([
+        OrderItem(order=order, ticket_tier=tier, quantity=quantity, unit_price=tier.price,
+                  unit_service_fee=Decimal('100'), subtotal=(tier.price + 100) * quantity)
+        for tier, quantity in items
+    ])
+    return order
+
+
+class RevenueRollupSyncTests(TestCase):
+    """Order.save applies each order's contribution exactly once."""
+
+    def setUp(self):
+        self.event = create_event(pricing_mode='complex')
+        self.vip = create_ticket_tier(self.event, name='VIP', price=Decimal('10000'))
+        self.general = create_ticket_tier(self.event, name='General', price=Decimal('5000'))
+
+    def _pay(self, order):
+        order = Order.objects.get(id=order.id)
+        order.status = 'paid'
+        order.save()
+        return order
+
+    def test_paid_order_is_rolled_up_and_refund_removes_it(self):
+        order = self._pay(_order(self.event, [(self.vip, 1), (self.general, 3)], discount=Decimal('2500')))
+
+        revenue = get_event_revenue(self.event)
+        self.assertEqual(revenue['calculation_method'], 'revenue_rollup')
+        self.assertEqual(revenue['total_orders'], 1)
+        self.assertEqual(revenue['total_tickets'], 4)
+        self.assertEqual(revenue['total_revenue'], 22900.0)
+        self.assertEqual(revenue['total_discount'], 2500.0)
+        self.assertEqual(revenue['validation']['status'], 'passed')
+        self.assertEqual(get_ticket_tier_revenue(self.general)['total_tickets'], 3)
+        self.assertEqual(RevenueRollup.objects.filter(granularity='hour').count(), 3)
+
+        order.status = 'refunded'
+        order.save()
+        revenue = get_event_revenue(self.event, validate=False)
+        self.assertEqual((revenue['total_orders'], revenue['total_revenue']), (0, 0.0))
+
+    def test_saves_without_revenue_changes_do_not_touch_rollups(self):
+        order = self._pay(_order(self.event, [(self.vip, 2)]))
+        before = list(RevenueRollup.objects.values_list('orders', 'total_revenue'))
+
+        with CaptureQueriesContext(connection) as ctx:
+            order.notes = 'Called the buyer'
+            order.save()
+            Order.objects.get(id=order.id).save()
+
+        self.assertFalse([q for q in ctx.captured_queries if 'core_revenuerollup' in q['sql']])
+        self.assertEqual(list(RevenueRollup.objects.values_list('orders', 'total_revenue')), before)
+
+    def test_items_created_after_payment_are_rolled_up(self):
+        # Complimentary redemptions create the order as paid, then its items
+        order = self._pay(_order(self.event, []))
+        item = OrderItem.objects.create(
+            order=order, ticket_tier=self.vip, quantity=2, unit_price=Decimal('0'), subtotal=Decimal('0')
+        )
+
+        self.assertEqual(get_event_revenue(self.event, validate=False)['total_tickets'], 2)
+        self.assertEqual(get_ticket_tier_revenue(self.vip)['total_tickets'], 2)
+
+        item.delete()
+        self.assertEqual(get_event_revenue(self.event, validate=False)['total_tickets'], 0)
+        self.assertEqual(get_ticket_tier_revenue(self.vip)['total_tickets'], 0)
+
+    def test_items_of_unpaid_orders_do_not_touch_rollups(self):
+        order = _order(self.event, [])
+        with CaptureQueriesContext(connection) as ctx:
+            OrderItem.objects.create(
+                order=order, ticket_tier=self.vip, quantity=1, unit_price=Decimal('10000'), subtotal=Decimal('10000')
+            )
+        self.assertFalse([q for q in ctx.captured_queries if 'core_revenuerollup' in q['sql']])
+
+    def test_raw_created_at_rewrite_and_delete_resync(self):
+        order = self._pay(_order(self.event, [(self.general, 2)]))
+        original_date = timezone.now() - timedelta(days=30)
+
+        with tracking_order_revenue(order.id):
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    'UPDATE events_order SET created_at = %s WHERE id = %s', [original_date, str(order.id)]
+                )
+
+        days = RevenueRollup.objects.filter(granularity='day', ticket_tier__isnull=True, orders__gt=0)
+        self.assertEqual(list(days.values_list('bucket_start', flat=True)), [day_bucket(original_date)])
+
+        Order.objects.get(id=order.id).delete()
+        revenue = get_event_revenue(self.event, validate=False)
+        self.assertEqual((revenue['total_orders'], revenue['total_tickets']), (0, 0))
+
+    def test_rollups_match_live_aggregation(self):
+        for discount in (Decimal('0'), Decimal('1500'), Decimal('700')):
+            self._pay(_order(self.event, [(self.vip, 1), (self.general, 2)], discount=discount))
+        _order(self.event, [(self.vip, 5)])  # pending: never counted
+        self._pay(_order(self.event, [(self.general, 1)], is_sandbox=True))
+
+        rolled = get_event_revenue(self.event, validate=False)
+        rolled_tier = get_ticket_tier_revenue(self.vip)
+        with LIVE:
+            live = get_event_revenue(self.event, validate=False)
+            live_tier = get_ticket_tier_revenue(self.vip)
+        for key in ('total_revenue', 'service_fees_original', 'total_discount', 'total_orders', 'total_tickets'):
+            self.assertEqual(rolled[key], live[key], key)
+        self.assertAlmostEqual(rolled['gross_revenue'], live['gross_revenue'], delta=3)
+        self.assertEqual(rolled_tier['total_tickets'], live_tier['total_tickets'])
+        self.assertAlmostEqual(rolled_tier['total_revenue'], live_tier['total_revenue'], delta=1)
+        self.assertEqual(get_organizer_revenue(self.event.organizer)['total_orders'], 3)
+
+        # Rebuild produces the same rows as incremental maintenance
+        incremental = sorted(RevenueRollup.objects.values_list(
+            'ticket_tier_id', 'granularity', 'bucket_start', 'orders', 'tickets', 'total_revenue'
+        ), key=str)
+        call_command('rebuild_revenue_rollups', stdout=open('/dev/null', 'w'))
+        rebuilt = sorted(RevenueRollup.objects.values_list(
+            'ticket_tier_id', 'granularity', 'bucket_start', 'orders', 'tickets', 'total_revenue'
+        ), key=str)
+        self.assertEqual(rebuilt, incremental)
+
+
+class RevenueAnalyticsTests(TestCase):
+    """EventViewSet.analytics reads rollups."""
+
+    def setUp(self):
+        self.organizer = create_organizer()
+        self.event = create_event(organizer=self.organizer, pricing_mode='complex')
+        self.tier = create_ticket_tier(self.event, name='General', price=Decimal('5000'))
+        user = get_user_model().objects.create_user(
+            email='owner@test.com', username='owner', password='password123', is_organizer=True
+        )
+        OrganizerUser.objects.create(organizer=self.organizer, user=user, is_admin=True, can_view_reports=True)
+        self.client = APIClient()
+        self.client.force_authenticate(user)
+
+    def _bulk_paid_orders(self, count, days):
+        """`count` paid orders spread over the last `days` days, bypassing Order.save."""
+        now = timezone.now()
+        orders = Order.objects.bulk_create(
+            (
+                Order(
+                    event=self.event, order_number=f'BENCH-{i}', email='', first_name='Guest',
+                    last_name='User', status='paid', subtotal=Decimal('5000'), service_fee=Decimal('100'),
+                    total=Decimal('5100'), subtotal_effective=Decimal('5000'),
+                    service_fee_effective=Decimal('100'),
+                )
+                for i in range(count)
+            ),
+            batch_size=5000,
+        )
+        OrderItem.objects.bulk_create(
+            (
+                OrderItem(order=order, ticket_tier=self.tier, quantity=1, unit_price=Decimal('5000'),
+                          unit_service_fee=Decimal('100'), subtotal=Decimal('5100'))
+                for order in orders
+            ),
+            batch_size=5000,
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {Order._meta.db_table} SET created_at = %s - (random() * %s) * interval '1 day'",
+                [now, days - 1],
+            )
+
+    def test_analytics_over_100k_orders(self):
+        self._bulk_paid_orders(100_000, days=30)
+        result = rebuild_revenue_rollups()
+        self.assertEqual(result['orders'], 100_000)
+
+        with CaptureQueriesContext(connection) as ctx:
+            started = time.perf_counter()
+            response = self.client.get('/api/v1/events/analytics/', {'days': 30})
+            elapsed = time.perf_counter() - started
+
+        self.assertEqual(response.status_code, 200)
+        kpis = response.data['kpis']
+        self.assertEqual(kpis['totalOrders'], 100_000)
+        self.assertEqual(kpis['totalSales'], 100_000)
+        self.assertEqual(kpis['totalRevenue'], 510_000_000.0)
+        self.assertEqual(sum(day['orders'] for day in response.data['chartData']), 100_000)
+        self.assertEqual(len(response.data['chartData']), 30)
+        self.assertEqual(response.data['categoryData'][0]['value'], 100_000)
+        self.assertLessEqual(len(ctx.captured_queries), 10)
+        self.assertLess(elapsed, 1.0)
+
+    def test_event_filter_and_all_sales(self):
+        self._bulk_paid_orders(10, days=5)
+        rebuild_revenue_rollups()
+
+        response = self.client.get('/api/v1/events/analytics/', {'days': 0, 'event_id': str(self.event.id)})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['kpis']['totalOrders'], 10)
+        self.assertEqual(response.data['categoryData'][0]['base_price'], 5000.0)
+        self.assertEqual(sum(day['orders'] for day in response.data['chartData']), 10)
+
+        other = create_event(organizer=create_organizer(name='Other', slug='other'), slug='other')
+        response = self.client.get('/api/v1/events/analytics/', {'event_id': str(other.id)})
+        self.assertEqual(response.status_code, 404)
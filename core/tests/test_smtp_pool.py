@@ -0,0 +1,229 @@
+"""
+Tests for the per-worker SMTP connection pool (core.smtp_pool).
+
+Connections are reused across sends, probed with NOOP after being idle, reopened when
+the server dropped the session; send_batch reports per-item results and stage timing.
+The pending-email fallback sends the backlog, records each result in the flow, and skips
+a run while the previous one still holds its lock.
+"""
+import smtplib
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from core import smtp_pool
+from core.flow_logger import FlowLogger
+from core.models import PlatformFlowEvent
+from core.smtp_pool import SMTPConnectionPool, send_batch, smtp_connection
+from core.testing import create_event
+
+
+class FakeSMTP:
+    def __init__(self, alive=True):
+        self.alive = alive
+
+    def noop(self):
+        if not self.alive:
+            raise smtplib.SMTPServerDisconnected('gone')
+        return (250, b'OK')
+
+
+class FakeBackend:
+    """Email backend double: counts opens and sends, can drop the session once."""
+
+    def __init__(self, drop_next_send=False):
+        self.connection = None
+        self.opens = 0
+        self.closes = 0
+        self.sent = []
+        self.drop_next_send = drop_next_send
+
+    def open(self):
+        self.opens += 1
+        self.connection = FakeSMTP()
+
+    def close(self):
+        self.closes += 1
+        self.connection = None
+
+    def send_messages(self, messages):
+        if self.drop_next_send:
+            self.drop_next_send = False
+            raise smtplib.SMTPServerDisconnected('Connection unexpectedly closed')
+        self.sent.extend(messages)
+        return len(messages)
+
+
+class SMTPConnectionPoolTests(SimpleTestCase):
+
+    def setUp(self):
+        self.backends = []
+
+        def factory(**kwargs):
+            backend = FakeBackend()
+            self.backends.append(backend)
+            return backend
+
+        patcher = mock.patch.object(smtp_pool, 'get_connection', side_effect=factory)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.pool = SMTPConnectionPool(max_connections=2, noop_after_seconds=30)
+
+    def test_connection_is_reused_between_sends(self):
+        for message in ['a', 'b', 'c']:
+            with self.pool.connection() as connection:
+                self.pool.send(connection, [message])
+        self.assertEqual(len(self.backends), 1)
+        self.assertEqual(self.backends[0].opens, 1)
+        self.assertEqual(self.backends[0].sent, ['a', 'b', 'c'])
+
+    def test_dead_idle_connection_is_replaced(self):
+        self.pool.noop_after_seconds = 0
+        with self.pool.connection() as connection:
+            pass
+        connection.connection.alive = False
+
+        with self.pool.connection() as fresh:
+            self.assertIsNot(fresh, connection)
+        self.assertEqual(connection.closes, 1)
+
+    def test_dropped_session_reconnects_once(self):
+        with self.pool.connection() as connection:
+            connection.drop_next_send = True
+            self.assertEqual(self.pool.send(connection, ['a']), 1)
+        self.assertEqual(connection.opens, 2)
+        self.assertEqual(connection.sent, ['a'])
+
+    def test_connection_is_discarded_when_block_raises(self):
+        with self.assertRaises(ValueError):
+            with self.pool.connection() as connection:
+                raise ValueError('boom')
+        self.assertEqual(connection.closes, 1)
+        with self.pool.connection() as fresh:
+            self.assertIsNot(fresh, connection)
+
+
+@override_settings(SMTP_POOL={'ENABLED': True, 'MAX_CONNECTIONS': 2})
+class SendBatchTests(SimpleTestCase):
+
+    def setUp(self):
+        self.backends = []
+
+        def factory(**kwargs):
+            backend = FakeBackend()
+            self.backends.append(backend)
+            return backend
+
+        patcher = mock.patch.object(smtp_pool, 'get_connection', side_effect=factory)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        pool_patcher = mock.patch.object(smtp_pool, '_pool', None)
+        pool_patcher.start()
+        self.addCleanup(pool_patcher.stop)
+
+    def test_batch_sends_over_one_connection_and_reports_failures(self):
+        def send_one(item, connection):
+            if item == 'bad':
+                raise RuntimeError('render failed')
+            smtp_pool.send_messages(connection, [item])
+            return {'status': 'success'}
+
+        batch = send_batch(['a', 'bad', 'b'], send_one, max_connections=1)
+
+        self.assertEqual(batch['results'][0], {'status': 'success'})
+        self.assertEqual(batch['results'][1], {'status': 'error', 'error': 'render failed'})
+        self.assertEqual(len(self.backends), 1)
+        self.assertEqual(self.backends[0].sent, ['a', 'b'])
+        self.assertEqual(batch['metrics']['items'], 3)
+        self.assertEqual(batch['metrics']['connections'], 1)
+        for stage in ['connection_time_ms', 'send_time_ms', 'total_time_ms']:
+            self.assertIn(stage, batch['metrics'])
+
+    def test_sender_metrics_record_connection_time(self):
+        metrics = {}
+        with smtp_connection(metrics=metrics) as connection:
+            smtp_pool.send_messages(connection, ['a'])
+        self.assertIn('connection_time_ms', metrics)
+
+    @override_settings(SMTP_POOL={'ENABLED': False})
+    def test_disabled_pool_opens_and_closes_per_send(self):
+        with smtp_connection() as connection:
+            smtp_pool.send_messages(connection, ['a'])
+        with smtp_connection() as connection:
+            smtp_pool.send_messages(connection, ['b'])
+        self.assertEqual(len(self.backends), 2)
+        self.assertTrue(all(backend.closes == 1 for backend in self.backends))
+
+
+LOCMEM_CACHE = override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+
+
+def _inline_batch(items, send_one):
+    return {'results': [send_one(item, None) for item in items], 'metrics': {}}
+
+
+@LOCMEM_CACHE
+class PendingEmailsFallbackSendTests(TestCase):
+
+    def setUp(self):
+        from apps.events.models import Order
+
+        self.order = Order.objects.create(
+            event=create_event(), email='buyer@test.com', first_name='Guest', last_name='User',
+            status='paid', subtotal=Decimal('10000'), service_fee=Decimal('0'), total=Decimal('10000'),
+        )
+        self.flow = FlowLogger.start_flow('ticket_checkout')
+        self.flow.update_order(self.order)
+        self.flow.log_event('EMAIL_PENDING', order=self.order)
+        PlatformFlowEvent.objects.filter(flow=self.flow.flow).update(created_at=timezone.now() - timedelta(minutes=5))
+
+    def _run(self, sender_result):
+        from apps.events import tasks
+
+        sender = mock.Mock(return_value=sender_result)
+        with mock.patch('core.smtp_pool.send_batch', side_effect=_inline_batch), \
+                mock.patch.object(tasks, '_confirmation_sender', return_value=sender):
+            result = tasks.ensure_pending_emails_sent()
+        self.assertIsNone(cache.get(tasks.PENDING_EMAILS_LOCK_KEY))
+        return result, sender
+
+    def _fallback_event(self):
+        return PlatformFlowEvent.objects.get(flow=self.flow.flow, step='EMAIL_TASK_ENQUEUED')
+
+    def test_backlog_is_sent_and_logged_after_the_send(self):
+        result, sender = self._run({'status': 'success'})
+
+        self.assertEqual((result['enqueued'], result['sent'], result['skipped']), (1, 1, 0))
+        self.assertEqual(sender.call_args.args[0], str(self.order.id))
+        event = self._fallback_event()
+        self.assertEqual(event.status, 'success')
+        self.assertTrue(event.metadata['sent'])
+
+    def test_failed_send_is_logged_as_failure(self):
+        result, _ = self._run({'status': 'error', 'error': 'smtp down'})
+
+        self.assertEqual((result['enqueued'], result['sent']), (1, 0))
+        event = self._fallback_event()
+        self.assertEqual(event.status, 'failure')
+        self.assertEqual(event.metadata['error'], 'smtp down')
+
+
+@LOCMEM_CACHE
+class PendingEmailsFallbackTests(SimpleTestCase):
+
+    def test_overlapping_run_is_skipped(self):
+        from apps.events import tasks
+
+        cache.set(tasks.PENDING_EMAILS_LOCK_KEY, 'other-run', 60)
+        self.addCleanup(cache.delete, tasks.PENDING_EMAILS_LOCK_KEY)
+
+        with mock.patch('core.smtp_pool.send_batch') as batch:
+            result = tasks.ensure_pending_emails_sent()
+
+        self.assertTrue(result['skipped_locked'])
+        batch.assert_not_called()
+        self.assertEqual(cache.get(tasks.PENDING_EMAILS_LOCK_KEY), 'other-run')
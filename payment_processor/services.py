@@ -534,6 +534,9 @@ class TransbankWebPayPlusService(BasePaymentService):
                     else:
                         # Event: create tickets from reservations
                         self._create_tickets_from_reservations(payment.order)
+                        # Pre-render QR images in the background once the order is committed
+                        from apps.events.tasks import enqueue_order_tickets_qr
+                        enqueue_order_tickets_qr(payment.order.id)
 
                     # Log tickets created + cleanup only for event orders (not experience, accommodation, car_rental)
                     if order_kind not in ('experience', 'accommodation', 'car_rental', 'erasmus_activity'):
@@ -605,12 +608,10 @@ class TransbankWebPayPlusService(BasePaymentService):
                 
                 # 🚀 ENTERPRISE: Release holds immediately when payment fails
                 from apps.events.models import TicketHold
-                expired_holds = TicketHold.objects.filter(
+                TicketHold.objects.filter(
                     order=payment.order,
                     released=False
-                )
-                for hold in expired_holds:
-                    hold.release()  # Returns tickets to availability
+                ).release()  # Returns tickets to availability, grouped by tier
                 
                 return {
                     'success': False,